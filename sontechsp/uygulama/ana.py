@@ -1,11 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-18
+# Last Update: 2026-10-17
 # Module: ana
 # Description: SONTECHSP ana uygulama giriş noktası (bootstrap sadece)
 # Changelog:
 # - İlk oluşturma
 # - Kod kalitesi: 120 satır limitine uygun hale getirildi
 # - Type hinting iyileştirmeleri
+# - Yerel metrik sunucusu başlatılıyor
 
 """
 SONTECHSP Ana Uygulama Bootstrap
@@ -16,6 +17,7 @@ Sadece bootstrap işlevi gören ana giriş noktası.
 Sorumluluklar:
 - PyQt6 uygulama başlatma
 - Log sistemi kurulumu
+- Yerel metrik sunucusu başlatma
 - Merkezi hata yönetimi
 - Ana pencere başlatma
 """
@@ -29,6 +31,7 @@ from PyQt6.QtWidgets import QApplication
 # SONTECHSP çekirdek modülleri
 from sontechsp.uygulama.cekirdek.kayit import kayit_sistemi_al, kayit_al
 from sontechsp.uygulama.cekirdek.hatalar import SontechHatasi, EntegrasyonHatasi
+from sontechsp.uygulama.moduller.pos.metrik_sunucusu import metrik_sunucusu_baslat
 
 # Ana pencere modülü
 from sontechsp.uygulama.arayuz.ana_pencere import AnaPencere
@@ -135,6 +138,9 @@ def main():
         logger = kayit_al("ana")
         logger.info("SONTECHSP uygulaması başlatılıyor...")
 
+        # Metrik sunucusu (arka plan thread'i)
+        metrik_sunucusu_baslat()
+
         # PyQt6 uygulama oluştur
         app = uygulama_kur()
         logger.info("PyQt6 uygulama oluşturuldu")
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-19
+# Last Update: 2026-10-17
 # Module: odeme_paneli
 # Description: POS ödeme paneli bileşeni
 # Changelog:
 # - İlk oluşturma
+# - Ara toplam ve KDV sabit %18 yerine sepetin KDV dökümünden gösteriliyor
 
 """
 Ödeme Paneli - POS ödeme işlemleri ve toplam gösterimi
@@ -14,6 +15,7 @@ from typing import Optional
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QTabWidget, QFrame
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamlari, SepetToplamOzeti
 from .turkuaz_tema import TurkuazTema
 
 
@@ -131,12 +133,21 @@ class OdemePaneli(QWidget):
         self.tab_widget.addTab(hizli_urunler_tab, "Hızlı Ürünler")
         layout.addWidget(self.tab_widget)
 
-    def genel_toplami_guncelle(self, tutar: Decimal):
-        """Genel toplamı günceller"""
+    def genel_toplami_guncelle(self, tutar: Decimal, toplamlar: Optional[SepetToplamOzeti] = None):
+        """
+        Genel toplamı günceller
+
+        toplamlar verilirse KDV sepetin oran dökümünden alınır; verilmezse
+        tutarın tamamı varsayılan orandan sayılır.
+        """
+        if toplamlar is None:
+            tek_satir = SepetToplamlari()
+            tek_satir.satir_ayarla(0, tutar)
+            toplamlar = tek_satir.ozet()
         self.genel_toplam_tutari = tutar
         self.genel_toplam_label.setText(f"{tutar:.2f} ₺")
-        ara_toplam = tutar / Decimal("1.18")
-        kdv = tutar - ara_toplam
+        kdv = toplamlar.kdv_toplami
+        ara_toplam = toplamlar.net_tutar - kdv
         self.ara_toplam_label.setText(f"Ara Toplam: {ara_toplam:.2f} ₺")
         self.kdv_label.setText(f"KDV: {kdv:.2f} ₺")
         self.para_ustu_hesapla()
@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-19
+# Last Update: 2026-10-17
 # Module: pos_satis_ekrani
 # Description: Ana POS satış ekranı - tüm bileşenleri birleştiren ana widget
 # Changelog:
 # - İlk oluşturma
+# - Ödeme paneline sepetin KDV dökümü aktarılıyor
+# - Sepet tablosunda sabit satır yüksekliği (okutmada satırlar yeniden ölçülmüyor)
 
 """
 POS Satış Ekranı - Ana POS arayüzü birleştirici widget
@@ -11,11 +13,13 @@ POS Satış Ekranı - Ana POS arayüzü birleştirici widget
 
 from typing import Optional
 from decimal import Decimal
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QSplitter, QApplication
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QSplitter, QApplication, QHeaderView
+)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QKeyEvent
 
-from .sepet_modeli import SepetModeli, SepetOgesi
+from .sepet_modeli import SATIR_YUKSEKLIGI, SepetModeli, SepetOgesi
 from .ust_bar import UstBar
 from .odeme_paneli import OdemePaneli
 from .hizli_islem_seridi import HizliIslemSeridi
@@ -107,6 +111,9 @@ class POSSatisEkrani(QWidget):
         self.sepet_tablo.setAlternatingRowColors(True)
         self.sepet_tablo.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.sepet_tablo.verticalHeader().setVisible(False)
+        # Sabit satır yüksekliği; eklenen satır için diğer satırlar ölçülmez
+        self.sepet_tablo.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.sepet_tablo.verticalHeader().setDefaultSectionSize(SATIR_YUKSEKLIGI)
 
         sepet_layout.addWidget(self.sepet_tablo)
 
@@ -266,7 +273,7 @@ class POSSatisEkrani(QWidget):
     def sepet_toplami_guncelle(self):
         """Sepet toplamını günceller"""
         toplam = self.sepet_modeli.genel_toplam()
-        self.odeme_paneli.genel_toplami_guncelle(toplam)
+        self.odeme_paneli.genel_toplami_guncelle(toplam, self.sepet_modeli.toplam_ozeti())
 
     def nakit_odeme(self):
         """Nakit ödeme işlemi"""
@@ -1,19 +1,28 @@
 # Version: 0.1.0
-# Last Update: 2024-12-19
+# Last Update: 2026-10-17
 # Module: sepet_modeli
 # Description: POS sepet tablosu için QAbstractTableModel
 # Changelog:
 # - İlk oluşturma
+# - Genel toplam her değişiklikte yeniden toplanmıyor; SepetToplamlari ile artımlı
+# - Satır bazlı değişiklik sinyalleri, önbellekli tutar metinleri ve sepeti_esitle
 
 """
 Sepet Modeli - POS sepet tablosu için model sınıfı
+
+Değişiklikler görünüme satır ve hücre düzeyinde bildirilir
+(beginInsertRows/beginRemoveRows/dataChanged); model sıfırlama sinyali
+kullanılmaz, böylece her barkod okutması yalnızca değişen satırı çizdirir.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Optional, Any
+from typing import Iterable, List, Optional, Any
 from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, pyqtSignal
 from PyQt6.QtGui import QColor
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import (
+    SepetToplamlari, SepetToplamOzeti, tutar_metni, tutar_yuvarla
+)
 from .turkuaz_tema import TurkuazTema
 
 
@@ -27,10 +36,22 @@ class SepetOgesi:
     birim_fiyat: Decimal
     toplam_fiyat: Decimal
     indirim_orani: float = 0.0
+    kdv_orani: Optional[Decimal] = None
+    # Görünüm metinleri; tutar değişince _oge_toplamini_guncelle yeniler
+    fiyat_metni: str = field(default="", compare=False, repr=False)
+    tutar_metni: str = field(default="", compare=False, repr=False)
 
     def toplam_hesapla(self) -> Decimal:
-        """Toplam fiyatı hesaplar"""
-        return self.birim_fiyat * self.adet * (Decimal("1") - Decimal(str(self.indirim_orani)))
+        """Toplam fiyatı hesaplar (kuruşa yuvarlanmış)"""
+        return tutar_yuvarla(self.birim_fiyat * self.adet * (Decimal("1") - Decimal(str(self.indirim_orani))))
+
+
+# Sepet tablosunun sabit satır yüksekliği (piksel)
+SATIR_YUKSEKLIGI = 32
+
+# Adet değişince yeniden çizilen kolonlar (Adet, Fiyat, Tutar)
+ADET_KOLONU = 2
+TUTAR_KOLONU = 4
 
 
 class SepetModeli(QAbstractTableModel):
@@ -42,6 +63,8 @@ class SepetModeli(QAbstractTableModel):
         super().__init__(parent)
         self.kolonlar = ["Barkod", "Ürün", "Adet", "Fiyat", "Tutar", "Sil"]
         self.sepet_ogeleri: List[SepetOgesi] = []
+        # Öğeler nesne kimliğiyle anahtarlanır (dataclass öğeleri hash'lenemez)
+        self._toplamlar = SepetToplamlari()
         self.tema = TurkuazTema()
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
@@ -68,9 +91,9 @@ class SepetModeli(QAbstractTableModel):
             elif kolon == 2:  # Adet
                 return str(oge.adet)
             elif kolon == 3:  # Fiyat
-                return f"{oge.birim_fiyat:.2f} ₺"
+                return oge.fiyat_metni
             elif kolon == 4:  # Tutar
-                return f"{oge.toplam_hesapla():.2f} ₺"
+                return oge.tutar_metni
             elif kolon == 5:  # Sil
                 return "Sil"
 
@@ -114,9 +137,10 @@ class SepetModeli(QAbstractTableModel):
             try:
                 yeni_adet = int(value)
                 if yeni_adet > 0:
-                    self.sepet_ogeleri[index.row()].adet = yeni_adet
-                    self.sepet_ogeleri[index.row()].toplam_fiyat = self.sepet_ogeleri[index.row()].toplam_hesapla()
-                    self.dataChanged.emit(index, index)
+                    oge = self.sepet_ogeleri[index.row()]
+                    oge.adet = yeni_adet
+                    self._oge_toplamini_guncelle(oge)
+                    self._satir_degisti(index.row())
                     self.sepet_degisti.emit()
                     return True
             except ValueError:
@@ -128,6 +152,7 @@ class SepetModeli(QAbstractTableModel):
         """Sepete öğe ekler"""
         self.beginInsertRows(QModelIndex(), len(self.sepet_ogeleri), len(self.sepet_ogeleri))
         self.sepet_ogeleri.append(oge)
+        self._oge_toplamini_guncelle(oge)
         self.endInsertRows()
         self.sepet_degisti.emit()
 
@@ -135,15 +160,74 @@ class SepetModeli(QAbstractTableModel):
         """Sepetten öğe siler"""
         if 0 <= satir < len(self.sepet_ogeleri):
             self.beginRemoveRows(QModelIndex(), satir, satir)
+            self._toplamlar.satir_cikar(id(self.sepet_ogeleri[satir]))
             del self.sepet_ogeleri[satir]
             self.endRemoveRows()
             self.sepet_degisti.emit()
 
     def sepeti_temizle(self):
         """Sepeti temizler"""
-        self.beginResetModel()
-        self.sepet_ogeleri.clear()
-        self.endResetModel()
+        if self.sepet_ogeleri:
+            self.beginRemoveRows(QModelIndex(), 0, len(self.sepet_ogeleri) - 1)
+            self.sepet_ogeleri.clear()
+            self._toplamlar.temizle()
+            self.endRemoveRows()
+        self.sepet_degisti.emit()
+
+    def sepeti_esitle(self, ogeler: Iterable[SepetOgesi]):
+        """
+        Sepeti verilen öğelere eşitler
+
+        Öğeler barkodla eşleştirilir: aynı barkodlu satırlar yerinde
+        güncellenir, yalnızca eklenen ve çıkan satırlar için satır sinyali
+        verilir. Sepet (servis veya bekletilen sepet) tamamen değiştiğinde
+        model sıfırlanmaz, seçim ve kaydırma konumu korunur.
+
+        Args:
+            ogeler: Sepetin yeni öğeleri (sırasıyla)
+        """
+        yeni = list(ogeler)
+        yeni_barkodlar = {oge.barkod for oge in yeni}
+
+        # Artık olmayan satırlar sondan başa çıkarılır
+        for satir in range(len(self.sepet_ogeleri) - 1, -1, -1):
+            if self.sepet_ogeleri[satir].barkod not in yeni_barkodlar:
+                self.beginRemoveRows(QModelIndex(), satir, satir)
+                self._toplamlar.satir_cikar(id(self.sepet_ogeleri[satir]))
+                del self.sepet_ogeleri[satir]
+                self.endRemoveRows()
+
+        for hedef, oge in enumerate(yeni):
+            mevcut = self._barkod_satiri(oge.barkod, hedef)
+            if mevcut is None:
+                self.beginInsertRows(QModelIndex(), hedef, hedef)
+                self.sepet_ogeleri.insert(hedef, oge)
+                self._oge_toplamini_guncelle(oge)
+                self.endInsertRows()
+                continue
+
+            if mevcut != hedef:
+                self.beginMoveRows(QModelIndex(), mevcut, mevcut, QModelIndex(), hedef)
+                self.sepet_ogeleri.insert(hedef, self.sepet_ogeleri.pop(mevcut))
+                self.endMoveRows()
+
+            eski = self.sepet_ogeleri[hedef]
+            onceki = self._gorunen_metinler(eski)
+            if eski is not oge:
+                self._toplamlar.satir_cikar(id(eski))
+                self.sepet_ogeleri[hedef] = oge
+            self._oge_toplamini_guncelle(oge)
+            if self._gorunen_metinler(oge) != onceki:
+                self.dataChanged.emit(self.createIndex(hedef, 0), self.createIndex(hedef, TUTAR_KOLONU))
+
+        # Tekrarlanan barkodlardan artakalan satırlar
+        if len(self.sepet_ogeleri) > len(yeni):
+            self.beginRemoveRows(QModelIndex(), len(yeni), len(self.sepet_ogeleri) - 1)
+            for oge in self.sepet_ogeleri[len(yeni):]:
+                self._toplamlar.satir_cikar(id(oge))
+            del self.sepet_ogeleri[len(yeni):]
+            self.endRemoveRows()
+
         self.sepet_degisti.emit()
 
     def adet_degistir(self, satir: int, degisim: int):
@@ -154,16 +238,42 @@ class SepetModeli(QAbstractTableModel):
 
             if yeni_adet > 0:
                 oge.adet = yeni_adet
-                oge.toplam_fiyat = oge.toplam_hesapla()
+                self._oge_toplamini_guncelle(oge)
 
                 # Değişikliği bildir
-                index = self.createIndex(satir, 2)  # Adet kolonu
-                self.dataChanged.emit(index, index)
+                self._satir_degisti(satir)
                 self.sepet_degisti.emit()
             elif yeni_adet <= 0:
                 # Adet 0 veya negatif olursa ürünü sil
                 self.oge_sil(satir)
 
+    def _oge_toplamini_guncelle(self, oge: SepetOgesi):
+        """Öğe tutarını, metinlerini ve sepet toplamlarını farkla günceller"""
+        oge.toplam_fiyat = oge.toplam_hesapla()
+        oge.fiyat_metni = tutar_metni(oge.birim_fiyat)
+        oge.tutar_metni = tutar_metni(oge.toplam_fiyat)
+        self._toplamlar.satir_ayarla(id(oge), oge.toplam_fiyat, oge.kdv_orani)
+
+    def _satir_degisti(self, satir: int):
+        """Adet değişikliğini yalnızca Adet-Tutar hücrelerine bildirir"""
+        self.dataChanged.emit(self.createIndex(satir, ADET_KOLONU), self.createIndex(satir, TUTAR_KOLONU))
+
+    @staticmethod
+    def _gorunen_metinler(oge: SepetOgesi) -> tuple:
+        """Satırın tabloda görünen metinleri"""
+        return (oge.urun_adi, oge.adet, oge.fiyat_metni, oge.tutar_metni)
+
+    def _barkod_satiri(self, barkod: str, baslangic: int) -> Optional[int]:
+        """Barkodun başlangıç satırından itibaren ilk görüldüğü satır"""
+        for satir in range(baslangic, len(self.sepet_ogeleri)):
+            if self.sepet_ogeleri[satir].barkod == barkod:
+                return satir
+        return None
+
     def genel_toplam(self) -> Decimal:
-        """Sepet genel toplamını hesaplar"""
-        return sum(oge.toplam_hesapla() for oge in self.sepet_ogeleri)
+        """Sepet genel toplamını döndürür (satırlar dolaşılmaz)"""
+        return self._toplamlar.net_tutar
+
+    def toplam_ozeti(self) -> SepetToplamOzeti:
+        """Ödeme paneli ve fiş için toplamlar ve KDV dökümü"""
+        return self._toplamlar.ozet()
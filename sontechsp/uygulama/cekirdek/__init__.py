@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-15
+# Last Update: 2026-10-17
 # Module: cekirdek
 # Description: SONTECHSP çekirdek altyapı modülü entegrasyon noktası
 # Changelog:
 # - 0.1.0: İlk versiyon - Çekirdek modül entegrasyonu
+# - Metrik kaydı dışa aktarıldı
 
 """
 SONTECHSP Çekirdek Altyapı Modülü
@@ -21,6 +22,7 @@ from .kayit import KayitSistemi, kayit_sistemi_al
 from .hatalar import SontechHatasi, AlanHatasi, DogrulamaHatasi, EntegrasyonHatasi
 from .yetki import YetkiKontrolcu, yetki_kontrolcu_al
 from .oturum import OturumYoneticisi, oturum_yoneticisi_al, OturumBilgisi
+from .metrikler import MetrikKaydi, metrik_kaydi_al
 
 
 class CekirdekSistem:
@@ -208,6 +210,8 @@ __all__ = [
     'OturumYoneticisi',
     'oturum_yoneticisi_al',
     'OturumBilgisi',
+    'MetrikKaydi',
+    'metrik_kaydi_al',
     'SontechHatasi',
     'AlanHatasi',
     'DogrulamaHatasi',
@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2024-12-15
+# Last Update: 2026-10-17
 # Module: ayarlar
 # Description: SONTECHSP ayarlar yönetimi modülü
 # Changelog:
 # - 0.1.0: İlk sürüm, .env dosya okuma ve ayar yönetimi sistemi
+# - Örnek dosyaya fiş yazıcısı ayarları eklendi
+# - Örnek dosyaya merkez sunucu adresi ayarı eklendi
+# - Örnek dosyaya katalog replikası mağaza ayarı eklendi
+# - Örnek dosyaya metrik sunucusu ayarları eklendi
 
 """
 SONTECHSP Ayarlar Yönetimi Modülü
@@ -223,6 +227,20 @@ ORTAM=dev
 # Kargo Ayarları
 # KARGO_API_ANAHTARI=
 # KARGO_TEST_MODU=true
+
+# Fiş Yazıcısı Ayarları
+# FIS_YAZICI_CIHAZI=/dev/usb/lp0
+# FIS_KUYRUK_KLASORU=veri/fis_kuyrugu
+
+# Bağlantı İzleyici (tanımlı değilse VERITABANI_URL sunucusu yoklanır)
+# MERKEZ_SUNUCU_ADRESI=merkez.sunucu:5432
+
+# Katalog Replikası (terminalin mağazası; tanımlıysa ürün/barkod/stok yerel SQLite'a kopyalanır)
+# MAGAZA_ID=1
+
+# Metrik Sunucusu (Prometheus metin formatı, http://adres:port/metrics; 0 kapatır)
+# METRIK_SUNUCUSU_PORT=9464
+# METRIK_SUNUCUSU_ADRESI=127.0.0.1
 """
         
         try:
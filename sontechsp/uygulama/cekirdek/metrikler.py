@@ -0,0 +1,287 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: metrikler
+# Description: SONTECHSP metrik kaydı ve Prometheus metin formatı
+# Changelog:
+# - 0.1.0: İlk versiyon - Sayac, Gosterge, Histogram ve MetrikKaydi
+# - 0.1.0: NaN değerler Prometheus'un beklediği 'NaN' yazımıyla üretiliyor
+
+"""
+SONTECHSP Metrik Modülü
+
+Modüller sayaç, gösterge ve histogramlarını olayın gerçekleştiği yerde
+günceller; okuma (scrape) sırasında SQL çalıştırılmaz. Kendi bellek içi
+sayaçlarını zaten tutan bileşenler (ör. POS monitoring) kayda toplayıcı
+ekler; toplayıcı yalnızca bellekteki değerleri okumalıdır.
+
+metin_olustur() kaydı Prometheus metin formatında (0.0.4) üretir; yerel
+HTTP uç noktası pos.metrik_sunucusu modülündedir.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SONSUZ = float('inf')
+
+# Saniye cinsinden varsayılan histogram sınırları
+VARSAYILAN_SINIRLAR: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+@dataclass
+class MetrikOrnegi:
+    """Tek bir örnek satırı: ad soneki, etiketler ve değer"""
+    sonek: str
+    etiketler: Dict[str, str]
+    deger: float
+
+
+@dataclass
+class MetrikAilesi:
+    """Aynı adlı örneklerin HELP/TYPE başlığıyla birlikte grubu"""
+    ad: str
+    tur: str
+    aciklama: str
+    ornekler: List[MetrikOrnegi] = field(default_factory=list)
+
+
+Toplayici = Callable[[], Iterable[MetrikAilesi]]
+
+
+class _Metrik:
+    """Etiketli metriklerin ortak altyapısı"""
+
+    tur = ''
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Sequence[str] = ()):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiketler = tuple(etiketler)
+        self._kilit = threading.Lock()
+
+    def _anahtar(self, degerler: Tuple) -> Tuple[str, ...]:
+        if len(degerler) != len(self.etiketler):
+            raise ValueError(
+                f"{self.ad} için {len(self.etiketler)} etiket değeri beklenirken {len(degerler)} verildi"
+            )
+        return tuple(str(d) for d in degerler)
+
+    def _etiket_sozlugu(self, anahtar: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.etiketler, anahtar))
+
+    def aile(self) -> MetrikAilesi:
+        raise NotImplementedError
+
+
+class Sayac(_Metrik):
+    """Yalnızca artan sayaç"""
+
+    tur = 'counter'
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Sequence[str] = ()):
+        super().__init__(ad, aciklama, etiketler)
+        self._degerler: Dict[Tuple[str, ...], float] = {}
+
+    def arttir(self, *etiket_degerleri, miktar: float = 1) -> None:
+        """Sayacı artırır; etiket değerleri tanım sırasıyla verilir"""
+        if miktar < 0:
+            raise ValueError("Sayaç azaltılamaz")
+        anahtar = self._anahtar(etiket_degerleri)
+        with self._kilit:
+            self._degerler[anahtar] = self._degerler.get(anahtar, 0) + miktar
+
+    def deger(self, *etiket_degerleri) -> float:
+        """Güncel değeri döndürür"""
+        with self._kilit:
+            return self._degerler.get(self._anahtar(etiket_degerleri), 0)
+
+    def aile(self) -> MetrikAilesi:
+        with self._kilit:
+            degerler = list(self._degerler.items())
+        return MetrikAilesi(self.ad, self.tur, self.aciklama, [
+            MetrikOrnegi('', self._etiket_sozlugu(anahtar), deger) for anahtar, deger in degerler
+        ])
+
+
+class Gosterge(Sayac):
+    """Artıp azalabilen anlık değer"""
+
+    tur = 'gauge'
+
+    def ayarla(self, deger: float, *etiket_degerleri) -> None:
+        """Göstergeyi verilen değere ayarlar"""
+        anahtar = self._anahtar(etiket_degerleri)
+        with self._kilit:
+            self._degerler[anahtar] = deger
+
+    def arttir(self, *etiket_degerleri, miktar: float = 1) -> None:
+        """Göstergeyi artırır (negatif miktar azaltır)"""
+        anahtar = self._anahtar(etiket_degerleri)
+        with self._kilit:
+            self._degerler[anahtar] = self._degerler.get(anahtar, 0) + miktar
+
+
+class Histogram(_Metrik):
+    """Sabit sınırlı süre histogramı (saniye)"""
+
+    tur = 'histogram'
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Sequence[str] = (),
+                 sinirlar: Sequence[float] = VARSAYILAN_SINIRLAR):
+        super().__init__(ad, aciklama, etiketler)
+        self.sinirlar = tuple(sorted(sinirlar))
+        # anahtar -> [kova sayıları (son eleman +Inf), toplam]
+        self._degerler: Dict[Tuple[str, ...], list] = {}
+
+    def gozlemle(self, deger: float, *etiket_degerleri) -> None:
+        """Bir gözlemi ilgili kovaya yazar"""
+        anahtar = self._anahtar(etiket_degerleri)
+        indeks = 0
+        for sinir in self.sinirlar:
+            if deger <= sinir:
+                break
+            indeks += 1
+        with self._kilit:
+            kayit = self._degerler.get(anahtar)
+            if kayit is None:
+                kayit = self._degerler[anahtar] = [[0] * (len(self.sinirlar) + 1), 0.0]
+            kayit[0][indeks] += 1
+            kayit[1] += deger
+
+    def aile(self) -> MetrikAilesi:
+        with self._kilit:
+            degerler = [(anahtar, list(kovalar), toplam)
+                        for anahtar, (kovalar, toplam) in self._degerler.items()]
+        aile = MetrikAilesi(self.ad, self.tur, self.aciklama)
+        for anahtar, kovalar, toplam in degerler:
+            aile.ornekler.extend(histogram_ornekleri(
+                self._etiket_sozlugu(anahtar), self.sinirlar, kovalar, toplam
+            ))
+        return aile
+
+
+def histogram_ornekleri(etiketler: Dict[str, str], sinirlar: Sequence[float],
+                        kovalar: Sequence[int], toplam: float) -> List[MetrikOrnegi]:
+    """
+    Birikimsiz kova sayılarından _bucket/_sum/_count örneklerini üretir
+
+    kovalar, sinirlar'dan bir fazla elemanlıdır; son eleman +Inf kovasıdır.
+    """
+    ornekler = []
+    birikimli = 0
+    for sinir, adet in zip(list(sinirlar) + [_SONSUZ], kovalar):
+        birikimli += adet
+        ornekler.append(MetrikOrnegi('_bucket', {**etiketler, 'le': _sayi_yaz(sinir)}, birikimli))
+    ornekler.append(MetrikOrnegi('_sum', etiketler, toplam))
+    ornekler.append(MetrikOrnegi('_count', etiketler, birikimli))
+    return ornekler
+
+
+class MetrikKaydi:
+    """Metriklerin ve toplayıcıların süreç genelindeki kaydı"""
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._metrikler: Dict[str, _Metrik] = {}
+        self._toplayicilar: List[Toplayici] = []
+
+    def sayac(self, ad: str, aciklama: str, etiketler: Sequence[str] = ()) -> Sayac:
+        """Sayaç tanımlar; aynı adla tekrar çağrılırsa mevcut sayacı döndürür"""
+        return self._tanimla(Sayac, ad, aciklama, etiketler)
+
+    def gosterge(self, ad: str, aciklama: str, etiketler: Sequence[str] = ()) -> Gosterge:
+        """Gösterge tanımlar; aynı adla tekrar çağrılırsa mevcut göstergeyi döndürür"""
+        return self._tanimla(Gosterge, ad, aciklama, etiketler)
+
+    def histogram(self, ad: str, aciklama: str, etiketler: Sequence[str] = (),
+                  sinirlar: Sequence[float] = VARSAYILAN_SINIRLAR) -> Histogram:
+        """Histogram tanımlar; aynı adla tekrar çağrılırsa mevcut histogramı döndürür"""
+        return self._tanimla(Histogram, ad, aciklama, etiketler, sinirlar=sinirlar)
+
+    def toplayici_ekle(self, toplayici: Toplayici) -> None:
+        """Okuma sırasında çağrılacak toplayıcı ekler (SQL çalıştırmamalıdır)"""
+        with self._kilit:
+            if toplayici not in self._toplayicilar:
+                self._toplayicilar.append(toplayici)
+
+    def toplayici_cikar(self, toplayici: Toplayici) -> None:
+        """Toplayıcıyı kayıttan çıkarır"""
+        with self._kilit:
+            if toplayici in self._toplayicilar:
+                self._toplayicilar.remove(toplayici)
+
+    def aileler(self) -> List[MetrikAilesi]:
+        """Tüm metrik ailelerini toplar; hata veren toplayıcı atlanır"""
+        with self._kilit:
+            metrikler = list(self._metrikler.values())
+            toplayicilar = list(self._toplayicilar)
+
+        aileler = [metrik.aile() for metrik in metrikler]
+        for toplayici in toplayicilar:
+            try:
+                aileler.extend(toplayici())
+            except Exception as e:
+                logger.error(f"Metrik toplayıcı hatası: {str(e)}")
+        return aileler
+
+    def metin_olustur(self) -> str:
+        """Kaydı Prometheus metin formatında döndürür"""
+        satirlar = []
+        for aile in self.aileler():
+            satirlar.append(f"# HELP {aile.ad} {_aciklama_kacisla(aile.aciklama)}")
+            satirlar.append(f"# TYPE {aile.ad} {aile.tur}")
+            for ornek in aile.ornekler:
+                satirlar.append(
+                    f"{aile.ad}{ornek.sonek}{_etiketleri_yaz(ornek.etiketler)} {_sayi_yaz(ornek.deger)}"
+                )
+        return "\n".join(satirlar) + "\n"
+
+    def _tanimla(self, sinif, ad: str, aciklama: str, etiketler: Sequence[str], **ek):
+        with self._kilit:
+            mevcut = self._metrikler.get(ad)
+            if mevcut is not None:
+                if type(mevcut) is not sinif or mevcut.etiketler != tuple(etiketler):
+                    raise ValueError(f"{ad} metriği farklı tür veya etiketlerle tanımlı")
+                return mevcut
+            metrik = self._metrikler[ad] = sinif(ad, aciklama, etiketler, **ek)
+            return metrik
+
+
+def _aciklama_kacisla(metin: str) -> str:
+    return metin.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _etiket_kacisla(deger: str) -> str:
+    return deger.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiketleri_yaz(etiketler: Dict[str, str]) -> str:
+    if not etiketler:
+        return ''
+    return '{' + ','.join(f'{ad}="{_etiket_kacisla(str(deger))}"' for ad, deger in etiketler.items()) + '}'
+
+
+def _sayi_yaz(deger: float) -> str:
+    if math.isnan(deger):
+        return 'NaN'
+    if deger == _SONSUZ:
+        return '+Inf'
+    if deger == -_SONSUZ:
+        return '-Inf'
+    if isinstance(deger, int) or float(deger).is_integer():
+        return str(int(deger))
+    return repr(float(deger))
+
+
+_metrik_kaydi = MetrikKaydi()
+
+
+def metrik_kaydi_al() -> MetrikKaydi:
+    """Süreç genelindeki metrik kaydını döndürür"""
+    return _metrik_kaydi
@@ -1,15 +1,18 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: ebelge.servisler.ebelge_servisi
 # Description: E-belge ana servis sınıfı
 # Changelog:
 # - İlk versiyon: EBelgeServisi sınıfı oluşturuldu
+# - Gönderim sayaçları ve süre histogramı metrik kaydına yazılıyor
 
 import json
 import logging
+import time
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
+from ....cekirdek.metrikler import metrik_kaydi_al
 from ..dto import EBelgeOlusturDTO, EBelgeSonucDTO, EBelgeGonderDTO
 from ..depolar.ebelge_deposu import EBelgeDeposu
 from ..saglayici_fabrikasi import SaglayiciFabrikasi
@@ -18,6 +21,16 @@ from ..hatalar import DogrulamaHatasi, EntegrasyonHatasi, JSONHatasi
 
 logger = logging.getLogger(__name__)
 
+_OLUSTURULAN_BELGELER = metrik_kaydi_al().sayac(
+    'sontechsp_ebelge_olusturulan_total', 'Oluşturulan e-belge çıkış kayıtları', ('belge_turu',)
+)
+_GONDERIMLER = metrik_kaydi_al().sayac(
+    'sontechsp_ebelge_gonderim_total', 'Entegratöre e-belge gönderim denemeleri', ('sonuc',)
+)
+_GONDERIM_SURELERI = metrik_kaydi_al().histogram(
+    'sontechsp_ebelge_gonderim_sure_saniye', 'Tek e-belge gönderim süresi (saniye)'
+)
+
 
 class EBelgeServisi:
     """E-belge ana servis sınıfı"""
@@ -37,6 +50,7 @@ class EBelgeServisi:
         try:
             # Çıkış kaydı oluştur
             cikis_id = self.depo.cikis_kaydi_olustur(dto)
+            _OLUSTURULAN_BELGELER.arttir(dto.belge_turu)
             logger.info(f"E-belge çıkış kaydı oluşturuldu: {cikis_id}")
             return cikis_id
             
@@ -59,6 +73,8 @@ class EBelgeServisi:
         gonderilen_ids = []
         
         for kayit in bekleyen_kayitlar:
+            baslangic = time.perf_counter()
+            basarili = False
             try:
                 # Durumu GONDERILIYOR olarak güncelle
                 self.depo.durum_guncelle(
@@ -89,6 +105,7 @@ class EBelgeServisi:
                         sonuc.dis_belge_no
                     )
                     gonderilen_ids.append(kayit.id)
+                    basarili = True
                     logger.info(f"Belge başarıyla gönderildi: {kayit.id}")
                 else:
                     # Başarısız gönderim
@@ -97,6 +114,9 @@ class EBelgeServisi:
             except Exception as e:
                 logger.error(f"Belge gönderim hatası: {kayit.id} - {str(e)}")
                 self._handle_failed_send(kayit.id, str(e))
+            
+            _GONDERIMLER.arttir('basarili' if basarili else 'basarisiz')
+            _GONDERIM_SURELERI.gozlemle(time.perf_counter() - baslangic)
         
         logger.info(f"Toplam {len(gonderilen_ids)} belge başarıyla gönderildi")
         return gonderilen_ids
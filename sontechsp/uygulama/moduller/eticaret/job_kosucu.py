@@ -1,10 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: eticaret.job_kosucu
 # Description: E-ticaret iş kuyruğu koşucusu
 # Changelog:
 # - İlk oluşturma
 # - JobKoşucusu FIFO iş işleme eklendi
+# - İş sayaçları ve süre histogramı metrik kaydına yazılıyor
 
 """
 E-ticaret iş kuyruğu koşucusu.
@@ -13,10 +14,12 @@ Asenkron işleri FIFO sırasında işler ve hata yönetimi sağlar.
 
 import json
 import logging
+import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Callable
 from sqlalchemy.orm import Session
 
+from ...cekirdek.metrikler import metrik_kaydi_al
 from .depolar import JobDeposu, EticaretDeposu
 from .baglanti_fabrikasi import BaglantiFabrikasi
 from .dto import JobDTO, JobSonucDTO, StokGuncelleDTO, FiyatGuncelleDTO
@@ -27,6 +30,16 @@ from ...veritabani.modeller.eticaret import EticaretIsKuyrugu
 
 logger = logging.getLogger(__name__)
 
+_EKLENEN_ISLER = metrik_kaydi_al().sayac(
+    'sontechsp_eticaret_is_eklenen_total', 'Kuyruğa eklenen e-ticaret işleri', ('tur',)
+)
+_ISLENEN_ISLER = metrik_kaydi_al().sayac(
+    'sontechsp_eticaret_is_islenen_total', 'İşlenen e-ticaret işleri', ('tur', 'sonuc')
+)
+_IS_SURELERI = metrik_kaydi_al().histogram(
+    'sontechsp_eticaret_is_sure_saniye', 'E-ticaret iş işleme süreleri (saniye)', ('tur',)
+)
+
 
 class JobKosucu:
     """
@@ -138,6 +151,7 @@ class JobKosucu:
             
             job_id = self.job_deposu.job_ekle(job_dto)
             self.db.commit()
+            _EKLENEN_ISLER.arttir(job_turu)
             
             logger.info(f"Yeni iş eklendi - ID: {job_id}, Tür: {job_turu}, "
                        f"Mağaza: {magaza_hesabi_id}")
@@ -163,7 +177,14 @@ class JobKosucu:
             İş sonucu
         """
         logger.debug(f"İş işleniyor - ID: {job.id}, Tür: {job.tur}")
-        
+        baslangic = time.perf_counter()
+        sonuc = self._job_isle_ve_kaydet(job)
+        _ISLENEN_ISLER.arttir(job.tur, 'basarili' if sonuc.basarili else 'basarisiz')
+        _IS_SURELERI.gozlemle(time.perf_counter() - baslangic, job.tur)
+        return sonuc
+    
+    def _job_isle_ve_kaydet(self, job: EticaretIsKuyrugu) -> JobSonucDTO:
+        """İşleyiciyi çağırır ve sonucu kuyruğa yazar"""
         try:
             # İş türüne göre işleyici çağır
             if job.tur not in self._job_isleyicileri:
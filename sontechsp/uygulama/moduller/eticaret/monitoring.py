@@ -1,10 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: eticaret.monitoring
 # Description: E-ticaret entegrasyon monitoring ve hata yönetimi
 # Changelog:
 # - İlk oluşturma
 # - HataYoneticisi ve MonitoringServisi eklendi
+# - Hata sayacı metrik kaydına (Prometheus dışa aktarımı) yazılıyor
 
 """
 E-ticaret entegrasyon monitoring ve hata yönetimi.
@@ -19,12 +20,18 @@ from dataclasses import dataclass, field
 from enum import Enum
 from sqlalchemy.orm import Session
 
+from ...cekirdek.metrikler import metrik_kaydi_al
 from .depolar import JobDeposu
 from .sabitler import JobDurumlari, JobTurleri
 from .hatalar import EntegrasyonHatasi
 
 logger = logging.getLogger(__name__)
 
+_HATALAR = metrik_kaydi_al().sayac(
+    'sontechsp_eticaret_hata_total', 'HataYoneticisi ile kaydedilen e-ticaret hataları',
+    ('seviye', 'platform')
+)
+
 
 class HataSeviyesi(str, Enum):
     """Hata seviyeleri"""
@@ -118,6 +125,7 @@ class HataYoneticisi:
         anahtar = f"{seviye.value}_{kaynak or 'unknown'}"
         self.hata_sayaclari[anahtar] = self.hata_sayaclari.get(anahtar, 0) + 1
         self.son_hatalar[anahtar] = datetime.now()
+        _HATALAR.arttir(seviye.value, platform or '')
         
         # Log seviyesine göre kaydet
         log_mesaji = f"[{kaynak or 'UNKNOWN'}] {mesaj}"
@@ -1,11 +1,18 @@
-# Version: 0.1.2
-# Last Update: 2024-12-19
+# Version: 0.1.4
+# Last Update: 2026-10-17
 # Module: pos.arayuzler
 # Description: POS modülü temel arayüzleri (interfaces)
 # Changelog:
 # - İlk oluşturma
 # - Duplicate method düzeltmesi ve type hint iyileştirmeleri
 # - Import düzenlemesi ve kod kalitesi iyileştirmeleri
+# - IStokService'e sepet bazlı toplu stok düşümü eklendi
+# - IStokService'e sepet bazlı toplu stok kontrolü eklendi, toplu düşüm mağaza alıyor
+# - ISepetRepository'ye sepet_durumu eklendi
+# - Artımlı sepet toplamları (sepet_toplamlari, satır KDV oranı) eklendi
+# - Tek transaction satış tamamlama: session parametreleri, giden olay (outbox) arayüzü
+# - Offline kuyruk toplu sahiplenme/onay metodları eklendi
+# - Offline kuyruk sahiplenme bırakma metodu eklendi
 
 """
 POS Modülü Temel Arayüzleri
@@ -20,6 +27,12 @@ from decimal import Decimal
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import (
+    SepetToplamlari, SepetToplamOzeti, tutar_yuvarla
+)
+
 
 # Enum tanımları
 class SepetDurum(Enum):
@@ -76,6 +89,51 @@ class StokKilitTuru(Enum):
     TRANSFER = "transfer"
 
 
+class GidenOlayHedef(Enum):
+    """Satış sonrası yan etkilerin gittiği sistemler (outbox hedefleri)"""
+
+    SADAKAT = "sadakat"
+    EBELGE = "ebelge"
+    ETICARET = "eticaret"
+
+
+class GidenOlayDurum(Enum):
+    """Giden olay (outbox) durumları"""
+
+    BEKLIYOR = "bekliyor"
+    ISLENIYOR = "isleniyor"
+    GONDERILDI = "gonderildi"
+    HATA = "hata"
+
+
+def sepet_toplam_ozeti(sepet: Dict[str, Any]) -> SepetToplamOzeti:
+    """
+    sepet_getir sözlüğünün toplamlarını döndürür
+
+    Sözlükte repository'nin hazırladığı 'toplamlar' varsa o kullanılır.
+    Yoksa (eski biçim) tutarlar sözlük alanlarından alınır; KDV dökümü
+    satırlardan kurulur ve satırlar toplamla tutarsızsa verilmez.
+    """
+    toplamlar = sepet.get('toplamlar')
+    if toplamlar is not None:
+        return toplamlar
+
+    brut = tutar_yuvarla(sepet['toplam_tutar'])
+    indirim = tutar_yuvarla(sepet.get('indirim_tutari') or 0)
+    net = tutar_yuvarla(sepet.get('net_tutar', brut - indirim))
+    satirlar = sepet.get('satirlar') or []
+    if any('toplam_tutar' not in satir for satir in satirlar):
+        return SepetToplamOzeti(brut_toplam=brut, indirim_tutari=indirim, net_tutar=net)
+
+    satirlardan = SepetToplamlari.satirlardan(
+        ((sira, satir['toplam_tutar'], satir.get('kdv_orani')) for sira, satir in enumerate(satirlar)),
+        indirim
+    )
+    if satirlardan.brut_toplam == brut and satirlardan.net_tutar == net:
+        return satirlardan.ozet()
+    return SepetToplamOzeti(brut_toplam=brut, indirim_tutari=indirim, net_tutar=net)
+
+
 # Repository Arayüzleri
 class ISepetRepository(ABC):
     """Sepet repository arayüzü"""
@@ -91,7 +149,8 @@ class ISepetRepository(ABC):
         pass
 
     @abstractmethod
-    def sepet_satiri_ekle(self, sepet_id: int, urun_id: int, barkod: str, adet: int, birim_fiyat: Decimal) -> int:
+    def sepet_satiri_ekle(self, sepet_id: int, urun_id: int, barkod: str, adet: int, birim_fiyat: Decimal,
+                          kdv_orani: Optional[Decimal] = None) -> int:
         """Sepete satır ekler"""
         pass
 
@@ -110,13 +169,30 @@ class ISepetRepository(ABC):
         """Sepeti boşaltır"""
         pass
 
+    @abstractmethod
+    def sepet_durum_guncelle(self, sepet_id: int, yeni_durum: SepetDurum,
+                             session: Optional[Session] = None) -> bool:
+        """Sepet durumunu günceller (session verilirse dış transaction'a katılır)"""
+        pass
+
+    def sepet_durumu(self, sepet_id: int) -> Optional[str]:
+        """Sepet durumunu getirir (sepet yoksa None); varsayılan sepet_getir kullanır"""
+        sepet = self.sepet_getir(sepet_id)
+        return sepet['durum'] if sepet else None
+
+    def sepet_toplamlari(self, sepet_id: int) -> Optional[SepetToplamOzeti]:
+        """Sepet toplamları ve KDV dökümü (sepet yoksa None); varsayılan sepet_getir kullanır"""
+        sepet = self.sepet_getir(sepet_id)
+        return sepet_toplam_ozeti(sepet) if sepet else None
+
 
 class ISatisRepository(ABC):
     """Satış repository arayüzü"""
 
     @abstractmethod
-    def satis_olustur(self, sepet_id: int, terminal_id: int, kasiyer_id: int, toplam_tutar: Decimal) -> int:
-        """Yeni satış kaydı oluşturur"""
+    def satis_olustur(self, sepet_id: int, terminal_id: int, kasiyer_id: int, toplam_tutar: Decimal,
+                      session: Optional[Session] = None) -> int:
+        """Yeni satış kaydı oluşturur (session verilirse dış transaction'a katılır)"""
         pass
 
     @abstractmethod
@@ -126,14 +202,39 @@ class ISatisRepository(ABC):
 
     @abstractmethod
     def satis_odeme_ekle(
-        self, satis_id: int, odeme_turu: OdemeTuru, tutar: Decimal, referans_no: Optional[str] = None
+        self, satis_id: int, odeme_turu: OdemeTuru, tutar: Decimal, referans_no: Optional[str] = None,
+        session: Optional[Session] = None
     ) -> int:
-        """Satışa ödeme ekler"""
+        """Satışa ödeme ekler (session verilirse dış transaction'a katılır)"""
+        pass
+
+    @abstractmethod
+    def satis_tamamla(self, satis_id: int, fis_no: str, session: Optional[Session] = None) -> bool:
+        """Satışı tamamlar (session verilirse dış transaction'a katılır)"""
+        pass
+
+
+class IGidenOlayRepository(ABC):
+    """Giden olay (outbox) repository arayüzü"""
+
+    @abstractmethod
+    def olaylari_ekle(self, olaylar: List[Dict[str, Any]], session: Optional[Session] = None) -> int:
+        """Olayları satışla aynı transaction'da kuyruğa yazar; eklenen sayıyı döndürür"""
         pass
 
     @abstractmethod
-    def satis_tamamla(self, satis_id: int, fis_no: str) -> bool:
-        """Satışı tamamlar"""
+    def bekleyenleri_al(self, hedef: GidenOlayHedef, limit: int = 50) -> List[Dict[str, Any]]:
+        """Hedefin bekleyen olaylarını işleniyor olarak işaretleyip döndürür"""
+        pass
+
+    @abstractmethod
+    def gonderildi_isaretle(self, olay_idleri: List[int]) -> int:
+        """Olayları gönderildi olarak işaretler"""
+        pass
+
+    @abstractmethod
+    def hata_isaretle(self, olay_id: int, hata_mesaji: str) -> bool:
+        """Olayı hata mesajıyla yeniden denenmek üzere işaretler"""
         pass
 
 
@@ -217,6 +318,32 @@ class IOfflineKuyrukRepository(ABC):
         """Hata durumundaki kuyrukları getirir"""
         pass
 
+    @abstractmethod
+    def bekleyenleri_sahiplen(self, limit: int = 50, terminal_id: Optional[int] = None,
+                              son_deneme_oncesi: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Bekleyen kayıtları tek ifadede ISLENIYOR yapıp döndürür"""
+        pass
+
+    @abstractmethod
+    def toplu_tamamla(self, kuyruk_idleri: List[int]) -> int:
+        """Kayıtları tek UPDATE ile tamamlandı olarak işaretler"""
+        pass
+
+    @abstractmethod
+    def toplu_deneme_artir(self, kuyruk_idleri: List[int], hata_mesaji: str) -> int:
+        """Kayıtların deneme sayısını tek UPDATE ile artırır"""
+        pass
+
+    @abstractmethod
+    def sahipsiz_islemleri_geri_al(self, zaman_asimi_saniye: int) -> int:
+        """Yarıda kalmış sahiplenmeleri BEKLEMEDE'ye döndürür"""
+        pass
+
+    @abstractmethod
+    def sahiplenmeyi_birak(self, kuyruk_idleri: List[int]) -> int:
+        """Gönderilmeyen sahiplenilmiş kayıtları deneme saymadan BEKLEMEDE'ye döndürür"""
+        pass
+
 
 # Service Arayüzleri
 class ISepetService(ABC):
@@ -366,6 +493,33 @@ class IStokService(ABC):
         """Stok düşer"""
         pass
 
+    def toplu_stok_kontrol(self, adetler: Dict[int, int], magaza_id: int,
+                           depo_id: Optional[int] = None) -> Dict[int, bool]:
+        """
+        Sepetteki ürünlerin stok yeterliliğini toplu kontrol eder
+
+        Varsayılan uygulama ürün ürün stok_kontrol çağırır; tek sorguda
+        okuyabilen servisler bu metodu ezer.
+        """
+        return {urun_id: self.stok_kontrol(urun_id, adet) for urun_id, adet in adetler.items()}
+
+    def toplu_stok_dusur(self, satirlar: List[Dict[str, Any]],
+                         referans_no: Optional[str] = None,
+                         magaza_id: Optional[int] = None,
+                         depo_id: Optional[int] = None,
+                         session: Optional[Session] = None) -> bool:
+        """
+        Sepet satırlarının stoğunu toplu düşer
+
+        Varsayılan uygulama satır satır stok_dusur çağırır ve session'ı
+        kullanamaz; tek transaction destekleyen servisler bu metodu ezer ve
+        session verilirse düşümü çağıranın transaction'ına katar.
+        """
+        basarili = True
+        for satir in satirlar:
+            basarili = self.stok_dusur(satir['urun_id'], satir['adet']) and basarili
+        return basarili
+
     @abstractmethod
     def stok_artir(self, urun_id: int, adet: int) -> bool:
         """Stok artırır (iade için)"""
@@ -0,0 +1,216 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.baglanti_izleyici
+# Description: Merkez sunucu bağlantısını arka planda izleyen bileşen
+# Changelog:
+# - İlk oluşturma
+
+"""
+Bağlantı İzleyici
+
+Merkez sunucuya (veritabanı/API) erişim arka plan thread'inde düzenli
+aralıklarla yoklanır; sonuç bir bayrakta tutulur. Satış hattı ağ isteği
+yapmaz, yalnızca bu bayrağı okur.
+
+- Yoklama varsayılan olarak merkez uç noktasına TCP bağlantısıdır. Uç
+  nokta MERKEZ_SUNUCU_ADRESI ayarından (host:port) okunur; tanımlı değilse
+  VERITABANI_URL'deki sunucu kullanılır.
+- Bağlantı yokken bekleme her başarısız yoklamada ikiye katlanır
+  (azami_bekleme ile sınırlı); bağlantı gelince normal aralığa döner.
+- Durum değiştiğinde dinleyiciler çağrılır. Dinleyiciler izleyici
+  thread'inde çalışır; UI tarafı Qt sinyaliyle ana thread'e aktarmalıdır.
+"""
+
+import atexit
+import logging
+import socket
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sontechsp.uygulama.moduller.pos.monitoring import get_pos_monitoring
+from sontechsp.uygulama.cekirdek.ayarlar import ayar_al
+
+# Merkez sunucuya erişilebiliyorsa True döndüren fonksiyon; hata fırlatması erişim yok demektir
+Yoklayici = Callable[[], bool]
+DurumDinleyicisi = Callable[[bool], None]
+
+VARSAYILAN_PORT = 5432
+_SEMA_PORTLARI = {'http': 80, 'https': 443}
+
+
+def merkez_adresi_coz(adres: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Yoklanacak merkez uç noktasını çözer
+
+    Args:
+        adres: host:port (None ise MERKEZ_SUNUCU_ADRESI, o da yoksa VERITABANI_URL)
+
+    Returns:
+        Tuple[str, int]: (host, port)
+    """
+    adres = adres or ayar_al('MERKEZ_SUNUCU_ADRESI')
+    if adres:
+        parca = urlsplit(adres if '//' in adres else f"//{adres}")
+    else:
+        parca = urlsplit(ayar_al('VERITABANI_URL', 'postgresql://localhost:5432/sontechsp'))
+    return (parca.hostname or 'localhost',
+            parca.port or _SEMA_PORTLARI.get(parca.scheme, VARSAYILAN_PORT))
+
+
+def tcp_yoklayici(host: str, port: int, zaman_asimi: float = 3.0) -> Yoklayici:
+    """Uç noktaya TCP bağlantısı açılabiliyorsa True döndüren yoklayıcı"""
+    def yokla() -> bool:
+        with socket.create_connection((host, port), timeout=zaman_asimi):
+            return True
+    return yokla
+
+
+class BaglantiIzleyici:
+    """
+    Merkez sunucu bağlantı izleyicisi
+
+    cevrimici özelliği kilitsiz okunur; ilk yoklama tamamlanana kadar False'tur.
+    """
+
+    def __init__(self, yoklayici: Yoklayici,
+                 aralik: float = 15.0,
+                 ilk_bekleme: float = 1.0,
+                 azami_bekleme: float = 60.0,
+                 arka_planda: bool = True):
+        """
+        Args:
+            yoklayici: Bağlantıyı bir kez yoklayan fonksiyon
+            aralik: Bağlantı varken yoklama aralığı (saniye)
+            ilk_bekleme: Bağlantı koptuktan sonraki ilk yoklama beklemesi (saniye)
+            azami_bekleme: Bağlantı yokken bekleme üst sınırı (saniye)
+            arka_planda: False ise yalnızca simdi_kontrol_et çağrısında yoklanır
+        """
+        self._yoklayici = yoklayici
+        self._aralik = aralik
+        self._ilk_bekleme = ilk_bekleme
+        self._azami_bekleme = azami_bekleme
+        self._logger = logging.getLogger(__name__)
+        self._monitoring = get_pos_monitoring()
+
+        self._cevrimici = False
+        self._son_kontrol: Optional[float] = None
+        self._dinleyiciler: List[DurumDinleyicisi] = []
+        self._kilit = threading.Lock()
+        self._yoklama_kilidi = threading.Lock()
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+
+        self._izleyici: Optional[threading.Thread] = None
+        if arka_planda:
+            self._izleyici = threading.Thread(
+                target=self._izleme_dongusu, name="baglanti-izleyici", daemon=True
+            )
+            self._izleyici.start()
+
+    @property
+    def cevrimici(self) -> bool:
+        """Son yoklamanın sonucu"""
+        return self._cevrimici
+
+    @property
+    def son_kontrol(self) -> Optional[float]:
+        """Son yoklamanın time.monotonic() zamanı (hiç yoklanmadıysa None)"""
+        return self._son_kontrol
+
+    def dinleyici_ekle(self, dinleyici: DurumDinleyicisi) -> None:
+        """Bağlantı durumu değiştiğinde yeni durumla çağrılacak dinleyici ekler"""
+        with self._kilit:
+            self._dinleyiciler.append(dinleyici)
+
+    def simdi_kontrol_et(self) -> bool:
+        """
+        Bağlantıyı çağıran thread'de hemen yoklar ve durumu günceller
+
+        Returns:
+            bool: Güncel bağlantı durumu
+        """
+        with self._yoklama_kilidi:
+            baslangic = time.perf_counter()
+            try:
+                durum = bool(self._yoklayici())
+                hata = None
+            except Exception as e:
+                durum = False
+                hata = str(e)
+            self._monitoring.sure_kaydet(
+                "baglanti_yoklama", time.perf_counter() - baslangic, basarili=durum
+            )
+            self._son_kontrol = time.monotonic()
+            onceki = self._cevrimici
+            self._cevrimici = durum
+
+        if durum != onceki:
+            if durum:
+                self._logger.info("Merkez sunucu bağlantısı kuruldu")
+            else:
+                self._logger.warning(f"Merkez sunucu bağlantısı yok: {hata or 'yoklama başarısız'}")
+            self._durum_bildir(durum)
+        return durum
+
+    def tetikle(self) -> None:
+        """Arka plan yoklamasını beklemeden hemen çalıştırır (ör. ağ hatası görüldüğünde)"""
+        self._uyandir.set()
+
+    def kapat(self, zaman_asimi: float = 5.0) -> None:
+        """Arka plan thread'ini durdurur"""
+        self._durdur.set()
+        self._uyandir.set()
+        if self._izleyici is not None and self._izleyici.is_alive():
+            self._izleyici.join(timeout=zaman_asimi)
+
+    # Yardımcılar
+
+    def _izleme_dongusu(self) -> None:
+        """
+        Arka plan yoklaması
+
+        Bağlantı varken aralik kadar beklenir. Bağlantı yokken bekleme
+        ilk_bekleme'den başlayıp her başarısız yoklamada ikiye katlanır.
+        """
+        bekleme = self._ilk_bekleme
+        while not self._durdur.is_set():
+            self._uyandir.clear()
+            if self.simdi_kontrol_et():
+                bekleme = self._ilk_bekleme
+                sonraki = self._aralik
+            else:
+                sonraki = bekleme
+                bekleme = min(max(bekleme, 0.1) * 2, self._azami_bekleme)
+
+            self._uyandir.wait(sonraki)
+
+    def _durum_bildir(self, durum: bool) -> None:
+        with self._kilit:
+            dinleyiciler = list(self._dinleyiciler)
+        for dinleyici in dinleyiciler:
+            try:
+                dinleyici(durum)
+            except Exception as e:
+                self._logger.error(f"Bağlantı durum dinleyicisi hatası: {str(e)}")
+
+
+_baglanti_izleyici: Optional[BaglantiIzleyici] = None
+_baglanti_izleyici_kilidi = threading.Lock()
+
+
+def baglanti_izleyici_al() -> BaglantiIzleyici:
+    """
+    Süreç genelinde tek bağlantı izleyicisini döndürür
+
+    İlk çağrıda merkez_adresi_coz() uç noktasını TCP ile yoklayan izleyici
+    oluşturulur ve arka planda başlatılır.
+    """
+    global _baglanti_izleyici
+    with _baglanti_izleyici_kilidi:
+        if _baglanti_izleyici is None:
+            host, port = merkez_adresi_coz()
+            _baglanti_izleyici = BaglantiIzleyici(tcp_yoklayici(host, port))
+            atexit.register(_baglanti_izleyici.kapat)
+        return _baglanti_izleyici
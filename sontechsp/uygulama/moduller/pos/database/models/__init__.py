@@ -1,10 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.database.models
 # Description: POS veri modelleri
 # Changelog:
 # - İlk oluşturma
 # - Sepet ve SepetSatiri modelleri eklendi
+# - GidenOlay (outbox) modeli eklendi
+# - IadeEdilebilirSatir (iade defteri) modeli eklendi
+# - GunSonuToplami (X/Z raporu toplamları) modeli eklendi
 
 """
 POS Veri Modelleri
@@ -14,11 +17,15 @@ Bu modül POS sisteminin SQLAlchemy veri modellerini içerir.
 
 from .sepet import Sepet, SepetSatiri, sepet_validasyon, sepet_satiri_validasyon
 from .satis import Satis, SatisOdeme, satis_validasyon, satis_odeme_validasyon
-from .iade import Iade, IadeSatiri, iade_validasyon, iade_satiri_validasyon
+from .iade import (
+    Iade, IadeSatiri, IadeEdilebilirSatir, iade_validasyon, iade_satiri_validasyon
+)
 from .offline_kuyruk import (
     OfflineKuyruk, offline_kuyruk_validasyon,
     satis_kuyruk_verisi_olustur, iade_kuyruk_verisi_olustur, stok_dusumu_kuyruk_verisi_olustur
 )
+from .giden_olay import GidenOlay
+from .gun_sonu import GunSonuToplami
 
 __all__ = [
     'Sepet',
@@ -31,11 +38,14 @@ __all__ = [
     'satis_odeme_validasyon',
     'Iade',
     'IadeSatiri',
+    'IadeEdilebilirSatir',
     'iade_validasyon',
     'iade_satiri_validasyon',
     'OfflineKuyruk',
     'offline_kuyruk_validasyon',
     'satis_kuyruk_verisi_olustur',
     'iade_kuyruk_verisi_olustur',
-    'stok_dusumu_kuyruk_verisi_olustur'
+    'stok_dusumu_kuyruk_verisi_olustur',
+    'GidenOlay',
+    'GunSonuToplami'
 ]
\ No newline at end of file
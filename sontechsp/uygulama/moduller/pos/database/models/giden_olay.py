@@ -0,0 +1,102 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.database.models.giden_olay
+# Description: POS giden olay (outbox) veri modeli
+# Changelog:
+# - İlk oluşturma
+
+"""
+POS Giden Olay Veri Modeli
+
+Satış tamamlandığında sadakat, e-belge ve e-ticaret sistemlerine gidecek
+yan etkiler satışla aynı transaction'da bu tabloya yazılır (outbox).
+Satış commit edilmezse olay da oluşmaz; hedef sistemler olayları kendi
+aktarıcılarıyla okur ve gönderildi olarak işaretler.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import (
+    Integer, String, ForeignKey, Enum as SQLEnum, DateTime, Text, JSON,
+    Index, CheckConstraint
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sontechsp.uygulama.veritabani.taban import Taban
+from sontechsp.uygulama.moduller.pos.arayuzler import GidenOlayHedef, GidenOlayDurum
+
+
+class GidenOlay(Taban):
+    """
+    Giden olay (outbox) modeli
+
+    Her kayıt bir satışın tek bir hedef sisteme gidecek olayıdır.
+    """
+
+    __tablename__ = 'pos_giden_olaylar'
+
+    hedef: Mapped[GidenOlayHedef] = mapped_column(
+        SQLEnum(GidenOlayHedef),
+        nullable=False,
+        comment="Hedef sistem (sadakat, e-belge, e-ticaret)"
+    )
+
+    olay_turu: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Olay türü (ör. satis_tamamlandi)"
+    )
+
+    satis_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey('pos_satis.id'),
+        nullable=True,
+        comment="Olayı doğuran satış kimliği"
+    )
+
+    veri: Mapped[Dict[str, Any]] = mapped_column(
+        JSON,
+        nullable=False,
+        comment="Olay verisi (JSON formatında)"
+    )
+
+    durum: Mapped[GidenOlayDurum] = mapped_column(
+        SQLEnum(GidenOlayDurum),
+        nullable=False,
+        default=GidenOlayDurum.BEKLIYOR,
+        comment="Olay durumu"
+    )
+
+    deneme_sayisi: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Gönderim deneme sayısı"
+    )
+
+    son_hata: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Son gönderim hatası"
+    )
+
+    islenme_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Gönderildi olarak işaretlenme tarihi"
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            'deneme_sayisi >= 0',
+            name='ck_giden_olay_deneme_sayisi_pozitif'
+        ),
+        # Aktarıcılar hedef başına bekleyenleri id sırasıyla okur
+        Index('ix_giden_olay_hedef_durum_id', 'hedef', 'durum', 'id'),
+        Index('ix_giden_olay_satis_id', 'satis_id'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<GidenOlay(id={self.id}, hedef={self.hedef.value if self.hedef else None}, "
+            f"olay_turu='{self.olay_turu}', durum={self.durum.value if self.durum else None})>"
+        )
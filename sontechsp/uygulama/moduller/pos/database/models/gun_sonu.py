@@ -0,0 +1,144 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.database.models.gun_sonu
+# Description: POS gün sonu (X/Z raporu) toplam modeli
+# Changelog:
+# - İlk oluşturma
+
+"""
+POS Gün Sonu Toplam Modeli
+
+X ve Z raporları satışları taramak yerine bu tablodaki hazır toplamları
+okur. Her kayıt bir gün, terminal ve kasiyer vardiyası için bir boyutun
+(genel toplam, ödeme türü veya KDV oranı) toplamıdır; satış tamamlama ve
+iptal transaction'ları kayıtları artımlı günceller.
+"""
+
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import (
+    Integer, String, Numeric, Date, Index, CheckConstraint, UniqueConstraint
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sontechsp.uygulama.veritabani.taban import Taban
+
+# Toplam boyutları
+BOYUT_GENEL = 'GENEL'
+BOYUT_ODEME = 'ODEME'
+BOYUT_KDV = 'KDV'
+
+
+class GunSonuToplami(Taban):
+    """
+    Gün sonu toplam modeli
+
+    (tarih, terminal_id, kasiyer_id, boyut, anahtar) başına tek kayıt.
+    GENEL boyutunun anahtarı boştur; ODEME boyutunda ödeme türü, KDV
+    boyutunda oran ('18.00') anahtardır.
+    """
+
+    __tablename__ = 'pos_gun_sonu_toplami'
+
+    tarih: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="Satış günü"
+    )
+
+    terminal_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Terminal kimliği"
+    )
+
+    kasiyer_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Kasiyer kimliği (vardiya)"
+    )
+
+    boyut: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        comment="Toplam boyutu (GENEL, ODEME, KDV)"
+    )
+
+    anahtar: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default='',
+        comment="Boyut anahtarı (ödeme türü veya KDV oranı)"
+    )
+
+    islem_sayisi: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Satış veya ödeme sayısı"
+    )
+
+    brut_tutar: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="İndirim öncesi tutar"
+    )
+
+    indirim_tutari: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="İndirim tutarı"
+    )
+
+    net_tutar: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="Net tutar (ödeme boyutunda tahsilat)"
+    )
+
+    matrah: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="KDV matrahı"
+    )
+
+    kdv_tutari: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="KDV tutarı"
+    )
+
+    iptal_sayisi: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Tamamlandıktan sonra iptal edilen satış sayısı"
+    )
+
+    iptal_tutari: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal('0.00'),
+        comment="İptal edilen satışların net tutarı"
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            'tarih', 'terminal_id', 'kasiyer_id', 'boyut', 'anahtar',
+            name='uq_gun_sonu_toplami_anahtar'
+        ),
+        CheckConstraint(
+            "boyut IN ('GENEL', 'ODEME', 'KDV')",
+            name='ck_gun_sonu_toplami_boyut'
+        ),
+        Index('ix_gun_sonu_toplami_tarih_terminal', 'tarih', 'terminal_id'),
+    )
+
+    def __repr__(self) -> str:
+        return (f"<GunSonuToplami(tarih={self.tarih}, terminal_id={self.terminal_id}, "
+                f"kasiyer_id={self.kasiyer_id}, boyut={self.boyut}, anahtar={self.anahtar})>")
@@ -1,14 +1,16 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.database.models.iade
 # Description: POS İade ve IadeSatiri veri modelleri
 # Changelog:
 # - İlk oluşturma
+# - İade edilebilir adet defteri (IadeEdilebilirSatir) eklendi
 
 """
 POS İade Veri Modelleri
 
-Bu modül POS sisteminin iade ve iade satırı veri modellerini içerir.
+Bu modül POS sisteminin iade ve iade satırı veri modellerini ve satış
+satırı başına iade edilebilir adet defterini içerir.
 """
 
 from decimal import Decimal
@@ -16,7 +18,7 @@ from datetime import datetime
 from typing import List, Optional
 from sqlalchemy import (
     Integer, String, Numeric, ForeignKey, Enum as SQLEnum,
-    Index, CheckConstraint, DateTime, Text
+    Index, CheckConstraint, UniqueConstraint, DateTime, Text
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -255,6 +257,105 @@ class IadeSatiri(Taban):
         self.toplam_tutar = Decimal(str(self.adet)) * self.birim_fiyat
 
 
+class IadeEdilebilirSatir(Taban):
+    """
+    İade edilebilir adet defteri
+    
+    Tamamlanan satışın her satırı için satılan ve iade edilen adedi tutar.
+    Satış tamamlanırken aynı transaction'da oluşturulur; iade satırı
+    eklenip değiştikçe koşullu UPDATE ile güncellenir. İade doğrulaması
+    önceki iadeleri taramaz, fiş no veya barkod indeksinden tek okumadır.
+    """
+    
+    __tablename__ = 'pos_iade_edilebilir_satir'
+    
+    # İlişki alanları
+    satis_id: Mapped[int] = mapped_column(
+        ForeignKey('pos_satis.id', ondelete='CASCADE'),
+        nullable=False,
+        comment="Satış kimliği"
+    )
+    
+    sepet_satiri_id: Mapped[int] = mapped_column(
+        ForeignKey('pos_sepet_satiri.id', ondelete='CASCADE'),
+        nullable=False,
+        comment="Satılan sepet satırı kimliği"
+    )
+    
+    fis_no: Mapped[Optional[str]] = mapped_column(
+        String(50),
+        nullable=True,
+        comment="Satış fiş numarası (snapshot)"
+    )
+    
+    # Ürün bilgileri
+    urun_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Ürün kimliği"
+    )
+    
+    barkod: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Ürün barkodu"
+    )
+    
+    urun_adi: Mapped[str] = mapped_column(
+        String(200),
+        nullable=False,
+        comment="Ürün adı (snapshot)"
+    )
+    
+    # Miktar ve tutar bilgileri
+    satilan_adet: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Satılan adet"
+    )
+    
+    iade_edilen_adet: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Şimdiye kadar iade edilen adet"
+    )
+    
+    net_tutar: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2),
+        nullable=False,
+        comment="Satırın indirim sonrası tutarı"
+    )
+    
+    # Kısıtlamalar
+    __table_args__ = (
+        CheckConstraint(
+            'iade_edilen_adet >= 0',
+            name='ck_iade_edilebilir_satir_iade_adet_pozitif'
+        ),
+        CheckConstraint(
+            'iade_edilen_adet <= satilan_adet',
+            name='ck_iade_edilebilir_satir_iade_adet_siniri'
+        ),
+        UniqueConstraint(
+            'sepet_satiri_id',
+            name='uq_iade_edilebilir_satir_sepet_satiri'
+        ),
+        Index('ix_iade_edilebilir_satir_fis_barkod', 'fis_no', 'barkod'),
+        Index('ix_iade_edilebilir_satir_satis_barkod', 'satis_id', 'barkod'),
+        Index('ix_iade_edilebilir_satir_barkod', 'barkod'),
+    )
+    
+    def __repr__(self) -> str:
+        return (f"<IadeEdilebilirSatir(id={self.id}, satis_id={self.satis_id}, "
+                f"barkod={self.barkod}, satilan_adet={self.satilan_adet}, "
+                f"iade_edilen_adet={self.iade_edilen_adet})>")
+    
+    def kalan_adet(self) -> int:
+        """Daha iade edilebilecek adedi döner"""
+        return self.satilan_adet - self.iade_edilen_adet
+
+
 # Model validasyon fonksiyonları
 def iade_validasyon(iade: Iade) -> List[str]:
     """
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.database.models.sepet
 # Description: POS Sepet ve SepetSatiri veri modelleri
 # Changelog:
 # - İlk oluşturma
+# - Sepet satırına kdv_orani eklendi
 
 """
 POS Sepet Veri Modelleri
@@ -181,6 +182,12 @@ class SepetSatiri(Taban):
         comment="Satır toplam tutarı"
     )
     
+    kdv_orani: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(5, 2),
+        nullable=True,
+        comment="Ürün KDV oranı (yüzde, snapshot)"
+    )
+    
     # İlişkiler
     sepet: Mapped["Sepet"] = relationship(
         "Sepet",
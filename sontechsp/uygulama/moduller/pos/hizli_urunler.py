@@ -0,0 +1,324 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.hizli_urunler
+# Description: Terminal ve saat dilimine göre sönümlenen satış sayılarıyla hızlı ürün sıralaması
+# Changelog:
+# - İlk oluşturma
+# - Açılışta son satışlardan yükleme; ürün kategorisi sıralanan ürünlere taşınıyor
+
+"""
+POS Hızlı Ürün Sıralaması
+
+Hızlı ürün paneli sabit/demo ürünler yerine terminalde gerçekten satan
+ürünleri gösterir. Her tamamlanan satışın satırları terminalin ve
+satış saatinin düştüğü saat dilimindeki sayaçlara artımlı eklenir.
+
+Sayaçlar üstel sönümlüdür (varsayılan yarılanma 7 gün): eski satışların
+ağırlığı zamanla azalır, böylece mevsimi geçen ürünler kendiliğinden
+geriler. Sönüm "ileri sönüm" ile yapılır; her satış sabit bir başlangıç
+anına göre büyüyen 2 ** (geçen süre / yarılanma) ağırlığıyla eklenir ve
+mevcut skorlar hiç güncellenmez. Sıralama tüm skorlar aynı katsayıyla
+büyüdüğü için değişmez; ağırlık çok büyüdüğünde skorlar bir kez
+küçültülür.
+
+Skor satır başınadır, adet başına değildir: panel dokunuş kazandırır ve
+bir satırda 10 adet satılan ürün tek dokunuştur.
+
+Sayaçlar bellektedir; süreç açılışında son GECMIS_GUN günün tamamlanmış
+satış satırlarından arka planda yeniden kurulur, böylece yeniden başlatma
+yarılanma süresini sıfırlamaz. Panel kategoriye göre süzebilsin diye
+ürünün kategori adı (urunler.kategori) ürün bilgisine eklenir; satış
+satırında yoksa ürün başına bir kez veritabanından okunur.
+"""
+
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.baglanti import postgresql_session
+from sontechsp.uygulama.veritabani.modeller.stok import Urun
+from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum
+from sontechsp.uygulama.moduller.pos.database.models.satis import Satis
+from sontechsp.uygulama.moduller.pos.database.models.sepet import SepetSatiri
+
+# Varsayılan yarılanma süresi (saniye, 7 gün)
+VARSAYILAN_YARILANMA = 7 * 24 * 3600.0
+
+# Varsayılan saat dilimi genişliği (saat)
+VARSAYILAN_DILIM_SAATI = 3
+
+# Sıralamada günün tamamının saat dilimine göre ağırlığı
+GENEL_AGIRLIK = 0.25
+
+# Terminal/dilim başına tutulan en fazla ürün
+VARSAYILAN_URUN_SINIRI = 200
+
+# Açılışta sayaçların yüklendiği geçmiş (gün, 4 yarılanma)
+GECMIS_GUN = 28
+
+# Geçmiş yüklemede bir kilit alımında işlenen satır sayısı
+_YUKLEME_PARTISI = 1000
+
+# Ağırlık üssü bu değeri aşınca skorlar küçültülür (2 ** 64)
+_USS_SINIRI = 64.0
+
+# Ürün bilgisinde saklanan satır alanları
+_URUN_ALANLARI = ('barkod', 'urun_adi', 'birim_fiyat', 'kategori_id', 'kategori')
+
+_logger = logging.getLogger(__name__)
+
+OturumAcici = Callable[[], ContextManager[Session]]
+
+# (terminal_id, dilim); dilim None ise günün tamamı
+_SayacAnahtari = Tuple[int, Optional[int]]
+
+
+class HizliUrunSiralayici:
+    """
+    Terminal ve saat dilimi başına sönümlenen satış sayaçları
+
+    Thread güvenlidir; satış tamamlama servis thread'inden yazar, panel
+    UI thread'inden okur.
+    """
+
+    def __init__(self, yarilanma_suresi: float = VARSAYILAN_YARILANMA,
+                 dilim_saati: int = VARSAYILAN_DILIM_SAATI,
+                 urun_siniri: int = VARSAYILAN_URUN_SINIRI,
+                 kategori_bul: Optional[Callable[[List[int]], Dict[int, Optional[str]]]] = None):
+        if yarilanma_suresi <= 0:
+            raise ValueError("Yarılanma süresi pozitif olmalıdır")
+        if not 1 <= dilim_saati <= 24:
+            raise ValueError("Saat dilimi 1-24 saat olmalıdır")
+        self.yarilanma_suresi = yarilanma_suresi
+        self.dilim_saati = dilim_saati
+        self.urun_siniri = urun_siniri
+        self._kilit = threading.Lock()
+        self._baslangic: Optional[float] = None
+        self._skorlar: Dict[_SayacAnahtari, Dict[int, float]] = defaultdict(dict)
+        self._urunler: Dict[int, Dict[str, Any]] = {}
+        self._surumler: Dict[int, int] = defaultdict(int)
+        # Kategorisi satırda gelmeyen ürünler için ürün ID -> kategori adı
+        self._kategori_bul = kategori_bul
+        self._kategorisi_arananlar: Set[int] = set()
+
+    def zaman_dilimi(self, zaman: datetime) -> int:
+        """Saatin düştüğü dilimin indeksi"""
+        return zaman.hour // self.dilim_saati
+
+    def satis_kaydet(self, terminal_id: int, satirlar: Iterable[Dict[str, Any]],
+                     zaman: Optional[datetime] = None) -> int:
+        """
+        Tamamlanan satışın satırlarını sayaçlara ekler
+
+        Args:
+            terminal_id: Satışın yapıldığı terminal
+            satirlar: urun_id ve (opsiyonel) barkod, urun_adi, birim_fiyat,
+                kategori_id, kategori içeren satış satırları
+            zaman: Satış zamanı (varsayılan şimdi)
+
+        Returns:
+            int: Sayılan satır sayısı
+        """
+        zaman = zaman or datetime.now()
+        satirlar = [satir for satir in satirlar if satir.get('urun_id') is not None]
+        kategoriler = self._kategorileri_bul(satirlar)
+        with self._kilit:
+            for satir in satirlar:
+                self._satir_ekle(terminal_id, satir, zaman)
+                if satir['urun_id'] in kategoriler:
+                    self._urunler[satir['urun_id']].setdefault('kategori', kategoriler[satir['urun_id']])
+            if satirlar:
+                self._surumler[terminal_id] += 1
+        return len(satirlar)
+
+    def gecmisten_yukle(self, oturum_ac: Optional[OturumAcici] = None, gun: int = GECMIS_GUN,
+                        bitis: Optional[datetime] = None) -> int:
+        """
+        Sayaçlara son günlerin tamamlanmış satış satırlarını ekler
+
+        Satırlar satış zamanıyla eklenir; sönüm canlı satışlarla aynıdır.
+        Ürün kategorisi urunler tablosundan okunur.
+
+        Args:
+            oturum_ac: Oturum açan context manager (varsayılan postgresql_session)
+            gun: Geriye doğru okunacak gün sayısı
+            bitis: Bu andan önceki satışlar (varsayılan şimdi)
+
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        bitis = bitis or datetime.now()
+        s = Satis.__table__
+        ss = SepetSatiri.__table__
+        u = Urun.__table__
+        sorgu = (
+            select(s.c.terminal_id, s.c.satis_tarihi, ss.c.urun_id, ss.c.barkod, ss.c.urun_adi,
+                   ss.c.birim_fiyat, u.c.kategori)
+            .select_from(s.join(ss, ss.c.sepet_id == s.c.sepet_id).outerjoin(u, u.c.id == ss.c.urun_id))
+            .where(s.c.durum == SatisDurum.TAMAMLANDI,
+                   s.c.satis_tarihi >= bitis - timedelta(days=gun),
+                   s.c.satis_tarihi < bitis)
+            .order_by(s.c.satis_tarihi)
+        )
+
+        eklenen = 0
+        terminaller = set()
+        with (oturum_ac or postgresql_session)() as oturum:
+            sonuc = oturum.execute(sorgu.execution_options(yield_per=_YUKLEME_PARTISI))
+            for parti in sonuc.mappings().partitions():
+                with self._kilit:
+                    for satir in parti:
+                        self._satir_ekle(satir['terminal_id'], satir, satir['satis_tarihi'])
+                        self._kategorisi_arananlar.add(satir['urun_id'])
+                        terminaller.add(satir['terminal_id'])
+                eklenen += len(parti)
+
+        with self._kilit:
+            for terminal_id in terminaller:
+                self._surumler[terminal_id] += 1
+        return eklenen
+
+    def en_cok_satanlar(self, terminal_id: int, zaman: Optional[datetime] = None,
+                        limit: int = 24) -> List[Dict[str, Any]]:
+        """
+        Terminalde saat diliminde en çok satan ürünler
+
+        Dilim skoruna günün tamamının skoru GENEL_AGIRLIK ile eklenir; yeni
+        açılan dilimde de panel boş kalmaz.
+
+        Args:
+            terminal_id: Terminal kimliği
+            zaman: Sıralama zamanı (varsayılan şimdi)
+            limit: En fazla ürün sayısı
+
+        Returns:
+            List[Dict[str, Any]]: Son satıştaki ürün bilgileri, skora göre azalan
+        """
+        zaman = zaman or datetime.now()
+        with self._kilit:
+            dilim = self._skorlar.get((terminal_id, self.zaman_dilimi(zaman)), {})
+            genel = self._skorlar.get((terminal_id, None), {})
+            birlesik = {
+                urun_id: dilim.get(urun_id, 0.0) + GENEL_AGIRLIK * skor
+                for urun_id, skor in genel.items()
+            }
+            secilen = heapq.nlargest(limit, birlesik.items(), key=lambda kalem: (kalem[1], -kalem[0]))
+            return [dict(self._urunler[urun_id]) for urun_id, _ in secilen]
+
+    def surum(self, terminal_id: int) -> int:
+        """Terminalin sayaçları her satışta artan sürüm numarası"""
+        with self._kilit:
+            return self._surumler[terminal_id]
+
+    def temizle(self) -> None:
+        """Tüm sayaçları sıfırlar"""
+        with self._kilit:
+            self._baslangic = None
+            self._skorlar.clear()
+            self._urunler.clear()
+            self._surumler.clear()
+
+    def _satir_ekle(self, terminal_id: int, satir: Dict[str, Any], zaman: datetime) -> None:
+        """Satırı terminalin dilim ve gün sayaçlarına ekler (kilit altında)"""
+        urun_id = satir['urun_id']
+        agirlik = self._agirlik(zaman.timestamp())
+        for anahtar in ((terminal_id, self.zaman_dilimi(zaman)), (terminal_id, None)):
+            skorlar = self._skorlar[anahtar]
+            skorlar[urun_id] = skorlar.get(urun_id, 0.0) + agirlik
+            self._budama(skorlar)
+        self._urun_bilgisi_guncelle(urun_id, satir)
+
+    def _kategorileri_bul(self, satirlar: List[Dict[str, Any]]) -> Dict[int, Optional[str]]:
+        """Kategorisi bilinmeyen ürünlerin kategorisini bir kez okur (kilit dışında)"""
+        if self._kategori_bul is None:
+            return {}
+        with self._kilit:
+            aranacaklar = sorted({
+                satir['urun_id'] for satir in satirlar
+                if satir.get('kategori') is None and satir.get('kategori_id') is None
+                and satir['urun_id'] not in self._kategorisi_arananlar
+            })
+            self._kategorisi_arananlar.update(aranacaklar)
+        if not aranacaklar:
+            return {}
+        try:
+            return self._kategori_bul(aranacaklar)
+        except Exception as e:
+            _logger.warning(f"Hızlı ürün kategorileri okunamadı: {str(e)}")
+            return {}
+
+    def _agirlik(self, an: float) -> float:
+        """Satışın ileri sönüm ağırlığı (gerekirse skorları küçültür)"""
+        if self._baslangic is None:
+            self._baslangic = an
+        us = (an - self._baslangic) / self.yarilanma_suresi
+        if us > _USS_SINIRI:
+            katsayi = 2.0 ** -us
+            for skorlar in self._skorlar.values():
+                for urun_id in skorlar:
+                    skorlar[urun_id] *= katsayi
+            self._baslangic = an
+            us = 0.0
+        return 2.0 ** us
+
+    def _budama(self, skorlar: Dict[int, float]) -> None:
+        """Sayaç ürün sınırını çeyrek aşınca en düşük skorlar atılır (amortize)"""
+        if len(skorlar) <= self.urun_siniri * 1.25:
+            return
+        kalanlar = heapq.nlargest(self.urun_siniri, skorlar.items(), key=lambda kalem: kalem[1])
+        skorlar.clear()
+        skorlar.update(kalanlar)
+
+    def _urun_bilgisi_guncelle(self, urun_id: int, satir: Dict[str, Any]) -> None:
+        """Panelde gösterilecek son ürün bilgisini saklar"""
+        bilgi = self._urunler.setdefault(urun_id, {'id': urun_id, 'urun_id': urun_id})
+        for alan in _URUN_ALANLARI:
+            if satir.get(alan) is not None:
+                bilgi[alan] = satir[alan]
+        bilgi.setdefault('urun_adi', str(urun_id))
+
+
+_hizli_urun_siralayici: Optional[HizliUrunSiralayici] = None
+_siralayici_kilidi = threading.Lock()
+
+
+def urun_kategorileri_getir(urun_idleri: List[int],
+                            oturum_ac: Optional[OturumAcici] = None) -> Dict[int, Optional[str]]:
+    """Ürünlerin kategori adlarını urunler tablosundan okur"""
+    u = Urun.__table__
+    with (oturum_ac or postgresql_session)() as oturum:
+        return dict(oturum.execute(select(u.c.id, u.c.kategori).where(u.c.id.in_(urun_idleri))).all())
+
+
+def _gecmisi_yukle(siralayici: HizliUrunSiralayici) -> None:
+    """Açılışta sayaçları arka planda son satışlardan yükler"""
+    try:
+        eklenen = siralayici.gecmisten_yukle()
+        _logger.info(f"Hızlı ürün sıralaması son satışlardan yüklendi - {eklenen} satır")
+    except Exception as e:
+        _logger.warning(f"Hızlı ürün sıralaması geçmişten yüklenemedi: {str(e)}")
+
+
+def hizli_urun_siralayici_al() -> HizliUrunSiralayici:
+    """
+    Süreç genelindeki hızlı ürün sıralayıcısını döndürür
+
+    İlk çağrıda sayaçlar son satışlardan arka plan thread'inde yüklenir;
+    yükleme bitince sürüm artar ve panel sıralamayı yeniden okur.
+    """
+    global _hizli_urun_siralayici
+    if _hizli_urun_siralayici is None:
+        with _siralayici_kilidi:
+            if _hizli_urun_siralayici is None:
+                siralayici = HizliUrunSiralayici(kategori_bul=urun_kategorileri_getir)
+                threading.Thread(
+                    target=_gecmisi_yukle, args=(siralayici,), name="hizli-urun-gecmisi", daemon=True
+                ).start()
+                _hizli_urun_siralayici = siralayici
+    return _hizli_urun_siralayici
@@ -0,0 +1,663 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.katalog_replikasi
+# Description: Ürün kataloğunun terminal SQLite veritabanına delta replikasyonu
+# Changelog:
+# - İlk oluşturma
+# - Geç commit'ler sabit sürüm payı yerine merkezin anlık görüntüsüyle (kesin filigran) izleniyor
+
+"""
+Katalog Replikası
+
+Merkez veritabanındaki ürün, barkod/fiyat ve mağaza stok satırları
+terminalin offline SQLite veritabanına kopyalanır; barkod okuma ve stok
+kontrolü önce bu yerel kopyadan yapılır. Merkez bağlantısı yokken de
+okutma ve fiyat çalışır, bağlantı varken WAN gecikmesi ödenmez.
+
+- Merkezde her satır ekleme/güncellemede ortak sıradan degisiklik_surumu
+  alır; silmeler katalog_silinenler tablosuna yazılır. Terminal her kaynak
+  için son uyguladığı sürümü (filigran) saklar ve yalnızca daha büyük
+  sürümleri sayfa sayfa çeker.
+- Her sayfa tek yerel transaction'da toplu upsert edilir; filigran aynı
+  transaction'da yazılır, yarıda kesilen senkron kaldığı yerden sürer.
+- Sıra değeri commit sırasında değil yazım anında alındığından geç commit
+  edilen satır daha küçük sürümle görünebilir. Her senkron başında
+  merkezde sıranın son değeri ve anlık görüntü (txid_current_snapshot)
+  kontrol noktası olarak alınır; o anda açık olan işlemlerin hepsi
+  bitince (sonraki bir turda xmin >= kontrol noktasının xmax'ı) kontrol
+  noktasının sıra değerine kadar olan sürümler kesinleşir. Delta sorgusu
+  kaynağın kesin filigranından başlar (tekrar uygulama zararsızdır); uzun
+  süren bir işlem ne kadar geç commit edilirse edilsin kaçırılmaz.
+  PostgreSQL olmayan merkezde filigranın SURUM_GUVENLIK_PAYI gerisinden
+  başlanır. Her tam_yenileme_carpani turda bir tüm katalog yeniden
+  çekilip merkezde olmayan yerel satırlar silinir.
+- urunler ve urun_barkodlari merkezle aynı tablolara yazılır; offline ürün
+  araması (FTS5 aynası) bu satırlardan beslenir. Mağaza stoku yerelde
+  mağaza/depo tabloları olmadığından katalog_stok_bakiyeleri tablosunda
+  tutulur ve yalnızca terminalin mağazası çekilir.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Engine, Index, Integer, MetaData, Numeric, String, Table,
+    delete, or_, select, text, true
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from sontechsp.uygulama.veritabani.modeller.stok import (
+    KatalogSilinen, StokBakiye, Urun, UrunBarkod
+)
+from sontechsp.uygulama.moduller.stok.dto import BarkodDTO
+from sontechsp.uygulama.moduller.stok.servisler.stok_entegrasyon_service import KRITIK_STOK_SEVIYESI
+from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
+from sontechsp.uygulama.moduller.pos.monitoring import get_pos_monitoring
+from sontechsp.uygulama.moduller.pos.baglanti_izleyici import baglanti_izleyici_al
+
+# Anlık görüntü okunamayan (PostgreSQL olmayan) merkezde delta sorgusu
+# filigranın bu kadar sürüm gerisinden başlar
+SURUM_GUVENLIK_PAYI = 500
+
+# Kaynağın kesin filigranı KATALOG_REPLIKA_DURUMU'nda bu ekle tutulur
+_KESIN_EKI = ':kesin'
+
+_SILINENLER = 'katalog_silinenler'
+_SILME_PARTISI = 500
+
+_yerel_metadata = MetaData()
+
+# Terminalin mağaza stoku (merkezdeki stok_bakiyeleri satırlarının kopyası)
+KATALOG_STOK_BAKIYELERI = Table(
+    'katalog_stok_bakiyeleri', _yerel_metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('urun_id', Integer, nullable=False),
+    Column('magaza_id', Integer, nullable=False),
+    Column('depo_id', Integer),
+    Column('miktar', Numeric(15, 4), nullable=False),
+    Column('rezerve_miktar', Numeric(15, 4), nullable=False),
+    Column('kullanilabilir_miktar', Numeric(15, 4), nullable=False),
+    Column('son_hareket_tarihi', DateTime(timezone=True)),
+    Column('degisiklik_surumu', BigInteger),
+    Index('ix_katalog_stok_urun_magaza', 'urun_id', 'magaza_id'),
+)
+
+# Kaynak başına son uygulanan sürüm
+KATALOG_REPLIKA_DURUMU = Table(
+    'katalog_replika_durumu', _yerel_metadata,
+    Column('kaynak', String(50), primary_key=True),
+    Column('son_surum', BigInteger, nullable=False),
+    Column('guncelleme_tarihi', DateTime(timezone=True)),
+)
+
+
+@dataclass(frozen=True)
+class _ReplikaKaynagi:
+    """Merkez tablosu ve yerel karşılığı"""
+    ad: str
+    merkez: Table
+    yerel: Table
+    magaza_filtreli: bool = False
+    # (kolon, yerel ebeveyn tablo): ebeveyni yerelde olmayan satır bekletilir
+    ebeveyn: Optional[Tuple[str, Table]] = None
+
+    @property
+    def kolonlar(self) -> List[str]:
+        return [kolon.name for kolon in self.yerel.columns]
+
+
+_KAYNAKLAR = (
+    _ReplikaKaynagi('urunler', Urun.__table__, Urun.__table__),
+    _ReplikaKaynagi('urun_barkodlari', UrunBarkod.__table__, UrunBarkod.__table__,
+                    ebeveyn=('urun_id', Urun.__table__)),
+    _ReplikaKaynagi('stok_bakiyeleri', StokBakiye.__table__, KATALOG_STOK_BAKIYELERI,
+                    magaza_filtreli=True),
+)
+_YEREL_TABLOLAR = {kaynak.ad: kaynak.yerel for kaynak in _KAYNAKLAR}
+
+
+def _stok_durumu_belirle(kullanilabilir: Decimal) -> str:
+    """Kullanılabilir miktara göre NORMAL / KRITIK / STOK_YOK"""
+    if kullanilabilir <= 0:
+        return "STOK_YOK"
+    if kullanilabilir <= KRITIK_STOK_SEVIYESI:
+        return "KRITIK"
+    return "NORMAL"
+
+
+class KatalogReplikasi:
+    """
+    Terminal katalog replikası
+
+    Okumalar (barkod_ile_ara, stok_durumlari_getir) yalnızca yerel SQLite'a
+    gider. Senkron arka plan thread'inde aralik saniyede bir veya uyandir()
+    ile hemen çalışır; merkez bağlantısı yokken tur atlanır.
+    """
+
+    def __init__(self, merkez_engine: Engine, yerel_engine: Engine, magaza_id: int,
+                 aralik: float = 60.0,
+                 parti_boyutu: int = 2000,
+                 tam_yenileme_carpani: int = 60,
+                 cevrimici: Optional[Callable[[], bool]] = None,
+                 arka_planda: bool = True):
+        """
+        Args:
+            merkez_engine: Merkez (PostgreSQL) veritabanı
+            yerel_engine: Terminal (SQLite) veritabanı
+            magaza_id: Stoku çekilecek mağaza (terminalin mağazası)
+            aralik: Delta senkron aralığı (saniye)
+            parti_boyutu: Sayfa başına çekilen satır sayısı
+            tam_yenileme_carpani: Kaç turda bir tüm katalogun yeniden çekileceği
+            cevrimici: Merkez erişilebilir mi (False ise tur atlanır)
+            arka_planda: False ise yalnızca senkronize_et çağrısında senkron yapılır
+        """
+        self._merkez_engine = merkez_engine
+        self._yerel_engine = yerel_engine
+        self._magaza_id = magaza_id
+        self._aralik = aralik
+        self._parti_boyutu = max(1, parti_boyutu)
+        self._tam_yenileme_carpani = max(1, tam_yenileme_carpani)
+        self._cevrimici = cevrimici or (lambda: True)
+        self._logger = logging.getLogger(__name__)
+        self._monitoring = get_pos_monitoring()
+
+        self._tur_kilidi = threading.Lock()
+        self._tur = 0
+        self._son_senkron: Optional[datetime] = None
+        self._son_uygulanan = 0
+        # Bitmesi beklenen kontrol noktaları: (anlık görüntü xmax, sıra değeri)
+        self._kontrol_noktalari: List[Tuple[int, int]] = []
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+
+        self.sema_olustur()
+        self._yuklu = self._filigranlar().keys() >= {kaynak.ad for kaynak in _KAYNAKLAR}
+
+        self._isci: Optional[threading.Thread] = None
+        if arka_planda:
+            self._isci = threading.Thread(
+                target=self._senkron_dongusu, name="katalog-replikasi", daemon=True
+            )
+            self._isci.start()
+
+    @property
+    def yuklu_mu(self) -> bool:
+        """Replika en az bir kez tamamen çekildi mi (önceki çalıştırmalar dahil)"""
+        return self._yuklu
+
+    @property
+    def magaza_id(self) -> int:
+        """Stoku tutulan mağaza"""
+        return self._magaza_id
+
+    def sema_olustur(self) -> None:
+        """
+        Yerel tabloları oluşturur
+
+        Terminalin mağazası değiştiyse eski mağazanın stok satırları silinir
+        ve stok filigranı sıfırlanır.
+        """
+        Urun.metadata.create_all(self._yerel_engine, tables=[Urun.__table__, UrunBarkod.__table__])
+        _yerel_metadata.create_all(self._yerel_engine)
+
+        with self._yerel_engine.begin() as yerel:
+            baska_magaza = yerel.execute(
+                select(KATALOG_STOK_BAKIYELERI.c.id)
+                .where(KATALOG_STOK_BAKIYELERI.c.magaza_id != self._magaza_id)
+                .limit(1)
+            ).first()
+            if baska_magaza is not None:
+                yerel.execute(delete(KATALOG_STOK_BAKIYELERI))
+                yerel.execute(
+                    delete(KATALOG_REPLIKA_DURUMU)
+                    .where(KATALOG_REPLIKA_DURUMU.c.kaynak == 'stok_bakiyeleri')
+                )
+
+    def senkronize_et(self, tam: bool = False) -> int:
+        """
+        Merkezdeki değişiklikleri yerel replikaya uygular
+
+        Args:
+            tam: True ise tüm katalog yeniden çekilir ve merkezde olmayan
+                yerel satırlar silinir
+
+        Returns:
+            int: Uygulanan (eklenen/güncellenen/silinen) satır sayısı
+        """
+        with self._tur_kilidi:
+            self._tur += 1
+            tam = tam or not self._yuklu or self._tur % self._tam_yenileme_carpani == 0
+            baslangic = time.perf_counter()
+            uygulanan = 0
+            try:
+                filigranlar = self._filigranlar()
+                with self._merkez_engine.connect() as merkez:
+                    kesin_ust = self._kesinlesen_surum(merkez)
+                    # Silmeler önce: silinen satırın barkodu/kodu yeni satırla çakışmasın
+                    uygulanan += self._silinenleri_uygula(
+                        merkez, filigranlar.get(_SILINENLER, 0),
+                        self._baslangic_imleci(filigranlar, _SILINENLER, kesin_ust), kesin_ust
+                    )
+                    for kaynak in _KAYNAKLAR:
+                        uygulanan += self._kaynagi_senkronize_et(
+                            merkez, kaynak, 0 if tam else filigranlar.get(kaynak.ad, 0), tam,
+                            0 if tam else self._baslangic_imleci(filigranlar, kaynak.ad, kesin_ust),
+                            kesin_ust
+                        )
+            except Exception:
+                self._monitoring.sure_kaydet(
+                    "katalog_senkron", time.perf_counter() - baslangic, basarili=False, tam=tam
+                )
+                raise
+
+            self._monitoring.sure_kaydet(
+                "katalog_senkron", time.perf_counter() - baslangic, basarili=True,
+                tam=tam, uygulanan=uygulanan
+            )
+            self._yuklu = True
+            self._son_senkron = datetime.now(timezone.utc)
+            self._son_uygulanan = uygulanan
+            if uygulanan:
+                self._logger.info(f"Katalog replikası güncellendi - {uygulanan} satır (tam={tam})")
+            return uygulanan
+
+    def uyandir(self) -> None:
+        """Arka plan senkronunu beklemeden çalıştırır"""
+        self._uyandir.set()
+
+    def kapat(self, zaman_asimi: float = 5.0) -> None:
+        """Arka plan thread'ini durdurur"""
+        self._durdur.set()
+        self._uyandir.set()
+        if self._isci is not None and self._isci.is_alive():
+            self._isci.join(timeout=zaman_asimi)
+
+    # Okumalar
+
+    def barkod_ile_ara(self, barkod: str) -> Optional[BarkodDTO]:
+        """
+        Aktif barkodu yerel replikada arar
+
+        Returns:
+            Optional[BarkodDTO]: Ürün adı/fiyat bilgili kayıt veya None
+        """
+        with self._yerel_engine.connect() as yerel:
+            satir = yerel.execute(
+                self._barkod_sorgusu().where(
+                    UrunBarkod.__table__.c.barkod == barkod,
+                    UrunBarkod.__table__.c.aktif == true()
+                )
+            ).first()
+        return self._barkod_dto(satir) if satir is not None else None
+
+    def indeks_kayitlari_getir(self, degisiklik_sonrasi: Optional[datetime] = None,
+                               parti_boyutu: int = 5000) -> Iterator[BarkodDTO]:
+        """
+        Barkod indeksini yerel replikadan besler
+
+        BarkodRepository.indeks_kayitlari_getir ile aynı sözleşme; terminal
+        açılışında indeks merkeze gitmeden yüklenir.
+        """
+        barkodlar, urunler = UrunBarkod.__table__, Urun.__table__
+        sorgu = self._barkod_sorgusu()
+        if degisiklik_sonrasi is None:
+            sorgu = sorgu.where(barkodlar.c.aktif == true(), urunler.c.aktif == true())
+        else:
+            sorgu = sorgu.where(or_(
+                barkodlar.c.olusturma_tarihi > degisiklik_sonrasi,
+                barkodlar.c.guncelleme_tarihi > degisiklik_sonrasi,
+                urunler.c.guncelleme_tarihi > degisiklik_sonrasi
+            ))
+
+        with self._yerel_engine.connect() as yerel:
+            sonuc = yerel.execution_options(yield_per=parti_boyutu).execute(sorgu)
+            for satir in sonuc:
+                yield self._barkod_dto(satir)
+
+    def stok_okunabilir(self, magaza_id: int) -> bool:
+        """Mağazanın stoku replikadan okunabilir mi"""
+        return self._yuklu and magaza_id == self._magaza_id
+
+    def stok_durumlari_getir(self, urun_idler: Iterable[int], magaza_id: int,
+                             depo_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Ürünlerin stok durumunu yerel replikadan getirir
+
+        Dönen sözlükler StokEntegrasyonService.stok_durumlari_getir ile aynı
+        alanları taşır; replikada satırı olmayan ürün STOK_YOK döner.
+        """
+        urun_idler = list(dict.fromkeys(urun_idler))
+        depo_id = depo_id or None
+        stok = KATALOG_STOK_BAKIYELERI
+        with self._yerel_engine.connect() as yerel:
+            satirlar = {
+                satir.urun_id: satir
+                for satir in yerel.execute(
+                    select(stok).where(
+                        stok.c.urun_id.in_(urun_idler),
+                        stok.c.magaza_id == magaza_id,
+                        stok.c.depo_id == depo_id if depo_id else stok.c.depo_id.is_(None)
+                    )
+                )
+            } if urun_idler else {}
+
+        durumlar = {}
+        for urun_id in urun_idler:
+            satir = satirlar.get(urun_id)
+            kullanilabilir = satir.kullanilabilir_miktar if satir is not None else Decimal('0')
+            durumlar[urun_id] = {
+                "urun_id": urun_id,
+                "magaza_id": magaza_id,
+                "depo_id": depo_id,
+                "toplam_stok": satir.miktar if satir is not None else Decimal('0'),
+                "kullanilabilir_stok": kullanilabilir,
+                "rezerve_stok": satir.rezerve_miktar if satir is not None else Decimal('0'),
+                "son_guncelleme": satir.son_hareket_tarihi if satir is not None else None,
+                "durum": _stok_durumu_belirle(kullanilabilir),
+                "kaynak": "yerel_replika"
+            }
+        return durumlar
+
+    def istatistikler(self) -> Dict[str, Any]:
+        """Filigranlar ve son senkron bilgisi"""
+        return {
+            'yuklu': self._yuklu,
+            'magaza_id': self._magaza_id,
+            'filigranlar': self._filigranlar(),
+            'son_senkron': self._son_senkron.isoformat() if self._son_senkron else None,
+            'son_uygulanan': self._son_uygulanan,
+            'tur': self._tur
+        }
+
+    # Senkron yardımcıları
+
+    def _senkron_dongusu(self) -> None:
+        """Arka plan senkronu"""
+        while not self._durdur.is_set():
+            self._uyandir.clear()
+            if self._cevrimici():
+                try:
+                    self.senkronize_et()
+                except Exception as e:
+                    self._logger.warning(f"Katalog replikası senkronize edilemedi: {str(e)}")
+            self._uyandir.wait(self._aralik)
+
+    def _islem_siniri(self, merkez) -> Optional[Tuple[int, int, int]]:
+        """
+        Merkezin (xmin, xmax, sıra değeri) kontrol noktası
+
+        Sıra değeri anlık görüntüden önce ayrı ifadeyle okunur: bu değere
+        kadar sürüm almış her işlemin kimliği anlık görüntüden önce
+        atanmıştır (tetikleyici txid_current() çağırır). PostgreSQL
+        değilse None.
+        """
+        if merkez.dialect.name != 'postgresql':
+            return None
+        son_surum = merkez.execute(text("SELECT last_value FROM katalog_degisiklik_seq")).scalar()
+        xmin, xmax = merkez.execute(text(
+            "SELECT txid_snapshot_xmin(txid_current_snapshot()), txid_snapshot_xmax(txid_current_snapshot())"
+        )).one()
+        return xmin, xmax, son_surum
+
+    def _kesinlesen_surum(self, merkez) -> Optional[int]:
+        """
+        Yeni kontrol noktası alır ve kesinleşen en büyük sürümü döndürür
+
+        Kontrol noktasında açık olan işlemlerin hepsi bittiyse (güncel
+        xmin >= xmax) o noktanın sıra değerine kadar olan sürümlerin hepsi
+        commit edilmiş veya geri alınmıştır.
+
+        Returns:
+            Optional[int]: Kesinleşen sürüm; anlık görüntü okunamıyorsa veya
+            henüz biten kontrol noktası yoksa None
+        """
+        sinir = self._islem_siniri(merkez)
+        if sinir is None:
+            return None
+        xmin, xmax, son_surum = sinir
+        kesinlesen = [surum for nokta_xmax, surum in self._kontrol_noktalari if nokta_xmax <= xmin]
+        self._kontrol_noktalari = [
+            (nokta_xmax, surum) for nokta_xmax, surum in self._kontrol_noktalari if nokta_xmax > xmin
+        ]
+        self._kontrol_noktalari.append((xmax, son_surum))
+        return max(kesinlesen) if kesinlesen else None
+
+    def _baslangic_imleci(self, filigranlar: Dict[str, int], kaynak: str,
+                          kesin_ust: Optional[int]) -> int:
+        """Delta sorgusunun başlayacağı sürüm (kesin filigran veya güvenlik payı)"""
+        filigran = filigranlar.get(kaynak, 0)
+        kesin = filigranlar.get(kaynak + _KESIN_EKI)
+        if kesin_ust is None and not self._kontrol_noktalari:
+            # Anlık görüntü yok (PostgreSQL olmayan merkez)
+            return max(0, filigran - SURUM_GUVENLIK_PAYI)
+        if kesin is None:
+            # Önceki sürümden kalan replika: ilk kontrol noktası bitene kadar pay
+            return max(0, filigran - SURUM_GUVENLIK_PAYI)
+        return min(kesin, filigran)
+
+    def _kesin_filigran_yaz(self, yerel, kaynak: str, filigran: int,
+                            kesin_ust: Optional[int]) -> None:
+        """Kesinleşen sürüm uygulanan filigranı aşmadan kesin filigranı ilerletir"""
+        if kesin_ust is None:
+            return
+        eski = self._filigranlar_baglantidan(yerel).get(kaynak + _KESIN_EKI, 0)
+        self._filigran_yaz(yerel, kaynak + _KESIN_EKI, max(eski, min(filigran, kesin_ust)))
+
+    def _kaynagi_senkronize_et(self, merkez, kaynak: _ReplikaKaynagi, filigran: int,
+                               tam: bool, imlec: int, kesin_ust: Optional[int]) -> int:
+        """
+        Kaynağın imleçten sonraki satırlarını sayfa sayfa uygular
+
+        Tam turda merkezde görülmeyen yerel satırlar sonda silinir.
+        """
+        merkez_tablo = kaynak.merkez
+        kolonlar = kaynak.kolonlar
+        # Bekletilen (ebeveyni henüz yerelde olmayan) en küçük sürüm
+        bekletilen: Optional[int] = None
+        gorulenler: Set[int] = set()
+        uygulanan = 0
+
+        while True:
+            sorgu = (
+                select(*[merkez_tablo.c[ad] for ad in kolonlar])
+                .where(merkez_tablo.c.degisiklik_surumu > imlec)
+                .order_by(merkez_tablo.c.degisiklik_surumu)
+                .limit(self._parti_boyutu)
+            )
+            if kaynak.magaza_filtreli:
+                sorgu = sorgu.where(merkez_tablo.c.magaza_id == self._magaza_id)
+            cekilen = [dict(satir._mapping) for satir in merkez.execute(sorgu)]
+            if not cekilen:
+                break
+            imlec = cekilen[-1]['degisiklik_surumu']
+            gorulenler.update(satir['id'] for satir in cekilen)
+
+            with self._yerel_engine.begin() as yerel:
+                satirlar = cekilen
+                if kaynak.ebeveyn is not None:
+                    satirlar, sayfa_bekletilen = self._ebeveyni_olmayanlari_ayir(yerel, kaynak, cekilen)
+                    if bekletilen is None:
+                        bekletilen = sayfa_bekletilen
+                uygulanan += self._upsert(yerel, kaynak.yerel, kolonlar, satirlar)
+                yeni_filigran = imlec if bekletilen is None else min(imlec, bekletilen - 1)
+                self._filigran_yaz(yerel, kaynak.ad, max(filigran, yeni_filigran))
+
+            if len(cekilen) < self._parti_boyutu:
+                break
+
+        if tam:
+            uygulanan += self._gorulmeyenleri_sil(kaynak, gorulenler)
+        with self._yerel_engine.begin() as yerel:
+            filigranlar = self._filigranlar_baglantidan(yerel)
+            if kaynak.ad not in filigranlar:
+                # Boş kaynak da yüklenmiş sayılır
+                self._filigran_yaz(yerel, kaynak.ad, filigran)
+            self._kesin_filigran_yaz(yerel, kaynak.ad, filigranlar.get(kaynak.ad, filigran), kesin_ust)
+        return uygulanan
+
+    def _ebeveyni_olmayanlari_ayir(self, yerel, kaynak: _ReplikaKaynagi,
+                                   satirlar: List[Dict[str, Any]]
+                                   ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Ebeveyni yerelde olmayan satırları ayırır
+
+        Ürünü henüz gelmemiş (ör. geç commit) barkod FK ihlali yerine
+        bekletilir; filigran bu satırın gerisinde kalır ve sonraki turda
+        yeniden denenir.
+        """
+        kolon, ebeveyn_tablo = kaynak.ebeveyn
+        istenen = {satir[kolon] for satir in satirlar}
+        mevcut = set(yerel.execute(
+            select(ebeveyn_tablo.c.id).where(ebeveyn_tablo.c.id.in_(istenen))
+        ).scalars())
+        uygun = [satir for satir in satirlar if satir[kolon] in mevcut]
+        bekletilen = [satir['degisiklik_surumu'] for satir in satirlar if satir[kolon] not in mevcut]
+        return uygun, (min(bekletilen) if bekletilen else None)
+
+    def _upsert(self, yerel, tablo: Table, kolonlar: List[str],
+                satirlar: List[Dict[str, Any]]) -> int:
+        """Satırları id üzerinden toplu ekler/günceller; eski sürüm yeniyi ezmez"""
+        if not satirlar:
+            return 0
+        ifade = sqlite_insert(tablo)
+        ifade = ifade.on_conflict_do_update(
+            index_elements=[tablo.c.id],
+            set_={ad: ifade.excluded[ad] for ad in kolonlar if ad != 'id'},
+            where=or_(
+                tablo.c.degisiklik_surumu.is_(None),
+                ifade.excluded.degisiklik_surumu > tablo.c.degisiklik_surumu
+            )
+        )
+        # Sürümü değişmeyen (güvenlik payıyla yeniden okunan) satırlar sayılmaz
+        return yerel.execute(ifade, satirlar).rowcount
+
+    def _silinenleri_uygula(self, merkez, filigran: int, imlec: int,
+                            kesin_ust: Optional[int]) -> int:
+        """katalog_silinenler kayıtlarını yerel tablolara uygular"""
+        silinenler = KatalogSilinen.__table__
+        uygulanan = 0
+        while True:
+            satirlar = merkez.execute(
+                select(silinenler.c.tablo_adi, silinenler.c.kayit_id, silinenler.c.degisiklik_surumu)
+                .where(silinenler.c.degisiklik_surumu > imlec)
+                .order_by(silinenler.c.degisiklik_surumu)
+                .limit(self._parti_boyutu)
+            ).all()
+            if not satirlar:
+                break
+            imlec = satirlar[-1].degisiklik_surumu
+
+            tablo_idleri: Dict[str, List[int]] = {}
+            for satir in satirlar:
+                tablo_idleri.setdefault(satir.tablo_adi, []).append(satir.kayit_id)
+            with self._yerel_engine.begin() as yerel:
+                for tablo_adi, idler in tablo_idleri.items():
+                    tablo = _YEREL_TABLOLAR.get(tablo_adi)
+                    if tablo is not None:
+                        uygulanan += yerel.execute(delete(tablo).where(tablo.c.id.in_(idler))).rowcount
+                filigran = max(filigran, imlec)
+                self._filigran_yaz(yerel, _SILINENLER, filigran)
+
+            if len(satirlar) < self._parti_boyutu:
+                break
+
+        with self._yerel_engine.begin() as yerel:
+            self._kesin_filigran_yaz(yerel, _SILINENLER, filigran, kesin_ust)
+        return uygulanan
+
+    def _gorulmeyenleri_sil(self, kaynak: _ReplikaKaynagi, gorulenler: Set[int]) -> int:
+        """Tam turda merkezde bulunmayan yerel satırları siler"""
+        tablo = kaynak.yerel
+        with self._yerel_engine.connect() as yerel:
+            fazlalar = [kayit_id for kayit_id in yerel.execute(select(tablo.c.id)).scalars()
+                        if kayit_id not in gorulenler]
+        silinen = 0
+        for i in range(0, len(fazlalar), _SILME_PARTISI):
+            with self._yerel_engine.begin() as yerel:
+                silinen += yerel.execute(
+                    delete(tablo).where(tablo.c.id.in_(fazlalar[i:i + _SILME_PARTISI]))
+                ).rowcount
+        return silinen
+
+    def _filigranlar(self) -> Dict[str, int]:
+        """Kaynak -> son uygulanan sürüm (kesin filigranlar ':kesin' ekiyle)"""
+        with self._yerel_engine.connect() as yerel:
+            return self._filigranlar_baglantidan(yerel)
+
+    @staticmethod
+    def _filigranlar_baglantidan(yerel) -> Dict[str, int]:
+        return {
+            satir.kaynak: satir.son_surum
+            for satir in yerel.execute(select(KATALOG_REPLIKA_DURUMU))
+        }
+
+    def _filigran_yaz(self, yerel, kaynak: str, surum: int) -> None:
+        ifade = sqlite_insert(KATALOG_REPLIKA_DURUMU).values(
+            kaynak=kaynak, son_surum=surum, guncelleme_tarihi=datetime.now(timezone.utc)
+        )
+        yerel.execute(ifade.on_conflict_do_update(
+            index_elements=[KATALOG_REPLIKA_DURUMU.c.kaynak],
+            set_={'son_surum': ifade.excluded.son_surum,
+                  'guncelleme_tarihi': ifade.excluded.guncelleme_tarihi}
+        ))
+
+    def _barkod_sorgusu(self):
+        barkodlar, urunler = UrunBarkod.__table__, Urun.__table__
+        return select(
+            barkodlar.c.id, barkodlar.c.urun_id, barkodlar.c.barkod, barkodlar.c.barkod_tipi,
+            barkodlar.c.birim, barkodlar.c.carpan, barkodlar.c.aktif, barkodlar.c.ana_barkod,
+            barkodlar.c.olusturma_tarihi, barkodlar.c.guncelleme_tarihi,
+            urunler.c.urun_adi, urunler.c.satis_fiyati, urunler.c.kdv_orani,
+            urunler.c.aktif.label('urun_aktif')
+        ).join(urunler, urunler.c.id == barkodlar.c.urun_id)
+
+    def _barkod_dto(self, satir) -> BarkodDTO:
+        return BarkodDTO(
+            id=satir.id,
+            urun_id=satir.urun_id,
+            barkod=satir.barkod,
+            barkod_tipi=satir.barkod_tipi,
+            birim=satir.birim,
+            carpan=satir.carpan,
+            # Pasif ürünün barkodu satışta kullanılamaz
+            aktif=bool(satir.aktif and satir.urun_aktif),
+            ana_barkod=satir.ana_barkod,
+            urun_adi=satir.urun_adi,
+            satis_fiyati=satir.satis_fiyati,
+            kdv_orani=satir.kdv_orani,
+            olusturma_tarihi=satir.olusturma_tarihi,
+            guncelleme_tarihi=satir.guncelleme_tarihi
+        )
+
+
+_katalog_replikasi: Optional[KatalogReplikasi] = None
+_katalog_replikasi_kilidi = threading.Lock()
+
+
+def katalog_replikasi_al(magaza_id: int) -> KatalogReplikasi:
+    """
+    Süreç genelinde tek katalog replikasını döndürür
+
+    İlk çağrıda merkez (PostgreSQL) ve terminal (SQLite) bağlantılarıyla
+    oluşturulur. Senkron bağlantı izleyicisi çevrimiçi dedikçe arka planda
+    çalışır ve bağlantı geri geldiğinde hemen tetiklenir.
+    """
+    global _katalog_replikasi
+    with _katalog_replikasi_kilidi:
+        if _katalog_replikasi is None:
+            baglanti = VeriTabaniBaglanti()
+            izleyici = baglanti_izleyici_al()
+            replika = KatalogReplikasi(
+                baglanti.postgresql_engine_al(), baglanti.sqlite_engine_al(), magaza_id,
+                cevrimici=lambda: izleyici.cevrimici
+            )
+            izleyici.dinleyici_ekle(lambda durum: durum and replika.uyandir())
+            atexit.register(replika.kapat)
+            _katalog_replikasi = replika
+        return _katalog_replikasi
@@ -0,0 +1,115 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.metrik_sunucusu
+# Description: Metrik kaydını Prometheus metin formatında sunan yerel HTTP sunucusu
+# Changelog:
+# - İlk oluşturma
+
+"""
+Yerel Metrik Sunucusu
+
+Çekirdek metrik kaydını GET /metrics uç noktasında Prometheus metin
+formatında (0.0.4) sunar. Sunucu daemon thread'de çalışır, arayüz
+thread'ini bloklamaz ve varsayılan olarak yalnızca 127.0.0.1'i dinler.
+Okuma kayıttaki bellek içi değerleri yazar; SQL çalıştırılmaz.
+"""
+
+import atexit
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from sontechsp.uygulama.cekirdek.ayarlar import ayar_al
+from sontechsp.uygulama.cekirdek.metrikler import MetrikKaydi, metrik_kaydi_al
+
+logger = logging.getLogger(__name__)
+
+ICERIK_TURU = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetrikIstegiIsleyici(BaseHTTPRequestHandler):
+    """GET /metrics isteğini kayıttan yanıtlar"""
+
+    kayit: MetrikKaydi
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        try:
+            govde = self.kayit.metin_olustur().encode('utf-8')
+        except Exception as e:
+            logger.error(f"Metrik metni oluşturulamadı: {str(e)}")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', ICERIK_TURU)
+        self.send_header('Content-Length', str(len(govde)))
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def log_message(self, format, *args):
+        logger.debug("Metrik isteği: " + format % args)
+
+
+class MetrikSunucusu:
+    """
+    Metrik kaydını yerel HTTP uç noktasında sunan sunucu
+
+    Daemon thread'de ThreadingHTTPServer çalıştırır; port=0 verilirse
+    işletim sisteminin seçtiği boş port kullanılır (bkz. port).
+    """
+
+    def __init__(self, kayit: MetrikKaydi, adres: str = '127.0.0.1', port: int = 9464):
+        isleyici = type('MetrikIstegiIsleyici', (_MetrikIstegiIsleyici,), {'kayit': kayit})
+        self._sunucu = ThreadingHTTPServer((adres, port), isleyici)
+        self._sunucu.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._sunucu.serve_forever, name="metrik-sunucusu", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrik sunucusu başlatıldı: http://{adres}:{self.port}/metrics")
+
+    @property
+    def port(self) -> int:
+        """Dinlenen port"""
+        return self._sunucu.server_address[1]
+
+    def kapat(self, zaman_asimi: float = 5.0) -> None:
+        """Sunucuyu durdurur"""
+        self._sunucu.shutdown()
+        self._sunucu.server_close()
+        self._thread.join(timeout=zaman_asimi)
+
+
+_metrik_sunucusu: Optional[MetrikSunucusu] = None
+_metrik_sunucusu_kilidi = threading.Lock()
+
+
+def metrik_sunucusu_baslat() -> Optional[MetrikSunucusu]:
+    """
+    Metrik sunucusunu ayarlara göre bir kez başlatır
+
+    METRIK_SUNUCUSU_PORT (varsayılan 9464, 0 kapatır) ve
+    METRIK_SUNUCUSU_ADRESI (varsayılan 127.0.0.1) okunur. Port
+    kullanılamıyorsa uyarı loglanır ve None döner; uygulama çalışmaya
+    devam eder.
+    """
+    global _metrik_sunucusu
+
+    with _metrik_sunucusu_kilidi:
+        if _metrik_sunucusu is not None:
+            return _metrik_sunucusu
+
+        port = int(ayar_al('METRIK_SUNUCUSU_PORT', 9464) or 0)
+        if port <= 0:
+            return None
+        adres = ayar_al('METRIK_SUNUCUSU_ADRESI', '127.0.0.1')
+        try:
+            _metrik_sunucusu = MetrikSunucusu(metrik_kaydi_al(), adres, port)
+        except OSError as e:
+            logger.warning(f"Metrik sunucusu başlatılamadı ({adres}:{port}): {str(e)}")
+            return None
+        atexit.register(_metrik_sunucusu.kapat)
+        return _metrik_sunucusu
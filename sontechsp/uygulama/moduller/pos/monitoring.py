@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.monitoring
 # Description: POS modülü monitoring ve performans izleme sistemi
 # Changelog:
 # - İlk oluşturma
+# - Ölçülmüş süre kaydı (sure_kaydet) eklendi
+# - Ham metrik kuyruğu yerine log-lineer gecikme histogramları ve kayan pencere yüzdelikleri
+# - Histogramlar ve hata sayaçları metrik kaydına (Prometheus dışa aktarımı) toplayıcı olarak eklendi
 
 """
 POS Modülü Monitoring ve Performans İzleme Sistemi
@@ -12,19 +15,145 @@ Bu modül POS işlemlerinin detaylı izlenmesi ve performans metriklerinin topla
 - İşlem süre ölçümü
 - Başarı/hata oranları
 - Günlük işlem istatistikleri
-- Performans metrikleri
+- Performans metrikleri (p50/p95/p99/max)
 - Kritik işlem uyarıları
+
+Süreler işlem başına nesne oluşturulmadan sabit kovalı log-lineer
+histogramlara yazılır: 32 mikrosaniyenin altı birebir, üstü her ikinin
+kuvveti aralığında 16 eşit kovaya bölünür (göreli hata en fazla %6.25).
+Her işlem için ömür boyu bir histogram ve dakikalık dilimlerden oluşan bir
+halka tutulur; performans_raporu ve sistem_durumu istenen son N dakikanın
+dilimlerini birleştirerek yüzdelik hesaplar.
+
+Ömür boyu histogramlar çekirdek metrik kaydına toplayıcı olarak eklenir;
+dışa aktarımda log-lineer kovalar VARSAYILAN_SINIRLAR'a toplanır (her kova
+üst sınırını kapsayan ilk sınıra yazılır).
 """
 
+import bisect
+import math
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
 from functools import wraps
 
 from sontechsp.uygulama.cekirdek.kayit import kayit_sistemi_al
+from sontechsp.uygulama.cekirdek.metrikler import (
+    MetrikAilesi, MetrikOrnegi, VARSAYILAN_SINIRLAR, histogram_ornekleri, metrik_kaydi_al
+)
+
+
+# Histogram düzeni: ikinin her kuvveti aralığı 2**_ALT_KOVA_BIT kovaya bölünür
+_ALT_KOVA_BIT = 4
+_ALT_KOVA_SAYISI = 1 << _ALT_KOVA_BIT
+_EN_BUYUK_US = (1 << 36) - 1  # ~19 saat; üstü son kovaya yazılır
+KOVA_SAYISI = ((_EN_BUYUK_US.bit_length() - _ALT_KOVA_BIT - 1) << _ALT_KOVA_BIT) + 2 * _ALT_KOVA_SAYISI
+
+
+def kova_indeksi(sure_us: int) -> int:
+    """Mikrosaniye cinsinden süreyi kova indeksine çevirir"""
+    if sure_us > _EN_BUYUK_US:
+        sure_us = _EN_BUYUK_US
+    kaydirma = sure_us.bit_length() - _ALT_KOVA_BIT - 1
+    if kaydirma <= 0:
+        return sure_us
+    return (kaydirma << _ALT_KOVA_BIT) + (sure_us >> kaydirma)
+
+
+def kova_ust_siniri(indeks: int) -> int:
+    """Kovaya düşen en büyük süreyi (mikrosaniye) döndürür"""
+    if indeks < 2 * _ALT_KOVA_SAYISI:
+        return indeks
+    kaydirma = (indeks >> _ALT_KOVA_BIT) - 1
+    mantis = indeks - (kaydirma << _ALT_KOVA_BIT)
+    return ((mantis + 1) << kaydirma) - 1
+
+
+# Log-lineer kova -> dışa aktarım kovası (son indeks +Inf)
+_DISA_AKTARIM_ESLEMESI = [
+    bisect.bisect_left([round(sinir * 1e6) for sinir in VARSAYILAN_SINIRLAR], kova_ust_siniri(indeks))
+    for indeks in range(KOVA_SAYISI)
+]
+
+
+class GecikmeHistogrami:
+    """Sabit kovalı log-lineer gecikme histogramı (mikrosaniye)"""
+
+    __slots__ = ('kovalar', 'sayi', 'basarisiz', 'toplam_us', 'min_us', 'max_us')
+
+    def __init__(self):
+        self.kovalar: List[int] = [0] * KOVA_SAYISI
+        self.sayi = 0
+        self.basarisiz = 0
+        self.toplam_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def ekle(self, sure_us: int, basarili: bool = True):
+        """Tek ölçümü histograma yazar"""
+        self.kovalar[kova_indeksi(sure_us)] += 1
+        if self.sayi == 0 or sure_us < self.min_us:
+            self.min_us = sure_us
+        if sure_us > self.max_us:
+            self.max_us = sure_us
+        self.sayi += 1
+        self.toplam_us += sure_us
+        if not basarili:
+            self.basarisiz += 1
+
+    def birlestir(self, diger: 'GecikmeHistogrami'):
+        """Başka bir histogramın sayımlarını bu histograma ekler"""
+        if diger.sayi == 0:
+            return
+        kovalar = self.kovalar
+        for indeks, adet in enumerate(diger.kovalar):
+            if adet:
+                kovalar[indeks] += adet
+        self.min_us = diger.min_us if self.sayi == 0 else min(self.min_us, diger.min_us)
+        self.max_us = max(self.max_us, diger.max_us)
+        self.sayi += diger.sayi
+        self.basarisiz += diger.basarisiz
+        self.toplam_us += diger.toplam_us
+
+    def yuzdelik(self, oran: float) -> int:
+        """
+        Yüzdelik değeri (mikrosaniye) döndürür
+
+        Hedef sıradaki ölçümün kovasının üst sınırı verilir; gözlenen
+        en büyük değeri aşmaz.
+        """
+        if self.sayi == 0:
+            return 0
+        hedef = max(1, math.ceil(oran * self.sayi))
+        birikimli = 0
+        for indeks, adet in enumerate(self.kovalar):
+            birikimli += adet
+            if birikimli >= hedef:
+                return min(kova_ust_siniri(indeks), self.max_us)
+        return self.max_us
+
+    def ozet(self) -> Dict[str, float]:
+        """Saniye cinsinden yüzdelik özetini döndürür"""
+        return {
+            'ortalama_sure': self.toplam_us / self.sayi / 1e6 if self.sayi else 0,
+            'min_sure': self.min_us / 1e6,
+            'p50_sure': self.yuzdelik(0.50) / 1e6,
+            'p95_sure': self.yuzdelik(0.95) / 1e6,
+            'p99_sure': self.yuzdelik(0.99) / 1e6,
+            'max_sure': self.max_us / 1e6
+        }
+
+
+class _PencereDilimi:
+    """Bir dakikalık ölçüm dilimi"""
+
+    __slots__ = ('dakika', 'histogram')
+
+    def __init__(self, dakika: int):
+        self.dakika = dakika
+        self.histogram = GecikmeHistogrami()
 
 
 @dataclass
@@ -37,11 +166,12 @@ class IslemMetrigi:
     basarili: Optional[bool] = None
     hata_mesaji: Optional[str] = None
     ek_bilgi: Dict[str, Any] = field(default_factory=dict)
-    
+    baslangic_ns: int = field(default_factory=time.perf_counter_ns)
+
     def tamamla(self, basarili: bool = True, hata_mesaji: str = None, **ek_bilgi):
         """İşlemi tamamlar ve süreyi hesaplar"""
         self.bitis_zamani = datetime.now()
-        self.sure = (self.bitis_zamani - self.baslangic_zamani).total_seconds()
+        self.sure = (time.perf_counter_ns() - self.baslangic_ns) / 1e9
         self.basarili = basarili
         self.hata_mesaji = hata_mesaji
         self.ek_bilgi.update(ek_bilgi)
@@ -51,32 +181,50 @@ class IslemMetrigi:
 class PerformansIstatistigi:
     """Performans istatistik bilgileri"""
     islem_adi: str
-    toplam_islem: int = 0
-    basarili_islem: int = 0
-    basarisiz_islem: int = 0
-    toplam_sure: float = 0.0
-    min_sure: float = float('inf')
-    max_sure: float = 0.0
-    ortalama_sure: float = 0.0
-    son_guncelleme: datetime = field(default_factory=datetime.now)
-    
-    def guncelle(self, metrik: IslemMetrigi):
-        """Metrik ile istatistikleri günceller"""
-        self.toplam_islem += 1
-        
-        if metrik.basarili:
-            self.basarili_islem += 1
-        else:
-            self.basarisiz_islem += 1
-        
-        if metrik.sure is not None:
-            self.toplam_sure += metrik.sure
-            self.min_sure = min(self.min_sure, metrik.sure)
-            self.max_sure = max(self.max_sure, metrik.sure)
-            self.ortalama_sure = self.toplam_sure / self.toplam_islem
-        
-        self.son_guncelleme = datetime.now()
-    
+    pencere_dakika: int = 60
+    kritik_esik: Optional[float] = None
+    histogram: GecikmeHistogrami = field(default_factory=GecikmeHistogrami)
+    dilimler: List[Optional[_PencereDilimi]] = field(default_factory=list)
+    son_guncelleme: float = 0.0
+
+    def __post_init__(self):
+        if not self.dilimler:
+            self.dilimler = [None] * self.pencere_dakika
+
+    def guncelle(self, sure_us: int, basarili: bool, zaman: float):
+        """Ölçümü ömür boyu histograma ve o dakikanın dilimine yazar"""
+        self.histogram.ekle(sure_us, basarili)
+
+        dakika = int(zaman // 60)
+        sira = dakika % self.pencere_dakika
+        dilim = self.dilimler[sira]
+        if dilim is None or dilim.dakika != dakika:
+            dilim = self.dilimler[sira] = _PencereDilimi(dakika)
+        dilim.histogram.ekle(sure_us, basarili)
+
+        self.son_guncelleme = zaman
+
+    def pencere_histogrami(self, son_dakika: int, zaman: float) -> GecikmeHistogrami:
+        """Son N dakikanın dilimlerini tek histogramda birleştirir"""
+        ilk_dakika = int(zaman // 60) - min(son_dakika, self.pencere_dakika) + 1
+        birlesik = GecikmeHistogrami()
+        for dilim in self.dilimler:
+            if dilim is not None and dilim.dakika >= ilk_dakika:
+                birlesik.birlestir(dilim.histogram)
+        return birlesik
+
+    @property
+    def toplam_islem(self) -> int:
+        return self.histogram.sayi
+
+    @property
+    def basarisiz_islem(self) -> int:
+        return self.histogram.basarisiz
+
+    @property
+    def basarili_islem(self) -> int:
+        return self.histogram.sayi - self.histogram.basarisiz
+
     @property
     def basari_orani(self) -> float:
         """Başarı oranını döndürür"""
@@ -88,33 +236,34 @@ class PerformansIstatistigi:
 class POSMonitoring:
     """
     POS Modülü Monitoring Sistemi
-    
+
     POS işlemlerinin performans izleme ve metrik toplama sistemi
     """
-    
-    def __init__(self, max_metrik_sayisi: int = 1000):
-        self.max_metrik_sayisi = max_metrik_sayisi
+
+    def __init__(self, pencere_dakika: int = 60, saat: Callable[[], float] = time.time):
+        """
+        Args:
+            pencere_dakika: Yüzdelik raporlarının geriye bakabileceği dakika sayısı
+            saat: Dakika dilimlerini belirleyen duvar saati (testte değiştirilir)
+        """
+        self.pencere_dakika = pencere_dakika
+        self._saat = saat
         self.logger = kayit_sistemi_al()
-        
+
         # Thread-safe koleksiyonlar
         self._lock = threading.RLock()
-        
-        # Aktif işlemler (thread-safe)
+
+        # Aktif işlemler (islem_baslat/islem_bitir ile izlenenler)
         self._aktif_islemler: Dict[str, IslemMetrigi] = {}
-        
-        # Tamamlanan işlem metrikleri (son N işlem)
-        self._metrikler: deque = deque(maxlen=max_metrik_sayisi)
-        
+
         # İşlem istatistikleri
-        self._istatistikler: Dict[str, PerformansIstatistigi] = defaultdict(
-            lambda: PerformansIstatistigi("")
-        )
-        
-        # Günlük sayaçlar
-        self._gunluk_sayaclar: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: defaultdict(int)
-        )
-        
+        self._istatistikler: Dict[str, PerformansIstatistigi] = {}
+
+        # Günlük sayaçlar: tarih -> işlem adı -> [toplam, başarılı, başarısız]
+        self._gunluk_sayaclar: Dict[str, Dict[str, List[int]]] = {}
+        self._bugun = ''
+        self._gun_bitisi = 0.0
+
         # Kritik eşik değerleri (saniye)
         self._kritik_esikler = {
             'sepet_islemleri': 2.0,
@@ -123,254 +272,281 @@ class POSMonitoring:
             'fis_islemleri': 1.0,
             'stok_islemleri': 1.5
         }
-        
+
         self.logger.info("POS Monitoring sistemi başlatıldı")
-    
+
     def islem_baslat(self, islem_adi: str, **ek_bilgi) -> str:
         """
         İşlem izlemeyi başlatır
-        
+
         Args:
             islem_adi: İşlem adı
             **ek_bilgi: Ek bilgi parametreleri
-            
+
         Returns:
             İşlem ID'si
         """
-        islem_id = f"{islem_adi}_{int(time.time() * 1000000)}"
-        
+        islem_id = f"{islem_adi}_{time.perf_counter_ns()}"
+
         metrik = IslemMetrigi(
             islem_adi=islem_adi,
             baslangic_zamani=datetime.now(),
             ek_bilgi=ek_bilgi
         )
-        
+
         with self._lock:
             self._aktif_islemler[islem_id] = metrik
-        
+
         self.logger.debug(f"İşlem başlatıldı: {islem_adi} (ID: {islem_id})")
         return islem_id
-    
-    def islem_bitir(self, islem_id: str, basarili: bool = True, 
+
+    def islem_bitir(self, islem_id: str, basarili: bool = True,
                    hata_mesaji: str = None, **ek_bilgi) -> Optional[IslemMetrigi]:
         """
         İşlem izlemeyi bitirir
-        
+
         Args:
             islem_id: İşlem ID'si
             basarili: İşlem başarılı mı
             hata_mesaji: Hata mesajı (varsa)
             **ek_bilgi: Ek bilgi parametreleri
-            
+
         Returns:
             Tamamlanan metrik bilgisi
         """
         with self._lock:
             metrik = self._aktif_islemler.pop(islem_id, None)
-        
+
         if metrik is None:
             self.logger.warning(f"Bilinmeyen işlem ID'si: {islem_id}")
             return None
-        
-        # İşlemi tamamla
+
+        # İşlemi tamamla ve histograma yaz
         metrik.tamamla(basarili, hata_mesaji, **ek_bilgi)
-        
-        # Metrikleri kaydet
-        with self._lock:
-            self._metrikler.append(metrik)
-            self._istatistikler[metrik.islem_adi].guncelle(metrik)
-            
-            # Günlük sayaçları güncelle
-            bugun = datetime.now().strftime('%Y-%m-%d')
-            self._gunluk_sayaclar[bugun][metrik.islem_adi] += 1
-            if basarili:
-                self._gunluk_sayaclar[bugun][f"{metrik.islem_adi}_basarili"] += 1
-            else:
-                self._gunluk_sayaclar[bugun][f"{metrik.islem_adi}_basarisiz"] += 1
-        
-        # Performans kontrolü
-        self._performans_kontrol(metrik)
-        
+        self.sure_ns_kaydet(metrik.islem_adi, int(metrik.sure * 1e9), basarili)
+
         # Log kaydı
         durum = "BAŞARILI" if basarili else "BAŞARISIZ"
         self.logger.info(
             f"İşlem tamamlandı: {metrik.islem_adi} - {durum} - "
             f"Süre: {metrik.sure:.3f}s"
         )
-        
+
         if not basarili and hata_mesaji:
             self.logger.error(f"İşlem hatası: {metrik.islem_adi} - {hata_mesaji}")
-        
+
         return metrik
-    
-    def _performans_kontrol(self, metrik: IslemMetrigi):
-        """Performans eşik kontrolü yapar"""
-        if metrik.sure is None:
-            return
-        
-        # İşlem kategorisini belirle
-        kategori = None
-        for kat, esik in self._kritik_esikler.items():
-            if kat.replace('_islemleri', '') in metrik.islem_adi.lower():
-                kategori = kat
-                break
-        
-        if kategori and metrik.sure > self._kritik_esikler[kategori]:
+
+    def sure_kaydet(self, islem_adi: str, sure: float, basarili: bool = True,
+                    **ek_bilgi) -> None:
+        """
+        Çağıranın ölçtüğü süreyi tamamlanmış işlem olarak kaydeder
+
+        Satış tamamlama aşamaları gibi sık ve kısa ölçümler için
+        islem_baslat/islem_bitir yerine kullanılır; işlem başına INFO log
+        yazılmaz. Ek bilgi yalnızca yavaş işlem uyarısına eklenir.
+
+        Args:
+            islem_adi: İşlem adı
+            sure: Süre (saniye)
+            basarili: İşlem başarılı mı
+            **ek_bilgi: Ek bilgi parametreleri
+        """
+        self.sure_ns_kaydet(islem_adi, int(sure * 1e9), basarili, **ek_bilgi)
+
+    def sure_ns_kaydet(self, islem_adi: str, sure_ns: int, basarili: bool = True,
+                       **ek_bilgi) -> None:
+        """
+        perf_counter_ns ile ölçülmüş süreyi kaydeder
+
+        Sıcak yol: metrik nesnesi oluşturmaz, yalnızca histogram kovalarını
+        ve günlük sayaçları artırır.
+
+        Args:
+            islem_adi: İşlem adı
+            sure_ns: Süre (nanosaniye)
+            basarili: İşlem başarılı mı
+            **ek_bilgi: Yavaş işlem uyarısına eklenecek bilgiler
+        """
+        sure_us = sure_ns // 1000 if sure_ns > 0 else 0
+        zaman = self._saat()
+
+        with self._lock:
+            istatistik = self._istatistikler.get(islem_adi)
+            if istatistik is None:
+                istatistik = self._istatistik_olustur(islem_adi)
+            istatistik.guncelle(sure_us, basarili, zaman)
+
+            if zaman >= self._gun_bitisi:
+                self._gunu_degistir(zaman)
+            gunluk = self._gunluk_sayaclar[self._bugun]
+            sayac = gunluk.get(islem_adi)
+            if sayac is None:
+                sayac = gunluk[islem_adi] = [0, 0, 0]
+            sayac[0] += 1
+            sayac[1 if basarili else 2] += 1
+            esik = istatistik.kritik_esik
+
+        # Performans kontrolü
+        if esik is not None and sure_us > esik * 1e6:
             self.logger.warning(
-                f"YAVAŞ İŞLEM UYARISI: {metrik.islem_adi} - "
-                f"Süre: {metrik.sure:.3f}s (Eşik: {self._kritik_esikler[kategori]}s)"
+                f"YAVAŞ İŞLEM UYARISI: {islem_adi} - "
+                f"Süre: {sure_us / 1e6:.3f}s (Eşik: {esik}s)"
+                + (f" - {ek_bilgi}" if ek_bilgi else "")
             )
-    
+
+    def _istatistik_olustur(self, islem_adi: str) -> PerformansIstatistigi:
+        """Yeni işlem için istatistik kaydını kritik eşiğiyle oluşturur (kilit altında)"""
+        istatistik = PerformansIstatistigi(
+            islem_adi=islem_adi,
+            pencere_dakika=self.pencere_dakika,
+            kritik_esik=self._kritik_esik_bul(islem_adi)
+        )
+        self._istatistikler[islem_adi] = istatistik
+        return istatistik
+
+    def _kritik_esik_bul(self, islem_adi: str) -> Optional[float]:
+        """İşlem adının düştüğü kategorinin eşiğini döndürür"""
+        adi = islem_adi.lower()
+        for kategori, esik in self._kritik_esikler.items():
+            if kategori.replace('_islemleri', '') in adi:
+                return esik
+        return None
+
+    def _gunu_degistir(self, zaman: float):
+        """Günlük sayaç anahtarını yerel gün değiştiğinde yeniler (kilit altında)"""
+        simdi = datetime.fromtimestamp(zaman)
+        self._bugun = simdi.strftime('%Y-%m-%d')
+        gece_yarisi = simdi.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self._gun_bitisi = gece_yarisi.timestamp()
+        self._gunluk_sayaclar.setdefault(self._bugun, {})
+
+    def _istatistik_sozlugu(self, stat: PerformansIstatistigi) -> Dict[str, Any]:
+        """Ömür boyu istatistiği rapor sözlüğüne çevirir"""
+        return {
+            'islem_adi': stat.islem_adi,
+            'toplam_islem': stat.toplam_islem,
+            'basarili_islem': stat.basarili_islem,
+            'basarisiz_islem': stat.basarisiz_islem,
+            'basari_orani': stat.basari_orani,
+            **stat.histogram.ozet(),
+            'son_guncelleme': datetime.fromtimestamp(stat.son_guncelleme).isoformat()
+        }
+
     def islem_istatistikleri(self, islem_adi: str = None) -> Dict[str, Any]:
         """
         İşlem istatistiklerini döndürür
-        
+
         Args:
             islem_adi: Belirli işlem adı (None ise tümü)
-            
+
         Returns:
             İstatistik bilgileri
         """
         with self._lock:
             if islem_adi:
                 if islem_adi in self._istatistikler:
-                    stat = self._istatistikler[islem_adi]
-                    return {
-                        'islem_adi': stat.islem_adi,
-                        'toplam_islem': stat.toplam_islem,
-                        'basarili_islem': stat.basarili_islem,
-                        'basarisiz_islem': stat.basarisiz_islem,
-                        'basari_orani': stat.basari_orani,
-                        'ortalama_sure': stat.ortalama_sure,
-                        'min_sure': stat.min_sure if stat.min_sure != float('inf') else 0,
-                        'max_sure': stat.max_sure,
-                        'son_guncelleme': stat.son_guncelleme.isoformat()
-                    }
+                    return self._istatistik_sozlugu(self._istatistikler[islem_adi])
                 else:
                     return {}
             else:
                 # Tüm istatistikler
                 return {
-                    islem: {
-                        'islem_adi': stat.islem_adi,
-                        'toplam_islem': stat.toplam_islem,
-                        'basarili_islem': stat.basarili_islem,
-                        'basarisiz_islem': stat.basarisiz_islem,
-                        'basari_orani': stat.basari_orani,
-                        'ortalama_sure': stat.ortalama_sure,
-                        'min_sure': stat.min_sure if stat.min_sure != float('inf') else 0,
-                        'max_sure': stat.max_sure,
-                        'son_guncelleme': stat.son_guncelleme.isoformat()
-                    }
+                    islem: self._istatistik_sozlugu(stat)
                     for islem, stat in self._istatistikler.items()
                 }
-    
+
     def gunluk_rapor(self, tarih: str = None) -> Dict[str, Any]:
         """
         Günlük işlem raporunu döndürür
-        
+
         Args:
             tarih: Rapor tarihi (YYYY-MM-DD formatında, None ise bugün)
-            
+
         Returns:
             Günlük rapor bilgileri
         """
         if tarih is None:
-            tarih = datetime.now().strftime('%Y-%m-%d')
-        
+            tarih = datetime.fromtimestamp(self._saat()).strftime('%Y-%m-%d')
+
         with self._lock:
-            gunluk_veri = self._gunluk_sayaclar.get(tarih, {})
-        
-        # İşlem türlerini grupla
-        islem_turleri = set()
-        for anahtar in gunluk_veri.keys():
-            if not anahtar.endswith(('_basarili', '_basarisiz')):
-                islem_turleri.add(anahtar)
-        
+            gunluk_veri = {
+                islem: list(sayac)
+                for islem, sayac in self._gunluk_sayaclar.get(tarih, {}).items()
+            }
+
         rapor = {
             'tarih': tarih,
-            'toplam_islem': sum(
-                gunluk_veri.get(islem, 0) for islem in islem_turleri
-            ),
+            'toplam_islem': sum(sayac[0] for sayac in gunluk_veri.values()),
             'islem_detaylari': {}
         }
-        
-        for islem in islem_turleri:
-            toplam = gunluk_veri.get(islem, 0)
-            basarili = gunluk_veri.get(f"{islem}_basarili", 0)
-            basarisiz = gunluk_veri.get(f"{islem}_basarisiz", 0)
-            
+
+        for islem, (toplam, basarili, basarisiz) in gunluk_veri.items():
             rapor['islem_detaylari'][islem] = {
                 'toplam': toplam,
                 'basarili': basarili,
                 'basarisiz': basarisiz,
                 'basari_orani': (basarili / toplam * 100) if toplam > 0 else 0
             }
-        
+
         return rapor
-    
+
+    def _pencere_histogramlari(self, son_dakika: int, zaman: float) -> Dict[str, GecikmeHistogrami]:
+        """Son N dakikada ölçümü olan işlemlerin birleşik histogramları"""
+        with self._lock:
+            histogramlar = {
+                islem: stat.pencere_histogrami(son_dakika, zaman)
+                for islem, stat in self._istatistikler.items()
+            }
+        return {islem: h for islem, h in histogramlar.items() if h.sayi}
+
     def performans_raporu(self, son_dakika: int = 60) -> Dict[str, Any]:
         """
         Son N dakikanın performans raporunu döndürür
-        
+
+        Dakikalık dilimlerle çalışır; N, pencere_dakika ile sınırlıdır.
+
         Args:
             son_dakika: Son kaç dakika
-            
+
         Returns:
             Performans rapor bilgileri
         """
-        simdi = datetime.now()
-        baslangic = simdi - timedelta(minutes=son_dakika)
-        
-        # Son N dakikadaki metrikleri filtrele
-        son_metrikler = []
-        with self._lock:
-            for metrik in self._metrikler:
-                if metrik.baslangic_zamani >= baslangic:
-                    son_metrikler.append(metrik)
-        
-        if not son_metrikler:
+        zaman = self._saat()
+        histogramlar = self._pencere_histogramlari(son_dakika, zaman)
+
+        if not histogramlar:
             return {
                 'zaman_araligi': f"Son {son_dakika} dakika",
                 'toplam_islem': 0,
                 'islem_detaylari': {}
             }
-        
-        # İşlem türlerine göre grupla
-        islem_gruplari = defaultdict(list)
-        for metrik in son_metrikler:
-            islem_gruplari[metrik.islem_adi].append(metrik)
-        
+
+        simdi = datetime.fromtimestamp(zaman)
         rapor = {
             'zaman_araligi': f"Son {son_dakika} dakika",
-            'baslangic_zamani': baslangic.isoformat(),
+            'baslangic_zamani': (simdi - timedelta(minutes=son_dakika)).isoformat(),
             'bitis_zamani': simdi.isoformat(),
-            'toplam_islem': len(son_metrikler),
+            'toplam_islem': sum(h.sayi for h in histogramlar.values()),
             'islem_detaylari': {}
         }
-        
-        for islem_adi, metrikler in islem_gruplari.items():
-            basarili_sayisi = sum(1 for m in metrikler if m.basarili)
-            basarisiz_sayisi = len(metrikler) - basarili_sayisi
-            
-            sureler = [m.sure for m in metrikler if m.sure is not None]
-            
+
+        for islem_adi, histogram in histogramlar.items():
+            basarili_sayisi = histogram.sayi - histogram.basarisiz
             rapor['islem_detaylari'][islem_adi] = {
-                'toplam': len(metrikler),
+                'toplam': histogram.sayi,
                 'basarili': basarili_sayisi,
-                'basarisiz': basarisiz_sayisi,
-                'basari_orani': (basarili_sayisi / len(metrikler) * 100),
-                'ortalama_sure': sum(sureler) / len(sureler) if sureler else 0,
-                'min_sure': min(sureler) if sureler else 0,
-                'max_sure': max(sureler) if sureler else 0
+                'basarisiz': histogram.basarisiz,
+                'basari_orani': (basarili_sayisi / histogram.sayi * 100),
+                **histogram.ozet()
             }
-        
+
         return rapor
-    
+
     def aktif_islemler(self) -> List[Dict[str, Any]]:
         """
         Aktif işlemleri döndürür
-        
+
         Returns:
             Aktif işlem listesi
         """
@@ -385,96 +561,123 @@ class POSMonitoring:
                 }
                 for islem_id, metrik in self._aktif_islemler.items()
             ]
-    
+
     def esik_degerlerini_guncelle(self, yeni_esikler: Dict[str, float]):
         """
         Kritik eşik değerlerini günceller
-        
+
         Args:
             yeni_esikler: Yeni eşik değerleri
         """
-        self._kritik_esikler.update(yeni_esikler)
+        with self._lock:
+            self._kritik_esikler.update(yeni_esikler)
+            for stat in self._istatistikler.values():
+                stat.kritik_esik = self._kritik_esik_bul(stat.islem_adi)
         self.logger.info(f"Kritik eşik değerleri güncellendi: {yeni_esikler}")
-    
+
     def istatistikleri_sifirla(self):
         """Tüm istatistikleri sıfırlar"""
         with self._lock:
-            self._metrikler.clear()
             self._istatistikler.clear()
             self._gunluk_sayaclar.clear()
-        
+            self._gun_bitisi = 0.0
+
         self.logger.info("POS Monitoring istatistikleri sıfırlandı")
-    
+
     def sistem_durumu(self) -> Dict[str, Any]:
         """
         Sistem durumu bilgilerini döndürür
-        
+
         Returns:
-            Sistem durumu bilgileri
+            Sistem durumu bilgileri (son 5 dakikanın işlem bazlı yüzdelikleri dahil)
         """
+        zaman = self._saat()
+        son_5dk = self._pencere_histogramlari(5, zaman)
         with self._lock:
             aktif_islem_sayisi = len(self._aktif_islemler)
-            toplam_metrik_sayisi = len(self._metrikler)
-            
-            # Son 5 dakikadaki işlemler
-            son_5dk = datetime.now() - timedelta(minutes=5)
-            son_islemler = sum(
-                1 for metrik in self._metrikler 
-                if metrik.baslangic_zamani >= son_5dk
-            )
-        
+            izlenen_islem_sayisi = len(self._istatistikler)
+
         return {
             'aktif_islem_sayisi': aktif_islem_sayisi,
-            'toplam_metrik_sayisi': toplam_metrik_sayisi,
-            'son_5dk_islem_sayisi': son_islemler,
-            'max_metrik_kapasitesi': self.max_metrik_sayisi,
+            'izlenen_islem_sayisi': izlenen_islem_sayisi,
+            'son_5dk_islem_sayisi': sum(h.sayi for h in son_5dk.values()),
+            'son_5dk_gecikmeler': {
+                islem: {
+                    anahtar: deger for anahtar, deger in h.ozet().items()
+                    if anahtar in ('p50_sure', 'p95_sure', 'p99_sure', 'max_sure')
+                }
+                for islem, h in son_5dk.items()
+            },
+            'pencere_dakika': self.pencere_dakika,
             'kritik_esikler': self._kritik_esikler.copy(),
-            'sistem_zamani': datetime.now().isoformat()
+            'sistem_zamani': datetime.fromtimestamp(zaman).isoformat()
         }
 
+    def metrik_aileleri(self) -> List[MetrikAilesi]:
+        """
+        Ömür boyu histogramları ve hata sayaçlarını metrik ailesi olarak döndürür
+
+        Returns:
+            İşlem süresi histogramı, hata sayacı ve aktif işlem göstergesi
+        """
+        with self._lock:
+            anlik = [
+                (islem, list(stat.histogram.kovalar), stat.histogram.toplam_us, stat.histogram.basarisiz)
+                for islem, stat in self._istatistikler.items()
+            ]
+            aktif_islem_sayisi = len(self._aktif_islemler)
+
+        sureler = MetrikAilesi('sontechsp_pos_islem_sure_saniye', 'histogram',
+                               'POS işlem süreleri (saniye)')
+        hatalar = MetrikAilesi('sontechsp_pos_islem_hata_total', 'counter',
+                               'Başarısız POS işlemleri')
+        for islem, kovalar, toplam_us, basarisiz in anlik:
+            disa_aktarim = [0] * (len(VARSAYILAN_SINIRLAR) + 1)
+            for indeks, adet in enumerate(kovalar):
+                if adet:
+                    disa_aktarim[_DISA_AKTARIM_ESLEMESI[indeks]] += adet
+            etiketler = {'islem': islem}
+            sureler.ornekler.extend(histogram_ornekleri(etiketler, VARSAYILAN_SINIRLAR,
+                                                        disa_aktarim, toplam_us / 1e6))
+            hatalar.ornekler.append(MetrikOrnegi('', etiketler, basarisiz))
+
+        aktif = MetrikAilesi('sontechsp_pos_aktif_islem', 'gauge', 'Süren izlenen POS işlemleri',
+                             [MetrikOrnegi('', {}, aktif_islem_sayisi)])
+        return [sureler, hatalar, aktif]
+
 
 def islem_izle(islem_adi: str = None):
     """
     Decorator: Fonksiyon çalışma süresini izler
-    
+
+    Süre perf_counter_ns ile ölçülür ve doğrudan histograma yazılır; çağrı
+    başına metrik nesnesi ya da INFO log üretilmez.
+
     Args:
         islem_adi: İşlem adı (None ise fonksiyon adı kullanılır)
-    
+
     Usage:
         @islem_izle("sepet_urun_ekleme")
         def urun_ekle(self, barkod):
             # kod
     """
     def decorator(func):
+        adi = islem_adi or f"{func.__module__}.{func.__name__}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # İşlem adını belirle
-            adi = islem_adi or f"{func.__module__}.{func.__name__}"
-            
-            # Monitoring instance'ını al
-            monitoring = get_pos_monitoring()
-            
-            # İşlemi başlat
-            islem_id = monitoring.islem_baslat(adi)
-            
+            baslangic = time.perf_counter_ns()
             try:
-                # Fonksiyonu çalıştır
                 sonuc = func(*args, **kwargs)
-                
-                # Başarılı olarak bitir
-                monitoring.islem_bitir(islem_id, basarili=True)
-                
-                return sonuc
-                
             except Exception as e:
-                # Hata ile bitir
-                monitoring.islem_bitir(
-                    islem_id, 
-                    basarili=False, 
-                    hata_mesaji=str(e)
-                )
+                monitoring = get_pos_monitoring()
+                monitoring.sure_ns_kaydet(adi, time.perf_counter_ns() - baslangic, basarili=False)
+                monitoring.logger.error(f"İşlem hatası: {adi} - {e}")
                 raise
-        
+
+            get_pos_monitoring().sure_ns_kaydet(adi, time.perf_counter_ns() - baslangic)
+            return sonuc
+
         return wrapper
     return decorator
 
@@ -491,16 +694,24 @@ def get_pos_monitoring() -> POSMonitoring:
     return _pos_monitoring
 
 
-def pos_monitoring_baslat(max_metrik_sayisi: int = 1000) -> POSMonitoring:
+def _pos_metrik_toplayicisi() -> List[MetrikAilesi]:
+    """Global monitoring oluşturulmuşsa metrik ailelerini döndürür"""
+    return _pos_monitoring.metrik_aileleri() if _pos_monitoring is not None else []
+
+
+metrik_kaydi_al().toplayici_ekle(_pos_metrik_toplayicisi)
+
+
+def pos_monitoring_baslat(pencere_dakika: int = 60) -> POSMonitoring:
     """
     POS monitoring sistemini başlatır
-    
+
     Args:
-        max_metrik_sayisi: Maksimum metrik sayısı
-        
+        pencere_dakika: Yüzdelik raporlarının geriye bakabileceği dakika sayısı
+
     Returns:
         POSMonitoring instance'ı
     """
     global _pos_monitoring
-    _pos_monitoring = POSMonitoring(max_metrik_sayisi)
-    return _pos_monitoring
\ No newline at end of file
+    _pos_monitoring = POSMonitoring(pencere_dakika)
+    return _pos_monitoring
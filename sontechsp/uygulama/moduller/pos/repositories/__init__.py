@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.repositories
 # Description: POS Repository katmanı - Veri erişim katmanı
 # Changelog:
 # - İlk oluşturma
+# - SepetMotoru eklendi
+# - GidenOlayRepository (satış outbox'ı) eklendi
+# - GunSonuRepository (X/Z raporu toplamları) eklendi
 
 """
 POS Repository Katmanı
@@ -13,7 +16,14 @@ Database modellerini kullanır ve Service katmanına veri sağlar.
 """
 
 from .sepet_repository import SepetRepository
+from .sepet_motoru import SepetMotoru, sepet_motoru_al
+from .giden_olay_repository import GidenOlayRepository
+from .gun_sonu_repository import GunSonuRepository
 
 __all__ = [
-    'SepetRepository'
+    'SepetRepository',
+    'SepetMotoru',
+    'sepet_motoru_al',
+    'GidenOlayRepository',
+    'GunSonuRepository'
 ]
\ No newline at end of file
@@ -0,0 +1,170 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.repositories.giden_olay_repository
+# Description: Giden olay (outbox) repository implementasyonu
+# Changelog:
+# - İlk oluşturma
+
+"""
+Giden Olay Repository
+
+Satış tamamlama hattı sadakat, e-belge ve e-ticaret yan etkilerini
+pos_giden_olaylar tablosuna satışla aynı transaction'da tek INSERT ile
+yazar. Hedef sistemlerin aktarıcıları bekleyen olayları FOR UPDATE SKIP
+LOCKED ile sahiplenir; aynı olayı iki aktarıcı birden almaz.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.baglanti import postgresql_session
+from sontechsp.uygulama.moduller.pos.arayuzler import (
+    IGidenOlayRepository, GidenOlayHedef, GidenOlayDurum
+)
+from sontechsp.uygulama.moduller.pos.database.models.giden_olay import GidenOlay
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi, VeritabaniHatasi
+
+# Aktarıcı bu sayıya ulaşan olayı artık sahiplenmez
+AZAMI_DENEME_SAYISI = 10
+
+
+class GidenOlayRepository(IGidenOlayRepository):
+    """
+    Giden olay repository implementasyonu
+
+    Sorgular Core ifadeleriyle (GidenOlay.__table__) yapılır; ekleme
+    olay sayısından bağımsız tek round-trip'tir.
+    """
+
+    def __init__(self, oturum_ac: Optional[Callable[[], ContextManager[Session]]] = None):
+        """
+        Args:
+            oturum_ac: Kendi oturumunu açan context manager (varsayılan postgresql_session)
+        """
+        self._oturum_ac = oturum_ac or postgresql_session
+        self._tablo = GidenOlay.__table__
+
+    def olaylari_ekle(self, olaylar: List[Dict[str, Any]], session: Optional[Session] = None) -> int:
+        """
+        Olayları kuyruğa yazar
+
+        Args:
+            olaylar: hedef (GidenOlayHedef), olay_turu, veri ve opsiyonel
+                satis_id içeren olay listesi
+            session: Satış transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            int: Eklenen olay sayısı
+
+        Raises:
+            DogrulamaHatasi: Hedef veya olay türü eksikse
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if not olaylar:
+            return 0
+
+        satirlar = []
+        for olay in olaylar:
+            if not isinstance(olay.get('hedef'), GidenOlayHedef) or not olay.get('olay_turu'):
+                raise DogrulamaHatasi("giden_olay", "Olay hedefi ve türü zorunludur")
+            satirlar.append({
+                'hedef': olay['hedef'],
+                'olay_turu': olay['olay_turu'],
+                'satis_id': olay.get('satis_id'),
+                'veri': olay.get('veri') or {},
+                'durum': GidenOlayDurum.BEKLIYOR,
+                'deneme_sayisi': 0
+            })
+
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                oturum.execute(insert(self._tablo), satirlar)
+            return len(satirlar)
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Giden olay ekleme hatası: {str(e)}")
+
+    def bekleyenleri_al(self, hedef: GidenOlayHedef, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Hedefin bekleyen ve hatalı olaylarını sahiplenir
+
+        Seçilen olaylar aynı transaction'da ISLENIYOR yapılır; başka
+        aktarıcının kilitlediği satırlar beklenmeden atlanır.
+
+        Args:
+            hedef: Hedef sistem
+            limit: En fazla alınacak olay sayısı
+
+        Returns:
+            List[Dict[str, Any]]: id, olay_turu, satis_id, veri ve
+            deneme_sayisi içeren olaylar (id sırasıyla)
+        """
+        t = self._tablo
+        try:
+            with islem_oturumu(self._oturum_ac) as oturum:
+                satirlar = oturum.execute(
+                    select(t.c.id, t.c.olay_turu, t.c.satis_id, t.c.veri, t.c.deneme_sayisi)
+                    .where(t.c.hedef == hedef,
+                           t.c.durum.in_((GidenOlayDurum.BEKLIYOR, GidenOlayDurum.HATA)),
+                           t.c.deneme_sayisi < AZAMI_DENEME_SAYISI)
+                    .order_by(t.c.id)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                ).mappings().all()
+                if satirlar:
+                    oturum.execute(
+                        update(t)
+                        .where(t.c.id.in_([satir['id'] for satir in satirlar]))
+                        .values(durum=GidenOlayDurum.ISLENIYOR)
+                    )
+            return [dict(satir) for satir in satirlar]
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Giden olay alma hatası: {str(e)}")
+
+    def gonderildi_isaretle(self, olay_idleri: List[int]) -> int:
+        """
+        Olayları gönderildi olarak işaretler
+
+        Returns:
+            int: Güncellenen olay sayısı
+        """
+        if not olay_idleri:
+            return 0
+
+        t = self._tablo
+        try:
+            with islem_oturumu(self._oturum_ac) as oturum:
+                sonuc = oturum.execute(
+                    update(t)
+                    .where(t.c.id.in_(olay_idleri))
+                    .values(durum=GidenOlayDurum.GONDERILDI,
+                            islenme_tarihi=datetime.now(timezone.utc))
+                )
+            return sonuc.rowcount
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Giden olay işaretleme hatası: {str(e)}")
+
+    def hata_isaretle(self, olay_id: int, hata_mesaji: str) -> bool:
+        """
+        Olayı hata mesajıyla işaretler; deneme sayısı artar
+
+        Returns:
+            bool: Olay bulundu mu
+        """
+        t = self._tablo
+        try:
+            with islem_oturumu(self._oturum_ac) as oturum:
+                sonuc = oturum.execute(
+                    update(t)
+                    .where(t.c.id == olay_id)
+                    .values(durum=GidenOlayDurum.HATA,
+                            deneme_sayisi=t.c.deneme_sayisi + 1,
+                            son_hata=hata_mesaji)
+                )
+            return sonuc.rowcount > 0
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Giden olay hata işaretleme hatası: {str(e)}")
@@ -0,0 +1,453 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.repositories.gun_sonu_repository
+# Description: Artımlı gün sonu (X/Z raporu) toplamları ve mutabakat
+# Changelog:
+# - İlk oluşturma
+# - İptal sayısı yalnızca fiş numaralı satışın IPTAL durumuna geçişinde artıyor
+
+"""
+Gün Sonu Repository
+
+pos_gun_sonu_toplami tablosunda gün, terminal ve kasiyer vardiyası başına
+satış sayısı, brüt/indirim/net tutar, ödeme türü ve KDV oranı toplamları
+tutulur:
+
+- Satış tamamlanırken satışın katkısı aynı transaction'da
+  INSERT ... ON CONFLICT DO UPDATE ile eklenir; yalnızca o satışın
+  ödemeleri ve satırları okunur.
+- Tamamlanmış satış iptal edilirken katkı geri alınır ve iptal sayısı
+  artırılır. Tamamlanmış durumdan iptal dışı bir duruma geçişte yalnızca
+  katkı geri alınır. İptal sayısı, mutabakattaki yeniden hesapla aynı
+  kurala uyar: fiş numarası almış satışın IPTAL durumuna geçişi.
+- X ve Z raporları günün birkaç toplam kaydını okur; satışlar taranmaz.
+- Mutabakat, toplamları ham satışlardan aynı hesapla yeniden kurar,
+  farkları listeler ve istenirse toplamları düzeltir.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.baglanti import postgresql_session
+from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum
+from sontechsp.uygulama.moduller.pos.database.models.gun_sonu import (
+    GunSonuToplami, BOYUT_GENEL, BOYUT_ODEME, BOYUT_KDV
+)
+from sontechsp.uygulama.moduller.pos.database.models.satis import Satis, SatisOdeme
+from sontechsp.uygulama.moduller.pos.database.models.sepet import SepetSatiri
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import (
+    SIFIR, SepetToplamlari, kdv_orani_normalle, tutar_yuvarla
+)
+from sontechsp.uygulama.cekirdek.hatalar import VeritabaniHatasi
+
+# Toplam kaydının sayısal alanları
+TOPLAM_ALANLARI = (
+    'islem_sayisi', 'brut_tutar', 'indirim_tutari', 'net_tutar',
+    'matrah', 'kdv_tutari', 'iptal_sayisi', 'iptal_tutari'
+)
+_SAYI_ALANLARI = ('islem_sayisi', 'iptal_sayisi')
+
+# (terminal_id, kasiyer_id, boyut, anahtar)
+ToplamAnahtari = Tuple[int, int, str, str]
+Katkilar = Dict[Tuple[str, str], Dict[str, Any]]
+
+
+def _bos_toplam() -> Dict[str, Any]:
+    return {alan: 0 if alan in _SAYI_ALANLARI else SIFIR for alan in TOPLAM_ALANLARI}
+
+
+def satis_katkilari(satis: Dict[str, Any], odemeler: Iterable[Tuple[str, int, Any]],
+                    satirlar: Iterable[Tuple[Any, Any, Any]]) -> Katkilar:
+    """
+    Tek satışın gün sonu toplamlarına katkısını hesaplar
+
+    KDV dökümü fişle aynı hesaptır (SepetToplamlari); satış indirimi
+    oranlara tutarları oranında dağıtılır.
+
+    Args:
+        satis: toplam_tutar ve indirim_tutari içeren satış başlığı
+        odemeler: (odeme_turu, odeme_sayisi, tutar) üçlüleri
+        satirlar: (satir_id, toplam_tutar, kdv_orani) üçlüleri
+
+    Returns:
+        Katkilar: (boyut, anahtar) başına alan değerleri
+    """
+    brut = tutar_yuvarla(satis['toplam_tutar'])
+    indirim = tutar_yuvarla(satis.get('indirim_tutari') or SIFIR)
+    katkilar: Katkilar = defaultdict(_bos_toplam)
+
+    genel = katkilar[(BOYUT_GENEL, '')]
+    genel.update(islem_sayisi=1, brut_tutar=brut, indirim_tutari=indirim, net_tutar=brut - indirim)
+
+    for odeme_turu, sayi, tutar in odemeler:
+        odeme = katkilar[(BOYUT_ODEME, odeme_turu)]
+        odeme['islem_sayisi'] += sayi
+        odeme['net_tutar'] += tutar_yuvarla(tutar)
+
+    satirlar = list(satirlar)
+    oran_brutleri: Dict[Decimal, Decimal] = defaultdict(lambda: SIFIR)
+    for _, tutar, kdv_orani in satirlar:
+        oran_brutleri[kdv_orani_normalle(kdv_orani)] += tutar_yuvarla(tutar)
+
+    for dilim in SepetToplamlari.satirlardan(satirlar, indirim).kdv_dokumu():
+        kdv = katkilar[(BOYUT_KDV, f"{dilim.oran:.2f}")]
+        kdv.update(islem_sayisi=1, brut_tutar=oran_brutleri[dilim.oran],
+                   indirim_tutari=oran_brutleri[dilim.oran] - dilim.tutar,
+                   net_tutar=dilim.tutar, matrah=dilim.matrah, kdv_tutari=dilim.kdv)
+        genel['matrah'] += dilim.matrah
+        genel['kdv_tutari'] += dilim.kdv
+
+    return dict(katkilar)
+
+
+def _iptal_katkisi(net_tutar: Decimal) -> Katkilar:
+    genel = _bos_toplam()
+    genel.update(iptal_sayisi=1, iptal_tutari=net_tutar)
+    return {(BOYUT_GENEL, ''): genel}
+
+
+def _ters_katki(katkilar: Katkilar) -> Katkilar:
+    return {
+        anahtar: {alan: -deger for alan, deger in degerler.items()}
+        for anahtar, degerler in katkilar.items()
+    }
+
+
+class GunSonuRepository:
+    """
+    Gün sonu toplamları repository'si
+
+    Sorgular Core ifadeleriyle yapılır. Yazan metodlar dış oturum
+    verilirse ona katılır; satış tamamlama ve iptal toplamları satışla
+    aynı transaction'da günceller.
+    """
+
+    def __init__(self, oturum_ac: Optional[Callable[[], ContextManager[Session]]] = None):
+        """
+        Args:
+            oturum_ac: Kendi oturumunu açan context manager (varsayılan postgresql_session)
+        """
+        self._oturum_ac = oturum_ac or postgresql_session
+        self._tablo = GunSonuToplami.__table__
+
+    def satis_ekle(self, satis_id: int, session: Optional[Session] = None) -> bool:
+        """
+        Tamamlanan satışın katkısını gün sonu toplamlarına ekler
+
+        Args:
+            satis_id: Satış kimliği
+            session: Satış tamamlama transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            bool: Satış bulunduysa True
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        return self._satisi_uygula(satis_id, katki=1, iptal=False, session=session)
+
+    def satis_cikar(self, satis_id: int, iptal: bool = True,
+                    session: Optional[Session] = None) -> bool:
+        """
+        Tamamlanmış durumdan çıkan satışın katkısını geri alır
+
+        Satışın günü, terminali ve kasiyeri değişmez; katkı eklendiği
+        kayıtlardan düşülür. Satış iptal ediliyorsa iptal sayısı/tutarı
+        da artırılır.
+
+        Args:
+            satis_id: Satış kimliği
+            iptal: Satış IPTAL durumuna geçiyorsa True
+            session: Durum değişikliği transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            bool: Satış bulunduysa True
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        return self._satisi_uygula(satis_id, katki=-1, iptal=iptal, session=session)
+
+    def iptal_ekle(self, satis_id: int, session: Optional[Session] = None) -> bool:
+        """
+        Katkısı önceden geri alınmış fiş numaralı satışın iptalini sayar
+
+        Tamamlandıktan sonra başka duruma alınıp sonra iptal edilen satış
+        için kullanılır; toplamlara dokunulmaz, yalnızca iptal sayısı/tutarı
+        artırılır.
+
+        Args:
+            satis_id: Satış kimliği
+            session: İptal transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            bool: Satış bulunduysa True
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        return self._satisi_uygula(satis_id, katki=0, iptal=True, session=session)
+
+    def ozet_getir(self, tarih: date, terminal_id: Optional[int] = None,
+                   kasiyer_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Gün, terminal veya vardiya toplamlarını okur
+
+        Z raporu terminal_id ile, X raporu terminal_id ve kasiyer_id ile
+        çağrılır; ikisi de verilmezse mağazanın tüm terminalleri toplanır.
+        Okunan kayıt sayısı vardiya × (ödeme türü + KDV oranı) kadardır.
+
+        Args:
+            tarih: Satış günü
+            terminal_id: Terminal kimliği (opsiyonel)
+            kasiyer_id: Kasiyer kimliği (opsiyonel)
+
+        Returns:
+            Dict[str, Any]: Genel toplamlar, 'odemeler' ve 'kdv_dokumu'
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        t = self._tablo
+        kosullar = [t.c.tarih == tarih]
+        if terminal_id:
+            kosullar.append(t.c.terminal_id == terminal_id)
+        if kasiyer_id:
+            kosullar.append(t.c.kasiyer_id == kasiyer_id)
+
+        try:
+            with self._oturum_ac() as oturum:
+                kayitlar = oturum.execute(
+                    select(t.c.boyut, t.c.anahtar, *(t.c[alan] for alan in TOPLAM_ALANLARI))
+                    .where(*kosullar)
+                ).mappings().all()
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Gün sonu toplamı okuma hatası: {str(e)}")
+
+        toplamlar: Katkilar = defaultdict(_bos_toplam)
+        for kayit in kayitlar:
+            toplam = toplamlar[(kayit['boyut'], kayit['anahtar'])]
+            for alan in TOPLAM_ALANLARI:
+                toplam[alan] += kayit[alan] if alan in _SAYI_ALANLARI else tutar_yuvarla(kayit[alan])
+
+        genel = toplamlar.get((BOYUT_GENEL, ''), _bos_toplam())
+        return {
+            'tarih': tarih.isoformat(),
+            'terminal_id': terminal_id,
+            'kasiyer_id': kasiyer_id,
+            'satis_sayisi': genel['islem_sayisi'],
+            'brut_tutar': genel['brut_tutar'],
+            'indirim_tutari': genel['indirim_tutari'],
+            'net_tutar': genel['net_tutar'],
+            'matrah': genel['matrah'],
+            'kdv_tutari': genel['kdv_tutari'],
+            'iptal_sayisi': genel['iptal_sayisi'],
+            'iptal_tutari': genel['iptal_tutari'],
+            'odemeler': {
+                anahtar: {'adet': toplam['islem_sayisi'], 'tutar': toplam['net_tutar']}
+                for (boyut, anahtar), toplam in sorted(toplamlar.items())
+                if boyut == BOYUT_ODEME and toplam['islem_sayisi']
+            },
+            'kdv_dokumu': {
+                anahtar: {'tutar': toplam['net_tutar'], 'matrah': toplam['matrah'],
+                          'kdv': toplam['kdv_tutari']}
+                for (boyut, anahtar), toplam in sorted(toplamlar.items())
+                if boyut == BOYUT_KDV and toplam['islem_sayisi']
+            }
+        }
+
+    def mutabakat_kontrol(self, tarih: date,
+                          terminal_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Kayıtlı toplamları ham satışlardan hesaplananlarla karşılaştırır
+
+        Args:
+            tarih: Satış günü
+            terminal_id: Yalnızca bu terminal (opsiyonel)
+
+        Returns:
+            List[Dict[str, Any]]: Farklı her alan için terminal_id, kasiyer_id,
+            boyut, anahtar, alan, kayitli ve hesaplanan (fark yoksa boş)
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        t = self._tablo
+        kosullar = [t.c.tarih == tarih]
+        if terminal_id:
+            kosullar.append(t.c.terminal_id == terminal_id)
+
+        try:
+            with self._oturum_ac() as oturum:
+                hesaplanan = self._ham_satislardan_hesapla(oturum, tarih, terminal_id)
+                kayitli: Dict[ToplamAnahtari, Dict[str, Any]] = {}
+                for kayit in oturum.execute(select(t).where(*kosullar)).mappings():
+                    kayitli[(kayit['terminal_id'], kayit['kasiyer_id'], kayit['boyut'], kayit['anahtar'])] = {
+                        alan: kayit[alan] if alan in _SAYI_ALANLARI else tutar_yuvarla(kayit[alan])
+                        for alan in TOPLAM_ALANLARI
+                    }
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Gün sonu mutabakat hatası: {str(e)}")
+
+        farklar = []
+        for anahtar in sorted(set(kayitli) | set(hesaplanan)):
+            kayit = kayitli.get(anahtar, _bos_toplam())
+            beklenen = hesaplanan.get(anahtar, _bos_toplam())
+            for alan in TOPLAM_ALANLARI:
+                if kayit[alan] != beklenen[alan]:
+                    farklar.append({
+                        'terminal_id': anahtar[0], 'kasiyer_id': anahtar[1],
+                        'boyut': anahtar[2], 'anahtar': anahtar[3],
+                        'alan': alan, 'kayitli': kayit[alan], 'hesaplanan': beklenen[alan]
+                    })
+        return farklar
+
+    def yeniden_olustur(self, tarih: date, terminal_id: Optional[int] = None,
+                        session: Optional[Session] = None) -> int:
+        """
+        Günün toplamlarını ham satışlardan yeniden kurar
+
+        Args:
+            tarih: Satış günü
+            terminal_id: Yalnızca bu terminal (opsiyonel)
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
+
+        Returns:
+            int: Yazılan toplam kaydı sayısı
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        t = self._tablo
+        kosullar = [t.c.tarih == tarih]
+        if terminal_id:
+            kosullar.append(t.c.terminal_id == terminal_id)
+
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                hesaplanan = self._ham_satislardan_hesapla(oturum, tarih, terminal_id)
+                oturum.execute(delete(t).where(*kosullar))
+                if hesaplanan:
+                    oturum.execute(t.insert(), [
+                        {'tarih': tarih, 'terminal_id': terminal, 'kasiyer_id': kasiyer,
+                         'boyut': boyut, 'anahtar': anahtar, **degerler}
+                        for (terminal, kasiyer, boyut, anahtar), degerler in hesaplanan.items()
+                    ])
+            return len(hesaplanan)
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Gün sonu yeniden oluşturma hatası: {str(e)}")
+
+    def _satisi_uygula(self, satis_id: int, katki: int, iptal: bool,
+                       session: Optional[Session]) -> bool:
+        """Satışın katkısını ekler (1), geri alır (-1) veya atlar (0); iptalde iptal sayısını artırır"""
+        s = Satis.__table__
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                satislar = self._satislari_oku(oturum, s.c.id == satis_id)
+                if not satislar:
+                    return False
+
+                satis, katkilar = satislar[0]
+                net_tutar = katkilar[(BOYUT_GENEL, '')]['net_tutar']
+                if katki < 0:
+                    katkilar = _ters_katki(katkilar)
+                elif katki == 0:
+                    katkilar = {(BOYUT_GENEL, ''): _bos_toplam()}
+                if iptal:
+                    katkilar[(BOYUT_GENEL, '')].update(iptal_sayisi=1, iptal_tutari=net_tutar)
+                self._katkilari_yaz(oturum, satis, katkilar)
+            return True
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"Gün sonu toplamı güncelleme hatası: {str(e)}")
+
+    def _katkilari_yaz(self, oturum: Session, satis: Dict[str, Any], katkilar: Katkilar) -> None:
+        """Katkıları tek INSERT ... ON CONFLICT DO UPDATE ile toplamlara ekler"""
+        t = self._tablo
+        insert = postgresql_insert if oturum.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        ifade = insert(t).values([
+            {'tarih': satis['satis_tarihi'].date(), 'terminal_id': satis['terminal_id'],
+             'kasiyer_id': satis['kasiyer_id'], 'boyut': boyut, 'anahtar': anahtar, **degerler}
+            for (boyut, anahtar), degerler in katkilar.items()
+        ])
+        oturum.execute(ifade.on_conflict_do_update(
+            index_elements=[t.c.tarih, t.c.terminal_id, t.c.kasiyer_id, t.c.boyut, t.c.anahtar],
+            set_={
+                **{alan: t.c[alan] + ifade.excluded[alan] for alan in TOPLAM_ALANLARI},
+                'guncelleme_tarihi': func.now()
+            }
+        ))
+
+    def _ham_satislardan_hesapla(self, oturum: Session, tarih: date,
+                                 terminal_id: Optional[int]) -> Dict[ToplamAnahtari, Dict[str, Any]]:
+        """
+        Günün tamamlanmış ve sonradan iptal edilmiş satışlarından toplamları hesaplar
+
+        Fiş numarası almış (bir kez tamamlanmış) IPTAL satışları iptal
+        sayısına girer; artımlı yol da yalnızca bu satışların IPTAL
+        durumuna geçişini sayar.
+        """
+        s = Satis.__table__
+        gun_baslangic = datetime.combine(tarih, time.min)
+        kosul = and_(
+            s.c.satis_tarihi >= gun_baslangic,
+            s.c.satis_tarihi < gun_baslangic + timedelta(days=1),
+            or_(s.c.durum == SatisDurum.TAMAMLANDI,
+                and_(s.c.durum == SatisDurum.IPTAL, s.c.fis_no.isnot(None)))
+        )
+        if terminal_id:
+            kosul = and_(kosul, s.c.terminal_id == terminal_id)
+
+        toplamlar: Dict[ToplamAnahtari, Dict[str, Any]] = defaultdict(_bos_toplam)
+        for satis, katkilar in self._satislari_oku(oturum, kosul):
+            if satis['durum'] == SatisDurum.IPTAL:
+                katkilar = _iptal_katkisi(katkilar[(BOYUT_GENEL, '')]['net_tutar'])
+            for (boyut, anahtar), degerler in katkilar.items():
+                toplam = toplamlar[(satis['terminal_id'], satis['kasiyer_id'], boyut, anahtar)]
+                for alan, deger in degerler.items():
+                    toplam[alan] += deger
+        return dict(toplamlar)
+
+    def _satislari_oku(self, oturum: Session, kosul) -> List[Tuple[Dict[str, Any], Katkilar]]:
+        """Koşula uyan satışları ödeme ve satır toplamlarıyla birlikte üç sorguda okur"""
+        s = Satis.__table__
+        o = SatisOdeme.__table__
+        ss = SepetSatiri.__table__
+
+        satislar = oturum.execute(
+            select(s.c.id, s.c.sepet_id, s.c.terminal_id, s.c.kasiyer_id, s.c.satis_tarihi,
+                   s.c.toplam_tutar, s.c.indirim_tutari, s.c.durum)
+            .where(kosul)
+        ).mappings().all()
+        if not satislar:
+            return []
+
+        secilen = select(s.c.id).where(kosul)
+        odemeler: Dict[int, List[Tuple[str, int, Any]]] = defaultdict(list)
+        for satis_id, odeme_turu, sayi, tutar in oturum.execute(
+            select(o.c.satis_id, o.c.odeme_turu, func.count(o.c.id), func.sum(o.c.tutar))
+            .where(o.c.satis_id.in_(secilen))
+            .group_by(o.c.satis_id, o.c.odeme_turu)
+        ):
+            odemeler[satis_id].append((getattr(odeme_turu, 'value', odeme_turu), sayi, tutar))
+
+        satirlar: Dict[int, List[Tuple[Any, Any, Any]]] = defaultdict(list)
+        for sepet_id, satir_id, tutar, kdv_orani in oturum.execute(
+            select(ss.c.sepet_id, ss.c.id, ss.c.toplam_tutar, ss.c.kdv_orani)
+            .where(ss.c.sepet_id.in_(select(s.c.sepet_id).where(kosul)))
+        ):
+            satirlar[sepet_id].append((satir_id, tutar, kdv_orani))
+
+        return [
+            (dict(satis), satis_katkilari(satis, odemeler[satis['id']], satirlar[satis['sepet_id']]))
+            for satis in satislar
+        ]
+
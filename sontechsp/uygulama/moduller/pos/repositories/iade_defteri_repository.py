@@ -0,0 +1,256 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.repositories.iade_defteri_repository
+# Description: Satış satırı başına iade edilebilir adet defteri
+# Changelog:
+# - İlk oluşturma
+# - Tekrar kayıtta iade edilen adet korunuyor; satır net tutarı indirim tekrar düşülmeden alınıyor
+
+"""
+İade Defteri Repository
+
+Tamamlanan her satış satırı için pos_iade_edilebilir_satir tablosunda
+satılan ve iade edilen adet tutulur:
+
+- Satış tamamlanırken satırlar sepetten tek INSERT ... SELECT ile, satış
+  transaction'ı içinde kopyalanır. Deftere zaten yazılmış satırlar
+  atlanır; iade edilen adet hiçbir zaman sıfırlanmaz.
+- İade satırı eklenirken adet koşullu UPDATE ile ayrılır
+  (iade_edilen_adet + adet <= satilan_adet). İki terminal aynı satırı
+  aynı anda iade etse de toplam satılan adedi aşamaz.
+- İade ekranı fiş no veya barkodla indeksten tek okuma yapar; orijinal
+  satış ve önceki iadeler yüklenmez.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+from sqlalchemy import Integer, String, exists, insert, literal, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.baglanti import postgresql_session
+from sontechsp.uygulama.moduller.pos.database.models.iade import IadeEdilebilirSatir
+from sontechsp.uygulama.moduller.pos.database.models.sepet import SepetSatiri
+from sontechsp.uygulama.moduller.pos.hatalar import IadeHatasi
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi, VeritabaniHatasi
+
+_KURUS = Decimal('0.01')
+
+
+class IadeDefteriRepository:
+    """
+    İade edilebilir adet defteri repository'si
+
+    Sorgular Core ifadeleriyle (IadeEdilebilirSatir.__table__) yapılır.
+    Yazan metodlar dış oturum verilirse ona katılır.
+    """
+
+    def __init__(self, oturum_ac: Optional[Callable[[], ContextManager[Session]]] = None):
+        """
+        Args:
+            oturum_ac: Kendi oturumunu açan context manager (varsayılan postgresql_session)
+        """
+        self._oturum_ac = oturum_ac or postgresql_session
+        self._tablo = IadeEdilebilirSatir.__table__
+
+    def satis_satirlarini_kaydet(self, satis_id: int, sepet_id: int, fis_no: Optional[str],
+                                 session: Optional[Session] = None) -> int:
+        """
+        Satışın sepet satırlarını deftere kopyalar
+
+        Sepet satırının toplam_tutar'ı satır indirimi düşülmüş nettir ve
+        olduğu gibi alınır. Aynı satış için tekrar çağrılırsa yalnızca
+        defterde olmayan satırlar eklenir ve fiş no güncellenir; iade
+        edilen adetler korunur.
+
+        Args:
+            satis_id: Satış kimliği
+            sepet_id: Satışın sepet kimliği
+            fis_no: Satış fiş numarası
+            session: Satış tamamlama transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            int: Deftere yazılan satır sayısı
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        t = self._tablo
+        s = SepetSatiri.__table__
+        kaynak = select(
+            literal(satis_id, Integer), s.c.id, literal(fis_no, String), s.c.urun_id,
+            s.c.barkod, s.c.urun_adi, s.c.adet, literal(0, Integer),
+            s.c.toplam_tutar
+        ).where(
+            s.c.sepet_id == sepet_id,
+            ~exists().where(t.c.sepet_satiri_id == s.c.id)
+        )
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                oturum.execute(
+                    update(t)
+                    .where(t.c.satis_id == satis_id, t.c.fis_no.is_distinct_from(fis_no))
+                    .values(fis_no=fis_no)
+                )
+                sonuc = oturum.execute(insert(t).from_select(
+                    ['satis_id', 'sepet_satiri_id', 'fis_no', 'urun_id', 'barkod', 'urun_adi',
+                     'satilan_adet', 'iade_edilen_adet', 'net_tutar'],
+                    kaynak
+                ))
+            return sonuc.rowcount
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"İade defteri kayıt hatası: {str(e)}")
+
+    def iade_edilebilir_satirlar(self, fis_no: Optional[str] = None, barkod: Optional[str] = None,
+                                 satis_id: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Fiş no, satış veya barkodla iade edilebilir satırları getirir
+
+        Yalnızca kalan adedi olan satırlar döner; barkodla aramada en yeni
+        satış önce gelir.
+
+        Args:
+            fis_no: Satış fiş numarası
+            barkod: Ürün barkodu
+            satis_id: Satış kimliği
+            limit: En fazla dönecek satır sayısı
+
+        Returns:
+            List[Dict[str, Any]]: satis_id, sepet_satiri_id, fis_no, urun_id,
+            barkod, urun_adi, satilan_adet, iade_edilen_adet, kalan_adet,
+            net_tutar ve birim_iade_tutari içeren satırlar
+
+        Raises:
+            DogrulamaHatasi: Hiçbir arama ölçütü verilmezse
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if not fis_no and not barkod and not satis_id:
+            raise DogrulamaHatasi("iade_arama", "Fiş numarası, satış ID veya barkod gereklidir")
+
+        t = self._tablo
+        kosullar = [t.c.iade_edilen_adet < t.c.satilan_adet]
+        if fis_no:
+            kosullar.append(t.c.fis_no == fis_no.strip())
+        if satis_id:
+            kosullar.append(t.c.satis_id == satis_id)
+        if barkod:
+            kosullar.append(t.c.barkod == barkod.strip())
+
+        try:
+            with self._oturum_ac() as oturum:
+                satirlar = oturum.execute(
+                    select(t.c.satis_id, t.c.sepet_satiri_id, t.c.fis_no, t.c.urun_id, t.c.barkod,
+                           t.c.urun_adi, t.c.satilan_adet, t.c.iade_edilen_adet, t.c.net_tutar)
+                    .where(*kosullar)
+                    .order_by(t.c.satis_id.desc(), t.c.sepet_satiri_id)
+                    .limit(limit)
+                ).mappings().all()
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"İade defteri okuma hatası: {str(e)}")
+
+        sonuc = []
+        for satir in satirlar:
+            kayit = dict(satir)
+            kayit['kalan_adet'] = kayit['satilan_adet'] - kayit['iade_edilen_adet']
+            kayit['birim_iade_tutari'] = (
+                Decimal(kayit['net_tutar']) / kayit['satilan_adet']
+            ).quantize(_KURUS, rounding=ROUND_HALF_UP)
+            sonuc.append(kayit)
+        return sonuc
+
+    def iade_adedi_ayir(self, adet: int, satis_id: Optional[int] = None,
+                        barkod: Optional[str] = None, sepet_satiri_id: Optional[int] = None,
+                        session: Optional[Session] = None) -> int:
+        """
+        Satış satırından iade adedi ayırır
+
+        sepet_satiri_id verilmezse satışta barkodu eşleşen ve yeterli kalanı
+        olan ilk satır seçilir. Ayırma tek koşullu UPDATE'tir; kalan aynı
+        anda başka iadeyle tükenirse hata verilir.
+
+        Args:
+            adet: İade edilecek adet
+            satis_id: Orijinal satış kimliği (sepet_satiri_id yoksa zorunlu)
+            barkod: Ürün barkodu (sepet_satiri_id yoksa zorunlu)
+            sepet_satiri_id: Orijinal sepet satırı kimliği
+            session: İade transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            int: Adedin ayrıldığı sepet satırı kimliği
+
+        Raises:
+            DogrulamaHatasi: Geçersiz parametreler
+            IadeHatasi: Satırda yeterli iade edilebilir adet yoksa
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if adet <= 0:
+            raise DogrulamaHatasi("iade_adet", "Adet pozitif olmalıdır")
+        if not sepet_satiri_id and not (satis_id and barkod):
+            raise DogrulamaHatasi("iade_satiri", "Sepet satırı ID veya satış ID ile barkod gereklidir")
+
+        t = self._tablo
+        yeterli = t.c.iade_edilen_adet + adet <= t.c.satilan_adet
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                if not sepet_satiri_id:
+                    sepet_satiri_id = oturum.execute(
+                        select(t.c.sepet_satiri_id)
+                        .where(t.c.satis_id == satis_id, t.c.barkod == barkod.strip(), yeterli)
+                        .order_by(t.c.sepet_satiri_id)
+                        .limit(1)
+                    ).scalar()
+                    if sepet_satiri_id is None:
+                        raise IadeHatasi(
+                            f"Satışta iade edilebilir {adet} adet bulunamadı - Barkod: {barkod}",
+                            satis_id=satis_id
+                        )
+
+                kosullar = [t.c.sepet_satiri_id == sepet_satiri_id, yeterli]
+                if satis_id:
+                    kosullar.append(t.c.satis_id == satis_id)
+                sonuc = oturum.execute(
+                    update(t)
+                    .where(*kosullar)
+                    .values(iade_edilen_adet=t.c.iade_edilen_adet + adet)
+                )
+                if sonuc.rowcount != 1:
+                    raise IadeHatasi(
+                        f"İade edilebilir adet aşıldı - Sepet satırı: {sepet_satiri_id}, Adet: {adet}",
+                        satis_id=satis_id
+                    )
+            return sepet_satiri_id
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"İade adedi ayırma hatası: {str(e)}")
+
+    def iade_adedi_geri_al(self, sepet_satiri_id: int, adet: int,
+                           session: Optional[Session] = None) -> bool:
+        """
+        Silinen veya azaltılan iade satırının adedini deftere geri verir
+
+        Args:
+            sepet_satiri_id: Orijinal sepet satırı kimliği
+            adet: Geri verilecek adet
+            session: İade transaction'ı (verilirse commit çağıranındır)
+
+        Returns:
+            bool: Defterde güncellenen satır varsa True
+
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if adet <= 0:
+            return False
+
+        t = self._tablo
+        try:
+            with islem_oturumu(self._oturum_ac, session) as oturum:
+                sonuc = oturum.execute(
+                    update(t)
+                    .where(t.c.sepet_satiri_id == sepet_satiri_id, t.c.iade_edilen_adet >= adet)
+                    .values(iade_edilen_adet=t.c.iade_edilen_adet - adet)
+                )
+            return sonuc.rowcount == 1
+        except SQLAlchemyError as e:
+            raise VeritabaniHatasi(f"İade adedi geri alma hatası: {str(e)}")
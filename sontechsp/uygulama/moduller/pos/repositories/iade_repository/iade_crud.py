@@ -1,20 +1,25 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.iade_repository.iade_crud
 # Description: İade CRUD işlemleri
 # Changelog:
 # - Refactoring: Ana dosyadan CRUD işlemleri ayrıldı
+# - İade satırı ekleme/güncelleme/silme iade defterini aynı transaction'da günceller
 
 """
 İade CRUD İşlemleri
 
 Bu modül iade ve iade satırı temel CRUD operasyonlarını yönetir.
 Oluşturma, okuma, güncelleme ve silme işlemleri sağlar.
+
+İade satırı adedi orijinal satış satırının iade defterinden aynı
+transaction'da ayrılır (bkz. iade_defteri_repository); satılandan fazlası
+iade edilemez.
 """
 
 from decimal import Decimal
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -24,6 +29,7 @@ from sontechsp.uygulama.moduller.pos.database.models.iade import (
     Iade, IadeSatiri, iade_validasyon, iade_satiri_validasyon
 )
 from sontechsp.uygulama.moduller.pos.database.models.satis import Satis
+from sontechsp.uygulama.moduller.pos.repositories.iade_defteri_repository import IadeDefteriRepository
 from sontechsp.uygulama.cekirdek.hatalar import (
     VeritabaniHatasi, DogrulamaHatasi, SontechHatasi
 )
@@ -36,6 +42,9 @@ class IadeCrud:
     Temel iade ve iade satırı CRUD operasyonlarını yönetir.
     """
     
+    # Satış satırı başına iade edilebilir adet defteri
+    _iade_defteri = IadeDefteriRepository()
+    
     def iade_olustur(self, orijinal_satis_id: int, terminal_id: int, kasiyer_id: int,
                     neden: str, musteri_id: Optional[int] = None, 
                     notlar: Optional[str] = None) -> int:
@@ -186,6 +195,26 @@ class IadeCrud:
             except SQLAlchemyError as e:
                 raise VeritabaniHatasi(f"İade getirme hatası: {str(e)}")
     
+    def iade_edilebilir_satirlar(self, fis_no: Optional[str] = None,
+                                 barkod: Optional[str] = None,
+                                 satis_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fiş no, satış veya barkodla kalan iade edilebilir satış satırlarını getirir
+        
+        Args:
+            fis_no: Satış fiş numarası
+            barkod: Ürün barkodu
+            satis_id: Satış kimliği
+            
+        Returns:
+            Kalan adedi olan satış satırları (bkz. IadeDefteriRepository)
+            
+        Raises:
+            DogrulamaHatasi: Hiçbir arama ölçütü verilmezse
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        return self._iade_defteri.iade_edilebilir_satirlar(fis_no=fis_no, barkod=barkod, satis_id=satis_id)
+    
     def iade_satiri_ekle(self, iade_id: int, urun_id: int, barkod: str, urun_adi: str,
                         adet: int, birim_fiyat: Decimal, 
                         orijinal_sepet_satiri_id: Optional[int] = None,
@@ -200,7 +229,8 @@ class IadeCrud:
             urun_adi: Ürün adı
             adet: İade edilen adet
             birim_fiyat: Birim fiyat
-            orijinal_sepet_satiri_id: Orijinal sepet satırı kimliği (opsiyonel)
+            orijinal_sepet_satiri_id: Orijinal sepet satırı kimliği (opsiyonel;
+                verilmezse orijinal satışta barkodla bulunur)
             iade_nedeni: Bu satır için özel iade nedeni (opsiyonel)
             
         Returns:
@@ -209,6 +239,7 @@ class IadeCrud:
         Raises:
             DogrulamaHatasi: Geçersiz parametreler
             SontechHatasi: İade bulunamadı
+            IadeHatasi: Satış satırında yeterli iade edilebilir adet yoksa
             VeritabaniHatasi: Veritabanı hatası
         """
         if iade_id <= 0:
@@ -236,6 +267,12 @@ class IadeCrud:
                 if not iade:
                     raise SontechHatasi(f"İade bulunamadı: {iade_id}")
                 
+                # Adedi orijinal satış satırının defterinden ayır
+                orijinal_sepet_satiri_id = self._iade_defteri.iade_adedi_ayir(
+                    adet, satis_id=iade.orijinal_satis_id, barkod=barkod,
+                    sepet_satiri_id=orijinal_sepet_satiri_id, session=session
+                )
+                
                 # Yeni satır oluştur
                 yeni_satir = IadeSatiri(
                     iade_id=iade_id,
@@ -281,6 +318,7 @@ class IadeCrud:
         Raises:
             DogrulamaHatasi: Geçersiz parametreler
             SontechHatasi: Satır bulunamadı
+            IadeHatasi: Artan adet için yeterli iade edilebilir adet yoksa
             VeritabaniHatasi: Veritabanı hatası
         """
         if satir_id <= 0:
@@ -295,6 +333,17 @@ class IadeCrud:
                 if not satir:
                     raise SontechHatasi(f"İade satırı bulunamadı: {satir_id}")
                 
+                # Adet farkını defterden ayır veya geri ver
+                fark = adet - satir.adet
+                if satir.orijinal_sepet_satiri_id and fark > 0:
+                    self._iade_defteri.iade_adedi_ayir(
+                        fark, sepet_satiri_id=satir.orijinal_sepet_satiri_id, session=session
+                    )
+                elif satir.orijinal_sepet_satiri_id and fark < 0:
+                    self._iade_defteri.iade_adedi_geri_al(
+                        satir.orijinal_sepet_satiri_id, -fark, session=session
+                    )
+                
                 # Adedi güncelle
                 satir.adet = adet
                 satir.toplam_tutar_guncelle()
@@ -340,6 +389,12 @@ class IadeCrud:
                 
                 iade_id = satir.iade_id
                 
+                # İade edilen adedi deftere geri ver
+                if satir.orijinal_sepet_satiri_id:
+                    self._iade_defteri.iade_adedi_geri_al(
+                        satir.orijinal_sepet_satiri_id, satir.adet, session=session
+                    )
+                
                 # Satırı sil
                 session.delete(satir)
                 
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.iade_repository.is_kurallari
 # Description: İade iş kuralları
 # Changelog:
 # - Refactoring: Ana dosyadan iş kuralları ayrıldı
+# - Önceki iadeler yüklenmeden toplamları tek sorguda okunuyor
 
 """
 İade İş Kuralları
@@ -15,6 +16,7 @@ Orijinal satış doğrulama ve iade edilebilirlik kontrolü sağlar.
 from decimal import Decimal
 from datetime import datetime
 from typing import Dict, Any
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -58,12 +60,11 @@ class IsKurallari:
                 if not satis:
                     raise SontechHatasi(f"Satış bulunamadı: {satis_id}")
                 
-                # Mevcut iadeleri kontrol et
-                mevcut_iadeler = session.query(Iade).filter(
-                    Iade.orijinal_satis_id == satis_id
-                ).all()
-                
-                toplam_iade_tutari = sum(iade.toplam_tutar for iade in mevcut_iadeler)
+                # Mevcut iadelerin toplamı ve sayısı (satırlar yüklenmez)
+                toplam_iade_tutari, mevcut_iade_sayisi = session.query(
+                    func.coalesce(func.sum(Iade.toplam_tutar), 0), func.count(Iade.id)
+                ).filter(Iade.orijinal_satis_id == satis_id).one()
+                toplam_iade_tutari = Decimal(str(toplam_iade_tutari))
                 
                 # İade edilebilirlik kontrolü
                 iade_edilebilir = (
@@ -82,7 +83,7 @@ class IsKurallari:
                     'iade_edilebilir': iade_edilebilir,
                     'toplam_iade_tutari': float(toplam_iade_tutari),
                     'kalan_iade_tutari': float(satis.net_tutar_hesapla() - toplam_iade_tutari),
-                    'mevcut_iade_sayisi': len(mevcut_iadeler)
+                    'mevcut_iade_sayisi': mevcut_iade_sayisi
                 }
                 
             except SQLAlchemyError as e:
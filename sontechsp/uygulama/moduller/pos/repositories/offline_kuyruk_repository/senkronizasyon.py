@@ -1,22 +1,28 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.offline_kuyruk_repository.senkronizasyon
 # Description: Kuyruk senkronizasyon işlemleri
 # Changelog:
 # - Refactoring: Ana dosyadan senkronizasyon işlemleri ayrıldı
+# - Toplu sahiplenme ve toplu onay (tek UPDATE) eklendi
+# - Gönderilmeyen sahiplenmeyi bırakma eklendi
 
 """
 Kuyruk Senkronizasyon İşlemleri
 
 Bu modül offline kuyruk senkronizasyon ve durum yönetimi işlemlerini yönetir.
 Kuyruk durumu güncelleme, deneme artırma ve listeleme işlemleri sağlar.
+
+Senkronizasyon döngüsü kayıtları toplu işler: bekleyenleri_sahiplen N
+kaydı tek UPDATE ... RETURNING ile ISLENIYOR yapıp döndürür; sonuçlar
+toplu_tamamla / toplu_deneme_artir ile yine tek UPDATE'te yazılır.
 """
 
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, case, literal, select, update
 
 from sontechsp.uygulama.veritabani.baglanti import sqlite_session
 from sontechsp.uygulama.moduller.pos.arayuzler import KuyrukDurum
@@ -299,4 +305,208 @@ class Senkronizasyon:
         except SQLAlchemyError as e:
             raise VeritabaniHatasi(f"İşlem hata işaretleme hatası: {str(e)}")
         except Exception as e:
-            raise SontechHatasi(f"İşlem hata işaretleme işlemi başarısız: {str(e)}")
\ No newline at end of file
+            raise SontechHatasi(f"İşlem hata işaretleme işlemi başarısız: {str(e)}")
+    
+    def bekleyenleri_sahiplen(self, limit: int = 50, terminal_id: Optional[int] = None,
+                              son_deneme_oncesi: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Bekleyen kayıtları tek ifadede sahiplenir (ISLENIYOR yapar)
+        
+        Args:
+            limit: Sahiplenilecek en fazla kayıt sayısı
+            terminal_id: Terminal kimliği (opsiyonel)
+            son_deneme_oncesi: Verilirse yalnızca bu zamandan önce denenmiş
+                veya hiç denenmemiş kayıtlar alınır (aynı turda başarısız
+                olan kayıt tekrar sahiplenilmez)
+            
+        Returns:
+            Sahiplenilen kayıtlar (öncelik ve işlem tarihi sırasıyla)
+            
+        Raises:
+            DogrulamaHatasi: Geçersiz parametreler
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if limit <= 0 or limit > 1000:
+            raise DogrulamaHatasi("Limit 1-1000 arasında olmalıdır")
+        
+        t = OfflineKuyruk.__table__
+        secim = select(t.c.id).where(t.c.durum == KuyrukDurum.BEKLEMEDE)
+        if terminal_id:
+            secim = secim.where(t.c.terminal_id == terminal_id)
+        if son_deneme_oncesi is not None:
+            secim = secim.where(or_(t.c.son_deneme_tarihi.is_(None),
+                                    t.c.son_deneme_tarihi < son_deneme_oncesi))
+        secim = secim.order_by(t.c.oncelik, t.c.islem_tarihi, t.c.id).limit(limit)
+        
+        with sqlite_session() as session:
+            try:
+                satirlar = session.execute(
+                    update(t)
+                    .where(t.c.id.in_(secim.scalar_subquery()))
+                    .values(durum=KuyrukDurum.ISLENIYOR, son_deneme_tarihi=datetime.now())
+                    .returning(t.c.id, t.c.islem_turu, t.c.veri, t.c.terminal_id,
+                               t.c.kasiyer_id, t.c.islem_tarihi, t.c.deneme_sayisi,
+                               t.c.max_deneme_sayisi, t.c.oncelik)
+                ).mappings().all()
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise VeritabaniHatasi(f"Kuyruk sahiplenme hatası: {str(e)}")
+        
+        # RETURNING sırası garanti değildir
+        satirlar = sorted(satirlar, key=lambda s: (s['oncelik'], s['islem_tarihi'], s['id']))
+        return [{
+            'id': satir['id'],
+            'islem_turu': satir['islem_turu'].value,
+            'durum': KuyrukDurum.ISLENIYOR.value,
+            'veri': satir['veri'],
+            'terminal_id': satir['terminal_id'],
+            'kasiyer_id': satir['kasiyer_id'],
+            'islem_tarihi': satir['islem_tarihi'].isoformat(),
+            'deneme_sayisi': satir['deneme_sayisi'],
+            'max_deneme_sayisi': satir['max_deneme_sayisi'],
+            'oncelik': satir['oncelik']
+        } for satir in satirlar]
+    
+    def toplu_tamamla(self, kuyruk_idleri: List[int]) -> int:
+        """
+        Kayıtları tek UPDATE ile tamamlandı olarak işaretler
+        
+        Args:
+            kuyruk_idleri: Kuyruk kimlikleri
+            
+        Returns:
+            Güncellenen kayıt sayısı
+            
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if not kuyruk_idleri:
+            return 0
+        
+        t = OfflineKuyruk.__table__
+        with sqlite_session() as session:
+            try:
+                sonuc = session.execute(
+                    update(t)
+                    .where(t.c.id.in_(kuyruk_idleri))
+                    .values(durum=KuyrukDurum.TAMAMLANDI, tamamlanma_tarihi=datetime.now(),
+                            hata_mesaji=None)
+                )
+                session.commit()
+                return sonuc.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise VeritabaniHatasi(f"Toplu tamamlama hatası: {str(e)}")
+    
+    def toplu_deneme_artir(self, kuyruk_idleri: List[int], hata_mesaji: str) -> int:
+        """
+        Kayıtların deneme sayısını tek UPDATE ile artırır
+        
+        kuyruk_deneme_artir ile aynı kuraldır: deneme hakkı kalan kayıt
+        BEKLEMEDE'ye döner, maksimum denemeye ulaşan HATA'da kalır.
+        
+        Args:
+            kuyruk_idleri: Kuyruk kimlikleri
+            hata_mesaji: Hata mesajı
+            
+        Returns:
+            Güncellenen kayıt sayısı
+            
+        Raises:
+            DogrulamaHatasi: Hata mesajı boş
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if not hata_mesaji or not hata_mesaji.strip():
+            raise DogrulamaHatasi("Hata mesajı boş olamaz")
+        if not kuyruk_idleri:
+            return 0
+        
+        t = OfflineKuyruk.__table__
+        yeni_deneme = t.c.deneme_sayisi + 1
+        asildi = yeni_deneme >= t.c.max_deneme_sayisi
+        with sqlite_session() as session:
+            try:
+                sonuc = session.execute(
+                    update(t)
+                    .where(t.c.id.in_(kuyruk_idleri))
+                    .values(
+                        deneme_sayisi=yeni_deneme,
+                        son_deneme_tarihi=datetime.now(),
+                        durum=case(
+                            (asildi, literal(KuyrukDurum.HATA, t.c.durum.type)),
+                            else_=literal(KuyrukDurum.BEKLEMEDE, t.c.durum.type)
+                        ),
+                        hata_mesaji=case(
+                            (asildi, f"Maksimum deneme sayısı aşıldı: {hata_mesaji}"),
+                            else_=hata_mesaji
+                        )
+                    )
+                )
+                session.commit()
+                return sonuc.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise VeritabaniHatasi(f"Toplu deneme artırma hatası: {str(e)}")
+    
+    def sahipsiz_islemleri_geri_al(self, zaman_asimi_saniye: int) -> int:
+        """
+        Yarıda kalmış (ör. çökme sonrası) sahiplenmeleri BEKLEMEDE'ye döndürür
+        
+        Args:
+            zaman_asimi_saniye: Bu süreden eski ISLENIYOR kayıtlar geri alınır
+            
+        Returns:
+            Geri alınan kayıt sayısı
+            
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        t = OfflineKuyruk.__table__
+        sinir = datetime.now() - timedelta(seconds=zaman_asimi_saniye)
+        with sqlite_session() as session:
+            try:
+                sonuc = session.execute(
+                    update(t)
+                    .where(t.c.durum == KuyrukDurum.ISLENIYOR,
+                           or_(t.c.son_deneme_tarihi.is_(None), t.c.son_deneme_tarihi < sinir))
+                    .values(durum=KuyrukDurum.BEKLEMEDE)
+                )
+                session.commit()
+                return sonuc.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise VeritabaniHatasi(f"Sahipsiz kuyruk geri alma hatası: {str(e)}")
+    
+    def sahiplenmeyi_birak(self, kuyruk_idleri: List[int]) -> int:
+        """
+        Sahiplenilip gönderilmeyen kayıtları BEKLEMEDE'ye döndürür
+        
+        Deneme sayısı artmaz; son_deneme_tarihi sahiplenme zamanında
+        kaldığından kayıt aynı senkronizasyon turunda yeniden sahiplenilmez.
+        
+        Args:
+            kuyruk_idleri: Kuyruk kimlikleri
+            
+        Returns:
+            Geri bırakılan kayıt sayısı
+            
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if not kuyruk_idleri:
+            return 0
+        
+        t = OfflineKuyruk.__table__
+        with sqlite_session() as session:
+            try:
+                sonuc = session.execute(
+                    update(t)
+                    .where(t.c.id.in_(kuyruk_idleri), t.c.durum == KuyrukDurum.ISLENIYOR)
+                    .values(durum=KuyrukDurum.BEKLEMEDE)
+                )
+                session.commit()
+                return sonuc.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise VeritabaniHatasi(f"Kuyruk sahiplenme bırakma hatası: {str(e)}")
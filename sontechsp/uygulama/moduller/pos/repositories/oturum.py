@@ -0,0 +1,39 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.repositories.oturum
+# Description: POS repository'leri için ortak transaction yardımcısı
+# Changelog:
+# - İlk oluşturma
+
+"""
+POS Repository Oturum Yardımcısı
+
+Satış tamamlama hattı satış, ödeme, stok ve sepet yazımlarını tek
+transaction içinde yapar. Repository metodları dış oturum verilirse ona
+katılır (commit/rollback çağıranındır); verilmezse eskisi gibi kendi
+PostgreSQL oturumunu açıp commit eder.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def islem_oturumu(oturum_ac: Callable[[], ContextManager[Session]],
+                  session: Optional[Session] = None) -> Iterator[Session]:
+    """
+    Dış oturum varsa onu kullanır, yoksa kendi transaction'ını açıp kapatır
+
+    Args:
+        oturum_ac: Kendi oturumunu açan context manager (postgresql_session)
+        session: Dış transaction oturumu (commit/rollback çağıranındır)
+    """
+    if session is not None:
+        yield session
+        return
+
+    with oturum_ac() as oturum:
+        yield oturum
+        oturum.commit()
@@ -1,9 +1,14 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.satis_repository.satis_crud
 # Description: Satış CRUD işlemleri
 # Changelog:
 # - Refactoring: Ana dosyadan CRUD işlemleri ayrıldı
+# - satis_olustur/satis_tamamla dış transaction'a katılabilir
+# - satis_tamamla satış satırlarını iade defterine yazar
+# - Tamamlama ve iptal gün sonu (X/Z) toplamlarını aynı transaction'da günceller
+# - İade defteri yalnızca ilk tamamlamada yazılıyor; satis_durum_guncelle de yazıyor
+# - Gün sonu iptal sayısı yalnızca IPTAL durumuna geçişte artıyor
 
 """
 Satış CRUD İşlemleri
@@ -20,6 +25,9 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from sontechsp.uygulama.veritabani.baglanti import postgresql_session
 from sontechsp.uygulama.moduller.pos.arayuzler import ISatisRepository, SatisDurum, OdemeTuru
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
+from sontechsp.uygulama.moduller.pos.repositories.iade_defteri_repository import IadeDefteriRepository
+from sontechsp.uygulama.moduller.pos.repositories.gun_sonu_repository import GunSonuRepository
 from sontechsp.uygulama.moduller.pos.database.models.satis import (
     Satis, SatisOdeme, satis_validasyon, satis_odeme_validasyon
 )
@@ -37,7 +45,8 @@ class SatisCrud:
     
     def satis_olustur(self, sepet_id: int, terminal_id: int, kasiyer_id: int,
                      toplam_tutar: Decimal, indirim_tutari: Optional[Decimal] = None,
-                     musteri_id: Optional[int] = None, notlar: Optional[str] = None) -> int:
+                     musteri_id: Optional[int] = None, notlar: Optional[str] = None,
+                     session: Optional[Session] = None) -> int:
         """
         Yeni satış kaydı oluşturur
         
@@ -49,6 +58,7 @@ class SatisCrud:
             indirim_tutari: İndirim tutarı (opsiyonel)
             musteri_id: Müşteri kimliği (opsiyonel)
             notlar: Satış notları (opsiyonel)
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
             
         Returns:
             Oluşturulan satış ID'si
@@ -75,7 +85,7 @@ class SatisCrud:
         if musteri_id and musteri_id <= 0:
             raise DogrulamaHatasi("Müşteri ID pozitif olmalıdır")
         
-        with postgresql_session() as session:
+        with islem_oturumu(postgresql_session, session) as oturum:
             try:
                 # Yeni satış oluştur
                 yeni_satis = Satis(
@@ -95,13 +105,12 @@ class SatisCrud:
                 if hatalar:
                     raise DogrulamaHatasi(f"Satış validasyon hataları: {', '.join(hatalar)}")
                 
-                session.add(yeni_satis)
-                session.commit()
+                oturum.add(yeni_satis)
+                oturum.flush()
                 
                 return yeni_satis.id
                 
             except SQLAlchemyError as e:
-                session.rollback()
                 raise VeritabaniHatasi(f"Satış oluşturma hatası: {str(e)}")
     
     def satis_getir(self, satis_id: int) -> Optional[Dict[str, Any]]:
@@ -203,6 +212,7 @@ class SatisCrud:
                 if not satis:
                     raise SontechHatasi(f"Satış bulunamadı: {satis_id}")
                 
+                onceki_durum = satis.durum
                 satis.durum = yeni_durum
                 if fis_no:
                     satis.fis_no = fis_no
@@ -212,6 +222,20 @@ class SatisCrud:
                 if hatalar:
                     raise DogrulamaHatasi(f"Satış validasyon hataları: {', '.join(hatalar)}")
                 
+                # İade defteri ve gün sonu toplamları tamamlanmış satışları içerir
+                session.flush()
+                if onceki_durum != SatisDurum.TAMAMLANDI and yeni_durum == SatisDurum.TAMAMLANDI:
+                    IadeDefteriRepository().satis_satirlarini_kaydet(
+                        satis_id, satis.sepet_id, satis.fis_no, session=session
+                    )
+                    GunSonuRepository().satis_ekle(satis_id, session=session)
+                elif onceki_durum == SatisDurum.TAMAMLANDI and yeni_durum != SatisDurum.TAMAMLANDI:
+                    GunSonuRepository().satis_cikar(
+                        satis_id, iptal=yeni_durum == SatisDurum.IPTAL, session=session
+                    )
+                elif onceki_durum != SatisDurum.IPTAL and yeni_durum == SatisDurum.IPTAL and satis.fis_no:
+                    GunSonuRepository().iptal_ekle(satis_id, session=session)
+                
                 session.commit()
                 return True
                 
@@ -251,6 +275,13 @@ class SatisCrud:
                 if satis.durum == SatisDurum.IPTAL:
                     raise SontechHatasi("Satış zaten iptal edilmiş")
                 
+                # Tamamlanmış satışın gün sonu katkısını geri al; katkısı
+                # önceden geri alınmış fiş numaralı satışın yalnızca iptali sayılır
+                if satis.durum == SatisDurum.TAMAMLANDI:
+                    GunSonuRepository().satis_cikar(satis_id, session=session)
+                elif satis.fis_no:
+                    GunSonuRepository().iptal_ekle(satis_id, session=session)
+                
                 # Durumu iptal olarak güncelle
                 satis.durum = SatisDurum.IPTAL
                 satis.notlar = f"{satis.notlar or ''}\nİPTAL: {iptal_nedeni}".strip()
@@ -262,13 +293,20 @@ class SatisCrud:
                 session.rollback()
                 raise VeritabaniHatasi(f"Satış iptal hatası: {str(e)}")
     
-    def satis_tamamla(self, satis_id: int, fis_no: str) -> bool:
+    def satis_tamamla(self, satis_id: int, fis_no: str,
+                      session: Optional[Session] = None) -> bool:
         """
         Satışı tamamlar
         
+        Satış satırları aynı transaction'da iade defterine kopyalanır; iade
+        doğrulaması sonradan satışı ve önceki iadeleri yüklemez. Satışın
+        gün sonu (X/Z raporu) toplamlarına katkısı da aynı transaction'da
+        eklenir.
+        
         Args:
             satis_id: Satış kimliği
             fis_no: Fiş numarası
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
             
         Returns:
             İşlem başarılı ise True
@@ -278,19 +316,25 @@ class SatisCrud:
             VeritabaniHatasi: Veritabanı hatası
         """
         try:
-            with postgresql_session() as session:
+            with islem_oturumu(postgresql_session, session) as oturum:
                 # Satış kaydını getir
-                satis = session.query(Satis).filter(Satis.id == satis_id).first()
+                satis = oturum.query(Satis).filter(Satis.id == satis_id).first()
                 
                 if not satis:
                     raise DogrulamaHatasi(f"Satış bulunamadı: {satis_id}")
                 
                 # Satış durumunu tamamlandı olarak işaretle
+                zaten_tamamlandi = satis.durum == SatisDurum.TAMAMLANDI
                 satis.durum = SatisDurum.TAMAMLANDI
                 satis.fis_no = fis_no
                 satis.guncelleme_tarihi = datetime.now()
                 
-                session.commit()
+                oturum.flush()
+                if not zaten_tamamlandi:
+                    IadeDefteriRepository().satis_satirlarini_kaydet(
+                        satis.id, satis.sepet_id, fis_no, session=oturum
+                    )
+                    GunSonuRepository().satis_ekle(satis.id, session=oturum)
                 return True
                 
         except DogrulamaHatasi:
@@ -1,30 +1,30 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.satis_repository.satis_raporlar
 # Description: Satış rapor işlemleri
 # Changelog:
 # - Refactoring: Ana dosyadan rapor işlemleri ayrıldı
+# - Günlük özet ile X/Z raporları artımlı gün sonu toplamlarından okunuyor
 
 """
 Satış Rapor İşlemleri
 
 Bu modül satış raporları ve özet işlemlerini yönetir.
 Günlük özetler, istatistikler ve analiz raporları sağlar.
+
+Günlük özet, X ve Z raporları satış tamamlama/iptal transaction'larında
+güncellenen gün sonu toplamlarını okur (GunSonuRepository); satışlar ve
+ödemeler taranmaz. Mutabakat toplamları ham satışlardan doğrular.
 """
 
-from decimal import Decimal
-from datetime import datetime
-from typing import Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Union
+
+from sontechsp.uygulama.moduller.pos.repositories.gun_sonu_repository import GunSonuRepository
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi
 
-from sontechsp.uygulama.veritabani.baglanti import postgresql_session
-from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum
-from sontechsp.uygulama.moduller.pos.database.models.satis import Satis
-from sontechsp.uygulama.cekirdek.hatalar import (
-    VeritabaniHatasi, DogrulamaHatasi
-)
+logger = logging.getLogger(__name__)
 
 
 class SatisRaporlar:
@@ -34,6 +34,8 @@ class SatisRaporlar:
     Satış raporları ve özet işlemlerini yönetir.
     """
     
+    _gun_sonu = GunSonuRepository()
+    
     def gunluk_satis_ozeti(self, terminal_id: int, tarih: datetime) -> Dict[str, Any]:
         """
         Günlük satış özetini getirir
@@ -50,48 +52,96 @@ class SatisRaporlar:
             VeritabaniHatasi: Veritabanı hatası
         """
         if terminal_id <= 0:
-            raise DogrulamaHatasi("Terminal ID pozitif olmalıdır")
+            raise DogrulamaHatasi("terminal_id_pozitif", "Terminal ID pozitif olmalıdır")
+        
+        ozet = self._gun_sonu.ozet_getir(_gun(tarih), terminal_id=terminal_id)
+        return {
+            'tarih': ozet['tarih'],
+            'terminal_id': terminal_id,
+            'toplam_satis_sayisi': ozet['satis_sayisi'],
+            'toplam_tutar': float(ozet['net_tutar']),
+            'toplam_indirim': float(ozet['indirim_tutari']),
+            'net_tutar': float(ozet['net_tutar']),
+            'odeme_ozeti': {
+                turu: {'adet': odeme['adet'], 'tutar': float(odeme['tutar'])}
+                for turu, odeme in ozet['odemeler'].items()
+            }
+        }
+    
+    def x_raporu(self, terminal_id: int, kasiyer_id: int,
+                 tarih: Optional[Union[date, datetime]] = None) -> Dict[str, Any]:
+        """
+        Kasiyer vardiyasının ara (X) raporunu getirir
+        
+        Args:
+            terminal_id: Terminal kimliği
+            kasiyer_id: Kasiyer kimliği
+            tarih: Rapor günü (varsayılan bugün)
+            
+        Returns:
+            Vardiya toplamları, ödeme türü ve KDV dökümü (Decimal)
+            
+        Raises:
+            DogrulamaHatasi: Geçersiz parametreler
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if terminal_id <= 0:
+            raise DogrulamaHatasi("terminal_id_pozitif", "Terminal ID pozitif olmalıdır")
+        
+        if kasiyer_id <= 0:
+            raise DogrulamaHatasi("kasiyer_id_pozitif", "Kasiyer ID pozitif olmalıdır")
+        
+        return self._gun_sonu.ozet_getir(_gun(tarih), terminal_id=terminal_id, kasiyer_id=kasiyer_id)
+    
+    def z_raporu(self, terminal_id: int, tarih: Optional[Union[date, datetime]] = None) -> Dict[str, Any]:
+        """
+        Terminalin gün sonu (Z) raporunu getirir
+        
+        Args:
+            terminal_id: Terminal kimliği
+            tarih: Rapor günü (varsayılan bugün)
+            
+        Returns:
+            Gün toplamları, ödeme türü ve KDV dökümü (Decimal)
+            
+        Raises:
+            DogrulamaHatasi: Geçersiz parametreler
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        if terminal_id <= 0:
+            raise DogrulamaHatasi("terminal_id_pozitif", "Terminal ID pozitif olmalıdır")
+        
+        return self._gun_sonu.ozet_getir(_gun(tarih), terminal_id=terminal_id)
+    
+    def gun_sonu_mutabakati(self, tarih: Union[date, datetime], terminal_id: Optional[int] = None,
+                            duzelt: bool = False) -> List[Dict[str, Any]]:
+        """
+        Gün sonu toplamlarını ham satışlardan doğrular
         
-        with postgresql_session() as session:
-            try:
-                # Günün başı ve sonu
-                gun_baslangic = tarih.replace(hour=0, minute=0, second=0, microsecond=0)
-                gun_bitis = tarih.replace(hour=23, minute=59, second=59, microsecond=999999)
-                
-                # Tamamlanan satışları getir
-                satislar = session.query(Satis).filter(
-                    and_(
-                        Satis.terminal_id == terminal_id,
-                        Satis.satis_tarihi >= gun_baslangic,
-                        Satis.satis_tarihi <= gun_bitis,
-                        Satis.durum == SatisDurum.TAMAMLANDI
-                    )
-                ).all()
-                
-                # Özet hesapla
-                toplam_satis_sayisi = len(satislar)
-                toplam_tutar = sum(satis.net_tutar_hesapla() for satis in satislar)
-                toplam_indirim = sum(satis.indirim_tutari for satis in satislar)
-                
-                # Ödeme türü bazında özet
-                odeme_ozeti = {}
-                for satis in satislar:
-                    for odeme in satis.odemeler:
-                        turu = odeme.odeme_turu.value
-                        if turu not in odeme_ozeti:
-                            odeme_ozeti[turu] = {'adet': 0, 'tutar': 0.0}
-                        odeme_ozeti[turu]['adet'] += 1
-                        odeme_ozeti[turu]['tutar'] += float(odeme.tutar)
-                
-                return {
-                    'tarih': tarih.date().isoformat(),
-                    'terminal_id': terminal_id,
-                    'toplam_satis_sayisi': toplam_satis_sayisi,
-                    'toplam_tutar': float(toplam_tutar),
-                    'toplam_indirim': float(toplam_indirim),
-                    'net_tutar': float(toplam_tutar),
-                    'odeme_ozeti': odeme_ozeti
-                }
-                
-            except SQLAlchemyError as e:
-                raise VeritabaniHatasi(f"Günlük özet hatası: {str(e)}")
\ No newline at end of file
+        Args:
+            tarih: Kontrol edilecek gün
+            terminal_id: Yalnızca bu terminal (opsiyonel)
+            duzelt: Fark varsa toplamlar ham satışlardan yeniden kurulur
+            
+        Returns:
+            Bulunan farklar (fark yoksa boş liste)
+            
+        Raises:
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        gun = _gun(tarih)
+        farklar = self._gun_sonu.mutabakat_kontrol(gun, terminal_id=terminal_id)
+        if farklar:
+            logger.warning(
+                f"Gün sonu toplamlarında {len(farklar)} fark - Tarih: {gun}, Terminal: {terminal_id}"
+            )
+            if duzelt:
+                self._gun_sonu.yeniden_olustur(gun, terminal_id=terminal_id)
+        return farklar
+
+
+def _gun(tarih: Optional[Union[date, datetime]]) -> date:
+    """Rapor gününü date olarak döndürür"""
+    if tarih is None:
+        return date.today()
+    return tarih.date() if isinstance(tarih, datetime) else tarih
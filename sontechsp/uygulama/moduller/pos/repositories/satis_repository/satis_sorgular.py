@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-18
+# Last Update: 2026-10-17
 # Module: pos.repositories.satis_repository.satis_sorgular
 # Description: Satış sorgu işlemleri
 # Changelog:
 # - Refactoring: Ana dosyadan sorgu işlemleri ayrıldı
+# - satis_odeme_ekle dış transaction'a katılabilir
 
 """
 Satış Sorgu İşlemleri
@@ -21,6 +22,7 @@ from sqlalchemy import and_, or_, desc
 
 from sontechsp.uygulama.veritabani.baglanti import postgresql_session
 from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum, OdemeTuru
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
 from sontechsp.uygulama.moduller.pos.database.models.satis import (
     Satis, SatisOdeme, satis_odeme_validasyon
 )
@@ -271,7 +273,8 @@ class SatisSorgular:
                 raise VeritabaniHatasi(f"Ödeme ekleme hatası: {str(e)}")
     
     def satis_odeme_ekle(self, satis_id: int, odeme_turu: OdemeTuru, 
-                        tutar: Decimal, referans_no: str = None) -> int:
+                        tutar: Decimal, referans_no: str = None,
+                        session: Optional[Session] = None) -> int:
         """
         Satışa ödeme ekler
         
@@ -280,6 +283,7 @@ class SatisSorgular:
             odeme_turu: Ödeme türü
             tutar: Ödeme tutarı
             referans_no: Referans numarası (opsiyonel)
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
             
         Returns:
             Ödeme kimliği
@@ -289,9 +293,9 @@ class SatisSorgular:
             VeritabaniHatasi: Veritabanı hatası
         """
         try:
-            with postgresql_session() as session:
+            with islem_oturumu(postgresql_session, session) as oturum:
                 # Satış kaydını kontrol et
-                satis = session.query(Satis).filter(Satis.id == satis_id).first()
+                satis = oturum.query(Satis).filter(Satis.id == satis_id).first()
                 if not satis:
                     raise DogrulamaHatasi(f"Satış bulunamadı: {satis_id}")
                 
@@ -306,11 +310,10 @@ class SatisSorgular:
                     odeme_tarihi=datetime.now()
                 )
                 
-                session.add(odeme)
-                session.flush()
+                oturum.add(odeme)
+                oturum.flush()
                 
                 odeme_id = odeme.id
-                session.commit()
                 
                 return odeme_id
                 
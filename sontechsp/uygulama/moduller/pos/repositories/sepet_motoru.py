@@ -0,0 +1,524 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.repositories.sepet_motoru
+# Description: Terminal içi sepet motoru (bellekte sepet, gecikmeli kalıcı yazım)
+# Changelog:
+# - İlk oluşturma
+# - sepet_durumu eklendi, yazım hatalarında üstel geri çekilme
+# - Toplamlar SepetToplamlari ile artımlı (KDV oranı başına) tutuluyor
+# - sepet_durum_guncelle dış transaction'a katılabilir (bellek commit sonrası güncellenir)
+
+"""
+Sepet Motoru
+
+Bu modül terminaldeki aktif sepetleri bellekte tutan ISepetRepository
+implementasyonunu içerir. Sepet değişiklikleri bellekte O(1) uygulanır;
+kalıcı yazım arka plan thread'inde birleştirilerek yapılır:
+
+- Kısa aralıkta yapılan değişiklikler (ör. art arda okutmalar) sepet başına
+  tek transaction'da pos_sepet / pos_sepet_satiri tablolarına yazılır
+- Ödeme öncesi sepet_kaydet ile bekleyen yazım zorla tamamlanır
+- Satır ID'leri motor tarafından verilir; kalıcı eşleme (sepet_id, urun_id)
+  üzerindendir (aynı ürün sepette tek satırdır)
+
+Sözleşme ISepetRepository ile aynıdır; servisler ve UI değişmeden kullanır.
+"""
+
+import atexit
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.moduller.pos.arayuzler import ISepetRepository, SepetDurum
+from sontechsp.uygulama.moduller.pos.repositories.sepet_repository import SepetRepository
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamlari, SepetToplamOzeti
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi, SontechHatasi
+
+# Bellekte tutulan (kalıcı yazımı bekleyebilen) sepet durumları
+_ACIK_DURUMLAR = (SepetDurum.AKTIF.value, SepetDurum.BEKLEMEDE.value)
+
+# Art arda yazım hatalarında bekleme üst sınırı (saniye)
+_AZAMI_YENIDEN_DENEME_BEKLEMESI = 30.0
+
+
+def _decimal_veya_none(deger: Any) -> Optional[Decimal]:
+    """Sözlükten gelen float/str değeri Decimal'e çevirir"""
+    return None if deger is None else Decimal(str(deger))
+
+
+@dataclass
+class _BellekSepeti:
+    """Bellekteki sepet ve satırları (urun_id -> satır)"""
+    id: int
+    terminal_id: int
+    kasiyer_id: int
+    durum: str
+    toplamlar: SepetToplamlari = field(default_factory=SepetToplamlari)
+    olusturma_tarihi: Optional[str] = None
+    guncelleme_tarihi: Optional[str] = None
+    satirlar: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    surum: int = 0
+    yazilan_surum: int = 0
+
+
+class SepetMotoru(ISepetRepository):
+    """
+    Bellek içi sepet motoru
+
+    Aktif sepetleri terminal belleğinde tutar, değişiklikleri gecikmeli ve
+    birleştirilmiş olarak SepetRepository üzerinden kalıcı hale getirir.
+    """
+
+    def __init__(self, sepet_repository: Optional[SepetRepository] = None,
+                 yazma_gecikmesi: float = 0.5,
+                 arka_planda_yaz: bool = True):
+        """
+        Motoru başlatır
+
+        Args:
+            sepet_repository: Kalıcı yazım için sepet repository
+            yazma_gecikmesi: Değişiklikten sonra yazım öncesi beklenen süre
+                (saniye); bu sürede gelen değişiklikler tek yazımda birleşir
+            arka_planda_yaz: False ise yalnızca sepet_kaydet /
+                bekleyenleri_yaz çağrılarında yazılır
+        """
+        self._repository = sepet_repository or SepetRepository()
+        self._yazma_gecikmesi = yazma_gecikmesi
+        self._logger = logging.getLogger(__name__)
+
+        self._sepetler: Dict[int, _BellekSepeti] = {}
+        self._satir_konumlari: Dict[int, Tuple[int, int]] = {}  # satir_id -> (sepet_id, urun_id)
+        self._satir_sayaci = itertools.count(1)
+        self._kirli: Set[int] = set()
+        self._kilit = threading.RLock()
+        self._yazma_kilidi = threading.Lock()
+
+        self._kirli_olayi = threading.Event()
+        self._durdur = threading.Event()
+        self._yazici: Optional[threading.Thread] = None
+        if arka_planda_yaz:
+            self._yazici = threading.Thread(
+                target=self._yazici_dongusu, name="sepet-yazici", daemon=True
+            )
+            self._yazici.start()
+
+    # ISepetRepository
+
+    def sepet_olustur(self, terminal_id: int, kasiyer_id: int) -> int:
+        """
+        Yeni sepet oluşturur (ID için veritabanına senkron yazılır)
+
+        Terminalin bellekteki aktif sepeti, repository ile aynı şekilde
+        beklemeye alınır.
+        """
+        sepet_id = self._repository.sepet_olustur(terminal_id, kasiyer_id)
+        simdi = datetime.now().isoformat()
+
+        with self._kilit:
+            for sepet in self._sepetler.values():
+                if sepet.terminal_id == terminal_id and sepet.durum == SepetDurum.AKTIF.value:
+                    sepet.durum = SepetDurum.BEKLEMEDE.value
+            self._sepetler[sepet_id] = _BellekSepeti(
+                id=sepet_id,
+                terminal_id=terminal_id,
+                kasiyer_id=kasiyer_id,
+                durum=SepetDurum.AKTIF.value,
+                olusturma_tarihi=simdi
+            )
+        return sepet_id
+
+    def sepet_getir(self, sepet_id: int) -> Optional[Dict[str, Any]]:
+        """Sepet bilgilerini bellekten getirir (ilk erişimde veritabanından yüklenir)"""
+        if sepet_id <= 0:
+            raise DogrulamaHatasi("sepet_id_pozitif", "Sepet ID pozitif olmalıdır")
+
+        with self._kilit:
+            sepet = self._sepet_al(sepet_id)
+            return self._sepet_sozlugu(sepet) if sepet else None
+
+    def sepet_durumu(self, sepet_id: int) -> Optional[str]:
+        """Sepet durumunu satır sözlüğü üretmeden döndürür (okutma başına O(1))"""
+        if sepet_id <= 0:
+            raise DogrulamaHatasi("sepet_id_pozitif", "Sepet ID pozitif olmalıdır")
+
+        with self._kilit:
+            sepet = self._sepet_al(sepet_id)
+            return sepet.durum if sepet else None
+
+    def sepet_toplamlari(self, sepet_id: int) -> Optional[SepetToplamOzeti]:
+        """Sepet toplamları ve KDV dökümü; satırlar dolaşılmaz, veritabanı okunmaz"""
+        if sepet_id <= 0:
+            raise DogrulamaHatasi("sepet_id_pozitif", "Sepet ID pozitif olmalıdır")
+
+        with self._kilit:
+            sepet = self._sepet_al(sepet_id)
+            return sepet.toplamlar.ozet() if sepet else None
+
+    def sepet_satiri_ekle(self, sepet_id: int, urun_id: int, barkod: str,
+                          adet: int, birim_fiyat: Decimal,
+                          kdv_orani: Optional[Decimal] = None) -> int:
+        """
+        Sepete satır ekler; ürün sepette varsa adedini artırır
+
+        Returns:
+            Satır ID'si (motor tarafından verilir)
+        """
+        if sepet_id <= 0:
+            raise DogrulamaHatasi("sepet_id", "Sepet ID pozitif olmalıdır")
+
+        if urun_id <= 0:
+            raise DogrulamaHatasi("urun_id", "Ürün ID pozitif olmalıdır")
+
+        if not barkod or not barkod.strip():
+            raise DogrulamaHatasi("barkod", "Barkod boş olamaz")
+
+        if adet <= 0:
+            raise DogrulamaHatasi("adet", "Adet pozitif olmalıdır")
+
+        if birim_fiyat <= 0:
+            raise DogrulamaHatasi("birim_fiyat", "Birim fiyat pozitif olmalıdır")
+
+        with self._kilit:
+            sepet = self._sepet_al(sepet_id)
+            if sepet is None:
+                raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
+
+            satir = sepet.satirlar.get(urun_id)
+            if satir is None:
+                satir = {
+                    'id': next(self._satir_sayaci),
+                    'urun_id': urun_id,
+                    'barkod': barkod.strip(),
+                    'urun_adi': f"Ürün {urun_id}",  # Gerçek implementasyonda stok servisinden alınacak
+                    'adet': 0,
+                    'birim_fiyat': birim_fiyat,
+                    'indirim_tutari': Decimal('0.00'),
+                    'toplam_tutar': Decimal('0.00'),
+                    'kdv_orani': kdv_orani
+                }
+                sepet.satirlar[urun_id] = satir
+                self._satir_konumlari[satir['id']] = (sepet_id, urun_id)
+
+            self._satir_adedi_ayarla(sepet, satir, satir['adet'] + adet)
+            self._degisti(sepet)
+            return satir['id']
+
+    def sepet_satiri_guncelle(self, satir_id: int, adet: int) -> bool:
+        """Satır adedini günceller"""
+        if satir_id <= 0:
+            raise DogrulamaHatasi("satir_id", "Satır ID pozitif olmalıdır")
+
+        if adet <= 0:
+            raise DogrulamaHatasi("adet", "Adet pozitif olmalıdır")
+
+        with self._kilit:
+            sepet, satir = self._satir_al(satir_id)
+            self._satir_adedi_ayarla(sepet, satir, adet)
+            self._degisti(sepet)
+            return True
+
+    def sepet_satiri_sil(self, satir_id: int) -> bool:
+        """Satırı siler"""
+        if satir_id <= 0:
+            raise DogrulamaHatasi("satir_id", "Satır ID pozitif olmalıdır")
+
+        with self._kilit:
+            sepet, satir = self._satir_al(satir_id)
+            sepet.toplamlar.satir_cikar(satir_id)
+            del sepet.satirlar[satir['urun_id']]
+            del self._satir_konumlari[satir_id]
+            self._degisti(sepet)
+            return True
+
+    def sepet_bosalt(self, sepet_id: int) -> bool:
+        """Sepetteki tüm satırları siler"""
+        if sepet_id <= 0:
+            raise DogrulamaHatasi("sepet_id", "Sepet ID pozitif olmalıdır")
+
+        with self._kilit:
+            sepet = self._sepet_al(sepet_id)
+            if sepet is None:
+                raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
+
+            for satir in sepet.satirlar.values():
+                self._satir_konumlari.pop(satir['id'], None)
+            sepet.satirlar.clear()
+            sepet.toplamlar.temizle()
+            self._degisti(sepet)
+            return True
+
+    # SepetRepository ek işlemleri
+
+    def terminal_aktif_sepet_getir(self, terminal_id: int) -> Optional[Dict[str, Any]]:
+        """Terminalin aktif sepetini getirir (bellekte yoksa veritabanından yüklenir)"""
+        if terminal_id <= 0:
+            raise DogrulamaHatasi("terminal_id", "Terminal ID pozitif olmalıdır")
+
+        with self._kilit:
+            for sepet in self._sepetler.values():
+                if sepet.terminal_id == terminal_id and sepet.durum == SepetDurum.AKTIF.value:
+                    return self._sepet_sozlugu(sepet)
+
+            kayit = self._repository.terminal_aktif_sepet_getir(terminal_id)
+            if kayit is None:
+                return None
+            return self._sepet_sozlugu(self._sepet_yukle(kayit))
+
+    def sepet_durum_guncelle(self, sepet_id: int, yeni_durum: SepetDurum,
+                             session: Optional[Session] = None) -> bool:
+        """
+        Sepet durumunu günceller
+
+        Bekleyen satır yazımı önce tamamlanır. Tamamlanan veya iptal edilen
+        sepet bellekten çıkarılır. session verilirse durum dış transaction'a
+        yazılır ve bellek yalnızca o transaction commit edilince güncellenir;
+        geri alınan satışta sepet açık kalır.
+        """
+        self.sepet_kaydet(sepet_id)
+        if session is None:
+            sonuc = self._repository.sepet_durum_guncelle(sepet_id, yeni_durum)
+            self._bellek_durumu_guncelle(sepet_id, yeni_durum)
+            return sonuc
+
+        sonuc = self._repository.sepet_durum_guncelle(sepet_id, yeni_durum, session=session)
+        event.listen(session, 'after_commit',
+                     lambda _oturum: self._bellek_durumu_guncelle(sepet_id, yeni_durum), once=True)
+        return sonuc
+
+    def _bellek_durumu_guncelle(self, sepet_id: int, yeni_durum: SepetDurum) -> None:
+        """Bellekteki sepetin durumunu kalıcı durumla eşitler"""
+        with self._kilit:
+            sepet = self._sepetler.get(sepet_id)
+            if sepet is not None:
+                sepet.durum = yeni_durum.value
+                if yeni_durum.value not in _ACIK_DURUMLAR and sepet_id not in self._kirli:
+                    self._bellekten_cikar(sepet)
+
+    # Kalıcı yazım
+
+    def sepet_kaydet(self, sepet_id: int) -> None:
+        """
+        Sepetin bekleyen değişikliklerini hemen kalıcı hale getirir
+
+        Ödeme öncesi çağrılır; satış kaydı veritabanındaki satırlardan
+        oluşturulduğu için yazım tamamlanmadan dönülmez.
+
+        Raises:
+            VeritabaniHatasi: Yazım başarısız olursa
+        """
+        with self._yazma_kilidi:
+            self._sepeti_yaz(sepet_id)
+
+    def bekleyenleri_yaz(self) -> int:
+        """
+        Değişmiş tüm sepetleri kalıcı hale getirir
+
+        Returns:
+            int: Yazılan sepet sayısı
+        """
+        with self._kilit:
+            kirli = sorted(self._kirli)
+
+        yazilan = 0
+        with self._yazma_kilidi:
+            for sepet_id in kirli:
+                if self._sepeti_yaz(sepet_id):
+                    yazilan += 1
+        return yazilan
+
+    def bekleyen_sepet_sayisi(self) -> int:
+        """Kalıcı yazımı bekleyen sepet sayısı"""
+        with self._kilit:
+            return len(self._kirli)
+
+    def kapat(self) -> None:
+        """Arka plan yazıcısını durdurur ve bekleyen değişiklikleri yazar"""
+        self._durdur.set()
+        self._kirli_olayi.set()
+        if self._yazici is not None and self._yazici.is_alive():
+            self._yazici.join(timeout=5)
+        self.bekleyenleri_yaz()
+
+    # Yardımcılar
+
+    def _sepet_al(self, sepet_id: int) -> Optional[_BellekSepeti]:
+        """Sepeti bellekten döndürür, yoksa veritabanından yükler (kilit altında)"""
+        sepet = self._sepetler.get(sepet_id)
+        if sepet is not None:
+            return sepet
+
+        kayit = self._repository.sepet_getir(sepet_id)
+        return self._sepet_yukle(kayit) if kayit else None
+
+    def _sepet_yukle(self, kayit: Dict[str, Any]) -> _BellekSepeti:
+        """sepet_getir sözlüğünden bellek sepeti oluşturur; satırlara motor ID'si verilir"""
+        mevcut = self._sepetler.get(kayit['id'])
+        if mevcut is not None:
+            return mevcut
+
+        sepet = _BellekSepeti(
+            id=kayit['id'],
+            terminal_id=kayit['terminal_id'],
+            kasiyer_id=kayit['kasiyer_id'],
+            durum=kayit['durum'],
+            olusturma_tarihi=kayit.get('olusturma_tarihi'),
+            guncelleme_tarihi=kayit.get('guncelleme_tarihi')
+        )
+        for satir in kayit.get('satirlar', []):
+            satir_id = next(self._satir_sayaci)
+            sepet.satirlar[satir['urun_id']] = {
+                'id': satir_id,
+                'urun_id': satir['urun_id'],
+                'barkod': satir['barkod'],
+                'urun_adi': satir['urun_adi'],
+                'adet': satir['adet'],
+                'birim_fiyat': Decimal(str(satir['birim_fiyat'])),
+                'indirim_tutari': Decimal(str(satir['indirim_tutari'])),
+                'toplam_tutar': Decimal(str(satir['toplam_tutar'])),
+                'kdv_orani': _decimal_veya_none(satir.get('kdv_orani'))
+            }
+            self._satir_konumlari[satir_id] = (sepet.id, satir['urun_id'])
+            sepet.toplamlar.satir_ayarla(satir_id, sepet.satirlar[satir['urun_id']]['toplam_tutar'],
+                                         sepet.satirlar[satir['urun_id']]['kdv_orani'])
+        sepet.toplamlar.indirim_ayarla(kayit.get('indirim_tutari') or Decimal('0.00'))
+
+        self._sepetler[sepet.id] = sepet
+        return sepet
+
+    def _satir_al(self, satir_id: int) -> Tuple[_BellekSepeti, Dict[str, Any]]:
+        """Satır ID'sinden sepet ve satırı bulur (kilit altında)"""
+        konum = self._satir_konumlari.get(satir_id)
+        if konum is None:
+            raise SontechHatasi(f"Sepet satırı bulunamadı: {satir_id}")
+
+        sepet_id, urun_id = konum
+        sepet = self._sepetler[sepet_id]
+        return sepet, sepet.satirlar[urun_id]
+
+    def _satir_adedi_ayarla(self, sepet: _BellekSepeti, satir: Dict[str, Any], adet: int) -> None:
+        """Satır adedini ve tutarını değiştirir, sepet toplamlarını farkla günceller"""
+        yeni_toplam = Decimal(adet) * satir['birim_fiyat'] - satir['indirim_tutari']
+        sepet.toplamlar.satir_ayarla(satir['id'], yeni_toplam, satir['kdv_orani'])
+        satir['adet'] = adet
+        satir['toplam_tutar'] = yeni_toplam
+
+    def _degisti(self, sepet: _BellekSepeti) -> None:
+        """Sepeti kirli işaretler ve yazıcıyı uyandırır (kilit altında)"""
+        sepet.surum += 1
+        sepet.guncelleme_tarihi = datetime.now().isoformat()
+        self._kirli.add(sepet.id)
+        self._kirli_olayi.set()
+
+    def _sepeti_yaz(self, sepet_id: int) -> bool:
+        """
+        Sepetin anlık görüntüsünü tek transaction'da yazar (yazma kilidi altında)
+
+        Returns:
+            bool: Yazım yapıldı mı (değişiklik yoksa False)
+        """
+        with self._kilit:
+            sepet = self._sepetler.get(sepet_id)
+            if sepet is None or sepet.surum == sepet.yazilan_surum:
+                self._kirli.discard(sepet_id)
+                return False
+
+            surum = sepet.surum
+            satirlar = [dict(satir) for satir in sepet.satirlar.values()]
+            toplam_tutar = sepet.toplamlar.brut_toplam
+            indirim_tutari = sepet.toplamlar.indirim_tutari
+
+        self._repository.sepet_esitle(sepet_id, satirlar, toplam_tutar, indirim_tutari)
+
+        with self._kilit:
+            sepet.yazilan_surum = surum
+            if sepet.surum == surum:
+                self._kirli.discard(sepet_id)
+                if sepet.durum not in _ACIK_DURUMLAR:
+                    self._bellekten_cikar(sepet)
+        return True
+
+    def _bellekten_cikar(self, sepet: _BellekSepeti) -> None:
+        """Kapanan sepeti ve satır eşlemelerini bellekten siler (kilit altında)"""
+        for satir in sepet.satirlar.values():
+            self._satir_konumlari.pop(satir['id'], None)
+        self._sepetler.pop(sepet.id, None)
+
+    def _sepet_sozlugu(self, sepet: _BellekSepeti) -> Dict[str, Any]:
+        """SepetRepository.sepet_getir ile aynı biçimde sözlük üretir"""
+        return {
+            'id': sepet.id,
+            'terminal_id': sepet.terminal_id,
+            'kasiyer_id': sepet.kasiyer_id,
+            'durum': sepet.durum,
+            'toplam_tutar': float(sepet.toplamlar.brut_toplam),
+            'indirim_tutari': float(sepet.toplamlar.indirim_tutari),
+            'net_tutar': float(sepet.toplamlar.net_tutar),
+            'olusturma_tarihi': sepet.olusturma_tarihi,
+            'guncelleme_tarihi': sepet.guncelleme_tarihi,
+            'satirlar': [
+                {
+                    'id': satir['id'],
+                    'urun_id': satir['urun_id'],
+                    'barkod': satir['barkod'],
+                    'urun_adi': satir['urun_adi'],
+                    'adet': satir['adet'],
+                    'birim_fiyat': float(satir['birim_fiyat']),
+                    'indirim_tutari': float(satir['indirim_tutari']),
+                    'toplam_tutar': float(satir['toplam_tutar']),
+                    'kdv_orani': float(satir['kdv_orani']) if satir['kdv_orani'] is not None else None
+                }
+                for satir in sepet.satirlar.values()
+            ],
+            'toplamlar': sepet.toplamlar.ozet()
+        }
+
+    def _yazici_dongusu(self) -> None:
+        """
+        Arka plan yazıcısı: değişiklik bekler, gecikme kadar biriktirip yazar
+
+        Yazım hata verirse (ör. veritabanı erişilemez) bekleme her denemede
+        ikiye katlanır, _AZAMI_YENIDEN_DENEME_BEKLEMESI ile sınırlanır ve ilk
+        başarılı yazımda sıfırlanır.
+        """
+        bekleme = self._yazma_gecikmesi
+        while not self._durdur.is_set():
+            self._kirli_olayi.wait()
+            if self._durdur.wait(bekleme):
+                break
+
+            self._kirli_olayi.clear()
+            try:
+                self.bekleyenleri_yaz()
+                bekleme = self._yazma_gecikmesi
+            except Exception as e:
+                # Kirli sepetler korunur, bir sonraki turda yeniden denenir
+                bekleme = min(max(bekleme, 0.1) * 2, _AZAMI_YENIDEN_DENEME_BEKLEMESI)
+                self._logger.error(
+                    f"Sepet kalıcı yazım hatası, {bekleme:.1f} sn sonra yeniden denenecek: {str(e)}"
+                )
+                self._kirli_olayi.set()
+
+_sepet_motoru: Optional[SepetMotoru] = None
+_sepet_motoru_kilidi = threading.Lock()
+
+
+def sepet_motoru_al() -> SepetMotoru:
+    """
+    Süreç genelindeki sepet motorunu döndürür
+
+    Sepet, ödeme ve iptal servisleri aynı motoru paylaşmalıdır; aksi halde
+    ödeme henüz yazılmamış sepet satırlarını göremez.
+    """
+    global _sepet_motoru
+    with _sepet_motoru_kilidi:
+        if _sepet_motoru is None:
+            _sepet_motoru = SepetMotoru()
+            atexit.register(_sepet_motoru.kapat)
+        return _sepet_motoru
@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.repositories.sepet_repository
 # Description: Sepet repository implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - sepet_esitle eklendi (sepet motoru toplu yazımı)
+# - Satır KDV oranı ve Decimal sepet toplamları eklendi
+# - sepet_durum_guncelle/sepet_esitle dış transaction'a katılabilir
 
 """
 Sepet Repository Implementasyonu
@@ -21,6 +24,8 @@ from sqlalchemy import and_, or_
 
 from sontechsp.uygulama.veritabani.baglanti import postgresql_session
 from sontechsp.uygulama.moduller.pos.arayuzler import ISepetRepository, SepetDurum
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamlari
+from sontechsp.uygulama.moduller.pos.repositories.oturum import islem_oturumu
 from sontechsp.uygulama.moduller.pos.database.models.sepet import (
     Sepet, SepetSatiri, sepet_validasyon, sepet_satiri_validasyon
 )
@@ -137,7 +142,11 @@ class SepetRepository(ISepetRepository):
                     'net_tutar': float(sepet.net_tutar_hesapla()),
                     'olusturma_tarihi': sepet.olusturma_tarihi.isoformat() if sepet.olusturma_tarihi else None,
                     'guncelleme_tarihi': sepet.guncelleme_tarihi.isoformat() if sepet.guncelleme_tarihi else None,
-                    'satirlar': []
+                    'satirlar': [],
+                    'toplamlar': SepetToplamlari.satirlardan(
+                        ((satir.id, satir.toplam_tutar, satir.kdv_orani) for satir in sepet.satirlar),
+                        sepet.indirim_tutari
+                    ).ozet()
                 }
                 
                 # Sepet satırlarını ekle
@@ -150,7 +159,8 @@ class SepetRepository(ISepetRepository):
                         'adet': satir.adet,
                         'birim_fiyat': float(satir.birim_fiyat),
                         'indirim_tutari': float(satir.indirim_tutari),
-                        'toplam_tutar': float(satir.toplam_tutar)
+                        'toplam_tutar': float(satir.toplam_tutar),
+                        'kdv_orani': float(satir.kdv_orani) if satir.kdv_orani is not None else None
                     }
                     sepet_dict['satirlar'].append(satir_dict)
                 
@@ -160,7 +170,8 @@ class SepetRepository(ISepetRepository):
                 raise VeritabaniHatasi(f"Sepet getirme hatası: {str(e)}")
     
     def sepet_satiri_ekle(self, sepet_id: int, urun_id: int, barkod: str, 
-                         adet: int, birim_fiyat: Decimal) -> int:
+                         adet: int, birim_fiyat: Decimal,
+                         kdv_orani: Optional[Decimal] = None) -> int:
         """
         Sepete satır ekler
         
@@ -170,6 +181,7 @@ class SepetRepository(ISepetRepository):
             barkod: Ürün barkodu
             adet: Ürün adedi
             birim_fiyat: Birim fiyat
+            kdv_orani: Ürün KDV oranı (yüzde)
             
         Returns:
             Oluşturulan satır ID'si
@@ -231,7 +243,8 @@ class SepetRepository(ISepetRepository):
                         adet=adet,
                         birim_fiyat=birim_fiyat,
                         indirim_tutari=Decimal('0.00'),
-                        toplam_tutar=Decimal(str(adet)) * birim_fiyat
+                        toplam_tutar=Decimal(str(adet)) * birim_fiyat,
+                        kdv_orani=kdv_orani
                     )
                     
                     # Validasyon
@@ -411,13 +424,15 @@ class SepetRepository(ISepetRepository):
             except SQLAlchemyError as e:
                 raise VeritabaniHatasi(f"Aktif sepet getirme hatası: {str(e)}")
     
-    def sepet_durum_guncelle(self, sepet_id: int, yeni_durum: SepetDurum) -> bool:
+    def sepet_durum_guncelle(self, sepet_id: int, yeni_durum: SepetDurum,
+                             session: Optional[Session] = None) -> bool:
         """
         Sepet durumunu günceller
         
         Args:
             sepet_id: Sepet kimliği
             yeni_durum: Yeni durum
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
             
         Returns:
             Güncelleme başarılı mı
@@ -430,9 +445,9 @@ class SepetRepository(ISepetRepository):
         if sepet_id <= 0:
             raise DogrulamaHatasi("sepet_id", "Sepet ID pozitif olmalıdır")
         
-        with postgresql_session() as session:
+        with islem_oturumu(postgresql_session, session) as oturum:
             try:
-                sepet = session.query(Sepet).filter(Sepet.id == sepet_id).first()
+                sepet = oturum.query(Sepet).filter(Sepet.id == sepet_id).first()
                 if not sepet:
                     raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
                 
@@ -443,13 +458,74 @@ class SepetRepository(ISepetRepository):
                 if hatalar:
                     raise DogrulamaHatasi("sepet_validasyon", f"Sepet validasyon hataları: {', '.join(hatalar)}")
                 
-                session.commit()
+                oturum.flush()
                 return True
                 
             except SQLAlchemyError as e:
-                session.rollback()
                 raise VeritabaniHatasi(f"Sepet durum güncelleme hatası: {str(e)}")
     
+    def sepet_esitle(self, sepet_id: int, satirlar: List[Dict[str, Any]],
+                     toplam_tutar: Decimal, indirim_tutari: Decimal,
+                     session: Optional[Session] = None) -> None:
+        """
+        Sepet satırlarını verilen anlık görüntüyle eşitler
+
+        Satırlar urun_id üzerinden eşlenir: yeni ürünler eklenir, değişenler
+        güncellenir, görüntüde olmayanlar silinir. Tüm değişiklikler ve sepet
+        toplamı tek transaction'da yazılır.
+
+        Args:
+            sepet_id: Sepet kimliği
+            satirlar: urun_id, barkod, urun_adi, adet, birim_fiyat,
+                indirim_tutari, toplam_tutar ve kdv_orani içeren satır listesi
+            toplam_tutar: Sepet toplam tutarı
+            indirim_tutari: Sepet indirim tutarı
+            session: Dış transaction oturumu (verilirse commit çağıranındır)
+
+        Raises:
+            SontechHatasi: Sepet bulunamadı
+            VeritabaniHatasi: Veritabanı hatası
+        """
+        with islem_oturumu(postgresql_session, session) as oturum:
+            try:
+                sepet = oturum.query(Sepet).filter(Sepet.id == sepet_id).first()
+                if not sepet:
+                    raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
+
+                mevcut = {
+                    satir.urun_id: satir
+                    for satir in oturum.query(SepetSatiri).filter(SepetSatiri.sepet_id == sepet_id)
+                }
+
+                for veri in satirlar:
+                    satir = mevcut.pop(veri['urun_id'], None)
+                    if satir is None:
+                        satir = SepetSatiri(sepet_id=sepet_id, urun_id=veri['urun_id'])
+                        oturum.add(satir)
+                    elif (satir.adet == veri['adet'] and satir.birim_fiyat == veri['birim_fiyat']
+                          and satir.indirim_tutari == veri['indirim_tutari']
+                          and satir.kdv_orani == veri.get('kdv_orani')):
+                        continue
+
+                    satir.barkod = veri['barkod']
+                    satir.urun_adi = veri['urun_adi']
+                    satir.adet = veri['adet']
+                    satir.birim_fiyat = veri['birim_fiyat']
+                    satir.indirim_tutari = veri['indirim_tutari']
+                    satir.toplam_tutar = veri['toplam_tutar']
+                    satir.kdv_orani = veri.get('kdv_orani')
+
+                for satir in mevcut.values():
+                    oturum.delete(satir)
+
+                sepet.toplam_tutar = toplam_tutar
+                sepet.indirim_tutari = indirim_tutari
+
+                oturum.flush()
+
+            except SQLAlchemyError as e:
+                raise VeritabaniHatasi(f"Sepet eşitleme hatası: {str(e)}")
+
     def _sepet_toplam_guncelle(self, session: Session, sepet_id: int) -> None:
         """
         Sepet toplamını günceller (private method)
@@ -0,0 +1,194 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.sepet_toplamlari
+# Description: Artımlı sepet toplamları ve KDV dökümü
+# Changelog:
+# - İlk oluşturma
+# - Önbellekli tutar metni (tutar_metni) eklendi
+
+"""
+Sepet Toplamları
+
+Sepetin brüt, indirim ve net toplamlarını ve KDV oranı başına ara
+toplamlarını satır ekleme, silme ve adet değişikliğinde artımlı olarak
+tutar. Tüm tutarlar kuruşa yuvarlanmış Decimal'dir; float dönüşümü
+yapılmaz.
+
+Satır tutarları KDV dahildir (raf fiyatı). KDV dökümü oran sayısı kadar
+işlem yapar; sepet indirimi oranlara tutarları oranında dağıtılır ve
+yuvarlama farkı son orana eklenir, böylece döküm toplamı net tutara
+birebir eşittir.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+KURUS = Decimal('0.01')
+SIFIR = Decimal('0.00')
+
+# Ürün KDV oranı bilinmediğinde kullanılan oran (UrunDTO varsayılanı)
+VARSAYILAN_KDV_ORANI = Decimal('18.00')
+
+
+def tutar_yuvarla(tutar: Any) -> Decimal:
+    """Tutarı kuruşa yuvarlanmış Decimal'e çevirir (float'lar metin üzerinden)"""
+    if not isinstance(tutar, Decimal):
+        tutar = Decimal(str(tutar))
+    return tutar.quantize(KURUS, rounding=ROUND_HALF_UP)
+
+
+def kdv_orani_normalle(kdv_orani: Any) -> Decimal:
+    """KDV oranını sözlük anahtarı olarak kullanılabilir biçime getirir"""
+    if kdv_orani is None:
+        return VARSAYILAN_KDV_ORANI
+    return tutar_yuvarla(kdv_orani)
+
+
+@lru_cache(maxsize=2048)
+def tutar_metni(tutar: Any) -> str:
+    """Tutarın ekranda gösterilen '12.50 ₺' metni (tekrar eden tutarlar önbellekten)"""
+    return f"{tutar:.2f} ₺"
+
+
+@dataclass(frozen=True)
+class KdvDilimi:
+    """Bir KDV oranının sepet içindeki payı"""
+    oran: Decimal
+    tutar: Decimal
+    matrah: Decimal
+    kdv: Decimal
+
+
+@dataclass(frozen=True)
+class SepetToplamOzeti:
+    """Sepet toplamlarının değişmez görüntüsü (ekranlar ve fiş için)"""
+    brut_toplam: Decimal
+    indirim_tutari: Decimal
+    net_tutar: Decimal
+    kdv_dokumu: Tuple[KdvDilimi, ...] = ()
+
+    @property
+    def kdv_toplami(self) -> Decimal:
+        """Tüm oranların KDV toplamı"""
+        return sum((dilim.kdv for dilim in self.kdv_dokumu), SIFIR)
+
+
+class SepetToplamlari:
+    """
+    Artımlı sepet toplamları
+
+    Satırlar çağıranın verdiği anahtarla (satır ID'si, urun_id vb.)
+    tutulur; her değişiklik yalnızca eski ve yeni tutar farkını uygular.
+    Thread güvenli değildir; sahibi olan yapının kilidi altında kullanılır.
+    """
+
+    def __init__(self):
+        self._satirlar: Dict[Hashable, Tuple[Decimal, Decimal]] = {}
+        self._oran_toplamlari: Dict[Decimal, Decimal] = {}
+        self._oran_satir_sayilari: Dict[Decimal, int] = {}
+        self._brut = SIFIR
+        self._indirim = SIFIR
+
+    @classmethod
+    def satirlardan(cls, satirlar: Iterable[Tuple[Hashable, Any, Any]],
+                    indirim_tutari: Any = SIFIR) -> 'SepetToplamlari':
+        """(anahtar, tutar, kdv_orani) üçlülerinden toplamları kurar"""
+        toplamlar = cls()
+        for anahtar, tutar, kdv_orani in satirlar:
+            toplamlar.satir_ayarla(anahtar, tutar, kdv_orani)
+        toplamlar.indirim_ayarla(indirim_tutari)
+        return toplamlar
+
+    def satir_ayarla(self, anahtar: Hashable, tutar: Any, kdv_orani: Any = None) -> None:
+        """Satırı ekler veya tutarını/oranını değiştirir"""
+        tutar = tutar_yuvarla(tutar)
+        oran = kdv_orani_normalle(kdv_orani)
+        self.satir_cikar(anahtar)
+
+        self._satirlar[anahtar] = (tutar, oran)
+        self._brut += tutar
+        self._oran_toplamlari[oran] = self._oran_toplamlari.get(oran, SIFIR) + tutar
+        self._oran_satir_sayilari[oran] = self._oran_satir_sayilari.get(oran, 0) + 1
+
+    def satir_cikar(self, anahtar: Hashable) -> None:
+        """Satırı toplamlardan çıkarır (yoksa bir şey yapmaz)"""
+        eski = self._satirlar.pop(anahtar, None)
+        if eski is None:
+            return
+
+        tutar, oran = eski
+        self._brut -= tutar
+        self._oran_satir_sayilari[oran] -= 1
+        if self._oran_satir_sayilari[oran]:
+            self._oran_toplamlari[oran] -= tutar
+        else:
+            del self._oran_satir_sayilari[oran]
+            del self._oran_toplamlari[oran]
+
+    def indirim_ayarla(self, indirim_tutari: Any) -> None:
+        """Sepet geneli indirimi ayarlar"""
+        self._indirim = tutar_yuvarla(indirim_tutari or SIFIR)
+
+    def temizle(self) -> None:
+        """Tüm satırları ve indirimi sıfırlar"""
+        self._satirlar.clear()
+        self._oran_toplamlari.clear()
+        self._oran_satir_sayilari.clear()
+        self._brut = SIFIR
+        self._indirim = SIFIR
+
+    @property
+    def brut_toplam(self) -> Decimal:
+        """Satır tutarları toplamı (sepet indirimi öncesi)"""
+        return self._brut
+
+    @property
+    def indirim_tutari(self) -> Decimal:
+        """Sepet geneli indirim"""
+        return self._indirim
+
+    @property
+    def net_tutar(self) -> Decimal:
+        """Ödenecek tutar"""
+        return self._brut - self._indirim
+
+    @property
+    def satir_sayisi(self) -> int:
+        """Toplamlara katılan satır sayısı"""
+        return len(self._satirlar)
+
+    def satir_tutari(self, anahtar: Hashable) -> Optional[Decimal]:
+        """Satırın toplamlardaki tutarı"""
+        satir = self._satirlar.get(anahtar)
+        return satir[0] if satir else None
+
+    def kdv_dokumu(self) -> List[KdvDilimi]:
+        """Oran başına KDV dahil tutar, matrah ve KDV (oran sırasıyla)"""
+        oranlar = sorted(self._oran_toplamlari)
+        dilimler = []
+        dagitilan = SIFIR
+        for sira, oran in enumerate(oranlar):
+            tutar = self._oran_toplamlari[oran]
+            if sira == len(oranlar) - 1:
+                pay = self._indirim - dagitilan
+            elif self._brut:
+                pay = tutar_yuvarla(self._indirim * tutar / self._brut)
+            else:
+                pay = SIFIR
+            dagitilan += pay
+
+            tutar -= pay
+            kdv = tutar_yuvarla(tutar * oran / (Decimal('100') + oran))
+            dilimler.append(KdvDilimi(oran=oran, tutar=tutar, matrah=tutar - kdv, kdv=kdv))
+        return dilimler
+
+    def ozet(self) -> SepetToplamOzeti:
+        """Kilit dışına verilebilecek değişmez görüntü (oran sayısı kadar işlem)"""
+        return SepetToplamOzeti(
+            brut_toplam=self._brut,
+            indirim_tutari=self._indirim,
+            net_tutar=self.net_tutar,
+            kdv_dokumu=tuple(self.kdv_dokumu())
+        )
@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.services.offline_kuyruk_service
 # Description: Offline kuyruk service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Toplu sahiplen/gönder/onayla senkronizasyonu, uyarlanır batch boyutu
+# - Network durumu arka plan bağlantı izleyicisinin bayrağından okunuyor
+# - Kuyruk gönderimi arka plan senkronizasyon işçisine taşındı; satış yalnızca kuyruğa yazar
+# - Kuyruğa eklenen işlemler metrik kaydında sayılıyor
 
 """
 Offline Kuyruk Service Implementasyonu
@@ -12,22 +16,28 @@ Bu modül offline kuyruk yönetimi iş kurallarını içerir.
 Network durumu kontrolü, kuyruk yönetimi ve senkronizasyon işlemlerini sağlar.
 """
 
-import socket
 import time
-import requests
 from decimal import Decimal
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
-from threading import Lock
+from datetime import timedelta
+from typing import Callable, List, Optional, Dict, Any
 
 from sontechsp.uygulama.moduller.pos.arayuzler import (
-    IOfflineKuyrukService, IOfflineKuyrukRepository, IslemTuru, KuyrukDurum
+    IOfflineKuyrukService, IOfflineKuyrukRepository, IslemTuru
 )
 from sontechsp.uygulama.cekirdek.hatalar import (
     SontechHatasi, DogrulamaHatasi, NetworkHatasi
 )
+from sontechsp.uygulama.cekirdek.metrikler import metrik_kaydi_al
+from sontechsp.uygulama.moduller.pos.baglanti_izleyici import (
+    BaglantiIzleyici, baglanti_izleyici_al
+)
+from sontechsp.uygulama.moduller.pos.services.offline_senkron_iscisi import OfflineSenkronIscisi
 from sontechsp.uygulama.cekirdek.kayit import kayit_al
 
+_KUYRUGA_EKLENEN = metrik_kaydi_al().sayac(
+    'sontechsp_offline_kuyruk_eklenen_total', 'Offline kuyruğa eklenen işlemler', ('islem_turu',)
+)
+
 
 class OfflineKuyrukService(IOfflineKuyrukService):
     """
@@ -37,72 +47,42 @@ class OfflineKuyrukService(IOfflineKuyrukService):
     Kuyruk senkronizasyonu ve hata yönetimi işlemlerini yürütür.
     """
     
-    def __init__(self, kuyruk_repository: IOfflineKuyrukRepository):
+    def __init__(self, kuyruk_repository: IOfflineKuyrukRepository,
+                 baglanti_izleyici: Optional[BaglantiIzleyici] = None,
+                 arka_planda_senkronize: bool = True):
         """
         Service'i başlatır
         
         Args:
             kuyruk_repository: Offline kuyruk repository
+            baglanti_izleyici: Bağlantı izleyicisi (varsayılan süreç geneli izleyici)
+            arka_planda_senkronize: False ise kuyruk yalnızca kuyruk_senkronize_et
+                çağrısında gönderilir
         """
         self._kuyruk_repo = kuyruk_repository
         self._logger = kayit_al(__name__)
-        self._senkron_lock = Lock()
-        self._son_network_kontrol = None
-        self._network_durum_cache_suresi = 30  # saniye
-        self._network_timeout = 5  # saniye
-        self._senkron_batch_boyutu = 10
-        self._max_senkron_suresi = 300  # 5 dakika
+        self._baglanti_izleyici = baglanti_izleyici or baglanti_izleyici_al()
+        # Çağrı anında çözülür; testlerde örnek üzerinde patch'lenebilir
+        self._senkron_iscisi = OfflineSenkronIscisi(
+            kuyruk_repository,
+            gonderici=lambda islem: self._kuyruk_islemini_gonder(islem),
+            cevrimici=lambda: self.network_durumu_kontrol(),
+            baglanti_sorunu=self._baglanti_izleyici.tetikle,
+            arka_planda=arka_planda_senkronize
+        )
+        self._baglanti_izleyici.dinleyici_ekle(self._baglanti_durumu_degisti)
     
     def network_durumu_kontrol(self) -> bool:
         """
-        Network durumunu kontrol eder
-        
-        Cache mekanizması ile sık kontrol edilmesini önler.
-        
+        Merkez sunucu bağlantı durumunu döndürür
+
+        Ağ isteği yapmaz; bağlantı izleyicisinin arka planda güncellediği
+        bayrağı okur.
+
         Returns:
             Network bağlantısı var mı
         """
-        try:
-            # Cache kontrolü
-            simdi = datetime.now()
-            if (self._son_network_kontrol and 
-                (simdi - self._son_network_kontrol).total_seconds() < self._network_durum_cache_suresi):
-                return self._cached_network_durumu
-            
-            # DNS çözümleme testi
-            socket.setdefaulttimeout(self._network_timeout)
-            socket.gethostbyname('google.com')
-            
-            # HTTP bağlantı testi
-            response = requests.get(
-                'https://httpbin.org/status/200',
-                timeout=self._network_timeout
-            )
-            
-            network_durumu = response.status_code == 200
-            
-            # Cache güncelle
-            self._son_network_kontrol = simdi
-            self._cached_network_durumu = network_durumu
-            
-            if network_durumu:
-                self._logger.debug("Network bağlantısı aktif")
-            else:
-                self._logger.warning("Network bağlantısı yok - HTTP test başarısız")
-            
-            return network_durumu
-            
-        except (socket.gaierror, socket.timeout, requests.RequestException) as e:
-            self._logger.warning(f"Network bağlantısı yok: {str(e)}")
-            
-            # Cache güncelle
-            self._son_network_kontrol = simdi
-            self._cached_network_durumu = False
-            
-            return False
-        except Exception as e:
-            self._logger.error(f"Network durumu kontrol hatası: {str(e)}")
-            return False
+        return self._baglanti_izleyici.cevrimici
     
     def islem_kuyruga_ekle(self, islem_turu: IslemTuru, veri: Dict[str, Any],
                           terminal_id: int, kasiyer_id: int, 
@@ -139,20 +119,7 @@ class OfflineKuyrukService(IOfflineKuyrukService):
             if oncelik < 1 or oncelik > 5:
                 raise DogrulamaHatasi("Öncelik 1-5 arasında olmalıdır")
             
-            # Network durumu kontrol et
-            network_aktif = self.network_durumu_kontrol()
-            
-            if network_aktif:
-                # Network varsa direkt işlemi göndermeyi dene
-                try:
-                    basarili = self._islem_direkt_gonder(islem_turu, veri, terminal_id, kasiyer_id)
-                    if basarili:
-                        self._logger.info(f"İşlem direkt gönderildi: {islem_turu.value}")
-                        return True
-                except Exception as e:
-                    self._logger.warning(f"Direkt gönderim başarısız, kuyruğa ekleniyor: {str(e)}")
-            
-            # Kuyruğa ekle
+            # Yalnızca yerel kuyruğa yaz; gönderimi senkronizasyon işçisi yapar
             kuyruk_id = self._kuyruk_repo.kuyruk_ekle(
                 islem_turu=islem_turu,
                 veri=veri,
@@ -163,13 +130,8 @@ class OfflineKuyrukService(IOfflineKuyrukService):
             )
             
             self._logger.info(f"İşlem kuyruğa eklendi: ID={kuyruk_id}, Tür={islem_turu.value}")
-            
-            # Network varsa hemen senkronizasyon dene
-            if network_aktif:
-                try:
-                    self.kuyruk_senkronize_et()
-                except Exception as e:
-                    self._logger.warning(f"Otomatik senkronizasyon başarısız: {str(e)}")
+            _KUYRUGA_EKLENEN.arttir(islem_turu.value)
+            self._senkron_iscisi.uyandir()
             
             return True
             
@@ -181,10 +143,10 @@ class OfflineKuyrukService(IOfflineKuyrukService):
     
     def kuyruk_senkronize_et(self) -> int:
         """
-        Kuyruğu senkronize eder (Ana koordinasyon fonksiyonu)
+        Kuyruğu çağıran thread'de senkronize eder
         
-        Bekleyen işlemleri sırayla gönderir ve durumlarını günceller.
-        Thread-safe implementasyon.
+        Arka plan işçisiyle aynı turu çalıştırır; işçi o sırada gönderim
+        yapıyorsa turunun bitmesi beklenir.
         
         Returns:
             İşlenen kayıt sayısı
@@ -193,169 +155,50 @@ class OfflineKuyrukService(IOfflineKuyrukService):
             NetworkHatasi: Network bağlantısı yok
             SontechHatasi: Senkronizasyon hatası
         """
-        with self._senkron_lock:
-            try:
-                # 1. Ön kontroller
-                self._senkron_on_kontrol()
-                
-                # 2. Senkronizasyon döngüsü
-                islenen_sayisi = self._senkron_dongusu_calistir()
-                
-                self._logger.info(f"Kuyruk senkronizasyonu tamamlandı: {islenen_sayisi} işlem")
-                return islenen_sayisi
-                
-            except NetworkHatasi:
-                raise
-            except Exception as e:
-                self._logger.error(f"Kuyruk senkronizasyon hatası: {str(e)}")
-                raise SontechHatasi(f"Kuyruk senkronize edilemedi: {str(e)}")
-    
-    def _senkron_on_kontrol(self) -> None:
-        """
-        Senkronizasyon öncesi kontrolleri yapar
-        
-        Raises:
-            NetworkHatasi: Network bağlantısı yok
-        """
-        # Network durumu kontrol et
-        if not self.network_durumu_kontrol():
-            raise NetworkHatasi("Network bağlantısı yok, senkronizasyon yapılamaz")
-        
-        self._logger.info("Kuyruk senkronizasyonu başlatıldı")
-    
-    def _senkron_dongusu_calistir(self) -> int:
-        """
-        Ana senkronizasyon döngüsünü çalıştırır
-        
-        Returns:
-            int: İşlenen kayıt sayısı
-        """
-        islenen_sayisi = 0
-        basla_zamani = datetime.now()
-        
-        while True:
-            # Zaman aşımı kontrolü
-            if self._zaman_asimi_kontrol(basla_zamani):
-                break
-            
-            # Bekleyen işlemleri getir
-            bekleyen_islemler = self._kuyruk_repo.bekleyen_kuyruk_listesi(
-                limit=self._senkron_batch_boyutu
-            )
-            
-            if not bekleyen_islemler:
-                break
+        try:
+            # 1. Ön kontroller
+            self._senkron_on_kontrol()
             
-            # İşlemleri sırayla gönder
-            batch_islenen = self._batch_islemlerini_gonder(bekleyen_islemler)
-            islenen_sayisi += batch_islenen
+            # 2. Senkronizasyon turu
+            islenen_sayisi = self._senkron_iscisi.bosalt()
             
-            # Network bağlantısı kesildi mi kontrol et
-            if not self.network_durumu_kontrol():
-                self._logger.warning("Network bağlantısı kesildi, senkronizasyon durduruluyor")
-                break
+            self._logger.info(f"Kuyruk senkronizasyonu tamamlandı: {islenen_sayisi} işlem")
+            return islenen_sayisi
             
-            # Kısa bekleme
-            time.sleep(0.1)
-        
-        return islenen_sayisi
+        except NetworkHatasi:
+            raise
+        except Exception as e:
+            self._logger.error(f"Kuyruk senkronizasyon hatası: {str(e)}")
+            raise SontechHatasi(f"Kuyruk senkronize edilemedi: {str(e)}")
     
-    def _zaman_asimi_kontrol(self, basla_zamani: datetime) -> bool:
+    def senkron_dinleyicisi_ekle(self, dinleyici: Callable[[int], None]) -> None:
         """
-        Zaman aşımı kontrolü yapar
-        
-        Args:
-            basla_zamani: Başlangıç zamanı
-            
-        Returns:
-            bool: Zaman aşımı var mı
+        Kayıt gönderen her arka plan senkronizasyon turundan sonra çağrılacak
+        dinleyici ekler; dinleyici işçi thread'inde çağrılır.
         """
-        gecen_sure = (datetime.now() - basla_zamani).total_seconds()
-        if gecen_sure > self._max_senkron_suresi:
-            self._logger.warning(f"Senkronizasyon zaman aşımı: {gecen_sure} saniye")
-            return True
-        return False
+        self._senkron_iscisi.tur_dinleyicisi_ekle(dinleyici)
     
-    def _batch_islemlerini_gonder(self, bekleyen_islemler: List[Dict]) -> int:
-        """
-        Batch işlemlerini gönderir
-        
-        Args:
-            bekleyen_islemler: Bekleyen işlem listesi
-            
-        Returns:
-            int: Bu batch'te işlenen kayıt sayısı
-        """
-        batch_islenen = 0
-        
-        for islem in bekleyen_islemler:
-            try:
-                # Network durumu tekrar kontrol et
-                if not self.network_durumu_kontrol():
-                    break
-                
-                # Tek işlemi gönder
-                if self._tek_islemi_gonder(islem):
-                    batch_islenen += 1
-                
-            except Exception as e:
-                self._islem_hata_yonet(islem, e)
-        
-        return batch_islenen
+    def kapat(self) -> None:
+        """Arka plan senkronizasyon işçisini durdurur"""
+        self._senkron_iscisi.kapat()
     
-    def _tek_islemi_gonder(self, islem: Dict) -> bool:
-        """
-        Tek işlemi gönderir
-        
-        Args:
-            islem: İşlem bilgisi
-            
-        Returns:
-            bool: İşlem başarılı mı
-        """
-        # İşlemi işleniyor durumuna getir
-        self._kuyruk_repo.kuyruk_durum_guncelle(
-            islem['id'], 
-            KuyrukDurum.ISLENIYOR
-        )
-        
-        # İşlemi gönder
-        basarili = self._kuyruk_islemini_gonder(islem)
-        
-        if basarili:
-            # Başarılı - tamamlandı olarak işaretle
-            self._kuyruk_repo.kuyruk_durum_guncelle(
-                islem['id'], 
-                KuyrukDurum.TAMAMLANDI
-            )
-            self._logger.debug(f"Kuyruk işlemi tamamlandı: ID={islem['id']}")
-            return True
-        else:
-            # Başarısız - deneme sayısını artır
-            self._kuyruk_repo.kuyruk_deneme_artir(
-                islem['id'], 
-                "Senkronizasyon sırasında işlem başarısız"
-            )
-            self._logger.warning(f"Kuyruk işlemi başarısız: ID={islem['id']}")
-            return False
+    def _baglanti_durumu_degisti(self, cevrimici: bool) -> None:
+        """Bağlantı geri gelince bekleyen kuyruğu göndermek için işçiyi uyandırır"""
+        if cevrimici:
+            self._senkron_iscisi.uyandir()
     
-    def _islem_hata_yonet(self, islem: Dict, hata: Exception) -> None:
+    def _senkron_on_kontrol(self) -> None:
         """
-        İşlem hatası yönetimi
+        Senkronizasyon öncesi kontrolleri yapar
         
-        Args:
-            islem: İşlem bilgisi
-            hata: Oluşan hata
+        Raises:
+            NetworkHatasi: Network bağlantısı yok
         """
-        try:
-            self._kuyruk_repo.kuyruk_deneme_artir(
-                islem['id'], 
-                f"Senkronizasyon hatası: {str(hata)}"
-            )
-        except Exception:
-            pass
+        # Network durumu kontrol et
+        if not self.network_durumu_kontrol():
+            raise NetworkHatasi("Network bağlantısı yok, senkronizasyon yapılamaz")
         
-        self._logger.error(f"Kuyruk işlemi hatası: ID={islem['id']}, Hata: {str(hata)}")
+        self._logger.info("Kuyruk senkronizasyonu başlatıldı")
     
     def offline_durum_bildir(self, terminal_id: int, kasiyer_id: int, 
                            islem_turu: IslemTuru) -> None:
@@ -393,8 +236,9 @@ class OfflineKuyrukService(IOfflineKuyrukService):
         try:
             istatistikler = self._kuyruk_repo.kuyruk_istatistikleri(terminal_id)
             
-            # Network durumu ekle
+            # Network durumu ve senkronizasyon işçisinin ilerlemesi
             istatistikler['network_durumu'] = self.network_durumu_kontrol()
+            istatistikler['senkron'] = self._senkron_iscisi.istatistikler()
             
             return istatistikler
             
@@ -449,37 +293,6 @@ class OfflineKuyrukService(IOfflineKuyrukService):
             self._logger.error(f"Kuyruk temizleme hatası: {str(e)}")
             return 0
     
-    def _islem_direkt_gonder(self, islem_turu: IslemTuru, veri: Dict[str, Any],
-                           terminal_id: int, kasiyer_id: int) -> bool:
-        """
-        İşlemi direkt ana sisteme gönderir (private method)
-        
-        Args:
-            islem_turu: İşlem türü
-            veri: İşlem verisi
-            terminal_id: Terminal kimliği
-            kasiyer_id: Kasiyer kimliği
-            
-        Returns:
-            Gönderim başarılı mı
-        """
-        try:
-            # Burada ana sistem API'sine HTTP çağrısı yapılacak
-            # Şimdilik mock implementasyon
-            
-            self._logger.debug(f"Direkt gönderim deneniyor: {islem_turu.value}")
-            
-            # Simüle edilmiş API çağrısı
-            time.sleep(0.1)  # Network gecikmesi simülasyonu
-            
-            # %90 başarı oranı simülasyonu
-            import random
-            return random.random() > 0.1
-            
-        except Exception as e:
-            self._logger.warning(f"Direkt gönderim hatası: {str(e)}")
-            return False
-    
     def _kuyruk_islemini_gonder(self, islem: Dict[str, Any]) -> bool:
         """
         Kuyruk işlemini ana sisteme gönderir (private method)
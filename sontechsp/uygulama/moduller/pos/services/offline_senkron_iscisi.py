@@ -0,0 +1,447 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.services.offline_senkron_iscisi
+# Description: Offline kuyruğu arka planda boşaltan senkronizasyon işçisi
+# Changelog:
+# - İlk oluşturma
+# - İlerleme sayaçları metrik kaydına (Prometheus dışa aktarımı) yazılıyor
+
+"""
+Offline Senkronizasyon İşçisi
+
+Kuyruğun boşaltılması satış hattından ayrılmıştır. Satış kaydı SQLite
+kuyruğuna yazılıp işçi uyandırılır; gönderim işçinin thread'inde yapılır.
+
+- Sahiplenilen batch terminallere ayrılır; terminaller en fazla
+  eszamanlilik kadar paralel gönderilir, her terminalin kayıtları
+  sahiplenme sırasıyla tek tek gönderilir.
+- Terminalin bir kaydı başarısız olursa o terminalin sonraki kayıtları
+  gönderilmez, deneme sayılmadan geri bırakılır ve turun geri kalanında
+  o terminalden kayıt gönderilmez; sıra bir sonraki turda korunur.
+- Geri basınç: hedef süreyi aşan veya hiç ilerleme olmayan batch'ten sonra
+  batch boyutu ve eşzamanlılık yarıya iner. İkisi de alt sınırdayken
+  yavaşlık sürerse turlar arasına ikiye katlanan bekleme girer; merkez
+  toparlanınca bekleme sıfırlanır ve boyut/eşzamanlılık yeniden artar.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from sontechsp.uygulama.cekirdek.metrikler import metrik_kaydi_al
+from sontechsp.uygulama.moduller.pos.arayuzler import IOfflineKuyrukRepository
+from sontechsp.uygulama.moduller.pos.monitoring import get_pos_monitoring
+
+# Kuyruk kaydını merkeze gönderen fonksiyon; False dönmesi veya hata fırlatması başarısızlıktır
+Gonderici = Callable[[Dict[str, Any]], bool]
+TurDinleyicisi = Callable[[int], None]
+
+_ISLENEN_KAYITLAR = metrik_kaydi_al().sayac(
+    'sontechsp_offline_senkron_kayit_total',
+    'Senkronizasyon işçisinin işlediği offline kuyruk kayıtları', ('sonuc',)
+)
+_BATCH_BOYUTU = metrik_kaydi_al().gosterge(
+    'sontechsp_offline_senkron_batch_boyutu', 'Uyarlanan senkronizasyon batch boyutu'
+)
+_GERI_BASINC_BEKLEMESI = metrik_kaydi_al().gosterge(
+    'sontechsp_offline_senkron_geri_basinc_saniye', 'Turlar arasındaki geri basınç beklemesi'
+)
+_SON_TUR_ZAMANI = metrik_kaydi_al().gosterge(
+    'sontechsp_offline_senkron_son_tur_zamani_saniye', 'Son senkronizasyon turunun bitişi (Unix zamanı)'
+)
+
+
+class _BatchSonucu:
+    """Tek batch gönderiminin sonuçları"""
+
+    def __init__(self):
+        self.basarili_idler: List[int] = []
+        self.hatalar: Dict[str, List[int]] = {}
+        self.birakilan_idler: List[int] = []
+        self.engellenen_terminaller: Set[int] = set()
+
+
+class OfflineSenkronIscisi:
+    """
+    Offline kuyruk senkronizasyon işçisi
+
+    bosalt() çağıran thread'de, arka plan thread'i uyandir() ile veya
+    aralik dolunca aynı turu çalıştırır; turlar birbirini bekler.
+    """
+
+    def __init__(self, kuyruk_repository: IOfflineKuyrukRepository,
+                 gonderici: Gonderici,
+                 cevrimici: Callable[[], bool],
+                 baglanti_sorunu: Optional[Callable[[], None]] = None,
+                 azami_eszamanlilik: int = 4,
+                 aralik: float = 30.0,
+                 hedef_batch_suresi: float = 2.0,
+                 ilk_geri_basinc_beklemesi: float = 1.0,
+                 azami_geri_basinc_beklemesi: float = 60.0,
+                 max_senkron_suresi: int = 300,
+                 arka_planda: bool = True):
+        """
+        Args:
+            kuyruk_repository: Offline kuyruk repository
+            gonderici: Tek kuyruk kaydını merkeze gönderen fonksiyon
+            cevrimici: Merkez erişilebilir mi (önbellekli bayrak okunmalı)
+            baglanti_sorunu: Batch'te hiç ilerleme olmadığında çağrılır
+            azami_eszamanlilik: Aynı anda gönderim yapılan en fazla terminal sayısı
+            aralik: Uyandırılmasa da kuyruğa bakma aralığı (saniye)
+            hedef_batch_suresi: Bu süreyi aşan batch yavaş sayılır (saniye)
+            ilk_geri_basinc_beklemesi: Geri basınçta turlar arası ilk bekleme (saniye)
+            azami_geri_basinc_beklemesi: Geri basınç beklemesi üst sınırı (saniye)
+            max_senkron_suresi: Tek turun süre sınırı; daha eski sahiplenmeler
+                yarıda kalmış sayılır (saniye)
+            arka_planda: False ise yalnızca bosalt() çağrısında gönderilir
+        """
+        self._kuyruk_repo = kuyruk_repository
+        self._gonderici = gonderici
+        self._cevrimici = cevrimici
+        self._baglanti_sorunu = baglanti_sorunu
+        self._aralik = aralik
+        self._hedef_batch_suresi = hedef_batch_suresi
+        self._ilk_geri_basinc_beklemesi = ilk_geri_basinc_beklemesi
+        self._azami_geri_basinc_beklemesi = azami_geri_basinc_beklemesi
+        self._max_senkron_suresi = max_senkron_suresi
+        self._logger = logging.getLogger(__name__)
+        self._monitoring = get_pos_monitoring()
+
+        self._min_batch_boyutu = 1
+        self._max_batch_boyutu = 500
+        self._batch_boyutu = 50  # başlangıç; gönderim süresine göre uyarlanır
+        self._azami_eszamanlilik = max(1, azami_eszamanlilik)
+        self._eszamanlilik = self._azami_eszamanlilik
+        self._geri_basinc_beklemesi = 0.0
+
+        self._tur_kilidi = threading.Lock()
+        self._metrik_kilidi = threading.Lock()
+        self._dinleyiciler: List[TurDinleyicisi] = []
+        self._metrikler: Dict[str, Any] = {
+            'calisiyor': False,
+            'gonderilen_toplam': 0,
+            'hatali_toplam': 0,
+            'ertelenen_toplam': 0,
+            'son_tur_zamani': None,
+            'son_tur_islenen': 0,
+            'son_batch_suresi': None,
+        }
+
+        self._havuz = ThreadPoolExecutor(max_workers=self._azami_eszamanlilik,
+                                         thread_name_prefix="offline-senkron")
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+        self._isci: Optional[threading.Thread] = None
+        if arka_planda:
+            self._isci = threading.Thread(
+                target=self._isci_dongusu, name="offline-senkron-iscisi", daemon=True
+            )
+            self._isci.start()
+
+    def uyandir(self) -> None:
+        """Arka plan işçisine kuyrukta yeni kayıt olduğunu bildirir; beklemeden döner"""
+        self._uyandir.set()
+
+    def tur_dinleyicisi_ekle(self, dinleyici: TurDinleyicisi) -> None:
+        """
+        Kayıt gönderen her arka plan turundan sonra işlenen sayıyla çağrılacak
+        dinleyici ekler (bosalt() çağıranı sonucu zaten alır)
+        """
+        with self._metrik_kilidi:
+            self._dinleyiciler.append(dinleyici)
+
+    def bosalt(self) -> int:
+        """
+        Kuyruğu çağıran thread'de boşaltır
+
+        Arka plan turu sürüyorsa bitmesi beklenir. Geri basınç beklemesi
+        gerektiğinde beklemeden döner; kalan kayıtları arka plan işçisi gönderir.
+
+        Returns:
+            int: Gönderilen kayıt sayısı
+        """
+        with self._tur_kilidi:
+            return self._tur_calistir()
+
+    def istatistikler(self) -> Dict[str, Any]:
+        """
+        İşçinin ilerleme metrikleri
+
+        Returns:
+            Dict: Toplam gönderilen/hatalı/ertelenen kayıt, son tur zamanı ve
+            sayısı, son batch süresi ve güncel batch boyutu, eşzamanlılık,
+            geri basınç beklemesi
+        """
+        with self._metrik_kilidi:
+            metrikler = dict(self._metrikler)
+        son_tur = metrikler['son_tur_zamani']
+        metrikler['son_tur_zamani'] = son_tur.isoformat() if son_tur else None
+        metrikler['batch_boyutu'] = self._batch_boyutu
+        metrikler['eszamanlilik'] = self._eszamanlilik
+        metrikler['geri_basinc_beklemesi'] = self._geri_basinc_beklemesi
+        return metrikler
+
+    def kapat(self, zaman_asimi: float = 5.0) -> None:
+        """Arka plan thread'ini durdurur; sahiplenilmiş kayıtlar bir sonraki açılışta geri alınır"""
+        self._durdur.set()
+        self._uyandir.set()
+        if self._isci is not None and self._isci.is_alive():
+            self._isci.join(timeout=zaman_asimi)
+        self._havuz.shutdown(wait=False)
+
+    # Tur
+
+    def _isci_dongusu(self) -> None:
+        """Uyandırılınca veya aralik dolunca tur çalıştırır; geri basınçta bekler"""
+        while not self._durdur.is_set():
+            self._uyandir.wait(self._aralik)
+            self._uyandir.clear()
+            if self._durdur.is_set():
+                break
+            if not self._cevrimici():
+                continue
+
+            try:
+                with self._tur_kilidi:
+                    islenen_sayisi = self._tur_calistir()
+                if islenen_sayisi:
+                    self._tur_bildir(islenen_sayisi)
+            except Exception as e:
+                self._logger.error(f"Arka plan senkronizasyon hatası: {str(e)}")
+
+            bekleme = self._geri_basinc_beklemesi
+            if bekleme:
+                if self._durdur.wait(bekleme):
+                    break
+                # Tur geri basınç nedeniyle kesildi; kalan kayıtlara devam et
+                self._uyandir.set()
+
+    def _tur_calistir(self) -> int:
+        """
+        Bir senkronizasyon turu: batch sahiplen, gönder, toplu onayla
+
+        Bu turda denenmiş kayıtlar aynı turda yeniden sahiplenilmez.
+        """
+        islenen_sayisi = 0
+        basla_zamani = datetime.now()
+        engelli_terminaller: Set[int] = set()
+        self._metrik_guncelle(calisiyor=True)
+
+        try:
+            geri_alinan = self._kuyruk_repo.sahipsiz_islemleri_geri_al(self._max_senkron_suresi)
+            if geri_alinan:
+                self._logger.warning(f"Yarıda kalmış {geri_alinan} kuyruk kaydı yeniden beklemeye alındı")
+
+            while not self._durdur.is_set():
+                if self._zaman_asimi_kontrol(basla_zamani):
+                    break
+
+                batch = self._kuyruk_repo.bekleyenleri_sahiplen(
+                    limit=self._batch_boyutu,
+                    son_deneme_oncesi=basla_zamani
+                )
+                if not batch:
+                    break
+
+                baslangic = time.perf_counter()
+                sonuc = self._batch_gonder(batch, engelli_terminaller)
+                gecen_sure = time.perf_counter() - baslangic
+
+                self._batch_sonuclarini_yaz(sonuc)
+                islenen_sayisi += len(sonuc.basarili_idler)
+                engelli_terminaller |= sonuc.engellenen_terminaller
+
+                self._monitoring.sure_kaydet(
+                    "offline_senkron_batch", gecen_sure, basarili=not sonuc.hatalar,
+                    batch_boyutu=len(batch), basarili_sayisi=len(sonuc.basarili_idler),
+                    eszamanlilik=self._eszamanlilik
+                )
+                self._metrik_guncelle(
+                    son_batch_suresi=gecen_sure,
+                    gonderilen=len(sonuc.basarili_idler),
+                    hatali=sum(len(idler) for idler in sonuc.hatalar.values()),
+                    ertelenen=len(sonuc.birakilan_idler)
+                )
+                self._batch_boyutunu_ayarla(len(batch), gecen_sure, bool(sonuc.basarili_idler))
+                if not sonuc.basarili_idler and self._baglanti_sorunu:
+                    self._baglanti_sorunu()
+
+                if not self._cevrimici():
+                    self._logger.warning("Network bağlantısı kesildi, senkronizasyon durduruluyor")
+                    break
+                if self._geri_basinc_beklemesi:
+                    self._logger.warning(
+                        f"Merkez yavaş yanıt veriyor, gönderim "
+                        f"{self._geri_basinc_beklemesi:.1f} sn erteleniyor"
+                    )
+                    break
+        finally:
+            self._metrik_guncelle(calisiyor=False, son_tur_zamani=datetime.now(),
+                                  son_tur_islenen=islenen_sayisi)
+
+        return islenen_sayisi
+
+    def _zaman_asimi_kontrol(self, basla_zamani: datetime) -> bool:
+        gecen_sure = (datetime.now() - basla_zamani).total_seconds()
+        if gecen_sure > self._max_senkron_suresi:
+            self._logger.warning(f"Senkronizasyon zaman aşımı: {gecen_sure} saniye")
+            return True
+        return False
+
+    # Batch
+
+    def _batch_gonder(self, islemler: List[Dict[str, Any]],
+                      engelli_terminaller: Set[int]) -> _BatchSonucu:
+        """
+        Sahiplenilen batch'i terminal başına sıralı, terminaller arası paralel gönderir
+
+        Args:
+            islemler: Sahiplenilen işlem listesi (sahiplenme sırasıyla)
+            engelli_terminaller: Bu turda kaydı başarısız olmuş terminaller
+
+        Returns:
+            _BatchSonucu: Başarılı ID'ler sahiplenme sırasıyla
+        """
+        sonuc = _BatchSonucu()
+
+        # Terminal -> [(sahiplenme sırası, işlem)]
+        gruplar: 'OrderedDict[Any, List[Tuple[int, Dict[str, Any]]]]' = OrderedDict()
+        for sira, islem in enumerate(islemler):
+            terminal_id = islem.get('terminal_id')
+            if terminal_id in engelli_terminaller:
+                sonuc.birakilan_idler.append(islem['id'])
+                continue
+            gruplar.setdefault(terminal_id, []).append((sira, islem))
+
+        kuyruk: Deque[Tuple[Any, List[Tuple[int, Dict[str, Any]]]]] = deque(gruplar.items())
+        basarili: List[Tuple[int, int]] = []
+        kilit = threading.Lock()
+
+        def calis() -> None:
+            while True:
+                try:
+                    terminal_id, grup = kuyruk.popleft()
+                except IndexError:
+                    return
+                grup_basarili, grup_sonucu = self._grubu_gonder(terminal_id, grup)
+                with kilit:
+                    basarili.extend(grup_basarili)
+                    for mesaj, idler in grup_sonucu.hatalar.items():
+                        sonuc.hatalar.setdefault(mesaj, []).extend(idler)
+                    sonuc.birakilan_idler.extend(grup_sonucu.birakilan_idler)
+                    sonuc.engellenen_terminaller |= grup_sonucu.engellenen_terminaller
+
+        calisan_sayisi = min(self._eszamanlilik, len(kuyruk))
+        if calisan_sayisi > 1:
+            wait([self._havuz.submit(calis) for _ in range(calisan_sayisi)])
+        else:
+            calis()
+
+        sonuc.basarili_idler = [kuyruk_id for _, kuyruk_id in sorted(basarili)]
+        return sonuc
+
+    def _grubu_gonder(self, terminal_id: Any, grup: List[Tuple[int, Dict[str, Any]]]
+                      ) -> Tuple[List[Tuple[int, int]], _BatchSonucu]:
+        """
+        Terminalin kayıtlarını sırayla gönderir; ilk hatada kalanları bırakır
+
+        Returns:
+            Tuple: ([(sahiplenme sırası, başarılı ID)], hata/bırakma sonuçları)
+        """
+        basarili: List[Tuple[int, int]] = []
+        sonuc = _BatchSonucu()
+        for i, (sira, islem) in enumerate(grup):
+            try:
+                if self._gonderici(islem):
+                    basarili.append((sira, islem['id']))
+                    continue
+                hata_mesaji = "Senkronizasyon sırasında işlem başarısız"
+            except Exception as e:
+                hata_mesaji = f"Senkronizasyon hatası: {str(e)}"
+
+            sonuc.hatalar.setdefault(hata_mesaji, []).append(islem['id'])
+            sonuc.birakilan_idler.extend(kalan['id'] for _, kalan in grup[i + 1:])
+            sonuc.engellenen_terminaller.add(terminal_id)
+            self._logger.warning(f"Kuyruk işlemi başarısız: ID={islem['id']}, {hata_mesaji}")
+            break
+        return basarili, sonuc
+
+    def _batch_sonuclarini_yaz(self, sonuc: _BatchSonucu) -> None:
+        """Batch sonuçlarını toplu UPDATE'lerle yazar"""
+        if sonuc.basarili_idler:
+            self._kuyruk_repo.toplu_tamamla(sonuc.basarili_idler)
+            self._logger.debug(f"Kuyruk batch'i tamamlandı: {len(sonuc.basarili_idler)} işlem")
+
+        for hata_mesaji, idler in sonuc.hatalar.items():
+            self._kuyruk_repo.toplu_deneme_artir(idler, hata_mesaji)
+
+        if sonuc.birakilan_idler:
+            self._kuyruk_repo.sahiplenmeyi_birak(sonuc.birakilan_idler)
+
+    def _batch_boyutunu_ayarla(self, alinan: int, gecen_sure: float, ilerleme_var: bool) -> None:
+        """
+        Batch boyutunu, eşzamanlılığı ve geri basınç beklemesini ayarlar
+
+        Hedef sürenin yarısından kısa süren dolu batch'ten sonra boyut ikiye
+        katlanır ve eşzamanlılık bir artar. Hedefi aşan veya hiç başarılı
+        kaydı olmayan batch'ten sonra ikisi de yarıya iner; zaten alt
+        sınırdaysalar turlar arası bekleme başlar veya ikiye katlanır.
+
+        Args:
+            alinan: Sahiplenilen kayıt sayısı
+            gecen_sure: Gönderim süresi (saniye)
+            ilerleme_var: Batch'te başarılı kayıt var mı
+        """
+        eski_boyut = self._batch_boyutu
+        eski_eszamanlilik = self._eszamanlilik
+        if gecen_sure > self._hedef_batch_suresi or not ilerleme_var:
+            self._batch_boyutu = max(self._min_batch_boyutu, eski_boyut // 2)
+            self._eszamanlilik = max(1, eski_eszamanlilik // 2)
+            if eski_boyut == self._min_batch_boyutu and eski_eszamanlilik == 1:
+                self._geri_basinc_beklemesi = min(
+                    max(self._geri_basinc_beklemesi * 2, self._ilk_geri_basinc_beklemesi),
+                    self._azami_geri_basinc_beklemesi
+                )
+            return
+
+        self._geri_basinc_beklemesi = 0.0
+        if alinan >= eski_boyut and gecen_sure < self._hedef_batch_suresi / 2:
+            self._batch_boyutu = min(self._max_batch_boyutu, eski_boyut * 2)
+            self._eszamanlilik = min(self._azami_eszamanlilik, eski_eszamanlilik + 1)
+
+        if self._batch_boyutu != eski_boyut:
+            self._logger.debug(
+                f"Senkron batch boyutu {eski_boyut} -> {self._batch_boyutu} "
+                f"({gecen_sure:.2f} sn)"
+            )
+
+    # Metrikler
+
+    def _metrik_guncelle(self, gonderilen: int = 0, hatali: int = 0, ertelenen: int = 0,
+                         **degerler: Any) -> None:
+        with self._metrik_kilidi:
+            self._metrikler['gonderilen_toplam'] += gonderilen
+            self._metrikler['hatali_toplam'] += hatali
+            self._metrikler['ertelenen_toplam'] += ertelenen
+            self._metrikler.update(degerler)
+
+        for sonuc, adet in (('gonderildi', gonderilen), ('hata', hatali), ('ertelendi', ertelenen)):
+            if adet:
+                _ISLENEN_KAYITLAR.arttir(sonuc, miktar=adet)
+        _BATCH_BOYUTU.ayarla(self._batch_boyutu)
+        _GERI_BASINC_BEKLEMESI.ayarla(self._geri_basinc_beklemesi)
+        if degerler.get('son_tur_zamani') is not None:
+            _SON_TUR_ZAMANI.ayarla(degerler['son_tur_zamani'].timestamp())
+
+    def _tur_bildir(self, islenen_sayisi: int) -> None:
+        with self._metrik_kilidi:
+            dinleyiciler = list(self._dinleyiciler)
+        for dinleyici in dinleyiciler:
+            try:
+                dinleyici(islenen_sayisi)
+            except Exception as e:
+                self._logger.error(f"Senkronizasyon dinleyicisi hatası: {str(e)}")
@@ -1,27 +1,36 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.fis_service
 # Description: Fiş service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Fiş toplamları ve KDV dökümü sepet toplamlarından basılıyor
+# - Fişler derlenmiş şablondan üretiliyor, yazdırma yazıcı kuyruğuna alınabiliyor
 
 """
 Fiş Service Implementasyonu
 
 Bu modül fiş formatlaması ve yazdırma işlemlerini yönetir.
 Satış fişi ve iade fişi oluşturma, formatlaması ve yazdırma hazırlığı sağlar.
+
+Fiş düzenleri modül yüklenirken bir kez derlenir; her fişte yalnızca
+değişken alanlar biçimlendirilir. Yazıcı kuyruğu verilmişse yazdırma
+işi kuyruğa alınıp hemen dönülür, yazıcı arka planda beslenir.
 """
 
-from decimal import Decimal
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 import logging
 
 from sontechsp.uygulama.moduller.pos.arayuzler import (
-    IFisService, ISatisRepository, IIadeRepository
+    IFisService, ISatisRepository, IIadeRepository, sepet_toplam_ozeti
 )
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamOzeti
 from sontechsp.uygulama.moduller.pos.hatalar import YazdirmaHatasi
 from sontechsp.uygulama.moduller.pos.monitoring import islem_izle, get_pos_monitoring
+from sontechsp.uygulama.moduller.pos.yazdirma import (
+    Satir, Bolum, sablon_derle, metni_escpos_yap, YazdirmaIsi, YaziciKuyrugu, yazici_kuyrugu_al
+)
 from sontechsp.uygulama.cekirdek.hatalar import (
     DogrulamaHatasi, SontechHatasi, VeritabaniHatasi
 )
@@ -29,6 +38,79 @@ from sontechsp.uygulama.cekirdek.kayit import kayit_sistemi_al
 
 logger = kayit_sistemi_al()
 
+_CIZGI = "=" * 40
+_TIRE = "-" * 40
+
+_MAGAZA_BOLUMU = Bolum('magaza', (
+    Satir("Mağaza: {magaza_adi}"),
+    Bolum('magaza_adresi', (Satir("Adres: {adres}"),)),
+    Bolum('magaza_telefonu', (Satir("Tel: {telefon}"),)),
+    Satir(""),
+))
+
+_URUN_SATIRLARI = (
+    Satir(_TIRE),
+    Satir("ÜRÜN                 ADET  B.FİYAT  TOPLAM"),
+    Satir(_TIRE),
+    Bolum('satirlar', (
+        Satir("{urun_adi:<15.15} {adet:>4} {birim_fiyat:>8.2f} {toplam_tutar:>8.2f}"),
+    )),
+    Satir(_TIRE),
+)
+
+SATIS_FISI_SABLONU = sablon_derle((
+    Satir(_CIZGI),
+    Satir("         SATIŞ FİŞİ", stil='buyuk'),
+    Satir(_CIZGI),
+    Satir(""),
+    _MAGAZA_BOLUMU,
+    Satir("Fiş No: {fis_no}"),
+    Satir("Tarih: {tarih}"),
+    Satir("Terminal: {terminal_id}"),
+    Satir("Kasiyer: {kasiyer_id}"),
+    Satir(""),
+    *_URUN_SATIRLARI,
+    Satir("Ara Toplam:              {brut_toplam:>10.2f} TL"),
+    Bolum('indirim', (Satir("İndirim:                 {indirim_tutari:>10.2f} TL"),)),
+    Bolum('kdv_dokumu', (Satir("{oran_metni:<25}{kdv:>10.2f} TL"),)),
+    Bolum('kdv_toplami_satiri', (Satir("TOPLAM KDV:              {kdv_toplami:>10.2f} TL"),)),
+    Satir("NET TOPLAM:              {net_tutar:>10.2f} TL", stil='kalin'),
+    Satir(""),
+    Bolum('odeme_bilgileri', (
+        Satir("ÖDEME BİLGİLERİ:"),
+        Bolum('odemeler', (Satir("{odeme_turu}:                   {tutar:>10.2f} TL"),)),
+        Satir(""),
+    )),
+    Satir(_CIZGI),
+    Satir("    Alışverişiniz için teşekkürler!"),
+    Satir(_CIZGI),
+    Satir(""),
+    Satir("Yazdırma: {yazdirma_zamani}"),
+))
+
+IADE_FISI_SABLONU = sablon_derle((
+    Satir(_CIZGI),
+    Satir("         İADE FİŞİ", stil='buyuk'),
+    Satir(_CIZGI),
+    Satir(""),
+    _MAGAZA_BOLUMU,
+    Satir("İade No: {fis_no}"),
+    Satir("Tarih: {tarih}"),
+    Satir("Terminal: {terminal_id}"),
+    Satir("Kasiyer: {kasiyer_id}"),
+    Satir("Orijinal Satış: {orijinal_satis_id}"),
+    Satir("İade Nedeni: {neden}"),
+    Satir(""),
+    *_URUN_SATIRLARI,
+    Satir("İADE TOPLAMI:            {toplam_tutar:>10.2f} TL", stil='kalin'),
+    Satir(""),
+    Satir(_CIZGI),
+    Satir("         İADE TAMAMLANDI"),
+    Satir(_CIZGI),
+    Satir(""),
+    Satir("Yazdırma: {yazdirma_zamani}"),
+))
+
 
 class FisService(IFisService):
     """
@@ -38,26 +120,33 @@ class FisService(IFisService):
     Repository katmanını kullanarak veri işlemlerini gerçekleştirir.
     """
     
-    def __init__(self, satis_repository: ISatisRepository, iade_repository: IIadeRepository):
+    def __init__(self, satis_repository: ISatisRepository, iade_repository: IIadeRepository,
+                 yazici_kuyrugu: Optional[YaziciKuyrugu] = None):
         """
         Service'i başlatır
         
         Args:
             satis_repository: Satış repository instance'ı
             iade_repository: İade repository instance'ı
+            yazici_kuyrugu: Varsayılan yazıcının kuyruğu (verilmezse fis_yazdir
+                eskisi gibi senkron yazdırır)
         """
         self.satis_repository = satis_repository
         self.iade_repository = iade_repository
+        self._yazici_kuyrugu = yazici_kuyrugu
         logger.info("FisService başlatıldı")
     
     @islem_izle("fis_satis_olusturma")
-    def satis_fisi_olustur(self, satis_id: int, magaza_bilgileri: Optional[Dict[str, Any]] = None) -> str:
+    def satis_fisi_olustur(self, satis_id: int, magaza_bilgileri: Optional[Dict[str, Any]] = None,
+                           toplamlar: Optional[SepetToplamOzeti] = None) -> str:
         """
         Satış fişi oluşturur ve formatlar
         
         Args:
             satis_id: Satış kimliği
             magaza_bilgileri: Mağaza bilgileri (opsiyonel)
+            toplamlar: Sepetin toplamları ve KDV dökümü (opsiyonel; verilmezse
+                satış kaydından kurulur)
             
         Returns:
             Formatlanmış fiş içeriği
@@ -79,7 +168,7 @@ class FisService(IFisService):
                 raise SontechHatasi(f"Satış bulunamadı: {satis_id}")
             
             # Fiş içeriğini formatla
-            fis_icerik = self._satis_fisi_formatla(satis_bilgisi, magaza_bilgileri)
+            fis_icerik = self._satis_fisi_formatla(satis_bilgisi, magaza_bilgileri, toplamlar)
             
             logger.info(f"Satış fişi başarıyla oluşturuldu - Satış ID: {satis_id}")
             return fis_icerik
@@ -152,6 +241,12 @@ class FisService(IFisService):
             
             logger.info(f"Fiş yazdırılıyor - Yazıcı: {yazici_adi or 'Varsayılan'}")
             
+            kuyruk = self._kuyruk_sec(yazici_adi)
+            if kuyruk is not None:
+                # Yazıcı arka planda beslenir; kasa kuyruğa alınınca devam eder
+                kuyruk.is_ekle(metni_escpos_yap(fis_icerik))
+                return True
+            
             # Yazdırma işlemi simülasyonu
             # Gerçek implementasyonda Windows Print API veya yazıcı driver'ı kullanılır
             yazdirma_basarili = self._yazici_gonder(fis_icerik, yazici_adi)
@@ -169,6 +264,67 @@ class FisService(IFisService):
             logger.error(f"Fiş yazdırma hatası: {str(e)}")
             raise YazdirmaHatasi(f"Fiş yazdırma işlemi başarısız: {str(e)}", yazici_adi)
     
+    @islem_izle("fis_kuyruga_alma")
+    def fis_kuyruga_al(self, satis_id: int, magaza_bilgileri: Optional[Dict[str, Any]] = None,
+                       toplamlar: Optional[SepetToplamOzeti] = None,
+                       yazici_adi: Optional[str] = None,
+                       geri_cagirim: Optional[Callable[[YazdirmaIsi], None]] = None) -> str:
+        """
+        Satış fişini ESC/POS olarak üretip yazıcı kuyruğuna alır
+        
+        İş kuyruk klasörüne yazıldıktan sonra döner; yazdırma, yeniden
+        deneme ve durum bildirimleri yazıcı kuyruğunun thread'indedir.
+        
+        Args:
+            satis_id: Satış kimliği
+            magaza_bilgileri: Mağaza bilgileri (opsiyonel)
+            toplamlar: Sepetin toplamları ve KDV dökümü (opsiyonel)
+            yazici_adi: Yazıcı adı (opsiyonel, varsayılan kuyruk kullanılır)
+            geri_cagirim: İşin durum değişikliklerinde çağrılır
+            
+        Returns:
+            Yazdırma iş kimliği
+            
+        Raises:
+            DogrulamaHatasi: Geçersiz satış ID
+            SontechHatasi: Satış bulunamadı
+            YazdirmaHatasi: Yazıcı kuyruğu yok veya iş kuyruğa yazılamadı
+        """
+        try:
+            if satis_id <= 0:
+                raise DogrulamaHatasi("Satış ID pozitif olmalıdır")
+            
+            kuyruk = self._kuyruk_sec(yazici_adi)
+            if kuyruk is None:
+                raise YazdirmaHatasi("Yazıcı kuyruğu tanımlı değil", yazici_adi)
+            
+            satis_bilgisi = self.satis_repository.satis_getir(satis_id)
+            if not satis_bilgisi:
+                raise SontechHatasi(f"Satış bulunamadı: {satis_id}")
+            
+            veri = SATIS_FISI_SABLONU.escpos_uret(
+                self._satis_fisi_degerleri(satis_bilgisi, magaza_bilgileri, toplamlar)
+            )
+            is_id = kuyruk.is_ekle(veri, etiket=str(satis_bilgisi.get('fis_no', satis_id)),
+                                   geri_cagirim=geri_cagirim)
+            
+            logger.info(f"Satış fişi yazdırma kuyruğuna alındı - Satış ID: {satis_id}, İş: {is_id}")
+            return is_id
+            
+        except (DogrulamaHatasi, SontechHatasi):
+            raise
+        except Exception as e:
+            logger.error(f"Fiş kuyruğa alma hatası: {str(e)}")
+            raise YazdirmaHatasi(f"Fiş kuyruğa alma işlemi başarısız: {str(e)}", yazici_adi)
+    
+    def _kuyruk_sec(self, yazici_adi: Optional[str]) -> Optional[YaziciKuyrugu]:
+        """Yazıcı adına göre kuyruğu seçer; kuyruk yapılandırılmamışsa None (private method)"""
+        if self._yazici_kuyrugu is None:
+            return None
+        if yazici_adi is None or yazici_adi == self._yazici_kuyrugu.yazici_adi:
+            return self._yazici_kuyrugu
+        return yazici_kuyrugu_al(yazici_adi)
+    
     def fis_onizleme(self, fis_icerik: str) -> Dict[str, Any]:
         """
         Fiş önizlemesi oluşturur
@@ -214,97 +370,59 @@ class FisService(IFisService):
             raise YazdirmaHatasi(f"Fiş önizleme işlemi başarısız: {str(e)}")
     
     def _satis_fisi_formatla(self, satis_bilgisi: Dict[str, Any], 
-                           magaza_bilgileri: Optional[Dict[str, Any]] = None) -> str:
+                           magaza_bilgileri: Optional[Dict[str, Any]] = None,
+                           toplamlar: Optional[SepetToplamOzeti] = None) -> str:
         """
         Satış fişini formatlar (private method)
         
         Args:
             satis_bilgisi: Satış bilgileri
             magaza_bilgileri: Mağaza bilgileri
+            toplamlar: Sepet toplamları ve KDV dökümü
             
         Returns:
             Formatlanmış fiş içeriği
         """
-        fis_satirlari = []
-        
-        # Başlık
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("         SATIŞ FİŞİ")
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("")
-        
-        # Mağaza bilgileri
-        if magaza_bilgileri:
-            fis_satirlari.append(f"Mağaza: {magaza_bilgileri.get('adi', 'SONTECHSP')}")
-            if magaza_bilgileri.get('adres'):
-                fis_satirlari.append(f"Adres: {magaza_bilgileri['adres']}")
-            if magaza_bilgileri.get('telefon'):
-                fis_satirlari.append(f"Tel: {magaza_bilgileri['telefon']}")
-            fis_satirlari.append("")
-        
-        # Fiş bilgileri
-        fis_satirlari.append(f"Fiş No: {satis_bilgisi.get('fis_no', 'N/A')}")
-        
-        # Tarih formatlaması
-        satis_tarihi = satis_bilgisi.get('satis_tarihi', datetime.now())
-        if isinstance(satis_tarihi, datetime):
-            tarih_str = satis_tarihi.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            tarih_str = str(satis_tarihi)[:19] if satis_tarihi else 'N/A'
-        
-        fis_satirlari.append(f"Tarih: {tarih_str}")
-        fis_satirlari.append(f"Terminal: {satis_bilgisi.get('terminal_id', 'N/A')}")
-        fis_satirlari.append(f"Kasiyer: {satis_bilgisi.get('kasiyer_id', 'N/A')}")
-        fis_satirlari.append("")
-        fis_satirlari.append("-" * 40)
-        
-        # Ürün listesi başlığı
-        fis_satirlari.append("ÜRÜN                 ADET  B.FİYAT  TOPLAM")
-        fis_satirlari.append("-" * 40)
-        
-        # Ürün satırları
+        return SATIS_FISI_SABLONU.metin_uret(
+            self._satis_fisi_degerleri(satis_bilgisi, magaza_bilgileri, toplamlar)
+        )
+    
+    def _satis_fisi_degerleri(self, satis_bilgisi: Dict[str, Any],
+                              magaza_bilgileri: Optional[Dict[str, Any]] = None,
+                              toplamlar: Optional[SepetToplamOzeti] = None) -> Dict[str, Any]:
+        """Satış fişi şablonunun alan değerlerini hazırlar (private method)"""
         satirlar = satis_bilgisi.get('satirlar', [])
-        for satir in satirlar:
-            urun_adi = satir.get('urun_adi', 'Bilinmeyen Ürün')[:15]
-            adet = satir.get('adet', 0)
-            birim_fiyat = satir.get('birim_fiyat', 0.0)
-            toplam = satir.get('toplam_tutar', 0.0)
-            
-            # Satırı formatla (sabit genişlik)
-            satir_str = f"{urun_adi:<15} {adet:>4} {birim_fiyat:>8.2f} {toplam:>8.2f}"
-            fis_satirlari.append(satir_str)
-        
-        fis_satirlari.append("-" * 40)
-        
-        # Toplam bilgileri
-        toplam_tutar = Decimal(str(satis_bilgisi.get('toplam_tutar', 0.0)))
-        indirim_tutari = Decimal(str(satis_bilgisi.get('indirim_tutari', 0.0)))
-        net_tutar = toplam_tutar - indirim_tutari
-        
-        fis_satirlari.append(f"Ara Toplam:              {toplam_tutar:>10.2f} TL")
-        if indirim_tutari > 0:
-            fis_satirlari.append(f"İndirim:                 {indirim_tutari:>10.2f} TL")
-        fis_satirlari.append(f"NET TOPLAM:              {net_tutar:>10.2f} TL")
-        fis_satirlari.append("")
-        
-        # Ödeme bilgileri
-        odemeler = satis_bilgisi.get('odemeler', [])
-        if odemeler:
-            fis_satirlari.append("ÖDEME BİLGİLERİ:")
-            for odeme in odemeler:
-                odeme_turu = odeme.get('odeme_turu', 'Bilinmeyen').upper()
-                tutar = odeme.get('tutar', 0.0)
-                fis_satirlari.append(f"{odeme_turu}:                   {tutar:>10.2f} TL")
-            fis_satirlari.append("")
-        
-        # Alt bilgi
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("    Alışverişiniz için teşekkürler!")
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("")
-        fis_satirlari.append(f"Yazdırma: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
-        
-        return '\n'.join(fis_satirlari)
+        if toplamlar is None:
+            toplamlar = sepet_toplam_ozeti({
+                'toplam_tutar': satis_bilgisi.get('toplam_tutar', 0.0),
+                'indirim_tutari': satis_bilgisi.get('indirim_tutari', 0.0),
+                'satirlar': satirlar
+            })
+        
+        odemeler = [
+            {'odeme_turu': odeme.get('odeme_turu', 'Bilinmeyen').upper(),
+             'tutar': odeme.get('tutar', 0.0)}
+            for odeme in satis_bilgisi.get('odemeler', [])
+        ]
+        
+        degerler = self._ortak_fis_degerleri(satis_bilgisi, magaza_bilgileri)
+        degerler.update({
+            'tarih': self._tarih_metni(satis_bilgisi.get('satis_tarihi', datetime.now())),
+            'satirlar': self._urun_satirlari(satirlar),
+            'brut_toplam': toplamlar.brut_toplam,
+            'indirim': [{}] if toplamlar.indirim_tutari > 0 else [],
+            'indirim_tutari': toplamlar.indirim_tutari,
+            'kdv_dokumu': [
+                {'oran_metni': f"KDV %{dilim.oran.normalize():f}:", 'kdv': dilim.kdv}
+                for dilim in toplamlar.kdv_dokumu
+            ],
+            'kdv_toplami_satiri': [{}] if toplamlar.kdv_dokumu else [],
+            'kdv_toplami': toplamlar.kdv_toplami,
+            'net_tutar': toplamlar.net_tutar,
+            'odeme_bilgileri': [{}] if odemeler else [],
+            'odemeler': odemeler
+        })
+        return degerler
     
     def _iade_fisi_formatla(self, iade_bilgisi: Dict[str, Any], 
                           magaza_bilgileri: Optional[Dict[str, Any]] = None) -> str:
@@ -318,64 +436,53 @@ class FisService(IFisService):
         Returns:
             Formatlanmış iade fişi içeriği
         """
-        fis_satirlari = []
-        
-        # Başlık
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("         İADE FİŞİ")
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("")
-        
-        # Mağaza bilgileri
+        degerler = self._ortak_fis_degerleri(iade_bilgisi, magaza_bilgileri)
+        degerler.update({
+            'tarih': iade_bilgisi.get('iade_tarihi', datetime.now().isoformat())[:19],
+            'orijinal_satis_id': iade_bilgisi.get('orijinal_satis_id', 'N/A'),
+            'neden': iade_bilgisi.get('neden', 'Belirtilmemiş'),
+            'satirlar': self._urun_satirlari(iade_bilgisi.get('satirlar', [])),
+            'toplam_tutar': iade_bilgisi.get('toplam_tutar', 0.0)
+        })
+        return IADE_FISI_SABLONU.metin_uret(degerler)
+    
+    def _ortak_fis_degerleri(self, bilgi: Dict[str, Any],
+                             magaza_bilgileri: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Satış ve iade fişlerinde ortak alanları hazırlar (private method)"""
+        magaza = []
         if magaza_bilgileri:
-            fis_satirlari.append(f"Mağaza: {magaza_bilgileri.get('adi', 'SONTECHSP')}")
-            if magaza_bilgileri.get('adres'):
-                fis_satirlari.append(f"Adres: {magaza_bilgileri['adres']}")
-            if magaza_bilgileri.get('telefon'):
-                fis_satirlari.append(f"Tel: {magaza_bilgileri['telefon']}")
-            fis_satirlari.append("")
-        
-        # İade bilgileri
-        fis_satirlari.append(f"İade No: {iade_bilgisi.get('fis_no', 'N/A')}")
-        fis_satirlari.append(f"Tarih: {iade_bilgisi.get('iade_tarihi', datetime.now().isoformat())[:19]}")
-        fis_satirlari.append(f"Terminal: {iade_bilgisi.get('terminal_id', 'N/A')}")
-        fis_satirlari.append(f"Kasiyer: {iade_bilgisi.get('kasiyer_id', 'N/A')}")
-        fis_satirlari.append(f"Orijinal Satış: {iade_bilgisi.get('orijinal_satis_id', 'N/A')}")
-        fis_satirlari.append(f"İade Nedeni: {iade_bilgisi.get('neden', 'Belirtilmemiş')}")
-        fis_satirlari.append("")
-        fis_satirlari.append("-" * 40)
-        
-        # Ürün listesi başlığı
-        fis_satirlari.append("ÜRÜN                 ADET  B.FİYAT  TOPLAM")
-        fis_satirlari.append("-" * 40)
-        
-        # İade satırları
-        satirlar = iade_bilgisi.get('satirlar', [])
-        for satir in satirlar:
-            urun_adi = satir.get('urun_adi', 'Bilinmeyen Ürün')[:15]
-            adet = satir.get('adet', 0)
-            birim_fiyat = satir.get('birim_fiyat', 0.0)
-            toplam = satir.get('toplam_tutar', 0.0)
-            
-            # Satırı formatla (sabit genişlik)
-            satir_str = f"{urun_adi:<15} {adet:>4} {birim_fiyat:>8.2f} {toplam:>8.2f}"
-            fis_satirlari.append(satir_str)
-        
-        fis_satirlari.append("-" * 40)
-        
-        # Toplam bilgileri
-        toplam_tutar = iade_bilgisi.get('toplam_tutar', 0.0)
-        fis_satirlari.append(f"İADE TOPLAMI:            {toplam_tutar:>10.2f} TL")
-        fis_satirlari.append("")
-        
-        # Alt bilgi
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("         İADE TAMAMLANDI")
-        fis_satirlari.append("=" * 40)
-        fis_satirlari.append("")
-        fis_satirlari.append(f"Yazdırma: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
-        
-        return '\n'.join(fis_satirlari)
+            magaza.append({
+                'magaza_adi': magaza_bilgileri.get('adi', 'SONTECHSP'),
+                'magaza_adresi': ([{'adres': magaza_bilgileri['adres']}]
+                                  if magaza_bilgileri.get('adres') else []),
+                'magaza_telefonu': ([{'telefon': magaza_bilgileri['telefon']}]
+                                    if magaza_bilgileri.get('telefon') else [])
+            })
+        return {
+            'magaza': magaza,
+            'fis_no': bilgi.get('fis_no', 'N/A'),
+            'terminal_id': bilgi.get('terminal_id', 'N/A'),
+            'kasiyer_id': bilgi.get('kasiyer_id', 'N/A'),
+            'yazdirma_zamani': datetime.now().strftime('%d.%m.%Y %H:%M:%S')
+        }
+    
+    @staticmethod
+    def _urun_satirlari(satirlar: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ürün satırlarını şablon alanlarına çevirir (private method)"""
+        return [
+            {'urun_adi': satir.get('urun_adi', 'Bilinmeyen Ürün'),
+             'adet': satir.get('adet', 0),
+             'birim_fiyat': satir.get('birim_fiyat', 0.0),
+             'toplam_tutar': satir.get('toplam_tutar', 0.0)}
+            for satir in satirlar
+        ]
+    
+    @staticmethod
+    def _tarih_metni(tarih: Any) -> str:
+        """Satış tarihini fiş biçimine çevirir (private method)"""
+        if isinstance(tarih, datetime):
+            return tarih.strftime('%Y-%m-%d %H:%M:%S')
+        return str(tarih)[:19] if tarih else 'N/A'
     
     def _yazici_gonder(self, fis_icerik: str, yazici_adi: Optional[str] = None) -> bool:
         """
@@ -433,6 +540,10 @@ class FisService(IFisService):
                 'hata_mesaji': None
             }
             
+            kuyruk = self._kuyruk_sec(yazici_adi)
+            if kuyruk is not None:
+                durum['bekleyen_is'] = kuyruk.bekleyen_is_sayisi()
+            
             logger.debug(f"Yazıcı durumu kontrol edildi: {durum['yazici_adi']}")
             return durum
             
@@ -1,15 +1,20 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.iade_service
 # Description: İade service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - İade edilebilir satırlar fiş no/barkodla defterden okunuyor
 
 """
 İade Service Implementasyonu
 
 Bu modül iade işlemlerinin iş kurallarını yönetir.
 İade işlemi başlatma, doğrulama, tutarı hesaplama ve stok girişi işlemlerini sağlar.
+
+Satış satırı başına iade edilebilir adet, satış tamamlanırken oluşturulan
+iade defterinde tutulur; iade masası fiş no veya barkodla bu defteri okur
+ve kalem eklenirken adet defterden aynı transaction'da ayrılır.
 """
 
 from decimal import Decimal
@@ -117,6 +122,36 @@ class IadeService(IIadeService):
             logger.error(f"İade başlatma hatası: {str(e)}")
             raise IadeHatasi(f"İade başlatma işlemi başarısız: {str(e)}")
     
+    def iade_edilebilir_satirlari_getir(self, fis_no: Optional[str] = None,
+                                        barkod: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fiş no veya barkodla kalan iade edilebilir satış satırlarını getirir
+        
+        Args:
+            fis_no: Satış fiş numarası
+            barkod: Ürün barkodu
+            
+        Returns:
+            Satış satırları (satis_id, sepet_satiri_id, kalan_adet,
+            birim_iade_tutari, ...)
+            
+        Raises:
+            DogrulamaHatasi: Fiş numarası ve barkod boşsa
+            IadeHatasi: Okuma hatası
+        """
+        fis_no = fis_no.strip() if fis_no else None
+        barkod = barkod.strip() if barkod else None
+        if not fis_no and not barkod:
+            raise DogrulamaHatasi("iade_arama", "Fiş numarası veya barkod gereklidir")
+        
+        try:
+            return self.iade_repository.iade_edilebilir_satirlar(fis_no=fis_no, barkod=barkod)
+        except (DogrulamaHatasi, IadeHatasi, SontechHatasi):
+            raise
+        except Exception as e:
+            logger.error(f"İade edilebilir satır okuma hatası: {str(e)}")
+            raise IadeHatasi(f"İade edilebilir satırlar alınamadı: {str(e)}")
+    
     def iade_kalemi_ekle(self, iade_id: int, urun_id: int, barkod: str, 
                         urun_adi: str, adet: int, birim_fiyat: Decimal,
                         orijinal_sepet_satiri_id: Optional[int] = None,
@@ -124,6 +159,9 @@ class IadeService(IIadeService):
         """
         İadeye kalem ekler ve iade tutarını hesaplar
         
+        Adet orijinal satış satırının iade defterinden ayrılır; satılandan
+        fazlası eklenemez.
+        
         Args:
             iade_id: İade kimliği
             urun_id: Ürün kimliği
@@ -139,7 +177,7 @@ class IadeService(IIadeService):
             
         Raises:
             DogrulamaHatasi: Geçersiz parametreler
-            IadeHatasi: İade işlemi hataları
+            IadeHatasi: İade işlemi hataları veya iade edilebilir adet aşımı
             SontechHatasi: İade bulunamadı
         """
         try:
@@ -1,32 +1,57 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.odeme_service
 # Description: POS Ödeme Service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Stok düşümü sepet bazlı toplu çağrıya taşındı
+# - Varsayılan sepet repository sepet motoru oldu; ödeme öncesi sepet kalıcı yazılır
+# - Stok düşümüne terminalin mağaza/depo bilgisi aktarılıyor
+# - Satış kaydından önce sepet bazlı toplu stok kontrolü yapılıyor
+# - Tutarlar sepetin artımlı toplamlarından (kuruş hassasiyetinde) okunuyor
+# - Satış, ödemeler, stok düşümü, tamamlama ve sepet durumu tek transaction'da;
+#   yan etkiler giden olay tablosuna (outbox), aşama süreleri monitoring'e
+# - Tamamlanan satışın satırları hızlı ürün sıralamasına ekleniyor
 
 """
 POS Ödeme Service Implementasyonu
 
 Bu modül ödeme işlemleri iş kurallarını içerir.
 Tek ve parçalı ödeme işlemleri, ödeme doğrulama ve stok düşümü sağlar.
+
+Satış tamamlama tek transaction'dır: satış kaydı, ödemeler, stok düşümü,
+satış tamamlama, sepet durumu ve sadakat / e-belge / e-ticaret giden
+olayları aynı oturumda yazılır ve bir kez commit edilir. Herhangi bir
+aşama hata verirse hiçbiri kalıcı olmaz.
 """
 
+from contextlib import contextmanager
 from decimal import Decimal
 import decimal
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, ContextManager, Iterator
 import logging
+import time
+
+from sqlalchemy.orm import Session
 
 from sontechsp.uygulama.moduller.pos.arayuzler import (
-    IOdemeService, ISepetRepository, ISatisRepository, IStokService,
-    SepetDurum, SatisDurum, OdemeTuru
+    IOdemeService, ISepetRepository, ISatisRepository, IStokService, IGidenOlayRepository,
+    SepetDurum, SatisDurum, OdemeTuru, GidenOlayHedef, sepet_toplam_ozeti
 )
-from sontechsp.uygulama.moduller.pos.repositories.sepet_repository import SepetRepository
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamOzeti
+from sontechsp.uygulama.moduller.pos.hizli_urunler import HizliUrunSiralayici, hizli_urun_siralayici_al
+from sontechsp.uygulama.moduller.pos.repositories.sepet_motoru import sepet_motoru_al
 from sontechsp.uygulama.moduller.pos.repositories.satis_repository import SatisRepository
+from sontechsp.uygulama.moduller.pos.repositories.giden_olay_repository import GidenOlayRepository
+from sontechsp.uygulama.veritabani.baglanti import postgresql_session
 from sontechsp.uygulama.moduller.pos.monitoring import islem_izle, get_pos_monitoring
 from sontechsp.uygulama.cekirdek.hatalar import (
-    DogrulamaHatasi, SontechHatasi, EntegrasyonHatasi
+    DogrulamaHatasi, SontechHatasi, EntegrasyonHatasi, StokHatasi
 )
+from sontechsp.uygulama.cekirdek.oturum import aktif_oturum
+
+# Tamamlanan satış için giden olay türü
+SATIS_TAMAMLANDI_OLAYI = "satis_tamamlandi"
 
 
 class OdemeHatasi(SontechHatasi):
@@ -60,18 +85,36 @@ class OdemeService(IOdemeService):
     def __init__(self, 
                  sepet_repository: Optional[ISepetRepository] = None,
                  satis_repository: Optional[ISatisRepository] = None,
-                 stok_service: Optional[IStokService] = None):
+                 stok_service: Optional[IStokService] = None,
+                 magaza_id: Optional[int] = None,
+                 depo_id: Optional[int] = None,
+                 giden_olay_repository: Optional[IGidenOlayRepository] = None,
+                 oturum_saglayici: Optional[Callable[[], ContextManager[Session]]] = None,
+                 hizli_urunler: Optional[HizliUrunSiralayici] = None):
         """
         Service'i başlatır
         
         Args:
-            sepet_repository: Sepet repository (opsiyonel, default SepetRepository)
+            sepet_repository: Sepet repository (opsiyonel, default paylaşılan sepet motoru)
             satis_repository: Satış repository (opsiyonel, default SatisRepository)
             stok_service: Stok service (opsiyonel, mock için)
+            magaza_id: Stoğun düşüleceği mağaza (opsiyonel, default aktif oturumun mağazası)
+            depo_id: Stoğun düşüleceği depo (opsiyonel)
+            giden_olay_repository: Satış sonrası olayların outbox'ı (opsiyonel, default GidenOlayRepository)
+            oturum_saglayici: Satış tamamlama transaction'ını açan, çıkışta commit
+                eden context manager (opsiyonel, default postgresql_session)
+            hizli_urunler: Satılan ürünlerin sayıldığı hızlı ürün sıralayıcısı
+                (opsiyonel, default süreç geneli sıralayıcı)
         """
-        self._sepet_repository = sepet_repository or SepetRepository()
+        self._sepet_repository = sepet_repository or sepet_motoru_al()
         self._satis_repository = satis_repository or SatisRepository()
         self._stok_service = stok_service  # Mock için opsiyonel
+        self._magaza_id = magaza_id
+        self._depo_id = depo_id
+        self._giden_olay_repository = giden_olay_repository or GidenOlayRepository()
+        self._oturum_saglayici = oturum_saglayici or postgresql_session
+        self._hizli_urunler = hizli_urunler or hizli_urun_siralayici_al()
+        self._monitoring = get_pos_monitoring()
         self._logger = logging.getLogger(__name__)
     
     @islem_izle("odeme_tek_odeme")
@@ -116,8 +159,7 @@ class OdemeService(IOdemeService):
         if sepet['durum'] != SepetDurum.AKTIF.value:
             raise DogrulamaHatasi("sepet_aktif_degil", "Sepet aktif durumda değil")
         
-        sepet_toplam = Decimal(str(sepet['toplam_tutar']))
-        net_tutar = Decimal(str(sepet.get('net_tutar', sepet['toplam_tutar'])))
+        net_tutar = sepet_toplam_ozeti(sepet).net_tutar
         
         # Ödeme tutarı kontrolü
         if tutar != net_tutar:
@@ -126,41 +168,10 @@ class OdemeService(IOdemeService):
                 sepet_id, tutar
             )
         
-        try:
-            # Satış kaydı oluştur
-            satis_id = self._satis_repository.satis_olustur(
-                sepet_id=sepet_id,
-                terminal_id=sepet['terminal_id'],
-                kasiyer_id=sepet['kasiyer_id'],
-                toplam_tutar=sepet_toplam
-            )
-            
-            # Ödeme kaydı ekle
-            odeme_id = self._satis_repository.satis_odeme_ekle(
-                satis_id=satis_id,
-                odeme_turu=odeme_turu,
-                tutar=tutar
-            )
-            
-            # Stok düşümü yap (stok servisi varsa)
-            if self._stok_service:
-                self._stok_dusumu_yap(sepet)
-            
-            # Fiş numarası oluştur
-            fis_no = self._fis_numarasi_olustur(satis_id)
-            
-            # Satışı tamamla
-            self._satis_repository.satis_tamamla(satis_id, fis_no)
-            
-            # Sepet durumunu güncelle
-            self._sepet_repository.sepet_durum_guncelle(sepet_id, SepetDurum.TAMAMLANDI)
-            
-            self._logger.info(f"Tek ödeme tamamlandı - Satış ID: {satis_id}, Fiş No: {fis_no}")
-            return True
-            
-        except Exception as e:
-            self._logger.error(f"Tek ödeme hatası: {str(e)}")
-            raise
+        satis_id, fis_no = self._satisi_tamamla(sepet, [{'turu': odeme_turu, 'tutar': tutar}])
+        
+        self._logger.info(f"Tek ödeme tamamlandı - Satış ID: {satis_id}, Fiş No: {fis_no}")
+        return True
     
     @islem_izle("odeme_parcali_odeme")
     def parcali_odeme_yap(self, sepet_id: int, odemeler: List[Dict[str, Any]]) -> bool:
@@ -186,11 +197,8 @@ class OdemeService(IOdemeService):
         # 2. Ödeme tutarları kontrolü
         self._odeme_tutarlari_kontrol(odemeler, sepet)
         
-        # 3. Satış işlemi
-        satis_id = self._satis_islemi_yap(sepet, odemeler)
-        
-        # 4. İşlemi tamamla
-        fis_no = self._odeme_tamamla(sepet_id, satis_id, sepet)
+        # 3. Satışı tek transaction'da tamamla
+        satis_id, fis_no = self._satisi_tamamla(sepet, odemeler)
         
         self._logger.info(f"Parçalı ödeme tamamlandı - Satış ID: {satis_id}, Fiş No: {fis_no}")
         return True
@@ -238,7 +246,7 @@ class OdemeService(IOdemeService):
             DogrulamaHatasi: Geçersiz ödeme tutarları
             OdemeHatasi: Toplam ödeme uyumsuzluğu
         """
-        net_tutar = Decimal(str(sepet.get('net_tutar', sepet['toplam_tutar'])))
+        net_tutar = sepet_toplam_ozeti(sepet).net_tutar
         toplam_odeme = Decimal('0.00')
         
         for odeme in odemeler:
@@ -258,84 +266,170 @@ class OdemeService(IOdemeService):
                 sepet['id'], toplam_odeme
             )
     
-    def _satis_islemi_yap(self, sepet: Dict, odemeler: List[Dict[str, Any]]) -> int:
+    def _sepeti_kaydet(self, sepet_id: int) -> None:
         """
-        Satış işlemini gerçekleştirir
+        Sepet motorunda bekleyen satır değişikliklerini kalıcı hale getirir
+        
+        Satış kaydı veritabanındaki sepet satırlarından oluşturulur; gecikmeli
+        yazım yapan repository'lerde satıştan önce çağrılmalıdır.
+        """
+        if hasattr(self._sepet_repository, 'sepet_kaydet'):
+            self._sepet_repository.sepet_kaydet(sepet_id)
+    
+    def _satisi_tamamla(self, sepet: Dict[str, Any], odemeler: List[Dict[str, Any]]) -> Tuple[int, str]:
+        """
+        Sepeti tek transaction'da satışa çevirir
+        
+        Stok kontrolü ve sepet motorunun bekleyen yazımı transaction'dan
+        önce yapılır. Ardından satış, ödemeler, stok düşümü, satış tamamlama,
+        sepet durumu ve giden olaylar aynı oturumla yazılır; commit bir kez,
+        bloğun sonunda yapılır. Aşama süreleri monitoring'e
+        'satis_tamamlama.<aşama>' adıyla kaydedilir ve tek satırda loglanır.
         
         Args:
             sepet: Sepet bilgisi
-            odemeler: Ödeme listesi
+            odemeler: Ödeme listesi [{'turu': OdemeTuru|str, 'tutar': Decimal, 'referans': str}]
             
         Returns:
-            int: Satış ID
+            Tuple[int, str]: Satış ID ve fiş numarası
             
         Raises:
-            Exception: Satış işlemi hatası
+            StokHatasi: Sepetteki bir ürünün stoğu yetersizse (satış oluşmaz)
+            EntegrasyonHatasi: Stok düşümü hatası (transaction geri alınır)
         """
+        sureler: Dict[str, float] = {}
+        basarili = False
         try:
-            sepet_toplam = Decimal(str(sepet['toplam_tutar']))
-            
-            # Satış kaydı oluştur
-            satis_id = self._satis_repository.satis_olustur(
-                sepet_id=sepet['id'],
-                terminal_id=sepet['terminal_id'],
-                kasiyer_id=sepet['kasiyer_id'],
-                toplam_tutar=sepet_toplam
-            )
-            
-            # Her ödeme için kayıt ekle
-            for odeme in odemeler:
-                odeme_turu = odeme['turu']
-                if isinstance(odeme_turu, str):
-                    odeme_turu = OdemeTuru(odeme_turu)
+            with self._asama('stok_kontrol', sureler):
+                self._sepet_stok_kontrol(sepet)
+            with self._asama('sepet_kaydet', sureler):
+                self._sepeti_kaydet(sepet['id'])
+            
+            toplamlar = sepet_toplam_ozeti(sepet)
+            with self._oturum_saglayici() as oturum:
+                with self._asama('satis', sureler):
+                    satis_id = self._satis_repository.satis_olustur(
+                        sepet_id=sepet['id'],
+                        terminal_id=sepet['terminal_id'],
+                        kasiyer_id=sepet['kasiyer_id'],
+                        toplam_tutar=toplamlar.brut_toplam,
+                        session=oturum
+                    )
                 
-                self._satis_repository.satis_odeme_ekle(
-                    satis_id=satis_id,
-                    odeme_turu=odeme_turu,
-                    tutar=Decimal(str(odeme['tutar'])),
-                    referans_no=odeme.get('referans')
-                )
-            
-            return satis_id
+                with self._asama('odemeler', sureler):
+                    for odeme in odemeler:
+                        odeme_turu = odeme['turu']
+                        if isinstance(odeme_turu, str):
+                            odeme_turu = OdemeTuru(odeme_turu)
+                        
+                        self._satis_repository.satis_odeme_ekle(
+                            satis_id=satis_id,
+                            odeme_turu=odeme_turu,
+                            tutar=Decimal(str(odeme['tutar'])),
+                            referans_no=odeme.get('referans'),
+                            session=oturum
+                        )
+                
+                with self._asama('stok_dusumu', sureler):
+                    self._stok_dusumu_yap(sepet, satis_id, oturum)
+                
+                fis_no = self._fis_numarasi_olustur(satis_id)
+                with self._asama('satis_tamamla', sureler):
+                    self._satis_repository.satis_tamamla(satis_id, fis_no, session=oturum)
+                
+                with self._asama('sepet_durumu', sureler):
+                    self._sepet_repository.sepet_durum_guncelle(
+                        sepet['id'], SepetDurum.TAMAMLANDI, session=oturum
+                    )
+                
+                with self._asama('giden_olaylar', sureler):
+                    self._giden_olay_repository.olaylari_ekle(
+                        self._giden_olaylar(sepet, satis_id, fis_no, odemeler, toplamlar),
+                        session=oturum
+                    )
+                
+                commit_baslangici = time.perf_counter()
+            sureler['commit'] = time.perf_counter() - commit_baslangici
+            basarili = True
+            self._hizli_urunleri_guncelle(sepet)
+            return satis_id, fis_no
             
         except Exception as e:
-            self._logger.error(f"Satış işlemi hatası: {str(e)}")
+            self._logger.error(f"Satış tamamlama hatası: {str(e)}")
             raise
+        finally:
+            self._asama_surelerini_kaydet(sureler, basarili)
     
-    def _odeme_tamamla(self, sepet_id: int, satis_id: int, sepet: Dict) -> str:
+    def _hizli_urunleri_guncelle(self, sepet: Dict[str, Any]) -> None:
+        """Commit edilen satışın satırlarını hızlı ürün sıralamasına ekler"""
+        try:
+            self._hizli_urunler.satis_kaydet(sepet['terminal_id'], sepet.get('satirlar') or [])
+        except Exception as e:
+            self._logger.warning(f"Hızlı ürün sıralaması güncellenemedi: {str(e)}")
+    
+    @contextmanager
+    def _asama(self, asama: str, sureler: Dict[str, float]) -> Iterator[None]:
+        """Satış tamamlama aşamasının süresini ölçer (hata verse de kaydedilir)"""
+        baslangic = time.perf_counter()
+        try:
+            yield
+        finally:
+            sureler[asama] = time.perf_counter() - baslangic
+    
+    def _asama_surelerini_kaydet(self, sureler: Dict[str, float], basarili: bool) -> None:
+        """Aşama sürelerini monitoring'e yazar ve tek satırda loglar"""
+        for asama, sure in sureler.items():
+            self._monitoring.sure_kaydet(f"satis_tamamlama.{asama}", sure, basarili)
+        
+        ozet = ", ".join(f"{asama}={sure * 1000:.1f}ms" for asama, sure in sureler.items())
+        self._logger.info(f"Satış tamamlama aşamaları ({'başarılı' if basarili else 'başarısız'}): {ozet}")
+    
+    def _giden_olaylar(self, sepet: Dict[str, Any], satis_id: int, fis_no: str,
+                       odemeler: List[Dict[str, Any]],
+                       toplamlar: SepetToplamOzeti) -> List[Dict[str, Any]]:
         """
-        Ödeme işlemini tamamlar
+        Satış sonrası sadakat, e-belge ve e-ticaret olaylarını hazırlar
         
-        Args:
-            sepet_id: Sepet ID
-            satis_id: Satış ID
-            sepet: Sepet bilgisi
-            
-        Returns:
-            str: Fiş numarası
-            
-        Raises:
-            Exception: Tamamlama işlemi hatası
+        Her hedefe aynı satış özeti gider; tutarlar JSON'a metin olarak
+        yazılır (kuruş hassasiyeti korunur).
         """
-        try:
-            # Stok düşümü yap (stok servisi varsa)
-            if self._stok_service:
-                self._stok_dusumu_yap(sepet)
-            
-            # Fiş numarası oluştur
-            fis_no = self._fis_numarasi_olustur(satis_id)
-            
-            # Satışı tamamla
-            self._satis_repository.satis_tamamla(satis_id, fis_no)
-            
-            # Sepet durumunu güncelle
-            self._sepet_repository.sepet_durum_guncelle(sepet_id, SepetDurum.TAMAMLANDI)
-            
-            return fis_no
-            
-        except Exception as e:
-            self._logger.error(f"Ödeme tamamlama hatası: {str(e)}")
-            raise
+        veri = {
+            'satis_id': satis_id,
+            'fis_no': fis_no,
+            'sepet_id': sepet['id'],
+            'terminal_id': sepet['terminal_id'],
+            'kasiyer_id': sepet['kasiyer_id'],
+            'musteri_id': sepet.get('musteri_id'),
+            'brut_toplam': str(toplamlar.brut_toplam),
+            'indirim_tutari': str(toplamlar.indirim_tutari),
+            'net_tutar': str(toplamlar.net_tutar),
+            'kdv_dokumu': [
+                {'oran': str(dilim.oran), 'matrah': str(dilim.matrah), 'kdv': str(dilim.kdv)}
+                for dilim in toplamlar.kdv_dokumu
+            ],
+            'satirlar': [
+                {
+                    'urun_id': satir['urun_id'],
+                    'barkod': satir.get('barkod'),
+                    'adet': satir['adet'],
+                    'birim_fiyat': str(satir['birim_fiyat']),
+                    'toplam_tutar': str(satir.get('toplam_tutar', '')),
+                    'kdv_orani': None if satir.get('kdv_orani') is None else str(satir['kdv_orani'])
+                }
+                for satir in sepet.get('satirlar', [])
+            ],
+            'odemeler': [
+                {
+                    'turu': odeme['turu'].value if isinstance(odeme['turu'], OdemeTuru) else odeme['turu'],
+                    'tutar': str(odeme['tutar'])
+                }
+                for odeme in odemeler
+            ]
+        }
+        return [
+            {'hedef': hedef, 'olay_turu': SATIS_TAMAMLANDI_OLAYI, 'satis_id': satis_id, 'veri': veri}
+            for hedef in GidenOlayHedef
+        ]
     
     def odeme_tutari_kontrol(self, sepet_id: int, odeme_tutari: Decimal) -> Dict[str, Any]:
         """
@@ -365,12 +459,12 @@ class OdemeService(IOdemeService):
         if odeme_tutari < 0:
             raise DogrulamaHatasi("odeme_tutar_negatif", "Ödeme tutarı negatif olamaz")
         
-        # Sepet bilgisini al
-        sepet = self._sepet_repository.sepet_getir(sepet_id)
-        if not sepet:
+        # Sepet toplamlarını al (satırlar okunmaz)
+        toplamlar = self._sepet_repository.sepet_toplamlari(sepet_id)
+        if toplamlar is None:
             raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
         
-        net_tutar = Decimal(str(sepet.get('net_tutar', sepet['toplam_tutar'])))
+        net_tutar = toplamlar.net_tutar
         
         if odeme_tutari == net_tutar:
             return {
@@ -413,42 +507,93 @@ class OdemeService(IOdemeService):
         if not sepet:
             raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
         
-        toplam_tutar = Decimal(str(sepet['toplam_tutar']))
-        indirim_tutari = Decimal(str(sepet.get('indirim_tutari', 0)))
-        net_tutar = toplam_tutar - indirim_tutari
+        toplamlar = sepet_toplam_ozeti(sepet)
         
         return {
             'sepet_id': sepet_id,
-            'toplam_tutar': float(toplam_tutar),
-            'indirim_tutari': float(indirim_tutari),
-            'net_tutar': float(net_tutar),
+            'toplam_tutar': float(toplamlar.brut_toplam),
+            'indirim_tutari': float(toplamlar.indirim_tutari),
+            'net_tutar': float(toplamlar.net_tutar),
             'satir_sayisi': len(sepet.get('satirlar', [])),
-            'durum': sepet['durum']
+            'durum': sepet['durum'],
+            'toplamlar': toplamlar
         }
     
-    def _stok_dusumu_yap(self, sepet: Dict[str, Any]) -> None:
+    def _sepet_stok_kontrol(self, sepet: Dict[str, Any]) -> None:
+        """
+        Satış kaydından önce sepetin tüm ürünleri için stok kontrolü yapar (private method)
+        
+        Ürün başına ayrı okuma yapılmaz; aynı ürünün satırları toplanır ve
+        stok servisinin toplu kontrolüne tek çağrıda verilir. Yetersiz
+        stokta satış kaydı hiç oluşturulmaz.
+        
+        Raises:
+            StokHatasi: Sepetteki bir ürünün stoğu yetersizse
+        """
+        if not self._stok_service or not sepet.get('satirlar'):
+            return
+        
+        magaza_id, depo_id = self._stok_lokasyonu()
+        if not magaza_id:
+            raise EntegrasyonHatasi("stok_servisi", "Stok kontrolü için terminal mağazası belirlenemedi")
+        
+        adetler: Dict[int, int] = {}
+        for satir in sepet['satirlar']:
+            adetler[satir['urun_id']] = adetler.get(satir['urun_id'], 0) + satir['adet']
+        
+        sonuc = self._stok_service.toplu_stok_kontrol(adetler, magaza_id, depo_id)
+        for urun_id, adet in adetler.items():
+            if not sonuc.get(urun_id, True):
+                raise StokHatasi("Sepet ürününde stok yetersiz", urun_id, talep_edilen=adet)
+    
+    def _stok_dusumu_yap(self, sepet: Dict[str, Any], satis_id: int,
+                         oturum: Optional[Session] = None) -> None:
         """
         Sepetteki ürünler için stok düşümü yapar (private method)
         
+        Tüm satırlar tek toplu çağrıyla düşülür; yetersiz stokta hiçbir
+        satır düşülmez.
+        
         Args:
             sepet: Sepet bilgileri
+            satis_id: Stok hareketlerine referans verilecek satış ID
+            oturum: Satış tamamlama transaction'ı
         """
         if not self._stok_service:
             return
         
+        satirlar = sepet.get('satirlar', [])
+        if not satirlar:
+            return
+        
+        magaza_id, depo_id = self._stok_lokasyonu()
+        if not magaza_id:
+            raise EntegrasyonHatasi("stok_servisi", "Stok düşümü için terminal mağazası belirlenemedi")
+        
         try:
-            for satir in sepet.get('satirlar', []):
-                urun_id = satir['urun_id']
-                adet = satir['adet']
-                
-                # Stok düşümü yap
-                if not self._stok_service.stok_dusur(urun_id, adet):
-                    self._logger.warning(f"Stok düşümü başarısız - Ürün: {urun_id}, Adet: {adet}")
+            referans_no = f"POS_{satis_id}"
+            if not self._stok_service.toplu_stok_dusur(satirlar, referans_no=referans_no,
+                                                       magaza_id=magaza_id, depo_id=depo_id,
+                                                       session=oturum):
+                self._logger.warning(f"Stok düşümü başarısız - Referans: {referans_no}")
                 
         except Exception as e:
             self._logger.error(f"Stok düşümü hatası: {str(e)}")
             raise EntegrasyonHatasi("stok_servisi", f"Stok düşümü hatası: {str(e)}")
     
+    def _stok_lokasyonu(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Stok düşümü yapılacak mağaza ve depoyu döndürür (private method)
+        
+        Sepet satırları mağaza bilgisi taşımaz; servise verilen mağaza yoksa
+        aktif oturumun (terminalin) mağazası kullanılır.
+        """
+        if self._magaza_id:
+            return self._magaza_id, self._depo_id
+        
+        oturum = aktif_oturum()
+        return (oturum.magaza_id if oturum else None), self._depo_id
+    
     def _fis_numarasi_olustur(self, satis_id: int) -> str:
         """
         Fiş numarası oluşturur (private method)
@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.offline_kuyruk_service
 # Description: Offline kuyruk service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Senkronizasyon toplu sahiplenme ve toplu onayla yapılıyor
+# - network_durumu_kontrol bağlantı izleyicisinin bayrağını okuyor
 
 """
 POS Offline Kuyruk Service Implementasyonu
@@ -20,6 +22,7 @@ import json
 from ..arayuzler import IOfflineKuyrukService, IslemTuru, KuyrukDurum
 from ..repositories.offline_kuyruk_repository import OfflineKuyrukRepository
 from ..monitoring import islem_izle, get_pos_monitoring
+from ..baglanti_izleyici import BaglantiIzleyici, baglanti_izleyici_al
 from ....cekirdek.hatalar import DogrulamaHatasi, SontechHatasi, NetworkHatasi
 
 
@@ -31,15 +34,27 @@ class OfflineKuyrukService(IOfflineKuyrukService):
     Online olunduğunda ana sisteme senkronize eder.
     """
 
-    def __init__(self, kuyruk_repository: Optional[OfflineKuyrukRepository] = None):
+    def __init__(self, kuyruk_repository: Optional[OfflineKuyrukRepository] = None,
+                 baglanti_izleyici: Optional[BaglantiIzleyici] = None):
         """
         Service'i başlatır
 
         Args:
             kuyruk_repository: Kuyruk repository (opsiyonel)
+            baglanti_izleyici: Bağlantı izleyicisi (varsayılan süreç geneli izleyici)
         """
         self._kuyruk_repository = kuyruk_repository or OfflineKuyrukRepository()
+        self._baglanti_izleyici = baglanti_izleyici or baglanti_izleyici_al()
         self._logger = logging.getLogger(__name__)
+        self._senkron_batch_boyutu = 100
+
+    def network_durumu_kontrol(self) -> bool:
+        """
+        Merkez sunucu bağlantı durumunu döndürür
+
+        Ağ isteği yapmaz; bağlantı izleyicisinin bayrağını okur.
+        """
+        return self._baglanti_izleyici.cevrimici
 
     @islem_izle("offline_islem_ekleme")
     def islem_kuyruga_ekle(
@@ -109,33 +124,39 @@ class OfflineKuyrukService(IOfflineKuyrukService):
         self._logger.info("Offline kuyruk senkronizasyonu başlatılıyor")
 
         try:
-            # Beklemedeki kayıtları al
-            bekleyen_kayitlar = self._kuyruk_repository.bekleyen_kayitlar_getir()
-
-            if not bekleyen_kayitlar:
+            islenen_sayisi = 0
+            basla_zamani = datetime.now()
+
+            while True:
+                # Beklemedeki kayıtları tek ifadede sahiplen
+                kayitlar = self._kuyruk_repository.bekleyenleri_sahiplen(
+                    limit=self._senkron_batch_boyutu, son_deneme_oncesi=basla_zamani
+                )
+                if not kayitlar:
+                    break
+
+                basarili_idler = []
+                hatali_idler = []
+                for kayit in kayitlar:
+                    try:
+                        if self._islemi_senkronize_et(kayit):
+                            basarili_idler.append(kayit["id"])
+                        else:
+                            hatali_idler.append(kayit["id"])
+                    except Exception as e:
+                        self._logger.error(f"Kayıt senkronizasyon hatası - ID: {kayit['id']}, Hata: {str(e)}")
+                        hatali_idler.append(kayit["id"])
+
+                # Sonuçları toplu güncelle
+                self._kuyruk_repository.toplu_tamamla(basarili_idler)
+                if hatali_idler:
+                    self._kuyruk_repository.toplu_deneme_artir(hatali_idler, "Senkronizasyon başarısız")
+                islenen_sayisi += len(basarili_idler)
+
+            if not islenen_sayisi:
                 self._logger.info("Senkronize edilecek kayıt bulunamadı")
                 return 0
 
-            islenen_sayisi = 0
-
-            for kayit in bekleyen_kayitlar:
-                try:
-                    # İşlemi senkronize et
-                    basarili = self._islemi_senkronize_et(kayit)
-
-                    if basarili:
-                        # Durumu güncelle
-                        self._kuyruk_repository.durum_guncelle(kayit["id"], KuyrukDurum.TAMAMLANDI)
-                        islenen_sayisi += 1
-                    else:
-                        # Hata durumuna güncelle
-                        self._kuyruk_repository.durum_guncelle(kayit["id"], KuyrukDurum.HATA)
-
-                except Exception as e:
-                    self._logger.error(f"Kayıt senkronizasyon hatası - ID: {kayit['id']}, Hata: {str(e)}")
-                    # Hata durumuna güncelle
-                    self._kuyruk_repository.durum_guncelle(kayit["id"], KuyrukDurum.HATA)
-
             self._logger.info(f"Offline kuyruk senkronizasyonu tamamlandı - İşlenen: {islenen_sayisi}")
             return islenen_sayisi
 
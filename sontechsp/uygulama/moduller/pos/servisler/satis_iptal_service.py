@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.satis_iptal_service
 # Description: POS Satış İptal Service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Varsayılan sepet repository paylaşılan sepet motoru oldu
 
 """
 POS Satış İptal Service Implementasyonu
@@ -20,7 +21,7 @@ from sontechsp.uygulama.moduller.pos.arayuzler import (
     ISatisIptalService, ISepetRepository, ISatisRepository, IStokService,
     SepetDurum, SatisDurum
 )
-from sontechsp.uygulama.moduller.pos.repositories.sepet_repository import SepetRepository
+from sontechsp.uygulama.moduller.pos.repositories.sepet_motoru import sepet_motoru_al
 from sontechsp.uygulama.moduller.pos.repositories.satis_repository import SatisRepository
 from sontechsp.uygulama.moduller.pos.monitoring import islem_izle, get_pos_monitoring
 from sontechsp.uygulama.cekirdek.hatalar import (
@@ -60,11 +61,11 @@ class SatisIptalService(ISatisIptalService):
         Service'i başlatır
         
         Args:
-            sepet_repository: Sepet repository (opsiyonel, default SepetRepository)
+            sepet_repository: Sepet repository (opsiyonel, default paylaşılan sepet motoru)
             satis_repository: Satış repository (opsiyonel, default SatisRepository)
             stok_service: Stok service (opsiyonel, mock için)
         """
-        self._sepet_repository = sepet_repository or SepetRepository()
+        self._sepet_repository = sepet_repository or sepet_motoru_al()
         self._satis_repository = satis_repository or SatisRepository()
         self._stok_service = stok_service  # Mock için opsiyonel
         self._logger = logging.getLogger(__name__)
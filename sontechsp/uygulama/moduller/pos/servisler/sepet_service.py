@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.sepet_service
 # Description: POS Sepet Service implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Varsayılan sepet repository paylaşılan sepet motoru oldu
+# - Barkod eklemede sepet yerine yalnızca sepet durumu okunuyor
+# - Ürünün KDV oranı sepet satırına aktarılıyor
 
 """
 POS Sepet Service Implementasyonu
@@ -19,7 +22,7 @@ import logging
 from sontechsp.uygulama.moduller.pos.arayuzler import (
     ISepetService, ISepetRepository, IStokService, SepetDurum
 )
-from sontechsp.uygulama.moduller.pos.repositories.sepet_repository import SepetRepository
+from sontechsp.uygulama.moduller.pos.repositories.sepet_motoru import sepet_motoru_al
 from sontechsp.uygulama.moduller.pos.monitoring import islem_izle, get_pos_monitoring
 from sontechsp.uygulama.cekirdek.hatalar import (
     DogrulamaHatasi, SontechHatasi, EntegrasyonHatasi
@@ -73,10 +76,10 @@ class SepetService(ISepetService):
         Service'i başlatır
         
         Args:
-            sepet_repository: Sepet repository (opsiyonel, default SepetRepository)
+            sepet_repository: Sepet repository (opsiyonel, default paylaşılan sepet motoru)
             stok_service: Stok service (opsiyonel, mock için)
         """
-        self._sepet_repository = sepet_repository or SepetRepository()
+        self._sepet_repository = sepet_repository or sepet_motoru_al()
         self._stok_service = stok_service  # Mock için opsiyonel
         self._logger = logging.getLogger(__name__)
     
@@ -141,13 +144,12 @@ class SepetService(ISepetService):
         
         barkod = barkod.strip()
         
-        # Sepet var mı kontrol et
-        sepet = self._sepet_repository.sepet_getir(sepet_id)
-        if not sepet:
+        # Sepet var mı ve aktif mi kontrol et (okutma başına satırlar okunmaz)
+        durum = self._sepet_repository.sepet_durumu(sepet_id)
+        if durum is None:
             raise SontechHatasi(f"Sepet bulunamadı: {sepet_id}")
         
-        # Sepet durumu kontrol et
-        if sepet['durum'] != SepetDurum.AKTIF.value:
+        if durum != SepetDurum.AKTIF.value:
             raise DogrulamaHatasi("sepet_aktif_degil", "Sepet aktif durumda değil")
         
         # Stok servisi varsa ürün bilgisi al
@@ -159,6 +161,9 @@ class SepetService(ISepetService):
                 
                 urun_id = urun_bilgisi['id']
                 birim_fiyat = Decimal(str(urun_bilgisi['satis_fiyati']))
+                kdv_orani = urun_bilgisi.get('kdv_orani')
+                if kdv_orani is not None:
+                    kdv_orani = Decimal(str(kdv_orani))
                 
                 # Stok kontrolü
                 if not self._stok_service.stok_kontrol(urun_id, 1):
@@ -172,6 +177,7 @@ class SepetService(ISepetService):
             # Mock veri (test için)
             urun_id = hash(barkod) % 1000 + 1  # Basit hash ile mock ID
             birim_fiyat = Decimal('10.00')  # Mock fiyat
+            kdv_orani = None  # Varsayılan oran
         
         try:
             # Sepete ürün ekle
@@ -180,7 +186,8 @@ class SepetService(ISepetService):
                 urun_id=urun_id,
                 barkod=barkod,
                 adet=1,
-                birim_fiyat=birim_fiyat
+                birim_fiyat=birim_fiyat,
+                kdv_orani=kdv_orani
             )
             
             self._logger.info(f"Ürün sepete eklendi - Satır ID: {satir_id}")
@@ -1,25 +1,43 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.servisler.stok_service
 # Description: POS stok servisi implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Sepet bazlı toplu stok düşümü eklendi
+# - Sepet bazlı toplu stok kontrolü eklendi, rezervasyon sonrası durum önbelleği geçersiz kılınıyor
+# - Rezervasyon serbest bırakılınca durum önbelleği geçersiz kılınıyor
+# - Toplu stok düşümü satış tamamlama transaction'ına katılabilir
+# - Stok durumu önce yerel katalog replikasından okunuyor
+# - Ürün başına kilit sözlüğü şeritli kilit havuzu ve PostgreSQL danışma kilitleriyle değiştirildi
 
 """
 POS Stok Servisi
 
 Bu modül POS sisteminin stok yönetimi işlemlerini gerçekleştirir.
 Stok modülü ile entegrasyon sağlar ve POS'a özel stok işlemlerini yönetir.
+
+Katalog replikası verilirse ve terminalin mağazasını tutuyorsa stok
+durumu merkeze gidilmeden yerel SQLite kopyasından okunur.
+
+Stok düşümü süreç içinde şeritli kilit havuzuyla, terminaller arasında
+(satış tamamlama transaction'ı verildiğinde) PostgreSQL danışma
+kilitleriyle (urun_id, magaza_id) bazında sıralanır; bkz. pos.stok_kilitleri.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from decimal import Decimal
 from datetime import datetime
 import logging
-import threading
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
+
+from sqlalchemy.orm import Session
 
 from ..arayuzler import IStokService, StokKilitTuru
+from ..katalog_replikasi import KatalogReplikasi
+from ..stok_kilitleri import (
+    StokKilitHavuzu, VARSAYILAN_ZAMAN_ASIMI, stok_kilit_havuzu_al, veritabani_kilitleri_al
+)
 from ...stok.servisler.stok_entegrasyon_service import (
     StokEntegrasyonService, POSSatisIslemi
 )
@@ -39,7 +57,9 @@ class StokService(IStokService):
                  stok_entegrasyon_service: StokEntegrasyonService,
                  rezervasyon_service: StokRezervasyonService,
                  barkod_service: BarkodService,
-                 bakiye_repository: IStokBakiyeRepository):
+                 bakiye_repository: IStokBakiyeRepository,
+                 katalog_replikasi: Optional[KatalogReplikasi] = None,
+                 kilit_havuzu: Optional[StokKilitHavuzu] = None):
         """
         Stok servisi constructor
         
@@ -48,16 +68,18 @@ class StokService(IStokService):
             rezervasyon_service: Stok rezervasyon servisi
             barkod_service: Barkod servisi
             bakiye_repository: Stok bakiye repository
+            katalog_replikasi: Terminalin yerel katalog replikası (opsiyonel)
+            kilit_havuzu: Stok kilit havuzu (varsayılan süreç geneli havuz)
         """
         self._entegrasyon_service = stok_entegrasyon_service
         self._rezervasyon_service = rezervasyon_service
         self._barkod_service = barkod_service
         self._bakiye_repository = bakiye_repository
+        self._katalog_replikasi = katalog_replikasi
         self._logger = logging.getLogger(__name__)
         
-        # Thread-safe stok kilitleme için
-        self._stok_kilitleri: Dict[str, threading.Lock] = {}
-        self._kilit_lock = threading.Lock()
+        # Aynı süreçteki tüm servisler aynı şeritleri paylaşmalı
+        self._kilit_havuzu = kilit_havuzu or stok_kilit_havuzu_al()
     
     def urun_bilgisi_getir(self, barkod: str) -> Optional[Dict[str, Any]]:
         """
@@ -120,10 +142,14 @@ class StokService(IStokService):
         try:
             self._validate_stok_parametreleri(urun_id, magaza_id, adet)
             
-            # Güncel stok durumunu al
-            stok_durumu = self._entegrasyon_service.gercek_zamanli_stok_durumu_getir(
-                urun_id, magaza_id, depo_id
-            )
+            # Güncel stok durumunu al (önce yerel replika)
+            yerel_durumlar = self._yerel_stok_durumlari([urun_id], magaza_id, depo_id)
+            if yerel_durumlar is not None:
+                stok_durumu = yerel_durumlar[urun_id]
+            else:
+                stok_durumu = self._entegrasyon_service.gercek_zamanli_stok_durumu_getir(
+                    urun_id, magaza_id, depo_id
+                )
             
             if "hata" in stok_durumu:
                 raise POSHatasi(f"Stok durumu alınamadı: {stok_durumu['hata']}")
@@ -147,6 +173,53 @@ class StokService(IStokService):
                 raise
             raise POSHatasi(f"Stok kontrolü yapılamadı: {str(e)}")
     
+    def toplu_stok_kontrol(self, adetler: Dict[int, int], magaza_id: int,
+                           depo_id: Optional[int] = None) -> Dict[int, bool]:
+        """
+        Sepetteki tüm ürünler için stok kontrolü yapar
+        
+        Ürün başına ayrı sorgu yapılmaz; durumlar entegrasyon servisinin
+        önbelleğinden, eksikler tek sorguda okunur.
+        
+        Args:
+            adetler: urun_id -> talep edilen toplam adet
+            magaza_id: Mağaza ID
+            depo_id: Depo ID (opsiyonel)
+            
+        Returns:
+            Dict[int, bool]: urun_id -> yeterli stok var mı
+            
+        Raises:
+            POSHatasi: Validasyon veya okuma hatası durumunda
+        """
+        try:
+            for urun_id, adet in adetler.items():
+                self._validate_stok_parametreleri(urun_id, magaza_id, adet)
+            
+            durumlar = self._yerel_stok_durumlari(list(adetler), magaza_id, depo_id)
+            if durumlar is None:
+                durumlar = self._entegrasyon_service.stok_durumlari_getir(
+                    list(adetler), magaza_id, depo_id
+                )
+            
+            sonuc = {}
+            for urun_id, adet in adetler.items():
+                kullanilabilir_stok = durumlar[urun_id].get("kullanilabilir_stok", Decimal('0'))
+                sonuc[urun_id] = kullanilabilir_stok >= Decimal(str(adet))
+                if not sonuc[urun_id]:
+                    self._logger.warning(
+                        f"Yetersiz stok - Ürün: {urun_id}, Mağaza: {magaza_id}, "
+                        f"Talep: {adet}, Mevcut: {kullanilabilir_stok}"
+                    )
+            
+            return sonuc
+            
+        except Exception as e:
+            self._logger.error(f"Toplu stok kontrol hatası: {str(e)}")
+            if isinstance(e, POSHatasi):
+                raise
+            raise POSHatasi(f"Stok kontrolü yapılamadı: {str(e)}")
+    
     def stok_rezerve_et(self, urun_id: int, magaza_id: int, adet: int,
                        kilit_turu: StokKilitTuru = StokKilitTuru.REZERVASYON,
                        referans_no: Optional[str] = None,
@@ -190,6 +263,8 @@ class StokService(IStokService):
             )
             
             if rezervasyon_id:
+                # Rezervasyon kullanılabilir miktarı değiştirir; bildirim üretmez
+                self._entegrasyon_service.stok_durumu_gecersiz_kil(urun_id, magaza_id, depo_id)
                 self._logger.info(
                     f"Stok rezerve edildi - ID: {rezervasyon_id}, "
                     f"Ürün: {urun_id}, Adet: {adet}"
@@ -221,10 +296,18 @@ class StokService(IStokService):
             if not rezervasyon_id:
                 raise POSHatasi("Rezervasyon ID gereklidir")
             
+            # Önbellek anahtarı için rezervasyonun ürün/mağaza/depo bilgisi
+            rezervasyon = self._rezervasyon_service.rezervasyon_bilgisi_getir(rezervasyon_id)
+            
             # Rezervasyonu iptal et
             basarili = self._rezervasyon_service.rezervasyon_iptal_et(int(rezervasyon_id))
             
             if basarili:
+                if rezervasyon is not None:
+                    # Serbest bırakma kullanılabilir miktarı artırır; bildirim üretmez
+                    self._entegrasyon_service.stok_durumu_gecersiz_kil(
+                        rezervasyon.urun_id, rezervasyon.magaza_id, rezervasyon.depo_id
+                    )
                 self._logger.info(f"Rezervasyon serbest bırakıldı - ID: {rezervasyon_id}")
             else:
                 self._logger.warning(f"Rezervasyon serbest bırakılamadı - ID: {rezervasyon_id}")
@@ -264,10 +347,7 @@ class StokService(IStokService):
                 raise POSHatasi("Referans numarası gereklidir")
             
             # POS satış işlemi oluştur
-            try:
-                satis_id = int(referans_no.split('_')[-1]) if '_' in referans_no and referans_no.split('_')[-1].isdigit() else 0
-            except (ValueError, IndexError):
-                satis_id = 0
+            satis_id = self._referans_satis_id(referans_no)
             
             satis_islemi = POSSatisIslemi(
                 satis_id=satis_id,
@@ -283,9 +363,11 @@ class StokService(IStokService):
             )
             
             # Entegrasyon servisi ile stok düşümü yap
-            basarili = self._entegrasyon_service.pos_satisi_isle(satis_islemi)
+            with self._kilit_havuzu.kilitle([(urun_id, magaza_id)]):
+                basarili = self._entegrasyon_service.pos_satisi_isle(satis_islemi)
             
             if basarili:
+                self._replikayi_uyandir()
                 self._logger.info(
                     f"Stok düşürüldü - Ürün: {urun_id}, Adet: {adet}, "
                     f"Referans: {referans_no}"
@@ -299,6 +381,77 @@ class StokService(IStokService):
                 raise
             raise POSHatasi(f"Stok düşürülemedi: {str(e)}")
     
+    def toplu_stok_dusur(self, satirlar: List[Dict[str, Any]],
+                         referans_no: Optional[str] = None,
+                         magaza_id: Optional[int] = None,
+                         depo_id: Optional[int] = None,
+                         session: Optional[Session] = None) -> bool:
+        """
+        Sepet satırlarının stoğunu tek transaction içinde düşer
+        
+        Args:
+            satirlar: urun_id ve adet (opsiyonel magaza_id, depo_id,
+                birim_fiyat) içeren sepet satırları
+            referans_no: Referans numarası
+            magaza_id: Satırda mağaza yoksa kullanılacak mağaza ID
+            depo_id: Satırda depo yoksa kullanılacak depo ID
+            session: Satış tamamlama transaction'ı; verilirse düşüm onunla
+                birlikte commit edilir ve satırlar transaction sonuna kadar
+                diğer terminallere karşı danışma kilidiyle tutulur
+            
+        Returns:
+            bool: İşlem başarılı mı
+            
+        Raises:
+            POSHatasi: Stok düşüm hatası (hiçbir satır düşülmez)
+        """
+        try:
+            if not referans_no:
+                raise POSHatasi("Referans numarası gereklidir")
+            
+            satis_id = self._referans_satis_id(referans_no)
+            satis_tarihi = datetime.utcnow()
+            satis_islemleri = []
+            for satir in satirlar:
+                satir_magaza_id = satir.get('magaza_id') or magaza_id or 0
+                adet = satir['adet']
+                self._validate_stok_parametreleri(satir['urun_id'], satir_magaza_id, adet)
+                
+                birim_fiyat = Decimal(str(satir.get('birim_fiyat', 0)))
+                satis_islemleri.append(POSSatisIslemi(
+                    satis_id=satis_id,
+                    magaza_id=satir_magaza_id,
+                    depo_id=satir.get('depo_id', depo_id),
+                    urun_id=satir['urun_id'],
+                    satis_miktari=Decimal(str(adet)),
+                    birim_fiyat=birim_fiyat,
+                    toplam_tutar=birim_fiyat * adet,
+                    satis_tarihi=satis_tarihi,
+                    kasiyer_id=1,  # Kasiyer bilgisi POS'tan gelecek
+                    fiş_no=referans_no
+                ))
+            
+            anahtarlar = [(islem.urun_id, islem.magaza_id) for islem in satis_islemleri]
+            with self._kilit_havuzu.kilitle(anahtarlar):
+                if session is not None:
+                    veritabani_kilitleri_al(session, anahtarlar)
+                basarili = self._entegrasyon_service.pos_sepeti_isle(satis_islemleri, session=session)
+            
+            if basarili:
+                self._replikayi_uyandir()
+                self._logger.info(
+                    f"Sepet stoğu düşürüldü - Satır: {len(satis_islemleri)}, "
+                    f"Referans: {referans_no}"
+                )
+            
+            return basarili
+            
+        except Exception as e:
+            self._logger.error(f"Toplu stok düşüm hatası: {str(e)}")
+            if isinstance(e, POSHatasi):
+                raise
+            raise POSHatasi(f"Stok düşürülemedi: {str(e)}")
+    
     def stok_artir(self, urun_id: int, magaza_id: int, adet: int,
                   referans_no: str, aciklama: Optional[str] = None,
                   depo_id: Optional[int] = None) -> bool:
@@ -361,6 +514,10 @@ class StokService(IStokService):
         try:
             self._validate_stok_parametreleri(urun_id, magaza_id, 1)
             
+            yerel_durumlar = self._yerel_stok_durumlari([urun_id], magaza_id, depo_id)
+            if yerel_durumlar is not None:
+                return yerel_durumlar[urun_id]
+            
             # Entegrasyon servisinden gerçek zamanlı stok durumu al
             stok_durumu = self._entegrasyon_service.gercek_zamanli_stok_durumu_getir(
                 urun_id, magaza_id, depo_id
@@ -380,12 +537,16 @@ class StokService(IStokService):
     def es_zamanli_stok_kilitle(self, urun_id: int, magaza_id: int,
                                depo_id: Optional[int] = None) -> bool:
         """
-        Eş zamanlı erişim için stok kilitleme
+        Eş zamanlı erişim için stok kilitleme (beklemeden)
+        
+        Kilit (urun_id, magaza_id) bazındadır; depo_id yalnızca uyumluluk
+        için alınır. Anahtarın şeridi başka bir ürün tarafından tutuluyorsa
+        da False döner.
         
         Args:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
-            depo_id: Depo ID (opsiyonel)
+            depo_id: Depo ID (opsiyonel, kullanılmaz)
             
         Returns:
             bool: Kilitleme başarılı mı
@@ -394,20 +555,12 @@ class StokService(IStokService):
             POSHatasi: Kilitleme hatası
         """
         try:
-            kilit_anahtari = self._stok_kilit_anahtari_olustur(urun_id, magaza_id, depo_id)
-            
-            with self._kilit_lock:
-                if kilit_anahtari not in self._stok_kilitleri:
-                    self._stok_kilitleri[kilit_anahtari] = threading.Lock()
-            
-            # Non-blocking lock denemesi
-            kilit = self._stok_kilitleri[kilit_anahtari]
-            kilitleme_basarili = kilit.acquire(blocking=False)
+            kilitleme_basarili = self._kilit_havuzu.dene(urun_id, magaza_id)
             
             if kilitleme_basarili:
-                self._logger.debug(f"Stok kilitlendi - {kilit_anahtari}")
+                self._logger.debug(f"Stok kilitlendi - Ürün: {urun_id}, Mağaza: {magaza_id}")
             else:
-                self._logger.warning(f"Stok kilitlenemedi - {kilit_anahtari}")
+                self._logger.warning(f"Stok kilitlenemedi - Ürün: {urun_id}, Mağaza: {magaza_id}")
             
             return kilitleme_basarili
             
@@ -418,12 +571,12 @@ class StokService(IStokService):
     def stok_kilidini_serbest_birak(self, urun_id: int, magaza_id: int,
                                    depo_id: Optional[int] = None) -> bool:
         """
-        Stok kilidini serbest bırakır
+        es_zamanli_stok_kilitle ile alınan kilidi serbest bırakır
         
         Args:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
-            depo_id: Depo ID (opsiyonel)
+            depo_id: Depo ID (opsiyonel, kullanılmaz)
             
         Returns:
             bool: Serbest bırakma başarılı mı
@@ -432,18 +585,10 @@ class StokService(IStokService):
             POSHatasi: Serbest bırakma hatası
         """
         try:
-            kilit_anahtari = self._stok_kilit_anahtari_olustur(urun_id, magaza_id, depo_id)
-            
-            if kilit_anahtari in self._stok_kilitleri:
-                kilit = self._stok_kilitleri[kilit_anahtari]
-                try:
-                    kilit.release()
-                    self._logger.debug(f"Stok kilidi serbest bırakıldı - {kilit_anahtari}")
-                    return True
-                except Exception:
-                    self._logger.warning(f"Kilit zaten serbest - {kilit_anahtari}")
-                    return True
-            
+            if self._kilit_havuzu.birak(urun_id, magaza_id):
+                self._logger.debug(f"Stok kilidi serbest bırakıldı - Ürün: {urun_id}, Mağaza: {magaza_id}")
+            else:
+                self._logger.warning(f"Kilit bu anahtarda tutulmuyor - Ürün: {urun_id}, Mağaza: {magaza_id}")
             return True
             
         except Exception as e:
@@ -451,28 +596,61 @@ class StokService(IStokService):
             raise POSHatasi(f"Stok kilidi serbest bırakılamadı: {str(e)}")
     
     @contextmanager
-    def stok_kilidi_ile(self, urun_id: int, magaza_id: int, depo_id: Optional[int] = None):
+    def stok_kilidi_ile(self, urun_id: int, magaza_id: int, depo_id: Optional[int] = None,
+                        session: Optional[Session] = None,
+                        zaman_asimi: Optional[float] = VARSAYILAN_ZAMAN_ASIMI):
         """
         Context manager ile stok kilitleme
         
+        Yerel şerit zaman_asimi süresince beklenir. session verilirse
+        terminaller arası danışma kilidi de alınır; o kilit blok sonunda
+        değil session'ın transaction'ı bitince bırakılır.
+        
         Args:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
-            depo_id: Depo ID (opsiyonel)
+            depo_id: Depo ID (opsiyonel, kullanılmaz)
+            session: Danışma kilidinin bağlanacağı transaction (opsiyonel)
+            zaman_asimi: Yerel kilit için bekleme sınırı (saniye)
             
         Yields:
-            bool: Kilitleme başarılı mı
+            bool: Kilitleme başarılı mı (süre dolarsa False)
             
         Raises:
-            POSHatasi: Kilitleme hatası
+            POSHatasi: Veritabanı kilidi alınamazsa
         """
-        kilitleme_basarili = False
+        anahtarlar = [(urun_id, magaza_id)]
+        with ExitStack() as kilitler:
+            try:
+                kilitler.enter_context(self._kilit_havuzu.kilitle(anahtarlar, zaman_asimi))
+            except StokKilitError:
+                self._logger.warning(f"Stok kilitlenemedi - Ürün: {urun_id}, Mağaza: {magaza_id}")
+                yield False
+                return
+            
+            if session is not None:
+                try:
+                    veritabani_kilitleri_al(session, anahtarlar)
+                except Exception as e:
+                    self._logger.error(f"Stok veritabanı kilidi hatası: {str(e)}")
+                    raise POSHatasi(f"Stok kilitlenemedi: {str(e)}")
+            yield True
+    
+    def _yerel_stok_durumlari(self, urun_idler: List[int], magaza_id: int,
+                              depo_id: Optional[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Replika bu mağazayı tutuyorsa stok durumlarını yerelden okur, yoksa None"""
+        if self._katalog_replikasi is None or not self._katalog_replikasi.stok_okunabilir(magaza_id):
+            return None
         try:
-            kilitleme_basarili = self.es_zamanli_stok_kilitle(urun_id, magaza_id, depo_id)
-            yield kilitleme_basarili
-        finally:
-            if kilitleme_basarili:
-                self.stok_kilidini_serbest_birak(urun_id, magaza_id, depo_id)
+            return self._katalog_replikasi.stok_durumlari_getir(urun_idler, magaza_id, depo_id)
+        except Exception as e:
+            self._logger.warning(f"Yerel stok okunamadı, merkezden okunuyor: {str(e)}")
+            return None
+    
+    def _replikayi_uyandir(self) -> None:
+        """Merkezde değişen stoğun replikaya sonraki turu beklemeden gelmesi için"""
+        if self._katalog_replikasi is not None:
+            self._katalog_replikasi.uyandir()
     
     def _validate_stok_parametreleri(self, urun_id: int, magaza_id: int, adet: int) -> None:
         """Stok parametrelerini validate eder"""
@@ -485,7 +663,7 @@ class StokService(IStokService):
         if adet <= 0:
             raise POSHatasi("Adet pozitif olmalıdır")
     
-    def _stok_kilit_anahtari_olustur(self, urun_id: int, magaza_id: int, 
-                                    depo_id: Optional[int] = None) -> str:
-        """Stok kilitleme için anahtar oluşturur"""
-        return f"stok_{urun_id}_{magaza_id}_{depo_id or 0}"
\ No newline at end of file
+    def _referans_satis_id(self, referans_no: str) -> int:
+        """POS_<satis_id> biçimindeki referanstan satış ID'sini çıkarır"""
+        son_parca = referans_no.split('_')[-1]
+        return int(son_parca) if '_' in referans_no and son_parca.isdigit() else 0
@@ -0,0 +1,179 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.stok_kilitleri
+# Description: POS stok işlemleri için şeritli yerel kilitler ve veritabanı danışma kilitleri
+# Changelog:
+# - İlk oluşturma
+# - birak yalnızca aynı anahtarın dene ile aldığı şeridi bırakıyor
+
+"""
+POS Stok Kilitleri
+
+İki katmanlı eş zamanlılık kontrolü:
+
+- Süreç içi: (urun_id, magaza_id) anahtarları sabit sayıda threading.Lock
+  şeridine dağıtılır. Kilit sayısı vardiya boyunca büyümez; farklı iki
+  ürünün aynı şeride düşmesi yalnızca gereksiz beklemeye yol açar.
+- Terminaller arası: PostgreSQL pg_advisory_xact_lock(urun_id, magaza_id)
+  ile aynı ürünün aynı mağazadaki son birimini iki terminalin birden
+  satması engellenir. Kilit transaction sonunda kendiliğinden bırakılır;
+  SQLite (offline/test) oturumlarında atlanır.
+
+Birden çok anahtar her zaman sıralı alınır; aynı sepeti farklı sırayla
+işleyen iki işlem birbirini kilitlenmeye (deadlock) sokmaz. dene ile
+alınan şerit alan anahtarla kaydedilir; birak aynı şeride düşen başka bir
+anahtarın veya kilitle bloğunun tuttuğu şeridi bırakmaz. Bekleme
+süreleri POS monitoring'e stok_kilidi_bekleme ve stok_db_kilidi_bekleme
+adlarıyla yazılır.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .monitoring import get_pos_monitoring
+from ..stok.hatalar.stok_hatalari import StokKilitError
+
+# (urun_id, magaza_id) kilit anahtarı
+StokAnahtari = Tuple[int, int]
+
+VARSAYILAN_SERIT_SAYISI = 256
+
+# Süreç içi kilit için varsayılan bekleme sınırı (saniye)
+VARSAYILAN_ZAMAN_ASIMI = 10.0
+
+_DANISMA_KILIDI_SQL = text("SELECT pg_advisory_xact_lock(:urun_id, :magaza_id)")
+
+
+class StokKilitHavuzu:
+    """(urun_id, magaza_id) anahtarlarını sabit sayıda kilide dağıtan havuz"""
+
+    def __init__(self, serit_sayisi: int = VARSAYILAN_SERIT_SAYISI):
+        if serit_sayisi <= 0:
+            raise ValueError("Şerit sayısı pozitif olmalıdır")
+        self.serit_sayisi = serit_sayisi
+        self._seritler = [threading.Lock() for _ in range(serit_sayisi)]
+        # dene ile alınan şerit -> alan anahtar
+        self._dene_sahipleri: Dict[int, StokAnahtari] = {}
+        self._sahip_kilidi = threading.Lock()
+
+    def serit_indeksi(self, urun_id: int, magaza_id: int) -> int:
+        """Anahtarın düştüğü şeridin indeksini döndürür"""
+        return hash((urun_id, magaza_id)) % self.serit_sayisi
+
+    def dene(self, urun_id: int, magaza_id: int) -> bool:
+        """Anahtarın şeridini beklemeden almayı dener, alınan şeridi kaydeder"""
+        indeks = self.serit_indeksi(urun_id, magaza_id)
+        if not self._seritler[indeks].acquire(blocking=False):
+            return False
+        with self._sahip_kilidi:
+            self._dene_sahipleri[indeks] = (urun_id, magaza_id)
+        return True
+
+    def birak(self, urun_id: int, magaza_id: int) -> bool:
+        """
+        Anahtarın dene ile aldığı şeridi bırakır
+
+        Şerit bu anahtar tarafından dene ile alınmadıysa (serbest, başka
+        anahtarda veya kilitle bloğunda) dokunulmaz ve False döner.
+        """
+        indeks = self.serit_indeksi(urun_id, magaza_id)
+        with self._sahip_kilidi:
+            if self._dene_sahipleri.get(indeks) != (urun_id, magaza_id):
+                return False
+            del self._dene_sahipleri[indeks]
+            self._seritler[indeks].release()
+        return True
+
+    @contextmanager
+    def kilitle(self, anahtarlar: Iterable[StokAnahtari],
+                zaman_asimi: Optional[float] = VARSAYILAN_ZAMAN_ASIMI) -> Iterator[None]:
+        """
+        Anahtarların şeritlerini sıralı alır, blok sonunda bırakır
+
+        Args:
+            anahtarlar: (urun_id, magaza_id) anahtarları
+            zaman_asimi: Toplam bekleme sınırı (saniye); None sınırsız bekler
+
+        Raises:
+            StokKilitError: Şeritler süresinde alınamazsa
+        """
+        indeksler = sorted({self.serit_indeksi(urun_id, magaza_id) for urun_id, magaza_id in anahtarlar})
+        alinan: List[int] = []
+        baslangic = time.perf_counter_ns()
+        try:
+            for indeks in indeksler:
+                if zaman_asimi is None:
+                    alindi = self._seritler[indeks].acquire()
+                else:
+                    kalan = zaman_asimi - (time.perf_counter_ns() - baslangic) / 1e9
+                    alindi = kalan > 0 and self._seritler[indeks].acquire(timeout=kalan)
+                if not alindi:
+                    raise StokKilitError(
+                        f"Stok kilidi {zaman_asimi}s içinde alınamadı", kaynak="yerel"
+                    )
+                alinan.append(indeks)
+        finally:
+            bekleme_ns = time.perf_counter_ns() - baslangic
+            if len(alinan) < len(indeksler):
+                for indeks in reversed(alinan):
+                    self._seritler[indeks].release()
+                get_pos_monitoring().sure_ns_kaydet('stok_kilidi_bekleme', bekleme_ns, basarili=False)
+            elif indeksler:
+                get_pos_monitoring().sure_ns_kaydet('stok_kilidi_bekleme', bekleme_ns)
+
+        try:
+            yield
+        finally:
+            for indeks in reversed(alinan):
+                self._seritler[indeks].release()
+
+
+def veritabani_kilitleri_al(session: Session, anahtarlar: Iterable[StokAnahtari]) -> int:
+    """
+    Anahtarlar için transaction ömürlü PostgreSQL danışma kilitlerini alır
+
+    Kilitler sıralı alınır ve commit/rollback ile bırakılır. PostgreSQL
+    dışındaki veritabanlarında hiçbir şey yapmaz.
+
+    Args:
+        session: Kilitlerin bağlanacağı transaction oturumu
+        anahtarlar: (urun_id, magaza_id) anahtarları
+
+    Returns:
+        int: Alınan kilit sayısı (PostgreSQL değilse 0)
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        return 0
+
+    sirali = sorted(set(anahtarlar))
+    baslangic = time.perf_counter_ns()
+    basarili = False
+    try:
+        for urun_id, magaza_id in sirali:
+            session.execute(_DANISMA_KILIDI_SQL, {'urun_id': urun_id, 'magaza_id': magaza_id})
+        basarili = True
+    finally:
+        if sirali:
+            get_pos_monitoring().sure_ns_kaydet(
+                'stok_db_kilidi_bekleme', time.perf_counter_ns() - baslangic, basarili
+            )
+    return len(sirali)
+
+
+_stok_kilit_havuzu: Optional[StokKilitHavuzu] = None
+_havuz_kilidi = threading.Lock()
+
+
+def stok_kilit_havuzu_al() -> StokKilitHavuzu:
+    """Süreç genelindeki stok kilit havuzunu döndürür"""
+    global _stok_kilit_havuzu
+    if _stok_kilit_havuzu is None:
+        with _havuz_kilidi:
+            if _stok_kilit_havuzu is None:
+                _stok_kilit_havuzu = StokKilitHavuzu()
+    return _stok_kilit_havuzu
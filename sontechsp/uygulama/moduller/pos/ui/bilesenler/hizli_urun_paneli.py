@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-18
+# Last Update: 2026-10-17
 # Module: hizli_urun_paneli
 # Description: POS hızlı ürün paneli bileşeni
 # Changelog:
 # - İlk oluşturma - Hızlı ürün paneli widget'ı
+# - Sabit buton havuzu; yenilemede yalnızca değişen butonların metni/durumu güncelleniyor
+# - Boş butonlar terminalin satışlarından sıralanan hızlı ürünlerle dolduruluyor
+# - Demo ürünler yalnızca sıralama boşken; kategori süzgeci sıralanan ürünün kategori adına da bakıyor
 
 """
 POS Hızlı Ürün Paneli Bileşeni
@@ -11,14 +14,26 @@ POS Hızlı Ürün Paneli Bileşeni
 Sık kullanılan ürünlerin hızlı erişim butonlarını sağlar.
 Kategori bazlı dinamik buton sistemi ile çalışır.
 
+Butonlar bir kez (en fazla buton sayısı kadar) oluşturulur; buton sayısı
+değişince fazlası gizlenir, ürünler değişince yalnızca içeriği değişen
+butonların metni ve durumu güncellenir. Pozisyonu tanımlı ürünler kendi
+butonlarında kalır, kalan butonlar terminalde o saat diliminde en çok
+satan ürünlerle (HizliUrunSiralayici) doldurulur. Terminalde henüz satış
+yoksa boş butonlar varsayılan ürünlerle doldurulur.
+
+Sıralanan ürünlerde kategori ID'si yerine ürünün kategori adı bulunur;
+kategori süzgeci ikisinden birinin eşleşmesine bakar.
+
 Sorumluluklar:
 - Hızlı ürün butonlarını gösterme
 - Kategori seçimi
 - Ürün butonlarını dinamik güncelleme
 - Boş butonları yönetme
+- Satışa göre sıralanan hızlı ürünleri gösterme
 """
 
-from typing import Dict, Any, List, Optional
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
@@ -34,9 +49,60 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from sontechsp.uygulama.cekirdek.oturum import aktif_oturum
+from ...hizli_urunler import HizliUrunSiralayici, hizli_urun_siralayici_al
 from ..handlers.pos_sinyalleri import POSSinyalleri
 from .pos_bilesen_arayuzu import POSBilesenWidget
 
+# Buton havuzunun boyutu (seçilebilecek en fazla buton sayısı)
+MAKS_BUTON_SAYISI = 24
+
+# Grid sütun sayısı
+SUTUN_SAYISI = 4
+
+BOS_BUTON_METNI = "Tanımsız"
+
+# Terminalde sıralama yokken boş butonları dolduran demo ürünler
+VARSAYILAN_HIZLI_URUNLER = (
+    {
+        "id": "1",
+        "barkod": "8690504123456",
+        "urun_adi": "Coca Cola 330ml",
+        "birim_fiyat": 5.50,
+        "kategori_id": "1",
+    },
+    {
+        "id": "2",
+        "barkod": "8690504123457",
+        "urun_adi": "Fanta 330ml",
+        "birim_fiyat": 5.50,
+        "kategori_id": "1",
+    },
+)
+
+BUTON_STILI = """
+    QPushButton {
+        background-color: #ecf0f1;
+        border: 1px solid #bdc3c7;
+        border-radius: 5px;
+        color: #7f8c8d;
+    }
+    QPushButton:hover {
+        background-color: #d5dbdb;
+    }
+    QPushButton:pressed {
+        background-color: #bdc3c7;
+    }
+    QPushButton[hasProduct="true"] {
+        background-color: #3498db;
+        color: white;
+        font-weight: bold;
+    }
+    QPushButton[hasProduct="true"]:hover {
+        background-color: #2980b9;
+    }
+"""
+
 
 class HizliUrunPaneli(POSBilesenWidget):
     """
@@ -49,17 +115,27 @@ class HizliUrunPaneli(POSBilesenWidget):
     hizli_urun_secildi = pyqtSignal(dict)  # ürün verisi
     kategori_degisti = pyqtSignal(str)  # kategori adı
 
-    def __init__(self, sinyaller: POSSinyalleri, parent=None):
+    def __init__(self, sinyaller: POSSinyalleri, parent=None,
+                 siralayici: Optional[HizliUrunSiralayici] = None,
+                 terminal_id: Optional[int] = None):
         super().__init__(parent)
         self.sinyaller = sinyaller
+        self._siralayici = siralayici or hizli_urun_siralayici_al()
+        self._terminal_id = terminal_id
         self._kategoriler: List[Dict[str, Any]] = []
         self._hizli_urunler: List[Dict[str, Any]] = []
+        self._sirali_urunler: List[Dict[str, Any]] = []
+        self._siralama_anahtari: Optional[Tuple[int, int, int]] = None
         self._aktif_kategori = ""
+        self._aktif_kategori_adi = ""
         self._buton_sayisi = 12  # Varsayılan 12 buton
+        self._buton_havuzu: List[QPushButton] = []
         self._butonlar: List[QPushButton] = []
+        self._gosterilen: List[Optional[Dict[str, Any]]] = []
         self._ui_kuruldu = False
         self._ui_kur()
         self._sinyalleri_bagla()
+        self._siralamayi_yenile()
         self._varsayilan_verileri_yukle()
 
     def _ui_kur(self):
@@ -115,18 +191,35 @@ class HizliUrunPaneli(POSBilesenWidget):
 
         # Butonlar için widget
         self.butonlar_widget = QWidget()
+        self.butonlar_widget.setStyleSheet(BUTON_STILI)
         self.butonlar_layout = QGridLayout(self.butonlar_widget)
         self.butonlar_layout.setSpacing(5)
+        self._buton_havuzunu_olustur()
 
         scroll_area.setWidget(self.butonlar_widget)
         layout.addWidget(scroll_area)
 
         self._ui_kuruldu = True
 
+    def _buton_havuzunu_olustur(self):
+        """En fazla buton sayısı kadar butonu bir kez oluşturur"""
+        for i in range(MAKS_BUTON_SAYISI):
+            buton = QPushButton(BOS_BUTON_METNI)
+            buton.setMinimumSize(80, 60)
+            buton.setMaximumSize(120, 80)
+            buton.setFont(QFont("Arial", 8))
+            buton.setProperty("hasProduct", False)
+            buton.setProperty("productData", None)
+            buton.clicked.connect(lambda checked, idx=i: self._hizli_urun_butonu_tiklandi(idx))
+            self.butonlar_layout.addWidget(buton, i // SUTUN_SAYISI, i % SUTUN_SAYISI)
+            self._buton_havuzu.append(buton)
+        self._gosterilen = [None] * MAKS_BUTON_SAYISI
+
     def _sinyalleri_bagla(self):
         """Sinyalleri bağlar"""
         self.sinyaller.hizli_urunler_guncellendi.connect(self._hizli_urunler_guncellendi)
         self.sinyaller.kategoriler_guncellendi.connect(self._kategoriler_guncellendi)
+        self.sinyaller.odeme_tamamlandi.connect(self._satis_tamamlandi)
 
     def _varsayilan_verileri_yukle(self):
         """Varsayılan test verilerini yükler"""
@@ -138,28 +231,11 @@ class HizliUrunPaneli(POSBilesenWidget):
             {"id": "4", "ad": "Kırtasiye", "aktif": True},
         ]
 
-        # Varsayılan hızlı ürünler
-        self._hizli_urunler = [
-            {
-                "id": "1",
-                "barkod": "8690504123456",
-                "urun_adi": "Coca Cola 330ml",
-                "birim_fiyat": 5.50,
-                "kategori_id": "1",
-                "pozisyon": 0,
-            },
-            {
-                "id": "2",
-                "barkod": "8690504123457",
-                "urun_adi": "Fanta 330ml",
-                "birim_fiyat": 5.50,
-                "kategori_id": "1",
-                "pozisyon": 1,
-            },
-        ]
+        # Pozisyonu tanımlı ürün yok; demo ürünler yalnızca sıralama boşken gösterilir
+        self._hizli_urunler = []
 
         self._kategorileri_guncelle()
-        self._butonlari_olustur()
+        self._buton_sayisini_uygula()
 
     def _kategorileri_guncelle(self):
         """Kategori combo box'ını günceller"""
@@ -178,6 +254,7 @@ class HizliUrunPaneli(POSBilesenWidget):
         """Kategori seçildiğinde çağrılır"""
         kategori_id = self.kategori_combo.currentData()
         self._aktif_kategori = kategori_id or ""
+        self._aktif_kategori_adi = kategori_adi if kategori_id else ""
         self._butonlari_guncelle()
         self.kategori_degisti.emit(kategori_adi)
 
@@ -188,95 +265,105 @@ class HizliUrunPaneli(POSBilesenWidget):
             # 12-24 arası değer kontrolü
             if 12 <= yeni_buton_sayisi <= 24:
                 self._buton_sayisi = yeni_buton_sayisi
-                self._butonlari_olustur()
+                self._buton_sayisini_uygula()
         except ValueError:
             pass
 
-    def _butonlari_olustur(self):
-        """Hızlı ürün butonlarını oluşturur"""
-        # Mevcut butonları temizle
-        for buton in self._butonlar:
-            buton.deleteLater()
-        self._butonlar.clear()
+    def _buton_sayisini_uygula(self):
+        """Buton sayısı kadar havuz butonunu gösterir, fazlasını gizler"""
+        self._butonlar = self._buton_havuzu[:self._buton_sayisi]
+        for i, buton in enumerate(self._buton_havuzu):
+            buton.setVisible(i < self._buton_sayisi)
 
-        # Grid düzeni hesapla (4 sütun)
-        sutun_sayisi = 4
-        satir_sayisi = (self._buton_sayisi + sutun_sayisi - 1) // sutun_sayisi
+        self._butonlari_guncelle()
 
-        # Yeni butonları oluştur
-        for i in range(self._buton_sayisi):
-            buton = QPushButton("Tanımsız")
-            buton.setMinimumSize(80, 60)
-            buton.setMaximumSize(120, 80)
-            buton.setFont(QFont("Arial", 8))
-            buton.setStyleSheet(
-                """
-                QPushButton {
-                    background-color: #ecf0f1;
-                    border: 1px solid #bdc3c7;
-                    border-radius: 5px;
-                    color: #7f8c8d;
-                }
-                QPushButton:hover {
-                    background-color: #d5dbdb;
-                }
-                QPushButton:pressed {
-                    background-color: #bdc3c7;
-                }
-                QPushButton[hasProduct="true"] {
-                    background-color: #3498db;
-                    color: white;
-                    font-weight: bold;
-                }
-                QPushButton[hasProduct="true"]:hover {
-                    background-color: #2980b9;
-                }
-            """
-            )
-
-            # Buton pozisyonunu hesapla
-            satir = i // sutun_sayisi
-            sutun = i % sutun_sayisi
-
-            # Butonu grid'e ekle
-            self.butonlar_layout.addWidget(buton, satir, sutun)
-
-            # Buton click handler'ını bağla
-            buton.clicked.connect(lambda checked, idx=i: self._hizli_urun_butonu_tiklandi(idx))
+    def _butonlari_guncelle(self):
+        """Butonları aktif kategoriye göre günceller (yalnızca değişenler)"""
+        # Açılıştaki geçmiş yüklemesi bittiyse sıralama burada da alınır
+        self._siralamayi_yenile()
+        yerlesim: List[Optional[Dict[str, Any]]] = [None] * len(self._butonlar)
+
+        # Pozisyonu tanımlı ürünler kendi butonlarında
+        for urun in sorted(self._kategori_urunleri(self._hizli_urunler),
+                           key=lambda x: x.get("pozisyon", 999)):
+            pozisyon = urun.get("pozisyon", 0)
+            if 0 <= pozisyon < len(yerlesim):
+                yerlesim[pozisyon] = urun
+
+        # Boş butonlar en çok satanlarla doldurulur
+        yerlesik = {urun.get("barkod") or urun.get("id") for urun in yerlesim if urun}
+        bos_pozisyonlar = iter([i for i, urun in enumerate(yerlesim) if urun is None])
+        sirali_urunler = self._sirali_urunler or list(VARSAYILAN_HIZLI_URUNLER)
+        for urun in self._kategori_urunleri(sirali_urunler):
+            if (urun.get("barkod") or urun.get("id")) in yerlesik:
+                continue
+            pozisyon = next(bos_pozisyonlar, None)
+            if pozisyon is None:
+                break
+            yerlesim[pozisyon] = urun
+
+        for pozisyon, urun in enumerate(yerlesim):
+            self._butonu_ayarla(pozisyon, urun)
+
+    def _kategori_urunleri(self, urunler: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aktif kategoriye ait ürünler ("Tümü" seçiliyse hepsi)"""
+        if not self._aktif_kategori:
+            return list(urunler)
+        return [
+            urun for urun in urunler
+            if urun.get("kategori_id") == self._aktif_kategori
+            or (urun.get("kategori_id") is None and urun.get("kategori") == self._aktif_kategori_adi)
+        ]
 
-            self._butonlar.append(buton)
+    def _butonu_ayarla(self, pozisyon: int, urun: Optional[Dict[str, Any]]):
+        """Butonun ürünü değiştiyse metnini ve durumunu günceller"""
+        if self._gosterilen[pozisyon] == urun:
+            return
 
-        self._butonlari_guncelle()
+        buton = self._buton_havuzu[pozisyon]
+        urun_vardi = self._gosterilen[pozisyon] is not None
+        self._gosterilen[pozisyon] = urun
+        buton.setText(urun["urun_adi"] if urun else BOS_BUTON_METNI)
+        buton.setProperty("productData", urun)
 
-    def _butonlari_guncelle(self):
-        """Butonları aktif kategoriye göre günceller"""
-        # Önce tüm butonları sıfırla
-        for i, buton in enumerate(self._butonlar):
-            buton.setText("Tanımsız")
-            buton.setProperty("hasProduct", False)
-            buton.setProperty("productData", None)
+        # Stil yalnızca dolu/boş durumu değişince yeniden uygulanır
+        if urun_vardi != (urun is not None):
+            buton.setProperty("hasProduct", urun is not None)
             buton.style().unpolish(buton)
             buton.style().polish(buton)
 
-        # Aktif kategoriye ait ürünleri bul
-        kategori_urunleri = []
-        for urun in self._hizli_urunler:
-            if not self._aktif_kategori or urun.get("kategori_id") == self._aktif_kategori:
-                kategori_urunleri.append(urun)
-
-        # Ürünleri pozisyonlarına göre sırala
-        kategori_urunleri.sort(key=lambda x: x.get("pozisyon", 999))
-
-        # Ürünleri butonlara ata
-        for urun in kategori_urunleri:
-            pozisyon = urun.get("pozisyon", 0)
-            if 0 <= pozisyon < len(self._butonlar):
-                buton = self._butonlar[pozisyon]
-                buton.setText(urun["urun_adi"])
-                buton.setProperty("hasProduct", True)
-                buton.setProperty("productData", urun)
-                buton.style().unpolish(buton)
-                buton.style().polish(buton)
+    def _siralamayi_yenile(self) -> bool:
+        """
+        Terminalin satış sıralamasını okur
+
+        Sıralama yalnızca yeni satış olduysa veya saat dilimi değiştiyse
+        yeniden okunur.
+
+        Returns:
+            bool: Sıralama değiştiyse True
+        """
+        terminal_id = self._terminal_id
+        if terminal_id is None:
+            oturum = aktif_oturum()
+            terminal_id = oturum.terminal_id if oturum else None
+        if terminal_id is None:
+            return False
+
+        simdi = datetime.now()
+        anahtar = (terminal_id, self._siralayici.surum(terminal_id), self._siralayici.zaman_dilimi(simdi))
+        if anahtar == self._siralama_anahtari:
+            return False
+
+        self._siralama_anahtari = anahtar
+        self._sirali_urunler = self._siralayici.en_cok_satanlar(
+            terminal_id, simdi, limit=MAKS_BUTON_SAYISI
+        )
+        return True
+
+    def _satis_tamamlandi(self, _odeme_bilgisi: Dict[str, Any]):
+        """Satış sonrası en çok satanlar değiştiyse butonları günceller"""
+        if self._siralamayi_yenile():
+            self._butonlari_guncelle()
 
     def _hizli_urun_butonu_tiklandi(self, pozisyon: int):
         """Hızlı ürün butonu tıklandığında çağrılır"""
@@ -304,11 +391,13 @@ class HizliUrunPaneli(POSBilesenWidget):
         """Bileşeni başlatır"""
         if not self._ui_kuruldu:
             self._ui_kur()
+        self._siralamayi_yenile()
         self._varsayilan_verileri_yukle()
 
     def temizle(self) -> None:
         """Bileşeni temizler"""
         self._aktif_kategori = ""
+        self._aktif_kategori_adi = ""
         self._hizli_urunler.clear()
         self._butonlari_guncelle()
 
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-18
+# Last Update: 2026-10-17
 # Module: odeme_paneli
 # Description: POS ödeme paneli bileşeni
 # Changelog:
 # - İlk oluşturma - Ödeme paneli widget'ı
+# - Tutarlar servisin gönderdiği sepet toplamlarından gösteriliyor
 
 """
 POS Ödeme Paneli Bileşeni
@@ -24,6 +25,8 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamOzeti, tutar_yuvarla
+
 from .pos_bilesen_arayuzu import POSBilesenWidget
 from ..handlers.pos_sinyalleri import POSSinyalleri
 
@@ -194,6 +197,7 @@ class OdemePaneli(POSBilesenWidget):
     def _sinyalleri_bagla(self):
         """Sinyalleri bağlar"""
         self.sinyaller.sepet_guncellendi.connect(self._sepet_guncellendi)
+        self.sinyaller.sepet_toplamlari_guncellendi.connect(self._sepet_toplamlari_guncellendi)
 
     def _odeme_turu_sec(self, odeme_turu: str):
         """Ödeme türü seçildiğinde çağrılır"""
@@ -209,12 +213,19 @@ class OdemePaneli(POSBilesenWidget):
         """Sepet güncellendiğinde tutarları hesaplar"""
         ara_toplam = Decimal("0.00")
         for veri in sepet_verileri:
-            ara_toplam += Decimal(str(veri.get("toplam_fiyat", 0)))
+            ara_toplam += tutar_yuvarla(veri.get("toplam_fiyat", 0))
 
         self._ara_toplam = ara_toplam
         self._genel_toplam = self._ara_toplam - self._indirim
         self._tutarlari_guncelle()
 
+    def _sepet_toplamlari_guncellendi(self, toplamlar: SepetToplamOzeti):
+        """Servisin artımlı tuttuğu toplamları doğrudan gösterir"""
+        self._ara_toplam = toplamlar.brut_toplam
+        self._indirim = toplamlar.indirim_tutari
+        self._genel_toplam = toplamlar.net_tutar
+        self._tutarlari_guncelle()
+
     def _tutarlari_guncelle(self):
         """Tutar göstergelerini günceller"""
         self.ara_toplam_deger.setText(f"{self._ara_toplam:.2f} ₺")
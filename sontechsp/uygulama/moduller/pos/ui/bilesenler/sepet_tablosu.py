@@ -1,15 +1,29 @@
 # Version: 0.1.0
-# Last Update: 2024-12-18
+# Last Update: 2026-10-17
 # Module: sepet_tablosu
 # Description: POS sepet tablosu bileşeni
 # Changelog:
 # - İlk oluşturma - Sepet tablosu widget'ı
 # - setVisible() metoduna geçiş (hide/show yerine)
-
-"""POS Sepet Tablosu Bileşeni"""
+# - Toplam tutar SepetToplamlari ile artımlı tutuluyor
+# - Tablo her güncellemede yeniden doldurulmuyor; satır farkıyla yalnızca değişen hücreler yazılıyor
+# - Kullanıcının düzenlediği hücrenin metni önbelleğe yansıtılıyor
+
+"""
+POS Sepet Tablosu Bileşeni
+
+Tablo her barkod okutmasında baştan doldurulmaz. Satırların görünen
+metinleri önbellekte tutulur; yeni sepet eskisiyle barkoda göre
+karşılaştırılır ve yalnızca eklenen/çıkan satırlar ile metni değişen
+hücreler yazılır. Satır yüksekliği sabittir ve içeriğe göre boyutlanan
+kolon yoktur, böylece güncelleme tüm satırları yeniden ölçtürmez.
+Kullanıcının doğrudan düzenlediği hücrenin (Adet) yeni metni de önbelleğe
+yazılır; aksi halde sonraki güncelleme hücreyi değişmemiş sanıp atlardı.
+"""
 
 from decimal import Decimal
-from typing import Any, Dict, List
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Tuple
 
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
@@ -22,9 +36,24 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamlari, tutar_metni
+
 from ..handlers.pos_sinyalleri import POSSinyalleri
 from .pos_bilesen_arayuzu import POSBilesenWidget
 
+# Sabit satır yüksekliği (piksel)
+SATIR_YUKSEKLIGI = 32
+
+# Sabit genişlikli kolonlar (Barkod, Adet, Fiyat, Tutar, Sil)
+KOLON_GENISLIKLERI = {0: 130, 2: 60, 3: 90, 4: 100, 5: 60}
+
+# Metin kolonları ve düzenlenebilir olanı
+METIN_KOLON_SAYISI = 5
+ADET_KOLONU = 2
+SIL_KOLONU = 5
+
+_SatirMetinleri = Tuple[str, str, str, str, str]
+
 
 class SepetTablosu(POSBilesenWidget):
     """Sepet Tablosu Widget'ı"""
@@ -37,7 +66,13 @@ class SepetTablosu(POSBilesenWidget):
         super().__init__(parent)
         self.sinyaller = sinyaller
         self._sepet_verileri: List[Dict[str, Any]] = []
+        # Tablodaki satırların görünen metinleri (satır sırasıyla)
+        self._satir_metinleri: List[_SatirMetinleri] = []
+        # Satırlar sözlük nesnesinin kimliğiyle anahtarlanır
+        self._toplamlar = SepetToplamlari()
         self._secili_satir = -1
+        # Tabloya kod içinden yazılırken itemChanged önbelleğe yansıtılmaz
+        self._tablo_yaziliyor = False
         self._ui_kuruldu = False
         self._ui_kur()
         self._sinyalleri_bagla()
@@ -63,17 +98,21 @@ class SepetTablosu(POSBilesenWidget):
         self.tablo.setHorizontalHeaderLabels(["Barkod", "Ürün", "Adet", "Fiyat", "Tutar", "Sil"])
 
         # Tablo ayarları
+        # İçeriğe göre boyutlanan kolon her güncellemede tüm satırları ölçer
         header = self.tablo.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
+        for kolon, genislik in KOLON_GENISLIKLERI.items():
+            header.setSectionResizeMode(kolon, QHeaderView.ResizeMode.Fixed)
+            self.tablo.setColumnWidth(kolon, genislik)
+
+        dikey_baslik = self.tablo.verticalHeader()
+        dikey_baslik.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        dikey_baslik.setDefaultSectionSize(SATIR_YUKSEKLIGI)
 
         self.tablo.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.tablo.setAlternatingRowColors(True)
         self.tablo.itemSelectionChanged.connect(self._satir_secim_degisti)
+        self.tablo.itemChanged.connect(self._hucre_degisti)
 
         layout.addWidget(self.tablo)
 
@@ -110,6 +149,16 @@ class SepetTablosu(POSBilesenWidget):
         else:
             self._secili_satir = -1
 
+    def _hucre_degisti(self, item: QTableWidgetItem):
+        """Kullanıcı hücreyi düzenlediğinde önbellekteki metni günceller"""
+        if self._tablo_yaziliyor:
+            return
+        satir, kolon = item.row(), item.column()
+        if 0 <= satir < len(self._satir_metinleri) and kolon < METIN_KOLON_SAYISI:
+            metinler = list(self._satir_metinleri[satir])
+            metinler[kolon] = item.text()
+            self._satir_metinleri[satir] = tuple(metinler)
+
     def _sil_butonu_tiklandi(self, satir_index: int):
         """Sil butonu tıklandığında çağrılır"""
         if 0 <= satir_index < len(self._sepet_verileri):
@@ -118,12 +167,12 @@ class SepetTablosu(POSBilesenWidget):
 
     def _sepet_guncellendi(self, sepet_verileri: List[Dict[str, Any]]):
         """Sepet güncellendiğinde çağrılır"""
-        self._sepet_verileri = sepet_verileri
+        self._sepet_verilerini_ayarla(sepet_verileri)
         self._tabloyu_guncelle()
 
     def _sepet_temizlendi(self):
         """Sepet temizlendiğinde çağrılır"""
-        self._sepet_verileri = []
+        self._sepet_verilerini_ayarla([])
         self._tabloyu_guncelle()
 
     def _urun_eklendi(self, urun_verisi: Dict[str, Any]):
@@ -136,7 +185,8 @@ class SepetTablosu(POSBilesenWidget):
                 self._sepet_verileri[i]["toplam_fiyat"] = (
                     Decimal(str(self._sepet_verileri[i]["birim_fiyat"])) * self._sepet_verileri[i]["adet"]
                 )
-                self._tabloyu_guncelle()
+                self._satir_toplamini_ayarla(self._sepet_verileri[i])
+                self._satiri_yaz(i, self._hucre_metinleri(self._sepet_verileri[i]))
                 return
 
         # Yeni ürün için toplam fiyat hesapla
@@ -146,71 +196,126 @@ class SepetTablosu(POSBilesenWidget):
 
         # Yeni ürün ekle
         self._sepet_verileri.append(urun_verisi)
-        self._tabloyu_guncelle()
+        self._satir_toplamini_ayarla(urun_verisi)
+        self._satir_ekle(len(self._satir_metinleri), self._hucre_metinleri(urun_verisi))
+        self._gorunurlugu_ayarla()
+
+    def _sepet_verilerini_ayarla(self, sepet_verileri: List[Dict[str, Any]]):
+        """Sepet verilerini değiştirir ve toplamları yeniden kurar"""
+        self._sepet_verileri = sepet_verileri
+        self._toplamlar = SepetToplamlari.satirlardan(
+            (id(veri), veri.get("toplam_fiyat", 0), veri.get("kdv_orani")) for veri in sepet_verileri
+        )
+
+    def _satir_toplamini_ayarla(self, veri: Dict[str, Any]):
+        """Tek satırın tutarını toplamlara yansıtır"""
+        self._toplamlar.satir_ayarla(id(veri), veri.get("toplam_fiyat", 0), veri.get("kdv_orani"))
 
     def _tabloyu_guncelle(self):
-        """Tabloyu günceller"""
+        """Tabloyu sepet verilerine satır farkıyla eşitler"""
         if not self._sepet_verileri:
-            self.tablo.setVisible(False)
-            self.bos_sepet_label.setVisible(True)
+            self.tablo.setRowCount(0)
+            self._satir_metinleri.clear()
+            self._gorunurlugu_ayarla()
             return
 
-        self.bos_sepet_label.setVisible(False)
-        self.tablo.setVisible(True)
-
-        self.tablo.setRowCount(len(self._sepet_verileri))
-
-        for satir, veri in enumerate(self._sepet_verileri):
-            # Barkod
-            barkod_item = QTableWidgetItem(str(veri.get("barkod", "")))
-            barkod_item.setFlags(barkod_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tablo.setItem(satir, 0, barkod_item)
-
-            # Ürün adı
-            urun_item = QTableWidgetItem(str(veri.get("urun_adi", "")))
-            urun_item.setFlags(urun_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tablo.setItem(satir, 1, urun_item)
-
-            # Adet
-            adet_item = QTableWidgetItem(str(veri.get("adet", 0)))
-            self.tablo.setItem(satir, 2, adet_item)
-
-            # Birim fiyat
-            birim_fiyat = veri.get("birim_fiyat", 0)
-            fiyat_item = QTableWidgetItem(f"{birim_fiyat:.2f} ₺")
-            fiyat_item.setFlags(fiyat_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tablo.setItem(satir, 3, fiyat_item)
-
-            # Toplam tutar
-            toplam_fiyat = veri.get("toplam_fiyat", 0)
-            tutar_item = QTableWidgetItem(f"{toplam_fiyat:.2f} ₺")
-            tutar_item.setFlags(tutar_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.tablo.setItem(satir, 4, tutar_item)
+        yeni = [self._hucre_metinleri(veri) for veri in self._sepet_verileri]
+        eski_barkodlar = [metinler[0] for metinler in self._satir_metinleri]
+        yeni_barkodlar = [metinler[0] for metinler in yeni]
+        eslestirici = SequenceMatcher(None, eski_barkodlar, yeni_barkodlar, autojunk=False)
+
+        # Sondan başa uygulanır; önceki bölümlerin satır numaraları kaymaz
+        for islem, i1, i2, j1, j2 in reversed(eslestirici.get_opcodes()):
+            ortak = min(i2 - i1, j2 - j1)
+            for k in range(ortak):
+                self._satiri_yaz(i1 + k, yeni[j1 + k])
+            for satir in range(i2 - 1, i1 + ortak - 1, -1):
+                self._satir_sil(satir)
+            for k in range(ortak, j2 - j1):
+                self._satir_ekle(i1 + k, yeni[j1 + k])
+
+        self._gorunurlugu_ayarla()
+
+    def _gorunurlugu_ayarla(self):
+        """Boş sepette tablo yerine mesaj gösterilir"""
+        bos = not self._sepet_verileri
+        self.tablo.setVisible(not bos)
+        self.bos_sepet_label.setVisible(bos)
+
+    @staticmethod
+    def _hucre_metinleri(veri: Dict[str, Any]) -> _SatirMetinleri:
+        """Satırın Barkod, Ürün, Adet, Fiyat ve Tutar hücre metinleri"""
+        return (
+            str(veri.get("barkod", "")),
+            str(veri.get("urun_adi", "")),
+            str(veri.get("adet", 0)),
+            tutar_metni(veri.get("birim_fiyat", 0)),
+            tutar_metni(veri.get("toplam_fiyat", 0)),
+        )
 
-            # Sil butonu
-            sil_btn = QPushButton("Sil")
-            sil_btn.setMaximumWidth(50)
-            sil_btn.clicked.connect(lambda checked, idx=satir: self._sil_butonu_tiklandi(idx))
-            self.tablo.setCellWidget(satir, 5, sil_btn)
+    def _satir_ekle(self, satir: int, metinler: _SatirMetinleri):
+        """Satır ekler; hücreler ve Sil butonu yalnızca burada oluşturulur"""
+        self._tablo_yaziliyor = True
+        try:
+            self.tablo.insertRow(satir)
+            for kolon, metin in enumerate(metinler):
+                item = QTableWidgetItem(metin)
+                if kolon != ADET_KOLONU:
+                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.tablo.setItem(satir, kolon, item)
+        finally:
+            self._tablo_yaziliyor = False
+
+        sil_btn = QPushButton("Sil")
+        sil_btn.setMaximumWidth(50)
+        sil_btn.clicked.connect(lambda checked, btn=sil_btn: self._sil_butonu_tiklandi(self._buton_satiri(btn)))
+        self.tablo.setCellWidget(satir, SIL_KOLONU, sil_btn)
+        self._satir_metinleri.insert(satir, metinler)
+
+    def _satiri_yaz(self, satir: int, metinler: _SatirMetinleri):
+        """Yalnızca metni değişen hücreleri günceller"""
+        eski = self._satir_metinleri[satir]
+        if eski == metinler:
+            return
+        self._tablo_yaziliyor = True
+        try:
+            for kolon in range(METIN_KOLON_SAYISI):
+                if eski[kolon] != metinler[kolon]:
+                    self.tablo.item(satir, kolon).setText(metinler[kolon])
+        finally:
+            self._tablo_yaziliyor = False
+        self._satir_metinleri[satir] = metinler
+
+    def _satir_sil(self, satir: int):
+        """Satırı ve önbellekteki metinlerini siler"""
+        self.tablo.removeRow(satir)
+        del self._satir_metinleri[satir]
+
+    def _buton_satiri(self, buton: QPushButton) -> int:
+        """Sil butonunun bulunduğu güncel satır (satırlar kaydıkça değişir)"""
+        for satir in range(self.tablo.rowCount()):
+            if self.tablo.cellWidget(satir, SIL_KOLONU) is buton:
+                return satir
+        return -1
 
     def baslat(self) -> None:
         """Bileşeni başlatır"""
         super().baslat()
-        self._sepet_verileri = []
+        self._sepet_verilerini_ayarla([])
         self._secili_satir = -1
         self._tabloyu_guncelle()
 
     def temizle(self) -> None:
         """Bileşeni temizler"""
         super().temizle()
-        self._sepet_verileri = []
+        self._sepet_verilerini_ayarla([])
         self._secili_satir = -1
         self._tabloyu_guncelle()
 
     def guncelle(self, veri: Dict[str, Any]) -> None:
         """Bileşeni günceller"""
         if "sepet_verileri" in veri:
-            self._sepet_verileri = veri["sepet_verileri"]
+            self._sepet_verilerini_ayarla(veri["sepet_verileri"])
             self._tabloyu_guncelle()
 
     def klavye_kisayolu_isle(self, tus: str) -> bool:
@@ -229,8 +334,5 @@ class SepetTablosu(POSBilesenWidget):
         return self._sepet_verileri.copy()
 
     def toplam_tutar_hesapla(self) -> Decimal:
-        """Sepet toplam tutarını hesaplar"""
-        toplam = Decimal("0.00")
-        for veri in self._sepet_verileri:
-            toplam += Decimal(str(veri.get("toplam_fiyat", 0)))
-        return toplam
+        """Sepet toplam tutarını döndürür (satırlar dolaşılmaz)"""
+        return self._toplamlar.brut_toplam
@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-19
+# Last Update: 2026-10-17
 # Module: pos_servis_entegratoru
 # Description: POS UI ve servis katmanı entegrasyon yöneticisi
 # Changelog:
 # - İlk oluşturma - POS servis entegrasyonu
+# - Sepet güncellemesinde servisin toplamları da yayınlanıyor
+# - Bağlantı izleyicisi durum değişiklikleri network_durumu_degisti sinyaline bağlandı
+# - Arka plan senkronizasyon turları offline_senkronizasyon_tamamlandi sinyaline bağlandı
 
 """
 POS Servis Entegratörü
@@ -26,6 +29,7 @@ from sontechsp.uygulama.cekirdek.kayit import kayit_al
 from sontechsp.uygulama.cekirdek.hatalar import POSHatasi, NetworkHatasi
 from ..handlers.pos_sinyalleri import POSSinyalleri
 from ..handlers.pos_hata_yoneticisi import POSHataYoneticisi
+from ...baglanti_izleyici import BaglantiIzleyici
 from ...arayuzler import (
     ISepetService,
     IOdemeService,
@@ -53,6 +57,7 @@ class POSServisEntegratoru:
         odeme_service: Optional[IOdemeService] = None,
         stok_service: Optional[IStokService] = None,
         offline_kuyruk_service: Optional[IOfflineKuyrukService] = None,
+        baglanti_izleyici: Optional[BaglantiIzleyici] = None,
     ):
         """
         Entegratör constructor
@@ -64,6 +69,8 @@ class POSServisEntegratoru:
             odeme_service: Ödeme servisi (opsiyonel)
             stok_service: Stok servisi (opsiyonel)
             offline_kuyruk_service: Offline kuyruk servisi (opsiyonel)
+            baglanti_izleyici: Durum değişikliklerini network_durumu_degisti
+                sinyaline aktarılan bağlantı izleyicisi (opsiyonel)
         """
         self._sinyaller = sinyaller
         self._hata_yoneticisi = hata_yoneticisi
@@ -71,6 +78,7 @@ class POSServisEntegratoru:
         self._odeme_service = odeme_service
         self._stok_service = stok_service
         self._offline_kuyruk_service = offline_kuyruk_service
+        self._baglanti_izleyici = baglanti_izleyici
         self._logger = kayit_al(__name__)
 
         # Aktif sepet bilgileri
@@ -98,6 +106,14 @@ class POSServisEntegratoru:
         # Offline kuyruk
         if self._offline_kuyruk_service:
             self._sinyaller.offline_islem_kuyruga_ekle.connect(self._offline_islem_ekle)
+            # Arka plan senkronizasyon turları da tamamlandı sinyaliyle bildirilir
+            senkron_dinleyicisi_ekle = getattr(self._offline_kuyruk_service, "senkron_dinleyicisi_ekle", None)
+            if callable(senkron_dinleyicisi_ekle):
+                senkron_dinleyicisi_ekle(self._sinyaller.offline_senkronizasyon_tamamlandi.emit)
+
+        # Bağlantı durumu; izleyici thread'inden yayınlanan sinyal ana thread'e kuyruklanır
+        if self._baglanti_izleyici:
+            self._baglanti_izleyici.dinleyici_ekle(self._sinyaller.network_durumu_degisti.emit)
 
     def baslat(self):
         """Entegratörü başlatır ve yeni sepet oluşturur"""
@@ -314,6 +330,8 @@ class POSServisEntegratoru:
                     # Sepet satırlarını UI formatına çevir
                     sepet_satirlari = self._sepet_satirlarini_cevir(sepet_bilgisi.get("satirlar", []))
                     self._sinyaller.sepet_guncellendi.emit(sepet_satirlari)
+                    if sepet_bilgisi.get("toplamlar") is not None:
+                        self._sinyaller.sepet_toplamlari_guncellendi.emit(sepet_bilgisi["toplamlar"])
 
         except Exception as e:
             self._logger.error(f"Sepet bilgisi güncelleme hatası: {str(e)}")
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-18
+# Last Update: 2026-10-17
 # Module: pos_sinyalleri
 # Description: POS sinyal/slot sistemi
 # Changelog:
 # - İlk oluşturma - POS sinyal sistemi
+# - sepet_toplamlari_guncellendi sinyali eklendi
 
 """
 POS Sinyal/Slot Sistemi
@@ -34,6 +35,7 @@ class POSSinyalleri(QObject):
     urun_eklendi = pyqtSignal(dict)  # Ürün sepete eklendi
     urun_cikarildi = pyqtSignal(int)  # Ürün sepetten çıkarıldı (satır index)
     sepet_guncellendi = pyqtSignal(list)  # Sepet değişti
+    sepet_toplamlari_guncellendi = pyqtSignal(object)  # Sepet toplamları (SepetToplamOzeti)
     sepet_temizlendi = pyqtSignal()  # Sepet temizlendi
     sepet_satir_secildi = pyqtSignal(int)  # Sepet satırı seçildi
 
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: pos.ui.odeme_ekrani
 # Description: POS Ödeme Ekranı PyQt6 arayüzü
 # Changelog:
 # - İlk oluşturma
+# - Ödenecek tutar sepetin toplamlarından (indirim sonrası net) alınıyor
 
 """
 POS Ödeme Ekranı PyQt6 Arayüzü
@@ -25,6 +26,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
 from sontechsp.uygulama.arayuz.taban_ekran import TabanEkran
+from sontechsp.uygulama.moduller.pos.arayuzler import sepet_toplam_ozeti
 from sontechsp.uygulama.moduller.pos.servisler.odeme_service import OdemeService
 from sontechsp.uygulama.cekirdek.oturum import oturum_baglamini_al
 
@@ -45,7 +47,8 @@ class OdemeEkrani(TabanEkran):
         """Ödeme ekranını başlatır"""
         # Sepet bilgisi önce atanmalı (TabanEkran __init__ içinde _icerik_olustur çağrılıyor)
         self.sepet_bilgisi = sepet_bilgisi
-        self.sepet_toplami = Decimal(str(sepet_bilgisi.get('toplam_tutar', '0.00')))
+        self.toplamlar = sepet_toplam_ozeti({'toplam_tutar': '0.00', **sepet_bilgisi})
+        self.sepet_toplami = self.toplamlar.net_tutar
         
         super().__init__("POS Ödeme", parent)
         
@@ -1,10 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-19
+# Last Update: 2026-10-17
 # Module: pos_ana_ekran
 # Description: POS ana ekran container - Grid layout (3x3) yapısı
 # Changelog:
 # - İlk oluşturma - POS UI altyapısı
 # - Kod analizi ve düzeltmeler
+# - Stok rezervasyon temizleyicisi başlatılıyor
+# - MAGAZA_ID tanımlıysa katalog replikası başlatılıyor; barkod ve stok önce yerelden okunuyor
 
 """
 POS Ana Ekran Container
@@ -453,18 +455,33 @@ class POSAnaEkran(TabanEkran):
             from ....stok.servisler.stok_rezervasyon_service import StokRezervasyonService
             from ....stok.servisler.barkod_service import BarkodService
             from ....stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+            from ....stok.depolar.barkod_indeksi import barkod_indeksi_baslat
+            from ..katalog_replikasi import katalog_replikasi_al
+            from sontechsp.uygulama.cekirdek.ayarlar import ayar_al
+
+            # Terminalin mağazası biliniyorsa katalog yerel SQLite'a replike edilir
+            magaza_id = ayar_al('MAGAZA_ID')
+            katalog_replikasi = katalog_replikasi_al(int(magaza_id)) if magaza_id else None
 
             # Stok modülü bağımlılıklarını oluştur
             bakiye_repository = StokBakiyeRepository()
             entegrasyon_service = StokEntegrasyonService()
-            rezervasyon_service = StokRezervasyonService()
-            barkod_service = BarkodService()
+            rezervasyon_service = StokRezervasyonService(bakiye_repository)
+            barkod_service = BarkodService(yerel_katalog=katalog_replikasi)
+
+            # Barkod indeksi arka planda yüklenir (replika varsa yerel kopyadan),
+            # yüklenene kadar okutmalar DB'ye düşer
+            barkod_indeksi_baslat(katalog_replikasi or barkod_service.barkod_repository,
+                                  arka_planda=True)
+            # Süresi dolan rezervasyonlar arka planda toplu düşülür
+            rezervasyon_service.temizleyici_baslat()
 
             return StokService(
                 stok_entegrasyon_service=entegrasyon_service,
                 rezervasyon_service=rezervasyon_service,
                 barkod_service=barkod_service,
                 bakiye_repository=bakiye_repository,
+                katalog_replikasi=katalog_replikasi,
             )
         except ImportError:
             print("Uyarı: Stok servisi yüklenemedi")
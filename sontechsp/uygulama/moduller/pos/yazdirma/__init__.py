@@ -0,0 +1,34 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.yazdirma
+# Description: POS fiş yazdırma alt sistemi
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP POS Yazdırma Alt Sistemi
+
+- Bir kez derlenen fiş şablonları (düz metin ve ESC/POS)
+- Yazıcı başına arka plan kuyruğu, yeniden deneme ve durum bildirimleri
+- Çökmeye dayanıklı dosya destekli kuyruk klasörü
+"""
+
+from .fis_sablonu import (
+    Satir, Bolum, DerlenmisSablon, sablon_derle, metni_escpos_yap
+)
+from .yazici_kuyrugu import (
+    YazdirmaDurumu, YazdirmaIsi, YaziciKuyrugu, cihaz_gonderici, yazici_kuyrugu_al
+)
+
+__all__ = [
+    'Satir',
+    'Bolum',
+    'DerlenmisSablon',
+    'sablon_derle',
+    'metni_escpos_yap',
+    'YazdirmaDurumu',
+    'YazdirmaIsi',
+    'YaziciKuyrugu',
+    'cihaz_gonderici',
+    'yazici_kuyrugu_al'
+]
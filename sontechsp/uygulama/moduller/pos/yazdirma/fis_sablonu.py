@@ -0,0 +1,185 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.yazdirma.fis_sablonu
+# Description: Bir kez derlenen fiş şablonları (metin ve ESC/POS çıktısı)
+# Changelog:
+# - İlk oluşturma
+
+"""
+Fiş Şablonları
+
+Fiş düzeni satır listesi olarak bir kez tanımlanır ve derlenir. Derleme
+sırasında sabit metin parçaları ESC/POS kod sayfasına (PC857, Türkçe)
+önceden kodlanır; her satışta yalnızca değişken alanlar biçimlendirilip
+kodlanır. Aynı derlenmiş şablon önizleme/kayıt için düz metin ve yazıcı
+için ESC/POS bayt dizisi üretir.
+
+Alanlar str.format sözdizimiyle yazılır ({fis_no}, {tutar:>10.2f}).
+Bolum, degerler içindeki aynı adlı listenin her elemanı için tekrarlanır;
+boş liste bölümü tamamen atlar (koşullu satırlar bu şekilde yazılır).
+"""
+
+from collections import ChainMap
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
+
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi
+
+# ESC/POS komutları
+ESC_BASLAT = b'\x1b@'
+ESC_KOD_SAYFASI_PC857 = b'\x1bt\x0d'
+ESC_KALIN_AC = b'\x1bE\x01'
+ESC_KALIN_KAPAT = b'\x1bE\x00'
+ESC_CIFT_YUKSEKLIK_AC = b'\x1d!\x01'
+ESC_CIFT_YUKSEKLIK_KAPAT = b'\x1d!\x00'
+ESC_BESLE_VE_KES = b'\x1dVB\x03'
+
+# PC857 kod sayfasının Python karşılığı
+VARSAYILAN_KODLAMA = 'cp857'
+
+_STILLER = {
+    'kalin': (ESC_KALIN_AC, ESC_KALIN_KAPAT),
+    'buyuk': (ESC_KALIN_AC + ESC_CIFT_YUKSEKLIK_AC, ESC_CIFT_YUKSEKLIK_KAPAT + ESC_KALIN_KAPAT),
+}
+
+
+@dataclass(frozen=True)
+class Satir:
+    """Şablon satırı; stil yalnızca ESC/POS çıktısını etkiler"""
+    metin: str
+    stil: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Bolum:
+    """degerler[ad] listesindeki her eleman için tekrarlanan satırlar"""
+    ad: str
+    ogeler: Tuple[Union[Satir, 'Bolum'], ...]
+
+
+# Derlenmiş parça: (metin, bayt) sabit parça veya (None, alan_adi, bicim)
+_Parca = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class _DerlenmisSatir:
+    parcalar: Tuple[_Parca, ...]
+    on_ek: bytes
+    son_ek: bytes
+
+
+@dataclass(frozen=True)
+class _DerlenmisBolum:
+    ad: str
+    ogeler: Tuple[Union[_DerlenmisSatir, '_DerlenmisBolum'], ...]
+
+
+class DerlenmisSablon:
+    """
+    Derlenmiş fiş şablonu
+
+    Thread-safe'tir; durum tutmaz, modül düzeyinde bir kez oluşturulup
+    paylaşılır.
+    """
+
+    def __init__(self, ogeler: Tuple[Union[_DerlenmisSatir, _DerlenmisBolum], ...],
+                 kodlama: str):
+        self._ogeler = ogeler
+        self._kodlama = kodlama
+
+    def metin_uret(self, degerler: Mapping[str, Any]) -> str:
+        """
+        Şablonu düz metin olarak üretir (satırlar '\\n' ile birleşir)
+
+        Args:
+            degerler: Alan değerleri ve bölüm listeleri
+        """
+        satirlar: List[str] = []
+        self._metin_satirlari(self._ogeler, degerler, satirlar)
+        return '\n'.join(satirlar)
+
+    def escpos_uret(self, degerler: Mapping[str, Any], kes: bool = True) -> bytes:
+        """
+        Şablonu yazıcıya gönderilecek ESC/POS bayt dizisi olarak üretir
+
+        Args:
+            degerler: Alan değerleri ve bölüm listeleri
+            kes: Sonda kağıt beslenip kesilsin mi
+        """
+        parcalar: List[bytes] = [ESC_BASLAT, ESC_KOD_SAYFASI_PC857]
+        self._bayt_satirlari(self._ogeler, degerler, parcalar)
+        if kes:
+            parcalar.append(ESC_BESLE_VE_KES)
+        return b''.join(parcalar)
+
+    def _metin_satirlari(self, ogeler, degerler: Mapping[str, Any], cikti: List[str]) -> None:
+        for oge in ogeler:
+            if isinstance(oge, _DerlenmisBolum):
+                for eleman in degerler.get(oge.ad) or ():
+                    self._metin_satirlari(oge.ogeler, ChainMap(eleman, degerler), cikti)
+                continue
+            cikti.append(''.join(
+                parca[0] if parca[0] is not None else format(degerler[parca[1]], parca[2])
+                for parca in oge.parcalar
+            ))
+
+    def _bayt_satirlari(self, ogeler, degerler: Mapping[str, Any], cikti: List[bytes]) -> None:
+        kodlama = self._kodlama
+        for oge in ogeler:
+            if isinstance(oge, _DerlenmisBolum):
+                for eleman in degerler.get(oge.ad) or ():
+                    self._bayt_satirlari(oge.ogeler, ChainMap(eleman, degerler), cikti)
+                continue
+            cikti.append(oge.on_ek)
+            for parca in oge.parcalar:
+                if parca[0] is not None:
+                    cikti.append(parca[1])
+                else:
+                    cikti.append(format(degerler[parca[1]], parca[2]).encode(kodlama, 'replace'))
+            cikti.append(oge.son_ek)
+            cikti.append(b'\n')
+
+
+def sablon_derle(ogeler: Sequence[Union[Satir, Bolum]],
+                 kodlama: str = VARSAYILAN_KODLAMA) -> DerlenmisSablon:
+    """
+    Şablon tanımını derler
+
+    Args:
+        ogeler: Satir ve Bolum listesi
+        kodlama: Yazıcı kod sayfasının Python kodlaması
+
+    Returns:
+        DerlenmisSablon: Tekrar tekrar kullanılabilir derlenmiş şablon
+
+    Raises:
+        DogrulamaHatasi: Bilinmeyen stil veya desteklenmeyen alan sözdizimi
+    """
+    return DerlenmisSablon(tuple(_oge_derle(oge, kodlama) for oge in ogeler), kodlama)
+
+
+def metni_escpos_yap(metin: str, kodlama: str = VARSAYILAN_KODLAMA) -> bytes:
+    """Hazır fiş metnini ESC/POS çerçevesine alır (başlatma, kod sayfası, kesim)"""
+    return (ESC_BASLAT + ESC_KOD_SAYFASI_PC857 + metin.encode(kodlama, 'replace')
+            + b'\n' + ESC_BESLE_VE_KES)
+
+
+def _oge_derle(oge: Union[Satir, Bolum], kodlama: str):
+    if isinstance(oge, Bolum):
+        return _DerlenmisBolum(oge.ad, tuple(_oge_derle(alt, kodlama) for alt in oge.ogeler))
+
+    if oge.stil is not None and oge.stil not in _STILLER:
+        raise DogrulamaHatasi("fis_sablonu", f"Bilinmeyen satır stili: {oge.stil}")
+    on_ek, son_ek = _STILLER.get(oge.stil, (b'', b''))
+
+    parcalar: List[_Parca] = []
+    for sabit, alan, bicim, donusum in Formatter().parse(oge.metin):
+        if sabit:
+            parcalar.append((sabit, sabit.encode(kodlama, 'replace')))
+        if alan is None:
+            continue
+        if not alan or donusum or '{' in (bicim or ''):
+            raise DogrulamaHatasi("fis_sablonu", f"Desteklenmeyen alan sözdizimi: {oge.metin}")
+        parcalar.append((None, alan, bicim or ''))
+    return _DerlenmisSatir(tuple(parcalar), on_ek, son_ek)
@@ -0,0 +1,356 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: pos.yazdirma.yazici_kuyrugu
+# Description: Yazıcı başına arka plan fiş kuyruğu (dosya destekli)
+# Changelog:
+# - İlk oluşturma
+
+"""
+Yazıcı Kuyruğu
+
+Her fiş yazıcısı için bir arka plan thread'i ve FIFO kuyruk tutulur.
+Satış hattı fişi kuyruğa ekleyip hemen döner; yavaş veya sıkışmış yazıcı
+kasayı bekletmez.
+
+- İş kuyruğa alınmadan önce kuyruk klasörüne atomik yazılır (geçici dosya,
+  fsync, os.replace); süreç çökerse bir sonraki açılışta kaldığı yerden
+  yazdırılır. Başarıyla yazdırılan işin dosyası silinir.
+- Yazdırma hatasında iş düşürülmez; bekleme her denemede ikiye katlanarak
+  (azami_bekleme ile sınırlı) aynı iş yeniden denenir, sıra korunur.
+- Durum değişiklikleri (KUYRUKTA, YAZDIRILIYOR, YAZDIRILDI, HATA)
+  dinleyicilere bildirilir. Dinleyiciler kuyruk thread'inde çağrılır; UI
+  tarafı Qt sinyaliyle ana thread'e aktarmalıdır.
+"""
+
+import atexit
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional
+
+from sontechsp.uygulama.moduller.pos.hatalar import YazdirmaHatasi
+from sontechsp.uygulama.moduller.pos.monitoring import get_pos_monitoring
+from sontechsp.uygulama.cekirdek.ayarlar import ayar_al
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi
+
+VARSAYILAN_YAZICI = 'varsayilan'
+
+_IS_UZANTISI = '.fis'
+_GECICI_UZANTI = '.tmp'
+
+
+class YazdirmaDurumu(Enum):
+    """Yazdırma işi durumları"""
+    KUYRUKTA = "kuyrukta"
+    YAZDIRILIYOR = "yazdiriliyor"
+    YAZDIRILDI = "yazdirildi"
+    HATA = "hata"
+
+
+@dataclass
+class YazdirmaIsi:
+    """Kuyruktaki yazdırma işi"""
+    is_id: str
+    yazici_adi: str
+    veri: bytes
+    etiket: str = ''
+    durum: YazdirmaDurumu = YazdirmaDurumu.KUYRUKTA
+    deneme_sayisi: int = 0
+    son_hata: Optional[str] = None
+    dosya_yolu: Optional[str] = None
+    geri_cagirim: Optional[Callable[['YazdirmaIsi'], None]] = None
+
+
+# Yazıcıya bayt gönderen fonksiyon; False dönmesi veya hata fırlatması başarısızlıktır
+Gonderici = Callable[[bytes], Optional[bool]]
+DurumDinleyicisi = Callable[[YazdirmaIsi], None]
+
+
+class YaziciKuyrugu:
+    """
+    Tek yazıcının fiş kuyruğu
+
+    İşler tek arka plan thread'inde eklenme sırasıyla yazdırılır.
+    """
+
+    def __init__(self, yazici_adi: str, gonderici: Gonderici,
+                 kuyruk_klasoru: Optional[str] = None,
+                 ilk_bekleme: float = 0.5,
+                 azami_bekleme: float = 30.0,
+                 arka_planda_yazdir: bool = True):
+        """
+        Kuyruğu başlatır, klasörde kalan işleri sıraya geri alır
+
+        Args:
+            yazici_adi: Yazıcı adı
+            gonderici: Bayt dizisini yazıcıya gönderen fonksiyon
+            kuyruk_klasoru: İşlerin kalıcı tutulduğu klasör (None ise yalnızca bellek)
+            ilk_bekleme: İlk hatadan sonra yeniden deneme beklemesi (saniye)
+            azami_bekleme: Yeniden deneme beklemesi üst sınırı (saniye)
+            arka_planda_yazdir: False ise yalnızca bekleyenleri_yazdir çağrısında yazdırılır
+        """
+        self.yazici_adi = yazici_adi
+        self._gonderici = gonderici
+        self._klasor = kuyruk_klasoru
+        self._ilk_bekleme = ilk_bekleme
+        self._azami_bekleme = azami_bekleme
+        self._logger = logging.getLogger(__name__)
+        self._monitoring = get_pos_monitoring()
+
+        self._isler: Deque[YazdirmaIsi] = deque()
+        self._dinleyiciler: List[DurumDinleyicisi] = []
+        self._sayac = itertools.count(1)
+        self._kosul = threading.Condition()
+        self._yazdirma_kilidi = threading.Lock()
+        self._durdur = threading.Event()
+
+        if self._klasor:
+            os.makedirs(self._klasor, exist_ok=True)
+            self._kalan_isleri_yukle()
+
+        self._yazici: Optional[threading.Thread] = None
+        if arka_planda_yazdir:
+            self._yazici = threading.Thread(
+                target=self._yazici_dongusu, name=f"fis-yazici-{yazici_adi}", daemon=True
+            )
+            self._yazici.start()
+
+    def durum_dinleyicisi_ekle(self, dinleyici: DurumDinleyicisi) -> None:
+        """Tüm işlerin durum değişikliklerini alacak dinleyici ekler"""
+        with self._kosul:
+            self._dinleyiciler.append(dinleyici)
+
+    def is_ekle(self, veri: bytes, etiket: str = '',
+                geri_cagirim: Optional[Callable[[YazdirmaIsi], None]] = None) -> str:
+        """
+        İşi kalıcı olarak kuyruğa ekler ve hemen döner
+
+        Args:
+            veri: Yazıcıya gidecek ESC/POS bayt dizisi
+            etiket: İzleme için kısa açıklama (ör. fiş numarası)
+            geri_cagirim: Yalnızca bu işin durum değişikliklerinde çağrılır
+
+        Returns:
+            str: İş kimliği
+
+        Raises:
+            DogrulamaHatasi: Veri boşsa
+            YazdirmaHatasi: İş kuyruk klasörüne yazılamazsa
+        """
+        if not veri:
+            raise DogrulamaHatasi("yazdirma_isi", "Yazdırılacak veri boş olamaz")
+
+        is_id = f"{time.time_ns():020d}-{next(self._sayac):06d}"
+        etiket = ' '.join(etiket.split())
+        isi = YazdirmaIsi(is_id, self.yazici_adi, veri, etiket, geri_cagirim=geri_cagirim)
+        if self._klasor:
+            isi.dosya_yolu = self._isi_diske_yaz(isi)
+
+        with self._kosul:
+            self._isler.append(isi)
+            self._kosul.notify()
+        self._durum_bildir(isi)
+        return is_id
+
+    def bekleyen_is_sayisi(self) -> int:
+        """Henüz yazdırılmamış iş sayısı"""
+        with self._kosul:
+            return len(self._isler)
+
+    def bekleyenleri_yazdir(self) -> int:
+        """
+        Bekleyen işleri çağıran thread'de sırayla yazdırır
+
+        İlk hatada durur (iş kuyrukta kalır).
+
+        Returns:
+            int: Yazdırılan iş sayısı
+        """
+        yazdirilan = 0
+        while True:
+            with self._kosul:
+                if not self._isler:
+                    return yazdirilan
+                isi = self._isler[0]
+            if not self._isi_yazdir(isi):
+                return yazdirilan
+            yazdirilan += 1
+
+    def kapat(self, zaman_asimi: float = 5.0) -> None:
+        """Arka plan thread'ini durdurur; bekleyen işler klasörde kalır"""
+        self._durdur.set()
+        with self._kosul:
+            self._kosul.notify_all()
+        if self._yazici is not None and self._yazici.is_alive():
+            self._yazici.join(timeout=zaman_asimi)
+
+    # Yardımcılar
+
+    def _isi_yazdir(self, isi: YazdirmaIsi) -> bool:
+        """İşi bir kez yazdırmayı dener; başarılıysa kuyruktan ve diskten siler"""
+        with self._yazdirma_kilidi:
+            with self._kosul:
+                if not self._isler or self._isler[0] is not isi:
+                    # Diğer thread bu işi yazdırmayı bitirdi
+                    return True
+            isi.durum = YazdirmaDurumu.YAZDIRILIYOR
+            isi.deneme_sayisi += 1
+            self._durum_bildir(isi)
+
+            baslangic = time.perf_counter()
+            try:
+                if self._gonderici(isi.veri) is False:
+                    raise YazdirmaHatasi("Yazıcı işi kabul etmedi", self.yazici_adi)
+            except Exception as e:
+                isi.durum = YazdirmaDurumu.HATA
+                isi.son_hata = str(e)
+                self._monitoring.sure_kaydet(
+                    "fis_yazdirma", time.perf_counter() - baslangic, basarili=False,
+                    yazici=self.yazici_adi
+                )
+                self._logger.error(
+                    f"Fiş yazdırılamadı ({self.yazici_adi}, {isi.etiket or isi.is_id}, "
+                    f"deneme {isi.deneme_sayisi}): {str(e)}"
+                )
+                self._durum_bildir(isi)
+                return False
+
+            self._monitoring.sure_kaydet(
+                "fis_yazdirma", time.perf_counter() - baslangic, yazici=self.yazici_adi
+            )
+            with self._kosul:
+                if self._isler and self._isler[0] is isi:
+                    self._isler.popleft()
+            if isi.dosya_yolu:
+                try:
+                    os.remove(isi.dosya_yolu)
+                except OSError as e:
+                    # Dosya kalırsa sonraki açılışta fiş ikinci kez basılır
+                    self._logger.error(f"Yazdırılan fiş kuyruk dosyası silinemedi: {str(e)}")
+            isi.durum = YazdirmaDurumu.YAZDIRILDI
+            isi.son_hata = None
+            self._durum_bildir(isi)
+            return True
+
+    def _yazici_dongusu(self) -> None:
+        """
+        Arka plan yazıcısı: kuyruk başındaki işi yazdırır
+
+        Hata durumunda bekleme her denemede ikiye katlanır, azami_bekleme ile
+        sınırlanır ve ilk başarılı yazdırmada sıfırlanır.
+        """
+        bekleme = self._ilk_bekleme
+        while not self._durdur.is_set():
+            with self._kosul:
+                while not self._isler and not self._durdur.is_set():
+                    self._kosul.wait()
+                if self._durdur.is_set():
+                    break
+                isi = self._isler[0]
+
+            if self._isi_yazdir(isi):
+                bekleme = self._ilk_bekleme
+                continue
+
+            if self._durdur.wait(bekleme):
+                break
+            bekleme = min(max(bekleme, 0.1) * 2, self._azami_bekleme)
+
+    def _durum_bildir(self, isi: YazdirmaIsi) -> None:
+        with self._kosul:
+            dinleyiciler = list(self._dinleyiciler)
+        if isi.geri_cagirim is not None:
+            dinleyiciler.append(isi.geri_cagirim)
+        for dinleyici in dinleyiciler:
+            try:
+                dinleyici(isi)
+            except Exception as e:
+                self._logger.error(f"Yazdırma durum dinleyicisi hatası: {str(e)}")
+
+    def _isi_diske_yaz(self, isi: YazdirmaIsi) -> str:
+        """İşi etiket satırı + veri olarak atomik yazar"""
+        dosya_yolu = os.path.join(self._klasor, isi.is_id + _IS_UZANTISI)
+        gecici_yol = dosya_yolu + _GECICI_UZANTI
+        try:
+            with open(gecici_yol, 'wb') as f:
+                f.write(isi.etiket.encode('utf-8') + b'\n' + isi.veri)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(gecici_yol, dosya_yolu)
+        except OSError as e:
+            raise YazdirmaHatasi(f"Fiş kuyruğa yazılamadı: {str(e)}", self.yazici_adi)
+        return dosya_yolu
+
+    def _kalan_isleri_yukle(self) -> None:
+        """Önceki çalışmadan kalan işleri isim (eklenme) sırasıyla kuyruğa alır"""
+        dosyalar = sorted(os.listdir(self._klasor))
+        for dosya_adi in dosyalar:
+            dosya_yolu = os.path.join(self._klasor, dosya_adi)
+            if dosya_adi.endswith(_GECICI_UZANTI):
+                # Yarım kalmış yazım; iş kuyruğa hiç alınmamıştı
+                os.remove(dosya_yolu)
+                continue
+            if not dosya_adi.endswith(_IS_UZANTISI):
+                continue
+            with open(dosya_yolu, 'rb') as f:
+                etiket, _, veri = f.read().partition(b'\n')
+            self._isler.append(YazdirmaIsi(
+                dosya_adi[:-len(_IS_UZANTISI)], self.yazici_adi, veri,
+                etiket.decode('utf-8', 'replace'), dosya_yolu=dosya_yolu
+            ))
+        if self._isler:
+            self._logger.info(
+                f"{len(self._isler)} yazdırılmamış fiş kuyruğa geri alındı ({self.yazici_adi})"
+            )
+
+
+def cihaz_gonderici(cihaz_yolu: str) -> Gonderici:
+    """
+    Bayt dizisini yazıcı cihazına/paylaşımına yazan gönderici
+
+    Args:
+        cihaz_yolu: Ör. /dev/usb/lp0 veya \\\\sunucu\\yazici
+    """
+    def gonder(veri: bytes) -> bool:
+        with open(cihaz_yolu, 'wb', buffering=0) as cihaz:
+            cihaz.write(veri)
+        return True
+    return gonder
+
+
+_yazici_kuyruklari: Dict[str, YaziciKuyrugu] = {}
+_yazici_kuyruklari_kilidi = threading.Lock()
+
+
+def yazici_kuyrugu_al(yazici_adi: Optional[str] = None,
+                      gonderici: Optional[Gonderici] = None) -> YaziciKuyrugu:
+    """
+    Süreç genelinde yazıcı başına tek kuyruk döndürür
+
+    İlk çağrıda kuyruk oluşturulur. Gönderici verilmezse FIS_YAZICI_CIHAZI
+    ayarındaki cihaza yazılır; kuyruk klasörü FIS_KUYRUK_KLASORU ayarının
+    (varsayılan veri/fis_kuyrugu) altında yazıcı adıyla açılır.
+
+    Raises:
+        YazdirmaHatasi: Gönderici verilmemiş ve cihaz ayarı yoksa
+    """
+    yazici_adi = yazici_adi or VARSAYILAN_YAZICI
+    with _yazici_kuyruklari_kilidi:
+        kuyruk = _yazici_kuyruklari.get(yazici_adi)
+        if kuyruk is None:
+            if gonderici is None:
+                cihaz_yolu = ayar_al('FIS_YAZICI_CIHAZI')
+                if not cihaz_yolu:
+                    raise YazdirmaHatasi("Fiş yazıcısı cihazı tanımlı değil", yazici_adi)
+                gonderici = cihaz_gonderici(cihaz_yolu)
+            klasor = os.path.join(ayar_al('FIS_KUYRUK_KLASORU', os.path.join('veri', 'fis_kuyrugu')),
+                                  yazici_adi)
+            kuyruk = YaziciKuyrugu(yazici_adi, gonderici, kuyruk_klasoru=klasor)
+            _yazici_kuyruklari[yazici_adi] = kuyruk
+            atexit.register(kuyruk.kapat)
+        return kuyruk
@@ -1,11 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: raporlar.dto
 # Description: Raporlama modülü veri transfer nesneleri
 # Changelog:
 # - İlk oluşturma
 # - TarihAraligiDTO, SatisOzetiDTO, UrunPerformansDTO, KritikStokDTO eklendi
 # - RaporSatirDTO, DisariAktarDTO eklendi
+# - StokDonemHareketiDTO eklendi (tarihteki stok ve dönem hareketleri)
 
 """
 SONTECHSP Raporlar DTO Katmanı
@@ -15,6 +16,7 @@ Bu modül raporlama sisteminin veri transfer nesnelerini içerir:
 - Satış özeti DTO'su
 - Ürün performans DTO'su
 - Kritik stok DTO'su
+- Stok dönem hareketi DTO'su
 - Rapor satır DTO'su
 - Dışa aktarım DTO'su
 
@@ -34,6 +36,8 @@ class RaporTuru(Enum):
     KRITIK_STOK = "kritik_stok"
     EN_COK_SATAN = "en_cok_satan"
     KARLILIK = "karlilik"
+    TARIHTEKI_STOK = "tarihteki_stok"
+    STOK_DONEM_HAREKETI = "stok_donem_hareketi"
 
 
 class DisariAktarFormat(Enum):
@@ -109,6 +113,23 @@ class KritikStokDTO:
             raise ValueError("Ürün adı boş olamaz")
 
 
+@dataclass
+class StokDonemHareketiDTO:
+    """Ürün bazında dönem açılış/giriş/çıkış/kapanış veri transfer nesnesi"""
+    urun_id: int
+    acilis: Decimal
+    giris: Decimal
+    cikis: Decimal
+    kapanis: Decimal
+    
+    def __post_init__(self):
+        """Stok dönem hareketi doğrulaması"""
+        if self.urun_id <= 0:
+            raise ValueError("Ürün ID pozitif olmalıdır")
+        if self.giris < 0 or self.cikis < 0:
+            raise ValueError("Giriş ve çıkış miktarları negatif olamaz")
+
+
 @dataclass
 class RaporSatirDTO:
     """Genel rapor satır veri transfer nesnesi"""
@@ -1,5 +1,5 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: raporlar.servisler.rapor_servisi
 # Description: Raporlama modülü ana servis sınıfı
 # Changelog:
@@ -7,6 +7,7 @@
 # - RaporServisi sınıfı eklendi
 # - Tüm rapor metodları eklendi
 # - Hata yönetimi ve loglama eklendi
+# - Tarihteki stok ve stok dönem hareketleri raporları eklendi
 
 """
 SONTECHSP Raporlar Ana Servis
@@ -16,6 +17,7 @@ Bu modül raporlama sisteminin ana servis sınıfını içerir:
 - Kritik stok servisi
 - En çok satan ürünler servisi
 - Karlılık servisi (MVP placeholder)
+- Tarihteki stok ve stok dönem hareketleri servisi
 - Dışa aktarım servisi
 
 Tüm iş mantığı bu katmanda uygulanır.
@@ -23,16 +25,20 @@ Tüm iş mantığı bu katmanda uygulanır.
 
 import logging
 import time
+from datetime import datetime
 from typing import List, Optional, Any, Dict
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..dto import (
     TarihAraligiDTO, SatisOzetiDTO, UrunPerformansDTO, 
-    KritikStokDTO, RaporSatirDTO, DisariAktarDTO
+    KritikStokDTO, RaporSatirDTO, DisariAktarDTO, StokDonemHareketiDTO
 )
 from ..sabitler import RaporSabitleri, HataMesajlari, LogMesajlari
-from ..sorgular import satis_ozeti, kritik_stok_listesi, en_cok_satan_urunler, karlilik_ozeti
+from ..sorgular import (
+    satis_ozeti, kritik_stok_listesi, en_cok_satan_urunler, karlilik_ozeti,
+    tarihteki_stok_listesi, stok_donem_hareketleri
+)
 from ..disari_aktarim import disari_aktar, DosyaIslemHatasi
 from ....veritabani.baglanti import get_readonly_session
 
@@ -348,6 +354,113 @@ class RaporServisi:
             self.logger.error(hata_mesaji)
             raise
     
+    def tarihteki_stok_al(self, magaza_id: int, tarih: datetime,
+                          depo_id: Optional[int] = None) -> List[Dict]:
+        """
+        Verilen andaki ürün bazında stok miktarlarını alır
+        
+        Args:
+            magaza_id: Mağaza ID
+            tarih: Stok anı
+            depo_id: Opsiyonel depo ID filtresi
+            
+        Returns:
+            List[Dict]: urun_id, miktar listesi
+            
+        Raises:
+            ParametreHatasi: Geçersiz parametre
+            VeriTabaniHatasi: Veritabanı hatası
+        """
+        baslangic_zamani = time.time()
+        
+        try:
+            # Parametre doğrulaması
+            self._parametre_dogrula(magaza_id=magaza_id, depo_id=depo_id)
+            
+            self.logger.info(LogMesajlari.RAPOR_BASLATILDI.format("tarihteki_stok", magaza_id))
+            
+            # Veritabanı oturumu al
+            session = self._session_al()
+            
+            try:
+                # Sorguyu çalıştır
+                sonuclar = tarihteki_stok_listesi(session, magaza_id, tarih, depo_id)
+                
+                # Performans loglaması
+                gecen_sure = (time.time() - baslangic_zamani) * 1000
+                self.logger.info(LogMesajlari.RAPOR_TAMAMLANDI.format("tarihteki_stok", gecen_sure))
+                
+                return sonuclar
+                
+            finally:
+                session.close()
+                
+        except (ParametreHatasi, VeriTabaniHatasi):
+            raise
+        except SQLAlchemyError as e:
+            hata_mesaji = HataMesajlari.SORGU_HATASI.format(str(e))
+            self.logger.error(hata_mesaji)
+            raise VeriTabaniHatasi(hata_mesaji)
+        except Exception as e:
+            hata_mesaji = HataMesajlari.BEKLENMEYEN_HATA.format(str(e))
+            self.logger.error(hata_mesaji)
+            raise
+    
+    def stok_donem_hareketleri_al(self, magaza_id: int, tarih_araligi: TarihAraligiDTO,
+                                  depo_id: Optional[int] = None) -> List[StokDonemHareketiDTO]:
+        """
+        Ürün bazında dönem açılış, giriş, çıkış ve kapanış miktarlarını alır
+        
+        Args:
+            magaza_id: Mağaza ID
+            tarih_araligi: Tarih aralığı
+            depo_id: Opsiyonel depo ID filtresi
+            
+        Returns:
+            List[StokDonemHareketiDTO]: Dönem hareket listesi
+            
+        Raises:
+            ParametreHatasi: Geçersiz parametre
+            VeriTabaniHatasi: Veritabanı hatası
+        """
+        baslangic_zamani = time.time()
+        
+        try:
+            # Parametre doğrulaması
+            self._parametre_dogrula(magaza_id=magaza_id, depo_id=depo_id)
+            
+            self.logger.info(LogMesajlari.RAPOR_BASLATILDI.format("stok_donem_hareketi", magaza_id))
+            
+            # Veritabanı oturumu al
+            session = self._session_al()
+            
+            try:
+                # Sorguyu çalıştır
+                sonuclar = stok_donem_hareketleri(session, magaza_id, tarih_araligi, depo_id)
+                
+                # DTO listesine çevir
+                donem_hareketleri = [StokDonemHareketiDTO(**sonuc) for sonuc in sonuclar]
+                
+                # Performans loglaması
+                gecen_sure = (time.time() - baslangic_zamani) * 1000
+                self.logger.info(LogMesajlari.RAPOR_TAMAMLANDI.format("stok_donem_hareketi", gecen_sure))
+                
+                return donem_hareketleri
+                
+            finally:
+                session.close()
+                
+        except (ParametreHatasi, VeriTabaniHatasi):
+            raise
+        except SQLAlchemyError as e:
+            hata_mesaji = HataMesajlari.SORGU_HATASI.format(str(e))
+            self.logger.error(hata_mesaji)
+            raise VeriTabaniHatasi(hata_mesaji)
+        except Exception as e:
+            hata_mesaji = HataMesajlari.BEKLENMEYEN_HATA.format(str(e))
+            self.logger.error(hata_mesaji)
+            raise
+    
     def disari_aktar(self, rapor_turu: str, veri: Any, disari_aktar_dto: DisariAktarDTO) -> str:
         """
         Raporu dışa aktarır
@@ -1,5 +1,5 @@
 # Version: 0.1.0
-# Last Update: 2024-12-17
+# Last Update: 2026-10-17
 # Module: raporlar.sorgular
 # Description: Raporlama modülü optimize edilmiş veritabanı sorguları
 # Changelog:
@@ -8,6 +8,8 @@
 # - Kritik stok sorgusu eklendi
 # - En çok satan ürünler sorgusu eklendi
 # - Karlılık sorgusu placeholder eklendi
+# - Tarihteki stok ve stok dönem hareketleri sorguları eklendi (görüntü + delta)
+# - Görüntü + delta okuması stok repository yerine SQL ile yapılıyor
 
 """
 SONTECHSP Raporlar Sorgu Katmanı
@@ -17,15 +19,17 @@ Bu modül raporlama sisteminin optimize edilmiş veritabanı sorgularını içer
 - Kritik stok sorguları
 - Ürün performans sorguları
 - Karlılık sorguları (MVP placeholder)
+- Tarihteki stok ve stok dönem hareketi sorguları
 
 Tüm sorgular salt okunur oturum kullanır ve performans optimizasyonu içerir.
 """
 
 import logging
 import time
+from datetime import datetime, time as gun_saati, timedelta
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func
+from sqlalchemy import DateTime, bindparam, text, func
 from decimal import Decimal
 
 from .dto import TarihAraligiDTO
@@ -275,4 +279,173 @@ def karlilik_ozeti(session: Session, magaza_id: int, tarih_araligi: TarihAraligi
         
     except Exception as e:
         logger.error(f"Karlılık özeti sorgu hatası: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+# Verilen andaki stok: en yakın dönem sonu görüntüsü + görüntüden sonraki
+# hareketler. Görüntü hiç yoksa hareket geçmişinin tamamı toplanır.
+_TARIHTEKI_STOK_SORGUSU = """
+    WITH taban AS (
+        SELECT donem_tipi, donem_sonu
+        FROM stok_bakiye_anlik_goruntu
+        WHERE donem_sonu <= :tarih
+        ORDER BY donem_sonu DESC, donem_tipi
+        LIMIT 1
+    )
+    SELECT k.urun_id, SUM(k.miktar) as miktar
+    FROM (
+        SELECT g.urun_id, g.miktar
+        FROM stok_bakiye_anlik_goruntu g
+        INNER JOIN taban t ON g.donem_tipi = t.donem_tipi AND g.donem_sonu = t.donem_sonu
+        WHERE g.magaza_id = :magaza_id {goruntu_depo}
+        UNION ALL
+        SELECT h.urun_id, h.miktar
+        FROM stok_hareketleri h
+        WHERE h.magaza_id = :magaza_id {hareket_depo}
+          AND h.olusturma_tarihi < :tarih
+          AND (NOT EXISTS (SELECT 1 FROM taban)
+               OR h.olusturma_tarihi >= (SELECT donem_sonu FROM taban))
+    ) k
+    GROUP BY k.urun_id
+    HAVING SUM(k.miktar) <> 0
+    ORDER BY k.urun_id
+"""
+
+
+def _tarihteki_stok(session: Session, magaza_id: int, tarih: datetime,
+                    depo_id: Optional[int] = None) -> Dict[int, Decimal]:
+    """Görüntü + delta ile urun_id -> miktar (sıfırlar hariç)"""
+    parametreler = {'magaza_id': magaza_id, 'tarih': tarih}
+    goruntu_depo = hareket_depo = ""
+    
+    # Depo filtresi ekle
+    if depo_id is not None:
+        goruntu_depo = "AND g.depo_id = :depo_id"
+        hareket_depo = "AND h.depo_id = :depo_id"
+        parametreler['depo_id'] = depo_id
+    
+    sorgu = text(_TARIHTEKI_STOK_SORGUSU.format(
+        goruntu_depo=goruntu_depo, hareket_depo=hareket_depo
+    )).bindparams(bindparam('tarih', type_=DateTime(timezone=True)))
+    
+    return {
+        int(row.urun_id): Decimal(str(row.miktar))
+        for row in session.execute(sorgu, parametreler)
+    }
+
+
+def tarihteki_stok_listesi(session: Session, magaza_id: int, tarih: datetime,
+                           depo_id: Optional[int] = None) -> List[Dict]:
+    """
+    Verilen andaki ürün bazında stok miktarları sorgusu
+    
+    En yakın dönem sonu görüntüsü + görüntüden sonraki hareketler okunur;
+    hareket geçmişinin tamamı taranmaz. Sıfır bakiyeli ürünler listelenmez.
+    
+    Args:
+        session: Salt okunur veritabanı oturumu
+        magaza_id: Mağaza ID
+        tarih: Stok anı
+        depo_id: Opsiyonel depo ID filtresi
+        
+    Returns:
+        List[Dict]: urun_id, miktar listesi
+        
+    Raises:
+        Exception: Sorgu hatası durumunda
+    """
+    baslangic_zamani = time.time()
+    
+    try:
+        miktarlar = _tarihteki_stok(session, magaza_id, tarih, depo_id)
+        
+        # Performans loglaması
+        gecen_sure = (time.time() - baslangic_zamani) * 1000
+        if gecen_sure > RaporSabitleri.YAVAS_SORGU_ESIGI_SANIYE * 1000:
+            logger.warning(LogMesajlari.YAVAS_SORGU_UYARISI.format(gecen_sure, "tarihteki_stok_listesi"))
+        
+        return [{'urun_id': urun_id, 'miktar': miktar} for urun_id, miktar in miktarlar.items()]
+        
+    except Exception as e:
+        logger.error(f"Tarihteki stok sorgu hatası: {e}")
+        raise
+
+
+def stok_donem_hareketleri(session: Session, magaza_id: int, tarih_araligi: TarihAraligiDTO,
+                           depo_id: Optional[int] = None) -> List[Dict]:
+    """
+    Ürün bazında dönem açılış, giriş, çıkış ve kapanış sorgusu
+    
+    Dönem, başlangıç gününün başından bitiş gününün sonuna kadardır (yerel
+    saat). Açılış görüntü + delta ile, giriş/çıkış yalnızca dönem
+    hareketlerinden hesaplanır.
+    
+    Args:
+        session: Salt okunur veritabanı oturumu
+        magaza_id: Mağaza ID
+        tarih_araligi: Tarih aralığı DTO
+        depo_id: Opsiyonel depo ID filtresi
+        
+    Returns:
+        List[Dict]: urun_id, acilis, giris, cikis, kapanis listesi
+        
+    Raises:
+        Exception: Sorgu hatası durumunda
+    """
+    baslangic_zamani = time.time()
+    
+    try:
+        baslangic = datetime.combine(tarih_araligi.baslangic_tarihi, gun_saati.min).astimezone()
+        bitis = datetime.combine(tarih_araligi.bitis_tarihi + timedelta(days=1), gun_saati.min).astimezone()
+        acilislar = _tarihteki_stok(session, magaza_id, baslangic, depo_id)
+        
+        sorgu_metni = """
+            SELECT 
+                h.urun_id,
+                SUM(CASE WHEN h.miktar > 0 THEN h.miktar ELSE 0 END) as giris,
+                SUM(CASE WHEN h.miktar < 0 THEN -h.miktar ELSE 0 END) as cikis
+            FROM stok_hareketleri h
+            WHERE h.magaza_id = :magaza_id
+                AND h.olusturma_tarihi >= :baslangic
+                AND h.olusturma_tarihi < :bitis
+        """
+        
+        parametreler = {'magaza_id': magaza_id, 'baslangic': baslangic, 'bitis': bitis}
+        
+        # Depo filtresi ekle
+        if depo_id is not None:
+            sorgu_metni += " AND h.depo_id = :depo_id"
+            parametreler['depo_id'] = depo_id
+        
+        sorgu_metni += " GROUP BY h.urun_id"
+        
+        sorgu = text(sorgu_metni).bindparams(
+            bindparam('baslangic', type_=DateTime(timezone=True)),
+            bindparam('bitis', type_=DateTime(timezone=True))
+        )
+        hareketler = {
+            int(row.urun_id): (Decimal(str(row.giris)), Decimal(str(row.cikis)))
+            for row in session.execute(sorgu, parametreler)
+        }
+        
+        # Performans loglaması
+        gecen_sure = (time.time() - baslangic_zamani) * 1000
+        if gecen_sure > RaporSabitleri.YAVAS_SORGU_ESIGI_SANIYE * 1000:
+            logger.warning(LogMesajlari.YAVAS_SORGU_UYARISI.format(gecen_sure, "stok_donem_hareketleri"))
+        
+        sonuclar = []
+        for urun_id in sorted(set(acilislar) | set(hareketler)):
+            acilis = acilislar.get(urun_id, Decimal('0'))
+            giris, cikis = hareketler.get(urun_id, (Decimal('0'), Decimal('0')))
+            sonuclar.append({
+                'urun_id': urun_id,
+                'acilis': acilis,
+                'giris': giris,
+                'cikis': cikis,
+                'kapanis': acilis + giris - cikis
+            })
+        return sonuclar
+        
+    except Exception as e:
+        logger.error(f"Stok dönem hareketleri sorgu hatası: {e}")
+        raise
@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2024-12-15
+# Last Update: 2026-10-17
 # Module: stok.depolar
 # Description: Stok modülü repository katmanı
 # Changelog:
 # - İlk oluşturma
+# - Stok rezervasyon repository eklendi
+# - Stok sayım repository eklendi
+# - Stok anlık görüntü repository eklendi
+# - Stok transfer repository eklendi
 
 """
 SONTECHSP Stok Repository Katmanı
@@ -26,22 +30,42 @@ from .arayuzler import (
     IUrunRepository,
     IBarkodRepository, 
     IStokHareketRepository,
-    IStokBakiyeRepository
+    IStokBakiyeRepository,
+    IStokRezervasyonRepository,
+    IStokSayimRepository,
+    IStokAnlikGoruntuRepository,
+    IStokTransferRepository
 )
 from .urun_repository import UrunRepository
 from .barkod_repository import BarkodRepository
 from .stok_hareket_repository import StokHareketRepository
 from .stok_bakiye_repository import StokBakiyeRepository
+from .stok_rezervasyon_repository import StokRezervasyonRepository
+from .stok_sayim_repository import StokSayimRepository
+from .stok_anlik_goruntu_repository import StokAnlikGoruntuRepository
+from .stok_transfer_repository import StokTransferRepository
+from .barkod_indeksi import BarkodIndeksi, barkod_indeksi_al, barkod_indeksi_baslat
 
 __all__ = [
     'IUrunRepository',
     'IBarkodRepository',
     'IStokHareketRepository', 
     'IStokBakiyeRepository',
+    'IStokRezervasyonRepository',
+    'IStokSayimRepository',
+    'IStokAnlikGoruntuRepository',
+    'IStokTransferRepository',
     'UrunRepository',
     'BarkodRepository',
     'StokHareketRepository',
-    'StokBakiyeRepository'
+    'StokBakiyeRepository',
+    'StokRezervasyonRepository',
+    'StokSayimRepository',
+    'StokAnlikGoruntuRepository',
+    'StokTransferRepository',
+    'BarkodIndeksi',
+    'barkod_indeksi_al',
+    'barkod_indeksi_baslat'
 ]
 
 __version__ = "0.1.0"
\ No newline at end of file
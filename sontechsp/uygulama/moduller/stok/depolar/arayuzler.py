@@ -1,9 +1,19 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.depolar.arayuzler
 # Description: Stok repository arayüzleri
 # Changelog:
 # - İlk oluşturma
+# - Kritik stok satırları sorgusu eklendi
+# - Atomik bakiye değişimi eklendi
+# - Toplu stok hareketi eklendi
+# - Stok rezervasyon repository arayüzü eklendi
+# - Stok sayım repository arayüzü eklendi
+# - İndeksli ürün araması ve toplu barkod okuma eklendi
+# - Stok anlık görüntü repository arayüzü eklendi
+# - Stok transfer repository arayüzü eklendi
+# - Çoklu ürün bakiye okuma eklendi
+# - Dönem görüntüsü silme eklendi
 
 """
 SONTECHSP Stok Repository Arayüzleri
@@ -13,10 +23,13 @@ Dependency injection ve test edilebilirlik için kullanılır.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from decimal import Decimal
 
-from ..dto import UrunDTO, BarkodDTO, StokHareketDTO, StokHareketFiltreDTO, StokBakiyeDTO
+from ..dto import (
+    UrunDTO, BarkodDTO, StokHareketDTO, StokHareketFiltreDTO, StokBakiyeDTO, StokRezervasyonDTO
+)
 
 
 class IUrunRepository(ABC):
@@ -48,8 +61,8 @@ class IUrunRepository(ABC):
         pass
     
     @abstractmethod
-    def ara(self, arama_terimi: str) -> List[UrunDTO]:
-        """Ürün adı veya kodu ile arama yapar"""
+    def ara(self, arama_terimi: str, limit: int = 100, onek: bool = False) -> List[UrunDTO]:
+        """Ürün adı veya kodu ile sıralı arama yapar"""
         pass
 
 
@@ -75,6 +88,11 @@ class IBarkodRepository(ABC):
     def urun_barkodlari_getir(self, urun_id: int) -> List[BarkodDTO]:
         """Ürünün tüm barkodlarını getirir"""
         pass
+    
+    @abstractmethod
+    def urunlerin_barkodlari_getir(self, urun_idler: List[int]) -> Dict[int, List[BarkodDTO]]:
+        """Birden fazla ürünün barkodlarını tek sorguda getirir"""
+        pass
 
 
 class IStokHareketRepository(ABC):
@@ -95,6 +113,12 @@ class IStokHareketRepository(ABC):
                                depo_id: Optional[int] = None) -> Decimal:
         """Stok bakiyesini kilitler ve getirir (SELECT FOR UPDATE)"""
         pass
+    
+    @abstractmethod
+    def toplu_hareket_uygula(self, hareketler: List[StokHareketDTO],
+                             bakiye_dogrulayici=None, session=None) -> List[StokBakiyeDTO]:
+        """Hareketleri tek transaction'da kaydeder, bakiyelere toplu uygular"""
+        pass
 
 
 class IStokBakiyeRepository(ABC):
@@ -106,12 +130,25 @@ class IStokBakiyeRepository(ABC):
         """Stok bakiyesini getirir"""
         pass
     
+    @abstractmethod
+    def bakiyeler_getir(self, urun_idler: List[int], magaza_id: int,
+                        depo_id: Optional[int] = None) -> Dict[int, StokBakiyeDTO]:
+        """Birden çok ürünün bakiyesini tek sorguda getirir"""
+        pass
+    
     @abstractmethod
     def bakiye_guncelle(self, urun_id: int, magaza_id: int, 
                        miktar_degisimi: Decimal, depo_id: Optional[int] = None) -> bool:
         """Stok bakiyesini günceller"""
         pass
     
+    @abstractmethod
+    def bakiye_degisimi_uygula(self, urun_id: int, magaza_id: int,
+                               miktar_degisimi: Decimal, depo_id: Optional[int] = None,
+                               session=None) -> StokBakiyeDTO:
+        """Bakiyeye miktar değişimini tek ifadede (upsert) uygular"""
+        pass
+    
     @abstractmethod
     def rezervasyon_yap(self, urun_id: int, magaza_id: int, 
                        miktar: Decimal, depo_id: Optional[int] = None) -> bool:
@@ -128,4 +165,165 @@ class IStokBakiyeRepository(ABC):
     def tum_bakiyeler_getir(self, magaza_id: Optional[int] = None, 
                            depo_id: Optional[int] = None) -> List[StokBakiyeDTO]:
         """Tüm stok bakiyelerini getirir"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def kritik_stok_satirlari_getir(self, varsayilan_kritik_seviye: Decimal,
+                                    magaza_id: Optional[int] = None,
+                                    depo_id: Optional[int] = None,
+                                    sadece_kritik: bool = False,
+                                    parti_boyutu: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Kritik seviyedeki bakiyeleri ürün bilgisiyle sıralı olarak getirir"""
+        pass
+
+
+class IStokRezervasyonRepository(ABC):
+    """Stok rezervasyon repository arayüzü"""
+    
+    @abstractmethod
+    def rezervasyon_ekle(self, rezervasyon: StokRezervasyonDTO, session=None) -> None:
+        """Rezervasyonu kaydeder ve bakiyede rezerve eder"""
+        pass
+    
+    @abstractmethod
+    def rezervasyon_getir(self, rezervasyon_no: str) -> Optional[StokRezervasyonDTO]:
+        """Rezervasyon numarası ile kayıt getirir"""
+        pass
+    
+    @abstractmethod
+    def rezervasyon_kapat(self, rezervasyon_no: str, yeni_durum: str,
+                          session=None) -> Optional[StokRezervasyonDTO]:
+        """Aktif rezervasyonu kapatır, kalan miktarı serbest bırakır"""
+        pass
+    
+    @abstractmethod
+    def rezervasyon_kullan(self, rezervasyon_no: str, miktar: Decimal,
+                           session=None) -> Optional[StokRezervasyonDTO]:
+        """Rezervasyondan miktar kullanır (stoktan düşer)"""
+        pass
+    
+    @abstractmethod
+    def aktif_rezervasyonlar(self, urun_id: Optional[int] = None,
+                             magaza_id: Optional[int] = None) -> List[StokRezervasyonDTO]:
+        """Aktif rezervasyonları getirir"""
+        pass
+    
+    @abstractmethod
+    def aktif_toplamlar(self) -> Dict[Tuple[int, int], Tuple[Decimal, int]]:
+        """(urun_id, magaza_id) başına aktif rezerve toplamı ve sayısı"""
+        pass
+    
+    @abstractmethod
+    def suresi_dolanlari_dusur(self, simdi: datetime, parti_boyutu: int = 500,
+                               session=None) -> List[StokRezervasyonDTO]:
+        """Süresi dolan rezervasyonlardan bir partiyi düşürür"""
+        pass
+
+
+class IStokSayimRepository(ABC):
+    """Stok sayım repository arayüzü"""
+    
+    @abstractmethod
+    def sayim_olustur(self, sayim_no: str, magaza_id: int, depo_id: Optional[int] = None,
+                      kullanici_id: Optional[int] = None,
+                      aciklama: Optional[str] = None) -> int:
+        """Sayım oturumunu oluşturur ve bakiye görüntüsünü alır"""
+        pass
+    
+    @abstractmethod
+    def sayim_getir(self, sayim_no: str) -> Optional[Dict[str, Any]]:
+        """Sayım başlığını kalem sayılarıyla birlikte getirir"""
+        pass
+    
+    @abstractmethod
+    def aktif_sayimlar(self, magaza_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Tamamlanmamış sayımları getirir"""
+        pass
+    
+    @abstractmethod
+    def durum_guncelle(self, sayim_id: int, yeni_durum: str,
+                       beklenen_durumlar: Tuple[str, ...], **alanlar) -> bool:
+        """Sayım durumunu korumalı olarak değiştirir"""
+        pass
+    
+    @abstractmethod
+    def sayim_verileri_yaz(self, sayim_id: int, kayitlar: List[Tuple[int, Decimal]],
+                           toplama: bool = False) -> int:
+        """Sayım verilerini toplu yazar"""
+        pass
+    
+    @abstractmethod
+    def farklar_getir(self, sayim_id: int, parti_boyutu: int = 5000) -> Iterator[Tuple[int, Decimal]]:
+        """Sayım farklarını akış olarak getirir"""
+        pass
+    
+    @abstractmethod
+    def fark_partisi_uygula(self, sayim: Dict[str, Any], parti_boyutu: int = 1000) -> int:
+        """Uygulanmamış farklardan bir partiyi bakiyeye işler"""
+        pass
+
+
+class IStokAnlikGoruntuRepository(ABC):
+    """Dönem sonu stok görüntüsü repository arayüzü"""
+    
+    @abstractmethod
+    def son_goruntu(self, tarih: datetime, session=None) -> Optional[Tuple[str, datetime]]:
+        """Verilen andan önceki en yeni görüntüyü bulur"""
+        pass
+    
+    @abstractmethod
+    def goruntu_olustur(self, donem_tipi: str, donem_sonu: datetime, session=None) -> int:
+        """Dönem sonu görüntüsünü artımlı olarak üretir"""
+        pass
+    
+    @abstractmethod
+    def goruntuleri_sil(self, donem_tipi: str, baslangic: datetime, bitis: datetime,
+                        session=None) -> int:
+        """baslangic < donem_sonu <= bitis aralığındaki görüntüleri siler"""
+        pass
+    
+    @abstractmethod
+    def tarihteki_stok(self, tarih: datetime, magaza_id: int,
+                       urun_idler: Optional[List[int]] = None,
+                       depo_id: Optional[int] = None, session=None) -> Dict[int, Decimal]:
+        """Verilen andaki stok miktarlarını görüntü + delta ile hesaplar"""
+        pass
+    
+    @abstractmethod
+    def donem_hareketleri(self, baslangic: datetime, bitis: datetime, magaza_id: int,
+                          urun_idler: Optional[List[int]] = None,
+                          depo_id: Optional[int] = None, session=None) -> List[Dict]:
+        """Dönem açılış, giriş, çıkış ve kapanış miktarlarını getirir"""
+        pass
+
+
+class IStokTransferRepository(ABC):
+    """Stok transfer belgesi repository arayüzü"""
+    
+    @abstractmethod
+    def belge_olustur(self, belge: Dict[str, Any], satirlar: List[Tuple[int, Decimal]],
+                      yolda: bool = True, bakiye_dogrulayici=None) -> int:
+        """Transfer belgesini oluşturur ve tek transaction'da sevk eder"""
+        pass
+    
+    @abstractmethod
+    def belge_getir(self, transfer_no: str) -> Optional[Dict[str, Any]]:
+        """Transfer belgesini satırlarıyla birlikte getirir"""
+        pass
+    
+    @abstractmethod
+    def kabul_et(self, transfer_no: str, kullanici_id: Optional[int] = None) -> bool:
+        """Yoldaki belgeyi hedefe kabul eder"""
+        pass
+    
+    @abstractmethod
+    def iptal_et(self, transfer_no: str, kullanici_id: Optional[int] = None,
+                 bakiye_dogrulayici=None) -> bool:
+        """Belgeyi iptal eder ve stok etkisini geri alır"""
+        pass
+    
+    @abstractmethod
+    def yoldaki_miktarlar(self, hedef_magaza_id: int,
+                          urun_idler: Optional[List[int]] = None) -> Dict[int, Decimal]:
+        """Hedef mağazaya yolda olan ürün miktarlarını toplar"""
+        pass
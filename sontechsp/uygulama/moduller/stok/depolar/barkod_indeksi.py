@@ -0,0 +1,316 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.barkod_indeksi
+# Description: Terminal içi barkod → ürün/fiyat indeksi
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Barkod İndeksi
+
+Bu modül POS okutmalarında veritabanına gitmeden barkod çözümlemesi için
+bellek içi bir indeks sağlar:
+- Başlangıçta urun_barkodlari ⋈ urunler tablosundan toplu yükleme
+- Barkod ekleme/silme ve ürün güncelleme kancaları ile anlık güncelleme
+- Son senkron zamanına göre periyodik delta yenileme
+- İsabet/ıska sayaçları
+"""
+
+import logging
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from ..dto import BarkodDTO
+
+# Sunucu/terminal saat farkına karşı delta sorgusu geriden başlatılır;
+# aynı kaydın iki kez uygulanması zararsızdır
+DELTA_GUVENLIK_PAYI = timedelta(seconds=5)
+
+
+class BarkodIndeksi:
+    """
+    Thread-safe bellek içi barkod indeksi
+
+    Okumalar tek bir dict erişimidir; yazmalar (kancalar ve yenileme)
+    kilit altında yapılır. İndeks yalnızca aktif barkodları tutar.
+    """
+
+    def __init__(self, barkod_repository=None, yenileme_araligi: float = 60.0,
+                 tam_yenileme_carpani: int = 30):
+        """
+        Args:
+            barkod_repository: indeks_kayitlari_getir sağlayan repository
+            yenileme_araligi: Delta yenileme aralığı (saniye)
+            tam_yenileme_carpani: Kaç delta turunda bir tam yükleme yapılacağı
+                (başka terminallerden silinen barkodları temizlemek için)
+        """
+        self._barkod_repository = barkod_repository
+        self._yenileme_araligi = yenileme_araligi
+        self._tam_yenileme_carpani = max(1, tam_yenileme_carpani)
+        self._logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self._kayitlar: Dict[str, BarkodDTO] = {}
+        self._barkod_idleri: Dict[int, str] = {}
+        self._urun_barkodlari: Dict[int, Set[str]] = {}
+
+        self._son_senkron: Optional[datetime] = None
+        self._delta_turu = 0
+        self._isabet = 0
+        self._iska = 0
+
+        self._durdur_olayi = threading.Event()
+        self._yenileme_thread: Optional[threading.Thread] = None
+
+    @property
+    def yuklu_mu(self) -> bool:
+        """İndeks en az bir kez yüklendi mi"""
+        return self._son_senkron is not None
+
+    def ara(self, barkod: str) -> Optional[BarkodDTO]:
+        """
+        Barkodu indekste arar
+
+        Returns:
+            Optional[BarkodDTO]: Kaydın kopyası veya None (ıska)
+        """
+        kayit = self._kayitlar.get(barkod)
+        if kayit is None:
+            self._iska += 1
+            return None
+
+        self._isabet += 1
+        return replace(kayit)
+
+    def yukle(self) -> int:
+        """
+        İndeksi veritabanından tamamen yeniden yükler
+
+        Returns:
+            int: Yüklenen barkod sayısı
+        """
+        if self._barkod_repository is None:
+            return 0
+
+        baslangic = datetime.now(timezone.utc)
+        kayitlar: Dict[str, BarkodDTO] = {}
+        barkod_idleri: Dict[int, str] = {}
+        urun_barkodlari: Dict[int, Set[str]] = {}
+
+        for dto in self._barkod_repository.indeks_kayitlari_getir():
+            kayitlar[dto.barkod] = dto
+            if dto.id is not None:
+                barkod_idleri[dto.id] = dto.barkod
+            urun_barkodlari.setdefault(dto.urun_id, set()).add(dto.barkod)
+
+        with self._lock:
+            self._kayitlar = kayitlar
+            self._barkod_idleri = barkod_idleri
+            self._urun_barkodlari = urun_barkodlari
+            self._son_senkron = baslangic
+            self._delta_turu = 0
+
+        self._logger.info(f"Barkod indeksi yüklendi - {len(kayitlar)} barkod")
+        return len(kayitlar)
+
+    def delta_yenile(self) -> int:
+        """
+        Son senkrondan sonra değişen kayıtları indekse uygular
+
+        Returns:
+            int: Uygulanan değişiklik sayısı
+        """
+        if self._barkod_repository is None:
+            return 0
+
+        if not self.yuklu_mu or self._delta_turu + 1 >= self._tam_yenileme_carpani:
+            return self.yukle()
+
+        baslangic = datetime.now(timezone.utc)
+        degisiklik = 0
+        for dto in self._barkod_repository.indeks_kayitlari_getir(
+            degisiklik_sonrasi=self._son_senkron - DELTA_GUVENLIK_PAYI
+        ):
+            self.kaydet(dto)
+            degisiklik += 1
+
+        with self._lock:
+            self._son_senkron = baslangic
+            self._delta_turu += 1
+
+        if degisiklik:
+            self._logger.debug(f"Barkod indeksi delta yenilendi - {degisiklik} kayıt")
+        return degisiklik
+
+    def kaydet(self, dto: BarkodDTO) -> None:
+        """Barkod kaydını ekler/günceller; pasif kayıt indeksten düşer"""
+        with self._lock:
+            eski_barkod = self._barkod_idleri.get(dto.id) if dto.id is not None else None
+            if eski_barkod is not None and eski_barkod != dto.barkod:
+                self._barkod_cikar(eski_barkod)
+
+            if not dto.aktif:
+                self._barkod_cikar(dto.barkod)
+                return
+
+            self._kayitlar[dto.barkod] = replace(dto)
+            if dto.id is not None:
+                self._barkod_idleri[dto.id] = dto.barkod
+            self._urun_barkodlari.setdefault(dto.urun_id, set()).add(dto.barkod)
+
+    def barkod_id_sil(self, barkod_id: int) -> bool:
+        """Barkod ID'si ile kaydı indeksten çıkarır"""
+        with self._lock:
+            barkod = self._barkod_idleri.get(barkod_id)
+            if barkod is None:
+                return False
+            self._barkod_cikar(barkod)
+            return True
+
+    def urun_guncelle(self, urun_id: int, urun_adi: str, satis_fiyati: Any,
+                      kdv_orani: Any, aktif: bool = True) -> int:
+        """
+        Ürün bilgisi değişince o ürüne ait tüm barkod kayıtlarını günceller
+
+        Returns:
+            int: Güncellenen barkod sayısı
+        """
+        with self._lock:
+            barkodlar = list(self._urun_barkodlari.get(urun_id, ()))
+            if not aktif:
+                for barkod in barkodlar:
+                    self._barkod_cikar(barkod)
+                return len(barkodlar)
+
+            for barkod in barkodlar:
+                # Okuyucular eski nesneyi tutuyor olabilir, yerinde değiştirilmez
+                self._kayitlar[barkod] = replace(
+                    self._kayitlar[barkod],
+                    urun_adi=urun_adi,
+                    satis_fiyati=satis_fiyati,
+                    kdv_orani=kdv_orani
+                )
+            return len(barkodlar)
+
+    def yapilandir(self, barkod_repository, yenileme_araligi: Optional[float] = None) -> None:
+        """Kaynak repository'yi ayarlar ve indeksi boşaltır"""
+        self.temizle()
+        self._barkod_repository = barkod_repository
+        if yenileme_araligi is not None:
+            self._yenileme_araligi = yenileme_araligi
+
+    def temizle(self) -> None:
+        """İndeksi ve sayaçları sıfırlar"""
+        with self._lock:
+            self._kayitlar = {}
+            self._barkod_idleri = {}
+            self._urun_barkodlari = {}
+            self._son_senkron = None
+            self._delta_turu = 0
+            self._isabet = 0
+            self._iska = 0
+
+    def istatistikler(self) -> Dict[str, Any]:
+        """İndeks boyutu ve isabet/ıska sayaçlarını döndürür"""
+        toplam = self._isabet + self._iska
+        return {
+            'barkod_sayisi': len(self._kayitlar),
+            'urun_sayisi': len(self._urun_barkodlari),
+            'isabet': self._isabet,
+            'iska': self._iska,
+            'isabet_orani': (self._isabet / toplam * 100) if toplam else 0.0,
+            'son_senkron': self._son_senkron.isoformat() if self._son_senkron else None
+        }
+
+    def periyodik_yenileme_baslat(self) -> None:
+        """Delta yenilemeyi arka plan thread'inde başlatır"""
+        if self._yenileme_thread and self._yenileme_thread.is_alive():
+            return
+
+        self._durdur_olayi.clear()
+        self._yenileme_thread = threading.Thread(
+            target=self._yenileme_dongusu,
+            name="barkod-indeksi-yenileme",
+            daemon=True
+        )
+        self._yenileme_thread.start()
+
+    def periyodik_yenileme_durdur(self, bekleme: float = 5.0) -> None:
+        """Arka plan yenilemeyi durdurur"""
+        self._durdur_olayi.set()
+        if self._yenileme_thread:
+            self._yenileme_thread.join(timeout=bekleme)
+            self._yenileme_thread = None
+
+    def _yenileme_dongusu(self) -> None:
+        """Arka plan delta yenileme döngüsü"""
+        if not self.yuklu_mu:
+            try:
+                self.yukle()
+            except Exception as e:
+                self._logger.warning(f"Barkod indeksi yüklenemedi: {str(e)}")
+        
+        while not self._durdur_olayi.wait(self._yenileme_araligi):
+            try:
+                self.delta_yenile()
+            except Exception as e:
+                self._logger.warning(f"Barkod indeksi yenilenemedi: {str(e)}")
+
+    def _barkod_cikar(self, barkod: str) -> None:
+        """Kilit altında çağrılmalıdır"""
+        kayit = self._kayitlar.pop(barkod, None)
+        if kayit is None:
+            return
+
+        if kayit.id is not None:
+            self._barkod_idleri.pop(kayit.id, None)
+
+        urun_barkodlari = self._urun_barkodlari.get(kayit.urun_id)
+        if urun_barkodlari is not None:
+            urun_barkodlari.discard(barkod)
+            if not urun_barkodlari:
+                del self._urun_barkodlari[kayit.urun_id]
+
+
+# Global barkod indeksi instance
+_barkod_indeksi: Optional[BarkodIndeksi] = None
+
+
+def barkod_indeksi_al() -> BarkodIndeksi:
+    """Global barkod indeksini döndürür (yüklenmemiş olabilir)"""
+    global _barkod_indeksi
+    if _barkod_indeksi is None:
+        _barkod_indeksi = BarkodIndeksi()
+    return _barkod_indeksi
+
+
+def barkod_indeksi_baslat(barkod_repository, yenileme_araligi: float = 60.0,
+                          periyodik: bool = True,
+                          arka_planda: bool = False) -> BarkodIndeksi:
+    """
+    Terminal başlangıcında barkod indeksini yükler
+
+    Args:
+        barkod_repository: indeks_kayitlari_getir sağlayan repository
+        yenileme_araligi: Delta yenileme aralığı (saniye)
+        periyodik: Arka plan delta yenileme başlatılsın mı
+        arka_planda: İlk yükleme de arka plan thread'inde yapılsın mı
+            (arayüz açılışını bekletmemek için)
+
+    Returns:
+        BarkodIndeksi instance'ı
+    """
+    if _barkod_indeksi is not None:
+        _barkod_indeksi.periyodik_yenileme_durdur()
+
+    # Mevcut nesne servislerde tutuluyor olabilir, yerine yenisi konmaz
+    indeks = barkod_indeksi_al()
+    indeks.yapilandir(barkod_repository, yenileme_araligi)
+
+    if not arka_planda:
+        indeks.yukle()
+    if periyodik or arka_planda:
+        indeks.periyodik_yenileme_baslat()
+    return indeks
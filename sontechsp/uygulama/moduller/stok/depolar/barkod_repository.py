@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.depolar.barkod_repository
 # Description: Barkod repository implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Barkod indeksi için ürün bilgili toplu/delta okuma eklendi
+# - Çoklu ürün barkodlarının tek sorguda okunması eklendi
 
 """
 SONTECHSP Barkod Repository
@@ -12,11 +14,13 @@ Bu modül barkod veri erişim işlemlerini gerçekleştirir.
 Barkod CRUD işlemleri ve benzersizlik kontrolü yapar.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import or_, select, true
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from sontechsp.uygulama.veritabani.modeller.stok import UrunBarkod
+from sontechsp.uygulama.veritabani.modeller.stok import Urun, UrunBarkod
 from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
 from ..dto import BarkodDTO
 from ..hatalar import BarkodValidationError
@@ -88,17 +92,53 @@ class BarkodRepository(IBarkodRepository):
             session.close()
     
     def barkod_ile_ara(self, barkod: str) -> Optional[BarkodDTO]:
-        """Barkod ile arama yapar"""
+        """Barkod ile arama yapar (ürün adı ve fiyatı ile birlikte)"""
         session = self.db.oturum_olustur()
         try:
-            barkod_obj = session.query(UrunBarkod).filter_by(
-                barkod=barkod, aktif=True
+            satir = session.query(UrunBarkod, Urun).join(
+                Urun, Urun.id == UrunBarkod.urun_id
+            ).filter(
+                UrunBarkod.barkod == barkod,
+                UrunBarkod.aktif.is_(True)
             ).first()
             
-            if not barkod_obj:
+            if not satir:
                 return None
             
-            return self._model_to_dto(barkod_obj)
+            return self._model_to_dto(satir[0], satir[1])
+            
+        finally:
+            session.close()
+    
+    def indeks_kayitlari_getir(self, degisiklik_sonrasi: Optional[datetime] = None,
+                               parti_boyutu: int = 5000) -> Iterator[BarkodDTO]:
+        """
+        Barkod indeksi için barkod ⋈ ürün kayıtlarını akış halinde getirir
+        
+        Args:
+            degisiklik_sonrasi: Verilirse sadece bu tarihten sonra eklenen/güncellenen
+                barkod veya ürün kayıtları döner (pasifler dahil, indeksten düşmek için)
+            parti_boyutu: Sunucudan tek seferde çekilecek satır sayısı
+        """
+        session = self.db.oturum_olustur()
+        try:
+            query = session.query(UrunBarkod, Urun).join(
+                Urun, Urun.id == UrunBarkod.urun_id
+            )
+            
+            if degisiklik_sonrasi is None:
+                query = query.filter(UrunBarkod.aktif.is_(True), Urun.aktif.is_(True))
+            else:
+                query = query.filter(
+                    or_(
+                        UrunBarkod.olusturma_tarihi > degisiklik_sonrasi,
+                        UrunBarkod.guncelleme_tarihi > degisiklik_sonrasi,
+                        Urun.guncelleme_tarihi > degisiklik_sonrasi
+                    )
+                )
+            
+            for barkod_obj, urun in query.yield_per(parti_boyutu):
+                yield self._model_to_dto(barkod_obj, urun)
             
         finally:
             session.close()
@@ -116,9 +156,36 @@ class BarkodRepository(IBarkodRepository):
         finally:
             session.close()
     
-    def _model_to_dto(self, barkod: UrunBarkod) -> BarkodDTO:
+    def urunlerin_barkodlari_getir(self, urun_idler: List[int]) -> Dict[int, List[BarkodDTO]]:
+        """
+        Birden fazla ürünün aktif barkodlarını tek IN sorgusuyla getirir
+        
+        Arama sonuçlarını barkodlarla doldururken ürün başına sorgu
+        (N+1) yapılmasını önler. Ana barkod her ürünün listesinde ilk sıradadır.
+        """
+        sonuc: Dict[int, List[BarkodDTO]] = {urun_id: [] for urun_id in urun_idler}
+        if not sonuc:
+            return sonuc
+        
+        barkodlar = UrunBarkod.__table__
+        session = self.db.oturum_olustur()
+        try:
+            satirlar = session.execute(
+                select(barkodlar)
+                .where(barkodlar.c.urun_id.in_(list(sonuc)), barkodlar.c.aktif == true())
+                .order_by(barkodlar.c.urun_id, barkodlar.c.ana_barkod.desc(), barkodlar.c.id)
+            )
+            for satir in satirlar:
+                sonuc[satir.urun_id].append(self._model_to_dto(satir))
+            
+            return sonuc
+            
+        finally:
+            session.close()
+    
+    def _model_to_dto(self, barkod: UrunBarkod, urun: Optional[Urun] = None) -> BarkodDTO:
         """Model'i DTO'ya çevirir"""
-        return BarkodDTO(
+        dto = BarkodDTO(
             id=barkod.id,
             urun_id=barkod.urun_id,
             barkod=barkod.barkod,
@@ -129,4 +196,13 @@ class BarkodRepository(IBarkodRepository):
             ana_barkod=barkod.ana_barkod,
             olusturma_tarihi=barkod.olusturma_tarihi,
             guncelleme_tarihi=barkod.guncelleme_tarihi
-        )
\ No newline at end of file
+        )
+        
+        if urun is not None:
+            dto.urun_adi = urun.urun_adi
+            dto.satis_fiyati = urun.satis_fiyati
+            dto.kdv_orani = urun.kdv_orani
+            # Pasif ürünün barkodu satışta kullanılamaz
+            dto.aktif = barkod.aktif and urun.aktif
+        
+        return dto
\ No newline at end of file
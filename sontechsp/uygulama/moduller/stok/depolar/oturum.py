@@ -0,0 +1,42 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.oturum
+# Description: Repository'ler arası ortak transaction yardımcısı
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Stok Repository Oturum Yardımcısı
+
+Birden fazla repository çağrısının tek transaction içinde çalışabilmesi
+için dış oturuma katılma / kendi oturumunu yönetme mantığını toplar.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def islem_oturumu(db, session: Optional[Session] = None) -> Iterator[Session]:
+    """
+    Dış oturum varsa onu kullanır, yoksa kendi transaction'ını açıp kapatır
+
+    Args:
+        db: oturum_olustur sağlayan veritabanı bağlantısı
+        session: Dış transaction oturumu (commit/rollback çağıranındır)
+    """
+    if session is not None:
+        yield session
+        return
+
+    oturum = db.oturum_olustur()
+    try:
+        yield oturum
+        oturum.commit()
+    except Exception:
+        oturum.rollback()
+        raise
+    finally:
+        oturum.close()
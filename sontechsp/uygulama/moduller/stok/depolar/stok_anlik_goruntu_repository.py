@@ -0,0 +1,218 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.stok_anlik_goruntu_repository
+# Description: Dönem sonu stok görüntüsü repository implementasyonu
+# Changelog:
+# - İlk oluşturma
+# - Sıfır bakiyeler görüntüye yazılmıyor, dönem görüntüsü silme eklendi
+
+"""
+SONTECHSP Stok Anlık Görüntü Repository
+
+Bu modül stok_bakiye_anlik_goruntu tablosu üzerindeki veri erişim
+işlemlerini gerçekleştirir:
+- Görüntüler bir önceki görüntü + aradaki hareketler ile tek
+  INSERT ... SELECT olarak üretilir; sıfır bakiyeli satırlar yazılmaz
+- Geçmiş tarihli stok = en yakın önceki görüntü + görüntüden sonraki
+  hareketler (olusturma_tarihi indeksi üzerinden aralık taraması)
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiyeAnlikGoruntu, StokHareket
+from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
+from .arayuzler import IStokAnlikGoruntuRepository
+from .oturum import islem_oturumu
+
+_GORUNTULER = StokBakiyeAnlikGoruntu.__table__
+_HAREKETLER = StokHareket.__table__
+
+
+class StokAnlikGoruntuRepository(IStokAnlikGoruntuRepository):
+    """Stok anlık görüntü repository implementasyonu"""
+
+    def __init__(self):
+        self.db = VeriTabaniBaglanti()
+
+    def son_goruntu(self, tarih: datetime,
+                    session: Optional[Session] = None) -> Optional[Tuple[str, datetime]]:
+        """
+        Verilen andan önceki (veya o andaki) en yeni görüntüyü bulur
+
+        Returns:
+            Optional[Tuple[str, datetime]]: (donem_tipi, donem_sonu) veya None
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            satir = oturum.execute(
+                select(_GORUNTULER.c.donem_tipi, _GORUNTULER.c.donem_sonu)
+                .where(_GORUNTULER.c.donem_sonu <= tarih)
+                .order_by(_GORUNTULER.c.donem_sonu.desc(), _GORUNTULER.c.donem_tipi)
+                .limit(1)
+            ).first()
+            return (satir.donem_tipi, satir.donem_sonu) if satir else None
+
+    def goruntu_olustur(self, donem_tipi: str, donem_sonu: datetime,
+                        session: Optional[Session] = None) -> int:
+        """
+        Dönem sonu görüntüsünü artımlı olarak üretir
+
+        Kaynak, donem_sonu'ndan önceki en yeni görüntü ile o görüntüden
+        sonraki hareketlerdir. Aynı dönem için tekrar çağrılırsa görüntü
+        yeniden üretilir. Toplamı sıfır olan (ürün, mağaza, depo) satırları
+        yazılmaz; görüntüde olmayan satırın bakiyesi sıfırdır.
+
+        Returns:
+            int: Yazılan görüntü satırı sayısı
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            oturum.execute(
+                delete(_GORUNTULER).where(_GORUNTULER.c.donem_tipi == donem_tipi,
+                                          _GORUNTULER.c.donem_sonu == donem_sonu)
+            )
+            taban = oturum.execute(
+                select(_GORUNTULER.c.donem_tipi, _GORUNTULER.c.donem_sonu)
+                .where(_GORUNTULER.c.donem_sonu < donem_sonu)
+                .order_by(_GORUNTULER.c.donem_sonu.desc(), _GORUNTULER.c.donem_tipi)
+                .limit(1)
+            ).first()
+
+            kaynak = self._durum_kaynagi(taban, donem_sonu)
+            sonuc = oturum.execute(insert(_GORUNTULER).from_select(
+                ['donem_tipi', 'donem_sonu', 'urun_id', 'magaza_id', 'depo_id', 'miktar'],
+                select(
+                    literal(donem_tipi), literal(donem_sonu),
+                    kaynak.c.urun_id, kaynak.c.magaza_id, kaynak.c.depo_id,
+                    func.sum(kaynak.c.miktar)
+                ).group_by(kaynak.c.urun_id, kaynak.c.magaza_id, kaynak.c.depo_id)
+                .having(func.sum(kaynak.c.miktar) != 0)
+            ))
+            return sonuc.rowcount
+
+    def goruntuleri_sil(self, donem_tipi: str, baslangic: datetime, bitis: datetime,
+                        session: Optional[Session] = None) -> int:
+        """
+        baslangic < donem_sonu <= bitis aralığındaki görüntüleri siler
+
+        Returns:
+            int: Silinen görüntü satırı sayısı
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            return oturum.execute(
+                delete(_GORUNTULER).where(_GORUNTULER.c.donem_tipi == donem_tipi,
+                                          _GORUNTULER.c.donem_sonu > baslangic,
+                                          _GORUNTULER.c.donem_sonu <= bitis)
+            ).rowcount
+
+    def tarihteki_stok(self, tarih: datetime, magaza_id: int,
+                       urun_idler: Optional[List[int]] = None,
+                       depo_id: Optional[int] = None,
+                       session: Optional[Session] = None) -> Dict[int, Decimal]:
+        """
+        Verilen andaki stok miktarlarını görüntü + delta ile hesaplar
+
+        Args:
+            tarih: Stok anı (bu andan önceki hareketler dahil)
+            magaza_id: Mağaza ID
+            urun_idler: Ürün filtresi (verilmezse mağazadaki tüm ürünler)
+            depo_id: Depo filtresi (verilmezse mağazanın tüm depoları toplanır)
+
+        Returns:
+            Dict[int, Decimal]: urun_id -> miktar (ürün ID sırasıyla, sıfırlar hariç)
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            taban = self.son_goruntu(tarih, session=oturum)
+            kaynak = self._durum_kaynagi(taban, tarih, magaza_id, urun_idler, depo_id)
+            satirlar = oturum.execute(
+                select(kaynak.c.urun_id, func.sum(kaynak.c.miktar))
+                .group_by(kaynak.c.urun_id)
+                .having(func.sum(kaynak.c.miktar) != 0)
+                .order_by(kaynak.c.urun_id)
+            )
+            return {urun_id: Decimal(str(miktar)) for urun_id, miktar in satirlar}
+
+    def donem_hareketleri(self, baslangic: datetime, bitis: datetime, magaza_id: int,
+                          urun_idler: Optional[List[int]] = None,
+                          depo_id: Optional[int] = None,
+                          session: Optional[Session] = None) -> List[Dict]:
+        """
+        [baslangic, bitis) dönemi için ürün bazında açılış, giriş, çıkış ve
+        kapanış miktarlarını getirir
+
+        Açılış görüntü + delta ile, giriş/çıkış yalnızca dönem hareketlerinden
+        hesaplanır.
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            acilislar = self.tarihteki_stok(baslangic, magaza_id, urun_idler, depo_id, session=oturum)
+
+            sorgu = select(
+                _HAREKETLER.c.urun_id,
+                func.sum(case((_HAREKETLER.c.miktar > 0, _HAREKETLER.c.miktar), else_=0)),
+                func.sum(case((_HAREKETLER.c.miktar < 0, -_HAREKETLER.c.miktar), else_=0))
+            ).where(
+                _HAREKETLER.c.olusturma_tarihi >= baslangic,
+                _HAREKETLER.c.olusturma_tarihi < bitis,
+                *self._filtreler(_HAREKETLER, magaza_id, urun_idler, depo_id)
+            ).group_by(_HAREKETLER.c.urun_id)
+            hareketler = {
+                urun_id: (Decimal(str(giris)), Decimal(str(cikis)))
+                for urun_id, giris, cikis in oturum.execute(sorgu)
+            }
+
+        sonuc = []
+        for urun_id in sorted(set(acilislar) | set(hareketler)):
+            acilis = acilislar.get(urun_id, Decimal('0'))
+            giris, cikis = hareketler.get(urun_id, (Decimal('0'), Decimal('0')))
+            sonuc.append({
+                'urun_id': urun_id,
+                'acilis': acilis,
+                'giris': giris,
+                'cikis': cikis,
+                'kapanis': acilis + giris - cikis
+            })
+        return sonuc
+
+    def _durum_kaynagi(self, taban, bitis: datetime, magaza_id: Optional[int] = None,
+                       urun_idler: Optional[List[int]] = None,
+                       depo_id: Optional[int] = None):
+        """
+        Taban görüntü satırları ile görüntüden bitis'e kadarki hareketlerin
+        UNION ALL alt sorgusu (urun_id, magaza_id, depo_id, miktar)
+        """
+        hareketler = select(
+            _HAREKETLER.c.urun_id, _HAREKETLER.c.magaza_id,
+            _HAREKETLER.c.depo_id, _HAREKETLER.c.miktar
+        ).where(
+            _HAREKETLER.c.olusturma_tarihi < bitis,
+            *self._filtreler(_HAREKETLER, magaza_id, urun_idler, depo_id)
+        )
+        if taban is None:
+            return hareketler.subquery()
+
+        donem_tipi, donem_sonu = taban
+        hareketler = hareketler.where(_HAREKETLER.c.olusturma_tarihi >= donem_sonu)
+        goruntu = select(
+            _GORUNTULER.c.urun_id, _GORUNTULER.c.magaza_id,
+            _GORUNTULER.c.depo_id, _GORUNTULER.c.miktar
+        ).where(
+            _GORUNTULER.c.donem_tipi == donem_tipi,
+            _GORUNTULER.c.donem_sonu == donem_sonu,
+            *self._filtreler(_GORUNTULER, magaza_id, urun_idler, depo_id)
+        )
+        return union_all(goruntu, hareketler).subquery()
+
+    def _filtreler(self, tablo, magaza_id: Optional[int],
+                   urun_idler: Optional[List[int]], depo_id: Optional[int]) -> list:
+        """Mağaza/ürün/depo filtre koşulları"""
+        kosullar = []
+        if magaza_id is not None:
+            kosullar.append(tablo.c.magaza_id == magaza_id)
+        if urun_idler is not None:
+            kosullar.append(tablo.c.urun_id.in_(list(urun_idler)))
+        if depo_id is not None:
+            kosullar.append(tablo.c.depo_id == depo_id)
+        return kosullar
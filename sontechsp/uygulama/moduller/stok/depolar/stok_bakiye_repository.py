@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.depolar.stok_bakiye_repository
 # Description: Stok bakiye repository implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Küme tabanlı kritik stok sorgusu eklendi
+# - Bakiye/rezervasyon güncellemeleri tek ifadeli atomik upsert/UPDATE'e taşındı
+# - Çoklu ürün bakiye okuma eklendi
+# - Kritik stok sorgusu Core select'e taşındı; minimum_stok 0 varsayılan seviyeyi kullanır
 
 """
 SONTECHSP Stok Bakiye Repository
@@ -12,16 +16,24 @@ Bu modül stok bakiye veri erişim işlemlerini gerçekleştirir.
 Atomik bakiye güncelleme ve rezervasyon işlemleri yapar.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Iterator, Optional, List
 from decimal import Decimal
+from sqlalchemy import and_, case, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, Urun
 from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
 from ..hatalar import StokYetersizError
 from ..dto import StokBakiyeDTO
 from .arayuzler import IStokBakiyeRepository
+from .oturum import islem_oturumu
+
+
+# Atomik ifadeler ORM yerine doğrudan tablo üzerinde kurulur
+_BAKIYELER = StokBakiye.__table__
 
 
 class StokBakiyeRepository(IStokBakiyeRepository):
@@ -51,131 +63,204 @@ class StokBakiyeRepository(IStokBakiyeRepository):
         finally:
             session.close()
     
+    def bakiyeler_getir(self, urun_idler: List[int], magaza_id: int,
+                        depo_id: Optional[int] = None) -> Dict[int, StokBakiyeDTO]:
+        """
+        Birden çok ürünün bakiyesini tek IN sorgusuyla getirir
+        
+        Returns:
+            Dict[int, StokBakiyeDTO]: urun_id -> bakiye (kaydı olmayan ürünler yer almaz)
+        """
+        urun_idler = list(urun_idler)
+        if not urun_idler:
+            return {}
+        
+        with self._islem_oturumu() as oturum:
+            satirlar = oturum.execute(
+                select(_BAKIYELER).where(
+                    _BAKIYELER.c.urun_id.in_(urun_idler),
+                    _BAKIYELER.c.magaza_id == magaza_id,
+                    _BAKIYELER.c.depo_id == depo_id if depo_id else _BAKIYELER.c.depo_id.is_(None)
+                )
+            )
+            return {
+                satir.urun_id: StokBakiyeDTO(
+                    id=satir.id,
+                    urun_id=satir.urun_id,
+                    magaza_id=satir.magaza_id,
+                    depo_id=satir.depo_id,
+                    miktar=satir.miktar,
+                    rezerve_miktar=satir.rezerve_miktar,
+                    kullanilabilir_miktar=satir.kullanilabilir_miktar,
+                    son_hareket_tarihi=satir.son_hareket_tarihi
+                )
+                for satir in satirlar
+            }
+    
     def bakiye_guncelle(self, urun_id: int, magaza_id: int, 
                        miktar_degisimi: Decimal, depo_id: Optional[int] = None) -> bool:
         """Stok bakiyesini günceller"""
-        session = self.db.oturum_olustur()
         try:
-            # Mevcut bakiyeyi bul veya oluştur
-            query = session.query(StokBakiye).filter(
-                StokBakiye.urun_id == urun_id,
-                StokBakiye.magaza_id == magaza_id
-            )
-            
-            if depo_id:
-                query = query.filter(StokBakiye.depo_id == depo_id)
-            else:
-                query = query.filter(StokBakiye.depo_id.is_(None))
-            
-            bakiye = query.first()
-            
-            if not bakiye:
-                # Yeni bakiye kaydı oluştur
-                bakiye = StokBakiye(
-                    urun_id=urun_id,
-                    magaza_id=magaza_id,
-                    depo_id=depo_id,
-                    miktar=Decimal('0.0000'),
-                    rezerve_miktar=Decimal('0.0000'),
-                    kullanilabilir_miktar=Decimal('0.0000')
-                )
-                session.add(bakiye)
-            
-            # Bakiyeyi güncelle
-            bakiye.miktar += miktar_degisimi
-            bakiye.kullanilabilir_miktar = bakiye.miktar - bakiye.rezerve_miktar
-            
-            session.commit()
+            self.bakiye_degisimi_uygula(urun_id, magaza_id, miktar_degisimi, depo_id)
             return True
-            
         except IntegrityError:
-            session.rollback()
             return False
-        finally:
-            session.close()
     
-    def rezervasyon_yap(self, urun_id: int, magaza_id: int, 
-                       miktar: Decimal, depo_id: Optional[int] = None) -> bool:
-        """Stok rezervasyonu yapar"""
-        session = self.db.oturum_olustur()
-        try:
-            query = session.query(StokBakiye).filter(
-                StokBakiye.urun_id == urun_id,
-                StokBakiye.magaza_id == magaza_id
-            )
-            
-            if depo_id:
-                query = query.filter(StokBakiye.depo_id == depo_id)
-            else:
-                query = query.filter(StokBakiye.depo_id.is_(None))
-            
-            bakiye = query.with_for_update().first()
-            
-            if not bakiye:
-                raise StokYetersizError(
-                    "Stok bakiyesi bulunamadı",
-                    f"urun_id:{urun_id}",
-                    Decimal('0.0000'),
-                    miktar
-                )
+    def bakiye_degisimi_uygula(self, urun_id: int, magaza_id: int,
+                               miktar_degisimi: Decimal, depo_id: Optional[int] = None,
+                               session: Optional[Session] = None) -> StokBakiyeDTO:
+        """
+        Bakiyeye miktar değişimini tek ifadede uygular
+        
+        INSERT ... ON CONFLICT DO UPDATE SET miktar = miktar + :d ... RETURNING
+        ile satır yoksa oluşturulur, varsa artırılır; satır kilidi yalnızca
+        ifade süresince tutulur.
+        
+        Args:
+            session: Verilirse dış transaction'a katılır (commit çağıranındır)
             
-            # Kullanılabilir stok kontrolü
-            if bakiye.kullanilabilir_miktar < miktar:
-                raise StokYetersizError(
-                    "Yetersiz stok",
-                    f"urun_id:{urun_id}",
-                    bakiye.kullanilabilir_miktar,
-                    miktar
-                )
-            
-            # Rezervasyon yap
-            bakiye.rezerve_miktar += miktar
-            bakiye.kullanilabilir_miktar = bakiye.miktar - bakiye.rezerve_miktar
+        Returns:
+            StokBakiyeDTO: Güncel miktar, rezerve ve kullanılabilir miktar
+        """
+        with self._islem_oturumu(session) as oturum:
+            ifade = self._bakiye_upsert_ifadesi(
+                oturum.get_bind().dialect.name, urun_id, magaza_id, miktar_degisimi, depo_id
+            )
+            satir = oturum.execute(ifade).one()
             
-            session.commit()
-            return True
+            return StokBakiyeDTO(
+                urun_id=urun_id,
+                magaza_id=magaza_id,
+                depo_id=depo_id,
+                miktar=satir.miktar,
+                rezerve_miktar=satir.rezerve_miktar,
+                kullanilabilir_miktar=satir.kullanilabilir_miktar
+            )
+    
+    def rezervasyon_yap(self, urun_id: int, magaza_id: int, 
+                       miktar: Decimal, depo_id: Optional[int] = None,
+                       session: Optional[Session] = None) -> bool:
+        """
+        Stok rezervasyonu yapar
+        
+        Yeterlilik kontrolü korumalı UPDATE'in WHERE koşuludur
+        (kullanilabilir_miktar >= :miktar); ayrı SELECT FOR UPDATE yapılmaz.
+        """
+        try:
+            with self._islem_oturumu(session) as oturum:
+                yeni_rezerve = _BAKIYELER.c.rezerve_miktar + miktar
+                ifade = update(_BAKIYELER).where(
+                    self._anahtar_kosulu(urun_id, magaza_id, depo_id),
+                    _BAKIYELER.c.kullanilabilir_miktar >= miktar
+                ).values(
+                    rezerve_miktar=yeni_rezerve,
+                    kullanilabilir_miktar=_BAKIYELER.c.miktar - yeni_rezerve
+                ).returning(_BAKIYELER.c.kullanilabilir_miktar)
+                
+                if oturum.execute(ifade).first() is None:
+                    # Sadece başarısız yolda hata mesajı için bakiye okunur
+                    mevcut = oturum.execute(
+                        select(_BAKIYELER.c.kullanilabilir_miktar).where(
+                            self._anahtar_kosulu(urun_id, magaza_id, depo_id)
+                        )
+                    ).scalar()
+                    raise StokYetersizError(
+                        "Stok bakiyesi bulunamadı" if mevcut is None else "Yetersiz stok",
+                        f"urun_id:{urun_id}",
+                        mevcut if mevcut is not None else Decimal('0.0000'),
+                        miktar
+                    )
+                
+                return True
             
         except StokYetersizError:
-            session.rollback()
             raise
         except Exception:
-            session.rollback()
+            if session is not None:
+                raise
             return False
-        finally:
-            session.close()
     
     def rezervasyon_iptal(self, urun_id: int, magaza_id: int, 
-                         miktar: Decimal, depo_id: Optional[int] = None) -> bool:
-        """Stok rezervasyonunu iptal eder"""
-        session = self.db.oturum_olustur()
+                         miktar: Decimal, depo_id: Optional[int] = None,
+                         session: Optional[Session] = None) -> bool:
+        """Stok rezervasyonunu iptal eder (rezerve miktar sıfırın altına inmez)"""
         try:
-            query = session.query(StokBakiye).filter(
-                StokBakiye.urun_id == urun_id,
-                StokBakiye.magaza_id == magaza_id
-            )
-            
-            if depo_id:
-                query = query.filter(StokBakiye.depo_id == depo_id)
-            else:
-                query = query.filter(StokBakiye.depo_id.is_(None))
-            
-            bakiye = query.with_for_update().first()
-            
-            if not bakiye:
-                return False
-            
-            # Rezervasyon iptal et
-            bakiye.rezerve_miktar = max(Decimal('0.0000'), bakiye.rezerve_miktar - miktar)
-            bakiye.kullanilabilir_miktar = bakiye.miktar - bakiye.rezerve_miktar
-            
-            session.commit()
-            return True
+            with self._islem_oturumu(session) as oturum:
+                yeni_rezerve = case(
+                    (_BAKIYELER.c.rezerve_miktar > miktar, _BAKIYELER.c.rezerve_miktar - miktar),
+                    else_=literal(Decimal('0.0000'))
+                )
+                ifade = update(_BAKIYELER).where(
+                    self._anahtar_kosulu(urun_id, magaza_id, depo_id)
+                ).values(
+                    rezerve_miktar=yeni_rezerve,
+                    kullanilabilir_miktar=_BAKIYELER.c.miktar - yeni_rezerve
+                ).returning(_BAKIYELER.c.id)
+                
+                return oturum.execute(ifade).first() is not None
             
         except Exception:
-            session.rollback()
+            if session is not None:
+                raise
             return False
-        finally:
-            session.close()
+    
+    def _islem_oturumu(self, session: Optional[Session] = None):
+        """Dış oturum varsa onu kullanır, yoksa kendi transaction'ını açıp kapatır"""
+        return islem_oturumu(self.db, session)
+    
+    def _anahtar_kosulu(self, urun_id: int, magaza_id: int, depo_id: Optional[int]):
+        """(urun_id, magaza_id, depo_id) bakiye anahtarı koşulu"""
+        return and_(
+            _BAKIYELER.c.urun_id == urun_id,
+            _BAKIYELER.c.magaza_id == magaza_id,
+            _BAKIYELER.c.depo_id == depo_id if depo_id else _BAKIYELER.c.depo_id.is_(None)
+        )
+    
+    def _bakiye_upsert_ifadesi(self, dialect_adi: str, urun_id: int, magaza_id: int,
+                               miktar_degisimi: Decimal, depo_id: Optional[int]):
+        """
+        Dialect'e uygun INSERT ... ON CONFLICT DO UPDATE ... RETURNING ifadesi
+        
+        PostgreSQL (çevrimiçi) ve SQLite >= 3.35 (offline) aynı sözdizimini destekler;
+        depo'suz bakiyeler uk_stok_bakiye_depo_yok kısmi indeksi ile eşleşir.
+        """
+        insert = postgresql_insert if dialect_adi == "postgresql" else sqlite_insert
+        
+        ifade = insert(_BAKIYELER).values(
+            urun_id=urun_id,
+            magaza_id=magaza_id,
+            depo_id=depo_id if depo_id else None,
+            miktar=miktar_degisimi,
+            rezerve_miktar=Decimal('0.0000'),
+            kullanilabilir_miktar=miktar_degisimi,
+            son_hareket_tarihi=func.now()
+        )
+        
+        if depo_id:
+            cakisma = {'index_elements': [_BAKIYELER.c.urun_id, _BAKIYELER.c.magaza_id, _BAKIYELER.c.depo_id]}
+        else:
+            cakisma = {
+                'index_elements': [_BAKIYELER.c.urun_id, _BAKIYELER.c.magaza_id],
+                'index_where': _BAKIYELER.c.depo_id.is_(None)
+            }
+        
+        yeni_miktar = _BAKIYELER.c.miktar + ifade.excluded.miktar
+        ifade = ifade.on_conflict_do_update(
+            **cakisma,
+            set_={
+                'miktar': yeni_miktar,
+                'kullanilabilir_miktar': yeni_miktar - _BAKIYELER.c.rezerve_miktar,
+                'son_hareket_tarihi': ifade.excluded.son_hareket_tarihi,
+                'guncelleme_tarihi': func.now()
+            }
+        )
+        
+        return ifade.returning(
+            _BAKIYELER.c.miktar,
+            _BAKIYELER.c.rezerve_miktar,
+            _BAKIYELER.c.kullanilabilir_miktar
+        )
+    
     def tum_bakiyeler_getir(self, magaza_id: Optional[int] = None, 
                            depo_id: Optional[int] = None) -> List[StokBakiyeDTO]:
         """Tüm stok bakiyelerini getirir"""
@@ -213,4 +298,64 @@ class StokBakiyeRepository(IStokBakiyeRepository):
             return dto_listesi
             
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+    
+    def kritik_stok_satirlari_getir(self, varsayilan_kritik_seviye: Decimal,
+                                    magaza_id: Optional[int] = None,
+                                    depo_id: Optional[int] = None,
+                                    sadece_kritik: bool = False,
+                                    parti_boyutu: int = 2000) -> Iterator[Dict[str, Any]]:
+        """
+        Kritik seviyedeki bakiyeleri tek sorguda (bakiye ⋈ ürün) akış halinde getirir
+        
+        Kritik seviye ürünün minimum_stok değeri, boş veya 0 ise varsayılan seviyedir.
+        Uyarı seviyesi ve sıralama (ACIL > KRITIK > UYARI, eksik miktar azalan)
+        veritabanında hesaplanır.
+        """
+        urunler = Urun.__table__
+        # minimum_stok 0 veya boşsa varsayılan seviye kullanılır
+        kritik_seviye = func.coalesce(func.nullif(urunler.c.minimum_stok, 0), literal(varsayilan_kritik_seviye))
+        mevcut = _BAKIYELER.c.kullanilabilir_miktar
+        eksik_miktar = kritik_seviye - mevcut
+        uyari_sirasi = case(
+            (mevcut <= 0, 0),
+            (mevcut <= kritik_seviye * Decimal('0.5'), 1),
+            else_=2
+        )
+        
+        sorgu = select(
+            _BAKIYELER.c.urun_id,
+            urunler.c.urun_kodu,
+            urunler.c.urun_adi,
+            _BAKIYELER.c.magaza_id,
+            _BAKIYELER.c.depo_id,
+            mevcut.label('mevcut_stok'),
+            kritik_seviye.label('kritik_seviye'),
+            eksik_miktar.label('eksik_miktar'),
+            uyari_sirasi.label('uyari_sirasi'),
+            _BAKIYELER.c.son_hareket_tarihi
+        ).join(
+            urunler, urunler.c.id == _BAKIYELER.c.urun_id
+        ).where(
+            mevcut <= kritik_seviye
+        )
+        
+        if magaza_id:
+            sorgu = sorgu.where(_BAKIYELER.c.magaza_id == magaza_id)
+        
+        if depo_id:
+            sorgu = sorgu.where(_BAKIYELER.c.depo_id == depo_id)
+        
+        if sadece_kritik:
+            sorgu = sorgu.where(uyari_sirasi == 1)
+        
+        sorgu = sorgu.order_by(uyari_sirasi, eksik_miktar.desc())
+        
+        session = self.db.oturum_olustur()
+        try:
+            sonuc = session.execute(sorgu.execution_options(yield_per=parti_boyutu))
+            for satir in sonuc:
+                yield dict(satir._mapping)
+            
+        finally:
+            session.close()
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.depolar.stok_hareket_repository
 # Description: Stok hareket repository implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Toplu hareket ekleme ve birleştirilmiş bakiye güncellemesi eklendi
 
 """
 SONTECHSP Stok Hareket Repository
@@ -12,24 +13,32 @@ Bu modül stok hareket veri erişim işlemlerini gerçekleştirir.
 PostgreSQL SELECT FOR UPDATE ile eş zamanlı erişim kontrolü yapar.
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import text
+from sqlalchemy import insert, text
 
 from sontechsp.uygulama.veritabani.modeller.stok import StokHareket, StokBakiye
 from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
-from ..dto import StokHareketDTO, StokHareketFiltreDTO
+from ..dto import StokBakiyeDTO, StokHareketDTO, StokHareketFiltreDTO
 from ..hatalar import EsZamanliErisimError
-from .arayuzler import IStokHareketRepository
+from .arayuzler import IStokBakiyeRepository, IStokHareketRepository
+from .oturum import islem_oturumu
+from .stok_bakiye_repository import StokBakiyeRepository
+
+_HAREKETLER = StokHareket.__table__
+
+# (urun_id, magaza_id, depo_id) bakiye anahtarı
+BakiyeAnahtari = Tuple[int, int, Optional[int]]
 
 
 class StokHareketRepository(IStokHareketRepository):
     """Stok hareket repository implementasyonu"""
     
-    def __init__(self):
+    def __init__(self, bakiye_repository: Optional[IStokBakiyeRepository] = None):
         self.db = VeriTabaniBaglanti()
+        self._bakiye_repository = bakiye_repository
     
     def hareket_ekle(self, hareket: StokHareketDTO) -> int:
         """Yeni stok hareketi ekler"""
@@ -65,6 +74,54 @@ class StokHareketRepository(IStokHareketRepository):
         finally:
             session.close()
     
+    def toplu_hareket_uygula(
+        self,
+        hareketler: List[StokHareketDTO],
+        bakiye_dogrulayici: Optional[Callable[[StokBakiyeDTO, Decimal], None]] = None,
+        session: Optional[Session] = None
+    ) -> List[StokBakiyeDTO]:
+        """
+        Hareket listesini tek transaction içinde kaydeder ve bakiyelere uygular
+        
+        Hareketler (urun_id, magaza_id, depo_id) anahtarına göre toplanır; her
+        anahtar için tek upsert yapılır. Anahtarlar sıralı işlendiği için satır
+        kilitleri her transaction'da aynı sırayla alınır ve eş zamanlı sepetler
+        birbirini kilitlenmeye (deadlock) sokmaz. Hareket satırları tek
+        executemany INSERT ile eklenir.
+        
+        Args:
+            hareketler: Kaydedilecek hareketler (miktar işaretli: + giriş, - çıkış)
+            bakiye_dogrulayici: Her anahtarın güncel bakiyesi ve toplam değişimi
+                ile çağrılır; hata fırlatırsa tüm işlem geri alınır
+            session: Verilirse dış transaction'a katılır (commit çağıranındır)
+            
+        Returns:
+            List[StokBakiyeDTO]: Anahtar sırasıyla güncel bakiyeler
+        """
+        if not hareketler:
+            return []
+        
+        for hareket in hareketler:
+            hatalar = hareket.validate()
+            if hatalar:
+                raise ValueError(f"Hareket doğrulama hatası: {', '.join(hatalar)}")
+        
+        degisimler = self._bakiye_degisimlerini_topla(hareketler)
+        bakiye_repository = self._bakiye_repository_al()
+        
+        with islem_oturumu(self.db, session) as oturum:
+            bakiyeler = []
+            for (urun_id, magaza_id, depo_id), degisim in degisimler:
+                bakiye = bakiye_repository.bakiye_degisimi_uygula(
+                    urun_id, magaza_id, degisim, depo_id, session=oturum
+                )
+                if bakiye_dogrulayici is not None:
+                    bakiye_dogrulayici(bakiye, degisim)
+                bakiyeler.append(bakiye)
+            
+            oturum.execute(insert(_HAREKETLER), [self._dto_to_satir(h) for h in hareketler])
+            return bakiyeler
+    
     def hareket_listesi(self, filtre: StokHareketFiltreDTO) -> List[StokHareketDTO]:
         """Filtrelenmiş hareket listesi getirir"""
         # Filtre doğrulama
@@ -146,4 +203,41 @@ class StokHareketRepository(IStokHareketRepository):
             aciklama=hareket.aciklama,
             kullanici_id=hareket.kullanici_id,
             olusturma_tarihi=hareket.olusturma_tarihi
-        )
\ No newline at end of file
+        )
+    
+    def _dto_to_satir(self, hareket: StokHareketDTO) -> Dict[str, object]:
+        """DTO'yu toplu INSERT parametre satırına çevirir"""
+        return {
+            'urun_id': hareket.urun_id,
+            'magaza_id': hareket.magaza_id,
+            'depo_id': hareket.depo_id,
+            'hareket_tipi': hareket.hareket_tipi,
+            'miktar': hareket.miktar,
+            'birim_fiyat': hareket.birim_fiyat,
+            'toplam_tutar': hareket.toplam_tutar,
+            'referans_tablo': hareket.referans_tablo,
+            'referans_id': hareket.referans_id,
+            'aciklama': hareket.aciklama,
+            'kullanici_id': hareket.kullanici_id
+        }
+    
+    def _bakiye_degisimlerini_topla(
+        self, hareketler: List[StokHareketDTO]
+    ) -> List[Tuple[BakiyeAnahtari, Decimal]]:
+        """Hareketleri bakiye anahtarına göre toplar, kilit sırasına dizer"""
+        toplamlar: Dict[BakiyeAnahtari, Decimal] = {}
+        for hareket in hareketler:
+            anahtar = (hareket.urun_id, hareket.magaza_id, hareket.depo_id or None)
+            toplamlar[anahtar] = toplamlar.get(anahtar, Decimal('0')) + hareket.miktar
+        
+        # depo_id None olabilir; sıralama için 0 kabul edilir
+        return sorted(
+            toplamlar.items(),
+            key=lambda kayit: (kayit[0][0], kayit[0][1], kayit[0][2] or 0)
+        )
+    
+    def _bakiye_repository_al(self) -> IStokBakiyeRepository:
+        """Bakiye repository'sini döndürür (verilmemişse oluşturur)"""
+        if self._bakiye_repository is None:
+            self._bakiye_repository = StokBakiyeRepository()
+        return self._bakiye_repository
@@ -0,0 +1,235 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.stok_rezervasyon_repository
+# Description: Stok rezervasyon repository implementasyonu
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Stok Rezervasyon Repository
+
+Bu modül stok_rezervasyonlari tablosu üzerindeki veri erişim işlemlerini
+gerçekleştirir. Rezervasyon kaydı ve stok_bakiyeleri.rezerve_miktar her
+zaman aynı transaction içinde güncellenir. Durum geçişleri
+"durum = 'AKTIF'" korumalı UPDATE ile yapıldığından aynı rezervasyon iki
+terminalden iki kez serbest bırakılamaz.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokRezervasyon
+from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
+from ..dto import StokRezervasyonDTO
+from .arayuzler import IStokBakiyeRepository, IStokRezervasyonRepository
+from .oturum import islem_oturumu
+from .stok_bakiye_repository import StokBakiyeRepository
+
+_REZERVASYONLAR = StokRezervasyon.__table__
+
+AKTIF = 'AKTIF'
+
+
+class StokRezervasyonRepository(IStokRezervasyonRepository):
+    """Stok rezervasyon repository implementasyonu"""
+
+    def __init__(self, bakiye_repository: Optional[IStokBakiyeRepository] = None):
+        self.db = VeriTabaniBaglanti()
+        self._bakiye_repository = bakiye_repository or StokBakiyeRepository()
+
+    def rezervasyon_ekle(self, rezervasyon: StokRezervasyonDTO,
+                         session: Optional[Session] = None) -> None:
+        """
+        Rezervasyonu kaydeder ve bakiyede rezerve eder
+
+        Raises:
+            StokYetersizError: Kullanılabilir stok yetersizse (kayıt eklenmez)
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            self._bakiye_repository.rezervasyon_yap(
+                rezervasyon.urun_id, rezervasyon.magaza_id,
+                rezervasyon.rezerve_miktar, rezervasyon.depo_id, session=oturum
+            )
+            oturum.execute(insert(_REZERVASYONLAR).values(
+                rezervasyon_no=rezervasyon.rezervasyon_id,
+                urun_id=rezervasyon.urun_id,
+                magaza_id=rezervasyon.magaza_id,
+                depo_id=rezervasyon.depo_id,
+                miktar=rezervasyon.rezerve_miktar,
+                durum=rezervasyon.durum,
+                gecerlilik_tarihi=rezervasyon.gecerlilik_tarihi,
+                referans_tablo=rezervasyon.referans_tablo,
+                referans_id=rezervasyon.referans_id,
+                aciklama=rezervasyon.aciklama
+            ))
+
+    def rezervasyon_getir(self, rezervasyon_no: str) -> Optional[StokRezervasyonDTO]:
+        """Rezervasyon numarası ile kayıt getirir"""
+        with islem_oturumu(self.db) as oturum:
+            satir = oturum.execute(
+                select(_REZERVASYONLAR).where(_REZERVASYONLAR.c.rezervasyon_no == rezervasyon_no)
+            ).first()
+            return self._satir_to_dto(satir) if satir else None
+
+    def rezervasyon_kapat(self, rezervasyon_no: str, yeni_durum: str,
+                          session: Optional[Session] = None) -> Optional[StokRezervasyonDTO]:
+        """
+        Aktif rezervasyonu kapatır ve kalan miktarı bakiyeden serbest bırakır
+
+        Returns:
+            Optional[StokRezervasyonDTO]: Kapatılan kayıt (kapanış öncesi miktarla)
+                veya rezervasyon aktif değilse None
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            satir = oturum.execute(
+                update(_REZERVASYONLAR)
+                .where(_REZERVASYONLAR.c.rezervasyon_no == rezervasyon_no,
+                       _REZERVASYONLAR.c.durum == AKTIF)
+                .values(durum=yeni_durum, guncelleme_tarihi=func.now())
+                .returning(*_REZERVASYONLAR.c)
+            ).first()
+            if satir is None:
+                return None
+
+            self._bakiye_repository.rezervasyon_iptal(
+                satir.urun_id, satir.magaza_id, satir.miktar, satir.depo_id, session=oturum
+            )
+            return self._satir_to_dto(satir)
+
+    def rezervasyon_kullan(self, rezervasyon_no: str, miktar: Decimal,
+                           session: Optional[Session] = None) -> Optional[StokRezervasyonDTO]:
+        """
+        Rezervasyondan miktar kullanır: rezerve miktar serbest bırakılır ve
+        stoktan düşülür; kalan sıfırlanırsa rezervasyon KULLANILDI olur
+
+        Returns:
+            Optional[StokRezervasyonDTO]: Güncel kayıt veya rezervasyon aktif
+                değil / kalan miktar yetersizse None
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            kalan = _REZERVASYONLAR.c.miktar - miktar
+            satir = oturum.execute(
+                update(_REZERVASYONLAR)
+                .where(_REZERVASYONLAR.c.rezervasyon_no == rezervasyon_no,
+                       _REZERVASYONLAR.c.durum == AKTIF,
+                       _REZERVASYONLAR.c.miktar >= miktar)
+                .values(
+                    miktar=kalan,
+                    durum=case((kalan <= 0, 'KULLANILDI'), else_=_REZERVASYONLAR.c.durum),
+                    guncelleme_tarihi=func.now()
+                )
+                .returning(*_REZERVASYONLAR.c)
+            ).first()
+            if satir is None:
+                return None
+
+            self._bakiye_repository.rezervasyon_iptal(
+                satir.urun_id, satir.magaza_id, miktar, satir.depo_id, session=oturum
+            )
+            self._bakiye_repository.bakiye_degisimi_uygula(
+                satir.urun_id, satir.magaza_id, -miktar, satir.depo_id, session=oturum
+            )
+            return self._satir_to_dto(satir)
+
+    def aktif_rezervasyonlar(self, urun_id: Optional[int] = None,
+                             magaza_id: Optional[int] = None) -> List[StokRezervasyonDTO]:
+        """Aktif rezervasyonları en yeni önce olacak şekilde getirir"""
+        sorgu = select(_REZERVASYONLAR).where(_REZERVASYONLAR.c.durum == AKTIF)
+        if urun_id is not None:
+            sorgu = sorgu.where(_REZERVASYONLAR.c.urun_id == urun_id)
+        if magaza_id is not None:
+            sorgu = sorgu.where(_REZERVASYONLAR.c.magaza_id == magaza_id)
+        sorgu = sorgu.order_by(_REZERVASYONLAR.c.olusturma_tarihi.desc(),
+                               _REZERVASYONLAR.c.id.desc())
+
+        with islem_oturumu(self.db) as oturum:
+            return [self._satir_to_dto(satir) for satir in oturum.execute(sorgu)]
+
+    def aktif_toplamlar(self) -> Dict[Tuple[int, int], Tuple[Decimal, int]]:
+        """
+        (urun_id, magaza_id) başına aktif rezerve toplamı ve rezervasyon sayısı
+
+        Kısmi ix_stok_rezervasyon_urun_magaza indeksi üzerinden tek GROUP BY.
+        """
+        sorgu = select(
+            _REZERVASYONLAR.c.urun_id,
+            _REZERVASYONLAR.c.magaza_id,
+            func.sum(_REZERVASYONLAR.c.miktar),
+            func.count()
+        ).where(
+            _REZERVASYONLAR.c.durum == AKTIF
+        ).group_by(_REZERVASYONLAR.c.urun_id, _REZERVASYONLAR.c.magaza_id)
+
+        with islem_oturumu(self.db) as oturum:
+            return {
+                (urun_id, magaza_id): (Decimal(str(toplam)), adet)
+                for urun_id, magaza_id, toplam, adet in oturum.execute(sorgu)
+            }
+
+    def suresi_dolanlari_dusur(self, simdi: datetime, parti_boyutu: int = 500,
+                               session: Optional[Session] = None) -> List[StokRezervasyonDTO]:
+        """
+        Süresi dolan aktif rezervasyonlardan bir partiyi SURESI_DOLDU yapar
+        ve rezerve miktarlarını bakiyelerden toplu serbest bırakır
+
+        Kayıtlar gecerlilik_tarihi indeksi sırasıyla seçilir; PostgreSQL'de
+        SKIP LOCKED ile başka terminalin işlediği satırlar atlanır. Bakiye
+        iadeleri (urun_id, magaza_id, depo_id) başına toplanıp sabit sırada
+        uygulanır.
+
+        Returns:
+            List[StokRezervasyonDTO]: Düşürülen rezervasyonlar
+        """
+        with islem_oturumu(self.db, session) as oturum:
+            idler = oturum.execute(
+                select(_REZERVASYONLAR.c.id)
+                .where(_REZERVASYONLAR.c.durum == AKTIF,
+                       _REZERVASYONLAR.c.gecerlilik_tarihi < simdi)
+                .order_by(_REZERVASYONLAR.c.gecerlilik_tarihi)
+                .limit(parti_boyutu)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not idler:
+                return []
+
+            satirlar = oturum.execute(
+                update(_REZERVASYONLAR)
+                .where(_REZERVASYONLAR.c.id.in_(idler),
+                       _REZERVASYONLAR.c.durum == AKTIF)
+                .values(durum='SURESI_DOLDU', guncelleme_tarihi=func.now())
+                .returning(*_REZERVASYONLAR.c)
+            ).all()
+
+            iadeler: Dict[Tuple[int, int, Optional[int]], Decimal] = {}
+            for satir in satirlar:
+                anahtar = (satir.urun_id, satir.magaza_id, satir.depo_id)
+                iadeler[anahtar] = iadeler.get(anahtar, Decimal('0')) + satir.miktar
+
+            for (urun_id, magaza_id, depo_id), miktar in sorted(
+                iadeler.items(), key=lambda kayit: (kayit[0][0], kayit[0][1], kayit[0][2] or 0)
+            ):
+                self._bakiye_repository.rezervasyon_iptal(
+                    urun_id, magaza_id, miktar, depo_id, session=oturum
+                )
+
+            return [self._satir_to_dto(satir) for satir in satirlar]
+
+    def _satir_to_dto(self, satir) -> StokRezervasyonDTO:
+        """Tablo satırını DTO'ya çevirir"""
+        return StokRezervasyonDTO(
+            rezervasyon_id=satir.rezervasyon_no,
+            urun_id=satir.urun_id,
+            magaza_id=satir.magaza_id,
+            depo_id=satir.depo_id,
+            rezerve_miktar=satir.miktar,
+            rezervasyon_tarihi=satir.olusturma_tarihi,
+            gecerlilik_tarihi=satir.gecerlilik_tarihi,
+            durum=satir.durum,
+            referans_tablo=satir.referans_tablo,
+            referans_id=satir.referans_id,
+            aciklama=satir.aciklama
+        )
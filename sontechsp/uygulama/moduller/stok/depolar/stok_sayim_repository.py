@@ -0,0 +1,266 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.stok_sayim_repository
+# Description: Stok sayım repository implementasyonu
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Stok Sayım Repository
+
+Bu modül stok_sayimlari ve stok_sayim_satirlari tabloları üzerindeki veri
+erişim işlemlerini gerçekleştirir:
+- Sayım başında stok_bakiyeleri görüntüsü tek INSERT ... SELECT ile alınır
+- Sayım verileri parti halinde upsert edilir
+- Farklar küme tabanlı hesaplanır ve parti başına tek transaction'da
+  hareket + bakiye + uygulandı işareti olarak yazılır
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, case, false, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, StokSayim, StokSayimSatiri
+from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
+from ..dto import StokHareketDTO
+from .arayuzler import IStokHareketRepository, IStokSayimRepository
+from .oturum import islem_oturumu
+from .stok_hareket_repository import StokHareketRepository
+
+_SAYIMLAR = StokSayim.__table__
+_SATIRLAR = StokSayimSatiri.__table__
+_BAKIYELER = StokBakiye.__table__
+
+
+class StokSayimRepository(IStokSayimRepository):
+    """Stok sayım repository implementasyonu"""
+
+    def __init__(self, hareket_repository: Optional[IStokHareketRepository] = None):
+        self.db = VeriTabaniBaglanti()
+        self._hareket_repository = hareket_repository or StokHareketRepository()
+
+    def sayim_olustur(self, sayim_no: str, magaza_id: int, depo_id: Optional[int] = None,
+                      kullanici_id: Optional[int] = None,
+                      aciklama: Optional[str] = None) -> int:
+        """
+        Sayım oturumunu oluşturur ve bakiye görüntüsünü alır
+
+        Görüntü, mağaza/depo bakiyelerinin tek INSERT ... SELECT ile
+        stok_sayim_satirlari tablosuna kopyalanmasıdır.
+
+        Returns:
+            int: Sayım kayıt ID'si
+        """
+        with islem_oturumu(self.db) as oturum:
+            sayim_id = oturum.execute(
+                insert(_SAYIMLAR).values(
+                    sayim_no=sayim_no,
+                    magaza_id=magaza_id,
+                    depo_id=depo_id,
+                    kullanici_id=kullanici_id,
+                    aciklama=aciklama,
+                    durum='BASLADI',
+                    uygulanan_kalem=0
+                ).returning(_SAYIMLAR.c.id)
+            ).scalar_one()
+
+            goruntu = select(
+                literal(sayim_id), _BAKIYELER.c.urun_id, _BAKIYELER.c.miktar, false()
+            ).where(
+                _BAKIYELER.c.magaza_id == magaza_id,
+                _BAKIYELER.c.depo_id == depo_id if depo_id else _BAKIYELER.c.depo_id.is_(None)
+            )
+            oturum.execute(insert(_SATIRLAR).from_select(
+                ['sayim_id', 'urun_id', 'sistem_miktar', 'uygulandi'], goruntu
+            ))
+
+            return sayim_id
+
+    def sayim_getir(self, sayim_no: str) -> Optional[Dict[str, Any]]:
+        """Sayım başlığını kalem sayılarıyla birlikte getirir"""
+        with islem_oturumu(self.db) as oturum:
+            baslik = oturum.execute(
+                select(_SAYIMLAR).where(_SAYIMLAR.c.sayim_no == sayim_no)
+            ).first()
+            if baslik is None:
+                return None
+
+            sayim = dict(baslik._mapping)
+            sayim.update(self._kalem_sayilari(oturum, baslik.id))
+            return sayim
+
+    def aktif_sayimlar(self, magaza_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Tamamlanmamış ve iptal edilmemiş sayım başlıklarını getirir"""
+        sorgu = select(_SAYIMLAR).where(
+            _SAYIMLAR.c.durum.in_(('BASLADI', 'DEVAM_EDIYOR', 'UYGULANIYOR'))
+        )
+        if magaza_id is not None:
+            sorgu = sorgu.where(_SAYIMLAR.c.magaza_id == magaza_id)
+
+        with islem_oturumu(self.db) as oturum:
+            return [dict(satir._mapping) for satir in oturum.execute(sorgu.order_by(_SAYIMLAR.c.id))]
+
+    def durum_guncelle(self, sayim_id: int, yeni_durum: str,
+                       beklenen_durumlar: Tuple[str, ...], **alanlar) -> bool:
+        """
+        Sayım durumunu yalnızca beklenen durumlardan birindeyse değiştirir
+
+        Returns:
+            bool: Durum değişti mi
+        """
+        with islem_oturumu(self.db) as oturum:
+            sonuc = oturum.execute(
+                update(_SAYIMLAR)
+                .where(_SAYIMLAR.c.id == sayim_id, _SAYIMLAR.c.durum.in_(beklenen_durumlar))
+                .values(durum=yeni_durum, guncelleme_tarihi=func.now(), **alanlar)
+            )
+            return sonuc.rowcount > 0
+
+    def sayim_verileri_yaz(self, sayim_id: int, kayitlar: List[Tuple[int, Decimal]],
+                           toplama: bool = False) -> int:
+        """
+        Sayım verilerini tek executemany upsert ile yazar
+
+        Görüntüde olmayan ürünler sistem miktarı 0 ile eklenir.
+
+        Args:
+            kayitlar: (urun_id, sayilan_miktar) listesi
+            toplama: True ise mevcut sayılan miktara eklenir (aynı ürünün
+                farklı raflarda okutulması), False ise üzerine yazılır
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        if not kayitlar:
+            return 0
+
+        with islem_oturumu(self.db) as oturum:
+            insert_ = postgresql_insert if oturum.get_bind().dialect.name == "postgresql" else sqlite_insert
+            ifade = insert_(_SATIRLAR)
+            yeni_miktar = ifade.excluded.sayilan_miktar
+            if toplama:
+                yeni_miktar = func.coalesce(_SATIRLAR.c.sayilan_miktar, 0) + yeni_miktar
+
+            ifade = ifade.on_conflict_do_update(
+                index_elements=[_SATIRLAR.c.sayim_id, _SATIRLAR.c.urun_id],
+                set_={'sayilan_miktar': yeni_miktar, 'guncelleme_tarihi': func.now()}
+            )
+            oturum.execute(ifade, [
+                {
+                    'sayim_id': sayim_id,
+                    'urun_id': urun_id,
+                    'sistem_miktar': Decimal('0.0000'),
+                    'sayilan_miktar': miktar,
+                    'uygulandi': False
+                }
+                for urun_id, miktar in kayitlar
+            ])
+            oturum.execute(
+                update(_SAYIMLAR)
+                .where(_SAYIMLAR.c.id == sayim_id, _SAYIMLAR.c.durum == 'BASLADI')
+                .values(durum='DEVAM_EDIYOR', guncelleme_tarihi=func.now())
+            )
+            return len(kayitlar)
+
+    def farklar_getir(self, sayim_id: int, parti_boyutu: int = 5000) -> Iterator[Tuple[int, Decimal]]:
+        """
+        Sayılan ve sistem miktarı farklı olan kalemleri akış olarak getirir
+
+        Yields:
+            Tuple[int, Decimal]: (urun_id, sayilan - sistem)
+        """
+        sorgu = select(
+            _SATIRLAR.c.urun_id, _SATIRLAR.c.sayilan_miktar - _SATIRLAR.c.sistem_miktar
+        ).where(self._fark_kosulu(sayim_id)).order_by(_SATIRLAR.c.urun_id)
+
+        with islem_oturumu(self.db) as oturum:
+            for urun_id, fark in oturum.execute(sorgu.execution_options(yield_per=parti_boyutu)):
+                yield urun_id, Decimal(str(fark))
+
+    def fark_partisi_uygula(self, sayim: Dict[str, Any], parti_boyutu: int = 1000) -> int:
+        """
+        Uygulanmamış farklardan bir partiyi tek transaction'da bakiyeye işler
+
+        Parti ürün ID sırasıyla seçilir; SAYIM hareketleri toplu eklenir,
+        bakiyeler toplu güncellenir, satırlar uygulandı olarak işaretlenir ve
+        başlıktaki ilerleme sayacı artırılır. Yarıda kalan uygulama aynı
+        çağrıyla kaldığı yerden devam eder.
+
+        Args:
+            sayim: sayim_getir ile alınmış sayım başlığı
+
+        Returns:
+            int: Bu partide uygulanan kalem sayısı (0 ise bitti)
+        """
+        with islem_oturumu(self.db) as oturum:
+            parti = oturum.execute(
+                select(_SATIRLAR.c.urun_id, _SATIRLAR.c.sayilan_miktar - _SATIRLAR.c.sistem_miktar)
+                .where(self._fark_kosulu(sayim['id']), _SATIRLAR.c.uygulandi == false())
+                .order_by(_SATIRLAR.c.urun_id)
+                .limit(parti_boyutu)
+                .with_for_update()
+            ).all()
+            if not parti:
+                return 0
+
+            hareketler = [
+                StokHareketDTO(
+                    urun_id=urun_id,
+                    magaza_id=sayim['magaza_id'],
+                    depo_id=sayim['depo_id'],
+                    hareket_tipi="SAYIM",
+                    miktar=Decimal(str(fark)),
+                    aciklama=f"Sayım farkı - Sayım ID: {sayim['sayim_no']}",
+                    kullanici_id=sayim['kullanici_id'],
+                    referans_tablo="stok_sayimlari",
+                    referans_id=sayim['id']
+                )
+                for urun_id, fark in parti
+            ]
+            self._hareket_repository.toplu_hareket_uygula(hareketler, session=oturum)
+
+            oturum.execute(
+                update(_SATIRLAR)
+                .where(_SATIRLAR.c.sayim_id == sayim['id'],
+                       _SATIRLAR.c.urun_id.in_([urun_id for urun_id, _ in parti]))
+                .values(uygulandi=True, guncelleme_tarihi=func.now())
+            )
+            oturum.execute(
+                update(_SAYIMLAR)
+                .where(_SAYIMLAR.c.id == sayim['id'])
+                .values(uygulanan_kalem=_SAYIMLAR.c.uygulanan_kalem + len(parti),
+                        guncelleme_tarihi=func.now())
+            )
+            return len(parti)
+
+    def _kalem_sayilari(self, oturum: Session, sayim_id: int) -> Dict[str, int]:
+        """Görüntü, sayılan ve fark kalem sayılarını tek sorguda hesaplar"""
+        fark_var = and_(
+            _SATIRLAR.c.sayilan_miktar.is_not(None),
+            _SATIRLAR.c.sayilan_miktar != _SATIRLAR.c.sistem_miktar
+        )
+        satir = oturum.execute(
+            select(
+                func.count(),
+                func.count(_SATIRLAR.c.sayilan_miktar),
+                func.coalesce(func.sum(case((fark_var, 1), else_=0)), 0)
+            ).where(_SATIRLAR.c.sayim_id == sayim_id)
+        ).one()
+
+        return {
+            'toplam_kalem': satir[0],
+            'sayilan_kalem': satir[1],
+            'fark_kalem': satir[2]
+        }
+
+    def _fark_kosulu(self, sayim_id: int):
+        """Sayılmış ve sistem miktarından farklı satır koşulu"""
+        return and_(
+            _SATIRLAR.c.sayim_id == sayim_id,
+            _SATIRLAR.c.sayilan_miktar.is_not(None),
+            _SATIRLAR.c.sayilan_miktar != _SATIRLAR.c.sistem_miktar
+        )
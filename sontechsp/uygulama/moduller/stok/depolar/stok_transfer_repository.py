@@ -0,0 +1,255 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.stok_transfer_repository
+# Description: Stok transfer belgesi repository implementasyonu
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Stok Transfer Repository
+
+Bu modül stok_transferleri ve stok_transfer_satirlari tabloları üzerindeki
+veri erişim işlemlerini gerçekleştirir:
+- Belge başlığı, satırları ve sevk hareketleri tek transaction'da yazılır
+- Her bacak (sevk, kabul, iptal) tüm satırlar için tek toplu hareket
+  uygulamasıdır; bakiye satırları (urun_id, magaza_id, depo_id) sırasıyla
+  kilitlenir, eş zamanlı transferler birbirini kilitlenmeye sokmaz
+- Durum geçişleri korumalı UPDATE ile yapılır; aynı belge iki kez kabul
+  veya iptal edilemez
+"""
+
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokTransfer, StokTransferSatiri
+from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
+from ..dto import StokBakiyeDTO, StokHareketDTO
+from .arayuzler import IStokHareketRepository, IStokTransferRepository
+from .oturum import islem_oturumu
+from .stok_hareket_repository import StokHareketRepository
+
+_TRANSFERLER = StokTransfer.__table__
+_SATIRLAR = StokTransferSatiri.__table__
+
+BakiyeDogrulayici = Callable[[StokBakiyeDTO, Decimal], None]
+
+
+class StokTransferRepository(IStokTransferRepository):
+    """Stok transfer repository implementasyonu"""
+
+    def __init__(self, hareket_repository: Optional[IStokHareketRepository] = None):
+        self.db = VeriTabaniBaglanti()
+        self._hareket_repository = hareket_repository or StokHareketRepository()
+
+    def belge_olustur(self, belge: Dict[str, Any], satirlar: List[Tuple[int, Decimal]],
+                      yolda: bool = True,
+                      bakiye_dogrulayici: Optional[BakiyeDogrulayici] = None) -> int:
+        """
+        Transfer belgesini oluşturur ve sevk eder
+
+        Başlık, satırlar (tek executemany) ve kaynak çıkış hareketleri aynı
+        transaction'dadır. yolda False ise hedef giriş hareketleri de aynı
+        toplu uygulamaya eklenir; iki bacağın bakiye kilitleri tek sıralı
+        listede alınır.
+
+        Args:
+            belge: transfer_no, kaynak/hedef mağaza-depo, kullanici_id, aciklama
+            satirlar: (urun_id, miktar) listesi; ürünler tekil olmalıdır
+            yolda: True ise belge YOLDA kalır, hedefe kabul ile girer
+            bakiye_dogrulayici: Her bakiye anahtarı için çağrılır; hata
+                fırlatırsa tüm belge geri alınır
+
+        Returns:
+            int: Transfer belgesi ID'si
+        """
+        with islem_oturumu(self.db) as oturum:
+            baslik = oturum.execute(
+                insert(_TRANSFERLER).values(
+                    **belge,
+                    durum='YOLDA' if yolda else 'TAMAMLANDI',
+                    sevk_tarihi=func.now(),
+                    kabul_tarihi=None if yolda else func.now()
+                ).returning(*_TRANSFERLER.c)
+            ).one()
+            baslik = dict(baslik._mapping)
+
+            oturum.execute(insert(_SATIRLAR), [
+                {'transfer_id': baslik['id'], 'urun_id': urun_id, 'miktar': miktar}
+                for urun_id, miktar in satirlar
+            ])
+
+            hareketler = self._cikis_hareketleri(baslik, satirlar, baslik['kullanici_id'])
+            if not yolda:
+                hareketler += self._giris_hareketleri(baslik, satirlar, baslik['kullanici_id'])
+            self._hareket_repository.toplu_hareket_uygula(hareketler, bakiye_dogrulayici, session=oturum)
+            return baslik['id']
+
+    def belge_getir(self, transfer_no: str) -> Optional[Dict[str, Any]]:
+        """Transfer belgesini satırlarıyla birlikte getirir"""
+        with islem_oturumu(self.db) as oturum:
+            baslik = oturum.execute(
+                select(_TRANSFERLER).where(_TRANSFERLER.c.transfer_no == transfer_no)
+            ).first()
+            if baslik is None:
+                return None
+
+            belge = dict(baslik._mapping)
+            belge['satirlar'] = self._satirlar(oturum, baslik.id)
+            return belge
+
+    def kabul_et(self, transfer_no: str, kullanici_id: Optional[int] = None) -> bool:
+        """
+        YOLDA belgeyi hedefe kabul eder
+
+        Durum geçişi ve tüm satırların giriş hareketleri tek transaction'dır.
+
+        Returns:
+            bool: Belge kabul edildi mi (YOLDA değilse False)
+        """
+        with islem_oturumu(self.db) as oturum:
+            baslik = self._durum_degistir(oturum, transfer_no, 'TAMAMLANDI', ('YOLDA',),
+                                          kabul_tarihi=func.now())
+            if baslik is None:
+                return False
+
+            satirlar = self._satirlar(oturum, baslik['id'])
+            self._hareket_repository.toplu_hareket_uygula(
+                self._giris_hareketleri(baslik, satirlar, kullanici_id), session=oturum
+            )
+            return True
+
+    def iptal_et(self, transfer_no: str, kullanici_id: Optional[int] = None,
+                 bakiye_dogrulayici: Optional[BakiyeDogrulayici] = None) -> bool:
+        """
+        Belgeyi iptal eder ve stok etkisini geri alır
+
+        YOLDA belgede miktarlar kaynağa iade edilir; TAMAMLANDI belgede
+        ayrıca hedeften geri düşülür.
+
+        Returns:
+            bool: Belge iptal edildi mi (zaten iptal ise False)
+        """
+        with islem_oturumu(self.db) as oturum:
+            onceki_durum = oturum.execute(
+                select(_TRANSFERLER.c.durum)
+                .where(_TRANSFERLER.c.transfer_no == transfer_no)
+                .with_for_update()
+            ).scalar()
+            if onceki_durum not in ('YOLDA', 'TAMAMLANDI'):
+                return False
+
+            baslik = self._durum_degistir(oturum, transfer_no, 'IPTAL_EDILDI', (onceki_durum,),
+                                          iptal_tarihi=func.now())
+            if baslik is None:
+                return False
+
+            satirlar = self._satirlar(oturum, baslik['id'])
+            hareketler = self._iptal_hareketleri(
+                baslik, satirlar, kullanici_id, hedeften_dus=onceki_durum == 'TAMAMLANDI'
+            )
+            self._hareket_repository.toplu_hareket_uygula(hareketler, bakiye_dogrulayici, session=oturum)
+            return True
+
+    def yoldaki_miktarlar(self, hedef_magaza_id: int,
+                          urun_idler: Optional[List[int]] = None) -> Dict[int, Decimal]:
+        """
+        Hedef mağazaya yolda olan ürün miktarlarını toplar
+
+        Returns:
+            Dict[int, Decimal]: urun_id -> yoldaki miktar
+        """
+        sorgu = select(
+            _SATIRLAR.c.urun_id, func.sum(_SATIRLAR.c.miktar)
+        ).join(
+            _TRANSFERLER, _TRANSFERLER.c.id == _SATIRLAR.c.transfer_id
+        ).where(
+            _TRANSFERLER.c.hedef_magaza_id == hedef_magaza_id,
+            _TRANSFERLER.c.durum == 'YOLDA'
+        ).group_by(_SATIRLAR.c.urun_id).order_by(_SATIRLAR.c.urun_id)
+        if urun_idler is not None:
+            sorgu = sorgu.where(_SATIRLAR.c.urun_id.in_(list(urun_idler)))
+
+        with islem_oturumu(self.db) as oturum:
+            return {urun_id: Decimal(str(miktar)) for urun_id, miktar in oturum.execute(sorgu)}
+
+    def _durum_degistir(self, oturum: Session, transfer_no: str, yeni_durum: str,
+                        beklenen_durumlar: Tuple[str, ...], **alanlar) -> Optional[Dict[str, Any]]:
+        """Durumu yalnızca beklenen durumlardan birindeyse değiştirir, başlığı döndürür"""
+        satir = oturum.execute(
+            update(_TRANSFERLER)
+            .where(_TRANSFERLER.c.transfer_no == transfer_no,
+                   _TRANSFERLER.c.durum.in_(beklenen_durumlar))
+            .values(durum=yeni_durum, guncelleme_tarihi=func.now(), **alanlar)
+            .returning(*_TRANSFERLER.c)
+        ).first()
+        return dict(satir._mapping) if satir else None
+
+    def _satirlar(self, oturum: Session, transfer_id: int) -> List[Tuple[int, Decimal]]:
+        """Belge satırlarını ürün ID sırasıyla getirir"""
+        return [
+            (urun_id, Decimal(str(miktar)))
+            for urun_id, miktar in oturum.execute(
+                select(_SATIRLAR.c.urun_id, _SATIRLAR.c.miktar)
+                .where(_SATIRLAR.c.transfer_id == transfer_id)
+                .order_by(_SATIRLAR.c.urun_id)
+            )
+        ]
+
+    def _cikis_hareketleri(self, baslik: Dict[str, Any], satirlar: List[Tuple[int, Decimal]],
+                           kullanici_id: Optional[int]) -> List[StokHareketDTO]:
+        """Kaynak lokasyon için transfer çıkış hareketleri"""
+        hedef = f"M{baslik['hedef_magaza_id']}D{baslik['hedef_depo_id'] or 0}"
+        return [
+            self._hareket(baslik, urun_id, baslik['kaynak_magaza_id'], baslik['kaynak_depo_id'],
+                          -miktar, f"Transfer çıkışı - Ref: {baslik['transfer_no']} - Hedef: {hedef}",
+                          kullanici_id)
+            for urun_id, miktar in satirlar
+        ]
+
+    def _giris_hareketleri(self, baslik: Dict[str, Any], satirlar: List[Tuple[int, Decimal]],
+                           kullanici_id: Optional[int]) -> List[StokHareketDTO]:
+        """Hedef lokasyon için transfer giriş hareketleri"""
+        kaynak = f"M{baslik['kaynak_magaza_id']}D{baslik['kaynak_depo_id'] or 0}"
+        return [
+            self._hareket(baslik, urun_id, baslik['hedef_magaza_id'], baslik['hedef_depo_id'],
+                          miktar, f"Transfer girişi - Ref: {baslik['transfer_no']} - Kaynak: {kaynak}",
+                          kullanici_id)
+            for urun_id, miktar in satirlar
+        ]
+
+    def _iptal_hareketleri(self, baslik: Dict[str, Any], satirlar: List[Tuple[int, Decimal]],
+                           kullanici_id: Optional[int], hedeften_dus: bool) -> List[StokHareketDTO]:
+        """Kaynağa iade ve (kabul edilmişse) hedeften geri çıkış hareketleri"""
+        aciklama = f"Transfer iptali - Orijinal Ref: {baslik['transfer_no']}"
+        hareketler = [
+            self._hareket(baslik, urun_id, baslik['kaynak_magaza_id'], baslik['kaynak_depo_id'],
+                          miktar, aciklama, kullanici_id, 'stok_transfer_iptalleri')
+            for urun_id, miktar in satirlar
+        ]
+        if hedeften_dus:
+            hareketler += [
+                self._hareket(baslik, urun_id, baslik['hedef_magaza_id'], baslik['hedef_depo_id'],
+                              -miktar, aciklama, kullanici_id, 'stok_transfer_iptalleri')
+                for urun_id, miktar in satirlar
+            ]
+        return hareketler
+
+    def _hareket(self, baslik: Dict[str, Any], urun_id: int, magaza_id: int,
+                 depo_id: Optional[int], miktar: Decimal, aciklama: str,
+                 kullanici_id: Optional[int],
+                 referans_tablo: str = 'stok_transferleri') -> StokHareketDTO:
+        """Transfer belgesine bağlı TRANSFER hareketi (miktar işaretli)"""
+        return StokHareketDTO(
+            urun_id=urun_id,
+            magaza_id=magaza_id,
+            depo_id=depo_id,
+            hareket_tipi="TRANSFER",
+            miktar=miktar,
+            aciklama=aciklama,
+            kullanici_id=kullanici_id,
+            referans_tablo=referans_tablo,
+            referans_id=baslik['id']
+        )
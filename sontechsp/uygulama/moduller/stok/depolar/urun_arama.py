@@ -0,0 +1,55 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.depolar.urun_arama
+# Description: Ürün arama yardımcıları
+# Changelog:
+# - İlk oluşturma
+# - Katlama model modülündeki tek fonksiyona bağlandı
+
+"""
+SONTECHSP Ürün Arama Yardımcıları
+
+Arama terimini urunler.arama_anahtari kolonuna yazılan fonksiyonla
+katlar (Türkçe İ/ı ve aksanlar) ve SQLite FTS5 MATCH sorgusunu oluşturur.
+"""
+
+import re
+from typing import Optional
+
+from sontechsp.uygulama.veritabani.modeller.stok import arama_anahtari_katla
+
+_KELIME = re.compile(r'\w+')
+
+# Trigram benzerliği bu değerin altındaki sonuçlar bulanık eşleşme sayılmaz
+BENZERLIK_ESIGI = 0.3
+
+
+def arama_anahtari(metin: str) -> str:
+    """
+    Metni arama anahtarına katlar
+
+    Saklanan urunler.arama_anahtari değeriyle aynı fonksiyonu kullanır:
+    "İSTANBUL Işık" -> "istanbul isik".
+    """
+    return arama_anahtari_katla(metin)
+
+
+def fts_sorgusu(anahtar: str) -> Optional[str]:
+    """
+    Katlanmış anahtardan FTS5 MATCH ifadesi üretir
+
+    Her kelime tırnaklanır ve önek (*) olarak aranır; böylece yazarken
+    arama ("sut ulk" -> "sut"* "ulk"*) prefix indeksinden karşılanır.
+
+    Returns:
+        Optional[str]: MATCH ifadesi veya aranacak kelime yoksa None
+    """
+    kelimeler = _KELIME.findall(anahtar)
+    if not kelimeler:
+        return None
+    return ' '.join(f'"{kelime}"*' for kelime in kelimeler)
+
+
+def like_deseni(anahtar: str) -> str:
+    """LIKE joker karakterlerini kaçışlar"""
+    return anahtar.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
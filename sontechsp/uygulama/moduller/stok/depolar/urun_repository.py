@@ -1,27 +1,51 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.depolar.urun_repository
 # Description: Ürün repository implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Güncelleme/silmede barkod indeksi kancası eklendi
+# - İndeksli, sıralı ürün araması (pg_trgm / FTS5) eklendi
+# - Arama saklanan arama_anahtari kolonu üzerinden yapılıyor
 
 """
 SONTECHSP Ürün Repository
 
 Bu modül ürün veri erişim işlemlerini gerçekleştirir.
 Ürün CRUD işlemleri ve iş kuralları kontrolü yapar.
+
+Ürün araması urunler.arama_anahtari kolonu üzerinden yapılır: online
+(PostgreSQL) veritabanında pg_trgm GIN indeksi, offline (SQLite)
+veritabanında bu kolonu tetikleyicilerle kopyalayan urun_arama_fts FTS5
+aynası kullanılır. Anahtar ve arama terimi aynı Python fonksiyonuyla
+katlanır; veritabanının lower() davranışına güvenilmez.
+
+Offline veritabanı tablolari_olustur("sqlite") ile kurulur (urunler, FTS5
+aynası ve tetikleyiciler dahil); ürün satırları bu tabloya yazıldıkça ayna
+kendiliğinden dolar. Satırların merkezden offline veritabanına
+kopyalanması bu repository'nin işi değildir; kopya yoksa arama boş döner.
 """
 
+import logging
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy import column, func, literal_column, select, table, true
 
 from sontechsp.uygulama.veritabani.modeller.stok import Urun, StokHareket
 from sontechsp.uygulama.veritabani.baglanti import VeriTabaniBaglanti
 from ..dto import UrunDTO
 from ..hatalar import UrunValidationError
 from .arayuzler import IUrunRepository
+from .barkod_indeksi import barkod_indeksi_al
+from .oturum import islem_oturumu
+from .urun_arama import arama_anahtari, fts_sorgusu, like_deseni
+
+logger = logging.getLogger(__name__)
+
+_URUNLER = Urun.__table__
+_FTS = table('urun_arama_fts', column('rowid'))
+_FTS_TABLOSU = literal_column('urun_arama_fts')
 
 
 class UrunRepository(IUrunRepository):
@@ -113,6 +137,11 @@ class UrunRepository(IUrunRepository):
             mevcut_urun.aktif = urun.aktif
             
             session.commit()
+            
+            # POS barkod indeksindeki ad/fiyat bilgisini tazele
+            barkod_indeksi_al().urun_guncelle(
+                urun_id, urun.urun_adi, urun.satis_fiyati, urun.kdv_orani, urun.aktif
+            )
             return True
             
         except IntegrityError as e:
@@ -138,6 +167,8 @@ class UrunRepository(IUrunRepository):
             
             session.delete(urun)
             session.commit()
+            
+            barkod_indeksi_al().urun_guncelle(urun_id, urun.urun_adi, None, None, aktif=False)
             return True
             
         finally:
@@ -169,22 +200,93 @@ class UrunRepository(IUrunRepository):
         finally:
             session.close()
     
-    def ara(self, arama_terimi: str) -> List[UrunDTO]:
-        """Ürün adı veya kodu ile arama yapar"""
-        session = self.db.oturum_olustur()
-        try:
-            arama = f"%{arama_terimi}%"
-            urunler = session.query(Urun).filter(
-                or_(
-                    Urun.urun_kodu.ilike(arama),
-                    Urun.urun_adi.ilike(arama)
-                )
-            ).filter_by(aktif=True).limit(100).all()
-            
-            return [self._model_to_dto(urun) for urun in urunler]
+    def ara(self, arama_terimi: str, limit: int = 100, onek: bool = False) -> List[UrunDTO]:
+        """
+        Ürün adı veya kodu ile indeksli, sıralı arama yapar
+        
+        Terim Türkçe katlanır ("İNCİR", "incir", "ıncır" aynı sonucu verir).
+        Sıralama: birebir ürün kodu, anahtar başı eşleşmesi, benzerlik.
+        
+        Args:
+            arama_terimi: Aranan metin
+            limit: En fazla sonuç sayısı
+            onek: Yazarken arama; kelime başı eşleşmesi aranır
+        """
+        terim = arama_terimi.strip()
+        anahtar = arama_anahtari(terim)
+        if not anahtar:
+            return []
+        
+        with islem_oturumu(self.db) as oturum:
+            dialect = oturum.get_bind().dialect.name
+            if dialect == "postgresql":
+                satirlar = self._trigram_ara(oturum, terim, anahtar, limit, onek)
+            elif dialect == "sqlite":
+                try:
+                    satirlar = self._fts_ara(oturum, terim, anahtar, limit)
+                except OperationalError:
+                    # FTS aynası oluşturulmamış eski offline veritabanı
+                    logger.warning("urun_arama_fts bulunamadı, LIKE aramasına dönülüyor")
+                    oturum.rollback()
+                    satirlar = self._like_ara(oturum, terim, anahtar, limit, onek)
+            else:
+                satirlar = self._like_ara(oturum, terim, anahtar, limit, onek)
             
-        finally:
-            session.close()
+            return [self._model_to_dto(satir) for satir in satirlar]
+    
+    def _trigram_ara(self, oturum: Session, terim: str, anahtar: str, limit: int, onek: bool):
+        """PostgreSQL: ix_urun_arama_anahtari_trgm GIN indeksi üzerinden arama"""
+        ifade = _URUNLER.c.arama_anahtari
+        desen = like_deseni(anahtar)
+        
+        if onek:
+            kosul = ifade.like(f"{desen}%") | ifade.like(f"% {desen}%")
+        else:
+            # LIKE alt dizgi, % operatörü yazım hatalarını (benzerlik) yakalar
+            kosul = ifade.like(f"%{desen}%") | ifade.op('%')(anahtar)
+        
+        return oturum.execute(
+            select(_URUNLER)
+            .where(kosul, _URUNLER.c.aktif == true())
+            .order_by(
+                (_URUNLER.c.urun_kodu == terim).desc(),
+                ifade.like(f"{desen}%").desc(),
+                func.similarity(ifade, anahtar).desc(),
+                _URUNLER.c.urun_adi
+            )
+            .limit(limit)
+        ).all()
+    
+    def _fts_ara(self, oturum: Session, terim: str, anahtar: str, limit: int):
+        """SQLite: urun_arama_fts üzerinde kelime öneki araması, bm25 sıralı"""
+        eslesme = fts_sorgusu(anahtar)
+        if eslesme is None:
+            return []
+        
+        return oturum.execute(
+            select(_URUNLER)
+            .join(_FTS, _FTS.c.rowid == _URUNLER.c.id)
+            .where(_FTS_TABLOSU.op('MATCH')(eslesme), _URUNLER.c.aktif == true())
+            .order_by(
+                (_URUNLER.c.urun_kodu == terim).desc(),
+                func.bm25(_FTS_TABLOSU),
+                _URUNLER.c.urun_adi
+            )
+            .limit(limit)
+        ).all()
+    
+    def _like_ara(self, oturum: Session, terim: str, anahtar: str, limit: int, onek: bool):
+        """İndeks olmadığında saklanan anahtar üzerinde LIKE araması"""
+        ifade = _URUNLER.c.arama_anahtari
+        desen = like_deseni(anahtar)
+        
+        return oturum.execute(
+            select(_URUNLER)
+            .where(ifade.like(f"{desen}%" if onek else f"%{desen}%", escape='\\'),
+                   _URUNLER.c.aktif == true())
+            .order_by((_URUNLER.c.urun_kodu == terim).desc(), _URUNLER.c.urun_adi)
+            .limit(limit)
+        ).all()
     
     def _model_to_dto(self, urun: Urun) -> UrunDTO:
         """Model'i DTO'ya çevirir"""
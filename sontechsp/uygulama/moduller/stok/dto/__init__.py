@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.dto
 # Description: Stok modülü DTO sınıfları
 # Changelog:
 # - İlk oluşturma
+# - StokRezervasyonDTO eklendi
 
 """
 SONTECHSP Stok DTO Sınıfları
@@ -13,6 +14,7 @@ Bu modül stok modülünün veri transfer objelerini içerir:
 - BarkodDTO: Barkod veri transfer objesi
 - StokHareketDTO: Stok hareket veri transfer objesi
 - StokRaporDTO: Stok rapor veri transfer objesi
+- StokRezervasyonDTO: Stok rezervasyon veri transfer objesi
 """
 
 from .urun_dto import UrunDTO
@@ -20,6 +22,7 @@ from .barkod_dto import BarkodDTO
 from .stok_hareket_dto import StokHareketDTO, StokHareketFiltreDTO
 from .stok_rapor_dto import StokDurumRaporDTO, StokHareketRaporDTO, StokRaporFiltreDTO
 from .stok_bakiye_dto import StokBakiyeDTO
+from .stok_rezervasyon_dto import StokRezervasyonDTO
 
 __all__ = [
     'UrunDTO',
@@ -27,6 +30,7 @@ __all__ = [
     'StokHareketDTO',
     'StokHareketFiltreDTO',
     'StokBakiyeDTO',
+    'StokRezervasyonDTO',
     'StokDurumRaporDTO',
     'StokHareketRaporDTO',
     'StokRaporFiltreDTO'
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.dto.barkod_dto
 # Description: Barkod DTO sınıfı
 # Changelog:
 # - İlk oluşturma
+# - Barkod indeksi için ürün adı/fiyat alanları eklendi
 
 """
 SONTECHSP Barkod DTO
@@ -36,6 +37,11 @@ class BarkodDTO:
     aktif: bool = True
     ana_barkod: bool = False
     
+    # Ürün bilgileri (barkod indeksi ve POS okuma için, opsiyonel)
+    urun_adi: Optional[str] = None
+    satis_fiyati: Optional[Decimal] = None
+    kdv_orani: Optional[Decimal] = None
+    
     # Zaman damgaları
     olusturma_tarihi: Optional[datetime] = None
     guncelleme_tarihi: Optional[datetime] = None
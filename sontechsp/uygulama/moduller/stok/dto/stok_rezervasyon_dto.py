@@ -0,0 +1,33 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.dto.stok_rezervasyon_dto
+# Description: Stok rezervasyon DTO sınıfı
+# Changelog:
+# - İlk oluşturma
+
+"""
+SONTECHSP Stok Rezervasyon DTO
+
+Bu modül süreli stok rezervasyonu veri transfer objesini içerir.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class StokRezervasyonDTO:
+    """Stok rezervasyon bilgileri"""
+    rezervasyon_id: str
+    urun_id: int
+    magaza_id: int
+    depo_id: Optional[int]
+    rezerve_miktar: Decimal
+    rezervasyon_tarihi: datetime
+    gecerlilik_tarihi: datetime
+    durum: str  # 'AKTIF', 'KULLANILDI', 'IPTAL_EDILDI', 'SURESI_DOLDU'
+    referans_tablo: Optional[str] = None
+    referans_id: Optional[int] = None
+    aciklama: Optional[str] = None
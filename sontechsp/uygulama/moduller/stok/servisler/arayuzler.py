@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.arayuzler
 # Description: Stok servis arayüzleri
 # Changelog:
 # - İlk oluşturma
+# - Toplu stok hareketi eklendi
+# - Önek araması ve toplu barkod okuma eklendi
+# - Toplu stok hareketi dış transaction'a katılabilir
 
 """
 SONTECHSP Stok Servis Arayüzleri
@@ -13,10 +16,10 @@ Bu modül stok modülünün servis arayüzlerini içerir.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
 
-from ..dto import UrunDTO, BarkodDTO, StokHareketDTO
+from ..dto import UrunDTO, BarkodDTO, StokHareketDTO, StokBakiyeDTO
 
 
 class IUrunService(ABC):
@@ -38,7 +41,7 @@ class IUrunService(ABC):
         pass
     
     @abstractmethod
-    def urun_ara(self, arama_terimi: str) -> List[UrunDTO]:
+    def urun_ara(self, arama_terimi: str, limit: int = 100, onek: bool = False) -> List[UrunDTO]:
         """Ürün arar"""
         pass
 
@@ -60,6 +63,20 @@ class IBarkodService(ABC):
     def barkod_ara(self, barkod: str) -> Optional[BarkodDTO]:
         """Barkod arar"""
         pass
+    
+    @abstractmethod
+    def urun_barkodlari_getir(self, urun_id: int) -> List[BarkodDTO]:
+        """Ürünün barkodlarını getirir"""
+        pass
+    
+    def urunlerin_barkodlari_getir(self, urun_idler: List[int]) -> Dict[int, List[BarkodDTO]]:
+        """
+        Birden fazla ürünün barkodlarını getirir
+        
+        Varsayılan uygulama ürün başına okur; toplu okuma destekleyen
+        servisler tek sorgu ile override eder.
+        """
+        return {urun_id: self.urun_barkodlari_getir(urun_id) for urun_id in urun_idler}
 
 
 class IStokHareketService(ABC):
@@ -74,6 +91,13 @@ class IStokHareketService(ABC):
     def stok_cikisi(self, hareket: StokHareketDTO) -> int:
         """Stok çıkış işlemi"""
         pass
+    
+    @abstractmethod
+    def toplu_stok_hareketi(self, hareketler: List[StokHareketDTO],
+                            yetersiz_stokta_hata: bool = False,
+                            session=None) -> List[StokBakiyeDTO]:
+        """Birden çok stok hareketini tek transaction içinde işler (session verilirse ona katılır)"""
+        pass
 
 
 class INegatifStokKontrol(ABC):
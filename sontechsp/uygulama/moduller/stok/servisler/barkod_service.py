@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.barkod_service
 # Description: Barkod servis implementasyonu
 # Changelog:
 # - İlk oluşturma
+# - Barkod araması bellek içi barkod indeksi üzerinden yapılıyor
+# - Toplu barkod okuma eklendi
+# - İndeks ıskasında merkezden önce yerel katalog replikasına bakılıyor
 
 """
 SONTECHSP Barkod Servisi
@@ -12,11 +15,12 @@ Bu modül barkod iş kurallarını uygular.
 Repository katmanını kullanarak barkod işlemlerini gerçekleştirir.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import re
 
 from ..dto import BarkodDTO
 from ..depolar.barkod_repository import BarkodRepository
+from ..depolar.barkod_indeksi import BarkodIndeksi, barkod_indeksi_al
 from ..hatalar import BarkodValidationError
 from .arayuzler import IBarkodService
 
@@ -24,8 +28,19 @@ from .arayuzler import IBarkodService
 class BarkodService(IBarkodService):
     """Barkod servis implementasyonu"""
     
-    def __init__(self, barkod_repository: Optional[BarkodRepository] = None):
+    def __init__(self, barkod_repository: Optional[BarkodRepository] = None,
+                 barkod_indeksi: Optional[BarkodIndeksi] = None,
+                 yerel_katalog=None):
+        """
+        Args:
+            barkod_repository: Merkez barkod repository
+            barkod_indeksi: Bellek içi barkod indeksi
+            yerel_katalog: barkod_ile_ara sağlayan yerel katalog replikası
+                (POS terminalinde offline SQLite kopyası)
+        """
         self.barkod_repository = barkod_repository or BarkodRepository()
+        self.barkod_indeksi = barkod_indeksi or barkod_indeksi_al()
+        self.yerel_katalog = yerel_katalog
     
     def barkod_ekle(self, barkod: BarkodDTO) -> int:
         """Barkod ekler"""
@@ -36,7 +51,14 @@ class BarkodService(IBarkodService):
         self._barkod_format_dogrula(barkod.barkod)
         
         # Repository'ye yönlendir
-        return self.barkod_repository.ekle(barkod)
+        barkod_id = self.barkod_repository.ekle(barkod)
+        
+        # İndeksi ürün bilgisiyle birlikte güncelle
+        yeni_kayit = self.barkod_repository.barkod_ile_ara(barkod.barkod)
+        if yeni_kayit:
+            self.barkod_indeksi.kaydet(yeni_kayit)
+        
+        return barkod_id
     
     def barkod_sil(self, barkod_id: int) -> bool:
         """Barkod siler"""
@@ -44,7 +66,11 @@ class BarkodService(IBarkodService):
             raise BarkodValidationError("Geçersiz barkod ID")
         
         # Repository'ye yönlendir (minimum barkod kontrolü repository'de)
-        return self.barkod_repository.sil(barkod_id)
+        silindi = self.barkod_repository.sil(barkod_id)
+        if silindi:
+            self.barkod_indeksi.barkod_id_sil(barkod_id)
+        
+        return silindi
     
     def barkod_ara(self, barkod: str) -> Optional[BarkodDTO]:
         """Barkod arar"""
@@ -55,8 +81,23 @@ class BarkodService(IBarkodService):
         temiz_barkod = barkod.strip()
         self._barkod_format_dogrula(temiz_barkod)
         
-        # Repository'ye yönlendir
-        return self.barkod_repository.barkod_ile_ara(temiz_barkod)
+        # Önce bellek içi indeks, sonra yerel replika, en son merkez repository
+        sonuc = self.barkod_indeksi.ara(temiz_barkod)
+        if sonuc is not None:
+            return sonuc
+        
+        if self.yerel_katalog is not None:
+            sonuc = self.yerel_katalog.barkod_ile_ara(temiz_barkod)
+        if sonuc is None:
+            sonuc = self.barkod_repository.barkod_ile_ara(temiz_barkod)
+        if sonuc is not None:
+            self.barkod_indeksi.kaydet(sonuc)
+        
+        return sonuc
+    
+    def indeks_istatistikleri(self) -> Dict[str, Any]:
+        """Barkod indeksi isabet/ıska istatistiklerini döndürür"""
+        return self.barkod_indeksi.istatistikler()
     
     def barkod_dogrula(self, barkod: str) -> bool:
         """Barkod format doğrulaması yapar"""
@@ -73,6 +114,12 @@ class BarkodService(IBarkodService):
         
         return self.barkod_repository.urun_barkodlari_getir(urun_id)
     
+    def urunlerin_barkodlari_getir(self, urun_idler: List[int]) -> Dict[int, List[BarkodDTO]]:
+        """Birden fazla ürünün barkodlarını tek sorguda getirir"""
+        return self.barkod_repository.urunlerin_barkodlari_getir(
+            [urun_id for urun_id in urun_idler if urun_id and urun_id > 0]
+        )
+    
     def _barkod_is_kurallari_dogrula(self, barkod: BarkodDTO) -> None:
         """Barkod iş kuralları doğrulaması"""
         # DTO doğrulaması
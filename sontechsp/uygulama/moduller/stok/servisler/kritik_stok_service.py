@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.kritik_stok_service
 # Description: SONTECHSP kritik stok servisi
 # Changelog:
 # - İlk oluşturma
+# - Kritik stok hesabı tek birleştirilmiş sorguya taşındı
+# - Bildirimler sorgu akışı kapandıktan sonra gönderilir
 
 """
 SONTECHSP Kritik Stok Servisi
@@ -12,7 +14,7 @@ Bu modül kritik stok yönetimi işlemlerini gerçekleştirir.
 Kritik seviye kontrolü, uyarı oluşturma ve raporlama işlemlerini içerir.
 """
 
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from decimal import Decimal
 from datetime import datetime
 from dataclasses import dataclass
@@ -39,6 +41,10 @@ class KritikStokUyari:
     son_hareket_tarihi: Optional[datetime]
 
 
+# Veritabanı sorgusundaki uyarı sırası → uyarı seviyesi
+UYARI_SEVIYELERI = ('ACIL', 'KRITIK', 'UYARI')
+
+
 class KritikStokService:
     """Kritik stok servisi implementasyonu"""
     
@@ -71,57 +77,35 @@ class KritikStokService:
         Returns:
             List[KritikStokUyari]: Kritik stok uyarıları listesi
         """
-        # Tüm stok bakiyelerini getir
-        bakiyeler = self._bakiye_repository.tum_bakiyeler_getir(magaza_id, depo_id)
+        return list(self.kritik_stok_akisi(magaza_id, depo_id, sadece_kritik))
+    
+    def kritik_stok_akisi(self,
+                          magaza_id: Optional[int] = None,
+                          depo_id: Optional[int] = None,
+                          sadece_kritik: bool = False) -> Iterator[KritikStokUyari]:
+        """
+        Kritik stokları tek sorgudan akış halinde üretir
         
-        kritik_stoklar = []
+        Filtreleme, uyarı seviyesi ve sıralama (ACIL > KRITIK > UYARI,
+        eksik miktar azalan) veritabanında yapılır.
         
-        for bakiye in bakiyeler:
-            # Ürün bilgilerini getir
-            urun = self._urun_repository.id_ile_getir(bakiye.urun_id)
-            if not urun:
-                continue
-            
-            # Kritik seviyeyi belirle
-            kritik_seviye = urun.minimum_stok or self._varsayilan_kritik_seviye
+        Args:
+            magaza_id: Mağaza ID filtresi (opsiyonel)
+            depo_id: Depo ID filtresi (opsiyonel)
+            sadece_kritik: Sadece KRITIK seviyesindeki stokları getir
             
-            # Kritik stok kontrolü
-            if bakiye.kullanilabilir_miktar <= kritik_seviye:
-                eksik_miktar = kritik_seviye - bakiye.kullanilabilir_miktar
-                
-                # Uyarı seviyesini belirle
-                uyari_seviyesi = self._uyari_seviyesi_belirle(
-                    bakiye.kullanilabilir_miktar, kritik_seviye
-                )
-                
-                # Sadece kritik filtresi varsa ve bu kritik değilse atla
-                if sadece_kritik and uyari_seviyesi != 'KRITIK':
-                    continue
-                
-                uyari = KritikStokUyari(
-                    urun_id=bakiye.urun_id,
-                    urun_kodu=urun.urun_kodu,
-                    urun_adi=urun.urun_adi,
-                    magaza_id=bakiye.magaza_id,
-                    magaza_adi=f"Mağaza {bakiye.magaza_id}",  # Gerçek mağaza adı alınabilir
-                    depo_id=bakiye.depo_id,
-                    depo_adi=f"Depo {bakiye.depo_id}" if bakiye.depo_id else None,
-                    mevcut_stok=bakiye.kullanilabilir_miktar,
-                    kritik_seviye=kritik_seviye,
-                    eksik_miktar=eksik_miktar,
-                    uyari_seviyesi=uyari_seviyesi,
-                    son_hareket_tarihi=bakiye.son_hareket_tarihi
-                )
-                
-                kritik_stoklar.append(uyari)
-        
-        # Uyarı seviyesine göre sırala (ACIL > KRITIK > UYARI)
-        kritik_stoklar.sort(key=lambda x: (
-            {'ACIL': 0, 'KRITIK': 1, 'UYARI': 2}[x.uyari_seviyesi],
-            x.eksik_miktar
-        ), reverse=True)
+        Yields:
+            KritikStokUyari: Kritik stok uyarısı
+        """
+        satirlar = self._bakiye_repository.kritik_stok_satirlari_getir(
+            self._varsayilan_kritik_seviye,
+            magaza_id=magaza_id,
+            depo_id=depo_id,
+            sadece_kritik=sadece_kritik
+        )
         
-        return kritik_stoklar
+        for satir in satirlar:
+            yield self._satirdan_uyari(satir)
     
     def uyari_olustur(self, 
                      magaza_id: Optional[int] = None,
@@ -138,10 +122,8 @@ class KritikStokService:
         Returns:
             Dict[str, int]: Uyarı istatistikleri
         """
-        kritik_stoklar = self.kritik_stok_listesi(magaza_id, sadece_kritik=True)
-        
         istatistikler = {
-            'toplam_uyari': len(kritik_stoklar),
+            'toplam_uyari': 0,
             'acil_uyari': 0,
             'kritik_uyari': 0,
             'uyari_uyari': 0,
@@ -149,8 +131,12 @@ class KritikStokService:
             'sms_gonderilen': 0
         }
         
-        for uyari in kritik_stoklar:
+        # Akış ve veritabanı oturumu bildirimlerden önce kapanır
+        uyarilar = list(self.kritik_stok_akisi(magaza_id, sadece_kritik=True))
+        
+        for uyari in uyarilar:
             # İstatistikleri güncelle
+            istatistikler['toplam_uyari'] += 1
             if uyari.uyari_seviyesi == 'ACIL':
                 istatistikler['acil_uyari'] += 1
             elif uyari.uyari_seviyesi == 'KRITIK':
@@ -160,8 +146,9 @@ class KritikStokService:
             
             # Uyarı kaydet (veritabanına)
             self._uyari_kaydet(uyari)
-            
-            # Email/SMS gönderimi (burada sadece simüle ediyoruz)
+        
+        # Email/SMS gönderimi (burada sadece simüle ediyoruz)
+        for uyari in uyarilar:
             if email_gonder:
                 self._email_uyari_gonder(uyari)
                 istatistikler['email_gonderilen'] += 1
@@ -218,46 +205,32 @@ class KritikStokService:
         if magaza_id <= 0:
             raise StokValidationError("Geçerli mağaza ID gereklidir")
         
-        kritik_stoklar = self.kritik_stok_listesi(magaza_id=magaza_id)
-        
-        # Depo bazında grupla
-        depo_gruplari = {}
+        # Depo bazında grupla (akış zaten seviyeye göre sıralı gelir)
+        depo_gruplari: Dict[str, List[KritikStokUyari]] = {}
         
-        for uyari in kritik_stoklar:
+        for uyari in self.kritik_stok_akisi(magaza_id=magaza_id):
             depo_adi = uyari.depo_adi or "Ana Depo"
-            
-            if depo_adi not in depo_gruplari:
-                depo_gruplari[depo_adi] = []
-            
-            depo_gruplari[depo_adi].append(uyari)
-        
-        # Her depo için uyarı seviyesine göre sırala
-        for depo_adi in depo_gruplari:
-            depo_gruplari[depo_adi].sort(
-                key=lambda x: {'ACIL': 0, 'KRITIK': 1, 'UYARI': 2}[x.uyari_seviyesi]
-            )
+            depo_gruplari.setdefault(depo_adi, []).append(uyari)
         
         return depo_gruplari
     
-    def _uyari_seviyesi_belirle(self, 
-                               mevcut_stok: Decimal, 
-                               kritik_seviye: Decimal) -> str:
-        """
-        Uyarı seviyesini belirler
-        
-        Args:
-            mevcut_stok: Mevcut stok miktarı
-            kritik_seviye: Kritik seviye
-            
-        Returns:
-            str: Uyarı seviyesi ('ACIL', 'KRITIK', 'UYARI')
-        """
-        if mevcut_stok <= 0:
-            return 'ACIL'
-        elif mevcut_stok <= kritik_seviye * Decimal('0.5'):
-            return 'KRITIK'
-        else:
-            return 'UYARI'
+    def _satirdan_uyari(self, satir: Dict[str, Any]) -> KritikStokUyari:
+        """Kritik stok sorgu satırını uyarı nesnesine çevirir"""
+        depo_id = satir['depo_id']
+        return KritikStokUyari(
+            urun_id=satir['urun_id'],
+            urun_kodu=satir['urun_kodu'],
+            urun_adi=satir['urun_adi'],
+            magaza_id=satir['magaza_id'],
+            magaza_adi=f"Mağaza {satir['magaza_id']}",  # Gerçek mağaza adı alınabilir
+            depo_id=depo_id,
+            depo_adi=f"Depo {depo_id}" if depo_id else None,
+            mevcut_stok=Decimal(satir['mevcut_stok']),
+            kritik_seviye=Decimal(satir['kritik_seviye']),
+            eksik_miktar=Decimal(satir['eksik_miktar']),
+            uyari_seviyesi=UYARI_SEVIYELERI[satir['uyari_sirasi']],
+            son_hareket_tarihi=satir['son_hareket_tarihi']
+        )
     
     def _uyari_kaydet(self, uyari: KritikStokUyari) -> None:
         """
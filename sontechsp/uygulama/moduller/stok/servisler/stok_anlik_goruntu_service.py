@@ -0,0 +1,146 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: stok.servisler.stok_anlik_goruntu_service
+# Description: SONTECHSP dönem sonu stok görüntüsü servisi
+# Changelog:
+# - İlk oluşturma
+# - Dönem anları yerel saat dilimli, aylık kapanış günlükleri temizliyor
+
+"""
+SONTECHSP Stok Anlık Görüntü Servisi
+
+Bu modül günlük/aylık kapanış görüntülerini üretir ve geçmiş tarihli stok
+sorgularını görüntü + delta üzerinden yanıtlar.
+
+Kapanış, görüntü anından sonra başlatılmalıdır (ör. günlük kapanış gece
+yarısından birkaç dakika sonra); görüntü anından önce açılıp sonra commit
+edilen hareketler bu şekilde kaçırılmaz.
+
+Dönem anları mağazanın yerel saatiyle gece yarısıdır ve saat dilimli
+(timestamptz) yazılır. Aylık kapanış üretildikten sonra o aya ait günlük
+görüntüler silinir; geçmiş aylar için aylık görüntü + delta okunur.
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Optional
+
+from ..depolar.arayuzler import IStokAnlikGoruntuRepository
+from ..hatalar.stok_hatalari import StokValidationError
+
+
+class DonemTipi(Enum):
+    """Görüntü dönem tipleri"""
+    GUNLUK = "GUNLUK"
+    AYLIK = "AYLIK"
+
+
+class StokAnlikGoruntuService:
+    """Stok anlık görüntü servisi implementasyonu"""
+
+    def __init__(self, goruntu_repository: Optional[IStokAnlikGoruntuRepository] = None):
+        """
+        Stok anlık görüntü servisi constructor
+
+        Args:
+            goruntu_repository: Görüntü repository (verilmezse oluşturulur)
+        """
+        if goruntu_repository is None:
+            from ..depolar.stok_anlik_goruntu_repository import StokAnlikGoruntuRepository
+            goruntu_repository = StokAnlikGoruntuRepository()
+        self._goruntu_repository = goruntu_repository
+
+    def gunluk_kapanis(self, gun: date) -> int:
+        """
+        Günün kapanış görüntüsünü üretir (ertesi gün yerel 00:00 anı)
+
+        Returns:
+            int: Yazılan görüntü satırı sayısı
+        """
+        return self._goruntu_repository.goruntu_olustur(
+            DonemTipi.GUNLUK.value, self._gun_basi(gun + timedelta(days=1))
+        )
+
+    def aylik_kapanis(self, yil: int, ay: int) -> int:
+        """
+        Ayın kapanış görüntüsünü üretir (sonraki ayın ilk günü yerel 00:00 anı)
+
+        Aylık görüntü yazıldıktan sonra ayın günlük görüntüleri silinir.
+
+        Returns:
+            int: Yazılan görüntü satırı sayısı
+        """
+        if not 1 <= ay <= 12:
+            raise StokValidationError("Ay 1-12 arasında olmalıdır")
+
+        ay_basi = self._gun_basi(date(yil, ay, 1))
+        sonraki_ay = self._gun_basi(date(yil + 1, 1, 1) if ay == 12 else date(yil, ay + 1, 1))
+        yazilan = self._goruntu_repository.goruntu_olustur(DonemTipi.AYLIK.value, sonraki_ay)
+        self._goruntu_repository.goruntuleri_sil(DonemTipi.GUNLUK.value, ay_basi, sonraki_ay)
+        return yazilan
+
+    def eksik_kapanislari_tamamla(self, bugun: date) -> List[date]:
+        """
+        Son görüntüden dünkü güne kadar eksik günlük kapanışları sırayla üretir
+
+        Her gün bir öncekinin üzerine artımlı kurulur. Hiç görüntü yoksa
+        yalnızca dünün kapanışı (tam geçmişten bir kez) üretilir.
+
+        Returns:
+            List[date]: Kapanışı yapılan günler
+        """
+        bugun_basi = self._gun_basi(bugun)
+        son = self._goruntu_repository.son_goruntu(bugun_basi)
+
+        gun = son[1].astimezone().date() if son else bugun - timedelta(days=1)
+        kapananlar = []
+        while gun < bugun:
+            self.gunluk_kapanis(gun)
+            kapananlar.append(gun)
+            gun += timedelta(days=1)
+        return kapananlar
+
+    def tarihteki_stok(self, tarih: datetime, magaza_id: int,
+                       urun_idler: Optional[List[int]] = None,
+                       depo_id: Optional[int] = None) -> Dict[int, Decimal]:
+        """
+        Verilen andaki stok miktarlarını getirir
+
+        Args:
+            tarih: Stok anı
+            magaza_id: Mağaza ID
+            urun_idler: Ürün filtresi (opsiyonel)
+            depo_id: Depo filtresi (verilmezse mağazanın tüm depoları)
+
+        Returns:
+            Dict[int, Decimal]: urun_id -> miktar
+        """
+        if magaza_id <= 0:
+            raise StokValidationError("Geçerli mağaza ID gereklidir")
+
+        return self._goruntu_repository.tarihteki_stok(tarih, magaza_id, urun_idler, depo_id)
+
+    def donem_hareket_ozeti(self, baslangic: datetime, bitis: datetime, magaza_id: int,
+                            urun_idler: Optional[List[int]] = None,
+                            depo_id: Optional[int] = None) -> List[Dict]:
+        """
+        Dönem için ürün bazında açılış, giriş, çıkış ve kapanış getirir
+
+        Returns:
+            List[Dict]: urun_id, acilis, giris, cikis, kapanis
+        """
+        if magaza_id <= 0:
+            raise StokValidationError("Geçerli mağaza ID gereklidir")
+
+        if baslangic > bitis:
+            raise StokValidationError("Başlangıç tarihi bitiş tarihinden büyük olamaz")
+
+        return self._goruntu_repository.donem_hareketleri(
+            baslangic, bitis, magaza_id, urun_idler, depo_id
+        )
+
+    @staticmethod
+    def _gun_basi(gun: date) -> datetime:
+        """Günün yerel saat dilimindeki 00:00 anı (saat dilimli)"""
+        return datetime.combine(gun, time.min).astimezone()
@@ -1,24 +1,38 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.stok_entegrasyon_service
 # Description: SONTECHSP stok entegrasyon servisi
 # Changelog:
 # - İlk oluşturma
+# - Sepet bazlı toplu POS stok düşümü eklendi
+# - Rezerve toplamı rezervasyon servisinin O(1) sayacından okunuyor
+# - Bildirimlerle güncellenen süreli stok durumu önbelleği ve toplu okuma eklendi
+# - Süresi dolan önbellek girdileri ve geçersiz kılma kayıtları aralıklı siliniyor
+# - pos_sepeti_isle dış transaction'a katılabilir, bildirimler commit sonrası yapılır
 
 """
 SONTECHSP Stok Entegrasyon Servisi
 
 Bu modül stok sisteminin diğer modüllerle entegrasyonunu sağlar.
 POS satış işlemleri ve e-ticaret güncellemeleri için gerçek zamanlı stok yönetimi yapar.
+
+Stok durumu (urun_id, magaza_id, depo_id) bazında önbellekte tutulur. Girdiler
+stok değiştiren her bildirimle güncellenir; başka süreçlerden (diğer
+terminaller, manuel hareketler) gelen değişiklikler için kısa süreli
+geçerlilik (TTL) uygulanır.
 """
 
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Iterable, Tuple
 from decimal import Decimal
 from datetime import datetime
 from dataclasses import dataclass
 import threading
 import queue
 import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from ..dto import StokHareketDTO, StokBakiyeDTO
 from ..depolar.arayuzler import IStokHareketRepository, IStokBakiyeRepository
@@ -26,6 +40,12 @@ from ..hatalar.stok_hatalari import StokValidationError, StokYetersizError
 from .arayuzler import IStokHareketService
 from .stok_rezervasyon_service import StokRezervasyonService
 
+# (urun_id, magaza_id, depo_id) önbellek anahtarı
+DurumAnahtari = Tuple[int, int, Optional[int]]
+
+# Kullanılabilir miktarı bu değere eşit veya altında olan stok KRITIK sayılır
+KRITIK_STOK_SEVIYESI = Decimal('10')
+
 
 @dataclass
 class StokGuncellemeBildirimi:
@@ -74,7 +94,8 @@ class StokEntegrasyonService:
     def __init__(self,
                  hareket_service: IStokHareketService,
                  bakiye_repository: IStokBakiyeRepository,
-                 rezervasyon_service: StokRezervasyonService):
+                 rezervasyon_service: StokRezervasyonService,
+                 durum_onbellek_suresi: float = 5.0):
         """
         Stok entegrasyon servisi constructor
         
@@ -82,6 +103,8 @@ class StokEntegrasyonService:
             hareket_service: Stok hareket servisi
             bakiye_repository: Stok bakiye repository
             rezervasyon_service: Stok rezervasyon servisi
+            durum_onbellek_suresi: Stok durumu önbellek girdisinin bildirim
+                gelmezse geçerli kalacağı süre (saniye)
         """
         self._hareket_service = hareket_service
         self._bakiye_repository = bakiye_repository
@@ -94,6 +117,17 @@ class StokEntegrasyonService:
         self._guncelleme_thread = None
         self._thread_calisir = False
         
+        # Stok durumu önbelleği: anahtar -> (geçerlilik sonu, bildirim sırası, durum)
+        self._durum_onbellegi: Dict[DurumAnahtari, Tuple[float, int, Dict[str, Any]]] = {}
+        self._durum_onbellek_suresi = durum_onbellek_suresi
+        self._bildirim_sirasi = 0
+        # Silinen geçersiz kılma kayıtlarının en büyük sırası: bu sıradan önce
+        # başlamış okumalar, kaydı silinmiş anahtara eski veri yazamaz
+        self._silinen_sira = 0
+        self._temizlik_araligi = max(durum_onbellek_suresi, 1.0)
+        self._sonraki_temizlik = time.monotonic() + self._temizlik_araligi
+        self._onbellek_kilidi = threading.Lock()
+        
         # Entegrasyon durumu
         self._pos_entegrasyonu_aktif = True
         self._eticaret_entegrasyonu_aktif = True
@@ -190,6 +224,101 @@ class StokEntegrasyonService:
             self._logger.error(f"POS satış işlemi hatası: {str(e)}")
             raise
     
+    def pos_sepeti_isle(self, satis_islemleri: List[POSSatisIslemi],
+                        session: Optional[Session] = None) -> bool:
+        """
+        Sepetin tüm satırları için stok düşümünü tek transaction'da yapar
+        
+        Satırlar tek tek pos_satisi_isle ile işlenmez; hareket servisi tüm
+        hareketleri tek seferde kaydeder ve birleştirilmiş bakiye
+        değişimlerini sabit kilit sırasıyla uygular. Herhangi bir satırda
+        stok yetersizse hiçbir satır düşülmez.
+        
+        session verilirse düşüm çağıranın transaction'ına (ör. satış
+        tamamlama) katılır; stok bildirimleri ve önbellek güncellemesi o
+        transaction commit edilince yapılır, geri alınan satış önbelleği
+        kirletmez.
+        
+        Args:
+            satis_islemleri: Sepet satırlarına ait POS satış işlemleri
+            session: Dış transaction oturumu (commit/rollback çağıranındır)
+            
+        Returns:
+            bool: İşlem başarılı mı
+            
+        Raises:
+            StokValidationError: Validasyon hatası durumunda
+            StokYetersizError: Yetersiz stok durumunda
+        """
+        if not self._pos_entegrasyonu_aktif:
+            self._logger.warning("POS entegrasyonu devre dışı")
+            return False
+        
+        if not satis_islemleri:
+            return True
+        
+        try:
+            hareketler = []
+            for satis_islemi in satis_islemleri:
+                self._validate_pos_satisi(satis_islemi)
+                hareketler.append(StokHareketDTO(
+                    urun_id=satis_islemi.urun_id,
+                    magaza_id=satis_islemi.magaza_id,
+                    depo_id=satis_islemi.depo_id,
+                    hareket_tipi="CIKIS",
+                    miktar=satis_islemi.satis_miktari,
+                    birim_fiyat=satis_islemi.birim_fiyat,
+                    toplam_tutar=satis_islemi.toplam_tutar,
+                    referans_tablo="pos_satislar",
+                    referans_id=satis_islemi.satis_id or None,
+                    aciklama=f"POS Satış - Fiş No: {satis_islemi.fiş_no}",
+                    kullanici_id=satis_islemi.kasiyer_id
+                ))
+            
+            bakiyeler = self._hareket_service.toplu_stok_hareketi(
+                hareketler, yetersiz_stokta_hata=True, session=session
+            )
+            
+            # Anahtar başına toplam düşülen miktar, bildirimdeki eski miktar için
+            dusulen: Dict[tuple, Decimal] = {}
+            for satis_islemi in satis_islemleri:
+                anahtar = (satis_islemi.urun_id, satis_islemi.magaza_id, satis_islemi.depo_id or None)
+                dusulen[anahtar] = dusulen.get(anahtar, Decimal('0')) + satis_islemi.satis_miktari
+            
+            zaman = datetime.utcnow()
+            referans_no = f"POS_{satis_islemleri[0].satis_id}"
+            bildirimler = []
+            for bakiye in bakiyeler:
+                miktar = dusulen.get((bakiye.urun_id, bakiye.magaza_id, bakiye.depo_id or None), Decimal('0'))
+                bildirimler.append(StokGuncellemeBildirimi(
+                    urun_id=bakiye.urun_id,
+                    magaza_id=bakiye.magaza_id,
+                    depo_id=bakiye.depo_id,
+                    eski_miktar=bakiye.kullanilabilir_miktar + miktar,
+                    yeni_miktar=bakiye.kullanilabilir_miktar,
+                    hareket_tipi="POS_SATIS",
+                    zaman_damgasi=zaman,
+                    kaynak_modul="POS",
+                    referans_no=referans_no
+                ))
+            
+            if session is None:
+                self._bildirimleri_yayinla(bildirimler)
+            else:
+                event.listen(session, 'after_commit',
+                             lambda _oturum: self._bildirimleri_yayinla(bildirimler), once=True)
+            
+            self._logger.info(
+                f"POS sepeti işlendi - Satır: {len(satis_islemleri)}, "
+                f"Bakiye: {len(bakiyeler)}, Referans: {referans_no}"
+            )
+            
+            return True
+            
+        except Exception as e:
+            self._logger.error(f"POS sepet işlemi hatası: {str(e)}")
+            raise
+    
     def eticaret_guncelle(self, guncelleme: EticaretGuncelleme) -> bool:
         """
         E-ticaret platformu stok güncellemesi yapar
@@ -269,6 +398,8 @@ class StokEntegrasyonService:
         """
         Gerçek zamanlı stok durumu bilgilerini getirir
         
+        Önbellekte geçerli girdi varsa veritabanına gidilmez.
+        
         Args:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
@@ -278,47 +409,7 @@ class StokEntegrasyonService:
             Dict[str, Any]: Stok durumu bilgileri
         """
         try:
-            # Mevcut bakiye bilgisi
-            bakiye = self._bakiye_repository.bakiye_getir(urun_id, magaza_id, depo_id)
-            
-            if not bakiye:
-                return {
-                    "urun_id": urun_id,
-                    "magaza_id": magaza_id,
-                    "depo_id": depo_id,
-                    "toplam_stok": Decimal('0'),
-                    "rezerve_stok": Decimal('0'),
-                    "kullanilabilir_stok": Decimal('0'),
-                    "son_guncelleme": None,
-                    "durum": "STOK_YOK"
-                }
-            
-            # Aktif rezervasyonları al
-            aktif_rezervasyonlar = self._rezervasyon_service.aktif_rezervasyonlar_listesi(
-                urun_id=urun_id,
-                magaza_id=magaza_id
-            )
-            
-            toplam_rezerve = sum(r.rezerve_miktar for r in aktif_rezervasyonlar)
-            
-            # Stok durumunu belirle
-            durum = "NORMAL"
-            if bakiye.kullanilabilir_miktar <= 0:
-                durum = "STOK_YOK"
-            elif bakiye.kullanilabilir_miktar <= Decimal('10'):  # Kritik seviye
-                durum = "KRITIK"
-            
-            return {
-                "urun_id": urun_id,
-                "magaza_id": magaza_id,
-                "depo_id": depo_id,
-                "toplam_stok": bakiye.miktar,
-                "rezerve_stok": toplam_rezerve,
-                "kullanilabilir_stok": bakiye.kullanilabilir_miktar,
-                "son_guncelleme": bakiye.son_hareket_tarihi,
-                "durum": durum,
-                "aktif_rezervasyon_sayisi": len(aktif_rezervasyonlar)
-            }
+            return self.stok_durumlari_getir([urun_id], magaza_id, depo_id)[urun_id]
             
         except Exception as e:
             self._logger.error(f"Gerçek zamanlı stok durumu hatası: {str(e)}")
@@ -329,6 +420,87 @@ class StokEntegrasyonService:
                 "hata": str(e)
             }
     
+    def stok_durumlari_getir(self,
+                             urun_idler: Iterable[int],
+                             magaza_id: int,
+                             depo_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Birden çok ürünün stok durumunu getirir (sepet bazlı kontrol için)
+        
+        Önbellekte bulunmayan veya süresi dolan ürünler tek sorguda okunur.
+        Rezerve toplamı ve rezervasyon sayısı her çağrıda rezervasyon
+        servisinin O(1) sayacından eklenir.
+        
+        Args:
+            urun_idler: Ürün ID listesi
+            magaza_id: Mağaza ID
+            depo_id: Depo ID (opsiyonel)
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: urun_id -> stok durumu bilgileri
+        """
+        urun_idler = list(dict.fromkeys(urun_idler))
+        depo_id = depo_id or None
+        simdi = time.monotonic()
+        
+        durumlar: Dict[int, Dict[str, Any]] = {}
+        eksikler = []
+        with self._onbellek_kilidi:
+            if simdi >= self._sonraki_temizlik:
+                self._suresi_dolanlari_sil(simdi)
+            for urun_id in urun_idler:
+                girdi = self._durum_onbellegi.get((urun_id, magaza_id, depo_id))
+                if girdi is not None and girdi[0] > simdi:
+                    durumlar[urun_id] = dict(girdi[2])
+                else:
+                    eksikler.append(urun_id)
+            okuma_sirasi = self._bildirim_sirasi
+        
+        if eksikler:
+            bakiyeler = self._bakiye_repository.bakiyeler_getir(eksikler, magaza_id, depo_id)
+            gecerlilik = time.monotonic() + self._durum_onbellek_suresi
+            with self._onbellek_kilidi:
+                for urun_id in eksikler:
+                    durum = self._stok_durumu_olustur(urun_id, magaza_id, depo_id, bakiyeler.get(urun_id))
+                    durumlar[urun_id] = dict(durum)
+                    
+                    # Okuma sırasında bildirim gelen anahtar eski veriyle ezilmez
+                    anahtar = (urun_id, magaza_id, depo_id)
+                    girdi = self._durum_onbellegi.get(anahtar)
+                    if girdi is None:
+                        yazilabilir = self._silinen_sira <= okuma_sirasi
+                    else:
+                        yazilabilir = girdi[1] <= okuma_sirasi
+                    if yazilabilir:
+                        self._durum_onbellegi[anahtar] = (gecerlilik, okuma_sirasi, durum)
+        
+        for urun_id, durum in durumlar.items():
+            durum["rezerve_stok"] = self._rezervasyon_service.rezerve_toplami_getir(urun_id, magaza_id)
+            durum["aktif_rezervasyon_sayisi"] = self._rezervasyon_service.aktif_rezervasyon_sayisi(
+                urun_id, magaza_id
+            )
+        
+        return {urun_id: durumlar[urun_id] for urun_id in urun_idler}
+    
+    def stok_durumu_gecersiz_kil(self, urun_id: Optional[int] = None,
+                                 magaza_id: Optional[int] = None,
+                                 depo_id: Optional[int] = None) -> None:
+        """
+        Önbellekteki stok durumunu geçersiz kılar
+        
+        Bildirim üretmeyen stok değişikliklerinden (ör. rezervasyon) sonra
+        çağrılır. Parametre verilmezse tüm önbellek temizlenir.
+        """
+        with self._onbellek_kilidi:
+            self._bildirim_sirasi += 1
+            if urun_id is None:
+                self._durum_onbellegi.clear()
+                self._silinen_sira = self._bildirim_sirasi
+                return
+            self._durum_onbellegi[(urun_id, magaza_id, depo_id or None)] = (
+                0.0, self._bildirim_sirasi, {}
+            )
+    
     def guncelleme_dinleyicisi_ekle(self, dinleyici: Callable[[StokGuncellemeBildirimi], None]) -> None:
         """
         Stok güncelleme dinleyicisi ekler
@@ -369,6 +541,10 @@ class StokEntegrasyonService:
                 "aktif": self._thread_calisir,
                 "dinleyici_sayisi": len(self._guncelleme_dinleyicileri),
                 "kuyruk_boyutu": self._guncelleme_kuyrugu.qsize()
+            },
+            "durum_onbellegi": {
+                "girdi_sayisi": len(self._durum_onbellegi),
+                "gecerlilik_suresi": self._durum_onbellek_suresi
             }
         }
     
@@ -428,8 +604,90 @@ class StokEntegrasyonService:
         )
         return True
     
+    def _stok_durumu_olustur(self, urun_id: int, magaza_id: int, depo_id: Optional[int],
+                             bakiye: Optional[StokBakiyeDTO]) -> Dict[str, Any]:
+        """Bakiye kaydından önbelleğe yazılacak stok durumunu oluşturur"""
+        if bakiye is None:
+            return {
+                "urun_id": urun_id,
+                "magaza_id": magaza_id,
+                "depo_id": depo_id,
+                "toplam_stok": Decimal('0'),
+                "kullanilabilir_stok": Decimal('0'),
+                "son_guncelleme": None,
+                "durum": "STOK_YOK"
+            }
+        
+        return {
+            "urun_id": urun_id,
+            "magaza_id": magaza_id,
+            "depo_id": depo_id,
+            "toplam_stok": bakiye.miktar,
+            "kullanilabilir_stok": bakiye.kullanilabilir_miktar,
+            "son_guncelleme": bakiye.son_hareket_tarihi,
+            "durum": self._stok_durumu_belirle(bakiye.kullanilabilir_miktar)
+        }
+    
+    def _stok_durumu_belirle(self, kullanilabilir: Decimal) -> str:
+        """Kullanılabilir miktara göre NORMAL / KRITIK / STOK_YOK"""
+        if kullanilabilir <= 0:
+            return "STOK_YOK"
+        if kullanilabilir <= KRITIK_STOK_SEVIYESI:
+            return "KRITIK"
+        return "NORMAL"
+    
+    def _onbellegi_guncelle(self, bildirim: StokGuncellemeBildirimi) -> None:
+        """
+        Bildirimi stok durumu önbelleğine uygular
+        
+        POS bildirimleri yeni kullanılabilir miktarı taşır; önbellekteki girdi
+        yerinde güncellenir ve süresi yenilenir. Diğer kaynaklarda (yerel
+        bakiye anlamı taşımayan e-ticaret miktarları) girdi geçersiz kılınır,
+        bir sonraki okuma veritabanından yapılır.
+        """
+        anahtar = (bildirim.urun_id, bildirim.magaza_id, bildirim.depo_id or None)
+        with self._onbellek_kilidi:
+            self._bildirim_sirasi += 1
+            girdi = self._durum_onbellegi.get(anahtar)
+            
+            if bildirim.kaynak_modul == "POS" and girdi is not None and girdi[2]:
+                durum = dict(girdi[2])
+                durum["toplam_stok"] = durum["toplam_stok"] - (bildirim.eski_miktar - bildirim.yeni_miktar)
+                durum["kullanilabilir_stok"] = bildirim.yeni_miktar
+                durum["son_guncelleme"] = bildirim.zaman_damgasi
+                durum["durum"] = self._stok_durumu_belirle(bildirim.yeni_miktar)
+                self._durum_onbellegi[anahtar] = (
+                    time.monotonic() + self._durum_onbellek_suresi, self._bildirim_sirasi, durum
+                )
+            else:
+                self._durum_onbellegi[anahtar] = (0.0, self._bildirim_sirasi, {})
+    
+    def _suresi_dolanlari_sil(self, simdi: float) -> None:
+        """
+        Süresi dolan girdileri ve geçersiz kılma kayıtlarını siler
+        
+        Okunmayan anahtarların girdileri (ör. bir kez satılıp bir daha
+        okutulmayan ürünler) önbellekte birikmez. Önbellek kilidi altında
+        çağrılır; aralıklı çalıştığı için maliyeti okumalara yayılır.
+        """
+        silinecekler = [anahtar for anahtar, girdi in self._durum_onbellegi.items() if girdi[0] <= simdi]
+        for anahtar in silinecekler:
+            self._silinen_sira = max(self._silinen_sira, self._durum_onbellegi.pop(anahtar)[1])
+        self._sonraki_temizlik = simdi + self._temizlik_araligi
+    
+    def _bildirimleri_yayinla(self, bildirimler: List[StokGuncellemeBildirimi]) -> None:
+        """Toplu düşümün bildirimlerini sırayla yayınlar"""
+        for bildirim in bildirimler:
+            self._guncelleme_bildir(bildirim)
+    
     def _guncelleme_bildir(self, bildirim: StokGuncellemeBildirimi) -> None:
-        """Güncelleme bildirimini kuyruğa ekler"""
+        """
+        Güncelleme bildirimini önbelleğe uygular ve kuyruğa ekler
+        
+        Önbellek kuyruğa eklemeden önce, çağıran thread'de güncellenir; aynı
+        terminalin bir sonraki okutması kendi satışını hemen görür.
+        """
+        self._onbellegi_guncelle(bildirim)
         try:
             self._guncelleme_kuyrugu.put_nowait(bildirim)
         except queue.Full:
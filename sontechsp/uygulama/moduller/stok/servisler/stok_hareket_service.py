@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.stok_hareket_service
 # Description: SONTECHSP stok hareket servisi
 # Changelog:
 # - İlk oluşturma
+# - Sepet/belge bazlı toplu stok hareketi eklendi
+# - Toplu stok hareketi dış transaction'a katılabilir
 
 """
 SONTECHSP Stok Hareket Servisi
@@ -16,9 +18,12 @@ from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime
 
-from ..dto import StokHareketDTO, StokHareketFiltreDTO
+from sqlalchemy.orm import Session
+
+from ..dto import StokBakiyeDTO, StokHareketDTO, StokHareketFiltreDTO
+from ..dto.stok_hareket_dto import HareketTipi
 from ..depolar.arayuzler import IStokHareketRepository, IStokBakiyeRepository
-from ..hatalar.stok_hatalari import StokValidationError, NegatifStokError
+from ..hatalar.stok_hatalari import StokValidationError, NegatifStokError, StokYetersizError
 from .arayuzler import IStokHareketService, INegatifStokKontrol
 from .negatif_stok_kontrol import NegatifStokKontrol
 
@@ -115,6 +120,60 @@ class StokHareketService(IStokHareketService):
         # Hareketi kaydet ve bakiyeyi güncelle
         return self._hareket_kaydet_ve_bakiye_guncelle(hareket)
     
+    def toplu_stok_hareketi(self, hareketler: List[StokHareketDTO],
+                            yetersiz_stokta_hata: bool = False,
+                            session: Optional[Session] = None) -> List[StokBakiyeDTO]:
+        """
+        Birden çok stok hareketini tek transaction içinde işler
+        
+        Sepet/belge satırları tek tek stok_cikisi ile işlenmez; tüm hareketler
+        tek INSERT ile kaydedilir ve aynı ürün/mağaza/depo için değişimler
+        toplanarak anahtar başına tek bakiye güncellemesi yapılır.
+        
+        Args:
+            hareketler: Hareket listesi; GIRIS/CIKIS miktarları pozitif
+                verilebilir, işaret hareket tipine göre ayarlanır
+            yetersiz_stokta_hata: True ise kullanılabilir miktarı eksiye düşüren
+                her çıkış StokYetersizError ile tüm işlemi geri alır; False ise
+                negatif stok politikası uygulanır
+            session: Dış transaction oturumu; verilirse hareketler onun
+                içinde yazılır ve commit/rollback çağıranındır
+            
+        Returns:
+            List[StokBakiyeDTO]: Etkilenen bakiyelerin güncel hali
+            
+        Raises:
+            StokValidationError: Validasyon hatası durumunda
+            StokYetersizError: yetersiz_stokta_hata ve yetersiz stok durumunda
+            NegatifStokError: Negatif stok kontrolü başarısız olursa
+        """
+        for hareket in hareketler:
+            if hareket.hareket_tipi == HareketTipi.CIKIS.value:
+                hareket.miktar = -abs(hareket.miktar)
+            elif hareket.hareket_tipi == HareketTipi.GIRIS.value:
+                hareket.miktar = abs(hareket.miktar)
+            self._validate_hareket(hareket)
+        
+        def bakiye_dogrula(bakiye: StokBakiyeDTO, degisim: Decimal) -> None:
+            if degisim >= 0:
+                return
+            
+            onceki_stok = bakiye.kullanilabilir_miktar - degisim
+            if yetersiz_stokta_hata:
+                if bakiye.kullanilabilir_miktar < 0:
+                    raise StokYetersizError(
+                        f"Yetersiz stok. Mevcut: {onceki_stok}, Talep: {-degisim}",
+                        urun_kodu=f"ID:{bakiye.urun_id}",
+                        kullanilabilir_stok=onceki_stok,
+                        talep_edilen_miktar=-degisim
+                    )
+            elif not self._negatif_stok_kontrol.kontrol_yap(bakiye.urun_id, -degisim, onceki_stok):
+                raise NegatifStokError(
+                    f"Yetersiz stok. Mevcut: {onceki_stok}, Talep: {-degisim}"
+                )
+        
+        return self._hareket_repository.toplu_hareket_uygula(hareketler, bakiye_dogrula, session=session)
+    
     def hareket_listesi(self, filtre: StokHareketFiltreDTO) -> List[StokHareketDTO]:
         """
         Stok hareket listesini getirir
@@ -1,57 +1,81 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.stok_rezervasyon_service
 # Description: SONTECHSP stok rezervasyon servisi
 # Changelog:
 # - İlk oluşturma
+# - Rezervasyonlar kalıcı tabloya taşındı, süre dolumu yığın tabanlı temizleyiciye bağlandı
+# - Toplam yenilemesi ve artımlı güncellemeler aynı kilitte; zamanlar UTC'li
 
 """
 SONTECHSP Stok Rezervasyon Servisi
 
 Bu modül stok rezervasyon işlemlerini yöneten servis sınıfını içerir.
 E-ticaret entegrasyonu için stok rezervasyon yönetimi sağlar.
+
+Rezervasyonlar stok_rezervasyonlari tablosunda tutulur; terminal yeniden
+başlasa da kaybolmaz ve diğer terminallerden görünür. Ürün/mağaza başına
+aktif rezerve toplamları bellekte tutulur ve O(1) okunur.
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from decimal import Decimal
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import heapq
+import logging
+import threading
 import uuid
-from dataclasses import dataclass
-
-from ..dto import StokBakiyeDTO
-from ..depolar.arayuzler import IStokBakiyeRepository
-from ..hatalar.stok_hatalari import StokValidationError, StokYetersizError
 
-
-@dataclass
-class StokRezervasyonu:
-    """Stok rezervasyon bilgileri"""
-    rezervasyon_id: str
-    urun_id: int
-    magaza_id: int
-    depo_id: Optional[int]
-    rezerve_miktar: Decimal
-    rezervasyon_tarihi: datetime
-    gecerlilik_tarihi: datetime
-    durum: str  # 'AKTIF', 'KULLANILDI', 'IPTAL_EDILDI', 'SURESI_DOLDU'
-    referans_tablo: Optional[str] = None
-    referans_id: Optional[int] = None
-    aciklama: Optional[str] = None
+from ..dto import StokRezervasyonDTO
+from ..depolar.arayuzler import IStokBakiyeRepository, IStokRezervasyonRepository
+from ..hatalar.stok_hatalari import StokValidationError
 
 
 class StokRezervasyonService:
     """Stok rezervasyon servisi implementasyonu"""
     
-    def __init__(self, bakiye_repository: IStokBakiyeRepository):
+    def __init__(self, bakiye_repository: IStokBakiyeRepository,
+                 rezervasyon_repository: Optional[IStokRezervasyonRepository] = None,
+                 temizlik_araligi: float = 30.0,
+                 parti_boyutu: int = 500):
         """
         Stok rezervasyon servisi constructor
         
         Args:
             bakiye_repository: Stok bakiye repository
+            rezervasyon_repository: Stok rezervasyon repository
+            temizlik_araligi: Süresi dolan rezervasyon taraması için azami
+                bekleme (saniye); diğer terminallerin rezervasyonları ve
+                toplamların yenilenmesi bu aralıkla yakalanır
+            parti_boyutu: Süre dolumunda tek transaction'da düşülecek kayıt sayısı
         """
+        if rezervasyon_repository is None:
+            from ..depolar.stok_rezervasyon_repository import StokRezervasyonRepository
+            rezervasyon_repository = StokRezervasyonRepository(bakiye_repository)
+        
         self._bakiye_repository = bakiye_repository
-        self._aktif_rezervasyonlar: Dict[str, StokRezervasyonu] = {}
+        self._rezervasyon_repository = rezervasyon_repository
         self._varsayilan_gecerlilik_suresi = timedelta(hours=2)  # 2 saat
+        self._temizlik_araligi = temizlik_araligi
+        self._parti_boyutu = parti_boyutu
+        self._logger = logging.getLogger(__name__)
+        
+        # (urun_id, magaza_id) -> (aktif rezerve toplamı, aktif rezervasyon sayısı)
+        # Veritabanı değişikliği ile bellek güncellemesi ve toplam yenilemesi
+        # _toplam_kilidi altında yapılır; yenileme bir değişikliği kaçırmaz
+        # veya iki kez saymaz
+        self._toplam_kilidi = threading.RLock()
+        self._lock = threading.Lock()
+        self._rezerve_toplamlari: Dict[Tuple[int, int], Tuple[Decimal, int]] = {}
+        self._toplamlar_yuklu = False
+        
+        # (gecerlilik_tarihi, rezervasyon_id) min-yığını; iptal/kullanılan
+        # kayıtlar yığından silinmez, zamanı gelince tarama ucuzdur
+        self._bitis_yigini: List[Tuple[datetime, str]] = []
+        
+        self._durdur_olayi = threading.Event()
+        self._uyandir_olayi = threading.Event()
+        self._temizlik_thread: Optional[threading.Thread] = None
     
     def rezervasyon_yap(self,
                        urun_id: int,
@@ -65,6 +89,9 @@ class StokRezervasyonService:
         """
         Stok rezervasyonu yapar (Ana koordinasyon fonksiyonu)
         
+        Rezervasyon kaydı ve bakiyedeki rezerve miktar tek transaction'da
+        yazılır; yeterlilik kontrolü bakiyenin korumalı UPDATE'idir.
+        
         Args:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
@@ -74,70 +101,35 @@ class StokRezervasyonService:
             referans_tablo: Referans tablo adı
             referans_id: Referans kayıt ID
             aciklama: Rezervasyon açıklaması
-            
+        
         Returns:
             str: Rezervasyon ID
-            
+        
         Raises:
             StokValidationError: Validasyon hatası durumunda
             StokYetersizError: Yetersiz stok durumunda
         """
         # 1. Doğrulama
-        self._rezervasyon_dogrula(urun_id, magaza_id, miktar, depo_id)
+        self._validate_rezervasyon_parametreleri(urun_id, magaza_id, miktar)
         
         # 2. Rezervasyon oluştur
-        rezervasyon_id = self._rezervasyon_olustur(
-            urun_id, magaza_id, miktar, depo_id, 
+        rezervasyon = self._rezervasyon_olustur(
+            urun_id, magaza_id, miktar, depo_id,
             gecerlilik_suresi, referans_tablo, referans_id, aciklama
         )
         
-        # 3. Stok bakiyesinde rezervasyon yap
-        self._stok_rezerve_et(urun_id, magaza_id, miktar, depo_id)
+        # 3. Kaydet ve stok bakiyesinde rezerve et
+        with self._toplam_kilidi:
+            self._rezervasyon_repository.rezervasyon_ekle(rezervasyon)
+            self._toplam_guncelle(urun_id, magaza_id, miktar, 1)
+        self._bitis_zamani_ekle(rezervasyon.gecerlilik_tarihi, rezervasyon.rezervasyon_id)
         
-        return rezervasyon_id
-    
-    def _rezervasyon_dogrula(self, urun_id: int, magaza_id: int, 
-                            miktar: Decimal, depo_id: Optional[int]) -> None:
-        """
-        Rezervasyon parametrelerini doğrular ve stok kontrolü yapar
-        
-        Args:
-            urun_id: Ürün ID
-            magaza_id: Mağaza ID
-            miktar: Rezerve edilecek miktar
-            depo_id: Depo ID
-            
-        Raises:
-            StokValidationError: Validasyon hatası durumunda
-            StokYetersizError: Yetersiz stok durumunda
-        """
-        # Parametre validasyonu
-        self._validate_rezervasyon_parametreleri(urun_id, magaza_id, miktar)
-        
-        # Mevcut kullanılabilir stok miktarını al
-        kullanilabilir_miktar = self.kullanilabilir_stok_getir(urun_id, magaza_id, depo_id)
-        
-        if kullanilabilir_miktar <= 0:
-            raise StokYetersizError(
-                f"Stok bulunamadı",
-                urun_kodu=f"ID:{urun_id}",
-                kullanilabilir_stok=Decimal('0'),
-                talep_edilen_miktar=miktar
-            )
-        
-        # Kullanılabilir stok kontrolü
-        if kullanilabilir_miktar < miktar:
-            raise StokYetersizError(
-                f"Yetersiz kullanılabilir stok. Mevcut: {kullanilabilir_miktar}, Talep: {miktar}",
-                urun_kodu=f"ID:{urun_id}",
-                kullanilabilir_stok=kullanilabilir_miktar,
-                talep_edilen_miktar=miktar
-            )
+        return rezervasyon.rezervasyon_id
     
     def _rezervasyon_olustur(self, urun_id: int, magaza_id: int, miktar: Decimal,
                             depo_id: Optional[int], gecerlilik_suresi: Optional[timedelta],
                             referans_tablo: Optional[str], referans_id: Optional[int],
-                            aciklama: Optional[str]) -> str:
+                            aciklama: Optional[str]) -> StokRezervasyonDTO:
         """
         Rezervasyon kaydını oluşturur
         
@@ -150,51 +142,30 @@ class StokRezervasyonService:
             referans_tablo: Referans tablo
             referans_id: Referans ID
             aciklama: Açıklama
-            
+        
         Returns:
-            str: Rezervasyon ID
+            StokRezervasyonDTO: Kaydedilecek rezervasyon
         """
         # Rezervasyon ID oluştur
         rezervasyon_id = f"RZV_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
         
         # Geçerlilik süresini belirle
+        simdi = datetime.now(timezone.utc)
         gecerlilik_suresi = gecerlilik_suresi or self._varsayilan_gecerlilik_suresi
-        gecerlilik_tarihi = datetime.utcnow() + gecerlilik_suresi
         
-        # Rezervasyon oluştur
-        rezervasyon = StokRezervasyonu(
+        return StokRezervasyonDTO(
             rezervasyon_id=rezervasyon_id,
             urun_id=urun_id,
             magaza_id=magaza_id,
             depo_id=depo_id,
             rezerve_miktar=miktar,
-            rezervasyon_tarihi=datetime.utcnow(),
-            gecerlilik_tarihi=gecerlilik_tarihi,
+            rezervasyon_tarihi=simdi,
+            gecerlilik_tarihi=simdi + gecerlilik_suresi,
             durum='AKTIF',
             referans_tablo=referans_tablo,
             referans_id=referans_id,
             aciklama=aciklama
         )
-        
-        # Rezervasyonu kaydet
-        self._aktif_rezervasyonlar[rezervasyon_id] = rezervasyon
-        
-        return rezervasyon_id
-    
-    def _stok_rezerve_et(self, urun_id: int, magaza_id: int, 
-                        miktar: Decimal, depo_id: Optional[int]) -> None:
-        """
-        Stok bakiyesinde rezervasyon yapar
-        
-        Args:
-            urun_id: Ürün ID
-            magaza_id: Mağaza ID
-            miktar: Rezerve edilecek miktar
-            depo_id: Depo ID
-        """
-        self._bakiye_repository.rezervasyon_yap(
-            urun_id, magaza_id, miktar, depo_id
-        )
     
     def rezervasyon_iptal(self, rezervasyon_id: str) -> bool:
         """
@@ -202,31 +173,24 @@ class StokRezervasyonService:
         
         Args:
             rezervasyon_id: Rezervasyon ID
-            
+        
         Returns:
             bool: İptal başarılı mı
-            
+        
         Raises:
             StokValidationError: Validasyon hatası durumunda
         """
-        if rezervasyon_id not in self._aktif_rezervasyonlar:
-            raise StokValidationError(f"Rezervasyon bulunamadı: {rezervasyon_id}")
-        
-        rezervasyon = self._aktif_rezervasyonlar[rezervasyon_id]
-        
-        if rezervasyon.durum != 'AKTIF':
-            raise StokValidationError(f"Sadece aktif rezervasyonlar iptal edilebilir. Durum: {rezervasyon.durum}")
-        
-        # Stok bakiyesinde rezervasyonu iptal et
-        self._bakiye_repository.rezervasyon_iptal(
-            rezervasyon.urun_id,
-            rezervasyon.magaza_id,
-            rezervasyon.rezerve_miktar,
-            rezervasyon.depo_id
-        )
-        
-        # Rezervasyon durumunu güncelle
-        rezervasyon.durum = 'IPTAL_EDILDI'
+        with self._toplam_kilidi:
+            rezervasyon = self._rezervasyon_repository.rezervasyon_kapat(rezervasyon_id, 'IPTAL_EDILDI')
+            if rezervasyon is not None:
+                self._toplam_guncelle(rezervasyon.urun_id, rezervasyon.magaza_id,
+                                      -rezervasyon.rezerve_miktar, -1)
+        
+        if rezervasyon is None:
+            mevcut = self._rezervasyon_repository.rezervasyon_getir(rezervasyon_id)
+            if mevcut is None:
+                raise StokValidationError(f"Rezervasyon bulunamadı: {rezervasyon_id}")
+            raise StokValidationError(f"Sadece aktif rezervasyonlar iptal edilebilir. Durum: {mevcut.durum}")
         
         return True
     
@@ -237,17 +201,17 @@ class StokRezervasyonService:
         Args:
             rezervasyon_id: Rezervasyon ID
             kullanilan_miktar: Kullanılan miktar (None ise tüm rezervasyon)
-            
+        
         Returns:
             bool: Kullanım başarılı mı
-            
+        
         Raises:
             StokValidationError: Validasyon hatası durumunda
         """
-        if rezervasyon_id not in self._aktif_rezervasyonlar:
-            raise StokValidationError(f"Rezervasyon bulunamadı: {rezervasyon_id}")
+        rezervasyon = self._rezervasyon_repository.rezervasyon_getir(rezervasyon_id)
         
-        rezervasyon = self._aktif_rezervasyonlar[rezervasyon_id]
+        if rezervasyon is None:
+            raise StokValidationError(f"Rezervasyon bulunamadı: {rezervasyon_id}")
         
         if rezervasyon.durum != 'AKTIF':
             raise StokValidationError(f"Sadece aktif rezervasyonlar kullanılabilir. Durum: {rezervasyon.durum}")
@@ -261,34 +225,24 @@ class StokRezervasyonService:
                 f"Rezerve: {rezervasyon.rezerve_miktar}, Kullanılan: {kullanilan_miktar}"
             )
         
-        # Stok bakiyesini güncelle - önce rezervasyonu iptal et, sonra stok düşümü yap
-        self._bakiye_repository.rezervasyon_iptal(
-            rezervasyon.urun_id,
-            rezervasyon.magaza_id,
-            kullanilan_miktar,
-            rezervasyon.depo_id
-        )
-        
-        # Stok düşümü yap (negatif miktar ile güncelleme)
-        self._bakiye_repository.bakiye_guncelle(
-            rezervasyon.urun_id,
-            rezervasyon.magaza_id,
-            -kullanilan_miktar,
-            rezervasyon.depo_id
-        )
+        # Rezerve miktar serbest bırakılır ve stok düşülür (tek transaction)
+        with self._toplam_kilidi:
+            guncel = self._rezervasyon_repository.rezervasyon_kullan(rezervasyon_id, kullanilan_miktar)
+            if guncel is not None:
+                self._toplam_guncelle(
+                    guncel.urun_id, guncel.magaza_id, -kullanilan_miktar,
+                    -1 if guncel.durum != 'AKTIF' else 0
+                )
         
-        # Rezervasyon durumunu güncelle
-        if kullanilan_miktar == rezervasyon.rezerve_miktar:
-            rezervasyon.durum = 'KULLANILDI'
-        else:
-            # Kısmi kullanım - rezerve miktarını azalt
-            rezervasyon.rezerve_miktar -= kullanilan_miktar
+        if guncel is None:
+            # Okuma ile kullanım arasında başka terminal kapattı/kullandı
+            raise StokValidationError(f"Rezervasyon kullanılamadı, durum değişmiş: {rezervasyon_id}")
         
         return True
     
-    def kullanilabilir_stok_getir(self, 
-                                 urun_id: int, 
-                                 magaza_id: int, 
+    def kullanilabilir_stok_getir(self,
+                                 urun_id: int,
+                                 magaza_id: int,
                                  depo_id: Optional[int] = None) -> Decimal:
         """
         Kullanılabilir stok miktarını getirir (toplam - rezerve)
@@ -297,7 +251,7 @@ class StokRezervasyonService:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
             depo_id: Depo ID (opsiyonel)
-            
+        
         Returns:
             Decimal: Kullanılabilir stok miktarı
         """
@@ -308,74 +262,178 @@ class StokRezervasyonService:
         
         return bakiye.kullanilabilir_miktar
     
-    def rezervasyon_bilgisi_getir(self, rezervasyon_id: str) -> Optional[StokRezervasyonu]:
+    def rezervasyon_bilgisi_getir(self, rezervasyon_id: str) -> Optional[StokRezervasyonDTO]:
         """
         Rezervasyon bilgilerini getirir
         
         Args:
             rezervasyon_id: Rezervasyon ID
-            
+        
         Returns:
-            Optional[StokRezervasyonu]: Rezervasyon bilgileri
+            Optional[StokRezervasyonDTO]: Rezervasyon bilgileri
         """
-        return self._aktif_rezervasyonlar.get(rezervasyon_id)
+        return self._rezervasyon_repository.rezervasyon_getir(rezervasyon_id)
     
-    def aktif_rezervasyonlar_listesi(self, 
+    def aktif_rezervasyonlar_listesi(self,
                                    urun_id: Optional[int] = None,
-                                   magaza_id: Optional[int] = None) -> List[StokRezervasyonu]:
+                                   magaza_id: Optional[int] = None) -> List[StokRezervasyonDTO]:
         """
-        Aktif rezervasyonların listesini getirir
+        Aktif rezervasyonların listesini getirir (en yeni önce)
         
         Args:
             urun_id: Ürün ID filtresi (opsiyonel)
             magaza_id: Mağaza ID filtresi (opsiyonel)
-            
+        
         Returns:
-            List[StokRezervasyonu]: Aktif rezervasyonlar listesi
+            List[StokRezervasyonDTO]: Aktif rezervasyonlar listesi
         """
-        rezervasyonlar = []
-        
-        for rezervasyon in self._aktif_rezervasyonlar.values():
-            if rezervasyon.durum != 'AKTIF':
-                continue
-            
-            if urun_id is not None and rezervasyon.urun_id != urun_id:
-                continue
-            
-            if magaza_id is not None and rezervasyon.magaza_id != magaza_id:
-                continue
-            
-            rezervasyonlar.append(rezervasyon)
+        return self._rezervasyon_repository.aktif_rezervasyonlar(urun_id, magaza_id)
+    
+    def rezerve_toplami_getir(self, urun_id: int, magaza_id: int) -> Decimal:
+        """
+        Ürün/mağaza için aktif rezerve toplamını döndürür (O(1))
         
-        # Rezervasyon tarihine göre sırala (en yeni önce)
-        rezervasyonlar.sort(key=lambda r: r.rezervasyon_tarihi, reverse=True)
+        Returns:
+            Decimal: Aktif rezervasyonların toplam miktarı
+        """
+        self._toplamlari_hazirla()
+        return self._rezerve_toplamlari.get((urun_id, magaza_id), (Decimal('0'), 0))[0]
+    
+    def aktif_rezervasyon_sayisi(self, urun_id: int, magaza_id: int) -> int:
+        """Ürün/mağaza için aktif rezervasyon sayısını döndürür (O(1))"""
+        self._toplamlari_hazirla()
+        return self._rezerve_toplamlari.get((urun_id, magaza_id), (Decimal('0'), 0))[1]
+    
+    def rezerve_toplamlarini_yenile(self) -> None:
+        """
+        Bellekteki rezerve toplamlarını veritabanından yeniden yükler
         
-        return rezervasyonlar
+        Okuma ve değiştirme, bu süreçteki rezervasyon değişikliklerinin
+        kullandığı kilit altındadır; okumayla değiştirme arasında artımlı
+        güncelleme kaybolmaz.
+        """
+        with self._toplam_kilidi:
+            self._rezerve_toplamlari = self._rezervasyon_repository.aktif_toplamlar()
+            self._toplamlar_yuklu = True
     
     def suresi_dolan_rezervasyonlari_temizle(self) -> int:
         """
-        Süresi dolan rezervasyonları temizler
+        Süresi dolan rezervasyonları partiler halinde düşürür
+        
+        Her parti tek transaction'dır: kayıtlar SURESI_DOLDU yapılır ve
+        rezerve miktarlar bakiyelerden anahtar başına toplu serbest bırakılır.
+        Diğer terminallerin süresi dolan rezervasyonları da düşürülür.
         
         Returns:
             int: Temizlenen rezervasyon sayısı
         """
-        simdi = datetime.utcnow()
+        simdi = datetime.now(timezone.utc)
         temizlenen_sayisi = 0
         
-        for rezervasyon_id, rezervasyon in list(self._aktif_rezervasyonlar.items()):
-            if rezervasyon.durum == 'AKTIF' and rezervasyon.gecerlilik_tarihi < simdi:
-                # Rezervasyonu iptal et
-                try:
-                    self.rezervasyon_iptal(rezervasyon_id)
-                    rezervasyon.durum = 'SURESI_DOLDU'
-                    temizlenen_sayisi += 1
-                except Exception:
-                    # Hata durumunda sadece durumu güncelle
-                    rezervasyon.durum = 'SURESI_DOLDU'
-                    temizlenen_sayisi += 1
+        while True:
+            with self._toplam_kilidi:
+                parti = self._rezervasyon_repository.suresi_dolanlari_dusur(simdi, self._parti_boyutu)
+                for rezervasyon in parti:
+                    self._toplam_guncelle(rezervasyon.urun_id, rezervasyon.magaza_id,
+                                          -rezervasyon.rezerve_miktar, -1)
+            temizlenen_sayisi += len(parti)
+            
+            if len(parti) < self._parti_boyutu:
+                break
+        
+        with self._lock:
+            while self._bitis_yigini and self._bitis_yigini[0][0] <= simdi:
+                heapq.heappop(self._bitis_yigini)
+        
+        if temizlenen_sayisi:
+            self._logger.info(f"Süresi dolan rezervasyon düşüldü - {temizlenen_sayisi} kayıt")
         
         return temizlenen_sayisi
     
+    def temizleyici_baslat(self) -> None:
+        """
+        Süre dolumu temizleyicisini arka plan thread'inde başlatır
+        
+        Thread en yakın bitiş zamanına (yığının tepesi) kadar uyur; daha
+        erken biten yeni rezervasyon eklenirse uyandırılır. En geç
+        temizlik_araligi saniyede bir tarar ve toplamları yeniler.
+        """
+        if self._temizlik_thread and self._temizlik_thread.is_alive():
+            return
+        
+        self._durdur_olayi.clear()
+        self._temizlik_thread = threading.Thread(
+            target=self._temizlik_dongusu,
+            name="stok-rezervasyon-temizleyici",
+            daemon=True
+        )
+        self._temizlik_thread.start()
+    
+    def temizleyici_durdur(self, bekleme: float = 5.0) -> None:
+        """Süre dolumu temizleyicisini durdurur"""
+        self._durdur_olayi.set()
+        self._uyandir_olayi.set()
+        if self._temizlik_thread:
+            self._temizlik_thread.join(timeout=bekleme)
+            self._temizlik_thread = None
+    
+    def _temizlik_dongusu(self) -> None:
+        """Arka plan süre dolumu döngüsü"""
+        while not self._durdur_olayi.is_set():
+            uyandirildi = self._uyandir_olayi.wait(self._sonraki_bekleme())
+            if self._durdur_olayi.is_set():
+                break
+            if uyandirildi:
+                # Yeni ve daha erken bitiş zamanı, bekleme yeniden hesaplanır
+                self._uyandir_olayi.clear()
+                continue
+            
+            try:
+                self.suresi_dolan_rezervasyonlari_temizle()
+                self.rezerve_toplamlarini_yenile()
+            except Exception as e:
+                self._logger.warning(f"Rezervasyon temizliği başarısız: {str(e)}")
+    
+    def _sonraki_bekleme(self) -> float:
+        """Yığının tepesindeki bitiş zamanına kalan süre (azami temizlik_araligi)"""
+        with self._lock:
+            if not self._bitis_yigini:
+                return self._temizlik_araligi
+            kalan = (self._bitis_yigini[0][0] - datetime.now(timezone.utc)).total_seconds()
+        return min(self._temizlik_araligi, max(0.0, kalan))
+    
+    def _bitis_zamani_ekle(self, gecerlilik_tarihi: datetime, rezervasyon_id: str) -> None:
+        """Bitiş zamanını yığına ekler, yeni tepe ise temizleyiciyi uyandırır"""
+        with self._lock:
+            heapq.heappush(self._bitis_yigini, (gecerlilik_tarihi, rezervasyon_id))
+            yeni_tepe = self._bitis_yigini[0][1] == rezervasyon_id
+        
+        if yeni_tepe:
+            self._uyandir_olayi.set()
+    
+    def _toplamlari_hazirla(self) -> None:
+        """Toplamlar henüz yüklenmediyse veritabanından yükler"""
+        if not self._toplamlar_yuklu:
+            self.rezerve_toplamlarini_yenile()
+    
+    def _toplam_guncelle(self, urun_id: int, magaza_id: int,
+                         miktar_degisimi: Decimal, adet_degisimi: int) -> None:
+        """Bellekteki ürün/mağaza rezerve toplamını artımlı günceller"""
+        anahtar = (urun_id, magaza_id)
+        with self._toplam_kilidi:
+            if not self._toplamlar_yuklu:
+                # İlk okumada tamamı yükleneceği için artımlı güncelleme gerekmez
+                return
+            
+            toplam, adet = self._rezerve_toplamlari.get(anahtar, (Decimal('0'), 0))
+            toplam += miktar_degisimi
+            adet += adet_degisimi
+            
+            if adet <= 0 or toplam <= 0:
+                self._rezerve_toplamlari.pop(anahtar, None)
+            else:
+                self._rezerve_toplamlari[anahtar] = (toplam, adet)
+    
     def _validate_rezervasyon_parametreleri(self,
                                           urun_id: int,
                                           magaza_id: int,
@@ -387,7 +445,7 @@ class StokRezervasyonService:
             urun_id: Ürün ID
             magaza_id: Mağaza ID
             miktar: Rezerve edilecek miktar
-            
+        
         Raises:
             StokValidationError: Validasyon hatası durumunda
         """
@@ -401,4 +459,4 @@ class StokRezervasyonService:
             raise StokValidationError("Rezerve edilecek miktar pozitif olmalıdır")
         
         if miktar > Decimal('999999.9999'):
-            raise StokValidationError("Rezerve edilecek miktar çok büyük")
\ No newline at end of file
+            raise StokValidationError("Rezerve edilecek miktar çok büyük")
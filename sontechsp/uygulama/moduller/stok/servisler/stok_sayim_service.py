@@ -1,267 +1,417 @@
-# Version: 0.1.0
-# Last Update: 2024-12-16
+# Version: 0.2.0
+# Last Update: 2026-10-17
 # Module: stok.servisler.stok_sayim_service
 # Description: SONTECHSP stok sayım servisi
 # Changelog:
 # - İlk oluşturma
+# - Sayım oturumları kalıcı hale getirildi (stok_sayimlari)
+# - Akışlı sayım dosyası yükleme ve parti halinde fark uygulama eklendi
+# - İndekste olmayan barkodlar repository'den çözülüyor, tamamlama özet döndürüyor
 
 """
 SONTECHSP Stok Sayım Servisi
 
 Bu modül stok sayım işlemlerini yöneten servis sınıfını içerir.
 Sayım başlatma, tamamlama ve iptal işlemlerini gerçekleştirir.
+
+Sayım oturumları veritabanında tutulur; süreç yeniden başlasa da sayım
+kaldığı yerden devam eder. Sistem miktarları başlangıçta tek sorguyla
+görüntülenir, farklar küme tabanlı hesaplanır ve bakiyeye parti parti
+uygulanır.
 """
 
-from typing import Dict, List, Optional
-from decimal import Decimal
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from decimal import Decimal, InvalidOperation
 from datetime import datetime
 from enum import Enum
 
-from ..dto import StokHareketDTO, StokBakiyeDTO
-from ..depolar.arayuzler import IStokHareketRepository, IStokBakiyeRepository
+from ..depolar.arayuzler import IStokHareketRepository, IStokBakiyeRepository, IStokSayimRepository
+from ..depolar.barkod_indeksi import barkod_indeksi_al
 from ..hatalar.stok_hatalari import StokValidationError, StokSayimError
 
+IlerlemeGeriCagrisi = Callable[[int, int], None]
+
 
 class SayimDurumu(Enum):
     """Sayım durumları"""
     BASLADI = "BASLADI"
     DEVAM_EDIYOR = "DEVAM_EDIYOR"
+    UYGULANIYOR = "UYGULANIYOR"
     TAMAMLANDI = "TAMAMLANDI"
     IPTAL_EDILDI = "IPTAL_EDILDI"
 
 
+_VERI_KABUL_EDEN = (SayimDurumu.BASLADI.value, SayimDurumu.DEVAM_EDIYOR.value)
+
+
 class StokSayimService:
     """Stok sayım servisi implementasyonu"""
-    
-    def __init__(self, 
+
+    def __init__(self,
                  hareket_repository: IStokHareketRepository,
-                 bakiye_repository: IStokBakiyeRepository):
+                 bakiye_repository: IStokBakiyeRepository,
+                 sayim_repository: Optional[IStokSayimRepository] = None,
+                 barkod_repository=None):
         """
         Stok sayım servisi constructor
-        
+
         Args:
             hareket_repository: Stok hareket repository
             bakiye_repository: Stok bakiye repository
+            sayim_repository: Stok sayım repository (verilmezse oluşturulur)
+            barkod_repository: İndekste bulunmayan barkodlar için
+                barkod_ile_ara sağlayan repository (verilmezse oluşturulur)
         """
         self._hareket_repository = hareket_repository
         self._bakiye_repository = bakiye_repository
-        self._aktif_sayimlar: Dict[str, Dict] = {}  # sayim_id -> sayim_bilgileri
-    
-    def sayim_baslat(self, 
-                    magaza_id: int, 
+        self._barkod_repository = barkod_repository
+        if sayim_repository is None:
+            from ..depolar.stok_sayim_repository import StokSayimRepository
+            sayim_repository = StokSayimRepository(hareket_repository)
+        self._sayim_repository = sayim_repository
+
+    def sayim_baslat(self,
+                    magaza_id: int,
                     depo_id: Optional[int] = None,
                     kullanici_id: Optional[int] = None,
                     aciklama: Optional[str] = None) -> str:
         """
         Stok sayım işlemini başlatır
-        
+
+        Mevcut sistem bakiyeleri sayım satırlarına tek sorguyla kopyalanır.
+
         Args:
             magaza_id: Mağaza ID
             depo_id: Depo ID (opsiyonel)
             kullanici_id: Sayımı başlatan kullanıcı ID
             aciklama: Sayım açıklaması
-            
+
         Returns:
             str: Sayım ID
-            
+
         Raises:
             StokValidationError: Validasyon hatası durumunda
         """
         if magaza_id <= 0:
             raise StokValidationError("Geçerli mağaza ID gereklidir")
-        
+
         # Sayım ID oluştur
-        sayim_id = f"SAYIM_{magaza_id}_{depo_id or 0}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # Sayım bilgilerini kaydet
-        sayim_bilgileri = {
-            'sayim_id': sayim_id,
-            'magaza_id': magaza_id,
-            'depo_id': depo_id,
-            'kullanici_id': kullanici_id,
-            'aciklama': aciklama,
-            'durum': SayimDurumu.BASLADI,
-            'baslangic_tarihi': datetime.utcnow(),
-            'sayim_verileri': {},  # urun_id -> sayilan_miktar
-            'sistem_bakiyeleri': {}  # urun_id -> sistem_miktar
-        }
-        
-        # Mevcut sistem bakiyelerini al
-        mevcut_bakiyeler = self._bakiye_repository.magaza_bakiyeleri_getir(magaza_id, depo_id)
-        
-        for bakiye in mevcut_bakiyeler:
-            sayim_bilgileri['sistem_bakiyeleri'][bakiye.urun_id] = bakiye.miktar
-        
-        self._aktif_sayimlar[sayim_id] = sayim_bilgileri
-        
+        sayim_id = f"SAYIM_{magaza_id}_{depo_id or 0}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+
+        self._sayim_repository.sayim_olustur(sayim_id, magaza_id, depo_id, kullanici_id, aciklama)
+
         return sayim_id
-    
-    def sayim_veri_ekle(self, 
-                       sayim_id: str, 
-                       urun_id: int, 
+
+    def sayim_veri_ekle(self,
+                       sayim_id: str,
+                       urun_id: int,
                        sayilan_miktar: Decimal) -> None:
         """
-        Sayım verisi ekler
-        
+        Sayım verisi ekler (aynı ürün için önceki değerin üzerine yazar)
+
         Args:
             sayim_id: Sayım ID
             urun_id: Ürün ID
             sayilan_miktar: Sayılan miktar
-            
+
         Raises:
             StokSayimError: Sayım hatası durumunda
         """
-        if sayim_id not in self._aktif_sayimlar:
-            raise StokSayimError(f"Aktif sayım bulunamadı: {sayim_id}")
-        
-        sayim = self._aktif_sayimlar[sayim_id]
-        
-        if sayim['durum'] not in [SayimDurumu.BASLADI, SayimDurumu.DEVAM_EDIYOR]:
-            raise StokSayimError(f"Sayım durumu veri eklemeye uygun değil: {sayim['durum']}")
-        
-        if urun_id <= 0:
-            raise StokValidationError("Geçerli ürün ID gereklidir")
-        
-        if sayilan_miktar < 0:
-            raise StokValidationError("Sayılan miktar negatif olamaz")
-        
-        # Sayım verisini ekle
-        sayim['sayim_verileri'][urun_id] = sayilan_miktar
-        sayim['durum'] = SayimDurumu.DEVAM_EDIYOR
-    
-    def sayim_tamamla(self, sayim_id: str) -> Dict[int, Decimal]:
+        sayim = self._veri_kabul_eden_sayim(sayim_id)
+        self._kayit_dogrula(urun_id, sayilan_miktar)
+
+        self._sayim_repository.sayim_verileri_yaz(sayim['id'], [(urun_id, sayilan_miktar)])
+
+    def sayim_verileri_ekle(self,
+                            sayim_id: str,
+                            kayitlar: Iterable[Tuple[int, Decimal]],
+                            parti_boyutu: int = 5000) -> int:
+        """
+        Sayım verilerini akış olarak parti parti ekler
+
+        Aynı ürün birden fazla kez gelirse miktarlar toplanır (farklı raflarda
+        okutulan aynı ürün). Kayıtlar belleğe toplanmaz; her parti tek
+        executemany ile yazılır.
+
+        Args:
+            sayim_id: Sayım ID
+            kayitlar: (urun_id, sayilan_miktar) akışı
+            parti_boyutu: Tek seferde yazılacak kayıt sayısı
+
+        Returns:
+            int: Yazılan kayıt sayısı
+
+        Raises:
+            StokSayimError: Sayım hatası durumunda
         """
-        Sayım işlemini tamamlar ve farkları hesaplar
-        
+        sayim = self._veri_kabul_eden_sayim(sayim_id)
+
+        toplam = 0
+        for parti in self._partiler(kayitlar, parti_boyutu):
+            for urun_id, miktar in parti.items():
+                self._kayit_dogrula(urun_id, miktar)
+            toplam += self._sayim_repository.sayim_verileri_yaz(
+                sayim['id'], list(parti.items()), toplama=True
+            )
+
+        return toplam
+
+    def sayim_dosyasi_yukle(self,
+                            sayim_id: str,
+                            dosya_yolu: str,
+                            ayirici: str = ';',
+                            parti_boyutu: int = 5000,
+                            barkod_cozucu: Optional[Callable[[str], Optional[int]]] = None,
+                            ilerleme: Optional[IlerlemeGeriCagrisi] = None) -> Dict[str, int]:
+        """
+        El terminali dosyasını ("barkod;miktar" satırları) akış olarak yükler
+
+        Dosya satır satır okunur, barkodlar bellek içi barkod indeksinden
+        çözülür ve sayım verileri parti halinde yazılır. İndeks yüklenmemişse
+        veya barkod indekste yoksa barkod repository'sine düşülür; sonuç
+        yükleme boyunca önbelleğe alınır (tekrarlanan barkodlar tek sorgu).
+
         Args:
             sayim_id: Sayım ID
-            
+            dosya_yolu: Sayım dosyası yolu
+            ayirici: Alan ayırıcı
+            parti_boyutu: Tek seferde yazılacak kayıt sayısı
+            barkod_cozucu: Barkoddan ürün ID çözen fonksiyon
+            ilerleme: Her parti sonrası (okunan_bayt, dosya_boyutu) ile çağrılır
+
         Returns:
-            Dict[int, Decimal]: Ürün ID -> Fark miktarı mapping
-            
+            Dict[str, int]: okunan_satir, yazilan_kayit, bilinmeyen_barkod,
+                hatali_satir sayıları
+
         Raises:
             StokSayimError: Sayım hatası durumunda
         """
-        if sayim_id not in self._aktif_sayimlar:
-            raise StokSayimError(f"Aktif sayım bulunamadı: {sayim_id}")
-        
-        sayim = self._aktif_sayimlar[sayim_id]
-        
-        if sayim['durum'] == SayimDurumu.TAMAMLANDI:
-            raise StokSayimError("Sayım zaten tamamlanmış")
-        
-        if sayim['durum'] == SayimDurumu.IPTAL_EDILDI:
-            raise StokSayimError("İptal edilmiş sayım tamamlanamaz")
-        
-        farklar = {}
-        
-        # Sayılan ürünler için fark hesapla
-        for urun_id, sayilan_miktar in sayim['sayim_verileri'].items():
-            sistem_miktar = sayim['sistem_bakiyeleri'].get(urun_id, Decimal('0'))
-            fark = sayilan_miktar - sistem_miktar
-            
-            if fark != 0:
-                farklar[urun_id] = fark
-                
-                # Sayım hareketi oluştur
-                hareket = StokHareketDTO(
-                    urun_id=urun_id,
-                    magaza_id=sayim['magaza_id'],
-                    depo_id=sayim['depo_id'],
-                    hareket_tipi="SAYIM",
-                    miktar=fark,
-                    aciklama=f"Sayım farkı - Sayım ID: {sayim_id}",
-                    kullanici_id=sayim['kullanici_id'],
-                    referans_tablo="stok_sayimlari",
-                    referans_id=None  # Sayım tablosu ID'si olabilir
-                )
-                
-                # Hareketi kaydet
-                self._hareket_repository.hareket_ekle(hareket)
-                
-                # Bakiyeyi güncelle
-                mevcut_bakiye = self._bakiye_repository.bakiye_getir(
-                    urun_id, sayim['magaza_id'], sayim['depo_id']
-                )
-                
-                if mevcut_bakiye:
-                    yeni_miktar = mevcut_bakiye.miktar + fark
-                    yeni_kullanilabilir = mevcut_bakiye.kullanilabilir_miktar + fark
-                    
-                    self._bakiye_repository.bakiye_guncelle(
-                        mevcut_bakiye.id,
-                        yeni_miktar,
-                        mevcut_bakiye.rezerve_miktar,
-                        yeni_kullanilabilir,
-                        None,  # birim_fiyat
-                        datetime.utcnow()
-                    )
-        
-        # Sayımı tamamla
-        sayim['durum'] = SayimDurumu.TAMAMLANDI
-        sayim['tamamlanma_tarihi'] = datetime.utcnow()
-        sayim['farklar'] = farklar
-        
-        return farklar
-    
+        if barkod_cozucu is None:
+            barkod_cozucu = self._barkod_cozucu_olustur()
+
+        sayaclar = {'okunan_satir': 0, 'yazilan_kayit': 0, 'bilinmeyen_barkod': 0, 'hatali_satir': 0}
+        dosya_boyutu = os.path.getsize(dosya_yolu)
+        okunan_bayt = 0
+
+        def kayit_akisi() -> Iterator[Tuple[int, Decimal]]:
+            nonlocal okunan_bayt
+            with open(dosya_yolu, 'rb') as dosya:
+                for ham_satir in dosya:
+                    if okunan_bayt == 0 and ham_satir.startswith(b'\xef\xbb\xbf'):
+                        okunan_bayt += 3
+                        ham_satir = ham_satir[3:]
+                    okunan_bayt += len(ham_satir)
+                    satir = ham_satir.decode('utf-8').strip()
+                    if not satir:
+                        continue
+                    sayaclar['okunan_satir'] += 1
+
+                    alanlar = satir.split(ayirici)
+                    try:
+                        miktar = Decimal(alanlar[1].strip().replace(',', '.')) if len(alanlar) > 1 else Decimal('1')
+                    except InvalidOperation:
+                        sayaclar['hatali_satir'] += 1
+                        continue
+                    if miktar < 0:
+                        sayaclar['hatali_satir'] += 1
+                        continue
+
+                    urun_id = barkod_cozucu(alanlar[0].strip())
+                    if urun_id is None:
+                        sayaclar['bilinmeyen_barkod'] += 1
+                        continue
+
+                    yield urun_id, miktar
+
+        sayim = self._veri_kabul_eden_sayim(sayim_id)
+        for parti in self._partiler(kayit_akisi(), parti_boyutu):
+            sayaclar['yazilan_kayit'] += self._sayim_repository.sayim_verileri_yaz(
+                sayim['id'], list(parti.items()), toplama=True
+            )
+            if ilerleme:
+                ilerleme(okunan_bayt, dosya_boyutu)
+
+        return sayaclar
+
+    def sayim_farklari(self, sayim_id: str) -> Iterator[Tuple[int, Decimal]]:
+        """
+        Sayım farklarını akış olarak getirir
+
+        Args:
+            sayim_id: Sayım ID
+
+        Yields:
+            Tuple[int, Decimal]: (urun_id, sayilan - sistem)
+        """
+        sayim = self._sayim_getir(sayim_id)
+        return self._sayim_repository.farklar_getir(sayim['id'])
+
+    def sayim_tamamla(self,
+                      sayim_id: str,
+                      parti_boyutu: int = 1000,
+                      ilerleme: Optional[IlerlemeGeriCagrisi] = None) -> Dict[str, int]:
+        """
+        Sayım işlemini tamamlar ve farkları bakiyeye uygular
+
+        Farklar parti parti, her parti kendi transaction'ında uygulanır.
+        Uygulama yarıda kesilirse sayım UYGULANIYOR durumunda kalır ve aynı
+        çağrı kalan kalemlerden devam eder. Farkların kendisi belleğe
+        alınmaz; gerekirse sayim_farklari ile akış olarak okunur.
+
+        Args:
+            sayim_id: Sayım ID
+            parti_boyutu: Transaction başına uygulanacak kalem sayısı
+            ilerleme: Her parti sonrası (uygulanan, toplam) ile çağrılır
+
+        Returns:
+            Dict[str, int]: fark_kalem ve uygulanan_kalem sayıları
+
+        Raises:
+            StokSayimError: Sayım hatası durumunda
+        """
+        sayim = self._sayim_getir(sayim_id)
+
+        if sayim['durum'] == SayimDurumu.TAMAMLANDI.value:
+            raise StokSayimError("Sayım zaten tamamlanmış", sayim_id)
+
+        if sayim['durum'] == SayimDurumu.IPTAL_EDILDI.value:
+            raise StokSayimError("İptal edilmiş sayım tamamlanamaz", sayim_id)
+
+        self._sayim_repository.durum_guncelle(
+            sayim['id'], SayimDurumu.UYGULANIYOR.value, _VERI_KABUL_EDEN
+        )
+
+        toplam = sayim['fark_kalem']
+        uygulanan = sayim['uygulanan_kalem']
+        while True:
+            adet = self._sayim_repository.fark_partisi_uygula(sayim, parti_boyutu)
+            if adet == 0:
+                break
+            uygulanan += adet
+            if ilerleme:
+                ilerleme(uygulanan, toplam)
+
+        self._sayim_repository.durum_guncelle(
+            sayim['id'], SayimDurumu.TAMAMLANDI.value, (SayimDurumu.UYGULANIYOR.value,),
+            tamamlanma_tarihi=datetime.utcnow()
+        )
+
+        return {'fark_kalem': toplam, 'uygulanan_kalem': uygulanan}
+
     def sayim_iptal(self, sayim_id: str) -> None:
         """
         Sayım işlemini iptal eder
-        
+
         Args:
             sayim_id: Sayım ID
-            
+
         Raises:
             StokSayimError: Sayım hatası durumunda
         """
-        if sayim_id not in self._aktif_sayimlar:
-            raise StokSayimError(f"Aktif sayım bulunamadı: {sayim_id}")
-        
-        sayim = self._aktif_sayimlar[sayim_id]
-        
-        if sayim['durum'] == SayimDurumu.TAMAMLANDI:
-            raise StokSayimError("Tamamlanmış sayım iptal edilemez")
-        
-        if sayim['durum'] == SayimDurumu.IPTAL_EDILDI:
-            raise StokSayimError("Sayım zaten iptal edilmiş")
-        
+        sayim = self._sayim_getir(sayim_id)
+
+        if sayim['durum'] == SayimDurumu.TAMAMLANDI.value:
+            raise StokSayimError("Tamamlanmış sayım iptal edilemez", sayim_id)
+
+        if sayim['durum'] == SayimDurumu.IPTAL_EDILDI.value:
+            raise StokSayimError("Sayım zaten iptal edilmiş", sayim_id)
+
+        if sayim['durum'] == SayimDurumu.UYGULANIYOR.value:
+            raise StokSayimError("Uygulanmakta olan sayım iptal edilemez", sayim_id)
+
         # Sayımı iptal et
-        sayim['durum'] = SayimDurumu.IPTAL_EDILDI
-        sayim['iptal_tarihi'] = datetime.utcnow()
-    
+        if not self._sayim_repository.durum_guncelle(
+            sayim['id'], SayimDurumu.IPTAL_EDILDI.value, _VERI_KABUL_EDEN,
+            iptal_tarihi=datetime.utcnow()
+        ):
+            raise StokSayimError("Sayım durumu iptal için uygun değil", sayim_id)
+
     def sayim_durumu_getir(self, sayim_id: str) -> Dict:
         """
         Sayım durumunu getirir
-        
+
         Args:
             sayim_id: Sayım ID
-            
+
         Returns:
-            Dict: Sayım durumu bilgileri
-            
+            Dict: Sayım durumu bilgileri (kalem sayıları dahil)
+
         Raises:
             StokSayimError: Sayım bulunamadığında
         """
-        if sayim_id not in self._aktif_sayimlar:
-            raise StokSayimError(f"Sayım bulunamadı: {sayim_id}")
-        
-        return self._aktif_sayimlar[sayim_id].copy()
-    
+        return self._sayim_getir(sayim_id)
+
     def aktif_sayimlar_listesi(self, magaza_id: Optional[int] = None) -> List[Dict]:
         """
         Aktif sayımların listesini getirir
-        
+
         Args:
             magaza_id: Mağaza ID filtresi (opsiyonel)
-            
+
         Returns:
             List[Dict]: Aktif sayımlar listesi
         """
-        sayimlar = []
-        
-        for sayim in self._aktif_sayimlar.values():
-            if magaza_id is None or sayim['magaza_id'] == magaza_id:
-                if sayim['durum'] in [SayimDurumu.BASLADI, SayimDurumu.DEVAM_EDIYOR]:
-                    sayimlar.append(sayim.copy())
-        
-        return sayimlar
\ No newline at end of file
+        return self._sayim_repository.aktif_sayimlar(magaza_id)
+
+    def _sayim_getir(self, sayim_id: str) -> Dict:
+        """Sayım başlığını getirir, yoksa hata fırlatır"""
+        sayim = self._sayim_repository.sayim_getir(sayim_id)
+        if sayim is None:
+            raise StokSayimError(f"Sayım bulunamadı: {sayim_id}", sayim_id)
+        return sayim
+
+    def _veri_kabul_eden_sayim(self, sayim_id: str) -> Dict:
+        """Veri eklenebilecek durumdaki sayımı getirir"""
+        sayim = self._sayim_getir(sayim_id)
+        if sayim['durum'] not in _VERI_KABUL_EDEN:
+            raise StokSayimError(f"Sayım durumu veri eklemeye uygun değil: {sayim['durum']}", sayim_id)
+        return sayim
+
+    def _kayit_dogrula(self, urun_id: int, sayilan_miktar: Decimal) -> None:
+        """Tek sayım kaydını doğrular"""
+        if urun_id <= 0:
+            raise StokValidationError("Geçerli ürün ID gereklidir")
+
+        if sayilan_miktar < 0:
+            raise StokValidationError("Sayılan miktar negatif olamaz")
+
+    def _partiler(self, kayitlar: Iterable[Tuple[int, Decimal]],
+                  parti_boyutu: int) -> Iterator[Dict[int, Decimal]]:
+        """Kayıt akışını, parti içinde aynı ürünü toplayarak partilere böler"""
+        parti: Dict[int, Decimal] = {}
+        for urun_id, miktar in kayitlar:
+            parti[urun_id] = parti.get(urun_id, Decimal('0')) + Decimal(miktar)
+            if len(parti) >= parti_boyutu:
+                yield parti
+                parti = {}
+        if parti:
+            yield parti
+
+    def _barkod_cozucu_olustur(self) -> Callable[[str], Optional[int]]:
+        """
+        Önce bellek içi indekse, ıskada barkod repository'sine bakan çözücü
+
+        Repository sonuçları (bulunamayanlar dahil) çözücü ömrü boyunca
+        saklanır; dosyada tekrar eden barkod için ikinci sorgu atılmaz.
+        """
+        indeks = barkod_indeksi_al()
+        yedek: Dict[str, Optional[int]] = {}
+
+        def coz(barkod: str) -> Optional[int]:
+            kayit = indeks.ara(barkod)
+            if kayit is not None:
+                return kayit.urun_id
+            if barkod not in yedek:
+                kayit = self._barkod_repository_al().barkod_ile_ara(barkod)
+                yedek[barkod] = kayit.urun_id if kayit else None
+            return yedek[barkod]
+
+        return coz
+
+    def _barkod_repository_al(self):
+        """Barkod repository'sini ilk ihtiyaçta oluşturur"""
+        if self._barkod_repository is None:
+            from ..depolar.barkod_repository import BarkodRepository
+            self._barkod_repository = BarkodRepository()
+        return self._barkod_repository
@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2024-12-16
+# Last Update: 2026-10-17
 # Module: stok.servisler.stok_yonetim_service
 # Description: Ana stok yönetim koordinatörü
 # Changelog:
 # - İlk oluşturma
+# - Detaylı aramada barkodlar tek sorguda dolduruluyor
 
 """
 SONTECHSP Ana Stok Yönetim Servisi
@@ -76,26 +77,26 @@ class StokYonetimService:
         except Exception as e:
             raise StokHatasiBase(f"Stok hareket işlemi hatası: {str(e)}")
     
-    def urun_ara_detayli(self, arama_terimi: str) -> List[dict]:
-        """Ürün arar ve detaylı bilgi döner"""
+    def urun_ara_detayli(self, arama_terimi: str, limit: int = 100, onek: bool = False) -> List[dict]:
+        """Ürün arar ve detaylı bilgi döner (sonuç sırası korunur)"""
         try:
-            urunler = self.urun_service.urun_ara(arama_terimi)
+            urunler = self.urun_service.urun_ara(arama_terimi, limit, onek)
             
-            detayli_sonuclar = []
-            for urun in urunler:
-                sonuc = {
+            # Barkodları tüm sonuçlar için tek sorguda getir
+            barkodlar = {}
+            if self.barkod_service:
+                barkodlar = self.barkod_service.urunlerin_barkodlari_getir(
+                    [urun.id for urun in urunler if urun.id]
+                )
+            
+            return [
+                {
                     "urun": urun,
-                    "barkodlar": [],
+                    "barkodlar": barkodlar.get(urun.id, []),
                     "stok_durumu": None
                 }
-                
-                # Barkodları getir
-                if self.barkod_service and urun.id:
-                    sonuc["barkodlar"] = self.barkod_service.urun_barkodlari_getir(urun.id)
-                
-                detayli_sonuclar.append(sonuc)
-            
-            return detayli_sonuclar
+                for urun in urunler
+            ]
             
         except Exception as e:
             raise StokHatasiBase(f"Detaylı arama hatası: {str(e)}")
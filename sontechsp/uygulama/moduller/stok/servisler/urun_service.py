@@ -53,13 +53,20 @@ class UrunService(IUrunService):
         # Repository'ye yönlendir (stok hareketi kontrolü repository'de)
         return self.urun_repository.sil(urun_id)
     
-    def urun_ara(self, arama_terimi: str) -> List[UrunDTO]:
-        """Ürün arar"""
+    def urun_ara(self, arama_terimi: str, limit: int = 100, onek: bool = False) -> List[UrunDTO]:
+        """
+        Ürün arar
+        
+        Args:
+            arama_terimi: Ürün kodu veya adından parça
+            limit: En fazla sonuç sayısı
+            onek: Yazarken arama (kelime başı eşleşmesi)
+        """
         if not arama_terimi or len(arama_terimi.strip()) < 2:
             raise UrunValidationError("Arama terimi en az 2 karakter olmalıdır")
         
         # Repository'ye yönlendir
-        return self.urun_repository.ara(arama_terimi.strip())
+        return self.urun_repository.ara(arama_terimi.strip(), limit, onek)
     
     def _urun_is_kurallari_dogrula(self, urun: UrunDTO) -> None:
         """Ürün iş kuralları doğrulaması"""
@@ -0,0 +1,82 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.stok_bakiye_tekil_indeks
+# Description: Depo'suz stok bakiyeleri için kısmi benzersiz indeks
+# Changelog:
+# - İlk versiyon: uk_stok_bakiye_depo_yok indeksi eklendi
+# - İndeks öncesi mükerrer depo'suz bakiyeler birleştirilir
+
+"""Depo'suz stok bakiyeleri için kısmi benzersiz indeks
+
+uk_stok_bakiye (urun_id, magaza_id, depo_id) kısıtı depo_id NULL iken
+çakışma üretmez. Atomik upsert (INSERT ... ON CONFLICT) için depo_id NULL
+satırlar (urun_id, magaza_id) üzerinde ayrıca tekilleştirilir.
+
+İndeks oluşturulmadan önce mevcut mükerrer depo'suz satırlar en küçük
+ID'li satırda birleştirilir: miktarlar toplanır, ortalama maliyet miktar
+ağırlıklı hesaplanır, son hareket tarihi en yenisi olur.
+
+Revision ID: 006_stok_bakiye_tekil_indeks
+Revises: 005_ebelge_outbox
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_stok_bakiye_tekil_indeks'
+down_revision = '005_ebelge_outbox'
+branch_labels = None
+depends_on = None
+
+
+# Aynı (urun_id, magaza_id) için depo'suz satırlar
+_KARDES_SATIRLAR = (
+    "FROM stok_bakiyeleri d WHERE d.urun_id = stok_bakiyeleri.urun_id "
+    "AND d.magaza_id = stok_bakiyeleri.magaza_id AND d.depo_id IS NULL"
+)
+
+
+def _mukerrer_bakiyeleri_birlestir() -> None:
+    """Mükerrer depo'suz bakiyeleri en küçük ID'li satırda birleştir"""
+    op.execute(f"""
+        UPDATE stok_bakiyeleri SET
+            miktar = (SELECT SUM(d.miktar) {_KARDES_SATIRLAR}),
+            rezerve_miktar = (SELECT SUM(d.rezerve_miktar) {_KARDES_SATIRLAR}),
+            kullanilabilir_miktar = (SELECT SUM(d.kullanilabilir_miktar) {_KARDES_SATIRLAR}),
+            ortalama_maliyet = COALESCE(
+                (SELECT SUM(d.miktar * d.ortalama_maliyet) / NULLIF(SUM(d.miktar), 0) {_KARDES_SATIRLAR}),
+                ortalama_maliyet
+            ),
+            son_hareket_tarihi = (SELECT MAX(d.son_hareket_tarihi) {_KARDES_SATIRLAR})
+        WHERE depo_id IS NULL AND id IN (
+            SELECT MIN(id) FROM stok_bakiyeleri WHERE depo_id IS NULL
+            GROUP BY urun_id, magaza_id HAVING COUNT(*) > 1
+        )
+    """)
+    op.execute("""
+        DELETE FROM stok_bakiyeleri
+        WHERE depo_id IS NULL AND id NOT IN (
+            SELECT MIN(id) FROM stok_bakiyeleri WHERE depo_id IS NULL
+            GROUP BY urun_id, magaza_id
+        )
+    """)
+
+
+def upgrade() -> None:
+    """Mükerrer satırları birleştir ve kısmi benzersiz indeksi oluştur"""
+    _mukerrer_bakiyeleri_birlestir()
+    op.create_index(
+        'uk_stok_bakiye_depo_yok',
+        'stok_bakiyeleri',
+        ['urun_id', 'magaza_id'],
+        unique=True,
+        postgresql_where=sa.text('depo_id IS NULL'),
+        sqlite_where=sa.text('depo_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Kısmi benzersiz indeksi kaldır"""
+    op.drop_index('uk_stok_bakiye_depo_yok', table_name='stok_bakiyeleri')
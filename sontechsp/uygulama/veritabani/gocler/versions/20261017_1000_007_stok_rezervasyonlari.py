@@ -0,0 +1,70 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.stok_rezervasyonlari
+# Description: Kalıcı stok rezervasyon tablosu
+# Changelog:
+# - İlk versiyon: stok_rezervasyonlari tablosu ve aktif kayıt indeksleri eklendi
+# - gecerlilik_tarihi saat dilimli tutulur
+
+"""Kalıcı stok rezervasyon tablosu
+
+Rezervasyonlar süreç belleğinden tabloya taşınır. Aktif kayıtlar
+(urun_id, magaza_id) ve gecerlilik_tarihi üzerinden kısmi indekslerle
+sorgulanır; süresi dolanlar bu indeks sırasıyla toplu düşülür.
+
+Revision ID: 007_stok_rezervasyonlari
+Revises: 006_stok_bakiye_tekil_indeks
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_stok_rezervasyonlari'
+down_revision = '006_stok_bakiye_tekil_indeks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """stok_rezervasyonlari tablosunu oluştur"""
+    op.create_table(
+        'stok_rezervasyonlari',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('rezervasyon_no', sa.String(length=50), nullable=False),
+        sa.Column('urun_id', sa.Integer(), nullable=False),
+        sa.Column('magaza_id', sa.Integer(), nullable=False),
+        sa.Column('depo_id', sa.Integer(), nullable=True),
+        sa.Column('miktar', sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column('durum', sa.String(length=20), nullable=False),
+        sa.Column('gecerlilik_tarihi', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('referans_tablo', sa.String(length=50), nullable=True),
+        sa.Column('referans_id', sa.Integer(), nullable=True),
+        sa.Column('aciklama', sa.Text(), nullable=True),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['urun_id'], ['urunler.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['magaza_id'], ['magazalar.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['depo_id'], ['depolar.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('rezervasyon_no')
+    )
+    
+    op.create_index(
+        'ix_stok_rezervasyon_urun_magaza', 'stok_rezervasyonlari', ['urun_id', 'magaza_id'],
+        postgresql_where=sa.text("durum = 'AKTIF'"),
+        sqlite_where=sa.text("durum = 'AKTIF'")
+    )
+    op.create_index(
+        'ix_stok_rezervasyon_gecerlilik', 'stok_rezervasyonlari', ['gecerlilik_tarihi'],
+        postgresql_where=sa.text("durum = 'AKTIF'"),
+        sqlite_where=sa.text("durum = 'AKTIF'")
+    )
+
+
+def downgrade() -> None:
+    """stok_rezervasyonlari tablosunu kaldır"""
+    op.drop_index('ix_stok_rezervasyon_gecerlilik', table_name='stok_rezervasyonlari')
+    op.drop_index('ix_stok_rezervasyon_urun_magaza', table_name='stok_rezervasyonlari')
+    op.drop_table('stok_rezervasyonlari')
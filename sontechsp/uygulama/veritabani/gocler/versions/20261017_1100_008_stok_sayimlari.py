@@ -0,0 +1,74 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.stok_sayimlari
+# Description: Kalıcı stok sayım oturumu tabloları
+# Changelog:
+# - İlk versiyon: stok_sayimlari ve stok_sayim_satirlari tabloları eklendi
+
+"""Kalıcı stok sayım oturumu tabloları
+
+Sayım oturumları ve sayım başındaki bakiye görüntüsü tabloya yazılır;
+sayım verileri parça parça yüklenir, farklar küme tabanlı hesaplanıp
+partiler halinde uygulanır.
+
+Revision ID: 008_stok_sayimlari
+Revises: 007_stok_rezervasyonlari
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_stok_sayimlari'
+down_revision = '007_stok_rezervasyonlari'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Sayım tablolarını oluştur"""
+    op.create_table(
+        'stok_sayimlari',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sayim_no', sa.String(length=60), nullable=False),
+        sa.Column('magaza_id', sa.Integer(), nullable=False),
+        sa.Column('depo_id', sa.Integer(), nullable=True),
+        sa.Column('kullanici_id', sa.Integer(), nullable=True),
+        sa.Column('aciklama', sa.Text(), nullable=True),
+        sa.Column('durum', sa.String(length=20), nullable=False),
+        sa.Column('uygulanan_kalem', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tamamlanma_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('iptal_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['magaza_id'], ['magazalar.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['depo_id'], ['depolar.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['kullanici_id'], ['kullanicilar.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sayim_no')
+    )
+    op.create_index('ix_stok_sayim_magaza_durum', 'stok_sayimlari', ['magaza_id', 'durum'])
+    
+    op.create_table(
+        'stok_sayim_satirlari',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sayim_id', sa.Integer(), nullable=False),
+        sa.Column('urun_id', sa.Integer(), nullable=False),
+        sa.Column('sistem_miktar', sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column('sayilan_miktar', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('uygulandi', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['sayim_id'], ['stok_sayimlari.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['urun_id'], ['urunler.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sayim_id', 'urun_id', name='uk_stok_sayim_satiri')
+    )
+
+
+def downgrade() -> None:
+    """Sayım tablolarını kaldır"""
+    op.drop_table('stok_sayim_satirlari')
+    op.drop_index('ix_stok_sayim_magaza_durum', table_name='stok_sayimlari')
+    op.drop_table('stok_sayimlari')
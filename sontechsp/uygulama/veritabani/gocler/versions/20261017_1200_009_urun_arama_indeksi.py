@@ -0,0 +1,93 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.urun_arama_indeksi
+# Description: Ürün arama indeksleri
+# Changelog:
+# - İlk versiyon: pg_trgm GIN indeksi ve SQLite FTS5 aynası eklendi
+# - DDL model modülünden bağımsızlaştırıldı (012 kolona taşıdı)
+
+"""Ürün arama indeksleri
+
+PostgreSQL'de Türkçe katlanmış "urun_kodu urun_adi" ifadesi üzerinde
+trigram GIN indeksi CONCURRENTLY oluşturulur; satışlar sürerken tablo
+kilitlenmez. Offline SQLite veritabanında aynı anahtar FTS5 tablosunda
+tutulur ve urunler tetikleyicileriyle güncel kalır.
+
+Revision ID: 009_urun_arama_indeksi
+Revises: 008_stok_sayimlari
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_urun_arama_indeksi'
+down_revision = '008_stok_sayimlari'
+branch_labels = None
+depends_on = None
+
+# Bu revizyondaki hâliyle sabitlenmiştir; model modülündeki güncel
+# tanımlar 012_urun_arama_anahtari ile gelir.
+_KATLAMA = ('İIıŞşĞğÜüÖöÇç', 'iiissgguuoocc')
+_ARAMA_METNI = "urun_kodu || ' ' || urun_adi"
+
+
+def _sqlite_arama_anahtari(ifade: str) -> str:
+    for kaynak, hedef in zip(*_KATLAMA):
+        ifade = f"replace({ifade}, '{kaynak}', '{hedef}')"
+    return f"lower({ifade})"
+
+
+_SQLITE_YENI_ANAHTAR = _sqlite_arama_anahtari(_ARAMA_METNI.replace("urun_", "new.urun_"))
+
+POSTGRESQL_ARAMA_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE OR REPLACE FUNCTION urun_arama_anahtari(metin text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS "
+    f"$$ SELECT lower(translate(metin, '{_KATLAMA[0]}', '{_KATLAMA[1]}')) $$",
+    "CREATE INDEX IF NOT EXISTS ix_urun_arama_trgm ON urunler "
+    f"USING gin (urun_arama_anahtari({_ARAMA_METNI}) gin_trgm_ops)",
+)
+
+SQLITE_ARAMA_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS urun_arama_fts "
+    "USING fts5(anahtar, tokenize='unicode61', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_ekle AFTER INSERT ON urunler BEGIN "
+    "INSERT INTO urun_arama_fts(rowid, anahtar) VALUES "
+    f"(new.id, {_SQLITE_YENI_ANAHTAR}); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_guncelle AFTER UPDATE OF urun_kodu, urun_adi "
+    "ON urunler BEGIN DELETE FROM urun_arama_fts WHERE rowid = old.id; "
+    "INSERT INTO urun_arama_fts(rowid, anahtar) VALUES "
+    f"(new.id, {_SQLITE_YENI_ANAHTAR}); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_sil AFTER DELETE ON urunler BEGIN "
+    "DELETE FROM urun_arama_fts WHERE rowid = old.id; END",
+)
+
+
+def upgrade() -> None:
+    """Arama indekslerini oluştur"""
+    if op.get_bind().dialect.name == 'postgresql':
+        uzanti, fonksiyon, indeks = POSTGRESQL_ARAMA_DDL
+        op.execute(uzanti)
+        op.execute(fonksiyon)
+        with op.get_context().autocommit_block():
+            op.execute(indeks.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1))
+    else:
+        for ddl in SQLITE_ARAMA_DDL:
+            op.execute(ddl)
+        op.execute(
+            "INSERT INTO urun_arama_fts(rowid, anahtar) "
+            f"SELECT id, {_sqlite_arama_anahtari(_ARAMA_METNI)} FROM urunler"
+        )
+
+
+def downgrade() -> None:
+    """Arama indekslerini kaldır"""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_urun_arama_trgm')
+        op.execute('DROP FUNCTION IF EXISTS urun_arama_anahtari(text)')
+    else:
+        for tetikleyici in ('trg_urun_arama_ekle', 'trg_urun_arama_guncelle', 'trg_urun_arama_sil'):
+            op.execute(f'DROP TRIGGER IF EXISTS {tetikleyici}')
+        op.execute('DROP TABLE IF EXISTS urun_arama_fts')
@@ -0,0 +1,56 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.stok_bakiye_anlik_goruntu
+# Description: Dönem sonu stok görüntüleri tablosu
+# Changelog:
+# - İlk versiyon: stok_bakiye_anlik_goruntu tablosu eklendi
+
+"""Dönem sonu stok görüntüleri tablosu
+
+Günlük/aylık kapanışta stok durumu bir önceki görüntü + aradaki hareketler
+ile artımlı olarak yazılır. Geçmiş tarihli stok sorguları görüntü + delta
+okur; stok_hareketleri geçmişinin tamamı taranmaz.
+
+Revision ID: 010_stok_bakiye_anlik_goruntu
+Revises: 009_urun_arama_indeksi
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_stok_bakiye_anlik_goruntu'
+down_revision = '009_urun_arama_indeksi'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """stok_bakiye_anlik_goruntu tablosunu oluştur"""
+    op.create_table(
+        'stok_bakiye_anlik_goruntu',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('donem_tipi', sa.String(length=10), nullable=False),
+        sa.Column('donem_sonu', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('urun_id', sa.Integer(), nullable=False),
+        sa.Column('magaza_id', sa.Integer(), nullable=False),
+        sa.Column('depo_id', sa.Integer(), nullable=True),
+        sa.Column('miktar', sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['urun_id'], ['urunler.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['magaza_id'], ['magazalar.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['depo_id'], ['depolar.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_stok_anlik_goruntu_donem', 'stok_bakiye_anlik_goruntu',
+        ['donem_sonu', 'magaza_id', 'urun_id']
+    )
+
+
+def downgrade() -> None:
+    """stok_bakiye_anlik_goruntu tablosunu kaldır"""
+    op.drop_index('ix_stok_anlik_goruntu_donem', table_name='stok_bakiye_anlik_goruntu')
+    op.drop_table('stok_bakiye_anlik_goruntu')
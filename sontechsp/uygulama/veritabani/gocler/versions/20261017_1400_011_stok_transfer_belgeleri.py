@@ -0,0 +1,76 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.stok_transfer_belgeleri
+# Description: Çok satırlı stok transfer belgeleri tabloları
+# Changelog:
+# - İlk versiyon: stok_transferleri ve stok_transfer_satirlari tabloları eklendi
+
+"""Çok satırlı stok transfer belgeleri tabloları
+
+Mağazalar/depolar arası transferler belge olarak tutulur. Belgenin tüm
+satırları tek transaction'da sevk edilir (kaynaktan çıkış) ve kabul edilir
+(hedefe giriş); arada belge YOLDA durumundadır.
+
+Revision ID: 011_stok_transfer_belgeleri
+Revises: 010_stok_bakiye_anlik_goruntu
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_stok_transfer_belgeleri'
+down_revision = '010_stok_bakiye_anlik_goruntu'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """stok_transferleri ve stok_transfer_satirlari tablolarını oluştur"""
+    op.create_table(
+        'stok_transferleri',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transfer_no', sa.String(length=60), nullable=False),
+        sa.Column('kaynak_magaza_id', sa.Integer(), nullable=False),
+        sa.Column('kaynak_depo_id', sa.Integer(), nullable=True),
+        sa.Column('hedef_magaza_id', sa.Integer(), nullable=False),
+        sa.Column('hedef_depo_id', sa.Integer(), nullable=True),
+        sa.Column('kullanici_id', sa.Integer(), nullable=True),
+        sa.Column('aciklama', sa.Text(), nullable=True),
+        sa.Column('durum', sa.String(length=20), nullable=False),
+        sa.Column('sevk_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('kabul_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('iptal_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['kaynak_magaza_id'], ['magazalar.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['kaynak_depo_id'], ['depolar.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['hedef_magaza_id'], ['magazalar.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['hedef_depo_id'], ['depolar.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['kullanici_id'], ['kullanicilar.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('transfer_no')
+    )
+    op.create_index('ix_stok_transfer_hedef_durum', 'stok_transferleri', ['hedef_magaza_id', 'durum'])
+
+    op.create_table(
+        'stok_transfer_satirlari',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transfer_id', sa.Integer(), nullable=False),
+        sa.Column('urun_id', sa.Integer(), nullable=False),
+        sa.Column('miktar', sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['transfer_id'], ['stok_transferleri.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['urun_id'], ['urunler.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('transfer_id', 'urun_id', name='uk_stok_transfer_satiri')
+    )
+
+
+def downgrade() -> None:
+    """stok_transferleri ve stok_transfer_satirlari tablolarını kaldır"""
+    op.drop_table('stok_transfer_satirlari')
+    op.drop_index('ix_stok_transfer_hedef_durum', table_name='stok_transferleri')
+    op.drop_table('stok_transferleri')
@@ -0,0 +1,102 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.urun_arama_anahtari
+# Description: Ürün arama anahtarının saklanan kolona taşınması
+# Changelog:
+# - İlk versiyon: urunler.arama_anahtari kolonu ve indeksleri eklendi
+
+"""Ürün arama anahtarının saklanan kolona taşınması
+
+Katlanmış "urun_kodu urun_adi" anahtarı artık uygulama tarafından
+(arama_anahtari_katla) hesaplanıp urunler.arama_anahtari kolonunda
+saklanır; arama terimi de aynı fonksiyondan geçer. Böylece SQLite'ın
+yalnızca ASCII çalışan lower() fonksiyonu ile Python'un Unicode lower()
+arasındaki fark ortadan kalkar. Mevcut satırlar parti parti doldurulur,
+trigram indeksi kolona CONCURRENTLY taşınır ve SQL katlama fonksiyonu
+kaldırılır. SQLite'ta FTS5 aynası kolondan yeniden oluşturulur.
+
+Revision ID: 012_urun_arama_anahtari
+Revises: 011_stok_transfer_belgeleri
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from sontechsp.uygulama.veritabani.modeller.stok import (
+    POSTGRESQL_ARAMA_DDL, SQLITE_ARAMA_DDL, urun_arama_anahtari
+)
+
+# revision identifiers, used by Alembic.
+revision = '012_urun_arama_anahtari'
+down_revision = '011_stok_transfer_belgeleri'
+branch_labels = None
+depends_on = None
+
+_PARTI_BOYUTU = 5000
+_ESKI_TETIKLEYICILER = ('trg_urun_arama_ekle', 'trg_urun_arama_guncelle', 'trg_urun_arama_sil')
+
+
+def _anahtarlari_doldur() -> None:
+    """Mevcut ürünlerin arama anahtarını parti parti hesaplar"""
+    baglanti = op.get_bind()
+    urunler = sa.table('urunler', sa.column('id'), sa.column('urun_kodu'),
+                       sa.column('urun_adi'), sa.column('arama_anahtari'))
+    guncelle = urunler.update().where(urunler.c.id == sa.bindparam('_id')).values(
+        arama_anahtari=sa.bindparam('_anahtar')
+    )
+
+    son_id = 0
+    while True:
+        satirlar = baglanti.execute(
+            sa.select(urunler.c.id, urunler.c.urun_kodu, urunler.c.urun_adi)
+            .where(urunler.c.id > son_id)
+            .order_by(urunler.c.id)
+            .limit(_PARTI_BOYUTU)
+        ).all()
+        if not satirlar:
+            break
+        baglanti.execute(guncelle, [
+            {'_id': satir.id, '_anahtar': urun_arama_anahtari(satir.urun_kodu, satir.urun_adi)}
+            for satir in satirlar
+        ])
+        son_id = satirlar[-1].id
+
+
+def upgrade() -> None:
+    """arama_anahtari kolonunu ekle, doldur ve indeksleri kolona taşı"""
+    op.add_column('urunler', sa.Column(
+        'arama_anahtari', sa.String(length=400), nullable=True,
+        comment="Katlanmış 'urun_kodu urun_adi' (uygulama tarafından hesaplanır)"
+    ))
+    _anahtarlari_doldur()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        uzanti, indeks = POSTGRESQL_ARAMA_DDL
+        op.execute(uzanti)
+        with op.get_context().autocommit_block():
+            op.execute(indeks.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1))
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_urun_arama_trgm')
+        op.execute('DROP FUNCTION IF EXISTS urun_arama_anahtari(text)')
+    else:
+        for tetikleyici in _ESKI_TETIKLEYICILER:
+            op.execute(f'DROP TRIGGER IF EXISTS {tetikleyici}')
+        op.execute('DROP TABLE IF EXISTS urun_arama_fts')
+        for ddl in SQLITE_ARAMA_DDL:
+            op.execute(ddl)
+        op.execute(
+            "INSERT INTO urun_arama_fts(rowid, anahtar) "
+            "SELECT id, arama_anahtari FROM urunler"
+        )
+
+
+def downgrade() -> None:
+    """arama_anahtari kolonunu ve indekslerini kaldır (009 indeksleri yeniden kurulmaz)"""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_urun_arama_anahtari_trgm')
+    else:
+        for tetikleyici in _ESKI_TETIKLEYICILER:
+            op.execute(f'DROP TRIGGER IF EXISTS {tetikleyici}')
+        op.execute('DROP TABLE IF EXISTS urun_arama_fts')
+    op.drop_column('urunler', 'arama_anahtari')
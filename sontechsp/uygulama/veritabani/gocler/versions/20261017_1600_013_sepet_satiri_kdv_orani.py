@@ -0,0 +1,54 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.sepet_satiri_kdv_orani
+# Description: POS sepet satırına KDV oranı kolonu
+# Changelog:
+# - İlk versiyon: pos_sepet_satiri.kdv_orani eklendi
+
+"""POS sepet satırına KDV oranı kolonu
+
+Sepet toplamları KDV oranı başına artımlı tutulur; veritabanından
+yeniden yüklenen sepetin dökümü kaybolmasın diye oran satırda saklanır.
+Boş oran uygulamada varsayılan orana (VARSAYILAN_KDV_ORANI) sayılır.
+
+pos_sepet tabloları metadata ile oluşturulduğundan (alembic zincirinde
+değil) tablo yoksa bu adım atlanır.
+
+Revision ID: 013_sepet_satiri_kdv_orani
+Revises: 012_urun_arama_anahtari
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013_sepet_satiri_kdv_orani'
+down_revision = '012_urun_arama_anahtari'
+branch_labels = None
+depends_on = None
+
+
+def _kolon_var_mi() -> bool:
+    """pos_sepet_satiri tablosu ve kdv_orani kolonu var mı"""
+    denetleyici = sa.inspect(op.get_bind())
+    if not denetleyici.has_table('pos_sepet_satiri'):
+        return False
+    return any(kolon['name'] == 'kdv_orani' for kolon in denetleyici.get_columns('pos_sepet_satiri'))
+
+
+def upgrade() -> None:
+    """kdv_orani kolonunu ekle"""
+    if not sa.inspect(op.get_bind()).has_table('pos_sepet_satiri') or _kolon_var_mi():
+        return
+    op.add_column('pos_sepet_satiri', sa.Column(
+        'kdv_orani', sa.Numeric(5, 2), nullable=True,
+        comment='Ürün KDV oranı (yüzde, snapshot)'
+    ))
+
+
+def downgrade() -> None:
+    """kdv_orani kolonunu kaldır"""
+    if not _kolon_var_mi():
+        return
+    op.drop_column('pos_sepet_satiri', 'kdv_orani')
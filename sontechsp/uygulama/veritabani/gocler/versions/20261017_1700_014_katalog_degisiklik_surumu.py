@@ -0,0 +1,134 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.katalog_degisiklik_surumu
+# Description: Katalog replikasyonu için değişiklik sürümü ve silme kayıtları
+# Changelog:
+# - İlk versiyon: degisiklik_surumu kolonları, katalog_silinenler ve tetikleyiciler eklendi
+
+"""Katalog replikasyonu için değişiklik sürümü ve silme kayıtları
+
+Terminaller ürün, barkod ve mağaza stok satırlarını yerel SQLite
+replikasına delta olarak çeker. urunler, urun_barkodlari ve
+stok_bakiyeleri tablolarına degisiklik_surumu kolonu eklenir; PostgreSQL'de
+her ekleme/güncelleme katalog_degisiklik_seq sırasından yeni sürüm alır,
+silmeler aynı sıradan sürümle katalog_silinenler tablosuna yazılır. Mevcut
+satırlar parti parti sürümlenir.
+
+SQLite'ta (terminal veritabanı) yalnızca kolonlar ve tablo eklenir;
+değerler merkezden kopyalanır.
+
+Revision ID: 014_katalog_degisiklik_surumu
+Revises: 013_sepet_satiri_kdv_orani
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014_katalog_degisiklik_surumu'
+down_revision = '013_sepet_satiri_kdv_orani'
+branch_labels = None
+depends_on = None
+
+_TABLOLAR = ('urunler', 'urun_barkodlari', 'stok_bakiyeleri')
+_PARTI_BOYUTU = 5000
+
+_POSTGRESQL_ORTAK_DDL = (
+    "CREATE SEQUENCE IF NOT EXISTS katalog_degisiklik_seq",
+    "CREATE OR REPLACE FUNCTION katalog_surum_ata() RETURNS trigger AS $$ "
+    "BEGIN NEW.degisiklik_surumu := nextval('katalog_degisiklik_seq'); RETURN NEW; END "
+    "$$ LANGUAGE plpgsql",
+    "CREATE OR REPLACE FUNCTION katalog_silineni_kaydet() RETURNS trigger AS $$ "
+    "BEGIN INSERT INTO katalog_silinenler (tablo_adi, kayit_id, degisiklik_surumu) "
+    "VALUES (TG_TABLE_NAME, OLD.id, nextval('katalog_degisiklik_seq')); RETURN OLD; END "
+    "$$ LANGUAGE plpgsql",
+)
+
+
+def _tetikleyicileri_kur(tablo: str) -> None:
+    """Tablonun sürüm ve silme tetikleyicilerini kurar"""
+    op.execute(
+        f"CREATE TRIGGER trg_{tablo}_surum BEFORE INSERT OR UPDATE ON {tablo} "
+        "FOR EACH ROW EXECUTE FUNCTION katalog_surum_ata()"
+    )
+    op.execute(
+        f"CREATE TRIGGER trg_{tablo}_silindi AFTER DELETE ON {tablo} "
+        "FOR EACH ROW EXECUTE FUNCTION katalog_silineni_kaydet()"
+    )
+
+
+def _surumleri_doldur(tablo: str) -> None:
+    """Mevcut satırları parti parti sürümler (tetikleyici sürüm atar)"""
+    baglanti = op.get_bind()
+    tablo_ifadesi = sa.table(tablo, sa.column('id'), sa.column('degisiklik_surumu'))
+
+    son_id = 0
+    while True:
+        idler = baglanti.execute(
+            sa.select(tablo_ifadesi.c.id)
+            .where(tablo_ifadesi.c.id > son_id)
+            .order_by(tablo_ifadesi.c.id)
+            .limit(_PARTI_BOYUTU)
+        ).scalars().all()
+        if not idler:
+            break
+        baglanti.execute(
+            tablo_ifadesi.update()
+            .where(tablo_ifadesi.c.id.in_(idler))
+            .values(degisiklik_surumu=sa.func.nextval('katalog_degisiklik_seq'))
+        )
+        son_id = idler[-1]
+
+
+def upgrade() -> None:
+    """degisiklik_surumu kolonlarını, katalog_silinenler'i ve tetikleyicileri ekle"""
+    for tablo in _TABLOLAR:
+        op.add_column(tablo, sa.Column(
+            'degisiklik_surumu', sa.BigInteger(), nullable=True,
+            comment='Katalog değişiklik sürümü (tetikleyici doldurur)'
+        ))
+        op.create_index(f'ix_{tablo}_degisiklik_surumu', tablo, ['degisiklik_surumu'])
+
+    op.create_table(
+        'katalog_silinenler',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tablo_adi', sa.String(length=50), nullable=False,
+                  comment='Silinen satırın tablosu'),
+        sa.Column('kayit_id', sa.Integer(), nullable=False,
+                  comment="Silinen satırın ID'si"),
+        sa.Column('degisiklik_surumu', sa.BigInteger(), nullable=False,
+                  comment='Silme anındaki katalog değişiklik sürümü'),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_katalog_silinenler_degisiklik_surumu', 'katalog_silinenler',
+                    ['degisiklik_surumu'])
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for ddl in _POSTGRESQL_ORTAK_DDL:
+        op.execute(ddl)
+    for tablo in _TABLOLAR:
+        _tetikleyicileri_kur(tablo)
+        _surumleri_doldur(tablo)
+
+
+def downgrade() -> None:
+    """Tetikleyicileri, katalog_silinenler'i ve degisiklik_surumu kolonlarını kaldır"""
+    if op.get_bind().dialect.name == 'postgresql':
+        for tablo in _TABLOLAR:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{tablo}_silindi ON {tablo}")
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{tablo}_surum ON {tablo}")
+        op.execute("DROP FUNCTION IF EXISTS katalog_silineni_kaydet()")
+        op.execute("DROP FUNCTION IF EXISTS katalog_surum_ata()")
+        op.execute("DROP SEQUENCE IF EXISTS katalog_degisiklik_seq")
+
+    op.drop_index('ix_katalog_silinenler_degisiklik_surumu', table_name='katalog_silinenler')
+    op.drop_table('katalog_silinenler')
+    for tablo in _TABLOLAR:
+        op.drop_index(f'ix_{tablo}_degisiklik_surumu', table_name=tablo)
+        op.drop_column(tablo, 'degisiklik_surumu')
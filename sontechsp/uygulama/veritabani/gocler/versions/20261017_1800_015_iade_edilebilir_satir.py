@@ -0,0 +1,112 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.iade_edilebilir_satir
+# Description: Satış satırı başına iade edilebilir adet defteri
+# Changelog:
+# - İlk versiyon: pos_iade_edilebilir_satir tablosu ve mevcut satışlardan doldurma
+# - Doldurmada satır indirimi net tutardan ikinci kez düşülmüyor
+
+"""Satış satırı başına iade edilebilir adet defteri
+
+İade doğrulaması orijinal satışı ve önceki iadeleri taramak yerine
+pos_iade_edilebilir_satir tablosundan fiş no/barkod indeksiyle tek okuma
+yapar. Tablo tamamlanmış satışların sepet satırlarından doldurulur; iade
+edilen adet, satır kimliğiyle veya (kimlik yoksa) satış ve barkodla
+eşleşen mevcut iade satırlarından hesaplanır.
+
+pos_ tabloları metadata ile oluşturulduğundan (alembic zincirinde değil)
+pos_satis veya pos_sepet_satiri yoksa bu adım atlanır.
+
+Revision ID: 015_iade_edilebilir_satir
+Revises: 014_katalog_degisiklik_surumu
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015_iade_edilebilir_satir'
+down_revision = '014_katalog_degisiklik_surumu'
+branch_labels = None
+depends_on = None
+
+_TABLO = 'pos_iade_edilebilir_satir'
+
+_DOLDURMA_SQL = """
+INSERT INTO pos_iade_edilebilir_satir
+    (satis_id, sepet_satiri_id, fis_no, urun_id, barkod, urun_adi,
+     satilan_adet, iade_edilen_adet, net_tutar)
+SELECT s.id, ss.id, s.fis_no, ss.urun_id, ss.barkod, ss.urun_adi, ss.adet,
+       LEAST(ss.adet, COALESCE((
+           SELECT SUM(isat.adet)
+           FROM pos_iade_satiri isat
+           JOIN pos_iade i ON i.id = isat.iade_id
+           WHERE isat.orijinal_sepet_satiri_id = ss.id
+              OR (isat.orijinal_sepet_satiri_id IS NULL
+                  AND i.orijinal_satis_id = s.id AND isat.barkod = ss.barkod)
+       ), 0)),
+       ss.toplam_tutar
+FROM pos_satis s
+JOIN pos_sepet_satiri ss ON ss.sepet_id = s.sepet_id
+WHERE s.durum = 'TAMAMLANDI'
+"""
+
+
+def _pos_tablolari_var_mi() -> bool:
+    """Defterin kaynak tabloları var mı"""
+    denetleyici = sa.inspect(op.get_bind())
+    return all(denetleyici.has_table(tablo)
+               for tablo in ('pos_satis', 'pos_sepet_satiri', 'pos_iade', 'pos_iade_satiri'))
+
+
+def upgrade() -> None:
+    """pos_iade_edilebilir_satir tablosunu oluştur ve doldur"""
+    if not _pos_tablolari_var_mi() or sa.inspect(op.get_bind()).has_table(_TABLO):
+        return
+
+    op.create_table(
+        _TABLO,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('satis_id', sa.Integer(), nullable=False, comment='Satış kimliği'),
+        sa.Column('sepet_satiri_id', sa.Integer(), nullable=False,
+                  comment='Satılan sepet satırı kimliği'),
+        sa.Column('fis_no', sa.String(length=50), nullable=True,
+                  comment='Satış fiş numarası (snapshot)'),
+        sa.Column('urun_id', sa.Integer(), nullable=False, comment='Ürün kimliği'),
+        sa.Column('barkod', sa.String(length=20), nullable=False, comment='Ürün barkodu'),
+        sa.Column('urun_adi', sa.String(length=200), nullable=False,
+                  comment='Ürün adı (snapshot)'),
+        sa.Column('satilan_adet', sa.Integer(), nullable=False, comment='Satılan adet'),
+        sa.Column('iade_edilen_adet', sa.Integer(), nullable=False,
+                  comment='Şimdiye kadar iade edilen adet'),
+        sa.Column('net_tutar', sa.Numeric(10, 2), nullable=False,
+                  comment='Satırın indirim sonrası tutarı'),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['satis_id'], ['pos_satis.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sepet_satiri_id'], ['pos_sepet_satiri.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('sepet_satiri_id', name='uq_iade_edilebilir_satir_sepet_satiri'),
+        sa.CheckConstraint('iade_edilen_adet >= 0',
+                           name='ck_iade_edilebilir_satir_iade_adet_pozitif'),
+        sa.CheckConstraint('iade_edilen_adet <= satilan_adet',
+                           name='ck_iade_edilebilir_satir_iade_adet_siniri'),
+    )
+    op.create_index('ix_iade_edilebilir_satir_fis_barkod', _TABLO, ['fis_no', 'barkod'])
+    op.create_index('ix_iade_edilebilir_satir_satis_barkod', _TABLO, ['satis_id', 'barkod'])
+    op.create_index('ix_iade_edilebilir_satir_barkod', _TABLO, ['barkod'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(_DOLDURMA_SQL)
+
+
+def downgrade() -> None:
+    """pos_iade_edilebilir_satir tablosunu kaldır"""
+    if not sa.inspect(op.get_bind()).has_table(_TABLO):
+        return
+    op.drop_index('ix_iade_edilebilir_satir_barkod', table_name=_TABLO)
+    op.drop_index('ix_iade_edilebilir_satir_satis_barkod', table_name=_TABLO)
+    op.drop_index('ix_iade_edilebilir_satir_fis_barkod', table_name=_TABLO)
+    op.drop_table(_TABLO)
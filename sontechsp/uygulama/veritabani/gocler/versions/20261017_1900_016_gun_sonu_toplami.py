@@ -0,0 +1,77 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.gun_sonu_toplami
+# Description: Artımlı gün sonu (X/Z raporu) toplamları
+# Changelog:
+# - İlk versiyon: pos_gun_sonu_toplami tablosu
+
+"""Artımlı gün sonu (X/Z raporu) toplamları
+
+X/Z raporları satışları taramak yerine gün, terminal ve kasiyer başına
+tutulan toplamları okur. Toplamlar satış tamamlama ve iptal
+transaction'larında güncellenir; geçmiş günler uygulamadaki mutabakat
+(SatisRaporlar.gun_sonu_mutabakati(..., duzelt=True)) ile doldurulur.
+
+Revision ID: 016_gun_sonu_toplami
+Revises: 015_iade_edilebilir_satir
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016_gun_sonu_toplami'
+down_revision = '015_iade_edilebilir_satir'
+branch_labels = None
+depends_on = None
+
+_TABLO = 'pos_gun_sonu_toplami'
+
+
+def _tutar(ad: str, aciklama: str) -> sa.Column:
+    return sa.Column(ad, sa.Numeric(12, 2), nullable=False, server_default='0', comment=aciklama)
+
+
+def upgrade() -> None:
+    """pos_gun_sonu_toplami tablosunu oluştur"""
+    if sa.inspect(op.get_bind()).has_table(_TABLO):
+        return
+
+    op.create_table(
+        _TABLO,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tarih', sa.Date(), nullable=False, comment='Satış günü'),
+        sa.Column('terminal_id', sa.Integer(), nullable=False, comment='Terminal kimliği'),
+        sa.Column('kasiyer_id', sa.Integer(), nullable=False, comment='Kasiyer kimliği (vardiya)'),
+        sa.Column('boyut', sa.String(length=10), nullable=False,
+                  comment='Toplam boyutu (GENEL, ODEME, KDV)'),
+        sa.Column('anahtar', sa.String(length=20), nullable=False, server_default='',
+                  comment='Boyut anahtarı (ödeme türü veya KDV oranı)'),
+        sa.Column('islem_sayisi', sa.Integer(), nullable=False, server_default='0',
+                  comment='Satış veya ödeme sayısı'),
+        _tutar('brut_tutar', 'İndirim öncesi tutar'),
+        _tutar('indirim_tutari', 'İndirim tutarı'),
+        _tutar('net_tutar', 'Net tutar (ödeme boyutunda tahsilat)'),
+        _tutar('matrah', 'KDV matrahı'),
+        _tutar('kdv_tutari', 'KDV tutarı'),
+        sa.Column('iptal_sayisi', sa.Integer(), nullable=False, server_default='0',
+                  comment='Tamamlandıktan sonra iptal edilen satış sayısı'),
+        _tutar('iptal_tutari', 'İptal edilen satışların net tutarı'),
+        sa.Column('olusturma_tarihi', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('guncelleme_tarihi', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tarih', 'terminal_id', 'kasiyer_id', 'boyut', 'anahtar',
+                            name='uq_gun_sonu_toplami_anahtar'),
+        sa.CheckConstraint("boyut IN ('GENEL', 'ODEME', 'KDV')", name='ck_gun_sonu_toplami_boyut'),
+    )
+    op.create_index('ix_gun_sonu_toplami_tarih_terminal', _TABLO, ['tarih', 'terminal_id'])
+
+
+def downgrade() -> None:
+    """pos_gun_sonu_toplami tablosunu kaldır"""
+    if not sa.inspect(op.get_bind()).has_table(_TABLO):
+        return
+    op.drop_index('ix_gun_sonu_toplami_tarih_terminal', table_name=_TABLO)
+    op.drop_table(_TABLO)
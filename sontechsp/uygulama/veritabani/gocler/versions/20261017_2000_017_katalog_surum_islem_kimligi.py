@@ -0,0 +1,52 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: migration.katalog_surum_islem_kimligi
+# Description: Katalog sürüm tetikleyicisi sıra değerinden önce işlem kimliği alır
+# Changelog:
+# - İlk versiyon: katalog_surum_ata fonksiyonu txid_current() çağırıyor
+
+"""Katalog sürüm tetikleyicisi sıra değerinden önce işlem kimliği alır
+
+Terminal replikası geç commit edilen satırları sabit bir sürüm payı yerine
+merkezin anlık görüntüsüyle (txid_current_snapshot) izler: bir senkron
+anındaki sıra değerine kadar olan sürümler, o anda açık olan işlemlerin
+hepsi bitince kesinleşir. Bunun için sürümü alan işlemin kimliği sıra
+değerinden önce atanmış olmalıdır; BEFORE tetikleyicisi satır yazımından
+önce çalıştığından fonksiyon txid_current() ile kimliği kendisi alır.
+
+Yalnızca PostgreSQL (merkez) veritabanında uygulanır.
+
+Revision ID: 017_katalog_surum_islem_kimligi
+Revises: 016_gun_sonu_toplami
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '017_katalog_surum_islem_kimligi'
+down_revision = '016_gun_sonu_toplami'
+branch_labels = None
+depends_on = None
+
+
+def _surum_fonksiyonu(govde: str) -> str:
+    return (
+        "CREATE OR REPLACE FUNCTION katalog_surum_ata() RETURNS trigger AS $$ "
+        f"BEGIN {govde}NEW.degisiklik_surumu := nextval('katalog_degisiklik_seq'); RETURN NEW; END "
+        "$$ LANGUAGE plpgsql"
+    )
+
+
+def upgrade() -> None:
+    """katalog_surum_ata fonksiyonunu işlem kimliği alacak şekilde değiştir"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(_surum_fonksiyonu("PERFORM txid_current(); "))
+
+
+def downgrade() -> None:
+    """katalog_surum_ata fonksiyonunun önceki halini geri yükle"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(_surum_fonksiyonu(""))
@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2024-12-15
+# Last Update: 2026-10-17
 # Module: veritabani.modeller
 # Description: SONTECHSP veritabanı modelleri paketi
 # Changelog:
 # - İlk oluşturma
+# - StokRezervasyon eklendi
+# - StokSayim ve StokSayimSatiri eklendi
+# - StokBakiyeAnlikGoruntu eklendi
+# - StokTransfer ve StokTransferSatiri eklendi
 
 """
 SONTECHSP Veritabanı Modelleri
@@ -14,7 +18,9 @@ Türkçe ASCII tablo isimlendirme standardına uygun olarak organize edilmiştir
 Modül organizasyonu:
 - kullanici_yetki.py: kullanicilar, roller, yetkiler
 - firma_magaza.py: firmalar, magazalar, terminaller, depolar  
-- stok.py: urunler, urun_barkodlari, stok_bakiyeleri, stok_hareketleri
+- stok.py: urunler, urun_barkodlari, stok_bakiyeleri, stok_hareketleri, stok_rezervasyonlari,
+  stok_sayimlari, stok_sayim_satirlari, stok_bakiye_anlik_goruntu, stok_transferleri,
+  stok_transfer_satirlari
 - crm.py: musteriler, sadakat_puanlari
 - pos.py: pos_satislar, pos_satis_satirlari, odeme_kayitlari
 - belgeler.py: satis_belgeleri, satis_belge_satirlari
@@ -42,7 +48,8 @@ __all__ = [
     'Firma', 'Magaza', 'Terminal', 'Depo',
     
     # Stok modelleri
-    'Urun', 'UrunBarkod', 'StokBakiye', 'StokHareket',
+    'Urun', 'UrunBarkod', 'StokBakiye', 'StokHareket', 'StokRezervasyon',
+    'StokSayim', 'StokSayimSatiri', 'StokBakiyeAnlikGoruntu', 'StokTransfer', 'StokTransferSatiri',
     
     # CRM modelleri
     'Musteriler', 'SadakatPuanlari',
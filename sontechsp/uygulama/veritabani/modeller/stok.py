@@ -1,9 +1,18 @@
 # Version: 0.1.0
-# Last Update: 2024-12-15
+# Last Update: 2026-10-17
 # Module: veritabani.modeller.stok
 # Description: SONTECHSP stok yönetimi modelleri
 # Changelog:
 # - İlk oluşturma
+# - stok_bakiyeleri benzersizlik kısıtları modele eklendi (upsert için)
+# - stok_rezervasyonlari tablosu eklendi
+# - stok_sayimlari ve stok_sayim_satirlari tabloları eklendi
+# - Ürün arama indeksleri eklendi (pg_trgm GIN / SQLite FTS5)
+# - stok_bakiye_anlik_goruntu tablosu eklendi
+# - stok_transferleri ve stok_transfer_satirlari tabloları eklendi
+# - Ürün arama anahtarı saklanan kolona taşındı (urunler.arama_anahtari)
+# - Katalog replikasyonu için degisiklik_surumu kolonları ve katalog_silinenler tablosu eklendi
+# - Sürüm tetikleyicisi sıra değerinden önce işlem kimliği alıyor (replika anlık görüntü filigranı)
 
 """
 SONTECHSP Stok Yönetimi Modelleri
@@ -16,17 +25,57 @@ Tablolar:
 - urun_barkodlari: Ürün barkod bilgileri (bir ürünün birden fazla barkodu olabilir)
 - stok_bakiyeleri: Mağaza/depo bazında stok bakiyeleri
 - stok_hareketleri: Tüm stok giriş/çıkış hareketleri
+- stok_rezervasyonlari: Süreli stok rezervasyonları
+- stok_sayimlari: Sayım oturumları
+- stok_sayim_satirlari: Sayım başındaki bakiye görüntüsü ve sayılan miktarlar
+- urun_arama_fts: Offline (SQLite) ürün arama aynası (FTS5)
+- stok_bakiye_anlik_goruntu: Dönem sonu (günlük/aylık) stok görüntüleri
+- stok_transferleri: Çok satırlı transfer belgeleri (yolda / tamamlandı)
+- stok_transfer_satirlari: Transfer belgesi ürün satırları
+- katalog_silinenler: Terminal replikalarına silme bildirimi (tombstone)
+
+urunler, urun_barkodlari ve stok_bakiyeleri satırları her yazımda ortak bir
+sıradan degisiklik_surumu alır (PostgreSQL tetikleyicisi); terminaller
+yalnızca son gördükleri sürümden büyük satırları çeker.
 """
 
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
-from sqlalchemy import Boolean, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    DDL, BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint,
+    event, text
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..taban import Taban
 
 
+# Ürün arama anahtarı: Türkçe büyük/küçük harf ve aksan katlaması.
+# "İ" / "I" / "ı" -> "i", "Ş" -> "s" ... ardından Unicode lower(). Anahtar
+# yazımda Python'da hesaplanıp urunler.arama_anahtari kolonunda saklanır;
+# arama terimi de aynı fonksiyondan geçer. Veritabanının lower()
+# davranışına (SQLite'ta yalnızca ASCII) güvenilmez.
+URUN_ARAMA_KATLAMA = ('İIıŞşĞğÜüÖöÇç', 'iiissgguuoocc')
+_KATLAMA_TABLOSU = str.maketrans(*URUN_ARAMA_KATLAMA)
+
+
+def arama_anahtari_katla(metin: str) -> str:
+    """Metni arama anahtarına katlar ("İSTANBUL Işık" -> "istanbul isik")"""
+    return metin.translate(_KATLAMA_TABLOSU).lower()
+
+
+def urun_arama_anahtari(urun_kodu: Optional[str], urun_adi: Optional[str]) -> str:
+    """Ürünün saklanan arama anahtarı (kod ve ad tek anahtarda)"""
+    return arama_anahtari_katla(f"{urun_kodu or ''} {urun_adi or ''}".strip())
+
+
+def _arama_anahtari_varsayilani(context) -> str:
+    """Core INSERT'lerde arama_anahtari kolonunu doldurur"""
+    parametreler = context.get_current_parameters()
+    return urun_arama_anahtari(parametreler.get('urun_kodu'), parametreler.get('urun_adi'))
+
+
 class Urun(Taban):
     """
     Ürün ana bilgileri tablosu
@@ -131,6 +180,20 @@ class Urun(Taban):
         comment="Ürün aktif mi"
     )
     
+    # Arama
+    arama_anahtari: Mapped[Optional[str]] = mapped_column(
+        String(400),
+        default=_arama_anahtari_varsayilani,
+        comment="Katlanmış 'urun_kodu urun_adi' (uygulama tarafından hesaplanır)"
+    )
+    
+    # Replikasyon
+    degisiklik_surumu: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        index=True,
+        comment="Katalog değişiklik sürümü (tetikleyici doldurur)"
+    )
+    
     # İlişkiler
     barkodlar: Mapped[List["UrunBarkod"]] = relationship(
         "UrunBarkod", 
@@ -154,6 +217,37 @@ class Urun(Taban):
         return f"<Urun(urun_kodu='{self.urun_kodu}', urun_adi='{self.urun_adi}')>"
 
 
+POSTGRESQL_ARAMA_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_urun_arama_anahtari_trgm ON urunler "
+    "USING gin (arama_anahtari gin_trgm_ops)",
+)
+
+SQLITE_ARAMA_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS urun_arama_fts "
+    "USING fts5(anahtar, tokenize='unicode61', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_ekle AFTER INSERT ON urunler BEGIN "
+    "INSERT INTO urun_arama_fts(rowid, anahtar) VALUES (new.id, new.arama_anahtari); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_guncelle AFTER UPDATE OF arama_anahtari "
+    "ON urunler BEGIN DELETE FROM urun_arama_fts WHERE rowid = old.id; "
+    "INSERT INTO urun_arama_fts(rowid, anahtar) VALUES (new.id, new.arama_anahtari); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_urun_arama_sil AFTER DELETE ON urunler BEGIN "
+    "DELETE FROM urun_arama_fts WHERE rowid = old.id; END",
+)
+
+for _ddl in POSTGRESQL_ARAMA_DDL:
+    event.listen(Urun.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+for _ddl in SQLITE_ARAMA_DDL:
+    event.listen(Urun.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+
+@event.listens_for(Urun, "before_insert")
+@event.listens_for(Urun, "before_update")
+def _arama_anahtarini_guncelle(mapper, connection, hedef: Urun) -> None:
+    """ORM yazımlarında arama anahtarını kod/ad ile eşitler"""
+    hedef.arama_anahtari = urun_arama_anahtari(hedef.urun_kodu, hedef.urun_adi)
+
+
 class UrunBarkod(Taban):
     """
     Ürün barkod bilgileri tablosu
@@ -215,6 +309,13 @@ class UrunBarkod(Taban):
         comment="Ana barkod mu"
     )
     
+    # Replikasyon
+    degisiklik_surumu: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        index=True,
+        comment="Katalog değişiklik sürümü (tetikleyici doldurur)"
+    )
+    
     # İlişkiler
     urun: Mapped["Urun"] = relationship(
         "Urun", 
@@ -292,16 +393,103 @@ class StokBakiye(Taban):
         comment="Son stok hareket tarihi"
     )
     
+    # Replikasyon
+    degisiklik_surumu: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        index=True,
+        comment="Katalog değişiklik sürümü (tetikleyici doldurur)"
+    )
+    
     # İlişkiler
     urun: Mapped["Urun"] = relationship(
         "Urun", 
         back_populates="stok_bakiyeleri"
     )
     
+    # Kısıtlamalar: depo_id NULL iken UNIQUE çakışma üretmediği için
+    # depo'suz bakiyeler ayrı kısmi indeks ile tekilleştirilir
+    __table_args__ = (
+        UniqueConstraint('urun_id', 'magaza_id', 'depo_id', name='uk_stok_bakiye'),
+        Index(
+            'uk_stok_bakiye_depo_yok', 'urun_id', 'magaza_id',
+            unique=True,
+            postgresql_where=text('depo_id IS NULL'),
+            sqlite_where=text('depo_id IS NULL')
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<StokBakiye(urun_id={self.urun_id}, magaza_id={self.magaza_id}, miktar={self.miktar})>"
 
 
+class KatalogSilinen(Taban):
+    """
+    Katalog silme bildirimi tablosu
+    
+    urunler, urun_barkodlari ve stok_bakiyeleri satırı silindiğinde
+    tetikleyici buraya bir kayıt yazar; terminal replikaları silinen
+    satırı bu kayıtlardan öğrenir.
+    """
+    
+    __tablename__ = "katalog_silinenler"
+    
+    tablo_adi: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Silinen satırın tablosu"
+    )
+    
+    kayit_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Silinen satırın ID'si"
+    )
+    
+    degisiklik_surumu: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        index=True,
+        comment="Silme anındaki katalog değişiklik sürümü"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<KatalogSilinen(tablo_adi='{self.tablo_adi}', kayit_id={self.kayit_id})>"
+
+
+# Katalog değişiklik sürümü: tek sıra, satır her eklendiğinde/güncellendiğinde
+# yeni değer alır; silmeler katalog_silinenler'e aynı sıradan sürümle yazılır.
+# Tetikleyiciler yalnızca merkez (PostgreSQL) veritabanında kurulur; terminal
+# SQLite'ında kolon merkezden kopyalanan değeri taşır. Sürüm tetikleyicisi
+# sıra değerinden önce txid_current() ile işlem kimliği alır: sürümü alan
+# her işlem, o andan sonra alınan anlık görüntüde görünür (replikanın
+# kesin filigranı buna dayanır).
+KATALOG_REPLIKA_TABLOLARI = ('urunler', 'urun_barkodlari', 'stok_bakiyeleri')
+
+POSTGRESQL_KATALOG_SURUM_DDL = (
+    "CREATE SEQUENCE IF NOT EXISTS katalog_degisiklik_seq",
+    "CREATE OR REPLACE FUNCTION katalog_surum_ata() RETURNS trigger AS $$ "
+    "BEGIN PERFORM txid_current(); "
+    "NEW.degisiklik_surumu := nextval('katalog_degisiklik_seq'); RETURN NEW; END "
+    "$$ LANGUAGE plpgsql",
+    "CREATE OR REPLACE FUNCTION katalog_silineni_kaydet() RETURNS trigger AS $$ "
+    "BEGIN INSERT INTO katalog_silinenler (tablo_adi, kayit_id, degisiklik_surumu) "
+    "VALUES (TG_TABLE_NAME, OLD.id, nextval('katalog_degisiklik_seq')); RETURN OLD; END "
+    "$$ LANGUAGE plpgsql",
+)
+
+
+def katalog_tetikleyici_ddl(tablo: str) -> tuple:
+    """Tablonun sürüm ve silme tetikleyicilerini kuran PostgreSQL DDL'i"""
+    return (
+        f"DROP TRIGGER IF EXISTS trg_{tablo}_surum ON {tablo}",
+        f"CREATE TRIGGER trg_{tablo}_surum BEFORE INSERT OR UPDATE ON {tablo} "
+        "FOR EACH ROW EXECUTE FUNCTION katalog_surum_ata()",
+        f"DROP TRIGGER IF EXISTS trg_{tablo}_silindi ON {tablo}",
+        f"CREATE TRIGGER trg_{tablo}_silindi AFTER DELETE ON {tablo} "
+        "FOR EACH ROW EXECUTE FUNCTION katalog_silineni_kaydet()",
+    )
+
+
 class StokHareket(Taban):
     """
     Stok hareket tablosu
@@ -382,4 +570,390 @@ class StokHareket(Taban):
     )
     
     def __repr__(self) -> str:
-        return f"<StokHareket(urun_id={self.urun_id}, hareket_tipi='{self.hareket_tipi}', miktar={self.miktar})>"
\ No newline at end of file
+        return f"<StokHareket(urun_id={self.urun_id}, hareket_tipi='{self.hareket_tipi}', miktar={self.miktar})>"
+
+
+class StokRezervasyon(Taban):
+    """
+    Stok rezervasyon tablosu
+    
+    Süreli rezervasyonları terminaller arası ortak ve yeniden başlatmaya
+    dayanıklı tutar. Rezerve miktar stok_bakiyeleri.rezerve_miktar ile
+    birlikte güncellenir.
+    """
+    
+    __tablename__ = "stok_rezervasyonlari"
+    
+    rezervasyon_no: Mapped[str] = mapped_column(
+        String(50),
+        unique=True,
+        nullable=False,
+        comment="Benzersiz rezervasyon numarası"
+    )
+    
+    # Foreign key'ler
+    urun_id: Mapped[int] = mapped_column(
+        ForeignKey("urunler.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Ürün ID referansı"
+    )
+    
+    magaza_id: Mapped[int] = mapped_column(
+        ForeignKey("magazalar.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Mağaza ID referansı"
+    )
+    
+    depo_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("depolar.id", ondelete="SET NULL"),
+        comment="Depo ID referansı (opsiyonel)"
+    )
+    
+    # Rezervasyon bilgileri
+    miktar: Mapped[Decimal] = mapped_column(
+        Numeric(15, 4),
+        nullable=False,
+        comment="Rezerve edilen (kalan) miktar"
+    )
+    
+    durum: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="AKTIF",
+        comment="Durum (AKTIF, KULLANILDI, IPTAL_EDILDI, SURESI_DOLDU)"
+    )
+    
+    gecerlilik_tarihi: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Rezervasyonun düşeceği zaman (UTC)"
+    )
+    
+    # Referans bilgileri
+    referans_tablo: Mapped[Optional[str]] = mapped_column(
+        String(50),
+        comment="Referans tablo adı"
+    )
+    
+    referans_id: Mapped[Optional[int]] = mapped_column(
+        comment="Referans kayıt ID"
+    )
+    
+    aciklama: Mapped[Optional[str]] = mapped_column(
+        Text,
+        comment="Rezervasyon açıklaması"
+    )
+    
+    # İndeksler: yalnızca aktif rezervasyonlar sorgulandığı için kısmi
+    __table_args__ = (
+        Index(
+            'ix_stok_rezervasyon_urun_magaza', 'urun_id', 'magaza_id',
+            postgresql_where=text("durum = 'AKTIF'"),
+            sqlite_where=text("durum = 'AKTIF'")
+        ),
+        Index(
+            'ix_stok_rezervasyon_gecerlilik', 'gecerlilik_tarihi',
+            postgresql_where=text("durum = 'AKTIF'"),
+            sqlite_where=text("durum = 'AKTIF'")
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokRezervasyon(rezervasyon_no='{self.rezervasyon_no}', durum='{self.durum}', miktar={self.miktar})>"
+
+
+class StokSayim(Taban):
+    """
+    Stok sayım oturumu tablosu
+    
+    Sayım oturumu kalıcıdır; el terminali verileri parça parça yüklenebilir
+    ve farkların uygulanması yarıda kalırsa kaldığı yerden devam eder.
+    """
+    
+    __tablename__ = "stok_sayimlari"
+    
+    sayim_no: Mapped[str] = mapped_column(
+        String(60),
+        unique=True,
+        nullable=False,
+        comment="Benzersiz sayım numarası"
+    )
+    
+    magaza_id: Mapped[int] = mapped_column(
+        ForeignKey("magazalar.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Mağaza ID referansı"
+    )
+    
+    depo_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("depolar.id", ondelete="SET NULL"),
+        comment="Depo ID referansı (opsiyonel)"
+    )
+    
+    kullanici_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("kullanicilar.id", ondelete="SET NULL"),
+        comment="Sayımı başlatan kullanıcı"
+    )
+    
+    aciklama: Mapped[Optional[str]] = mapped_column(
+        Text,
+        comment="Sayım açıklaması"
+    )
+    
+    durum: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="BASLADI",
+        comment="Durum (BASLADI, DEVAM_EDIYOR, UYGULANIYOR, TAMAMLANDI, IPTAL_EDILDI)"
+    )
+    
+    uygulanan_kalem: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Farkı bakiyeye uygulanmış kalem sayısı"
+    )
+    
+    tamamlanma_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="Sayımın tamamlanma zamanı"
+    )
+    
+    iptal_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="Sayımın iptal zamanı"
+    )
+    
+    __table_args__ = (
+        Index('ix_stok_sayim_magaza_durum', 'magaza_id', 'durum'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokSayim(sayim_no='{self.sayim_no}', durum='{self.durum}')>"
+
+
+class StokSayimSatiri(Taban):
+    """
+    Stok sayım satırı tablosu
+    
+    sistem_miktar sayım başındaki stok_bakiyeleri görüntüsüdür; sayılan
+    miktar el terminali verisiyle doldurulur. Farklar bu tablo üzerinden
+    küme tabanlı hesaplanır.
+    """
+    
+    __tablename__ = "stok_sayim_satirlari"
+    
+    sayim_id: Mapped[int] = mapped_column(
+        ForeignKey("stok_sayimlari.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Sayım ID referansı"
+    )
+    
+    urun_id: Mapped[int] = mapped_column(
+        ForeignKey("urunler.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Ürün ID referansı"
+    )
+    
+    sistem_miktar: Mapped[Decimal] = mapped_column(
+        Numeric(15, 4),
+        nullable=False,
+        default=Decimal('0.0000'),
+        comment="Sayım başındaki sistem miktarı"
+    )
+    
+    sayilan_miktar: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(15, 4),
+        comment="Sayılan miktar (sayılmadıysa boş)"
+    )
+    
+    uygulandi: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        comment="Fark bakiyeye uygulandı mı"
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('sayim_id', 'urun_id', name='uk_stok_sayim_satiri'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokSayimSatiri(sayim_id={self.sayim_id}, urun_id={self.urun_id})>"
+
+
+class StokBakiyeAnlikGoruntu(Taban):
+    """
+    Dönem sonu stok görüntüsü tablosu
+    
+    Her satır, donem_sonu anından önceki tüm stok hareketlerinin
+    (urun_id, magaza_id, depo_id) bazında toplamıdır. Görüntüler bir önceki
+    görüntü + aradaki hareketler ile artımlı üretilir; geçmiş tarihli stok
+    sorguları tüm hareket geçmişi yerine görüntü + delta okur.
+    """
+    
+    __tablename__ = "stok_bakiye_anlik_goruntu"
+    
+    donem_tipi: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        comment="Dönem tipi (GUNLUK, AYLIK)"
+    )
+    
+    donem_sonu: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Görüntü anı (bu andan önceki hareketler dahil)"
+    )
+    
+    urun_id: Mapped[int] = mapped_column(
+        ForeignKey("urunler.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Ürün ID referansı"
+    )
+    
+    magaza_id: Mapped[int] = mapped_column(
+        ForeignKey("magazalar.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Mağaza ID referansı"
+    )
+    
+    depo_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("depolar.id", ondelete="SET NULL"),
+        comment="Depo ID referansı"
+    )
+    
+    miktar: Mapped[Decimal] = mapped_column(
+        Numeric(15, 4),
+        nullable=False,
+        default=Decimal('0.0000'),
+        comment="Görüntü anındaki stok miktarı"
+    )
+    
+    __table_args__ = (
+        Index('ix_stok_anlik_goruntu_donem', 'donem_sonu', 'magaza_id', 'urun_id'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokBakiyeAnlikGoruntu(donem_sonu={self.donem_sonu}, urun_id={self.urun_id}, miktar={self.miktar})>"
+
+
+class StokTransfer(Taban):
+    """
+    Stok transfer belgesi tablosu
+    
+    Bir belge kaynak lokasyondan hedef lokasyona çok sayıda ürün satırı
+    taşır. Sevk edilen ama henüz kabul edilmeyen belge YOLDA durumundadır;
+    miktar kaynaktan düşülmüş, hedefe henüz eklenmemiştir.
+    """
+    
+    __tablename__ = "stok_transferleri"
+    
+    transfer_no: Mapped[str] = mapped_column(
+        String(60),
+        unique=True,
+        nullable=False,
+        comment="Benzersiz transfer numarası"
+    )
+    
+    kaynak_magaza_id: Mapped[int] = mapped_column(
+        ForeignKey("magazalar.id", ondelete="RESTRICT"),
+        nullable=False,
+        comment="Kaynak mağaza ID referansı"
+    )
+    
+    kaynak_depo_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("depolar.id", ondelete="SET NULL"),
+        comment="Kaynak depo ID referansı (opsiyonel)"
+    )
+    
+    hedef_magaza_id: Mapped[int] = mapped_column(
+        ForeignKey("magazalar.id", ondelete="RESTRICT"),
+        nullable=False,
+        comment="Hedef mağaza ID referansı"
+    )
+    
+    hedef_depo_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("depolar.id", ondelete="SET NULL"),
+        comment="Hedef depo ID referansı (opsiyonel)"
+    )
+    
+    kullanici_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("kullanicilar.id", ondelete="SET NULL"),
+        comment="Transferi başlatan kullanıcı"
+    )
+    
+    aciklama: Mapped[Optional[str]] = mapped_column(
+        Text,
+        comment="Transfer açıklaması"
+    )
+    
+    durum: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="YOLDA",
+        comment="Durum (YOLDA, TAMAMLANDI, IPTAL_EDILDI)"
+    )
+    
+    sevk_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="Kaynaktan çıkış zamanı"
+    )
+    
+    kabul_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="Hedefe giriş zamanı"
+    )
+    
+    iptal_tarihi: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="İptal zamanı"
+    )
+    
+    __table_args__ = (
+        Index('ix_stok_transfer_hedef_durum', 'hedef_magaza_id', 'durum'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokTransfer(transfer_no='{self.transfer_no}', durum='{self.durum}')>"
+
+
+class StokTransferSatiri(Taban):
+    """
+    Stok transfer belgesi satırı tablosu
+    
+    Her ürün belgede bir kez yer alır; aynı ürünün tekrar eden satırları
+    belge oluşturulurken toplanır.
+    """
+    
+    __tablename__ = "stok_transfer_satirlari"
+    
+    transfer_id: Mapped[int] = mapped_column(
+        ForeignKey("stok_transferleri.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Transfer belgesi ID referansı"
+    )
+    
+    urun_id: Mapped[int] = mapped_column(
+        ForeignKey("urunler.id", ondelete="RESTRICT"),
+        nullable=False,
+        comment="Ürün ID referansı"
+    )
+    
+    miktar: Mapped[Decimal] = mapped_column(
+        Numeric(15, 4),
+        nullable=False,
+        comment="Transfer miktarı"
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('transfer_id', 'urun_id', name='uk_stok_transfer_satiri'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StokTransferSatiri(transfer_id={self.transfer_id}, urun_id={self.urun_id}, miktar={self.miktar})>"
+
+
+for _tablo in (Urun.__table__, UrunBarkod.__table__, StokBakiye.__table__):
+    for _ddl in POSTGRESQL_KATALOG_SURUM_DDL + katalog_tetikleyici_ddl(_tablo.name):
+        event.listen(_tablo, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
@@ -0,0 +1,95 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_baglanti_izleyici_unit
+# Description: Bağlantı izleyici birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+Bağlantı İzleyici Birim Testleri
+
+Durum bayrağını, yalnızca değişiklikte yayınlanan olayları, bağlantı
+yokken artan beklemeyi ve merkez adresinin ayarlardan çözülmesini doğrular.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+from sontechsp.uygulama.moduller.pos.baglanti_izleyici import (
+    BaglantiIzleyici, merkez_adresi_coz
+)
+
+
+class TestBaglantiIzleyici:
+    """Bağlantı izleyici testleri"""
+
+    def test_dinleyici_yalnizca_durum_degisince_cagrilir(self):
+        yoklayici = Mock(side_effect=[True, True, OSError("bağlantı reddedildi"), False, True])
+        izleyici = BaglantiIzleyici(yoklayici, arka_planda=False)
+        olaylar = []
+        izleyici.dinleyici_ekle(olaylar.append)
+
+        assert izleyici.cevrimici is False
+        sonuclar = [izleyici.simdi_kontrol_et() for _ in range(5)]
+
+        assert sonuclar == [True, True, False, False, True]
+        assert olaylar == [True, False, True]
+        assert izleyici.cevrimici is True
+
+    def test_hatali_dinleyici_digerlerini_engellemez(self):
+        izleyici = BaglantiIzleyici(Mock(return_value=True), arka_planda=False)
+        olaylar = []
+        izleyici.dinleyici_ekle(Mock(side_effect=RuntimeError("UI hatası")))
+        izleyici.dinleyici_ekle(olaylar.append)
+
+        izleyici.simdi_kontrol_et()
+
+        assert olaylar == [True]
+
+    def test_bekleme_baglanti_yokken_artar_ve_geri_gelince_sifirlanir(self):
+        izleyici = BaglantiIzleyici(Mock(), arka_planda=False, aralik=10.0,
+                                    ilk_bekleme=1.0, azami_bekleme=4.0)
+        bekleme_sureleri = []
+
+        def bekle(sure):
+            bekleme_sureleri.append(sure)
+            if len(bekleme_sureleri) == 6:
+                izleyici._durdur.set()
+            return False
+
+        izleyici._yoklayici.side_effect = [False, False, False, False, True, False]
+        with patch.object(izleyici._uyandir, 'wait', side_effect=bekle):
+            izleyici._izleme_dongusu()
+
+        assert bekleme_sureleri == [1.0, 2.0, 4.0, 4.0, 10.0, 1.0]
+
+    def test_tetikle_bekleyen_yoklamayi_hemen_calistirir(self):
+        ilk_yoklama = threading.Event()
+        ikinci_yoklama = threading.Event()
+
+        def yokla():
+            if not ilk_yoklama.is_set():
+                ilk_yoklama.set()
+                return False
+            return True
+
+        izleyici = BaglantiIzleyici(yokla, ilk_bekleme=60.0, azami_bekleme=60.0)
+        izleyici.dinleyici_ekle(lambda durum: durum and ikinci_yoklama.set())
+        try:
+            assert ilk_yoklama.wait(2)
+            izleyici.tetikle()
+            assert ikinci_yoklama.wait(2)
+        finally:
+            izleyici.kapat()
+
+        assert izleyici.cevrimici is True
+
+    def test_merkez_adresi_ayardan_veya_veritabani_urlsinden_cozulur(self):
+        ayarlar = {'VERITABANI_URL': 'postgresql://k:s@db.merkez:6543/sontechsp'}
+        with patch('sontechsp.uygulama.moduller.pos.baglanti_izleyici.ayar_al',
+                   side_effect=lambda anahtar, varsayilan=None: ayarlar.get(anahtar, varsayilan)):
+            assert merkez_adresi_coz() == ('db.merkez', 6543)
+            assert merkez_adresi_coz('api.merkez:8443') == ('api.merkez', 8443)
+
+            ayarlar['MERKEZ_SUNUCU_ADRESI'] = 'https://api.merkez'
+            assert merkez_adresi_coz() == ('api.merkez', 443)
@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_entegrasyon_e2e
 # Description: POS End-to-End entegrasyon testleri
 # Changelog:
 # - İlk oluşturma
+# - Ödeme servisi mağaza bilgisiyle kuruluyor
+# - Sepet durumu mock'u eklendi
+# - Ödeme servisi transaction sağlayıcı ve giden olay mock'uyla kuruluyor
 
 """
 POS End-to-End Entegrasyon Testleri
@@ -15,7 +18,7 @@ Gerçek senaryoları simüle ederek tüm katmanların birlikte çalışmasını
 import pytest
 from decimal import Decimal
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from typing import Dict, Any
 
 from sontechsp.uygulama.moduller.pos.servisler.sepet_service import SepetService
@@ -75,6 +78,7 @@ class TestE2ESatisSenaryosu:
                 }
             ]
         }
+        sepet_repo.sepet_durumu.return_value = SepetDurum.AKTIF.value
         sepet_repo.sepet_satiri_ekle.return_value = 1
         sepet_repo.sepet_durum_guncelle.return_value = True
         
@@ -128,7 +132,10 @@ class TestE2ESatisSenaryosu:
         odeme_service = OdemeService(
             sepet_repository=mock_repositories['sepet_repo'],
             satis_repository=mock_repositories['satis_repo'],
-            stok_service=mock_stok_service
+            stok_service=mock_stok_service,
+            magaza_id=1,
+            giden_olay_repository=Mock(),
+            oturum_saglayici=MagicMock()
         )
         
         fis_service = FisService(
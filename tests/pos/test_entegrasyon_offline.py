@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_entegrasyon_offline
 # Description: POS Offline-Online geçiş entegrasyon testleri
 # Changelog:
 # - İlk oluşturma
+# - Senkronizasyon testleri toplu sahiplen/onayla protokolüne göre güncellendi
+# - Network testleri bağlantı izleyicisine göre güncellendi
+# - Satış hattının yalnızca kuyruğa yazması ve terminal sırası testleri eklendi
 
 """
 POS Offline-Online Geçiş Entegrasyon Testleri
@@ -24,6 +27,7 @@ from sontechsp.uygulama.moduller.pos.services.offline_kuyruk_service import Offl
 from sontechsp.uygulama.moduller.pos.servisler.sepet_service import SepetService
 from sontechsp.uygulama.moduller.pos.servisler.odeme_service import OdemeService
 from sontechsp.uygulama.moduller.pos.repositories.offline_kuyruk_repository import OfflineKuyrukRepository
+from sontechsp.uygulama.moduller.pos.baglanti_izleyici import BaglantiIzleyici
 from sontechsp.uygulama.moduller.pos.arayuzler import (
     IslemTuru, KuyrukDurum, SepetDurum, OdemeTuru
 )
@@ -70,9 +74,10 @@ class TestOfflineOnlineGecis:
         ]
         
         mock_repo.kuyruk_ekle.return_value = 1
-        mock_repo.bekleyen_kuyruk_listesi.return_value = mock_kuyruk_kayitlari
-        mock_repo.kuyruk_durum_guncelle.return_value = True
-        mock_repo.kuyruk_deneme_artir.return_value = True
+        mock_repo.bekleyenleri_sahiplen.side_effect = [mock_kuyruk_kayitlari, []]
+        mock_repo.sahipsiz_islemleri_geri_al.return_value = 0
+        mock_repo.toplu_tamamla.return_value = len(mock_kuyruk_kayitlari)
+        mock_repo.toplu_deneme_artir.return_value = len(mock_kuyruk_kayitlari)
         mock_repo.kuyruk_istatistikleri.return_value = {
             'toplam_kayit': 2,
             'durum_sayilari': {
@@ -92,8 +97,10 @@ class TestOfflineOnlineGecis:
     
     @pytest.fixture
     def offline_kuyruk_service(self, mock_kuyruk_repository):
-        """Offline kuyruk service fixture"""
-        return OfflineKuyrukService(mock_kuyruk_repository)
+        """Offline kuyruk service fixture (arka plan işçisi kapalı)"""
+        izleyici = BaglantiIzleyici(Mock(return_value=False), arka_planda=False)
+        return OfflineKuyrukService(mock_kuyruk_repository, izleyici,
+                                    arka_planda_senkronize=False)
     
     def test_network_kesintisi_simulasyonu(self, offline_kuyruk_service):
         """
@@ -168,7 +175,7 @@ class TestOfflineOnlineGecis:
                 assert islenen_sayisi >= 0
                 
                 # Repository metodlarının çağrıldığını doğrula
-                offline_kuyruk_service._kuyruk_repo.bekleyen_kuyruk_listesi.assert_called()
+                offline_kuyruk_service._kuyruk_repo.bekleyenleri_sahiplen.assert_called()
     
     def test_kuyruk_senkronizasyon_basarili(self, offline_kuyruk_service):
         """
@@ -187,13 +194,10 @@ class TestOfflineOnlineGecis:
                 islenen_sayisi = offline_kuyruk_service.kuyruk_senkronize_et()
                 
                 # İşlem sayısı beklendiği gibi
-                assert islenen_sayisi >= 0
-                
-                # Durum güncellemelerinin yapıldığını kontrol et
-                calls = offline_kuyruk_service._kuyruk_repo.kuyruk_durum_guncelle.call_args_list
+                assert islenen_sayisi == 2
                 
-                # En az bir durum güncellemesi yapılmış olmalı
-                assert len(calls) >= 0
+                # Tüm batch tek toplu güncellemeyle tamamlanmış olmalı
+                offline_kuyruk_service._kuyruk_repo.toplu_tamamla.assert_called_once_with([1, 2])
     
     def test_kuyruk_senkronizasyon_basarisiz(self, offline_kuyruk_service):
         """
@@ -215,7 +219,64 @@ class TestOfflineOnlineGecis:
                 assert islenen_sayisi == 0
                 
                 # Deneme sayısı artırma işleminin çağrıldığını kontrol et
-                offline_kuyruk_service._kuyruk_repo.kuyruk_deneme_artir.assert_called()
+                offline_kuyruk_service._kuyruk_repo.toplu_deneme_artir.assert_called_once()
+                offline_kuyruk_service._kuyruk_repo.toplu_tamamla.assert_not_called()
+    
+    def test_satis_yalnizca_kuyruga_yazar_ve_isciyi_uyandirir(self, offline_kuyruk_service):
+        """
+        Online durumda bile satış hattı gönderim yapmaz
+        
+        Senaryo:
+        1. Network online iken işlem kuyruğa eklenir
+        2. Kayıt yalnızca yerel kuyruğa yazılır, işçi uyandırılır
+        """
+        with patch.object(offline_kuyruk_service, 'network_durumu_kontrol', return_value=True), \
+             patch.object(offline_kuyruk_service, '_kuyruk_islemini_gonder') as mock_gonder, \
+             patch.object(offline_kuyruk_service._senkron_iscisi, 'uyandir') as mock_uyandir:
+            sonuc = offline_kuyruk_service.islem_kuyruga_ekle(
+                islem_turu=IslemTuru.SATIS,
+                veri={'sepet_id': 1, 'fis_no': 'ONLINE001'},
+                terminal_id=1,
+                kasiyer_id=1
+            )
+        
+        assert sonuc is True
+        offline_kuyruk_service._kuyruk_repo.kuyruk_ekle.assert_called_once()
+        mock_uyandir.assert_called_once()
+        mock_gonder.assert_not_called()
+        offline_kuyruk_service._kuyruk_repo.bekleyenleri_sahiplen.assert_not_called()
+    
+    def test_terminal_sirasi_hatada_korunur(self, offline_kuyruk_service, mock_kuyruk_repository):
+        """
+        Terminalin kaydı başarısız olunca aynı terminalin sonraki kayıtları gönderilmez
+        
+        Senaryo:
+        1. Terminal 1'in ilk kaydı başarısız, terminal 2'nin kaydı başarılı
+        2. Terminal 1'in sonraki kaydı deneme sayılmadan bırakılır
+        """
+        kayitlar = [
+            {'id': 10, 'islem_turu': IslemTuru.SATIS.value, 'veri': {}, 'terminal_id': 1},
+            {'id': 11, 'islem_turu': IslemTuru.SATIS.value, 'veri': {}, 'terminal_id': 2},
+            {'id': 12, 'islem_turu': IslemTuru.SATIS.value, 'veri': {}, 'terminal_id': 1},
+        ]
+        mock_kuyruk_repository.bekleyenleri_sahiplen.side_effect = [kayitlar, []]
+        gonderilen = []
+        
+        def gonder(islem):
+            gonderilen.append(islem['id'])
+            return islem['id'] != 10
+        
+        with patch.object(offline_kuyruk_service, 'network_durumu_kontrol', return_value=True), \
+             patch.object(offline_kuyruk_service, '_kuyruk_islemini_gonder', side_effect=gonder):
+            islenen_sayisi = offline_kuyruk_service.kuyruk_senkronize_et()
+        
+        assert islenen_sayisi == 1
+        assert sorted(gonderilen) == [10, 11]
+        mock_kuyruk_repository.toplu_tamamla.assert_called_once_with([11])
+        mock_kuyruk_repository.toplu_deneme_artir.assert_called_once_with(
+            [10], "Senkronizasyon sırasında işlem başarısız"
+        )
+        mock_kuyruk_repository.sahiplenmeyi_birak.assert_called_once_with([12])
     
     def test_network_kesintisi_sirasinda_senkronizasyon(self, offline_kuyruk_service):
         """
@@ -503,74 +564,67 @@ class TestNetworkDurumKontrolu:
     """Network durumu kontrol testleri"""
     
     @pytest.fixture
-    def offline_service_real(self, mock_offline_kuyruk_repository):
+    def yoklayici(self):
+        """Merkez sunucu yoklayıcısı mock'u"""
+        return Mock(return_value=True)
+    
+    @pytest.fixture
+    def baglanti_izleyici(self, yoklayici):
+        """Arka plan thread'i olmayan bağlantı izleyicisi"""
+        return BaglantiIzleyici(yoklayici, arka_planda=False)
+    
+    @pytest.fixture
+    def offline_service_real(self, mock_offline_kuyruk_repository, baglanti_izleyici):
         """Gerçek network kontrolü için offline service fixture"""
-        return OfflineKuyrukService(mock_offline_kuyruk_repository)
+        return OfflineKuyrukService(mock_offline_kuyruk_repository, baglanti_izleyici,
+                                    arka_planda_senkronize=False)
     
-    def test_network_online_kontrolu(self, offline_service_real):
+    def test_network_online_kontrolu(self, offline_service_real, baglanti_izleyici, yoklayici):
         """
         Network online durumu kontrol testi
         
         Senaryo:
-        1. Network bağlantısı var
-        2. DNS çözümleme başarılı
-        3. HTTP isteği başarılı
-        4. True döndüğünü doğrula
+        1. İzleyici merkez sunucuyu başarıyla yoklar
+        2. Servis ağ isteği yapmadan True döndürür
         """
-        with patch('socket.gethostbyname') as mock_dns, \
-             patch('requests.get') as mock_http:
-            
-            # Başarılı network simülasyonu
-            mock_http.return_value.status_code = 200
-            
-            durum = offline_service_real.network_durumu_kontrol()
-            
-            assert durum is True
-            mock_dns.assert_called_once_with('google.com')
-            mock_http.assert_called_once()
+        baglanti_izleyici.simdi_kontrol_et()
+        
+        with patch('socket.create_connection') as mock_baglanti:
+            assert offline_service_real.network_durumu_kontrol() is True
+            assert offline_service_real.network_durumu_kontrol() is True
+            mock_baglanti.assert_not_called()
+        
+        yoklayici.assert_called_once()
     
-    def test_network_offline_dns_hatasi(self, offline_service_real):
+    def test_ilk_yoklama_oncesi_offline(self, offline_service_real, yoklayici):
         """
-        Network offline DNS hatası testi
-        
-        Senaryo:
-        1. DNS çözümleme başarısız
-        2. False döndüğünü doğrula
+        İzleyici henüz yoklamadıysa servis offline kabul eder
         """
-        import socket
-        with patch('socket.gethostbyname', side_effect=socket.gaierror("DNS hatası")):
-            durum = offline_service_real.network_durumu_kontrol()
-            assert durum is False
+        assert offline_service_real.network_durumu_kontrol() is False
+        yoklayici.assert_not_called()
     
-    def test_network_offline_http_hatasi(self, offline_service_real):
+    def test_network_offline_baglanti_hatasi(self, offline_service_real, baglanti_izleyici, yoklayici):
         """
-        Network offline HTTP hatası testi
+        Network offline bağlantı hatası testi
         
         Senaryo:
-        1. DNS çözümleme başarılı
-        2. HTTP isteği başarısız
-        3. False döndüğünü doğrula
+        1. Merkez sunucuya bağlantı reddedilir
+        2. False döndüğünü doğrula
         """
-        import requests
+        yoklayici.side_effect = ConnectionRefusedError("Bağlantı reddedildi")
         
-        with patch('socket.gethostbyname') as mock_dns, \
-             patch('requests.get', side_effect=requests.RequestException("HTTP hatası")):
-            
-            durum = offline_service_real.network_durumu_kontrol()
-            
-            assert durum is False
-            mock_dns.assert_called_once()
+        assert baglanti_izleyici.simdi_kontrol_et() is False
+        assert offline_service_real.network_durumu_kontrol() is False
     
-    def test_network_timeout_kontrolu(self, offline_service_real):
+    def test_network_timeout_kontrolu(self, offline_service_real, baglanti_izleyici, yoklayici):
         """
         Network timeout kontrol testi
         
         Senaryo:
-        1. Network isteği timeout olsun
+        1. Yoklama zaman aşımına uğrar
         2. False döndüğünü doğrula
         """
-        import socket
+        yoklayici.side_effect = socket.timeout("Timeout")
         
-        with patch('socket.gethostbyname', side_effect=socket.timeout("Timeout")):
-            durum = offline_service_real.network_durumu_kontrol()
-            assert durum is False
\ No newline at end of file
+        assert baglanti_izleyici.simdi_kontrol_et() is False
+        assert offline_service_real.network_durumu_kontrol() is False
@@ -0,0 +1,165 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_gun_sonu_unit
+# Description: Artımlı gün sonu (X/Z raporu) toplamları birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Tamamlanmış satışın iptal dışı duruma geçişi ve sonradan iptali
+
+"""
+Gün Sonu Toplamları Birim Testleri
+
+SQLite bellek veritabanında satış tamamlama ve iptalinin toplamları
+artımlı güncellemesini, X/Z özetlerinin toplamlardan okunmasını ve
+mutabakatın farkı bulup toplamları ham satışlardan yeniden kurmasını
+test eder.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from sontechsp.uygulama.veritabani.taban import Taban
+from sontechsp.uygulama.moduller.pos.arayuzler import OdemeTuru, SatisDurum, SepetDurum
+from sontechsp.uygulama.moduller.pos.database.models.gun_sonu import GunSonuToplami
+from sontechsp.uygulama.moduller.pos.database.models.satis import Satis, SatisOdeme
+from sontechsp.uygulama.moduller.pos.database.models.sepet import Sepet, SepetSatiri
+from sontechsp.uygulama.moduller.pos.repositories.gun_sonu_repository import GunSonuRepository
+
+GUN = date(2026, 10, 17)
+
+
+def _satis_ekle(baglanti, satis_id: int, kasiyer_id: int, satirlar, odemeler,
+                indirim: Decimal = Decimal('0')) -> None:
+    """Sepet, satırlar, satış ve ödemeleri yazar"""
+    brut = sum(tutar for tutar, _ in satirlar)
+    baglanti.execute(insert(Sepet.__table__).values(
+        id=satis_id, terminal_id=1, kasiyer_id=kasiyer_id, durum=SepetDurum.TAMAMLANDI, toplam_tutar=brut
+    ))
+    baglanti.execute(insert(SepetSatiri.__table__), [
+        {'sepet_id': satis_id, 'urun_id': sira, 'barkod': f'869000000{sira:04d}', 'urun_adi': 'Ürün',
+         'adet': 1, 'birim_fiyat': tutar, 'indirim_tutari': Decimal('0'), 'toplam_tutar': tutar,
+         'kdv_orani': oran}
+        for sira, (tutar, oran) in enumerate(satirlar, start=1)
+    ])
+    baglanti.execute(insert(Satis.__table__).values(
+        id=satis_id, sepet_id=satis_id, terminal_id=1, kasiyer_id=kasiyer_id,
+        satis_tarihi=datetime(2026, 10, 17, 10, satis_id), toplam_tutar=brut, indirim_tutari=indirim,
+        durum=SatisDurum.TAMAMLANDI, fis_no=f'F-{satis_id:04d}'
+    ))
+    baglanti.execute(insert(SatisOdeme.__table__), [
+        {'satis_id': satis_id, 'odeme_turu': turu, 'tutar': tutar,
+         'odeme_tarihi': datetime(2026, 10, 17, 10, satis_id)}
+        for turu, tutar in odemeler
+    ])
+
+
+@pytest.fixture
+def ortam():
+    """İki kasiyerin satışlarını içeren veritabanı ve repository"""
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    Taban.metadata.create_all(engine, tables=[
+        Sepet.__table__, SepetSatiri.__table__, Satis.__table__, SatisOdeme.__table__,
+        GunSonuToplami.__table__
+    ])
+    with engine.begin() as baglanti:
+        _satis_ekle(baglanti, 1, 7, [(Decimal('110'), Decimal('10')), (Decimal('120'), Decimal('20'))],
+                    [(OdemeTuru.NAKIT, Decimal('100')), (OdemeTuru.KART, Decimal('120'))],
+                    indirim=Decimal('10'))
+        _satis_ekle(baglanti, 2, 7, [(Decimal('55'), Decimal('10'))], [(OdemeTuru.NAKIT, Decimal('55'))])
+        _satis_ekle(baglanti, 3, 8, [(Decimal('40'), Decimal('20'))], [(OdemeTuru.KART, Decimal('40'))])
+
+    repository = GunSonuRepository(oturum_ac=lambda: Session(engine))
+    for satis_id in (1, 2, 3):
+        assert repository.satis_ekle(satis_id) is True
+    return engine, repository
+
+
+class TestGunSonuToplamlari:
+    """Artımlı toplam testleri"""
+
+    def test_z_ve_x_raporlari_toplamlardan_okunur(self, ortam):
+        _, repository = ortam
+
+        z = repository.ozet_getir(GUN, terminal_id=1)
+        assert (z['satis_sayisi'], z['brut_tutar'], z['indirim_tutari'], z['net_tutar']) == (
+            3, Decimal('325.00'), Decimal('10.00'), Decimal('315.00')
+        )
+        assert z['odemeler'] == {
+            'kart': {'adet': 2, 'tutar': Decimal('160.00')},
+            'nakit': {'adet': 2, 'tutar': Decimal('155.00')},
+        }
+        # Satış 1'in 10 TL indirimi oranlara 110/230 ve 120/230 payıyla dağıtılır
+        assert z['kdv_dokumu']['10.00']['tutar'] == Decimal('160.22')
+        assert z['kdv_dokumu']['20.00']['tutar'] == Decimal('154.78')
+        assert z['kdv_tutari'] == z['kdv_dokumu']['10.00']['kdv'] + z['kdv_dokumu']['20.00']['kdv']
+        assert z['matrah'] + z['kdv_tutari'] == z['net_tutar']
+
+        x = repository.ozet_getir(GUN, terminal_id=1, kasiyer_id=8)
+        assert (x['satis_sayisi'], x['net_tutar'], list(x['odemeler'])) == (1, Decimal('40.00'), ['kart'])
+
+    def test_iptal_katkiyi_geri_alir(self, ortam):
+        _, repository = ortam
+
+        assert repository.satis_cikar(2) is True
+        z = repository.ozet_getir(GUN, terminal_id=1)
+        assert (z['satis_sayisi'], z['net_tutar'], z['iptal_sayisi'], z['iptal_tutari']) == (
+            2, Decimal('260.00'), 1, Decimal('55.00')
+        )
+        assert z['odemeler']['nakit'] == {'adet': 1, 'tutar': Decimal('100.00')}
+        assert repository.satis_cikar(99) is False
+
+
+class TestGunSonuMutabakati:
+    """Ham satışlardan doğrulama testleri"""
+
+    def test_tutarli_toplamlarda_fark_yok(self, ortam):
+        engine, repository = ortam
+        with engine.begin() as baglanti:
+            baglanti.execute(update(Satis.__table__).where(Satis.__table__.c.id == 2)
+                             .values(durum=SatisDurum.IPTAL))
+        repository.satis_cikar(2)
+
+        assert repository.mutabakat_kontrol(GUN) == []
+
+    def test_iptal_disi_gecis_iptal_sayilmaz(self, ortam):
+        engine, repository = ortam
+        s = Satis.__table__
+
+        # Tamamlandı -> Beklemede: yalnızca katkı geri alınır
+        with engine.begin() as baglanti:
+            baglanti.execute(update(s).where(s.c.id == 2).values(durum=SatisDurum.BEKLEMEDE))
+        repository.satis_cikar(2, iptal=False)
+        z = repository.ozet_getir(GUN, terminal_id=1)
+        assert (z['satis_sayisi'], z['iptal_sayisi']) == (2, 0)
+        assert repository.mutabakat_kontrol(GUN) == []
+
+        # Beklemede -> İptal: fiş numaralı satışın iptali sayılır
+        with engine.begin() as baglanti:
+            baglanti.execute(update(s).where(s.c.id == 2).values(durum=SatisDurum.IPTAL))
+        repository.iptal_ekle(2)
+        z = repository.ozet_getir(GUN, terminal_id=1)
+        assert (z['satis_sayisi'], z['iptal_sayisi'], z['iptal_tutari']) == (2, 1, Decimal('55.00'))
+        assert repository.mutabakat_kontrol(GUN) == []
+
+    def test_fark_bulunur_ve_yeniden_olusturulur(self, ortam):
+        engine, repository = ortam
+        t = GunSonuToplami.__table__
+        with engine.begin() as baglanti:
+            baglanti.execute(update(t).where(t.c.boyut == 'GENEL', t.c.kasiyer_id == 8)
+                             .values(net_tutar=Decimal('41.00')))
+
+        farklar = repository.mutabakat_kontrol(GUN, terminal_id=1)
+        assert [(f['kasiyer_id'], f['alan'], f['kayitli'], f['hesaplanan']) for f in farklar] == [
+            (8, 'net_tutar', Decimal('41.00'), Decimal('40.00'))
+        ]
+
+        oncesi = repository.ozet_getir(GUN)
+        assert repository.yeniden_olustur(GUN) > 0
+        assert repository.mutabakat_kontrol(GUN) == []
+        assert repository.ozet_getir(GUN)['net_tutar'] == oncesi['net_tutar'] - Decimal('1.00')
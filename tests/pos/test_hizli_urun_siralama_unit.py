@@ -0,0 +1,186 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_hizli_urun_siralama_unit
+# Description: Satışa göre hızlı ürün sıralaması ve buton havuzu birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Geçmişten yükleme, kategori süzgeci ve demo ürünlerin yalnızca boş sıralamada gösterilmesi
+
+"""
+Hızlı Ürün Sıralaması Birim Testleri
+
+Sönümlenen sayaçların terminal ve saat dilimine göre sıralamasını,
+eski satışların ağırlığının azalmasını ve hızlı ürün panelinin butonları
+yeniden oluşturmadan sıralanan ürünlerle doldurmasını test eder.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from sontechsp.uygulama.veritabani.taban import Taban
+from sontechsp.uygulama.veritabani.modeller.stok import Urun
+from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum, SepetDurum
+from sontechsp.uygulama.moduller.pos.database.models.satis import Satis
+from sontechsp.uygulama.moduller.pos.database.models.sepet import Sepet, SepetSatiri
+from sontechsp.uygulama.moduller.pos.hizli_urunler import HizliUrunSiralayici
+from sontechsp.uygulama.moduller.pos.ui.bilesenler.hizli_urun_paneli import HizliUrunPaneli
+from sontechsp.uygulama.moduller.pos.ui.handlers.pos_sinyalleri import POSSinyalleri
+
+SABAH = datetime(2026, 10, 17, 8, 30)
+AKSAM = datetime(2026, 10, 17, 19, 0)
+
+
+def _satir(urun_id: int, ad: str) -> dict:
+    return {'urun_id': urun_id, 'barkod': f'869{urun_id:010d}', 'urun_adi': ad, 'birim_fiyat': 10}
+
+
+class TestHizliUrunSiralayici:
+    """Sönümlenen sayaç testleri"""
+
+    def test_saat_dilimi_ve_terminal_ayri_siralanir(self):
+        siralayici = HizliUrunSiralayici()
+        for _ in range(3):
+            siralayici.satis_kaydet(1, [_satir(1, 'Simit')], SABAH)
+        for _ in range(2):
+            siralayici.satis_kaydet(1, [_satir(2, 'Bira')], AKSAM)
+        siralayici.satis_kaydet(2, [_satir(3, 'Gazete')], SABAH)
+
+        assert [u['urun_adi'] for u in siralayici.en_cok_satanlar(1, SABAH)] == ['Simit', 'Bira']
+        assert [u['urun_adi'] for u in siralayici.en_cok_satanlar(1, AKSAM)] == ['Bira', 'Simit']
+        assert [u['urun_id'] for u in siralayici.en_cok_satanlar(2, SABAH)] == [3]
+        assert siralayici.surum(1) == 5
+
+    def test_eski_satislar_sonumlenir(self):
+        siralayici = HizliUrunSiralayici(yarilanma_suresi=24 * 3600.0)
+        for _ in range(4):
+            siralayici.satis_kaydet(1, [_satir(1, 'Dondurma')], SABAH - timedelta(days=3))
+        siralayici.satis_kaydet(1, [_satir(2, 'Salep')], SABAH)
+
+        # 3 yarılanma sonra 4 satış 0.5 satış ağırlığındadır
+        assert [u['urun_adi'] for u in siralayici.en_cok_satanlar(1, SABAH)] == ['Salep', 'Dondurma']
+
+    def test_uzun_sure_sonra_skorlar_kuculur_ve_sinir_korunur(self):
+        siralayici = HizliUrunSiralayici(yarilanma_suresi=1.0, urun_siniri=4)
+        siralayici.satis_kaydet(1, [_satir(i, f'Ürün {i}') for i in range(1, 7)], SABAH)
+        siralayici.satis_kaydet(1, [_satir(9, 'Yeni')], SABAH + timedelta(seconds=100))
+
+        sirali = siralayici.en_cok_satanlar(1, SABAH, limit=10)
+        assert sirali[0]['urun_adi'] == 'Yeni'
+        assert len(sirali) <= 5
+
+
+    def test_gecmisten_yukleme_ve_kategori(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+        Taban.metadata.create_all(engine, tables=[
+            Urun.__table__, Sepet.__table__, SepetSatiri.__table__, Satis.__table__
+        ])
+        with engine.begin() as baglanti:
+            baglanti.execute(insert(Urun.__table__), [
+                {'id': 1, 'urun_kodu': 'U1', 'urun_adi': 'Simit', 'kategori': 'Fırın', 'birim': 'adet'},
+                {'id': 2, 'urun_kodu': 'U2', 'urun_adi': 'Ayran', 'kategori': 'İçecekler', 'birim': 'adet'},
+            ])
+            for satis_id, (urun_id, ad, gun_once, durum) in enumerate([
+                (1, 'Simit', 1, SatisDurum.TAMAMLANDI), (1, 'Simit', 2, SatisDurum.TAMAMLANDI),
+                (2, 'Ayran', 1, SatisDurum.TAMAMLANDI), (2, 'Ayran', 1, SatisDurum.IPTAL),
+                (2, 'Ayran', 1, SatisDurum.IPTAL), (2, 'Ayran', 40, SatisDurum.TAMAMLANDI),
+            ], start=1):
+                baglanti.execute(insert(Sepet.__table__).values(
+                    id=satis_id, terminal_id=1, kasiyer_id=1, durum=SepetDurum.TAMAMLANDI
+                ))
+                baglanti.execute(insert(SepetSatiri.__table__).values(
+                    sepet_id=satis_id, urun_id=urun_id, barkod=f'869{urun_id:010d}', urun_adi=ad,
+                    adet=1, birim_fiyat=Decimal('5'), indirim_tutari=Decimal('0'), toplam_tutar=Decimal('5')
+                ))
+                baglanti.execute(insert(Satis.__table__).values(
+                    id=satis_id, sepet_id=satis_id, terminal_id=1, kasiyer_id=1,
+                    satis_tarihi=SABAH - timedelta(days=gun_once), toplam_tutar=Decimal('5'), durum=durum
+                ))
+
+        siralayici = HizliUrunSiralayici()
+        # Yalnızca son 28 günün tamamlanmış satışları
+        assert siralayici.gecmisten_yukle(lambda: Session(engine), bitis=SABAH) == 3
+        sirali = siralayici.en_cok_satanlar(1, SABAH)
+        assert [(u['urun_adi'], u['kategori']) for u in sirali] == [('Simit', 'Fırın'), ('Ayran', 'İçecekler')]
+        assert siralayici.surum(1) == 1
+
+    def test_satirda_olmayan_kategori_bir_kez_okunur(self):
+        aramalar = []
+
+        def kategori_bul(urun_idleri):
+            aramalar.append(urun_idleri)
+            return {urun_id: 'Fırın' for urun_id in urun_idleri}
+
+        siralayici = HizliUrunSiralayici(kategori_bul=kategori_bul)
+        siralayici.satis_kaydet(1, [_satir(1, 'Simit'), dict(_satir(2, 'Ayran'), kategori='İçecekler')], SABAH)
+        siralayici.satis_kaydet(1, [_satir(1, 'Simit')], SABAH)
+
+        assert aramalar == [[1]]
+        assert {u['urun_adi']: u['kategori'] for u in siralayici.en_cok_satanlar(1, SABAH)} == {
+            'Simit': 'Fırın', 'Ayran': 'İçecekler'
+        }
+
+
+class TestHizliUrunPaneliHavuzu:
+    """Buton havuzu testleri"""
+
+    @pytest.fixture
+    def panel(self):
+        app = QApplication.instance() or QApplication(sys.argv)
+        siralayici = HizliUrunSiralayici()
+        panel = HizliUrunPaneli(POSSinyalleri(), siralayici=siralayici, terminal_id=1)
+        yield panel, siralayici
+        panel.close()
+        panel.deleteLater()
+        app.processEvents()
+
+    def test_buton_sayisi_degisince_butonlar_yeniden_olusturulmaz(self, panel):
+        panel, _ = panel
+        havuz = list(panel._buton_havuzu)
+
+        panel.buton_sayisi_combo.setCurrentText("20")
+        panel.buton_sayisi_combo.setCurrentText("12")
+
+        assert len(panel._butonlar) == 12
+        assert panel._butonlar == havuz[:12]
+        assert panel._buton_havuzu == havuz
+
+    def test_bos_butonlar_en_cok_satanlarla_dolar(self, panel):
+        panel, siralayici = panel
+        panel.kategori_combo.setCurrentIndex(0)  # Tümü
+
+        # Satış yokken demo ürünler gösterilir
+        assert [b.text() for b in panel._butonlar[:3]] == ['Coca Cola 330ml', 'Fanta 330ml', 'Tanımsız']
+
+        panel._hizli_urunler_guncellendi([dict(_satir(9, 'Çay'), pozisyon=1)])
+        siralayici.satis_kaydet(1, [_satir(7, 'Ekmek'), _satir(9, 'Çay')])
+        siralayici.satis_kaydet(1, [_satir(7, 'Ekmek'), _satir(8, 'Simit')])
+        panel.sinyaller.odeme_tamamlandi.emit({})
+
+        # Demo ürünler sıralamaya yer açar; pozisyonu tanımlı ürün yerinde kalır
+        # ve tekrar gösterilmez
+        assert [b.text() for b in panel._butonlar[:4]] == ['Ekmek', 'Çay', 'Simit', 'Tanımsız']
+        assert panel._butonlar[2].property("hasProduct") is True
+
+        # Sıralama değişmediyse butonlara dokunulmaz
+        panel._butonlar[2].setText("elle")
+        panel.sinyaller.odeme_tamamlandi.emit({})
+        assert panel._butonlar[2].text() == "elle"
+
+    def test_kategori_sirali_urunun_kategori_adiyla_suzulur(self, panel):
+        panel, siralayici = panel
+        siralayici.satis_kaydet(1, [dict(_satir(7, 'Ekmek'), kategori='Atıştırmalık'),
+                                    dict(_satir(8, 'Ayran'), kategori='İçecekler')])
+        panel.sinyaller.odeme_tamamlandi.emit({})
+
+        panel.kategori_combo.setCurrentText('İçecekler')
+        assert [b.text() for b in panel._butonlar[:2]] == ['Ayran', 'Tanımsız']
+        panel.kategori_combo.setCurrentText('Atıştırmalık')
+        assert [b.text() for b in panel._butonlar[:2]] == ['Ekmek', 'Tanımsız']
@@ -0,0 +1,130 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_iade_defteri_unit
+# Description: İade edilebilir adet defteri birim testleri
+# Changelog:
+# - İlk oluşturma
+# - İndirimli satır net tutarı ve tekrar kayıtta iade adedinin korunması
+
+"""
+İade Defteri Birim Testleri
+
+SQLite bellek veritabanında satış satırlarının deftere kopyalanmasını,
+fiş no/barkodla okumayı, adedin koşullu ayrılıp geri verilmesini ve
+IadeService'in arama ölçütü doğrulamasını test eder.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from sontechsp.uygulama.veritabani.taban import Taban
+from sontechsp.uygulama.moduller.pos.arayuzler import SatisDurum, SepetDurum
+from sontechsp.uygulama.moduller.pos.database.models.iade import IadeEdilebilirSatir
+from sontechsp.uygulama.moduller.pos.database.models.satis import Satis
+from sontechsp.uygulama.moduller.pos.database.models.sepet import Sepet, SepetSatiri
+from sontechsp.uygulama.moduller.pos.hatalar import IadeHatasi
+from sontechsp.uygulama.moduller.pos.repositories.iade_defteri_repository import (
+    IadeDefteriRepository
+)
+from sontechsp.uygulama.moduller.pos.servisler.iade_service import IadeService
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi
+
+
+@pytest.fixture
+def defter():
+    """Tamamlanmış iki satırlı satışı deftere yazılmış repository"""
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    Taban.metadata.create_all(engine, tables=[
+        Sepet.__table__, SepetSatiri.__table__, Satis.__table__, IadeEdilebilirSatir.__table__
+    ])
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(Sepet.__table__).values(
+            id=1, terminal_id=1, kasiyer_id=1, durum=SepetDurum.TAMAMLANDI, toplam_tutar=Decimal('230')
+        ))
+        baglanti.execute(insert(SepetSatiri.__table__), [
+            {'id': 10, 'sepet_id': 1, 'urun_id': 1, 'barkod': '8690000000012', 'urun_adi': 'Süt',
+             'adet': 3, 'birim_fiyat': Decimal('10'), 'indirim_tutari': Decimal('1'),
+             'toplam_tutar': Decimal('29')},
+            {'id': 11, 'sepet_id': 1, 'urun_id': 2, 'barkod': '8690000000029', 'urun_adi': 'Çay',
+             'adet': 1, 'birim_fiyat': Decimal('200'), 'indirim_tutari': Decimal('0'),
+             'toplam_tutar': Decimal('200')},
+        ])
+        baglanti.execute(insert(Satis.__table__).values(
+            id=5, sepet_id=1, terminal_id=1, kasiyer_id=1, satis_tarihi=datetime(2026, 10, 17, 12, 0),
+            toplam_tutar=Decimal('230'), durum=SatisDurum.TAMAMLANDI, fis_no='F-0005'
+        ))
+
+    repository = IadeDefteriRepository(oturum_ac=lambda: Session(engine))
+    assert repository.satis_satirlarini_kaydet(5, 1, 'F-0005') == 2
+    return repository
+
+
+class TestIadeDefteri:
+    """Defter testleri"""
+
+    def test_fis_no_ve_barkodla_tek_okuma(self, defter):
+        satirlar = defter.iade_edilebilir_satirlar(fis_no='F-0005')
+        assert [s['sepet_satiri_id'] for s in satirlar] == [10, 11]
+        # Satır toplamı indirim düşülmüş nettir (3 x 10 - 1); indirim tekrar düşülmez
+        sut = satirlar[0]
+        assert (sut['kalan_adet'], sut['net_tutar'], sut['birim_iade_tutari']) == (
+            3, Decimal('29.00'), Decimal('9.67')
+        )
+
+        assert [s['urun_adi'] for s in defter.iade_edilebilir_satirlar(barkod='8690000000029')] == ['Çay']
+        with pytest.raises(DogrulamaHatasi):
+            defter.iade_edilebilir_satirlar()
+
+    def test_adet_kosullu_ayrilir_ve_geri_verilir(self, defter):
+        assert defter.iade_adedi_ayir(2, satis_id=5, barkod='8690000000012') == 10
+        assert defter.iade_adedi_ayir(1, sepet_satiri_id=10) == 10
+
+        # Satılan adet tükendi; satır artık listelenmez ve yeni iade reddedilir
+        with pytest.raises(IadeHatasi):
+            defter.iade_adedi_ayir(1, satis_id=5, barkod='8690000000012')
+        with pytest.raises(IadeHatasi):
+            defter.iade_adedi_ayir(1, sepet_satiri_id=10)
+        assert [s['sepet_satiri_id'] for s in defter.iade_edilebilir_satirlar(fis_no='F-0005')] == [11]
+
+        assert defter.iade_adedi_geri_al(10, 2) is True
+        assert defter.iade_edilebilir_satirlar(barkod='8690000000012')[0]['kalan_adet'] == 2
+        assert defter.iade_adedi_geri_al(10, 5) is False
+
+    def test_tekrar_kayit_iade_edilen_adedi_korur(self, defter):
+        defter.iade_adedi_ayir(3, sepet_satiri_id=10)
+
+        assert defter.satis_satirlarini_kaydet(5, 1, 'F-0005-B') == 0
+        assert defter.iade_edilebilir_satirlar(barkod='8690000000012') == []
+        with pytest.raises(IadeHatasi):
+            defter.iade_adedi_ayir(1, sepet_satiri_id=10)
+        assert [s['sepet_satiri_id'] for s in defter.iade_edilebilir_satirlar(fis_no='F-0005-B')] == [11]
+
+    def test_baska_satisin_satiri_ayrilamaz(self, defter):
+        with pytest.raises(IadeHatasi):
+            defter.iade_adedi_ayir(1, satis_id=6, sepet_satiri_id=10)
+        with pytest.raises(IadeHatasi):
+            defter.iade_adedi_ayir(1, satis_id=5, barkod='0000000000000')
+
+
+class TestIadeServiceDefter:
+    """Servis testleri"""
+
+    def test_arama_olcutu_zorunlu_ve_repositorye_iletilir(self):
+        iade_repository = Mock()
+        iade_repository.iade_edilebilir_satirlar.return_value = [{'sepet_satiri_id': 10}]
+        servis = IadeService(iade_repository, Mock())
+
+        with pytest.raises(DogrulamaHatasi):
+            servis.iade_edilebilir_satirlari_getir(fis_no='  ')
+
+        assert servis.iade_edilebilir_satirlari_getir(barkod=' 8690000000012 ') == [{'sepet_satiri_id': 10}]
+        iade_repository.iade_edilebilir_satirlar.assert_called_once_with(
+            fis_no=None, barkod='8690000000012'
+        )
@@ -0,0 +1,214 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_katalog_replikasi_unit
+# Description: Katalog replikası birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Geç commit edilen satırın kesin filigranla yakalanması testi
+
+"""
+Katalog Replikası Birim Testleri
+
+Merkez ve terminal için iki SQLite bellek veritabanı kullanır; merkez
+satırlarının sürümleri (PostgreSQL'de tetikleyicinin atadığı değerler)
+testte elle verilir. Delta çekmeyi, silme kayıtlarını, bekletilen
+barkodları, geç commit'leri, tam yenilemeyi ve servislerin önce yerelden okumasını doğrular.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, text, update
+from sqlalchemy.pool import StaticPool
+
+import sontechsp.uygulama.veritabani.modeller  # noqa: F401 - FK hedefleri metadata'ya yüklenir
+from sontechsp.uygulama.veritabani.taban import Taban
+from sontechsp.uygulama.veritabani.modeller.stok import (
+    KatalogSilinen, StokBakiye, Urun, UrunBarkod
+)
+from sontechsp.uygulama.moduller.pos.katalog_replikasi import (
+    KATALOG_STOK_BAKIYELERI, KatalogReplikasi
+)
+from sontechsp.uygulama.moduller.pos.servisler.stok_service import StokService
+from sontechsp.uygulama.moduller.stok.servisler.barkod_service import BarkodService
+from sontechsp.uygulama.moduller.stok.depolar.barkod_indeksi import BarkodIndeksi
+
+
+def _motor():
+    return create_engine("sqlite://", poolclass=StaticPool,
+                         connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def merkez():
+    """Ürün, barkod ve iki mağaza stoku yüklü merkez veritabanı"""
+    engine = _motor()
+    Taban.metadata.create_all(engine, tables=[
+        Urun.__table__, UrunBarkod.__table__, StokBakiye.__table__, KatalogSilinen.__table__
+    ])
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(Urun.__table__), [
+            {'id': 1, 'urun_kodu': 'SUT001', 'urun_adi': 'Süt Ülker 1L',
+             'satis_fiyati': Decimal('32.50'), 'kdv_orani': Decimal('1'), 'degisiklik_surumu': 1},
+            {'id': 2, 'urun_kodu': 'CAY001', 'urun_adi': 'Çaykur Rize Çayı',
+             'satis_fiyati': Decimal('180'), 'kdv_orani': Decimal('1'), 'degisiklik_surumu': 2},
+        ])
+        baglanti.execute(insert(UrunBarkod.__table__), [
+            {'id': 10, 'urun_id': 1, 'barkod': '8690000000012', 'birim': 'adet', 'degisiklik_surumu': 3},
+            {'id': 11, 'urun_id': 2, 'barkod': '8690000000029', 'birim': 'adet', 'degisiklik_surumu': 4},
+        ])
+        baglanti.execute(insert(StokBakiye.__table__), [
+            {'id': 20, 'urun_id': 1, 'magaza_id': 1, 'miktar': Decimal('50'),
+             'rezerve_miktar': Decimal('2'), 'kullanilabilir_miktar': Decimal('48'),
+             'degisiklik_surumu': 5},
+            {'id': 21, 'urun_id': 2, 'magaza_id': 2, 'miktar': Decimal('7'),
+             'rezerve_miktar': Decimal('0'), 'kullanilabilir_miktar': Decimal('7'),
+             'degisiklik_surumu': 6},
+        ])
+    return engine
+
+
+@pytest.fixture
+def replika(merkez):
+    """Mağaza 1 için senkronize edilmemiş terminal replikası"""
+    return KatalogReplikasi(merkez, _motor(), magaza_id=1, arka_planda=False)
+
+
+class TestKatalogReplikasi:
+    """Replikasyon testleri"""
+
+    def test_ilk_senkron_katalogu_ve_magaza_stokunu_kopyalar(self, replika):
+        assert replika.yuklu_mu is False
+
+        assert replika.senkronize_et() == 5
+
+        dto = replika.barkod_ile_ara('8690000000012')
+        assert (dto.urun_id, dto.urun_adi, dto.satis_fiyati) == (1, 'Süt Ülker 1L', Decimal('32.50'))
+        durumlar = replika.stok_durumlari_getir([1, 2], magaza_id=1)
+        assert durumlar[1]['kullanilabilir_stok'] == Decimal('48')
+        assert durumlar[2]['durum'] == 'STOK_YOK'  # başka mağazanın stoku çekilmez
+        assert replika.stok_okunabilir(1) and not replika.stok_okunabilir(2)
+        assert replika.istatistikler()['filigranlar']['stok_bakiyeleri'] == 5
+
+        # Offline ürün araması (FTS5 aynası) kopyalanan satırlardan beslenir
+        with replika._yerel_engine.connect() as yerel:
+            bulunan = yerel.execute(text(
+                "SELECT rowid FROM urun_arama_fts WHERE urun_arama_fts MATCH '\"cay\"*'"
+            )).scalars().all()
+        assert bulunan == [2]
+
+    def test_delta_yalnizca_yeni_surumleri_ve_silmeleri_uygular(self, merkez, replika):
+        replika.senkronize_et()
+        assert replika.senkronize_et() == 0  # güvenlik payıyla yeniden okunanlar sayılmaz
+
+        with merkez.begin() as baglanti:
+            baglanti.execute(update(Urun.__table__).where(Urun.__table__.c.id == 1)
+                             .values(satis_fiyati=Decimal('34.90'), degisiklik_surumu=7))
+            baglanti.execute(delete(UrunBarkod.__table__).where(UrunBarkod.__table__.c.id == 11))
+            baglanti.execute(insert(KatalogSilinen.__table__).values(
+                tablo_adi='urun_barkodlari', kayit_id=11, degisiklik_surumu=8
+            ))
+            baglanti.execute(update(StokBakiye.__table__).where(StokBakiye.__table__.c.id == 20)
+                             .values(kullanilabilir_miktar=Decimal('5'), degisiklik_surumu=9))
+
+        assert replika.senkronize_et() == 3
+
+        assert replika.barkod_ile_ara('8690000000012').satis_fiyati == Decimal('34.90')
+        assert replika.barkod_ile_ara('8690000000029') is None
+        assert replika.stok_durumlari_getir([1], magaza_id=1)[1]['durum'] == 'KRITIK'
+
+    def test_urunu_gelmeyen_barkod_bekletilir_ve_sonra_uygulanir(self, merkez, replika):
+        replika.senkronize_et()
+        # Ürün 3'ün transaction'ı barkodundan sonra commit ediliyor (geç commit)
+        with merkez.begin() as baglanti:
+            baglanti.execute(insert(UrunBarkod.__table__).values(
+                id=12, urun_id=3, barkod='8690000000036', birim='adet', degisiklik_surumu=11
+            ))
+
+        replika.senkronize_et()
+        assert replika.barkod_ile_ara('8690000000036') is None
+        assert replika.istatistikler()['filigranlar']['urun_barkodlari'] == 10
+
+        with merkez.begin() as baglanti:
+            baglanti.execute(insert(Urun.__table__).values(
+                id=3, urun_kodu='SU001', urun_adi='Su 0.5L', satis_fiyati=Decimal('5'),
+                kdv_orani=Decimal('1'), degisiklik_surumu=10
+            ))
+
+        replika.senkronize_et()
+        assert replika.barkod_ile_ara('8690000000036').urun_adi == 'Su 0.5L'
+        assert replika.istatistikler()['filigranlar']['urun_barkodlari'] == 11
+
+    def test_tam_yenileme_merkezde_olmayan_yerel_satirlari_siler(self, merkez, replika):
+        replika.senkronize_et()
+        # Silme kaydı güvenlik payının da gerisinde kalmış (ör. uzun süre kapalı terminal)
+        with merkez.begin() as baglanti:
+            baglanti.execute(delete(StokBakiye.__table__).where(StokBakiye.__table__.c.id == 20))
+
+        replika.senkronize_et()
+        assert replika.stok_durumlari_getir([1], magaza_id=1)[1]['kullanilabilir_stok'] == Decimal('48')
+
+        replika.senkronize_et(tam=True)
+        assert replika.stok_durumlari_getir([1], magaza_id=1)[1]['durum'] == 'STOK_YOK'
+        with replika._yerel_engine.connect() as yerel:
+            assert yerel.execute(KATALOG_STOK_BAKIYELERI.select()).all() == []
+
+    def test_gec_commit_kesin_filigrandan_yeniden_okunur(self, merkez, replika):
+        # Merkez anlık görüntüsü (xmin, xmax, sıra değeri) her senkronda elle verilir
+        sinirlar = iter([(100, 101, 6), (101, 103, 1004), (103, 104, 1004)])
+        replika._islem_siniri = lambda _merkez: next(sinirlar)
+        replika.senkronize_et()
+
+        # txid 101 sürüm 7'yi aldı ama commit etmedi; sonraki işlemler 1000+ sürümlerle commit edildi
+        with merkez.begin() as baglanti:
+            baglanti.execute(insert(Urun.__table__), [
+                {'id': 100 + sira, 'urun_kodu': f'YENI{sira}', 'urun_adi': f'Yeni {sira}',
+                 'satis_fiyati': Decimal('1'), 'kdv_orani': Decimal('1'),
+                 'degisiklik_surumu': 1000 + sira}
+                for sira in range(5)
+            ])
+        replika.senkronize_et()
+        filigranlar = replika.istatistikler()['filigranlar']
+        assert (filigranlar['urunler'], filigranlar['urunler:kesin']) == (1004, 6)
+
+        # Uzun süren işlem, sabit güvenlik payının (500) çok gerisindeki sürümle commit ediliyor
+        with merkez.begin() as baglanti:
+            baglanti.execute(update(Urun.__table__).where(Urun.__table__.c.id == 1)
+                             .values(satis_fiyati=Decimal('29.90'), degisiklik_surumu=7))
+
+        replika.senkronize_et()
+        assert replika.barkod_ile_ara('8690000000012').satis_fiyati == Decimal('29.90')
+        assert replika.istatistikler()['filigranlar']['urunler:kesin'] == 1004
+
+
+class TestYerelOnceOkuma:
+    """Servislerin yerel replikayı merkezden önce okuması"""
+
+    def test_stok_kontrolu_replikadan_yapilir(self, replika):
+        replika.senkronize_et()
+        entegrasyon = Mock()
+        stok_service = StokService(entegrasyon, Mock(), Mock(), Mock(), katalog_replikasi=replika)
+
+        assert stok_service.toplu_stok_kontrol({1: 48, 2: 1}, magaza_id=1) == {1: True, 2: False}
+        assert stok_service.stok_kontrol(1, 1, 49) is False
+        entegrasyon.stok_durumlari_getir.assert_not_called()
+        entegrasyon.gercek_zamanli_stok_durumu_getir.assert_not_called()
+
+        # Replikanın tutmadığı mağaza merkezden okunur
+        entegrasyon.gercek_zamanli_stok_durumu_getir.return_value = {'kullanilabilir_stok': Decimal('7')}
+        assert stok_service.stok_kontrol(2, 2, 5) is True
+
+    def test_barkod_indeks_iskasinda_merkezden_once_replikaya_bakilir(self, replika):
+        replika.senkronize_et()
+        barkod_repository = Mock()
+        indeks = BarkodIndeksi()
+        barkod_service = BarkodService(barkod_repository, indeks, yerel_katalog=replika)
+
+        assert barkod_service.barkod_ara('8690000000029').urun_adi == 'Çaykur Rize Çayı'
+        barkod_repository.barkod_ile_ara.assert_not_called()
+        assert indeks.ara('8690000000029') is not None
+
+        # Replika yalnızca indeksi de besleyebilir
+        yeni_indeks = BarkodIndeksi(replika)
+        assert yeni_indeks.yukle() == 2
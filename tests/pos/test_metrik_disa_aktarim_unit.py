@@ -0,0 +1,114 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_metrik_disa_aktarim_unit
+# Description: Metrik kaydı ve yerel metrik sunucusu birim testleri
+# Changelog:
+# - İlk oluşturma
+# - NaN ve sonsuz gösterge değerlerinin yazımı testi
+
+"""
+Metrik Dışa Aktarım Birim Testleri
+
+Sayaç/gösterge/histogram metin formatını, POS monitoring toplayıcısının
+log-lineer kovaları dışa aktarım sınırlarına toplamasını ve HTTP
+sunucusunun /metrics yanıtını doğrular.
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sontechsp.uygulama.cekirdek.metrikler import MetrikKaydi
+from sontechsp.uygulama.moduller.pos.metrik_sunucusu import MetrikSunucusu
+from sontechsp.uygulama.moduller.pos.monitoring import POSMonitoring
+
+
+class TestMetrikKaydi:
+    """Metin formatı testleri"""
+
+    def test_sayac_gosterge_ve_histogram_metni(self):
+        kayit = MetrikKaydi()
+        sayac = kayit.sayac('test_islem_total', 'İşlemler', ('sonuc',))
+        sayac.arttir('basarili', miktar=3)
+        sayac.arttir('hata "ağ"')
+        kayit.gosterge('test_kuyruk', 'Kuyruk').ayarla(7)
+        histogram = kayit.histogram('test_sure_saniye', 'Süre', sinirlar=(0.1, 1.0))
+        for sure in (0.05, 0.1, 0.5, 2.0):
+            histogram.gozlemle(sure)
+
+        satirlar = kayit.metin_olustur().splitlines()
+
+        assert '# TYPE test_islem_total counter' in satirlar
+        assert 'test_islem_total{sonuc="basarili"} 3' in satirlar
+        assert 'test_islem_total{sonuc="hata \\"ağ\\""} 1' in satirlar
+        assert 'test_kuyruk 7' in satirlar
+        assert 'test_sure_saniye_bucket{le="0.1"} 2' in satirlar
+        assert 'test_sure_saniye_bucket{le="1"} 3' in satirlar
+        assert 'test_sure_saniye_bucket{le="+Inf"} 4' in satirlar
+        assert 'test_sure_saniye_count 4' in satirlar
+        assert 'test_sure_saniye_sum 2.65' in satirlar
+
+    def test_nan_ve_sonsuz_degerler_prometheus_yazimiyla_uretilir(self):
+        kayit = MetrikKaydi()
+        kayit.gosterge('test_oran', 'Oran').ayarla(float('nan'))
+        kayit.gosterge('test_alt_sinir', 'Alt sınır').ayarla(float('-inf'))
+
+        satirlar = kayit.metin_olustur().splitlines()
+
+        assert 'test_oran NaN' in satirlar
+        assert 'test_alt_sinir -Inf' in satirlar
+
+    def test_ayni_ad_ayni_metrigi_dondurur_farkli_etiket_reddedilir(self):
+        kayit = MetrikKaydi()
+        assert kayit.sayac('a_total', 'A', ('x',)) is kayit.sayac('a_total', 'A', ('x',))
+        with pytest.raises(ValueError):
+            kayit.sayac('a_total', 'A', ('y',))
+        with pytest.raises(ValueError):
+            kayit.sayac('a_total', 'A', ('x',)).arttir()
+
+    def test_pos_histogrami_disa_aktarim_sinirlarina_toplanir(self):
+        monitoring = POSMonitoring()
+        for sure in (0.0004, 0.003, 0.003, 0.2):
+            monitoring.sure_kaydet('sepet_barkod_ekleme', sure)
+        monitoring.sure_kaydet('sepet_barkod_ekleme', 40.0, basarili=False)
+
+        kayit = MetrikKaydi()
+        kayit.toplayici_ekle(monitoring.metrik_aileleri)
+        satirlar = kayit.metin_olustur().splitlines()
+
+        etiket = 'islem="sepet_barkod_ekleme"'
+        assert f'sontechsp_pos_islem_sure_saniye_bucket{{{etiket},le="0.001"}} 1' in satirlar
+        assert f'sontechsp_pos_islem_sure_saniye_bucket{{{etiket},le="0.005"}} 3' in satirlar
+        assert f'sontechsp_pos_islem_sure_saniye_bucket{{{etiket},le="0.25"}} 4' in satirlar
+        assert f'sontechsp_pos_islem_sure_saniye_bucket{{{etiket},le="30"}} 4' in satirlar
+        assert f'sontechsp_pos_islem_sure_saniye_count{{{etiket}}} 5' in satirlar
+        assert f'sontechsp_pos_islem_hata_total{{{etiket}}} 1' in satirlar
+
+    def test_hatali_toplayici_digerlerini_engellemez(self):
+        kayit = MetrikKaydi()
+        kayit.gosterge('saglam', 'Sağlam').ayarla(1)
+        kayit.toplayici_ekle(lambda: 1 / 0)
+
+        assert 'saglam 1' in kayit.metin_olustur().splitlines()
+
+
+class TestMetrikSunucusu:
+    """HTTP sunucusu testleri"""
+
+    def test_metrics_uc_noktasi(self):
+        kayit = MetrikKaydi()
+        kayit.sayac('test_istek_total', 'İstekler').arttir()
+        sunucu = MetrikSunucusu(kayit, port=0)
+        try:
+            adres = f"http://127.0.0.1:{sunucu.port}"
+            with urllib.request.urlopen(f"{adres}/metrics", timeout=5) as yanit:
+                assert yanit.status == 200
+                assert yanit.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                assert 'test_istek_total 1' in yanit.read().decode('utf-8')
+
+            with pytest.raises(urllib.error.HTTPError) as hata:
+                urllib.request.urlopen(f"{adres}/baska", timeout=5)
+            assert hata.value.code == 404
+        finally:
+            sunucu.kapat()
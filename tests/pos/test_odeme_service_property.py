@@ -1,9 +1,13 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_odeme_service_property
 # Description: OdemeService özellik tabanlı testleri
 # Changelog:
 # - İlk oluşturma
+# - Stok düşümü toplu çağrıya göre güncellendi
+# - Servis mağaza bilgisiyle kuruluyor
+# - Tutar kontrolü sepet toplamlarından; ödeme bilgisi kuruşa yuvarlanıyor
+# - Satış tamamlama tek transaction oturumuyla ve giden olay deposuyla kuruluyor
 
 """
 OdemeService Özellik Tabanlı Testleri
@@ -14,13 +18,14 @@ Hypothesis kütüphanesi kullanılarak rastgele verilerle test edilir.
 
 import pytest
 from decimal import Decimal
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 from hypothesis import given, strategies as st, assume, settings
 
 from sontechsp.uygulama.moduller.pos.servisler.odeme_service import (
     OdemeService, OdemeHatasi
 )
 from sontechsp.uygulama.moduller.pos.arayuzler import SepetDurum, OdemeTuru
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import SepetToplamOzeti, tutar_yuvarla
 from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi, SontechHatasi
 
 
@@ -38,7 +43,10 @@ class TestOdemeServicePropertyTests:
         self.odeme_service = OdemeService(
             sepet_repository=self.mock_sepet_repository,
             satis_repository=self.mock_satis_repository,
-            stok_service=self.mock_stok_service
+            stok_service=self.mock_stok_service,
+            magaza_id=1,
+            giden_olay_repository=Mock(),
+            oturum_saglayici=MagicMock()
         )
     
     def teardown_method(self):
@@ -87,7 +95,7 @@ class TestOdemeServicePropertyTests:
         self.mock_satis_repository.satis_odeme_ekle.return_value = 1
         self.mock_satis_repository.satis_tamamla.return_value = True
         self.mock_sepet_repository.sepet_durum_guncelle.return_value = True
-        self.mock_stok_service.stok_dusur.return_value = True
+        self.mock_stok_service.toplu_stok_dusur.return_value = True
         
         # Act
         sonuc = self.odeme_service.tek_odeme_yap(sepet_id, odeme_turu, toplam_tutar)
@@ -101,25 +109,30 @@ class TestOdemeServicePropertyTests:
             sepet_id=sepet_id,
             terminal_id=terminal_id,
             kasiyer_id=kasiyer_id,
-            toplam_tutar=toplam_tutar
+            toplam_tutar=toplam_tutar,
+            session=ANY
         )
         
         # 3. Ödeme kaydı eklenmiş olmalı
         self.mock_satis_repository.satis_odeme_ekle.assert_called_with(
             satis_id=1,
             odeme_turu=odeme_turu,
-            tutar=toplam_tutar
+            tutar=toplam_tutar,
+            referans_no=None,
+            session=ANY
         )
         
         # 4. Stok düşümü yapılmış olmalı
-        self.mock_stok_service.stok_dusur.assert_called_with(1, 2)
+        self.mock_stok_service.toplu_stok_dusur.assert_called_with(
+            mock_sepet['satirlar'], referans_no="POS_1", magaza_id=1, depo_id=None, session=ANY
+        )
         
         # 5. Satış tamamlanmış olmalı
         self.mock_satis_repository.satis_tamamla.assert_called()
         
         # 6. Sepet durumu güncellenmiş olmalı
         self.mock_sepet_repository.sepet_durum_guncelle.assert_called_with(
-            sepet_id, SepetDurum.TAMAMLANDI
+            sepet_id, SepetDurum.TAMAMLANDI, session=ANY
         )
     
     @given(
@@ -165,7 +178,7 @@ class TestOdemeServicePropertyTests:
         self.mock_satis_repository.satis_olustur.assert_not_called()
         
         # Stok düşümü yapılmamalı
-        self.mock_stok_service.stok_dusur.assert_not_called()
+        self.mock_stok_service.toplu_stok_dusur.assert_not_called()
     
     @given(
         sepet_id=st.integers(min_value=1, max_value=10000),
@@ -253,18 +266,16 @@ class TestOdemeServicePropertyTests:
         Herhangi bir ödeme tutarı için, kontrol sonucu doğru olmalı
         """
         # Arrange
-        mock_sepet = {
-            'id': sepet_id,
-            'toplam_tutar': float(toplam_tutar),
-            'net_tutar': float(toplam_tutar),
-            'satirlar': []
-        }
-        
-        self.mock_sepet_repository.sepet_getir.return_value = mock_sepet
+        self.mock_sepet_repository.sepet_toplamlari.return_value = SepetToplamOzeti(
+            brut_toplam=toplam_tutar, indirim_tutari=Decimal('0.00'), net_tutar=toplam_tutar
+        )
         
         # Act
         sonuc = self.odeme_service.odeme_tutari_kontrol(sepet_id, odeme_tutari)
         
+        # Sepet satırları okunmamalı
+        self.mock_sepet_repository.sepet_getir.assert_not_called()
+        
         # Assert
         assert 'gecerli' in sonuc
         assert 'mesaj' in sonuc
@@ -294,7 +305,10 @@ class TestOdemeServiceValidasyonTests:
         self.odeme_service = OdemeService(
             sepet_repository=self.mock_sepet_repository,
             satis_repository=self.mock_satis_repository,
-            stok_service=self.mock_stok_service
+            stok_service=self.mock_stok_service,
+            magaza_id=1,
+            giden_olay_repository=Mock(),
+            oturum_saglayici=MagicMock()
         )
     
     def teardown_method(self):
@@ -397,7 +411,10 @@ class TestOdemeServiceEntegrasyonTests:
         self.odeme_service = OdemeService(
             sepet_repository=self.mock_sepet_repository,
             satis_repository=self.mock_satis_repository,
-            stok_service=self.mock_stok_service
+            stok_service=self.mock_stok_service,
+            magaza_id=1,
+            giden_olay_repository=Mock(),
+            oturum_saglayici=MagicMock()
         )
     
     def teardown_method(self):
@@ -437,8 +454,8 @@ class TestOdemeServiceEntegrasyonTests:
         # Assert
         assert bilgi['sepet_id'] == sepet_id
         assert bilgi['toplam_tutar'] == float(toplam_tutar)
-        assert bilgi['indirim_tutari'] == float(indirim_tutari)
-        assert bilgi['net_tutar'] == float(toplam_tutar - indirim_tutari)
+        assert bilgi['indirim_tutari'] == float(tutar_yuvarla(indirim_tutari))
+        assert bilgi['net_tutar'] == float(toplam_tutar - tutar_yuvarla(indirim_tutari))
         assert bilgi['satir_sayisi'] == 2
         assert bilgi['durum'] == SepetDurum.AKTIF.value
     
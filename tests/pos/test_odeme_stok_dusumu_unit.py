@@ -0,0 +1,190 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_odeme_stok_dusumu_unit
+# Description: Ödeme sonrası stok düşümü uçtan uca birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Satış öncesi sepet stok kontrolü testi
+# - Tek transaction satış tamamlama ve giden olay (outbox) testleri
+
+"""
+Ödeme Sonrası Stok Düşümü Birim Testleri
+
+OdemeService'i gerçek POS StokService, StokEntegrasyonService ve stok
+repository'leriyle offline (SQLite) veritabanı üzerinde çalıştırır; sepet
+satırlarının mağaza bilgisi taşımadığı gerçek akışı doğrular. Satış
+tamamlama transaction'ı aynı veritabanında açılır; stok düşümü ve giden
+olaylar tek commit'te yazılır.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import sontechsp.uygulama.veritabani.modeller  # noqa: F401 - FK hedefleri metadata'ya yüklenir
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, StokHareket
+from sontechsp.uygulama.moduller.pos.arayuzler import GidenOlayHedef, OdemeTuru, SepetDurum
+from sontechsp.uygulama.moduller.pos.database.models.giden_olay import GidenOlay
+from sontechsp.uygulama.moduller.pos.monitoring import get_pos_monitoring
+from sontechsp.uygulama.moduller.pos.repositories.giden_olay_repository import GidenOlayRepository
+from sontechsp.uygulama.moduller.pos.servisler.odeme_service import OdemeService
+from sontechsp.uygulama.moduller.pos.servisler.stok_service import StokService
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_hareket_repository import StokHareketRepository
+from sontechsp.uygulama.moduller.stok.servisler.stok_entegrasyon_service import StokEntegrasyonService
+from sontechsp.uygulama.moduller.stok.servisler.stok_hareket_service import StokHareketService
+from sontechsp.uygulama.cekirdek.hatalar import EntegrasyonHatasi, StokHatasi, VeritabaniHatasi
+
+
+@pytest.fixture
+def engine():
+    """Mağaza 3'te stoklu SQLite bellek veritabanı"""
+    engine = create_engine("sqlite://")
+    StokBakiye.metadata.create_all(
+        engine, tables=[StokBakiye.__table__, StokHareket.__table__, GidenOlay.__table__]
+    )
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(StokBakiye.__table__), [
+            {'urun_id': urun_id, 'magaza_id': 3, 'depo_id': None, 'miktar': Decimal('10'),
+             'rezerve_miktar': Decimal('0'), 'kullanilabilir_miktar': Decimal('10')}
+            for urun_id in (1, 2)
+        ])
+    return engine
+
+
+@pytest.fixture
+def stok_service(engine):
+    """Gerçek repository'lerle kurulmuş POS stok servisi"""
+    bakiye_repo = StokBakiyeRepository()
+    hareket_repo = StokHareketRepository(bakiye_repository=bakiye_repo)
+    for repo in (bakiye_repo, hareket_repo):
+        repo.db = Mock()
+        repo.db.oturum_olustur.side_effect = sessionmaker(bind=engine)
+
+    entegrasyon = StokEntegrasyonService(
+        StokHareketService(hareket_repo, bakiye_repo), bakiye_repo, Mock()
+    )
+    yield StokService(entegrasyon, Mock(), Mock(), bakiye_repo)
+    entegrasyon.kapat()
+
+
+def _sepet() -> dict:
+    """SepetRepository.sepet_getir biçiminde, mağaza bilgisi olmayan sepet"""
+    return {
+        'id': 7, 'terminal_id': 1, 'kasiyer_id': 1, 'durum': SepetDurum.AKTIF.value,
+        'toplam_tutar': 25.0, 'indirim_tutari': 0.0, 'net_tutar': 25.0,
+        'satirlar': [
+            {'id': 1, 'urun_id': 1, 'barkod': '111', 'urun_adi': 'Ürün 1', 'adet': 2,
+             'birim_fiyat': 5.0, 'indirim_tutari': 0.0, 'toplam_tutar': 10.0},
+            {'id': 2, 'urun_id': 2, 'barkod': '222', 'urun_adi': 'Ürün 2', 'adet': 3,
+             'birim_fiyat': 5.0, 'indirim_tutari': 0.0, 'toplam_tutar': 15.0},
+        ]
+    }
+
+
+def _odeme_servisi(stok_service, engine, sepet=None, **kwargs) -> OdemeService:
+    sepet_repository = Mock(spec=['sepet_getir', 'sepet_durum_guncelle'])
+    sepet_repository.sepet_getir.return_value = sepet or _sepet()
+    satis_repository = Mock()
+    satis_repository.satis_olustur.return_value = 42
+    kwargs.setdefault('giden_olay_repository', GidenOlayRepository())
+    return OdemeService(sepet_repository=sepet_repository, satis_repository=satis_repository,
+                        stok_service=stok_service, oturum_saglayici=sessionmaker(bind=engine).begin,
+                        **kwargs)
+
+
+def _giden_olay_sayisi(engine) -> int:
+    with engine.connect() as baglanti:
+        return baglanti.execute(select(func.count()).select_from(GidenOlay.__table__)).scalar()
+
+
+def _bakiyeler(engine) -> dict:
+    tablo = StokBakiye.__table__
+    with engine.connect() as baglanti:
+        return {satir.urun_id: satir.miktar for satir in baglanti.execute(select(tablo))}
+
+
+class TestOdemeStokDusumu:
+    """Ödeme sonrası gerçek stok düşümü testleri"""
+
+    def test_terminal_magazasindan_stok_duser(self, stok_service, engine):
+        """Sepet satırları mağaza taşımasa da terminal mağazasından düşülmeli"""
+        servis = _odeme_servisi(stok_service, engine, magaza_id=3)
+
+        assert servis.tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('25.00')) is True
+        assert _bakiyeler(engine) == {1: Decimal('8'), 2: Decimal('7')}
+
+    def test_magaza_belirlenemezse_hata_verir(self, stok_service, engine):
+        """Mağaza bilgisi yoksa düşüm sessizce atlanmamalı"""
+        servis = _odeme_servisi(stok_service, engine)
+
+        with pytest.raises(EntegrasyonHatasi):
+            servis.tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('25.00'))
+        assert _bakiyeler(engine) == {1: Decimal('10'), 2: Decimal('10')}
+
+    def test_yetersiz_stokta_satis_olusturulmaz(self, stok_service, engine):
+        """Aynı ürünün satırları toplanarak kontrol edilmeli, satış kaydı açılmamalı"""
+        sepet = _sepet()
+        sepet['satirlar'].append(dict(sepet['satirlar'][1], id=3, adet=8, toplam_tutar=40.0))
+        sepet['toplam_tutar'] = sepet['net_tutar'] = 65.0
+        servis = _odeme_servisi(stok_service, engine, sepet=sepet, magaza_id=3)
+
+        with pytest.raises(StokHatasi):
+            servis.tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('65.00'))
+
+        servis._satis_repository.satis_olustur.assert_not_called()
+        assert _bakiyeler(engine) == {1: Decimal('10'), 2: Decimal('10')}
+
+
+class TestSatisTamamlamaTransaction:
+    """Tek transaction satış tamamlama testleri"""
+
+    def test_tek_commit_ve_giden_olaylar(self, stok_service, engine):
+        """Stok düşümü, sepet durumu ve outbox tek commit'te yazılmalı"""
+        servis = _odeme_servisi(stok_service, engine, magaza_id=3)
+        # Transaction öncesi okuma (stok kontrolü) sayıma girmesin
+        stok_service.toplu_stok_kontrol = Mock(return_value={1: True, 2: True})
+        commitler = []
+        event.listen(engine, 'commit', lambda baglanti: commitler.append(baglanti))
+
+        assert servis.tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('25.00')) is True
+
+        assert len(commitler) == 1
+        assert _bakiyeler(engine) == {1: Decimal('8'), 2: Decimal('7')}
+        oturum = servis._satis_repository.satis_olustur.call_args.kwargs['session']
+        servis._sepet_repository.sepet_durum_guncelle.assert_called_once_with(
+            7, SepetDurum.TAMAMLANDI, session=oturum
+        )
+
+        olaylar = GidenOlayRepository(sessionmaker(bind=engine).begin).bekleyenleri_al(GidenOlayHedef.EBELGE)
+        assert [olay['satis_id'] for olay in olaylar] == [42]
+        assert olaylar[0]['veri']['net_tutar'] == '25.00'
+        assert _giden_olay_sayisi(engine) == len(GidenOlayHedef)
+
+    def test_giden_olay_hatasinda_stok_geri_alinir(self, stok_service, engine):
+        """Son aşama hata verirse önceki aşamaların yazdıkları kalıcı olmamalı"""
+        giden_olaylar = Mock()
+        giden_olaylar.olaylari_ekle.side_effect = VeritabaniHatasi("outbox yazılamadı")
+        servis = _odeme_servisi(stok_service, engine, magaza_id=3, giden_olay_repository=giden_olaylar)
+
+        with pytest.raises(VeritabaniHatasi):
+            servis.tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('25.00'))
+
+        assert _bakiyeler(engine) == {1: Decimal('10'), 2: Decimal('10')}
+        assert _giden_olay_sayisi(engine) == 0
+
+    def test_asama_sureleri_monitoringe_yazilir(self, stok_service, engine):
+        """Her aşamanın süresi satis_tamamlama.<aşama> olarak kaydedilmeli"""
+        monitoring = get_pos_monitoring()
+        asamalar = ('satis', 'odemeler', 'stok_dusumu', 'giden_olaylar', 'commit')
+        onceki = {asama: monitoring.islem_istatistikleri(f"satis_tamamlama.{asama}").get('toplam_islem', 0)
+                  for asama in asamalar}
+
+        _odeme_servisi(stok_service, engine, magaza_id=3).tek_odeme_yap(7, OdemeTuru.NAKIT, Decimal('25.00'))
+
+        for asama in asamalar:
+            istatistik = monitoring.islem_istatistikleri(f"satis_tamamlama.{asama}")
+            assert istatistik['toplam_islem'] == onceki[asama] + 1
@@ -1,9 +1,11 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_offline_kuyruk_repository_unit
 # Description: OfflineKuyrukRepository birim testleri
 # Changelog:
 # - İlk oluşturma
+# - Toplu sahiplenme ve toplu onay testleri (bellek içi SQLite)
+# - Gönderilmeyen sahiplenmeyi bırakma testi
 
 """
 OfflineKuyrukRepository Birim Testleri
@@ -12,12 +14,17 @@ Bu modül OfflineKuyrukRepository kuyruk testlerini içerir.
 """
 
 import pytest
+from contextlib import contextmanager
 from decimal import Decimal
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
 from sontechsp.uygulama.moduller.pos.repositories.offline_kuyruk_repository import OfflineKuyrukRepository
 from sontechsp.uygulama.moduller.pos.arayuzler import IslemTuru, KuyrukDurum
+from sontechsp.uygulama.moduller.pos.database.models.offline_kuyruk import OfflineKuyruk
 from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi, SontechHatasi, VeritabaniHatasi
 
 
@@ -449,4 +456,111 @@ class TestOfflineKuyrukRepository:
         args = mock_kuyruk_ekle.call_args[0]
         assert args[0] == IslemTuru.STOK_DUSUMU
         assert args[2] == terminal_id
-        assert args[3] == kasiyer_id
\ No newline at end of file
+        assert args[3] == kasiyer_id
+
+
+class TestOfflineKuyrukTopluSenkronizasyon:
+    """Toplu sahiplenme ve toplu onay testleri (bellek içi SQLite)"""
+    
+    def setup_method(self):
+        """Her test öncesi boş kuyruk tablosu kurar"""
+        engine = create_engine("sqlite://")
+        self.tablo = OfflineKuyruk.__table__
+        self.tablo.create(engine)
+        self.oturum_fabrikasi = sessionmaker(bind=engine)
+        
+        @contextmanager
+        def sqlite_session():
+            oturum = self.oturum_fabrikasi()
+            try:
+                yield oturum
+            finally:
+                oturum.close()
+        
+        self.yama = patch(
+            'sontechsp.uygulama.moduller.pos.repositories.offline_kuyruk_repository.'
+            'senkronizasyon.sqlite_session', sqlite_session
+        )
+        self.yama.start()
+        self.repository = OfflineKuyrukRepository()
+    
+    def teardown_method(self):
+        self.yama.stop()
+    
+    def _kayitlar_ekle(self, kayitlar):
+        with self.oturum_fabrikasi() as oturum:
+            oturum.execute(insert(self.tablo), [{
+                'islem_turu': IslemTuru.SATIS, 'durum': KuyrukDurum.BEKLEMEDE,
+                'veri': {'sira': i}, 'terminal_id': 1, 'kasiyer_id': 1,
+                'islem_tarihi': datetime(2026, 10, 17, 9, 0, i), 'deneme_sayisi': 0,
+                'max_deneme_sayisi': 3, 'oncelik': 1, **kayit
+            } for i, kayit in enumerate(kayitlar)])
+            oturum.commit()
+    
+    def _durumlar(self):
+        with self.oturum_fabrikasi() as oturum:
+            return {satir.id: (satir.durum, satir.deneme_sayisi) for satir in oturum.execute(
+                select(self.tablo.c.id, self.tablo.c.durum, self.tablo.c.deneme_sayisi)
+            )}
+    
+    def test_sahiplenme_oncelik_sirasiyla_ve_tek_seferde(self):
+        """Sahiplenilen kayıtlar ISLENIYOR olur ve tekrar sahiplenilmez"""
+        self._kayitlar_ekle([{'oncelik': 3}, {'oncelik': 1}, {'oncelik': 2}, {}])
+        
+        ilk = self.repository.bekleyenleri_sahiplen(limit=3)
+        ikinci = self.repository.bekleyenleri_sahiplen(limit=3)
+        
+        assert [kayit['id'] for kayit in ilk] == [2, 4, 3]
+        assert all(kayit['durum'] == KuyrukDurum.ISLENIYOR.value for kayit in ilk)
+        assert [kayit['id'] for kayit in ikinci] == [1]
+        assert self.repository.bekleyenleri_sahiplen(limit=3) == []
+    
+    def test_toplu_onay_ve_deneme_artirma(self):
+        """Tamamlananlar ve başarısızlar tek UPDATE'lerle yazılır"""
+        self._kayitlar_ekle([{}, {}, {'deneme_sayisi': 2}])
+        idler = [kayit['id'] for kayit in self.repository.bekleyenleri_sahiplen(limit=10)]
+        
+        assert self.repository.toplu_tamamla(idler[:1]) == 1
+        assert self.repository.toplu_deneme_artir(idler[1:], "Ağ hatası") == 2
+        
+        assert self._durumlar() == {
+            1: (KuyrukDurum.TAMAMLANDI, 0),
+            2: (KuyrukDurum.BEKLEMEDE, 1),
+            3: (KuyrukDurum.HATA, 3),
+        }
+    
+    def test_ayni_turda_denenen_kayit_yeniden_sahiplenilmez(self):
+        """son_deneme_oncesi verilince bu turda denenmiş kayıt atlanır"""
+        self._kayitlar_ekle([{}, {}])
+        tur_baslangici = datetime.now()
+        ilk = self.repository.bekleyenleri_sahiplen(limit=1, son_deneme_oncesi=tur_baslangici)
+        self.repository.toplu_deneme_artir([ilk[0]['id']], "Ağ hatası")
+        
+        ikinci = self.repository.bekleyenleri_sahiplen(limit=10, son_deneme_oncesi=tur_baslangici)
+        
+        assert [kayit['id'] for kayit in ikinci] == [2]
+    
+    def test_sahipsiz_islemler_geri_alinir(self):
+        """Yarıda kalmış sahiplenmeler BEKLEMEDE'ye döner"""
+        self._kayitlar_ekle([{}, {}])
+        self.repository.bekleyenleri_sahiplen(limit=10)
+        
+        assert self.repository.sahipsiz_islemleri_geri_al(3600) == 0
+        assert self.repository.sahipsiz_islemleri_geri_al(-1) == 2
+        assert {durum for durum, _ in self._durumlar().values()} == {KuyrukDurum.BEKLEMEDE}
+    
+    def test_gonderilmeyen_sahiplenme_deneme_sayilmadan_birakilir(self):
+        """Bırakılan kayıt BEKLEMEDE'ye döner, aynı turda yeniden sahiplenilmez"""
+        self._kayitlar_ekle([{}, {}])
+        tur_baslangici = datetime.now()
+        idler = [kayit['id'] for kayit in
+                 self.repository.bekleyenleri_sahiplen(limit=10, son_deneme_oncesi=tur_baslangici)]
+        self.repository.toplu_tamamla(idler[:1])
+        
+        assert self.repository.sahiplenmeyi_birak(idler) == 1
+        assert self._durumlar() == {
+            1: (KuyrukDurum.TAMAMLANDI, 0),
+            2: (KuyrukDurum.BEKLEMEDE, 0),
+        }
+        assert self.repository.bekleyenleri_sahiplen(limit=10, son_deneme_oncesi=tur_baslangici) == []
+        assert [kayit['id'] for kayit in self.repository.bekleyenleri_sahiplen(limit=10)] == [2]
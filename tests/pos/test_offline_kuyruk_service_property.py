@@ -1,9 +1,12 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_offline_kuyruk_service_property
 # Description: OfflineKuyrukService özellik tabanlı testleri
 # Changelog:
 # - İlk oluşturma
+# - Senkronizasyon testleri toplu sahiplen/onayla protokolüne göre güncellendi
+# - Network cache testi bağlantı izleyicisine göre güncellendi
+# - Batch uyarlama testleri senkronizasyon işçisine taşındı, geri basınç testi eklendi
 
 """
 OfflineKuyrukService Özellik Tabanlı Testleri
@@ -21,6 +24,7 @@ import hypothesis.strategies as st
 from hypothesis import given, assume, settings
 
 from sontechsp.uygulama.moduller.pos.services.offline_kuyruk_service import OfflineKuyrukService
+from sontechsp.uygulama.moduller.pos.baglanti_izleyici import BaglantiIzleyici
 from sontechsp.uygulama.moduller.pos.arayuzler import (
     IOfflineKuyrukRepository, IslemTuru, KuyrukDurum
 )
@@ -94,7 +98,9 @@ class TestOfflineKuyrukServiceProperty:
     def setup_method(self):
         """Her test öncesi çalışır"""
         self.mock_repo = Mock(spec=IOfflineKuyrukRepository)
-        self.service = OfflineKuyrukService(self.mock_repo)
+        izleyici = BaglantiIzleyici(Mock(return_value=False), arka_planda=False)
+        self.service = OfflineKuyrukService(self.mock_repo, izleyici,
+                                            arka_planda_senkronize=False)
     
     @given(
         islem_turu=islem_turu_strategy(),
@@ -117,56 +123,54 @@ class TestOfflineKuyrukServiceProperty:
         kuyruk_id = 123
         self.mock_repo.kuyruk_ekle.return_value = kuyruk_id
         
-        # Network durumu mock'u - önce offline, sonra online
+        # Satış ağ durumuna bakmaz; senkronizasyon sırasında online
         with patch.object(self.service, 'network_durumu_kontrol') as mock_network:
-            with patch.object(self.service, '_islem_direkt_gonder') as mock_direkt:
-                # İlk çağrıda offline (False), sonraki çağrılarda online (True)
-                mock_network.side_effect = [False, True, True, True]
-                mock_direkt.return_value = False  # Direkt gönderim başarısız
+            mock_network.return_value = True
+            
+            # Bekleyen kuyruk listesi mock'u
+            kuyruk_kaydi = {
+                'id': kuyruk_id,
+                'islem_turu': islem_turu.value,
+                'durum': KuyrukDurum.BEKLEMEDE.value,
+                'veri': veri,
+                'terminal_id': terminal_id,
+                'kasiyer_id': kasiyer_id
+            }
+            
+            # İlk sahiplenmede kayıt var, ikincide boş liste
+            self.mock_repo.sahipsiz_islemleri_geri_al.return_value = 0
+            self.mock_repo.bekleyenleri_sahiplen.side_effect = [
+                [kuyruk_kaydi],  # İlk batch
+                []  # İkinci batch - boş
+            ]
+            
+            # Kuyruk işlemi gönderimi başarılı
+            with patch.object(self.service, '_kuyruk_islemini_gonder') as mock_gonder:
+                mock_gonder.return_value = True
+                
+                # Act - İşlemi kuyruğa ekle
+                result = self.service.islem_kuyruga_ekle(
+                    islem_turu, veri, terminal_id, kasiyer_id, oncelik
+                )
+                
+                # Assert - Kuyruk ekleme başarılı
+                assert result is True
+                self.mock_repo.kuyruk_ekle.assert_called_once()
+                
+                # Act - Senkronizasyon yap (online durumda)
+                islenen_sayisi = self.service.kuyruk_senkronize_et()
                 
-                # Bekleyen kuyruk listesi mock'u
-                kuyruk_kaydi = {
-                    'id': kuyruk_id,
-                    'islem_turu': islem_turu.value,
-                    'durum': KuyrukDurum.BEKLEMEDE.value,
-                    'veri': veri,
-                    'terminal_id': terminal_id,
-                    'kasiyer_id': kasiyer_id
-                }
+                # Assert - Senkronizasyon özellikleri
+                assert islenen_sayisi >= 0  # En az 0 işlem işlenmeli
                 
-                # İlk çağrıda kayıt var, ikinci çağrıda boş liste
-                self.mock_repo.bekleyen_kuyruk_listesi.side_effect = [
-                    [kuyruk_kaydi],  # İlk batch
-                    []  # İkinci batch - boş
-                ]
+                # Bekleyen kayıtlar sahiplenildi
+                assert self.mock_repo.bekleyenleri_sahiplen.call_count >= 1
                 
-                # Kuyruk işlemi gönderimi başarılı
-                with patch.object(self.service, '_kuyruk_islemini_gonder') as mock_gonder:
-                    mock_gonder.return_value = True
-                    
-                    # Act - İşlemi kuyruğa ekle (offline durumda)
-                    result = self.service.islem_kuyruga_ekle(
-                        islem_turu, veri, terminal_id, kasiyer_id, oncelik
-                    )
-                    
-                    # Assert - Kuyruk ekleme başarılı
-                    assert result is True
-                    self.mock_repo.kuyruk_ekle.assert_called_once()
-                    
-                    # Act - Senkronizasyon yap (online durumda)
-                    islenen_sayisi = self.service.kuyruk_senkronize_et()
-                    
-                    # Assert - Senkronizasyon özellikleri
-                    assert islenen_sayisi >= 0  # En az 0 işlem işlenmeli
-                    
-                    # Bekleyen kuyruk listesi çağrıldı
-                    assert self.mock_repo.bekleyen_kuyruk_listesi.call_count >= 1
-                    
-                    # Durum güncellemeleri yapıldı
-                    assert self.mock_repo.kuyruk_durum_guncelle.call_count >= 1
-                    
-                    # İşlem gönderildi
-                    mock_gonder.assert_called_once_with(kuyruk_kaydi)
+                # Başarılı kayıt toplu onaylandı
+                self.mock_repo.toplu_tamamla.assert_called_once_with([kuyruk_id])
+                
+                # İşlem gönderildi
+                mock_gonder.assert_called_once_with(kuyruk_kaydi)
     
     @given(
         islem_turu=islem_turu_strategy(),
@@ -191,53 +195,50 @@ class TestOfflineKuyrukServiceProperty:
         with patch.object(self.service, 'network_durumu_kontrol') as mock_network:
             mock_network.return_value = True
             
-            # Direkt gönderim başarısız
-            with patch.object(self.service, '_islem_direkt_gonder') as mock_direkt:
-                mock_direkt.return_value = False
+            # Bekleyen kuyruk listesi - hatalı işlem
+            kuyruk_kaydi = {
+                'id': kuyruk_id,
+                'islem_turu': islem_turu.value,
+                'durum': KuyrukDurum.BEKLEMEDE.value,
+                'veri': veri,
+                'terminal_id': terminal_id,
+                'kasiyer_id': kasiyer_id,
+                'deneme_sayisi': 0,
+                'max_deneme_sayisi': 3
+            }
+            
+            self.mock_repo.sahipsiz_islemleri_geri_al.return_value = 0
+            self.mock_repo.bekleyenleri_sahiplen.side_effect = [
+                [kuyruk_kaydi],  # İlk batch
+                []  # İkinci batch - boş
+            ]
+            
+            # Kuyruk işlemi gönderimi başarısız
+            with patch.object(self.service, '_kuyruk_islemini_gonder') as mock_gonder:
+                mock_gonder.return_value = False  # Hata simülasyonu
+                
+                # Act - İşlemi kuyruğa ekle
+                result = self.service.islem_kuyruga_ekle(
+                    islem_turu, veri, terminal_id, kasiyer_id
+                )
                 
-                # Bekleyen kuyruk listesi - hatalı işlem
-                kuyruk_kaydi = {
-                    'id': kuyruk_id,
-                    'islem_turu': islem_turu.value,
-                    'durum': KuyrukDurum.BEKLEMEDE.value,
-                    'veri': veri,
-                    'terminal_id': terminal_id,
-                    'kasiyer_id': kasiyer_id,
-                    'deneme_sayisi': 0,
-                    'max_deneme_sayisi': 3
-                }
+                # Assert - Kuyruk ekleme başarılı
+                assert result is True
                 
-                self.mock_repo.bekleyen_kuyruk_listesi.side_effect = [
-                    [kuyruk_kaydi],  # İlk batch
-                    []  # İkinci batch - boş
-                ]
+                # Act - Senkronizasyon yap (hata ile)
+                islenen_sayisi = self.service.kuyruk_senkronize_et()
+                
+                # Assert - Hata yönetimi özellikleri
+                assert islenen_sayisi >= 0  # İşlem sayısı geçerli
+                
+                # Hata durumu için toplu deneme artırma çağrıldı
+                self.mock_repo.toplu_deneme_artir.assert_called()
                 
-                # Kuyruk işlemi gönderimi başarısız
-                with patch.object(self.service, '_kuyruk_islemini_gonder') as mock_gonder:
-                    mock_gonder.return_value = False  # Hata simülasyonu
-                    
-                    # Act - İşlemi kuyruğa ekle
-                    result = self.service.islem_kuyruga_ekle(
-                        islem_turu, veri, terminal_id, kasiyer_id
-                    )
-                    
-                    # Assert - Kuyruk ekleme başarılı
-                    assert result is True
-                    
-                    # Act - Senkronizasyon yap (hata ile)
-                    islenen_sayisi = self.service.kuyruk_senkronize_et()
-                    
-                    # Assert - Hata yönetimi özellikleri
-                    assert islenen_sayisi >= 0  # İşlem sayısı geçerli
-                    
-                    # Hata durumu için deneme artırma çağrıldı
-                    self.mock_repo.kuyruk_deneme_artir.assert_called()
-                    
-                    # Deneme artırma çağrısının parametrelerini kontrol et
-                    call_args = self.mock_repo.kuyruk_deneme_artir.call_args
-                    assert call_args[0][0] == kuyruk_id  # İlk parametre kuyruk_id
-                    assert isinstance(call_args[0][1], str)  # İkinci parametre hata mesajı
-                    assert len(call_args[0][1]) > 0  # Hata mesajı boş değil
+                # Deneme artırma çağrısının parametrelerini kontrol et
+                call_args = self.mock_repo.toplu_deneme_artir.call_args
+                assert call_args[0][0] == [kuyruk_id]  # İlk parametre kuyruk ID listesi
+                assert isinstance(call_args[0][1], str)  # İkinci parametre hata mesajı
+                assert len(call_args[0][1]) > 0  # Hata mesajı boş değil
     
     @given(
         network_durumu=st.booleans(),
@@ -246,36 +247,28 @@ class TestOfflineKuyrukServiceProperty:
     @settings(max_examples=100)
     def test_property_network_durumu_cache_tutarliligi(self, network_durumu, islem_sayisi):
         """
-        Herhangi bir network durumu için, cache mekanizması tutarlı çalışmalı
+        Herhangi bir network durumu için, servis izleyicinin son yoklama
+        sonucunu döndürmeli ve kendisi ağ isteği yapmamalı
         """
         # Arrange
-        with patch('socket.gethostbyname') as mock_dns:
-            with patch('requests.get') as mock_http:
-                if network_durumu:
-                    mock_dns.return_value = '8.8.8.8'
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_http.return_value = mock_response
-                else:
-                    mock_dns.side_effect = Exception("Network error")
-                
-                # Act - İlk kontrol
-                ilk_sonuc = self.service.network_durumu_kontrol()
-                
-                # Act - Ardışık kontroller (cache süresi içinde)
-                sonuclar = []
-                for _ in range(min(islem_sayisi, 10)):  # Maksimum 10 kontrol
-                    sonuclar.append(self.service.network_durumu_kontrol())
-                
-                # Assert - Cache tutarlılığı
-                assert ilk_sonuc == network_durumu
-                
-                # Tüm sonuçlar aynı olmalı (cache nedeniyle)
-                for sonuc in sonuclar:
-                    assert sonuc == ilk_sonuc
-                
-                # DNS çağrısı sadece bir kez yapılmalı (cache nedeniyle)
-                assert mock_dns.call_count <= 1
+        yoklayici = Mock(return_value=network_durumu)
+        izleyici = BaglantiIzleyici(yoklayici, arka_planda=False)
+        service = OfflineKuyrukService(self.mock_repo, izleyici)
+        izleyici.simdi_kontrol_et()
+        
+        with patch('socket.create_connection') as mock_baglanti:
+            # Act - Ardışık kontroller
+            ilk_sonuc = service.network_durumu_kontrol()
+            sonuclar = [service.network_durumu_kontrol() for _ in range(min(islem_sayisi, 10))]
+            
+            # Assert - Tutarlılık
+            assert ilk_sonuc == network_durumu
+            for sonuc in sonuclar:
+                assert sonuc == ilk_sonuc
+            
+            # Yoklama yalnızca izleyicide bir kez yapıldı
+            mock_baglanti.assert_not_called()
+            assert yoklayici.call_count == 1
     
     @given(
         terminal_id=pozitif_int_strategy(),
@@ -313,16 +306,17 @@ class TestOfflineKuyrukServiceProperty:
         with patch.object(self.service, 'network_durumu_kontrol') as mock_network:
             mock_network.return_value = True
             
-            # İşlem listesini batch'lere böl
-            batch_boyutu = self.service._senkron_batch_boyutu
-            batches = [islem_listesi[i:i + batch_boyutu] 
-                      for i in range(0, len(islem_listesi), batch_boyutu)]
+            # Sahiplenme mock'u: istenen limit kadar kaydı sırayla verir
+            self.mock_repo.reset_mock()
+            kalan = list(islem_listesi)
             
-            if not batches:
-                batches = [[]]  # Boş liste için boş batch
+            def sahiplen(limit, **kwargs):
+                batch = kalan[:limit]
+                del kalan[:limit]
+                return batch
             
-            # Bekleyen kuyruk listesi mock'u
-            self.mock_repo.bekleyen_kuyruk_listesi.side_effect = batches
+            self.mock_repo.sahipsiz_islemleri_geri_al.return_value = 0
+            self.mock_repo.bekleyenleri_sahiplen.side_effect = sahiplen
             
             # Tüm işlemler başarılı
             with patch.object(self.service, '_kuyruk_islemini_gonder') as mock_gonder:
@@ -332,16 +326,60 @@ class TestOfflineKuyrukServiceProperty:
                 islenen_sayisi = self.service.kuyruk_senkronize_et()
                 
                 # Assert - Batch işleme özellikleri
-                assert islenen_sayisi >= 0
-                assert islenen_sayisi <= len(islem_listesi)
+                assert islenen_sayisi == len(islem_listesi)
                 
-                # Bekleyen kuyruk listesi en az bir kez çağrıldı
-                assert self.mock_repo.bekleyen_kuyruk_listesi.call_count >= 1
+                # Kayıtlar en az bir kez sahiplenildi
+                assert self.mock_repo.bekleyenleri_sahiplen.call_count >= 1
                 
-                # Her batch için limit parametresi doğru
-                for call in self.mock_repo.bekleyen_kuyruk_listesi.call_args_list:
-                    if 'limit' in call.kwargs:
-                        assert call.kwargs['limit'] == batch_boyutu
+                # Batch başına tek toplu onay
+                onaylanan = [kuyruk_id
+                             for call in self.mock_repo.toplu_tamamla.call_args_list
+                             for kuyruk_id in call.args[0]]
+                assert onaylanan == [islem['id'] for islem in islem_listesi]
+                assert self.mock_repo.toplu_tamamla.call_count < max(len(islem_listesi), 2)
+    
+    def test_batch_boyutu_gonderim_suresine_gore_uyarlanir(self):
+        """
+        Hızlı dolu batch'ten sonra boyut büyümeli, yavaş batch'ten sonra küçülmeli
+        """
+        isci = self.service._senkron_iscisi
+        baslangic_boyutu = isci._batch_boyutu
+        
+        isci._batch_boyutunu_ayarla(baslangic_boyutu, 0.01, True)
+        assert isci._batch_boyutu == baslangic_boyutu * 2
+        
+        isci._batch_boyutunu_ayarla(5, 0.01, True)
+        assert isci._batch_boyutu == baslangic_boyutu * 2
+        
+        isci._batch_boyutunu_ayarla(5, isci._hedef_batch_suresi + 1, True)
+        assert isci._batch_boyutu == baslangic_boyutu
+        
+        for _ in range(20):
+            isci._batch_boyutunu_ayarla(1, 0.01, False)
+        assert isci._batch_boyutu == isci._min_batch_boyutu
+    
+    def test_yavas_merkezde_eszamanlilik_duser_ve_geri_basinc_baslar(self):
+        """
+        Yavaş batch'ler eşzamanlılığı düşürmeli; alt sınırda turlar arası
+        bekleme ikiye katlanarak başlamalı, hızlı batch'te sıfırlanmalı
+        """
+        isci = self.service._senkron_iscisi
+        yavas = isci._hedef_batch_suresi + 1
+        
+        while isci._batch_boyutu > isci._min_batch_boyutu or isci._eszamanlilik > 1:
+            isci._batch_boyutunu_ayarla(isci._batch_boyutu, yavas, True)
+            assert isci._geri_basinc_beklemesi == 0
+        
+        isci._batch_boyutunu_ayarla(1, yavas, True)
+        ilk_bekleme = isci._geri_basinc_beklemesi
+        isci._batch_boyutunu_ayarla(1, yavas, True)
+        assert ilk_bekleme > 0
+        assert isci._geri_basinc_beklemesi == ilk_bekleme * 2
+        
+        isci._batch_boyutunu_ayarla(1, 0.01, True)
+        assert isci._geri_basinc_beklemesi == 0
+        assert isci._eszamanlilik == 2
+        assert isci.istatistikler()['batch_boyutu'] == 2
     
     def test_property_network_hatasi_durumunda_senkronizasyon_iptal(self):
         """
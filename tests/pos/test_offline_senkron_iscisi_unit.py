@@ -0,0 +1,80 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_offline_senkron_iscisi_unit
+# Description: Offline senkronizasyon işçisi birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+Offline Senkronizasyon İşçisi Birim Testleri
+
+Arka plan işçisinin uyandırılınca kuyruğu boşalttığını, ilerleme
+metriklerini yayınladığını ve terminalleri paralel, her terminali sıralı
+gönderdiğini doğrular.
+"""
+
+import threading
+from unittest.mock import Mock
+
+from sontechsp.uygulama.moduller.pos.arayuzler import IOfflineKuyrukRepository
+from sontechsp.uygulama.moduller.pos.services.offline_senkron_iscisi import OfflineSenkronIscisi
+
+
+def _kayit(kuyruk_id, terminal_id):
+    return {'id': kuyruk_id, 'islem_turu': 'satis', 'veri': {}, 'terminal_id': terminal_id}
+
+
+def _repo(*batchler):
+    repo = Mock(spec=IOfflineKuyrukRepository)
+    repo.sahipsiz_islemleri_geri_al.return_value = 0
+    repo.bekleyenleri_sahiplen.side_effect = list(batchler) + [[]]
+    return repo
+
+
+class TestOfflineSenkronIscisi:
+    """Senkronizasyon işçisi testleri"""
+
+    def test_arka_plan_iscisi_uyandirilinca_bosaltir_ve_metrik_yayinlar(self):
+        repo = _repo([_kayit(1, 1), _kayit(2, 1)])
+        tur_bitti = threading.Event()
+        turlar = []
+        isci = OfflineSenkronIscisi(repo, gonderici=Mock(return_value=True),
+                                    cevrimici=lambda: True, aralik=60.0)
+        isci.tur_dinleyicisi_ekle(lambda sayi: (turlar.append(sayi), tur_bitti.set()))
+        try:
+            isci.uyandir()
+            assert tur_bitti.wait(2)
+        finally:
+            isci.kapat()
+
+        assert turlar == [2]
+        repo.toplu_tamamla.assert_called_once_with([1, 2])
+        metrikler = isci.istatistikler()
+        assert metrikler['gonderilen_toplam'] == 2
+        assert metrikler['son_tur_islenen'] == 2
+        assert metrikler['calisiyor'] is False
+        assert metrikler['son_tur_zamani'] is not None
+
+    def test_terminaller_paralel_her_terminal_sirali_gonderilir(self):
+        # İki terminalin ilk kayıtları aynı anda gönderimde olmalı
+        bariyer = threading.Barrier(2, timeout=2)
+        kilit = threading.Lock()
+        gonderim_sirasi = {1: [], 2: []}
+
+        def gonder(islem):
+            with kilit:
+                ilk = not gonderim_sirasi[islem['terminal_id']]
+                gonderim_sirasi[islem['terminal_id']].append(islem['id'])
+            if ilk:
+                bariyer.wait()
+            return True
+
+        repo = _repo([_kayit(1, 1), _kayit(2, 2), _kayit(3, 1), _kayit(4, 2), _kayit(5, 1)])
+        isci = OfflineSenkronIscisi(repo, gonderici=gonder, cevrimici=lambda: True,
+                                    azami_eszamanlilik=2, arka_planda=False)
+
+        assert isci.bosalt() == 5
+        isci.kapat()
+
+        assert gonderim_sirasi == {1: [1, 3, 5], 2: [2, 4]}
+        repo.toplu_tamamla.assert_called_once_with([1, 2, 3, 4, 5])
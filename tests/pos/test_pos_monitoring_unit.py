@@ -0,0 +1,117 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_pos_monitoring_unit
+# Description: POS monitoring gecikme histogramı birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+POS Monitoring Birim Testleri
+
+Log-lineer kovaların sınırlarını, yüzdeliklerin göreli hata payını,
+dakikalık kayan pencereyi ve islem_izle decorator'ının kaydını doğrular.
+"""
+
+import pytest
+
+from sontechsp.uygulama.moduller.pos.monitoring import (
+    GecikmeHistogrami, KOVA_SAYISI, POSMonitoring, islem_izle, kova_indeksi,
+    kova_ust_siniri, pos_monitoring_baslat
+)
+
+
+class _Saat:
+    """Elle ilerletilen duvar saati"""
+
+    def __init__(self, zaman: float = 1_800_000_000.0):
+        self.zaman = zaman
+
+    def __call__(self) -> float:
+        return self.zaman
+
+
+class TestGecikmeHistogrami:
+    """Histogram testleri"""
+
+    @pytest.mark.parametrize("sure_us", [0, 1, 31, 32, 33, 1000, 123_456, 5_000_000, 2 ** 36 - 1])
+    def test_deger_kovasinin_icinde_ve_goreli_hata_sinirli(self, sure_us):
+        indeks = kova_indeksi(sure_us)
+
+        assert 0 <= indeks < KOVA_SAYISI
+        assert sure_us <= kova_ust_siniri(indeks) <= sure_us * (1 + 1 / 16)
+        assert indeks == 0 or kova_ust_siniri(indeks - 1) < sure_us
+
+    def test_cok_buyuk_sure_son_kovaya_yazilir(self):
+        assert kova_indeksi(2 ** 50) == KOVA_SAYISI - 1
+
+    def test_yuzdelikler(self):
+        histogram = GecikmeHistogrami()
+        for sure_us in range(1, 10_001):
+            histogram.ekle(sure_us * 100)  # 0.1ms .. 1s
+
+        assert histogram.yuzdelik(0.50) == pytest.approx(500_000, rel=1 / 16)
+        assert histogram.yuzdelik(0.99) == pytest.approx(990_000, rel=1 / 16)
+        assert histogram.yuzdelik(1.0) == histogram.max_us == 1_000_000
+        assert histogram.ozet()['min_sure'] == pytest.approx(0.0001)
+
+
+class TestPOSMonitoring:
+    """Monitoring testleri"""
+
+    def test_performans_raporu_kayan_pencereden_yuzdelik_verir(self):
+        saat = _Saat()
+        monitoring = POSMonitoring(pencere_dakika=60, saat=saat)
+        for _ in range(99):
+            monitoring.sure_kaydet('sepet_barkod_ekleme', 0.002)
+        monitoring.sure_kaydet('sepet_barkod_ekleme', 0.8, basarili=False)
+
+        rapor = monitoring.performans_raporu(5)['islem_detaylari']['sepet_barkod_ekleme']
+        assert (rapor['toplam'], rapor['basarisiz']) == (100, 1)
+        assert rapor['p50_sure'] == pytest.approx(0.002, rel=1 / 16)
+        assert rapor['p99_sure'] == pytest.approx(0.002, rel=1 / 16)
+        assert rapor['max_sure'] == pytest.approx(0.8)
+
+        # 10 dakika sonra yalnızca yeni ölçümler son 5 dakikada görünür
+        saat.zaman += 600
+        monitoring.sure_kaydet('sepet_barkod_ekleme', 0.05)
+        rapor = monitoring.performans_raporu(5)['islem_detaylari']['sepet_barkod_ekleme']
+        assert rapor['toplam'] == 1
+        assert monitoring.performans_raporu(60)['toplam_islem'] == 101
+
+        durum = monitoring.sistem_durumu()
+        assert durum['son_5dk_islem_sayisi'] == 1
+        assert durum['son_5dk_gecikmeler']['sepet_barkod_ekleme']['p99_sure'] == pytest.approx(0.05, rel=1 / 16)
+
+        # Pencere dışına çıkan dilimler düşer, ömür boyu istatistik kalır
+        saat.zaman += 3600
+        assert monitoring.performans_raporu(60)['toplam_islem'] == 0
+        istatistik = monitoring.islem_istatistikleri('sepet_barkod_ekleme')
+        assert (istatistik['toplam_islem'], istatistik['basarisiz_islem']) == (101, 1)
+
+    def test_gunluk_rapor_sayaclari(self):
+        monitoring = POSMonitoring(saat=_Saat())
+        monitoring.sure_kaydet('fis_yazdirma', 0.01)
+        monitoring.sure_kaydet('fis_yazdirma', 0.01, basarili=False)
+
+        rapor = monitoring.gunluk_rapor()
+        assert rapor['toplam_islem'] == 2
+        assert rapor['islem_detaylari']['fis_yazdirma'] == {
+            'toplam': 2, 'basarili': 1, 'basarisiz': 1, 'basari_orani': 50.0
+        }
+
+    def test_islem_izle_basari_ve_hatayi_kaydeder(self):
+        monitoring = pos_monitoring_baslat()
+
+        @islem_izle("test_izlenen_islem")
+        def islem(hata: bool):
+            if hata:
+                raise ValueError("hata")
+            return 42
+
+        assert islem(False) == 42
+        with pytest.raises(ValueError):
+            islem(True)
+
+        istatistik = monitoring.islem_istatistikleri('test_izlenen_islem')
+        assert (istatistik['basarili_islem'], istatistik['basarisiz_islem']) == (1, 1)
+        assert monitoring.aktif_islemler() == []
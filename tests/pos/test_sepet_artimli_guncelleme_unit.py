@@ -0,0 +1,146 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_sepet_artimli_guncelleme_unit
+# Description: Sepet modeli ve sepet tablosunun satır bazlı güncelleme birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Elle düzenlenen Adet hücresinin önbelleğe yansıması testi
+
+"""
+Sepet Artımlı Güncelleme Birim Testleri
+
+Sepet modelinin model sıfırlamak yerine satır ekleme/silme ve hücre
+değişikliği sinyalleri verdiğini, sepet tablosunun ise mevcut hücre
+nesnelerini koruyarak yalnızca değişen satırları yazdığını test eder.
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from sontechsp.uygulama.arayuz.ekranlar.pos.sepet_modeli import SepetModeli, SepetOgesi
+from sontechsp.uygulama.moduller.pos.ui.bilesenler.sepet_tablosu import SepetTablosu
+from sontechsp.uygulama.moduller.pos.ui.handlers.pos_sinyalleri import POSSinyalleri
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def _oge(barkod: str, adet: int = 1, fiyat: str = "10.00") -> SepetOgesi:
+    birim_fiyat = Decimal(fiyat)
+    return SepetOgesi(barkod=barkod, urun_adi=f"Ürün {barkod}", adet=adet,
+                      birim_fiyat=birim_fiyat, toplam_fiyat=birim_fiyat * adet)
+
+
+def _satir(barkod: str, adet: int = 1, fiyat: str = "10.00") -> dict:
+    birim_fiyat = Decimal(fiyat)
+    return {"barkod": barkod, "urun_adi": f"Ürün {barkod}", "adet": adet,
+            "birim_fiyat": birim_fiyat, "toplam_fiyat": birim_fiyat * adet}
+
+
+class TestSepetModeliSinyalleri:
+    """Model sinyal testleri"""
+
+    def _kaydet(self, model: SepetModeli) -> dict:
+        olaylar = {"ekleme": [], "silme": [], "degisim": [], "sifirlama": 0}
+        model.rowsInserted.connect(lambda _, ilk, son: olaylar["ekleme"].append((ilk, son)))
+        model.rowsRemoved.connect(lambda _, ilk, son: olaylar["silme"].append((ilk, son)))
+        model.dataChanged.connect(
+            lambda sol, sag, *_: olaylar["degisim"].append((sol.row(), sol.column(), sag.column()))
+        )
+        model.modelReset.connect(lambda: olaylar.__setitem__("sifirlama", olaylar["sifirlama"] + 1))
+        return olaylar
+
+    def test_adet_degisimi_yalnizca_satir_hucrelerini_bildirir(self, app):
+        model = SepetModeli()
+        model.oge_ekle(_oge("1"))
+        model.oge_ekle(_oge("2"))
+        olaylar = self._kaydet(model)
+
+        model.adet_degistir(1, 2)
+        model.sepeti_temizle()
+
+        assert olaylar["degisim"] == [(1, 2, 4)]
+        assert olaylar["silme"] == [(0, 1)]
+        assert olaylar["sifirlama"] == 0
+
+    def test_sepeti_esitle_farki_uygular(self, app):
+        model = SepetModeli()
+        for barkod in ("1", "2", "3"):
+            model.oge_ekle(_oge(barkod))
+        olaylar = self._kaydet(model)
+
+        model.sepeti_esitle([_oge("1"), _oge("3", adet=2), _oge("4")])
+
+        assert [oge.barkod for oge in model.sepet_ogeleri] == ["1", "3", "4"]
+        assert olaylar["silme"] == [(1, 1)]
+        assert olaylar["ekleme"] == [(2, 2)]
+        assert olaylar["degisim"] == [(1, 0, 4)]
+        assert olaylar["sifirlama"] == 0
+        assert model.data(model.index(1, 4)) == "20.00 ₺"
+        assert model.genel_toplam() == Decimal("40.00")
+
+
+class TestSepetTablosuFarki:
+    """Sepet tablosu satır farkı testleri"""
+
+    @pytest.fixture
+    def tablo(self, app):
+        tablo = SepetTablosu(POSSinyalleri())
+        yield tablo
+        tablo.deleteLater()
+
+    def test_okutma_yalnizca_ilgili_satiri_yazar(self, tablo):
+        for barkod in ("1", "2", "3"):
+            tablo._urun_eklendi(_satir(barkod))
+        hucreler = [tablo.tablo.item(satir, 1) for satir in range(3)]
+        butonlar = [tablo.tablo.cellWidget(satir, 5) for satir in range(3)]
+
+        tablo._urun_eklendi(_satir("2"))
+
+        assert tablo.tablo.rowCount() == 3
+        assert tablo.tablo.item(1, 2).text() == "2"
+        assert tablo.tablo.item(1, 4).text() == "20.00 ₺"
+        assert [tablo.tablo.item(satir, 1) for satir in range(3)] == hucreler
+        assert [tablo.tablo.cellWidget(satir, 5) for satir in range(3)] == butonlar
+        assert tablo.toplam_tutar_hesapla() == Decimal("40.00")
+
+    def test_sepet_guncellemesi_fark_uygular_ve_sil_butonu_kayar(self, tablo):
+        tablo._sepet_guncellendi([_satir("1"), _satir("2"), _satir("3")])
+        ucuncu_hucre = tablo.tablo.item(2, 0)
+        ucuncu_buton = tablo.tablo.cellWidget(2, 5)
+        silinenler = []
+        tablo.satir_silindi.connect(silinenler.append)
+
+        tablo._sepet_guncellendi([_satir("1"), _satir("3", adet=3), _satir("5")])
+
+        assert [tablo.tablo.item(satir, 0).text() for satir in range(3)] == ["1", "3", "5"]
+        assert tablo.tablo.item(1, 0) is ucuncu_hucre
+        assert tablo.tablo.item(1, 4).text() == "30.00 ₺"
+
+        ucuncu_buton.click()
+        assert silinenler == [1]
+
+        tablo._sepet_temizlendi()
+        assert tablo.tablo.rowCount() == 0
+        assert tablo._satir_metinleri == []
+
+    def test_elle_duzenlenen_adet_sonraki_guncellemede_duzeltilir(self, tablo):
+        tablo._sepet_guncellendi([_satir("1"), _satir("2")])
+
+        # Kullanıcı Adet hücresine 5 yazdı, servis adedi kabul etmedi
+        tablo.tablo.item(1, 2).setText("5")
+        assert tablo._satir_metinleri[1][2] == "5"
+
+        tablo._sepet_guncellendi([_satir("1"), _satir("2")])
+
+        assert tablo.tablo.item(1, 2).text() == "1"
+        assert tablo._satir_metinleri[1][2] == "1"
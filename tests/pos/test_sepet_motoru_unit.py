@@ -0,0 +1,224 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_sepet_motoru_unit
+# Description: SepetMotoru birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Ödeme servisi mağaza bilgisiyle kuruluyor
+# - sepet_durumu ve yazım geri çekilmesi testleri
+# - Artımlı toplam ve KDV dökümü testi
+# - Dış transaction'da durum güncelleme testi
+
+"""
+SepetMotoru Birim Testleri
+
+Bellek içi sepet işlemlerini, yazımların birleştirilmesini ve ödeme
+öncesi zorunlu yazımı doğrular.
+"""
+
+import time
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from sontechsp.uygulama.moduller.pos.arayuzler import OdemeTuru, SepetDurum
+from sontechsp.uygulama.moduller.pos.repositories.sepet_motoru import SepetMotoru
+from sontechsp.uygulama.moduller.pos.servisler.odeme_service import OdemeService
+from sontechsp.uygulama.cekirdek.hatalar import SontechHatasi
+
+
+@pytest.fixture
+def repository():
+    """Kalıcı yazımı kaydeden sahte SepetRepository"""
+    repo = Mock()
+    repo.sepet_olustur.return_value = 10
+    repo.sepet_durum_guncelle.return_value = True
+    return repo
+
+
+@pytest.fixture
+def motor(repository):
+    """Arka plan yazıcısı olmayan motor"""
+    return SepetMotoru(repository, arka_planda_yaz=False)
+
+
+class TestSepetMotoru:
+    """Sepet motoru testleri"""
+
+    def test_satirlar_bellekte_birlestirilir(self, motor, repository):
+        """Aynı ürün tek satırda toplanmalı, toplam farkla güncellenmeli"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        satir1 = motor.sepet_satiri_ekle(sepet_id, 5, "111", 2, Decimal('1.10'))
+        satir2 = motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('1.10'))
+        motor.sepet_satiri_ekle(sepet_id, 6, "222", 1, Decimal('2.00'))
+
+        sepet = motor.sepet_getir(sepet_id)
+
+        assert satir1 == satir2
+        assert [satir['adet'] for satir in sepet['satirlar']] == [3, 1]
+        assert sepet['toplam_tutar'] == pytest.approx(5.30)
+        repository.sepet_esitle.assert_not_called()
+
+    def test_degisiklikler_tek_yazimda_birlesir(self, motor, repository):
+        """Art arda değişiklikler sepet başına tek eşitleme çağrısı olmalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        satir_id = motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+        motor.sepet_satiri_ekle(sepet_id, 6, "222", 1, Decimal('2.00'))
+        motor.sepet_satiri_guncelle(satir_id, 4)
+
+        assert motor.bekleyenleri_yaz() == 1
+        assert motor.bekleyenleri_yaz() == 0
+
+        sepet_id_arg, satirlar, toplam, indirim = repository.sepet_esitle.call_args.args
+        assert sepet_id_arg == sepet_id
+        assert [(satir['urun_id'], satir['adet']) for satir in satirlar] == [(5, 4), (6, 1)]
+        assert toplam == Decimal('14.00')
+        assert indirim == Decimal('0.00')
+
+    def test_sil_ve_bosalt(self, motor):
+        """Silinen satır ID'si artık geçersiz olmalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        satir_id = motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+        motor.sepet_satiri_ekle(sepet_id, 6, "222", 1, Decimal('2.00'))
+
+        motor.sepet_satiri_sil(satir_id)
+        assert motor.sepet_getir(sepet_id)['toplam_tutar'] == pytest.approx(2.00)
+        with pytest.raises(SontechHatasi):
+            motor.sepet_satiri_guncelle(satir_id, 2)
+
+        motor.sepet_bosalt(sepet_id)
+        assert motor.sepet_getir(sepet_id)['satirlar'] == []
+
+    def test_veritabanindan_yuklenen_sepet(self, motor, repository):
+        """Bellekte olmayan sepet bir kez okunmalı, satırlara motor ID'si verilmeli"""
+        repository.sepet_getir.return_value = {
+            'id': 3, 'terminal_id': 1, 'kasiyer_id': 1, 'durum': 'aktif',
+            'toplam_tutar': 4.0, 'indirim_tutari': 0.0, 'net_tutar': 4.0,
+            'olusturma_tarihi': None, 'guncelleme_tarihi': None,
+            'satirlar': [{'id': 900, 'urun_id': 5, 'barkod': '111', 'urun_adi': 'Çay',
+                          'adet': 2, 'birim_fiyat': 2.0, 'indirim_tutari': 0.0, 'toplam_tutar': 4.0}]
+        }
+
+        satir_id = motor.sepet_getir(3)['satirlar'][0]['id']
+        motor.sepet_satiri_guncelle(satir_id, 3)
+
+        assert motor.sepet_getir(3)['toplam_tutar'] == pytest.approx(6.0)
+        assert repository.sepet_getir.call_count == 1
+
+    def test_durum_guncelleme_once_yazar_sonra_bellekten_cikarir(self, motor, repository):
+        """Tamamlanan sepet yazılmalı ve bellekten çıkarılmalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+
+        motor.sepet_durum_guncelle(sepet_id, SepetDurum.TAMAMLANDI)
+
+        assert repository.sepet_esitle.call_count == 1
+        assert motor.bekleyen_sepet_sayisi() == 0
+        repository.sepet_getir.return_value = None
+        assert motor.sepet_getir(sepet_id) is None
+
+    def test_dis_transaction_durumu_commit_sonrasi_uygulanir(self, motor, repository):
+        """Sepet bellekten yalnızca dış transaction commit edilince çıkarılmalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+        oturumlar = sessionmaker()
+
+        with pytest.raises(RuntimeError):
+            with oturumlar.begin() as oturum:
+                motor.sepet_durum_guncelle(sepet_id, SepetDurum.TAMAMLANDI, session=oturum)
+                raise RuntimeError("satış geri alındı")
+        assert motor.sepet_getir(sepet_id)['durum'] == SepetDurum.AKTIF.value
+
+        with oturumlar.begin() as oturum:
+            motor.sepet_durum_guncelle(sepet_id, SepetDurum.TAMAMLANDI, session=oturum)
+            assert motor.sepet_getir(sepet_id)['durum'] == SepetDurum.AKTIF.value
+        repository.sepet_durum_guncelle.assert_called_with(sepet_id, SepetDurum.TAMAMLANDI, session=oturum)
+        repository.sepet_getir.return_value = None
+        assert motor.sepet_getir(sepet_id) is None
+
+    def test_arka_plan_yazici(self, repository):
+        """Arka plan yazıcısı gecikme sonunda değişiklikleri yazmalı"""
+        motor = SepetMotoru(repository, yazma_gecikmesi=0.01)
+        try:
+            sepet_id = motor.sepet_olustur(1, 1)
+            motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+
+            for _ in range(200):
+                if motor.bekleyen_sepet_sayisi() == 0:
+                    break
+                time.sleep(0.01)
+        finally:
+            motor.kapat()
+
+        assert repository.sepet_esitle.call_count >= 1
+        assert motor.bekleyen_sepet_sayisi() == 0
+
+    def test_toplamlar_kdv_orani_basina_tutulur(self, motor):
+        """Toplamlar satır dolaşmadan güncel olmalı, KDV oranı başına ayrılmalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        satir_id = motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('11.80'), Decimal('18'))
+        motor.sepet_satiri_ekle(sepet_id, 6, "222", 2, Decimal('5.40'), Decimal('8'))
+        motor.sepet_satiri_guncelle(satir_id, 2)
+
+        with patch.object(motor, '_sepet_sozlugu') as sozluk:
+            toplamlar = motor.sepet_toplamlari(sepet_id)
+        sozluk.assert_not_called()
+
+        assert toplamlar.net_tutar == Decimal('34.40')
+        assert [(dilim.oran, dilim.kdv) for dilim in toplamlar.kdv_dokumu] == [
+            (Decimal('8.00'), Decimal('0.80')), (Decimal('18.00'), Decimal('3.60'))
+        ]
+
+        motor.sepet_satiri_sil(satir_id)
+        assert motor.sepet_toplamlari(sepet_id).net_tutar == Decimal('10.80')
+        assert motor.sepet_getir(sepet_id)['satirlar'][0]['kdv_orani'] == pytest.approx(8.0)
+
+    def test_sepet_durumu_sozluk_uretmez(self, motor, repository):
+        """Okutma öncesi durum kontrolü satır sözlüğü üretmemeli"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+        repository.sepet_getir.return_value = None
+
+        with patch.object(motor, '_sepet_sozlugu') as sozluk:
+            assert motor.sepet_durumu(sepet_id) == SepetDurum.AKTIF.value
+            assert motor.sepet_durumu(99) is None
+        sozluk.assert_not_called()
+
+    def test_yazim_hatasinda_bekleme_artar(self, repository):
+        """Veritabanı erişilemezken yeniden denemeler seyrekleşmeli"""
+        repository.sepet_esitle.side_effect = RuntimeError("bağlantı yok")
+        motor = SepetMotoru(repository, yazma_gecikmesi=0.01, arka_planda_yaz=False)
+        beklemeler = []
+
+        def bekle(sure):
+            beklemeler.append(sure)
+            return len(beklemeler) > 6
+
+        motor._durdur = Mock(is_set=Mock(return_value=False), wait=Mock(side_effect=bekle))
+        sepet_id = motor.sepet_olustur(1, 1)
+        motor.sepet_satiri_ekle(sepet_id, 5, "111", 1, Decimal('3.00'))
+
+        motor._yazici_dongusu()
+
+        assert beklemeler[0] == 0.01
+        assert all(sonraki > onceki for onceki, sonraki in zip(beklemeler, beklemeler[1:]))
+        assert motor.bekleyen_sepet_sayisi() == 1
+
+    def test_odeme_satistan_once_sepeti_yazar(self, motor, repository):
+        """Ödeme, satış kaydından önce bekleyen sepet yazımını tamamlamalı"""
+        sepet_id = motor.sepet_olustur(1, 1)
+        motor.sepet_satiri_ekle(sepet_id, 5, "111", 2, Decimal('5.00'))
+
+        cagrilar = []
+        repository.sepet_esitle.side_effect = lambda *args: cagrilar.append('sepet_esitle')
+        satis_repository = Mock()
+        satis_repository.satis_olustur.side_effect = lambda **kwargs: cagrilar.append('satis_olustur') or 1
+        servis = OdemeService(sepet_repository=motor, satis_repository=satis_repository,
+                              stok_service=Mock(), magaza_id=1, giden_olay_repository=Mock(),
+                              oturum_saglayici=sessionmaker().begin)
+
+        servis.tek_odeme_yap(sepet_id, OdemeTuru.NAKIT, Decimal('10.00'))
+
+        assert cagrilar[:2] == ['sepet_esitle', 'satis_olustur']
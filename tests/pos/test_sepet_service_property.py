@@ -1,9 +1,10 @@
 # Version: 0.1.0
-# Last Update: 2025-12-16
+# Last Update: 2026-10-17
 # Module: tests.pos.test_sepet_service_property
 # Description: SepetService özellik tabanlı testleri
 # Changelog:
 # - İlk oluşturma
+# - Barkod ekleme testleri sepet_durumu üzerinden
 
 """
 SepetService Özellik Tabanlı Testleri
@@ -75,7 +76,7 @@ class TestSepetServicePropertyTests:
             'satirlar': []
         }
         
-        self.mock_sepet_repository.sepet_getir.return_value = mock_sepet
+        self.mock_sepet_repository.sepet_durumu.return_value = mock_sepet['durum']
         
         # Mock stok service - geçersiz barkod için None döner
         self.mock_stok_service.urun_bilgisi_getir.return_value = None
@@ -246,7 +247,7 @@ class TestSepetServicePropertyTests:
             'stok_miktari': stok_miktari
         }
         
-        self.mock_sepet_repository.sepet_getir.return_value = mock_sepet
+        self.mock_sepet_repository.sepet_durumu.return_value = mock_sepet['durum']
         self.mock_stok_service.urun_bilgisi_getir.return_value = mock_urun_bilgisi
         self.mock_stok_service.stok_kontrol.return_value = False  # Stok yetersiz
         
@@ -415,7 +416,7 @@ class TestSepetServiceEntegrasyonTests:
             'stok_miktari': 100
         }
         
-        self.mock_sepet_repository.sepet_getir.return_value = mock_sepet
+        self.mock_sepet_repository.sepet_durumu.return_value = mock_sepet['durum']
         self.mock_stok_service.urun_bilgisi_getir.return_value = mock_urun_bilgisi
         self.mock_stok_service.stok_kontrol.return_value = True
         self.mock_sepet_repository.sepet_satiri_ekle.return_value = 1
@@ -427,7 +428,7 @@ class TestSepetServiceEntegrasyonTests:
         assert sonuc is True
         
         # Tüm servis çağrıları yapılmış olmalı
-        self.mock_sepet_repository.sepet_getir.assert_called_with(sepet_id)
+        self.mock_sepet_repository.sepet_durumu.assert_called_with(sepet_id)
         self.mock_stok_service.urun_bilgisi_getir.assert_called_with(barkod)
         self.mock_stok_service.stok_kontrol.assert_called_with(urun_id, 1)
         self.mock_sepet_repository.sepet_satiri_ekle.assert_called_with(
@@ -435,7 +436,8 @@ class TestSepetServiceEntegrasyonTests:
             urun_id=urun_id,
             barkod=barkod,
             adet=1,
-            birim_fiyat=birim_fiyat
+            birim_fiyat=birim_fiyat,
+            kdv_orani=None
         )
     
     @given(
@@ -449,7 +451,7 @@ class TestSepetServiceEntegrasyonTests:
         sepet_id = 999999  # Var olmayan sepet ID
         barkod = "1234567890"
         
-        self.mock_sepet_repository.sepet_getir.return_value = None
+        self.mock_sepet_repository.sepet_durumu.return_value = None
         
         # Act & Assert
         with pytest.raises(SontechHatasi) as exc_info:
@@ -477,7 +479,7 @@ class TestSepetServiceEntegrasyonTests:
             'satirlar': []
         }
         
-        self.mock_sepet_repository.sepet_getir.return_value = mock_sepet
+        self.mock_sepet_repository.sepet_durumu.return_value = mock_sepet['durum']
         
         # Act & Assert
         with pytest.raises(DogrulamaHatasi) as exc_info:
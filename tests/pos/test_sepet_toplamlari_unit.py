@@ -0,0 +1,96 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_sepet_toplamlari_unit
+# Description: SepetToplamlari birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+SepetToplamlari Birim Testleri
+
+Artımlı toplamların tam yeniden hesaplamayla aynı sonucu verdiğini ve
+KDV dökümünün indirimle birlikte net tutara birebir eşit olduğunu doğrular.
+"""
+
+from decimal import Decimal
+
+from hypothesis import given, settings, strategies as st
+
+from sontechsp.uygulama.moduller.pos.arayuzler import sepet_toplam_ozeti
+from sontechsp.uygulama.moduller.pos.sepet_toplamlari import (
+    VARSAYILAN_KDV_ORANI, SepetToplamlari, tutar_yuvarla
+)
+
+ORANLAR = [None, Decimal('1'), Decimal('8'), Decimal('18'), Decimal('20')]
+
+islemler = st.lists(st.tuples(
+    st.integers(min_value=0, max_value=5),
+    st.one_of(st.none(), st.decimals(min_value=Decimal('0.01'), max_value=Decimal('999.99'), places=2)),
+    st.sampled_from(ORANLAR)
+), max_size=40)
+
+
+class TestSepetToplamlari:
+    """Sepet toplamları testleri"""
+
+    @given(islemler=islemler)
+    @settings(max_examples=100)
+    def test_artimli_toplam_yeniden_hesaplamaya_esit(self, islemler):
+        """Ekle/değiştir/çıkar dizisi sonunda toplamlar satırlardan kurulanla aynı olmalı"""
+        toplamlar = SepetToplamlari()
+        satirlar = {}
+        for anahtar, tutar, oran in islemler:
+            if tutar is None:
+                toplamlar.satir_cikar(anahtar)
+                satirlar.pop(anahtar, None)
+            else:
+                toplamlar.satir_ayarla(anahtar, tutar, oran)
+                satirlar[anahtar] = (tutar, oran)
+
+        yeniden = SepetToplamlari.satirlardan((a, t, o) for a, (t, o) in satirlar.items())
+        assert toplamlar.ozet() == yeniden.ozet()
+        assert toplamlar.brut_toplam == sum((t for t, _ in satirlar.values()), Decimal('0.00'))
+
+    @given(
+        tutarlar=st.lists(st.decimals(min_value=Decimal('0.01'), max_value=Decimal('999.99'), places=2),
+                          min_size=1, max_size=10),
+        indirim_orani=st.decimals(min_value=Decimal('0'), max_value=Decimal('1'), places=2)
+    )
+    @settings(max_examples=100)
+    def test_kdv_dokumu_net_tutara_esit(self, tutarlar, indirim_orani):
+        """Oranlara dağıtılan indirim sonrası döküm toplamı net tutar olmalı"""
+        toplamlar = SepetToplamlari()
+        for sira, tutar in enumerate(tutarlar):
+            toplamlar.satir_ayarla(sira, tutar, ORANLAR[sira % len(ORANLAR)])
+        toplamlar.indirim_ayarla(tutar_yuvarla(toplamlar.brut_toplam * indirim_orani))
+
+        ozet = toplamlar.ozet()
+        assert sum((dilim.tutar for dilim in ozet.kdv_dokumu), Decimal('0.00')) == ozet.net_tutar
+        for dilim in ozet.kdv_dokumu:
+            assert dilim.matrah + dilim.kdv == dilim.tutar
+
+    def test_varsayilan_oran_ve_kdv(self):
+        """Oransız satır varsayılan orana sayılmalı, KDV dahil tutardan ayrılmalı"""
+        toplamlar = SepetToplamlari()
+        toplamlar.satir_ayarla('a', Decimal('118.00'))
+
+        dilim, = toplamlar.kdv_dokumu()
+        assert dilim.oran == VARSAYILAN_KDV_ORANI
+        assert (dilim.matrah, dilim.kdv) == (Decimal('100.00'), Decimal('18.00'))
+
+        toplamlar.satir_cikar('a')
+        assert toplamlar.kdv_dokumu() == []
+        assert toplamlar.net_tutar == Decimal('0.00')
+
+    def test_sozlukten_ozet(self):
+        """Eski biçim sözlükte döküm satırlar toplamla tutarlıysa verilmeli"""
+        sepet = {
+            'toplam_tutar': 15.3, 'indirim_tutari': 0.3,
+            'satirlar': [{'toplam_tutar': 11.8, 'kdv_orani': 18.0}, {'toplam_tutar': 3.5, 'kdv_orani': 8.0}]
+        }
+        ozet = sepet_toplam_ozeti(sepet)
+        assert ozet.net_tutar == Decimal('15.00')
+        assert len(ozet.kdv_dokumu) == 2
+
+        sepet['toplam_tutar'] = 20.0
+        assert sepet_toplam_ozeti(sepet).kdv_dokumu == ()
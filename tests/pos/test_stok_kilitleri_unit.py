@@ -0,0 +1,145 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_stok_kilitleri_unit
+# Description: Şeritli stok kilit havuzu ve danışma kilidi birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Aynı şeride düşen anahtarın başkasının kilidini bırakamaması testi
+
+"""
+Stok Kilitleri Birim Testleri
+
+Şeritli havuzun süreç içi sıralamasını, zaman aşımını, çoklu anahtarın
+kilitlenmeye girmeden alınmasını, danışma kilitlerinin yalnızca
+PostgreSQL'de sıralı alınmasını ve StokService'in satış transaction'ında
+bu kilitleri kullanmasını doğrular.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from sontechsp.uygulama.moduller.pos.monitoring import pos_monitoring_baslat
+from sontechsp.uygulama.moduller.pos.servisler.stok_service import StokService
+from sontechsp.uygulama.moduller.pos.stok_kilitleri import (
+    StokKilitHavuzu, veritabani_kilitleri_al
+)
+from sontechsp.uygulama.moduller.stok.hatalar.stok_hatalari import StokKilitError
+
+
+def _postgres_oturumu() -> Mock:
+    oturum = Mock()
+    oturum.get_bind.return_value.dialect.name = 'postgresql'
+    return oturum
+
+
+class TestStokKilitHavuzu:
+    """Süreç içi şeritli kilit testleri"""
+
+    def test_ayni_anahtar_sirayla_calisir_ve_bekleme_kaydedilir(self):
+        monitoring = pos_monitoring_baslat()
+        havuz = StokKilitHavuzu(serit_sayisi=8)
+        kilit_alindi = threading.Event()
+        birak = threading.Event()
+
+        def tutan():
+            with havuz.kilitle([(1, 1)]):
+                kilit_alindi.set()
+                birak.wait(5)
+
+        thread = threading.Thread(target=tutan)
+        thread.start()
+        kilit_alindi.wait(5)
+
+        with pytest.raises(StokKilitError):
+            with havuz.kilitle([(1, 1)], zaman_asimi=0.05):
+                pass
+        assert havuz.dene(1, 1) is False
+
+        birak.set()
+        thread.join(5)
+        with havuz.kilitle([(1, 1)], zaman_asimi=1):
+            pass
+
+        istatistik = monitoring.islem_istatistikleri('stok_kilidi_bekleme')
+        assert (istatistik['basarili_islem'], istatistik['basarisiz_islem']) == (2, 1)
+        assert istatistik['max_sure'] >= 0.05
+
+    def test_birak_yalnizca_dene_ile_alinan_seridi_birakir(self):
+        havuz = StokKilitHavuzu(serit_sayisi=1)
+        assert havuz.dene(1, 1) is True
+
+        # (2, 1) aynı şeride düşüyor: alamaz, sahibinin kilidini de bırakamaz
+        assert havuz.dene(2, 1) is False
+        assert havuz.birak(2, 1) is False
+        assert havuz.dene(3, 1) is False
+
+        assert havuz.birak(1, 1) is True
+        assert havuz.birak(1, 1) is False
+
+        with havuz.kilitle([(1, 1)]):
+            assert havuz.birak(1, 1) is False
+            assert havuz.dene(1, 1) is False
+        assert havuz.dene(1, 1) is True
+
+    def test_ters_sirali_sepetler_kilitlenmeye_girmez(self):
+        havuz = StokKilitHavuzu(serit_sayisi=4)
+        anahtarlar = [(urun_id, 1) for urun_id in range(1, 9)]
+        hatalar = []
+
+        def sepet(sira):
+            try:
+                for _ in range(200):
+                    with havuz.kilitle(sira, zaman_asimi=5):
+                        pass
+            except StokKilitError as e:
+                hatalar.append(e)
+
+        threadler = [threading.Thread(target=sepet, args=(anahtarlar,)),
+                     threading.Thread(target=sepet, args=(anahtarlar[::-1],))]
+        for thread in threadler:
+            thread.start()
+        for thread in threadler:
+            thread.join(10)
+
+        assert hatalar == []
+        with havuz.kilitle(anahtarlar, zaman_asimi=0.1):
+            pass
+
+
+class TestVeritabaniKilitleri:
+    """PostgreSQL danışma kilidi testleri"""
+
+    def test_sqlite_oturumunda_kilit_alinmaz(self):
+        with Session(create_engine("sqlite://")) as oturum:
+            assert veritabani_kilitleri_al(oturum, [(1, 1)]) == 0
+
+    def test_postgresql_kilitleri_tekil_ve_sirali_alinir(self):
+        oturum = _postgres_oturumu()
+
+        assert veritabani_kilitleri_al(oturum, [(5, 1), (2, 1), (5, 1)]) == 2
+
+        parametreler = [cagri.args[1] for cagri in oturum.execute.call_args_list]
+        assert parametreler == [{'urun_id': 2, 'magaza_id': 1}, {'urun_id': 5, 'magaza_id': 1}]
+        assert 'pg_advisory_xact_lock' in str(oturum.execute.call_args_list[0].args[0])
+
+    def test_toplu_stok_dusumu_satis_transactioninda_kilitlenir(self):
+        entegrasyon = Mock()
+        entegrasyon.pos_sepeti_isle.return_value = True
+        stok_service = StokService(entegrasyon, Mock(), Mock(), Mock(),
+                                   kilit_havuzu=StokKilitHavuzu(serit_sayisi=8))
+        oturum = _postgres_oturumu()
+
+        assert stok_service.toplu_stok_dusur(
+            [{'urun_id': 3, 'adet': 1}, {'urun_id': 1, 'adet': 2}],
+            referans_no='POS_42', magaza_id=7, session=oturum
+        ) is True
+
+        parametreler = [cagri.args[1] for cagri in oturum.execute.call_args_list]
+        assert parametreler == [{'urun_id': 1, 'magaza_id': 7}, {'urun_id': 3, 'magaza_id': 7}]
+        entegrasyon.pos_sepeti_isle.assert_called_once()
+        with stok_service.stok_kilidi_ile(1, 7) as kilit_durumu:
+            assert kilit_durumu is True
@@ -0,0 +1,143 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.pos.test_yazici_kuyrugu_unit
+# Description: Fiş şablonu ve yazıcı kuyruğu birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+Fiş Şablonu ve Yazıcı Kuyruğu Birim Testleri
+
+Derlenmiş şablonun metin/ESC/POS çıktısını, kuyruğun dosya destekli
+kalıcılığını, yeniden denemeyi ve FisService'in kuyruğa alıp hemen
+döndüğünü doğrular.
+"""
+
+import os
+import threading
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from sontechsp.uygulama.moduller.pos.servisler.fis_service import FisService
+from sontechsp.uygulama.moduller.pos.yazdirma import (
+    Satir, Bolum, sablon_derle, YazdirmaDurumu, YaziciKuyrugu
+)
+from sontechsp.uygulama.cekirdek.hatalar import DogrulamaHatasi
+
+
+class TestFisSablonu:
+    """Derlenmiş şablon testleri"""
+
+    def test_metin_ve_escpos_ayni_duzeni_uretir(self):
+        sablon = sablon_derle((
+            Satir("FİŞ {fis_no}", stil='kalin'),
+            Bolum('satirlar', (Satir("{urun_adi:<6.6}{tutar:>8.2f}"),)),
+            Bolum('indirim', (Satir("İndirim {indirim:.2f}"),)),
+        ))
+        degerler = {
+            'fis_no': 'F-1',
+            'satirlar': [{'urun_adi': 'Şekerleme', 'tutar': Decimal('12.5')}],
+            'indirim': [],
+        }
+
+        assert sablon.metin_uret(degerler) == "FİŞ F-1\nŞekerl   12.50"
+
+        bayt = sablon.escpos_uret(degerler)
+        assert bayt.startswith(b'\x1b@\x1bt\x0d')
+        assert b'\x1bE\x01' + "FİŞ F-1".encode('cp857') + b'\x1bE\x00\n' in bayt
+        assert "Şekerl   12.50\n".encode('cp857') in bayt
+        assert bayt.endswith(b'\x1dVB\x03')
+
+    def test_desteklenmeyen_sozdizimi_derlemede_reddedilir(self):
+        with pytest.raises(DogrulamaHatasi):
+            sablon_derle((Satir("{fis_no!r}"),))
+        with pytest.raises(DogrulamaHatasi):
+            sablon_derle((Satir("x", stil='egik'),))
+
+
+class TestYaziciKuyrugu:
+    """Yazıcı kuyruğu testleri"""
+
+    def test_is_diske_yazilir_ve_yazdirilinca_silinir(self, tmp_path):
+        gonderici = Mock(return_value=True)
+        kuyruk = YaziciKuyrugu("kasa1", gonderici, str(tmp_path), arka_planda_yazdir=False)
+        durumlar = []
+
+        kuyruk.is_ekle(b'fis', etiket='F-1', geri_cagirim=lambda isi: durumlar.append(isi.durum))
+
+        assert len(os.listdir(tmp_path)) == 1
+        assert kuyruk.bekleyenleri_yazdir() == 1
+        gonderici.assert_called_once_with(b'fis')
+        assert os.listdir(tmp_path) == []
+        assert durumlar == [YazdirmaDurumu.KUYRUKTA, YazdirmaDurumu.YAZDIRILIYOR,
+                            YazdirmaDurumu.YAZDIRILDI]
+
+    def test_cokme_sonrasi_kalan_isler_sirayla_yazdirilir(self, tmp_path):
+        ilk = YaziciKuyrugu("kasa1", Mock(return_value=False), str(tmp_path),
+                            arka_planda_yazdir=False)
+        ilk.is_ekle(b'bir', etiket='F-1')
+        ilk.is_ekle(b'iki', etiket='F-2')
+        assert ilk.bekleyenleri_yazdir() == 0
+        (tmp_path / "yarim.fis.tmp").write_bytes(b'x')
+
+        gonderici = Mock(return_value=True)
+        yeni = YaziciKuyrugu("kasa1", gonderici, str(tmp_path), arka_planda_yazdir=False)
+
+        assert yeni.bekleyen_is_sayisi() == 2
+        assert yeni.bekleyenleri_yazdir() == 2
+        assert [c.args[0] for c in gonderici.call_args_list] == [b'bir', b'iki']
+        assert os.listdir(tmp_path) == []
+
+    def test_hatali_is_arka_planda_yeniden_denenir(self):
+        yazdirildi = threading.Event()
+        gonderici = Mock(side_effect=[OSError("kağıt sıkıştı"), OSError("kağıt sıkıştı"), True])
+        durumlar = []
+
+        def dinle(isi):
+            durumlar.append((isi.durum, isi.deneme_sayisi))
+            if isi.durum == YazdirmaDurumu.YAZDIRILDI:
+                yazdirildi.set()
+
+        kuyruk = YaziciKuyrugu("kasa1", gonderici, ilk_bekleme=0.01, azami_bekleme=0.02)
+        kuyruk.durum_dinleyicisi_ekle(dinle)
+        try:
+            kuyruk.is_ekle(b'fis')
+            assert yazdirildi.wait(2)
+        finally:
+            kuyruk.kapat()
+
+        assert gonderici.call_count == 3
+        assert (YazdirmaDurumu.HATA, 2) in durumlar
+        assert durumlar[-1] == (YazdirmaDurumu.YAZDIRILDI, 3)
+        assert kuyruk.bekleyen_is_sayisi() == 0
+
+
+class TestFisServiceKuyruk:
+    """FisService kuyruk entegrasyonu testleri"""
+
+    def test_fis_kuyruga_alinip_hemen_doner(self, tmp_path):
+        satis_repository = Mock()
+        satis_repository.satis_getir.return_value = {
+            'fis_no': 'F-42', 'terminal_id': 1, 'kasiyer_id': 2,
+            'toplam_tutar': Decimal('10.00'), 'indirim_tutari': Decimal('0'),
+            'satirlar': [{'urun_adi': 'Süt', 'adet': 1, 'birim_fiyat': Decimal('10.00'),
+                          'toplam_tutar': Decimal('10.00'), 'kdv_orani': Decimal('1')}],
+            'odemeler': [{'odeme_turu': 'nakit', 'tutar': Decimal('10.00')}]
+        }
+        gonderici = Mock(return_value=True)
+        kuyruk = YaziciKuyrugu("kasa1", gonderici, str(tmp_path), arka_planda_yazdir=False)
+        fis_service = FisService(satis_repository, Mock(), yazici_kuyrugu=kuyruk)
+
+        is_id = fis_service.fis_kuyruga_al(1)
+
+        gonderici.assert_not_called()
+        assert (tmp_path / f"{is_id}.fis").exists()
+        assert fis_service.fis_yazdir("kopya fiş") is True
+        assert fis_service.yazici_durumu_kontrol()['bekleyen_is'] == 2
+
+        kuyruk.bekleyenleri_yazdir()
+        veri = gonderici.call_args_list[0].args[0]
+        assert "F-42".encode('cp857') in veri
+        assert "NET TOPLAM".encode('cp857') in veri
@@ -0,0 +1,12 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok
+# Description: Stok modülü testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+Stok Modülü Testleri
+
+Bu modül stok modülünün birim ve özellik tabanlı testlerini içerir.
+"""
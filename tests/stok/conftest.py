@@ -0,0 +1,89 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.conftest
+# Description: Stok testleri için pytest konfigürasyonu
+# Changelog:
+# - İlk oluşturma
+
+"""
+Stok Testleri Pytest Konfigürasyonu
+
+Repository'leri gerçek SQL ile çalıştıran testlerin ortak fixture'larını
+sağlar:
+
+- sqlite_motoru: İstenen tablolarla SQLite bellek veritabanı kurar
+- db_bagla: Repository'lerin db bağımlılığını verilen veritabanına bağlar
+- pg_motoru: SONTECHSP_TEST_PG_URL tanımlıysa PostgreSQL test veritabanı
+  (tanımlı değilse postgresql işaretli testler atlanır)
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sontechsp.uygulama.veritabani.modeller  # noqa: F401 - FK hedefleri metadata'ya yüklenir
+from sontechsp.uygulama.veritabani.taban import Taban
+
+PG_URL_DEGISKENI = "SONTECHSP_TEST_PG_URL"
+
+
+@pytest.fixture
+def sqlite_motoru():
+    """
+    SQLite bellek veritabanı üreten fixture
+
+    Kullanım: sqlite_motoru(StokBakiye.__table__, ..., paylasimli=True)
+    paylasimli=True tek bağlantıyı thread'ler arasında paylaştırır.
+    """
+    def olustur(*tablolar, paylasimli: bool = False):
+        if paylasimli:
+            engine = create_engine("sqlite://", poolclass=StaticPool,
+                                   connect_args={"check_same_thread": False})
+        else:
+            engine = create_engine("sqlite://")
+        Taban.metadata.create_all(engine, tables=list(tablolar))
+        return engine
+
+    return olustur
+
+
+@pytest.fixture
+def db_bagla():
+    """
+    Repository'leri verilen veritabanına bağlayan fixture
+
+    Kullanım: db_bagla(engine, repo1, repo2) - hepsi aynı sahte db
+    nesnesini paylaşır; sahte db döndürülür.
+    """
+    def bagla(engine, *repolar):
+        db = Mock()
+        db.oturum_olustur.side_effect = sessionmaker(bind=engine)
+        for repo in repolar:
+            repo.db = db
+        return db
+
+    return bagla
+
+
+@pytest.fixture
+def pg_motoru():
+    """
+    PostgreSQL test veritabanı (şema her test için kurulur ve silinir)
+
+    Üretim veritabanına bağlanmayın: tablolar test sonunda düşürülür.
+    """
+    url = os.environ.get(PG_URL_DEGISKENI)
+    if not url:
+        pytest.skip(f"{PG_URL_DEGISKENI} tanımlı değil")
+
+    engine = create_engine(url)
+    Taban.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        Taban.metadata.drop_all(engine)
+        engine.dispose()
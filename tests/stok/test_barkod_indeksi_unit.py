@@ -0,0 +1,141 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_barkod_indeksi_unit
+# Description: BarkodIndeksi birim testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+BarkodIndeksi Birim Testleri
+
+Bu modül bellek içi barkod indeksinin yükleme, kanca ve delta
+güncellemelerini ve BarkodService entegrasyonunu test eder.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock
+
+from sontechsp.uygulama.moduller.stok.dto import BarkodDTO
+from sontechsp.uygulama.moduller.stok.depolar.barkod_indeksi import BarkodIndeksi
+from sontechsp.uygulama.moduller.stok.servisler.barkod_service import BarkodService
+
+
+def _dto(barkod_id: int, urun_id: int, barkod: str, fiyat: str = "10.00", aktif: bool = True) -> BarkodDTO:
+    return BarkodDTO(
+        id=barkod_id,
+        urun_id=urun_id,
+        barkod=barkod,
+        urun_adi=f"Ürün {urun_id}",
+        satis_fiyati=Decimal(fiyat),
+        kdv_orani=Decimal('18.00'),
+        aktif=aktif
+    )
+
+
+class TestBarkodIndeksi:
+    """BarkodIndeksi birim testleri"""
+    
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.repository = Mock()
+        self.repository.indeks_kayitlari_getir.return_value = iter([
+            _dto(1, 10, "12345678"),
+            _dto(2, 10, "87654321"),
+            _dto(3, 20, "11112222", "5.50")
+        ])
+        self.indeks = BarkodIndeksi(self.repository)
+    
+    def test_yukle_ve_ara(self):
+        """Yüklenen barkodlar indeksten bulunmalı, sayaçlar işlemeli"""
+        assert self.indeks.yukle() == 3
+        
+        kayit = self.indeks.ara("11112222")
+        assert kayit.urun_id == 20
+        assert kayit.satis_fiyati == Decimal("5.50")
+        assert self.indeks.ara("99999999") is None
+        
+        istatistik = self.indeks.istatistikler()
+        assert istatistik['isabet'] == 1
+        assert istatistik['iska'] == 1
+        assert istatistik['barkod_sayisi'] == 3
+    
+    def test_donen_kayit_indeksi_bozmaz(self):
+        """Çağıranın değiştirdiği kopya indeksteki kaydı etkilememeli"""
+        self.indeks.yukle()
+        
+        kayit = self.indeks.ara("12345678")
+        kayit.satis_fiyati = Decimal("0")
+        
+        assert self.indeks.ara("12345678").satis_fiyati == Decimal("10.00")
+    
+    def test_urun_guncelle_tum_barkodlara_yansir(self):
+        """Ürün güncelleme kancası ürünün tüm barkodlarını güncellemeli"""
+        self.indeks.yukle()
+        
+        guncellenen = self.indeks.urun_guncelle(10, "Yeni Ad", Decimal("12.00"), Decimal("20.00"))
+        
+        assert guncellenen == 2
+        assert self.indeks.ara("12345678").urun_adi == "Yeni Ad"
+        assert self.indeks.ara("87654321").satis_fiyati == Decimal("12.00")
+    
+    def test_pasif_urun_indeksten_duser(self):
+        """Pasifleşen ürünün barkodları indeksten çıkarılmalı"""
+        self.indeks.yukle()
+        
+        self.indeks.urun_guncelle(10, "Ürün 10", None, None, aktif=False)
+        
+        assert self.indeks.ara("12345678") is None
+        assert self.indeks.ara("11112222") is not None
+    
+    def test_barkod_id_sil(self):
+        """Silinen barkod ID'si indeksten çıkarılmalı"""
+        self.indeks.yukle()
+        
+        assert self.indeks.barkod_id_sil(2) is True
+        assert self.indeks.ara("87654321") is None
+        assert self.indeks.barkod_id_sil(2) is False
+    
+    def test_delta_yenile_degisiklikleri_uygular(self):
+        """Delta yenileme yeni, değişen ve pasifleşen kayıtları uygulamalı"""
+        self.indeks.yukle()
+        self.repository.indeks_kayitlari_getir.return_value = iter([
+            _dto(4, 30, "33334444"),
+            _dto(3, 20, "11112222", "6.00"),
+            _dto(1, 10, "12345678", aktif=False)
+        ])
+        
+        assert self.indeks.delta_yenile() == 3
+        
+        _, kwargs = self.repository.indeks_kayitlari_getir.call_args
+        assert kwargs['degisiklik_sonrasi'] is not None
+        assert self.indeks.ara("33334444").urun_id == 30
+        assert self.indeks.ara("11112222").satis_fiyati == Decimal("6.00")
+        assert self.indeks.ara("12345678") is None
+
+
+class TestBarkodServiceIndeks:
+    """BarkodService indeks entegrasyon testleri"""
+    
+    def test_iskada_repository_sonucu_indekse_yazilir(self):
+        """İlk aramada DB'ye gidilmeli, ikinci arama indeksten dönmeli"""
+        repository = Mock()
+        repository.barkod_ile_ara.return_value = _dto(1, 10, "12345678")
+        service = BarkodService(barkod_repository=repository, barkod_indeksi=BarkodIndeksi())
+        
+        ilk = service.barkod_ara("12345678")
+        ikinci = service.barkod_ara("12345678")
+        
+        assert ilk.urun_id == ikinci.urun_id == 10
+        repository.barkod_ile_ara.assert_called_once_with("12345678")
+        assert service.indeks_istatistikleri()['isabet'] == 1
+    
+    def test_barkod_sil_indeksi_gunceller(self):
+        """Başarılı silme indeksten de düşmeli"""
+        repository = Mock()
+        repository.sil.return_value = True
+        indeks = BarkodIndeksi()
+        indeks.kaydet(_dto(5, 10, "12345678"))
+        service = BarkodService(barkod_repository=repository, barkod_indeksi=indeks)
+        
+        assert service.barkod_sil(5) is True
+        assert indeks.ara("12345678") is None
@@ -0,0 +1,107 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_kritik_stok_service_unit
+# Description: KritikStokService birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Bildirim sırası testi eklendi
+
+"""
+KritikStokService Birim Testleri
+
+Kritik stok listesinin tek birleştirilmiş sorgu satırlarından üretildiğini
+ve ürün başına sorgu yapılmadığını doğrular.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock
+
+from sontechsp.uygulama.moduller.stok.servisler.kritik_stok_service import KritikStokService
+
+
+def _satir(urun_id: int, mevcut: str, kritik: str, sira: int, depo_id=None) -> dict:
+    return {
+        'urun_id': urun_id,
+        'urun_kodu': f"U{urun_id}",
+        'urun_adi': f"Ürün {urun_id}",
+        'magaza_id': 1,
+        'depo_id': depo_id,
+        'mevcut_stok': Decimal(mevcut),
+        'kritik_seviye': Decimal(kritik),
+        'eksik_miktar': Decimal(kritik) - Decimal(mevcut),
+        'uyari_sirasi': sira,
+        'son_hareket_tarihi': None
+    }
+
+
+class TestKritikStokService:
+    """KritikStokService birim testleri"""
+    
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.bakiye_repository = Mock()
+        self.urun_repository = Mock()
+        self.service = KritikStokService(self.bakiye_repository, self.urun_repository)
+    
+    def test_kritik_stok_listesi_tek_sorgu(self):
+        """Liste sorgu sırasını korumalı ve ürün başına sorgu yapmamalı"""
+        self.bakiye_repository.kritik_stok_satirlari_getir.return_value = iter([
+            _satir(1, '0', '20', 0),
+            _satir(2, '4', '20', 1),
+            _satir(3, '8', '10', 2)
+        ])
+        
+        liste = self.service.kritik_stok_listesi(magaza_id=1)
+        
+        assert [u.uyari_seviyesi for u in liste] == ["ACIL", "KRITIK", "UYARI"]
+        assert liste[1].eksik_miktar == Decimal('16')
+        self.bakiye_repository.kritik_stok_satirlari_getir.assert_called_once_with(
+            Decimal('10.0000'), magaza_id=1, depo_id=None, sadece_kritik=False
+        )
+        self.urun_repository.id_ile_getir.assert_not_called()
+        self.bakiye_repository.tum_bakiyeler_getir.assert_not_called()
+    
+    def test_uyari_olustur_ayni_akisi_kullanir(self):
+        """Uyarı oluşturma sadece KRITIK filtresiyle akışı tüketmeli"""
+        self.bakiye_repository.kritik_stok_satirlari_getir.return_value = iter([
+            _satir(2, '4', '20', 1),
+            _satir(5, '3', '10', 1)
+        ])
+        
+        istatistikler = self.service.uyari_olustur(magaza_id=1)
+        
+        assert istatistikler['toplam_uyari'] == 2
+        assert istatistikler['kritik_uyari'] == 2
+        _, kwargs = self.bakiye_repository.kritik_stok_satirlari_getir.call_args
+        assert kwargs['sadece_kritik'] is True
+    
+    def test_bildirimler_akis_kapandiktan_sonra_gonderilir(self):
+        """Email gönderimi başlamadan sorgu akışı tamamen tüketilmiş olmalı"""
+        akis_bitti = []
+        
+        def satirlar(*args, **kwargs):
+            yield _satir(2, '4', '20', 1)
+            yield _satir(5, '3', '10', 1)
+            akis_bitti.append(True)
+        
+        self.bakiye_repository.kritik_stok_satirlari_getir.side_effect = satirlar
+        gonderimde_akis_bitmis = []
+        self.service._email_uyari_gonder = lambda uyari: gonderimde_akis_bitmis.append(bool(akis_bitti))
+        
+        istatistikler = self.service.uyari_olustur(magaza_id=1, email_gonder=True)
+        
+        assert istatistikler['email_gonderilen'] == 2
+        assert gonderimde_akis_bitmis == [True, True]
+    
+    def test_depo_bazinda_rapor(self):
+        """Depo raporu depo adına göre gruplanmalı, sıra korunmalı"""
+        self.bakiye_repository.kritik_stok_satirlari_getir.return_value = iter([
+            _satir(1, '0', '20', 0, depo_id=3),
+            _satir(2, '4', '20', 1),
+            _satir(3, '8', '10', 2, depo_id=3)
+        ])
+        
+        rapor = self.service.depo_bazinda_kritik_stok_raporu(1)
+        
+        assert [u.urun_id for u in rapor["Depo 3"]] == [1, 3]
+        assert [u.urun_id for u in rapor["Ana Depo"]] == [2]
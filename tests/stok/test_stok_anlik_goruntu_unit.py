@@ -0,0 +1,166 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_anlik_goruntu_unit
+# Description: Dönem sonu stok görüntüsü birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Sıfır bakiye, saat dilimi ve günlük görüntü temizliği testleri
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+Dönem Sonu Stok Görüntüsü Birim Testleri
+
+StokAnlikGoruntuService / StokAnlikGoruntuRepository ve rapor sorgusunu
+offline (SQLite) veritabanında gerçek SQL ile doğrular.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiyeAnlikGoruntu, StokHareket
+from sontechsp.uygulama.moduller.raporlar.dto import TarihAraligiDTO
+from sontechsp.uygulama.moduller.raporlar.sorgular import stok_donem_hareketleri, tarihteki_stok_listesi
+from sontechsp.uygulama.moduller.stok.depolar.stok_anlik_goruntu_repository import StokAnlikGoruntuRepository
+from sontechsp.uygulama.moduller.stok.servisler.stok_anlik_goruntu_service import StokAnlikGoruntuService
+
+# (urun_id, magaza_id, depo_id, miktar, tarih)
+HAREKETLER = [
+    (1, 1, None, '10', datetime(2026, 10, 1, 9)),
+    (1, 1, None, '-3', datetime(2026, 10, 1, 18)),
+    (2, 1, None, '5', datetime(2026, 10, 1, 12)),
+    (1, 1, 7, '4', datetime(2026, 10, 2, 10)),
+    (2, 1, None, '-5', datetime(2026, 10, 2, 11)),
+    (1, 1, None, '-2', datetime(2026, 10, 3, 8)),
+    (1, 2, None, '100', datetime(2026, 10, 1, 8)),
+]
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """Hareketleri yüklenmiş SQLite bellek veritabanı"""
+    engine = sqlite_motoru(StokHareket.__table__, StokBakiyeAnlikGoruntu.__table__)
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(StokHareket.__table__), [
+            {'urun_id': urun_id, 'magaza_id': magaza_id, 'depo_id': depo_id,
+             'hareket_tipi': 'GIRIS' if Decimal(miktar) > 0 else 'CIKIS',
+             'miktar': Decimal(miktar), 'olusturma_tarihi': tarih}
+            for urun_id, magaza_id, depo_id, miktar, tarih in HAREKETLER
+        ])
+    return engine
+
+
+@pytest.fixture
+def servis(engine, db_bagla):
+    """Test veritabanına bağlı görüntü servisi"""
+    repo = StokAnlikGoruntuRepository()
+    db_bagla(engine, repo)
+    return StokAnlikGoruntuService(repo)
+
+
+def _goruntu(engine, donem_sonu):
+    tablo = StokBakiyeAnlikGoruntu.__table__
+    with engine.connect() as baglanti:
+        return {
+            (satir.urun_id, satir.magaza_id, satir.depo_id): satir.miktar
+            for satir in baglanti.execute(select(tablo).where(tablo.c.donem_sonu == donem_sonu))
+        }
+
+
+class TestAnlikGoruntu:
+    """Görüntü üretimi ve görüntü + delta sorgu testleri"""
+
+    def test_gunluk_kapanis_artimli_uretilir(self, servis, engine):
+        """İkinci gün görüntüsü birinci görüntü + o günün hareketleri olmalı, sıfırlar yazılmamalı"""
+        servis.gunluk_kapanis(date(2026, 10, 1))
+        assert servis.gunluk_kapanis(date(2026, 10, 2)) == 3
+
+        assert _goruntu(engine, datetime(2026, 10, 3)) == {
+            (1, 1, None): Decimal('7'),
+            (1, 1, 7): Decimal('4'),
+            (1, 2, None): Decimal('100'),
+        }
+
+    def test_donem_anlari_saat_dilimli(self):
+        """timestamptz kolona yerel gece yarısı saat dilimiyle yazılmalı"""
+        repo = Mock()
+        StokAnlikGoruntuService(repo).gunluk_kapanis(date(2026, 10, 1))
+
+        donem_sonu = repo.goruntu_olustur.call_args.args[1]
+        assert donem_sonu.tzinfo is not None
+        assert donem_sonu == datetime(2026, 10, 2).astimezone()
+
+    def test_aylik_kapanis_gunlukleri_temizler(self, servis, engine):
+        """Aylık görüntü yazılınca o ayın günlük görüntüleri silinmeli, sorgu sonucu değişmemeli"""
+        servis.aylik_kapanis(2026, 9)
+        for gun in range(1, 4):
+            servis.gunluk_kapanis(date(2026, 10, gun))
+        tarih = datetime(2026, 11, 2, 12)
+        once = servis.tarihteki_stok(tarih, 1)
+
+        servis.aylik_kapanis(2026, 10)
+
+        tablo = StokBakiyeAnlikGoruntu.__table__
+        with engine.connect() as baglanti:
+            donemler = {satir.donem_tipi for satir in baglanti.execute(select(tablo.c.donem_tipi))}
+        assert donemler == {'AYLIK'}
+        assert servis.tarihteki_stok(tarih, 1) == once == {1: Decimal('9')}
+
+    def test_kapanis_tekrar_calisirsa_cift_sayilmaz(self, servis, engine):
+        """Aynı dönem yeniden üretilirse eski satırların yerine geçmeli"""
+        servis.gunluk_kapanis(date(2026, 10, 1))
+        servis.gunluk_kapanis(date(2026, 10, 1))
+
+        assert _goruntu(engine, datetime(2026, 10, 2))[(1, 1, None)] == Decimal('7')
+
+    def test_tarihteki_stok_goruntu_ve_delta(self, servis):
+        """Görüntülü ve görüntüsüz sonuçlar aynı olmalı"""
+        tarih = datetime(2026, 10, 3, 12)
+        gecmisten = servis.tarihteki_stok(tarih, 1)
+
+        servis.gunluk_kapanis(date(2026, 10, 1))
+        assert servis.tarihteki_stok(tarih, 1) == gecmisten == {1: Decimal('9')}
+        assert servis.tarihteki_stok(tarih, 1, depo_id=7) == {1: Decimal('4')}
+        assert servis.tarihteki_stok(datetime(2026, 10, 1, 10), 1, urun_idler=[1]) == {1: Decimal('10')}
+
+    def test_eksik_kapanislar_sirayla_tamamlanir(self, servis, engine):
+        """Son görüntüden düne kadar her gün için kapanış üretilmeli"""
+        servis.gunluk_kapanis(date(2026, 10, 1))
+
+        assert servis.eksik_kapanislari_tamamla(date(2026, 10, 4)) == [
+            date(2026, 10, 2), date(2026, 10, 3)
+        ]
+        assert _goruntu(engine, datetime(2026, 10, 4))[(1, 1, None)] == Decimal('5')
+
+    def test_rapor_donem_hareketleri(self, servis, engine):
+        """Rapor sorgusu açılış + giriş - çıkış = kapanış vermeli"""
+        servis.aylik_kapanis(2026, 9)
+        servis.gunluk_kapanis(date(2026, 10, 1))
+
+        with sessionmaker(bind=engine)() as session:
+            sonuclar = stok_donem_hareketleri(
+                session, 1, TarihAraligiDTO(date(2026, 10, 2), date(2026, 10, 3))
+            )
+
+        assert sonuclar == [
+            {'urun_id': 1, 'acilis': Decimal('7'), 'giris': Decimal('4'),
+             'cikis': Decimal('2'), 'kapanis': Decimal('9')},
+            {'urun_id': 2, 'acilis': Decimal('5'), 'giris': Decimal('0'),
+             'cikis': Decimal('5'), 'kapanis': Decimal('0')},
+        ]
+
+    def test_rapor_tarihteki_stok_repository_ile_ayni(self, servis, engine):
+        """Rapor SQL'i görüntü + delta için repository ile aynı sonucu vermeli"""
+        servis.gunluk_kapanis(date(2026, 10, 1))
+        tarih = datetime(2026, 10, 3, 12)
+
+        with sessionmaker(bind=engine)() as session:
+            sonuclar = tarihteki_stok_listesi(session, 1, tarih)
+            depodaki = tarihteki_stok_listesi(session, 1, tarih, depo_id=7)
+
+        assert {s['urun_id']: s['miktar'] for s in sonuclar} == servis.tarihteki_stok(tarih, 1)
+        assert depodaki == [{'urun_id': 1, 'miktar': Decimal('4')}]
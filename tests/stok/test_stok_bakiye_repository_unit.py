@@ -0,0 +1,113 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_bakiye_repository_unit
+# Description: StokBakiyeRepository atomik güncelleme birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Kritik stok sorgusu testi eklendi
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+StokBakiyeRepository Atomik Güncelleme Birim Testleri
+
+Upsert ve korumalı UPDATE ifadelerini offline (SQLite) veritabanında
+gerçek SQL ile çalıştırarak doğrular.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, select
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, Urun
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.hatalar import StokYetersizError
+
+
+@pytest.fixture
+def repository(sqlite_motoru, db_bagla):
+    """SQLite bellek veritabanına bağlı repository"""
+    engine = sqlite_motoru(StokBakiye.__table__)
+    
+    repo = StokBakiyeRepository()
+    db_bagla(engine, repo)
+    repo.engine = engine
+    return repo
+
+
+def _satir_sayisi(repository) -> int:
+    with repository.engine.connect() as baglanti:
+        return len(baglanti.execute(select(StokBakiye.__table__)).all())
+
+
+class TestStokBakiyeAtomikGuncelleme:
+    """Atomik bakiye güncelleme testleri"""
+    
+    def test_upsert_satir_olusturur_ve_artirir(self, repository):
+        """Aynı anahtara ikinci değişim yeni satır açmadan eklenmeli"""
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('5'))
+        sonuc = repository.bakiye_degisimi_uygula(1, 1, Decimal('-2'))
+        
+        assert sonuc.miktar == Decimal('3')
+        assert sonuc.kullanilabilir_miktar == Decimal('3')
+        assert _satir_sayisi(repository) == 1
+    
+    def test_depolu_ve_deposuz_bakiye_ayri_tutulur(self, repository):
+        """depo_id NULL ve dolu bakiyeler ayrı satırlar olmalı"""
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('5'))
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('7'), depo_id=3)
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('1'), depo_id=3)
+        
+        assert _satir_sayisi(repository) == 2
+        assert repository.bakiye_degisimi_uygula(1, 1, Decimal('0'), depo_id=3).miktar == Decimal('8')
+    
+    def test_rezervasyon_korumali_update(self, repository):
+        """Yetersiz stokta rezervasyon yapılmamalı ve hata vermeli"""
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('10'))
+        
+        assert repository.rezervasyon_yap(1, 1, Decimal('6')) is True
+        with pytest.raises(StokYetersizError):
+            repository.rezervasyon_yap(1, 1, Decimal('6'))
+        
+        sonuc = repository.bakiye_degisimi_uygula(1, 1, Decimal('0'))
+        assert sonuc.rezerve_miktar == Decimal('6')
+        assert sonuc.kullanilabilir_miktar == Decimal('4')
+    
+    def test_bakiyesiz_rezervasyon_hata_verir(self, repository):
+        """Bakiye satırı yoksa rezervasyon hatası alınmalı"""
+        with pytest.raises(StokYetersizError):
+            repository.rezervasyon_yap(9, 1, Decimal('1'))
+    
+    def test_rezervasyon_iptal_sifirin_altina_inmez(self, repository):
+        """Fazla iptal rezerve miktarı sıfırda bırakmalı"""
+        repository.bakiye_degisimi_uygula(1, 1, Decimal('10'))
+        repository.rezervasyon_yap(1, 1, Decimal('4'))
+        
+        assert repository.rezervasyon_iptal(1, 1, Decimal('9')) is True
+        assert repository.rezervasyon_iptal(2, 1, Decimal('1')) is False
+        
+        sonuc = repository.bakiye_degisimi_uygula(1, 1, Decimal('0'))
+        assert sonuc.rezerve_miktar == Decimal('0')
+        assert sonuc.kullanilabilir_miktar == Decimal('10')
+
+
+class TestKritikStokSorgusu:
+    """Kritik stok sorgusu testleri"""
+    
+    def test_sifir_minimum_stok_varsayilan_seviyeyi_kullanir(self, repository):
+        """minimum_stok 0 veya boş olan ürünlerde varsayılan kritik seviye geçerli olmalı"""
+        Urun.metadata.create_all(repository.engine, tables=[Urun.__table__])
+        with repository.engine.begin() as baglanti:
+            baglanti.execute(insert(Urun.__table__), [
+                {'id': 1, 'urun_kodu': 'U1', 'urun_adi': 'Ürün 1', 'minimum_stok': Decimal('0')},
+                {'id': 2, 'urun_kodu': 'U2', 'urun_adi': 'Ürün 2', 'minimum_stok': None},
+                {'id': 3, 'urun_kodu': 'U3', 'urun_adi': 'Ürün 3', 'minimum_stok': Decimal('2')},
+            ])
+        for urun_id in (1, 2, 3):
+            repository.bakiye_degisimi_uygula(urun_id, 1, Decimal('5'))
+        
+        satirlar = list(repository.kritik_stok_satirlari_getir(Decimal('10')))
+        
+        assert {satir['urun_id']: Decimal(satir['kritik_seviye']) for satir in satirlar} == {
+            1: Decimal('10'), 2: Decimal('10')
+        }
@@ -0,0 +1,175 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_entegrasyon_onbellek_unit
+# Description: Stok durumu önbelleği birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Süresi dolan girdilerin silinmesi ve rezervasyon serbest bırakma testleri
+
+"""
+Stok Durumu Önbelleği Birim Testleri
+
+StokEntegrasyonService önbelleğinin bildirimlerle güncellenmesini, süre
+dolumunu ve toplu okumayı doğrular.
+"""
+
+import time
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from sontechsp.uygulama.moduller.pos.servisler.stok_service import StokService
+from sontechsp.uygulama.moduller.stok.dto import StokBakiyeDTO
+from sontechsp.uygulama.moduller.stok.servisler.stok_entegrasyon_service import (
+    EticaretGuncelleme, POSSatisIslemi, StokEntegrasyonService
+)
+
+
+def _bakiye(urun_id, miktar) -> StokBakiyeDTO:
+    return StokBakiyeDTO(urun_id=urun_id, magaza_id=1, miktar=Decimal(miktar),
+                         rezerve_miktar=Decimal('0'), kullanilabilir_miktar=Decimal(miktar))
+
+
+@pytest.fixture
+def bakiye_repository():
+    """Ürün 1 ve 2 için bakiye döndüren repository"""
+    bakiyeler = {1: _bakiye(1, '20'), 2: _bakiye(2, '8')}
+    repo = Mock()
+    repo.bakiyeler_getir.side_effect = lambda urun_idler, magaza_id, depo_id: {
+        urun_id: bakiyeler[urun_id] for urun_id in urun_idler if urun_id in bakiyeler
+    }
+    return repo
+
+
+def _servis(bakiye_repository, sure=60.0):
+    rezervasyon_service = Mock()
+    rezervasyon_service.rezerve_toplami_getir.return_value = Decimal('0')
+    rezervasyon_service.aktif_rezervasyon_sayisi.return_value = 0
+    return StokEntegrasyonService(Mock(), bakiye_repository, rezervasyon_service,
+                                  durum_onbellek_suresi=sure)
+
+
+@pytest.fixture
+def servis(bakiye_repository):
+    """Uzun süreli önbellekli entegrasyon servisi"""
+    servis = _servis(bakiye_repository)
+    yield servis
+    servis.kapat()
+
+
+def _okunan_urunler(bakiye_repository):
+    return [cagri.args[0] for cagri in bakiye_repository.bakiyeler_getir.call_args_list]
+
+
+class TestStokDurumuOnbellegi:
+    """Önbellek okuma ve bildirim testleri"""
+
+    def test_tekrar_okuma_veritabanina_gitmez(self, servis, bakiye_repository):
+        """Aynı ürünün ikinci okuması önbellekten gelmeli"""
+        ilk = servis.gercek_zamanli_stok_durumu_getir(1, 1)
+        ikinci = servis.gercek_zamanli_stok_durumu_getir(1, 1)
+
+        assert ilk == ikinci
+        assert ikinci["kullanilabilir_stok"] == Decimal('20')
+        assert bakiye_repository.bakiyeler_getir.call_count == 1
+
+    def test_toplu_okuma_yalnizca_eksikleri_sorgular(self, servis, bakiye_repository):
+        """Sepet okuması önbellekte olmayan ürünleri tek sorguda okumalı"""
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+        durumlar = servis.stok_durumlari_getir([1, 2, 3, 2], 1)
+
+        assert list(durumlar) == [1, 2, 3]
+        assert _okunan_urunler(bakiye_repository) == [[1], [2, 3]]
+        assert durumlar[2]["durum"] == "KRITIK"
+        assert durumlar[3]["durum"] == "STOK_YOK"
+
+    def test_pos_bildirimi_girdiyi_gunceller(self, servis, bakiye_repository):
+        """Sepet satışı sonrası durum yeniden okunmadan güncel olmalı"""
+        servis.stok_durumlari_getir([1, 2], 1)
+        servis._hareket_service.toplu_stok_hareketi.return_value = [_bakiye(1, '15')]
+
+        servis.pos_sepeti_isle([POSSatisIslemi(
+            satis_id=7, magaza_id=1, depo_id=None, urun_id=1,
+            satis_miktari=Decimal('5'), birim_fiyat=Decimal('1'), toplam_tutar=Decimal('5'),
+            satis_tarihi=datetime.utcnow(), kasiyer_id=1, fiş_no='F7'
+        )])
+        durum = servis.gercek_zamanli_stok_durumu_getir(1, 1)
+
+        assert durum["kullanilabilir_stok"] == Decimal('15')
+        assert durum["toplam_stok"] == Decimal('15')
+        assert bakiye_repository.bakiyeler_getir.call_count == 1
+
+    def test_eticaret_bildirimi_girdiyi_gecersiz_kilar(self, servis, bakiye_repository):
+        """Yerel bakiye taşımayan bildirim sonrası veritabanından okunmalı"""
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+        bakiye_repository.bakiye_getir.return_value = _bakiye(1, '20')
+
+        servis.eticaret_guncelle(EticaretGuncelleme(
+            platform='TRENDYOL', urun_id=1, magaza_id=1, depo_id=None,
+            yeni_stok_miktari=Decimal('3'), guncelleme_tarihi=datetime.utcnow()
+        ))
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+
+        assert _okunan_urunler(bakiye_repository) == [[1], [1]]
+
+    def test_sure_dolunca_yeniden_okunur(self, bakiye_repository):
+        """Bildirim gelmese de süresi dolan girdi yenilenmeli"""
+        servis = _servis(bakiye_repository, sure=0.0)
+        try:
+            servis.gercek_zamanli_stok_durumu_getir(1, 1)
+            servis.gercek_zamanli_stok_durumu_getir(1, 1)
+        finally:
+            servis.kapat()
+
+        assert bakiye_repository.bakiyeler_getir.call_count == 2
+
+    def test_gecersiz_kilma(self, servis, bakiye_repository):
+        """Rezervasyon sonrası geçersiz kılınan ürün yeniden okunmalı"""
+        servis.stok_durumlari_getir([1, 2], 1)
+        servis.stok_durumu_gecersiz_kil(2, 1)
+        servis.stok_durumlari_getir([1, 2], 1)
+
+        assert _okunan_urunler(bakiye_repository) == [[1, 2], [2]]
+
+    def test_okunmayan_girdiler_temizlenir(self, servis):
+        """Bir daha okunmayan ürünlerin geçersiz kılma kayıtları birikmemeli"""
+        for urun_id in range(100, 200):
+            servis.stok_durumu_gecersiz_kil(urun_id, 1)
+        servis._sonraki_temizlik = 0.0
+
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+
+        assert servis.entegrasyon_durumu_getir()["durum_onbellegi"]["girdi_sayisi"] == 1
+
+    def test_temizlenen_kayit_eski_okumayi_yazdirmaz(self, servis, bakiye_repository):
+        """Okuma sürerken geçersiz kılınıp silinen anahtara eski veri yazılmamalı"""
+        okuma = bakiye_repository.bakiyeler_getir.side_effect
+
+        def okurken_gecersiz_kil(urun_idler, magaza_id, depo_id):
+            sonuc = okuma(urun_idler, magaza_id, depo_id)
+            servis.stok_durumu_gecersiz_kil(1, 1)
+            with servis._onbellek_kilidi:
+                servis._suresi_dolanlari_sil(time.monotonic())
+            return sonuc
+
+        bakiye_repository.bakiyeler_getir.side_effect = okurken_gecersiz_kil
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+        bakiye_repository.bakiyeler_getir.side_effect = okuma
+        servis.gercek_zamanli_stok_durumu_getir(1, 1)
+
+        assert bakiye_repository.bakiyeler_getir.call_count == 2
+
+    def test_rezervasyon_serbest_birakilinca_yeniden_okunur(self, servis, bakiye_repository):
+        """POS rezervasyon iptali ürünün önbellek girdisini geçersiz kılmalı"""
+        rezervasyon_service = Mock()
+        rezervasyon_service.rezervasyon_bilgisi_getir.return_value = Mock(urun_id=2, magaza_id=1, depo_id=None)
+        rezervasyon_service.rezervasyon_iptal_et.return_value = True
+        stok_service = StokService(servis, rezervasyon_service, Mock(), bakiye_repository)
+
+        servis.stok_durumlari_getir([1, 2], 1)
+        assert stok_service.stok_rezervasyon_serbest_birak("5") is True
+        servis.stok_durumlari_getir([1, 2], 1)
+
+        assert _okunan_urunler(bakiye_repository) == [[1, 2], [2]]
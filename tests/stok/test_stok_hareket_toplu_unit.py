@@ -0,0 +1,137 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_hareket_toplu_unit
+# Description: Toplu stok hareketi birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+Toplu Stok Hareketi Birim Testleri
+
+StokHareketRepository.toplu_hareket_uygula ve
+StokHareketService.toplu_stok_hareketi akışını offline (SQLite)
+veritabanında gerçek SQL ile doğrular.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import select
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, StokHareket
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_hareket_repository import StokHareketRepository
+from sontechsp.uygulama.moduller.stok.dto import StokHareketDTO
+from sontechsp.uygulama.moduller.stok.hatalar import StokYetersizError
+from sontechsp.uygulama.moduller.stok.servisler.stok_hareket_service import StokHareketService
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """SQLite bellek veritabanı"""
+    return sqlite_motoru(StokBakiye.__table__, StokHareket.__table__)
+
+
+@pytest.fixture
+def hareket_repository(engine, db_bagla):
+    """Aynı veritabanına bağlı hareket ve bakiye repository'leri"""
+    bakiye_repo = StokBakiyeRepository()
+    repo = StokHareketRepository(bakiye_repository=bakiye_repo)
+    db_bagla(engine, bakiye_repo, repo)
+    return repo
+
+
+def _hareket(urun_id, miktar, hareket_tipi="CIKIS", depo_id=None) -> StokHareketDTO:
+    return StokHareketDTO(
+        urun_id=urun_id, magaza_id=1, depo_id=depo_id,
+        hareket_tipi=hareket_tipi, miktar=Decimal(miktar)
+    )
+
+
+def _tablo(engine, tablo):
+    with engine.connect() as baglanti:
+        return baglanti.execute(select(tablo)).all()
+
+
+class TestTopluHareketRepository:
+    """Repository seviyesinde toplu hareket testleri"""
+
+    def test_ayni_urun_tek_bakiye_guncellemesine_toplanir(self, hareket_repository, engine):
+        """Aynı ürünün satırları tek bakiye değişimi olarak uygulanmalı"""
+        hareket_repository.toplu_hareket_uygula([_hareket(1, '10', 'GIRIS')])
+
+        bakiyeler = hareket_repository.toplu_hareket_uygula([
+            _hareket(1, '-2'), _hareket(1, '-3'), _hareket(2, '4', 'GIRIS')
+        ])
+
+        assert [(b.urun_id, b.miktar) for b in bakiyeler] == [
+            (1, Decimal('5')), (2, Decimal('4'))
+        ]
+        assert len(_tablo(engine, StokHareket.__table__)) == 4
+        assert len(_tablo(engine, StokBakiye.__table__)) == 2
+
+    def test_bakiye_anahtarlari_sabit_sirada_islenir(self, hareket_repository):
+        """Kilit sırası giriş sırasından bağımsız olarak anahtara göre olmalı"""
+        bakiyeler = hareket_repository.toplu_hareket_uygula([
+            _hareket(3, '1', 'GIRIS', depo_id=2),
+            _hareket(1, '1', 'GIRIS'),
+            _hareket(3, '1', 'GIRIS'),
+            _hareket(2, '1', 'GIRIS')
+        ])
+
+        assert [(b.urun_id, b.depo_id) for b in bakiyeler] == [
+            (1, None), (2, None), (3, None), (3, 2)
+        ]
+
+    def test_dogrulayici_hatasi_tum_islemi_geri_alir(self, hareket_repository, engine):
+        """Doğrulayıcı hata fırlatırsa ne hareket ne bakiye kalmalı"""
+        def reddet(bakiye, degisim):
+            if bakiye.urun_id == 2:
+                raise StokYetersizError("Yetersiz stok", "ID:2", Decimal('0'), -degisim)
+
+        with pytest.raises(StokYetersizError):
+            hareket_repository.toplu_hareket_uygula(
+                [_hareket(1, '5', 'GIRIS'), _hareket(2, '-1')], reddet
+            )
+
+        assert _tablo(engine, StokHareket.__table__) == []
+        assert _tablo(engine, StokBakiye.__table__) == []
+
+
+class TestTopluStokHareketiServisi:
+    """Servis seviyesinde toplu hareket testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.negatif_stok_kontrol = Mock()
+        self.negatif_stok_kontrol.kontrol_yap.return_value = True
+
+    def test_cikis_miktari_isaretlenir(self, hareket_repository):
+        """Pozitif girilen çıkış miktarı negatif kaydedilmeli"""
+        servis = StokHareketService(hareket_repository, Mock(), self.negatif_stok_kontrol)
+        hareket_repository.toplu_hareket_uygula([_hareket(1, '10', 'GIRIS')])
+
+        bakiyeler = servis.toplu_stok_hareketi([_hareket(1, '4'), _hareket(1, '1')])
+
+        assert bakiyeler[0].kullanilabilir_miktar == Decimal('5')
+        self.negatif_stok_kontrol.kontrol_yap.assert_called_once_with(
+            1, Decimal('5'), Decimal('10')
+        )
+
+    def test_yetersiz_stokta_hicbir_satir_dusulmez(self, hareket_repository, engine):
+        """Bir satır yetersizse sepetin tamamı geri alınmalı"""
+        servis = StokHareketService(hareket_repository, Mock(), self.negatif_stok_kontrol)
+        hareket_repository.toplu_hareket_uygula([
+            _hareket(1, '10', 'GIRIS'), _hareket(2, '1', 'GIRIS')
+        ])
+
+        with pytest.raises(StokYetersizError):
+            servis.toplu_stok_hareketi(
+                [_hareket(1, '3'), _hareket(2, '2')], yetersiz_stokta_hata=True
+            )
+
+        bakiyeler = {satir.urun_id: satir.miktar for satir in _tablo(engine, StokBakiye.__table__)}
+        assert bakiyeler == {1: Decimal('10'), 2: Decimal('1')}
+        assert len(_tablo(engine, StokHareket.__table__)) == 2
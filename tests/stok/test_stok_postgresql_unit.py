@@ -0,0 +1,156 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_postgresql_unit
+# Description: PostgreSQL'e özgü stok SQL yollarının testleri
+# Changelog:
+# - İlk oluşturma
+
+"""
+PostgreSQL'e Özgü Stok SQL Testleri
+
+SQLite testlerinin çalıştıramadığı yolları gerçek PostgreSQL'de doğrular:
+pg_trgm ürün araması, rezervasyon düşümündeki SKIP LOCKED ve bakiye /
+sayım upsert'lerindeki ON CONFLICT kısmi indeks eşleşmesi.
+
+SONTECHSP_TEST_PG_URL boş bir test veritabanını göstermelidir; tanımlı
+değilse testler atlanır.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, StokSayimSatiri, Urun
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_hareket_repository import StokHareketRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_rezervasyon_repository import StokRezervasyonRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_sayim_repository import StokSayimRepository
+from sontechsp.uygulama.moduller.stok.depolar.urun_repository import UrunRepository
+from sontechsp.uygulama.moduller.stok.servisler.stok_rezervasyon_service import StokRezervasyonService
+
+pytestmark = pytest.mark.postgresql
+
+URUNLER = [
+    (1, 'SUT001', 'Süt Ülker 1L'),
+    (2, 'AYR001', 'SÜTAŞ Ayran'),
+    (3, 'CAY001', 'Çaykur Rize Çayı'),
+]
+
+
+@pytest.fixture
+def engine(pg_motoru):
+    """Firma, mağaza ve ürünleri yüklenmiş PostgreSQL veritabanı"""
+    with pg_motoru.begin() as baglanti:
+        baglanti.execute(text("INSERT INTO firmalar (id, firma_adi) VALUES (1, 'Test')"))
+        baglanti.execute(text(
+            "INSERT INTO magazalar (id, firma_id, magaza_adi, magaza_kodu) "
+            "VALUES (1, 1, 'Merkez', 'M1'), (2, 1, 'Şube', 'M2')"
+        ))
+        baglanti.execute(insert(Urun.__table__), [
+            {'id': urun_id, 'urun_kodu': kod, 'urun_adi': ad} for urun_id, kod, ad in URUNLER
+        ])
+    return pg_motoru
+
+
+@pytest.fixture
+def bakiye_repository(engine, db_bagla):
+    """PostgreSQL'e bağlı bakiye repository"""
+    repo = StokBakiyeRepository()
+    db_bagla(engine, repo)
+    return repo
+
+
+class TestPostgresqlUrunArama:
+    """pg_trgm araması"""
+
+    def test_trigram_indeksi_olusur(self, engine):
+        """Metadata kurulumu trigram indeksini oluşturmalı"""
+        with engine.connect() as baglanti:
+            indeksler = baglanti.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'urunler'"
+            )).scalars().all()
+        assert 'ix_urun_arama_anahtari_trgm' in indeksler
+
+    def test_turkce_ve_yazim_hatali_arama(self, engine, db_bagla):
+        """Katlanmış terim ve benzerlik (%) eşleşmesi sonuç vermeli"""
+        repo = UrunRepository()
+        db_bagla(engine, repo)
+
+        assert [urun.urun_kodu for urun in repo.ara('sütaş')] == ['AYR001']
+        assert [urun.urun_kodu for urun in repo.ara('ÇAY', onek=True)] == ['CAY001']
+        assert 'CAY001' in [urun.urun_kodu for urun in repo.ara('caykurr')]
+
+
+class TestPostgresqlSkipLocked:
+    """Süresi dolan rezervasyon düşümü"""
+
+    def test_kilitli_satir_atlanir(self, engine, bakiye_repository):
+        """Başka işlemin kilitlediği rezervasyon beklenmeden atlanmalı"""
+        bakiye_repository.bakiye_degisimi_uygula(1, 1, Decimal('10'))
+        rezervasyon_repository = StokRezervasyonRepository(bakiye_repository)
+        rezervasyon_repository.db = bakiye_repository.db
+        servis = StokRezervasyonService(bakiye_repository, rezervasyon_repository)
+        for _ in range(3):
+            servis.rezervasyon_yap(1, 1, Decimal('1'), gecerlilik_suresi=timedelta(seconds=-1))
+
+        kilitli = threading.Event()
+        birak = threading.Event()
+
+        def kilitle():
+            with engine.begin() as baglanti:
+                baglanti.execute(text(
+                    "SELECT id FROM stok_rezervasyonlari ORDER BY id LIMIT 1 FOR UPDATE"
+                ))
+                kilitli.set()
+                birak.wait(10)
+
+        kilitleyici = threading.Thread(target=kilitle)
+        kilitleyici.start()
+        try:
+            assert kilitli.wait(10)
+            dusulenler = rezervasyon_repository.suresi_dolanlari_dusur(datetime.now(timezone.utc))
+        finally:
+            birak.set()
+            kilitleyici.join()
+
+        assert len(dusulenler) == 2
+        assert servis.suresi_dolan_rezervasyonlari_temizle() == 1
+
+
+class TestPostgresqlOnConflict:
+    """Upsert kısmi indeks eşleşmeleri"""
+
+    def test_bakiye_upsert_depolu_ve_deposuz(self, engine, bakiye_repository):
+        """depo_id NULL bakiye kısmi indeksle, depolu bakiye tam anahtarla birleşmeli"""
+        bakiye_repository.bakiye_degisimi_uygula(1, 1, Decimal('5'))
+        bakiye_repository.bakiye_degisimi_uygula(1, 1, Decimal('-2'))
+        bakiye_repository.bakiye_degisimi_uygula(1, 2, Decimal('4'))
+        sonuc = bakiye_repository.bakiye_degisimi_uygula(1, 2, Decimal('1'))
+
+        with engine.connect() as baglanti:
+            satirlar = baglanti.execute(
+                select(StokBakiye.__table__.c.magaza_id, StokBakiye.__table__.c.miktar)
+                .order_by(StokBakiye.__table__.c.magaza_id)
+            ).all()
+        assert [tuple(satir) for satir in satirlar] == [(1, Decimal('3')), (2, Decimal('5'))]
+        assert sonuc.kullanilabilir_miktar == Decimal('5')
+
+    def test_sayim_verisi_toplanarak_yazilir(self, engine, bakiye_repository, db_bagla):
+        """Aynı ürünün farklı raf okutmaları toplanmalı"""
+        hareket_repository = StokHareketRepository(bakiye_repository=bakiye_repository)
+        sayim_repository = StokSayimRepository(hareket_repository)
+        db_bagla(engine, hareket_repository, sayim_repository)
+        sayim_id = sayim_repository.sayim_olustur('SAY-PG-1', 1)
+
+        sayim_repository.sayim_verileri_yaz(sayim_id, [(1, Decimal('2'))], toplama=True)
+        sayim_repository.sayim_verileri_yaz(sayim_id, [(1, Decimal('3')), (2, Decimal('1'))], toplama=True)
+
+        tablo = StokSayimSatiri.__table__
+        with engine.connect() as baglanti:
+            miktarlar = dict(baglanti.execute(
+                select(tablo.c.urun_id, tablo.c.sayilan_miktar).where(tablo.c.sayim_id == sayim_id)
+            ).all())
+        assert miktarlar == {1: Decimal('5'), 2: Decimal('1')}
@@ -0,0 +1,157 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_rezervasyon_service_unit
+# Description: Kalıcı stok rezervasyonu birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Eş zamanlı yenileme ve UTC geçerlilik testleri eklendi
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+Kalıcı Stok Rezervasyonu Birim Testleri
+
+StokRezervasyonService ve StokRezervasyonRepository akışını offline
+(SQLite) veritabanında gerçek SQL ile doğrular.
+"""
+
+import threading
+import time
+from datetime import timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from sontechsp.uygulama.veritabani.modeller.stok import StokBakiye, StokRezervasyon
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_rezervasyon_repository import StokRezervasyonRepository
+from sontechsp.uygulama.moduller.stok.hatalar.stok_hatalari import StokValidationError, StokYetersizError
+from sontechsp.uygulama.moduller.stok.servisler.stok_rezervasyon_service import StokRezervasyonService
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """Thread'ler arası paylaşılan SQLite bellek veritabanı"""
+    return sqlite_motoru(StokBakiye.__table__, StokRezervasyon.__table__, paylasimli=True)
+
+
+@pytest.fixture
+def bakiye_repository(engine, db_bagla):
+    """Başlangıç bakiyeleri yüklenmiş bakiye repository"""
+    repo = StokBakiyeRepository()
+    db_bagla(engine, repo)
+    repo.bakiye_degisimi_uygula(1, 1, Decimal('10'))
+    repo.bakiye_degisimi_uygula(2, 1, Decimal('10'))
+    return repo
+
+
+def _servis(engine, bakiye_repository, **kwargs) -> StokRezervasyonService:
+    rezervasyon_repository = StokRezervasyonRepository(bakiye_repository)
+    rezervasyon_repository.db = bakiye_repository.db
+    return StokRezervasyonService(bakiye_repository, rezervasyon_repository, **kwargs)
+
+
+def _bakiye_alani(engine, urun_id, alan) -> Decimal:
+    with engine.connect() as baglanti:
+        return baglanti.execute(
+            select(StokBakiye.__table__.c[alan])
+            .where(StokBakiye.__table__.c.urun_id == urun_id)
+        ).scalar_one()
+
+
+def _rezerve(engine, urun_id) -> Decimal:
+    return _bakiye_alani(engine, urun_id, 'rezerve_miktar')
+
+
+class TestKaliciRezervasyon:
+    """Kalıcı rezervasyon testleri"""
+
+    def test_rezervasyon_yeni_servis_orneginden_gorunur(self, engine, bakiye_repository):
+        """Rezervasyon süreç belleğine bağlı olmamalı"""
+        rezervasyon_id = _servis(engine, bakiye_repository).rezervasyon_yap(1, 1, Decimal('3'))
+
+        yeni_servis = _servis(engine, bakiye_repository)
+
+        assert yeni_servis.rezervasyon_bilgisi_getir(rezervasyon_id).rezerve_miktar == Decimal('3')
+        assert yeni_servis.rezerve_toplami_getir(1, 1) == Decimal('3')
+        assert _rezerve(engine, 1) == Decimal('3')
+
+    def test_yetersiz_stokta_kayit_olusmaz(self, engine, bakiye_repository):
+        """Bakiye rezerve edilemezse rezervasyon satırı da yazılmamalı"""
+        servis = _servis(engine, bakiye_repository)
+
+        with pytest.raises(StokYetersizError):
+            servis.rezervasyon_yap(1, 1, Decimal('11'))
+
+        assert servis.aktif_rezervasyonlar_listesi() == []
+        assert _rezerve(engine, 1) == Decimal('0')
+
+    def test_toplamlar_iptal_ve_kullanimla_guncellenir(self, engine, bakiye_repository):
+        """O(1) toplamlar iptal ve kısmi kullanımda artımlı güncellenmeli"""
+        servis = _servis(engine, bakiye_repository)
+        assert servis.rezerve_toplami_getir(1, 1) == Decimal('0')
+
+        birinci = servis.rezervasyon_yap(1, 1, Decimal('2'))
+        ikinci = servis.rezervasyon_yap(1, 1, Decimal('5'))
+        servis.rezervasyon_iptal(birinci)
+        servis.rezervasyon_kullan(ikinci, Decimal('1'))
+
+        assert servis.rezerve_toplami_getir(1, 1) == Decimal('4')
+        assert servis.aktif_rezervasyon_sayisi(1, 1) == 1
+        assert _rezerve(engine, 1) == Decimal('4')
+        assert _bakiye_alani(engine, 1, 'miktar') == Decimal('9')
+
+    def test_iptal_edilen_rezervasyon_tekrar_iptal_edilemez(self, engine, bakiye_repository):
+        """Aynı rezervasyon iki kez serbest bırakılmamalı"""
+        servis = _servis(engine, bakiye_repository)
+        rezervasyon_id = servis.rezervasyon_yap(1, 1, Decimal('2'))
+        servis.rezervasyon_iptal(rezervasyon_id)
+
+        with pytest.raises(StokValidationError):
+            servis.rezervasyon_iptal(rezervasyon_id)
+
+        assert _rezerve(engine, 1) == Decimal('0')
+
+    def test_suresi_dolanlar_partiler_halinde_dusulur(self, engine, bakiye_repository):
+        """Süresi dolanlar toplu düşülmeli, geçerli olanlar kalmalı"""
+        servis = _servis(engine, bakiye_repository, parti_boyutu=2)
+        for _ in range(3):
+            servis.rezervasyon_yap(1, 1, Decimal('1'), gecerlilik_suresi=timedelta(seconds=-1))
+        servis.rezervasyon_yap(2, 1, Decimal('1'), gecerlilik_suresi=timedelta(seconds=-1))
+        gecerli = servis.rezervasyon_yap(2, 1, Decimal('2'))
+
+        assert servis.suresi_dolan_rezervasyonlari_temizle() == 4
+
+        assert _rezerve(engine, 1) == Decimal('0')
+        assert _rezerve(engine, 2) == Decimal('2')
+        assert servis.rezerve_toplami_getir(2, 1) == Decimal('2')
+        assert [r.rezervasyon_id for r in servis.aktif_rezervasyonlar_listesi()] == [gecerli]
+
+    def test_yenileme_eszamanli_rezervasyonu_kaybetmez(self, engine, bakiye_repository):
+        """Yenileme sürerken yapılan rezervasyon toplamdan düşmemeli"""
+        servis = _servis(engine, bakiye_repository)
+        servis.rezervasyon_yap(1, 1, Decimal('2'))
+        repository = servis._rezervasyon_repository
+        asil_okuma = repository.aktif_toplamlar
+        diger = []
+
+        def yavas_okuma():
+            toplamlar = asil_okuma()
+            thread = threading.Thread(target=servis.rezervasyon_yap, args=(1, 1, Decimal('3')))
+            thread.start()
+            diger.append(thread)
+            time.sleep(0.1)
+            return toplamlar
+
+        repository.aktif_toplamlar = yavas_okuma
+        servis.rezerve_toplamlarini_yenile()
+        diger[0].join()
+
+        assert servis.rezerve_toplami_getir(1, 1) == _rezerve(engine, 1) == Decimal('5')
+
+    def test_gecerlilik_tarihi_utc(self, engine, bakiye_repository):
+        """Geçerlilik tarihi saat dilimli (UTC) üretilmeli"""
+        servis = _servis(engine, bakiye_repository)
+        rezervasyon = servis._rezervasyon_olustur(1, 1, Decimal('1'), None, None, None, None, None)
+
+        assert rezervasyon.gecerlilik_tarihi.tzinfo is timezone.utc
@@ -0,0 +1,153 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_sayim_service_unit
+# Description: Kalıcı stok sayımı birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Barkod repository yedeği ve bayt bazlı ilerleme testleri
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+Kalıcı Stok Sayımı Birim Testleri
+
+StokSayimService ve StokSayimRepository akışını offline (SQLite)
+veritabanında gerçek SQL ile doğrular.
+"""
+
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import select
+
+from sontechsp.uygulama.veritabani.modeller.stok import (
+    StokBakiye, StokHareket, StokSayim, StokSayimSatiri
+)
+from sontechsp.uygulama.moduller.stok.depolar.barkod_indeksi import BarkodIndeksi
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_hareket_repository import StokHareketRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_sayim_repository import StokSayimRepository
+from sontechsp.uygulama.moduller.stok.dto import BarkodDTO
+from sontechsp.uygulama.moduller.stok.hatalar.stok_hatalari import StokSayimError
+from sontechsp.uygulama.moduller.stok.servisler.stok_sayim_service import StokSayimService
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """SQLite bellek veritabanı"""
+    return sqlite_motoru(
+        StokBakiye.__table__, StokHareket.__table__,
+        StokSayim.__table__, StokSayimSatiri.__table__
+    )
+
+
+@pytest.fixture
+def servis(engine, db_bagla):
+    """Başlangıç bakiyeleri yüklenmiş sayım servisi"""
+    bakiye_repo = StokBakiyeRepository()
+    hareket_repo = StokHareketRepository(bakiye_repository=bakiye_repo)
+    sayim_repo = StokSayimRepository(hareket_repo)
+    db_bagla(engine, bakiye_repo, hareket_repo, sayim_repo)
+
+    for urun_id in (1, 2, 3):
+        bakiye_repo.bakiye_degisimi_uygula(urun_id, 1, Decimal('10'))
+    bakiye_repo.bakiye_degisimi_uygula(4, 2, Decimal('10'))
+
+    return StokSayimService(hareket_repo, bakiye_repo, sayim_repo)
+
+
+def _bakiyeler(engine, magaza_id=1):
+    tablo = StokBakiye.__table__
+    with engine.connect() as baglanti:
+        return dict(baglanti.execute(
+            select(tablo.c.urun_id, tablo.c.miktar).where(tablo.c.magaza_id == magaza_id)
+        ).all())
+
+
+class TestKaliciSayim:
+    """Kalıcı sayım testleri"""
+
+    def test_goruntu_ve_farklar(self, servis):
+        """Görüntü tek mağazayı kapsamalı, farklar yalnızca sayılanlardan çıkmalı"""
+        sayim_id = servis.sayim_baslat(1, kullanici_id=None)
+        servis.sayim_veri_ekle(sayim_id, 1, Decimal('8'))
+        servis.sayim_veri_ekle(sayim_id, 2, Decimal('10'))
+        servis.sayim_veri_ekle(sayim_id, 1, Decimal('7'))
+
+        durum = servis.sayim_durumu_getir(sayim_id)
+
+        assert durum['durum'] == 'DEVAM_EDIYOR'
+        assert (durum['toplam_kalem'], durum['sayilan_kalem'], durum['fark_kalem']) == (3, 2, 1)
+        assert list(servis.sayim_farklari(sayim_id)) == [(1, Decimal('-3'))]
+
+    def test_tamamlama_parti_parti_uygular(self, servis, engine):
+        """Farklar partiler halinde bakiyeye ve harekete yazılmalı"""
+        sayim_id = servis.sayim_baslat(1)
+        servis.sayim_verileri_ekle(sayim_id, [(1, Decimal('12')), (2, Decimal('9')),
+                                              (3, Decimal('10')), (5, Decimal('4'))])
+        ilerleme = []
+
+        ozet = servis.sayim_tamamla(sayim_id, parti_boyutu=2,
+                                    ilerleme=lambda u, t: ilerleme.append((u, t)))
+
+        assert ozet == {'fark_kalem': 3, 'uygulanan_kalem': 3}
+        assert dict(servis.sayim_farklari(sayim_id)) == {1: Decimal('2'), 2: Decimal('-1'), 5: Decimal('4')}
+        assert ilerleme == [(2, 3), (3, 3)]
+        assert _bakiyeler(engine) == {1: Decimal('12'), 2: Decimal('9'),
+                                      3: Decimal('10'), 5: Decimal('4')}
+        with engine.connect() as baglanti:
+            assert len(baglanti.execute(select(StokHareket.__table__)).all()) == 3
+        assert servis.sayim_durumu_getir(sayim_id)['durum'] == 'TAMAMLANDI'
+        assert servis.aktif_sayimlar_listesi(1) == []
+
+    def test_dosya_akisla_yuklenir(self, servis, tmp_path):
+        """Tekrarlanan barkodlar toplanmalı, bilinmeyen ve hatalı satırlar sayılmalı"""
+        dosya = tmp_path / "sayim.txt"
+        dosya.write_text("B1;2\nB2;5\nB1;3,5\nXX;1\nB2;abc\n\nB3\n", encoding='utf-8')
+        barkodlar = {'B1': 1, 'B2': 2, 'B3': 3}
+        sayim_id = servis.sayim_baslat(1)
+        ilerleme = []
+
+        sonuc = servis.sayim_dosyasi_yukle(sayim_id, str(dosya), parti_boyutu=2,
+                                           barkod_cozucu=barkodlar.get,
+                                           ilerleme=lambda o, t: ilerleme.append((o, t)))
+
+        assert sonuc == {'okunan_satir': 6, 'yazilan_kayit': 4,
+                         'bilinmeyen_barkod': 1, 'hatali_satir': 1}
+        boyut = dosya.stat().st_size
+        assert all(t == boyut for _, t in ilerleme)
+        assert ilerleme[-1][0] == boyut
+        assert dict(servis.sayim_farklari(sayim_id)) == {
+            1: Decimal('-4.5'), 2: Decimal('-5'), 3: Decimal('-9')
+        }
+
+    def test_indekste_olmayan_barkod_repositoryden_cozulur(self, servis, tmp_path):
+        """Yüklenmemiş indeks barkodları bilinmeyen saydırmamalı; her barkod tek sorgu"""
+        dosya = tmp_path / "sayim.txt"
+        dosya.write_bytes("\ufeffB1;2\nB1;1\nXX;1\nXX;2\n".encode('utf-8'))
+        barkod_repository = Mock()
+        barkod_repository.barkod_ile_ara.side_effect = (
+            lambda barkod: BarkodDTO(urun_id=1, barkod=barkod) if barkod == 'B1' else None
+        )
+        servis._barkod_repository = barkod_repository
+        sayim_id = servis.sayim_baslat(1)
+
+        with patch(f"{StokSayimService.__module__}.barkod_indeksi_al", return_value=BarkodIndeksi()):
+            sonuc = servis.sayim_dosyasi_yukle(sayim_id, str(dosya))
+
+        assert (sonuc['yazilan_kayit'], sonuc['bilinmeyen_barkod']) == (1, 2)
+        assert barkod_repository.barkod_ile_ara.call_count == 2
+        assert dict(servis.sayim_farklari(sayim_id))[1] == Decimal('-7')
+
+    def test_iptal_edilen_sayima_veri_eklenemez(self, servis, engine):
+        """İptal edilen sayım veri kabul etmemeli ve bakiyeye dokunmamalı"""
+        sayim_id = servis.sayim_baslat(1)
+        servis.sayim_veri_ekle(sayim_id, 1, Decimal('1'))
+        servis.sayim_iptal(sayim_id)
+
+        with pytest.raises(StokSayimError):
+            servis.sayim_veri_ekle(sayim_id, 1, Decimal('2'))
+        with pytest.raises(StokSayimError):
+            servis.sayim_tamamla(sayim_id)
+
+        assert _bakiyeler(engine)[1] == Decimal('10')
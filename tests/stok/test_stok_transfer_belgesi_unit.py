@@ -0,0 +1,139 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_stok_transfer_belgesi_unit
+# Description: Çok satırlı stok transfer belgesi birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+Çok Satırlı Stok Transfer Belgesi Birim Testleri
+
+StokTransferService / StokTransferRepository akışını offline (SQLite)
+veritabanında gerçek SQL ile doğrular.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, insert, select
+
+from sontechsp.uygulama.veritabani.modeller.stok import (
+    StokBakiye, StokHareket, StokTransfer, StokTransferSatiri
+)
+from sontechsp.uygulama.moduller.stok.depolar.stok_bakiye_repository import StokBakiyeRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_hareket_repository import StokHareketRepository
+from sontechsp.uygulama.moduller.stok.depolar.stok_transfer_repository import StokTransferRepository
+from sontechsp.uygulama.moduller.stok.hatalar import StokYetersizError
+from sontechsp.uygulama.moduller.stok.hatalar.stok_hatalari import StokValidationError
+from sontechsp.uygulama.moduller.stok.servisler.stok_transfer_service import StokTransferService
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """Kaynak mağazada (1) stoklu SQLite bellek veritabanı"""
+    engine = sqlite_motoru(
+        StokBakiye.__table__, StokHareket.__table__,
+        StokTransfer.__table__, StokTransferSatiri.__table__
+    )
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(StokBakiye.__table__), [
+            {'urun_id': urun_id, 'magaza_id': 1, 'depo_id': None, 'miktar': Decimal(miktar),
+             'rezerve_miktar': Decimal('0'), 'kullanilabilir_miktar': Decimal(miktar)}
+            for urun_id, miktar in [(1, '10'), (2, '5'), (3, '8')]
+        ])
+    return engine
+
+
+@pytest.fixture
+def servis(engine, db_bagla):
+    """Aynı veritabanına bağlı repository'lerle transfer servisi"""
+    bakiye_repo = StokBakiyeRepository()
+    hareket_repo = StokHareketRepository(bakiye_repository=bakiye_repo)
+    transfer_repo = StokTransferRepository(hareket_repository=hareket_repo)
+    db_bagla(engine, bakiye_repo, hareket_repo, transfer_repo)
+
+    return StokTransferService(hareket_repo, bakiye_repo, transfer_repo)
+
+
+def _bakiyeler(engine):
+    tablo = StokBakiye.__table__
+    with engine.connect() as baglanti:
+        return {
+            (satir.urun_id, satir.magaza_id): satir.miktar
+            for satir in baglanti.execute(select(tablo))
+        }
+
+
+SATIRLAR = [(3, Decimal('2')), (1, Decimal('4')), (2, Decimal('5')), (1, Decimal('1'))]
+
+
+class TestTransferBelgesi:
+    """Çok satırlı transfer belgesi testleri"""
+
+    def test_anlik_transfer_iki_bacak_tek_transaction(self, servis, engine):
+        """Tüm satırlar tek commit'te kaynaktan düşmeli ve hedefe eklenmeli"""
+        commitler = []
+        event.listen(engine, "commit", lambda baglanti: commitler.append(1))
+
+        ref = servis.transfer_belgesi_olustur(1, 2, SATIRLAR, yolda=False)
+
+        assert len(commitler) == 1
+        assert _bakiyeler(engine) == {
+            (1, 1): Decimal('5'), (2, 1): Decimal('0'), (3, 1): Decimal('6'),
+            (1, 2): Decimal('5'), (2, 2): Decimal('5'), (3, 2): Decimal('2'),
+        }
+        belge = servis.transfer_belgesi_getir(ref)
+        assert belge['durum'] == 'TAMAMLANDI'
+        assert belge['satirlar'] == [(1, Decimal('5')), (2, Decimal('5')), (3, Decimal('2'))]
+
+    def test_bakiye_kilitleri_sabit_sirada_alinir(self, servis, engine):
+        """Bakiye güncellemeleri iki bacak için (urun, magaza) sırasıyla yapılmalı"""
+        sira = []
+
+        def kaydet(baglanti, cursor, ifade, parametreler, context, executemany):
+            if ifade.startswith('INSERT INTO stok_bakiyeleri'):
+                sira.append((parametreler[0], parametreler[1]))
+
+        event.listen(engine, "before_cursor_execute", kaydet)
+        servis.transfer_belgesi_olustur(1, 2, SATIRLAR, yolda=False)
+
+        assert sira == sorted(sira) and len(sira) == 6
+
+    def test_yetersiz_satir_tum_belgeyi_geri_alir(self, servis, engine):
+        """Bir satırda stok yetmezse hiçbir bakiye ve belge yazılmamalı"""
+        with pytest.raises(StokYetersizError):
+            servis.transfer_belgesi_olustur(1, 2, [(1, Decimal('4')), (2, Decimal('6'))])
+
+        assert _bakiyeler(engine) == {(1, 1): Decimal('10'), (2, 1): Decimal('5'), (3, 1): Decimal('8')}
+        with engine.connect() as baglanti:
+            assert baglanti.execute(select(StokTransfer.__table__)).all() == []
+
+    def test_yolda_kabul(self, servis, engine):
+        """Yoldaki miktar kaynaktan düşer, hedefe yalnızca kabulde girer"""
+        ref = servis.transfer_belgesi_olustur(1, 2, SATIRLAR)
+
+        assert (1, 2) not in _bakiyeler(engine)
+        assert servis.yoldaki_stok(2) == {1: Decimal('5'), 2: Decimal('5'), 3: Decimal('2')}
+
+        assert servis.transfer_kabul_et(ref) is True
+        assert _bakiyeler(engine)[(1, 2)] == Decimal('5')
+        assert servis.yoldaki_stok(2) == {}
+        with pytest.raises(StokValidationError):
+            servis.transfer_kabul_et(ref)
+
+    def test_yolda_iptal_kaynaga_iade_eder(self, servis, engine):
+        """Yoldaki belgenin iptali kaynağı eski haline getirmeli"""
+        ref = servis.transfer_belgesi_olustur(1, 2, SATIRLAR)
+
+        assert servis.transfer_iptal(ref) is True
+        assert _bakiyeler(engine) == {(1, 1): Decimal('10'), (2, 1): Decimal('5'), (3, 1): Decimal('8')}
+        with pytest.raises(StokValidationError):
+            servis.transfer_kabul_et(ref)
+
+    def test_tek_urun_transfer_yap(self, servis, engine):
+        """Eski tek ürünlük API tek satırlı anında belge olmalı"""
+        ref = servis.transfer_yap(1, 1, 2, Decimal('3'))
+
+        assert servis.transfer_belgesi_getir(ref)['satirlar'] == [(1, Decimal('3'))]
+        assert _bakiyeler(engine)[(1, 2)] == Decimal('3')
@@ -0,0 +1,150 @@
+# Version: 0.1.0
+# Last Update: 2026-10-17
+# Module: tests.stok.test_urun_arama_unit
+# Description: İndeksli ürün araması birim testleri
+# Changelog:
+# - İlk oluşturma
+# - Saklanan arama anahtarı ve ASCII dışı harf testleri
+# - Ortak SQLite/db fixture'ları conftest'e taşındı
+
+"""
+İndeksli Ürün Araması Birim Testleri
+
+UrunRepository.ara (FTS5 aynası) ve toplu barkod okumasını offline
+(SQLite) veritabanında gerçek SQL ile doğrular.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import event, insert, select, text, update
+
+from sontechsp.uygulama.veritabani.modeller.stok import Urun, UrunBarkod, urun_arama_anahtari
+from sontechsp.uygulama.moduller.stok.depolar.barkod_repository import BarkodRepository
+from sontechsp.uygulama.moduller.stok.depolar.urun_arama import arama_anahtari, fts_sorgusu
+from sontechsp.uygulama.moduller.stok.depolar.urun_repository import UrunRepository
+from sontechsp.uygulama.moduller.stok.servisler.barkod_service import BarkodService
+from sontechsp.uygulama.moduller.stok.servisler.stok_yonetim_service import StokYonetimService
+from sontechsp.uygulama.moduller.stok.servisler.urun_service import UrunService
+
+URUNLER = [
+    (1, 'SUT001', 'Süt Ülker 1L', True),
+    (2, 'AYR001', 'SÜTAŞ Ayran', True),
+    (3, 'MAK001', 'Irmak Makarna', True),
+    (4, 'CAY001', 'Çaykur Rize Çayı', True),
+    (5, 'SUT002', 'Eski Süt', False),
+    (6, 'PAS001', 'ÉCLAIR Pasta', True),
+]
+
+
+@pytest.fixture
+def engine(sqlite_motoru):
+    """Ürünleri yüklenmiş SQLite bellek veritabanı (FTS5 aynası dahil)"""
+    engine = sqlite_motoru(Urun.__table__, UrunBarkod.__table__)
+    with engine.begin() as baglanti:
+        baglanti.execute(insert(Urun.__table__), [
+            {'id': urun_id, 'urun_kodu': kod, 'urun_adi': ad, 'aktif': aktif}
+            for urun_id, kod, ad, aktif in URUNLER
+        ])
+    return engine
+
+
+@pytest.fixture
+def urun_repository(engine, db_bagla):
+    """Test veritabanına bağlı ürün repository"""
+    repo = UrunRepository()
+    db_bagla(engine, repo)
+    return repo
+
+
+def _kodlar(urunler):
+    return [urun.urun_kodu for urun in urunler]
+
+
+class TestAramaAnahtari:
+    """Türkçe katlama testleri"""
+
+    def test_turkce_harfler_katlanir(self):
+        """İ/ı ve aksanlı harfler veritabanı ifadesiyle aynı katlanmalı"""
+        assert arama_anahtari("İSTANBUL Işık ÇAĞ") == "istanbul isik cag"
+
+    def test_fts_sorgusu_kelime_onekleri(self):
+        """Her kelime tırnaklı önek olarak aranmalı, işaretler atılmalı"""
+        assert fts_sorgusu('sut "ulk') == '"sut"* "ulk"*'
+        assert fts_sorgusu('- *') is None
+
+
+class TestUrunAramasi:
+    """FTS5 aynası üzerinden arama testleri"""
+
+    def test_buyuk_kucuk_harf_ve_aksandan_bagimsiz(self, urun_repository):
+        """"SÜT", "sut" ve "süt" aynı aktif ürünleri bulmalı"""
+        for terim in ("SÜT", "sut", "süt"):
+            assert sorted(_kodlar(urun_repository.ara(terim))) == ['AYR001', 'SUT001']
+
+    def test_noktali_ve_noktasiz_i(self, urun_repository):
+        """"ırmak" ve "IRMAK" aynı ürünü bulmalı"""
+        assert _kodlar(urun_repository.ara("ırmak")) == ['MAK001']
+        assert _kodlar(urun_repository.ara("IRMAK")) == ['MAK001']
+
+    def test_birebir_urun_kodu_once_gelir(self, urun_repository):
+        """Birebir ürün kodu eşleşmesi sıralamada ilk olmalı"""
+        assert _kodlar(urun_repository.ara("AYR001"))[0] == 'AYR001'
+
+    def test_ayna_tetikleyicilerle_guncel_kalir(self, urun_repository, engine):
+        """Ad değişikliği ve silme FTS aynasına yansımalı"""
+        with engine.begin() as baglanti:
+            baglanti.execute(update(Urun.__table__).where(Urun.__table__.c.id == 4)
+                             .values(urun_adi='Yeşil Çay',
+                                     arama_anahtari=urun_arama_anahtari('CAY001', 'Yeşil Çay')))
+            baglanti.execute(Urun.__table__.delete().where(Urun.__table__.c.id == 3))
+
+        assert _kodlar(urun_repository.ara("yesil")) == ['CAY001']
+        assert urun_repository.ara("caykur") == []
+        assert urun_repository.ara("makarna") == []
+
+    def test_fts_yoksa_like_aramasina_doner(self, urun_repository, engine):
+        """FTS aynası olmayan eski veritabanında arama yine çalışmalı"""
+        with engine.begin() as baglanti:
+            baglanti.execute(text("DROP TABLE urun_arama_fts"))
+
+        assert _kodlar(urun_repository.ara("çayı")) == ['CAY001']
+        assert _kodlar(urun_repository.ara("éclair")) == ['PAS001']
+
+    def test_anahtar_yazimda_saklanir(self, engine):
+        """Core INSERT de arama anahtarını Python katlamasıyla doldurmalı"""
+        tablo = Urun.__table__
+        with engine.connect() as baglanti:
+            anahtarlar = dict(baglanti.execute(select(tablo.c.id, tablo.c.arama_anahtari)).all())
+
+        assert anahtarlar[3] == 'mak001 irmak makarna'
+        assert anahtarlar[6] == 'pas001 éclair pasta'
+
+
+class TestTopluBarkodOkuma:
+    """Detaylı aramada barkodların tek sorguda okunması"""
+
+    def test_detayli_arama_tek_barkod_sorgusu(self, urun_repository, engine):
+        """Barkodlar ürün başına değil, tüm sonuçlar için bir kez okunmalı"""
+        with engine.begin() as baglanti:
+            baglanti.execute(insert(UrunBarkod.__table__), [
+                {'urun_id': 1, 'barkod': '8690000000011', 'birim': 'adet', 'ana_barkod': False},
+                {'urun_id': 1, 'barkod': '8690000000012', 'birim': 'adet', 'ana_barkod': True},
+                {'urun_id': 2, 'barkod': '8690000000021', 'birim': 'adet', 'ana_barkod': True},
+            ])
+
+        barkod_repo = BarkodRepository()
+        barkod_repo.db = urun_repository.db
+        servis = StokYonetimService(UrunService(urun_repository), BarkodService(barkod_repo, Mock()))
+
+        sorgular = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda *args: sorgular.append(args[2]) if 'urun_barkodlari' in args[2] else None)
+        sonuclar = servis.urun_ara_detayli("sut")
+
+        assert len(sorgular) == 1
+        barkodlar = {s["urun"].urun_kodu: [b.barkod for b in s["barkodlar"]] for s in sonuclar}
+        assert barkodlar == {
+            'SUT001': ['8690000000012', '8690000000011'],
+            'AYR001': ['8690000000021']
+        }